@@ -0,0 +1,122 @@
+"""Add persisted dedup match keys and indexes to crm_contacts
+
+Revision ID: 014_crm_dedup_keys
+Revises: aa04f1da746c
+Create Date: 2026-10-16
+
+Replaces full-table Python scans in DeduplicationEngine with indexed lookups:
+- email_domain: domain matching without ILIKE '%@domain'
+- phone_normalized: digits-only phone equality
+- company_normalized + pg_trgm GIN index: fuzzy company candidates
+- company_block_key: normalized-name prefix for bulk/blocking candidates
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014_crm_dedup_keys'
+down_revision = 'aa04f1da746c'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Snapshot of app.models.crm normalization at this revision (migrations must
+# not import application code, which keeps changing after they are written)
+COMPANY_SUFFIXES = [
+    'incorporated', 'corporation', 'technologies', 'technology',
+    'solutions', 'enterprises', 'holdings', 'services',
+    'limited', 'company', 'group', 'inc', 'corp', 'llc',
+    'ltd', 'co', 'tech'
+]
+_COMPANY_SUFFIX_PATTERNS = [
+    re.compile(rf'[\s,.]?\b{re.escape(suffix)}\b[\s,.]?') for suffix in COMPANY_SUFFIXES
+]
+COMPANY_BLOCK_KEY_LENGTH = 3
+
+
+def normalize_company_name(company):
+    if not company:
+        return ""
+    normalized = company.lower()
+    for pattern in _COMPANY_SUFFIX_PATTERNS:
+        normalized = pattern.sub(' ', normalized)
+    normalized = re.sub(r'[^\w\s]', '', normalized)
+    return ' '.join(normalized.split())
+
+
+def company_block_key(normalized_company):
+    if not normalized_company:
+        return None
+    return normalized_company.replace(' ', '')[:COMPANY_BLOCK_KEY_LENGTH] or None
+
+
+def upgrade() -> None:
+    op.add_column('crm_contacts', sa.Column('email_domain', sa.String(length=255), nullable=True))
+    op.add_column('crm_contacts', sa.Column('phone_normalized', sa.String(length=50), nullable=True))
+    op.add_column('crm_contacts', sa.Column('company_normalized', sa.String(length=255), nullable=True))
+    op.add_column('crm_contacts', sa.Column('company_block_key', sa.String(length=10), nullable=True))
+
+    # Backfill keys that are plain SQL expressions
+    op.execute("""
+        UPDATE crm_contacts
+        SET email_domain = NULLIF(lower(substring(email from '@([^@]*)$')), ''),
+            phone_normalized = NULLIF(regexp_replace(phone, '\\D', '', 'g'), '')
+    """)
+
+    # Company normalization (suffix stripping) must match the Python code exactly
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, company FROM crm_contacts "
+                "WHERE id > :last_id AND company IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            normalized = normalize_company_name(row.company)
+            updates.append({
+                "id": row.id,
+                "normalized": normalized or None,
+                "block_key": company_block_key(normalized),
+            })
+
+        bind.execute(
+            sa.text(
+                "UPDATE crm_contacts SET company_normalized = :normalized, "
+                "company_block_key = :block_key WHERE id = :id"
+            ),
+            updates
+        )
+        last_id = rows[-1].id
+
+    op.create_index('idx_crm_contact_email_domain', 'crm_contacts', ['email_domain'], unique=False)
+    op.create_index('idx_crm_contact_phone_normalized', 'crm_contacts', ['phone_normalized'], unique=False)
+    op.create_index('idx_crm_contact_company_block', 'crm_contacts', ['company_block_key'], unique=False)
+
+    # Trigram index for similarity() candidate search
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crm_contact_company_trgm
+        ON crm_contacts USING gin (company_normalized gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS idx_crm_contact_company_trgm')
+    op.drop_index('idx_crm_contact_company_block', table_name='crm_contacts')
+    op.drop_index('idx_crm_contact_phone_normalized', table_name='crm_contacts')
+    op.drop_index('idx_crm_contact_email_domain', table_name='crm_contacts')
+
+    op.drop_column('crm_contacts', 'company_block_key')
+    op.drop_column('crm_contacts', 'company_normalized')
+    op.drop_column('crm_contacts', 'phone_normalized')
+    op.drop_column('crm_contacts', 'email_domain')
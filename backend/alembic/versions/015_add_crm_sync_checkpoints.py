@@ -0,0 +1,38 @@
+"""Add resumable incremental sync checkpoints to crm_sync_logs
+
+Revision ID: 015_crm_sync_checkpoints
+Revises: 014_crm_dedup_keys
+Create Date: 2026-10-16
+
+CloseSyncEngine commits a checkpoint with every page it writes:
+- sync_since: lower bound of the run's date_updated window
+- sync_cursor: page cursor within the window (NULL once the run completes)
+- high_watermark: newest remote date_updated written, start of the next run
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015_crm_sync_checkpoints'
+down_revision = '014_crm_dedup_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('crm_sync_logs', sa.Column('sync_since', sa.DateTime(), nullable=True))
+    op.add_column('crm_sync_logs', sa.Column('sync_cursor', sa.String(length=255), nullable=True))
+    op.add_column('crm_sync_logs', sa.Column('high_watermark', sa.DateTime(), nullable=True))
+
+    op.create_index(
+        'idx_sync_log_checkpoint', 'crm_sync_logs',
+        ['credential_id', 'platform', 'started_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_sync_log_checkpoint', table_name='crm_sync_logs')
+
+    op.drop_column('crm_sync_logs', 'high_watermark')
+    op.drop_column('crm_sync_logs', 'sync_cursor')
+    op.drop_column('crm_sync_logs', 'sync_since')
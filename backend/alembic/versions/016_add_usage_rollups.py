@@ -0,0 +1,105 @@
+"""Add pre-aggregated usage rollups for cost and latency analytics
+
+Revision ID: 016_usage_rollups
+Revises: 015_crm_sync_checkpoints
+Create Date: 2026-10-16
+
+Hourly/daily rollups of ai_cost_tracking and api_call_logs, maintained by the
+refresh_usage_rollups Celery task:
+- ai_cost_rollups: by agent_type, agent_mode, provider, model (+ latency sketch)
+- ai_cost_lead_rollups: by lead_id, agent_type (hourly)
+- api_call_rollups: by provider, model, operation_type (+ latency sketch)
+- rollup_watermarks: highest raw id folded in, per raw table
+
+Rollups start empty; the first refresh backfills them from the raw tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016_usage_rollups'
+down_revision = '015_crm_sync_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+def _metric_columns():
+    return [
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('request_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('success_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('cache_hits', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total_cost_usd', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('uncached_requests', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('uncached_cost_usd', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('latency_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('latency_sum_ms', sa.BigInteger(), nullable=False, server_default='0'),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table('rollup_watermarks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO rollup_watermarks (name, last_id) VALUES ('ai_cost_tracking', 0), ('api_call_logs', 0)")
+
+    op.create_table('ai_cost_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        *_metric_columns(),
+        sa.Column('agent_type', sa.String(length=50), nullable=False),
+        sa.Column('agent_mode', sa.String(length=20), nullable=False, server_default=''),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('latency_sketch', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'granularity', 'bucket_start', 'agent_type', 'agent_mode', 'provider', 'model',
+            name='uq_ai_cost_rollup_bucket'
+        )
+    )
+    op.create_index('idx_ai_cost_rollup_agent', 'ai_cost_rollups', ['granularity', 'agent_type', 'bucket_start'])
+
+    op.create_table('ai_cost_lead_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        *_metric_columns(),
+        sa.Column('lead_id', sa.Integer(), nullable=False),
+        sa.Column('agent_type', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'granularity', 'bucket_start', 'lead_id', 'agent_type',
+            name='uq_ai_cost_lead_rollup_bucket'
+        )
+    )
+    op.create_index('idx_ai_cost_lead_rollup_lead', 'ai_cost_lead_rollups', ['lead_id', 'bucket_start'])
+
+    op.create_table('api_call_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        *_metric_columns(),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('operation_type', sa.String(length=50), nullable=False),
+        sa.Column('latency_sketch', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'granularity', 'bucket_start', 'provider', 'model', 'operation_type',
+            name='uq_api_call_rollup_bucket'
+        )
+    )
+    op.create_index('idx_api_call_rollup_provider', 'api_call_rollups', ['granularity', 'provider', 'bucket_start'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_api_call_rollup_provider', table_name='api_call_rollups')
+    op.drop_table('api_call_rollups')
+
+    op.drop_index('idx_ai_cost_lead_rollup_lead', table_name='ai_cost_lead_rollups')
+    op.drop_table('ai_cost_lead_rollups')
+
+    op.drop_index('idx_ai_cost_rollup_agent', table_name='ai_cost_rollups')
+    op.drop_table('ai_cost_rollups')
+
+    op.drop_table('rollup_watermarks')
@@ -0,0 +1,64 @@
+"""Add embedded knowledge base chunks with an HNSW vector index
+
+Revision ID: 017_knowledge_chunks
+Revises: 016_usage_rollups
+Create Date: 2026-10-17
+
+knowledge_chunks holds the embedded text chunks that
+KnowledgeBaseService.search_similar_documents ranks by cosine distance:
+- embedding vector(384) with an HNSW index (vector_cosine_ops)
+- customer_id denormalized from the document for the tenant filter
+
+Documents uploaded before this revision have no chunks until
+KnowledgeBaseService.reindex_documents() has run.
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = '017_knowledge_chunks'
+down_revision = '016_usage_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    op.create_table('knowledge_chunks',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('chunk_index', sa.Integer(), nullable=False),
+        sa.Column('chunk_text', sa.Text(), nullable=False),
+        sa.Column('embedding', Vector(384), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id']),
+        sa.ForeignKeyConstraint(['document_id'], ['knowledge_documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_knowledge_chunks_id'), 'knowledge_chunks', ['id'], unique=False)
+    op.create_index(op.f('ix_knowledge_chunks_customer_id'), 'knowledge_chunks', ['customer_id'], unique=False)
+    op.create_index(op.f('ix_knowledge_chunks_document_id'), 'knowledge_chunks', ['document_id'], unique=False)
+    op.create_index('idx_knowledge_chunks_document_order', 'knowledge_chunks', ['document_id', 'chunk_index'], unique=False)
+
+    # m/ef_construction are the pgvector defaults; recall is tuned per query with hnsw.ef_search
+    op.create_index(
+        'idx_knowledge_chunks_embedding_hnsw',
+        'knowledge_chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_knowledge_chunks_embedding_hnsw', table_name='knowledge_chunks')
+    op.drop_index('idx_knowledge_chunks_document_order', table_name='knowledge_chunks')
+    op.drop_index(op.f('ix_knowledge_chunks_document_id'), table_name='knowledge_chunks')
+    op.drop_index(op.f('ix_knowledge_chunks_customer_id'), table_name='knowledge_chunks')
+    op.drop_index(op.f('ix_knowledge_chunks_id'), table_name='knowledge_chunks')
+    op.drop_table('knowledge_chunks')
@@ -0,0 +1,41 @@
+"""Add composite indexes for grouped campaign analytics
+
+Revision ID: 018_campaign_analytics_indexes
+Revises: 017_knowledge_chunks
+Create Date: 2026-10-17
+
+CampaignService.get_campaign_analytics aggregates variant analytics per tone
+with one GROUP BY over a campaign_messages join:
+- idx_campaign_message_campaign_id (campaign_id, id): message ids of a
+  campaign from the index alone
+- idx_variant_analytics_message_tone (message_id, tone) INCLUDE counters:
+  index-only scan of the per-variant counters
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '018_campaign_analytics_indexes'
+down_revision = '017_knowledge_chunks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_campaign_message_campaign_id',
+        'campaign_messages',
+        ['campaign_id', 'id'],
+        unique=False
+    )
+    op.create_index(
+        'idx_variant_analytics_message_tone',
+        'message_variant_analytics',
+        ['message_id', 'tone'],
+        unique=False,
+        postgresql_include=['times_selected', 'times_opened', 'times_clicked', 'times_replied']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_variant_analytics_message_tone', table_name='message_variant_analytics')
+    op.drop_index('idx_campaign_message_campaign_id', table_name='campaign_messages')
@@ -0,0 +1,31 @@
+"""Add normalized company name index on leads
+
+Revision ID: 019_lead_company_name_key
+Revises: 018_campaign_analytics_indexes
+Create Date: 2026-10-17
+
+DealerScraperImporter matches re-imported dealers on the trimmed,
+case-folded company name (lower(trim(company_name)) IN (...)); the plain
+company_name index can't serve that lookup.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '019_lead_company_name_key'
+down_revision = '018_campaign_analytics_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_leads_company_name_key',
+        'leads',
+        [sa.text('lower(trim(company_name))')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_leads_company_name_key', table_name='leads')
@@ -6,18 +6,19 @@ Provides comprehensive cost analytics including:
 - Breakdown by agent, lead, and provider
 - Cache hit statistics with savings
 - Time-series data for visualization
+
+Reads the pre-aggregated usage rollups (app.services.usage_rollups) rather
+than scanning ai_cost_tracking.
 """
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from decimal import Decimal
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, case
 
 from app.models.database import get_db
-from app.models.ai_cost_tracking import AICostTracking
 from app.models.lead import Lead
+from app.services.usage_rollups import UsageStats, ai_cost_lead_usage, ai_cost_usage
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -100,45 +101,31 @@ async def get_ai_cost_analytics(
     - Daily time-series data for visualization
     """
     try:
-        # Build base query with filters
-        filters = []
-
-        if agent_type:
-            filters.append(AICostTracking.agent_type == agent_type)
-
-        if start_date:
-            filters.append(AICostTracking.timestamp >= start_date)
-
-        if end_date:
-            filters.append(AICostTracking.timestamp <= end_date)
+        # Rollups take [start, end); the API's end_date is inclusive
+        end = end_date + timedelta(microseconds=1) if end_date else None
+        filters = {"agent_type": agent_type, "lead_id": lead_id}
 
-        if lead_id:
-            filters.append(AICostTracking.lead_id == lead_id)
-
-        # Get total cost and requests
-        total_query = db.query(
-            func.sum(AICostTracking.cost_usd).label("total_cost"),
-            func.count(AICostTracking.id).label("total_requests")
+        by_model = ai_cost_usage(
+            db, ("agent_type", "agent_mode", "provider", "model"), start=start_date, end=end, **filters
         )
+        totals = UsageStats()
+        for stats in by_model.values():
+            totals.merge(stats)
 
-        if filters:
-            total_query = total_query.filter(and_(*filters))
-
-        total_result = total_query.first()
-        total_cost = float(total_result.total_cost or Decimal("0.0"))
-        total_requests = total_result.total_requests or 0
+        total_cost = totals.cost_usd
+        total_requests = totals.requests
 
         # Get breakdown by agent
-        agent_breakdown = _get_agent_breakdown(db, filters)
+        agent_breakdown = _get_agent_breakdown(by_model)
 
         # Get breakdown by lead
-        lead_breakdown = _get_lead_breakdown(db, filters)
+        lead_breakdown = _get_lead_breakdown(db, start_date, end, filters)
 
         # Get cache statistics
-        cache_stats = _get_cache_statistics(db, filters)
+        cache_stats = _get_cache_statistics(totals)
 
         # Get time series data
-        time_series = _get_time_series(db, filters)
+        time_series = _get_time_series(db, start_date, end, filters)
 
         logger.info(
             f"Analytics generated: total_cost=${total_cost:.6f}, "
@@ -160,55 +147,29 @@ async def get_ai_cost_analytics(
         raise HTTPException(status_code=500, detail=f"Failed to generate analytics: {str(e)}")
 
 
-def _get_agent_breakdown(db: Session, filters: List) -> List[AgentCostBreakdown]:
-    """Get cost breakdown by agent type."""
-    query = db.query(
-        AICostTracking.agent_type,
-        AICostTracking.agent_mode,
-        func.count(AICostTracking.id).label("total_requests"),
-        func.sum(AICostTracking.cost_usd).label("total_cost"),
-        func.avg(AICostTracking.cost_usd).label("avg_cost"),
-        func.avg(AICostTracking.latency_ms).label("avg_latency")
-    ).group_by(
-        AICostTracking.agent_type,
-        AICostTracking.agent_mode
-    )
-
-    if filters:
-        query = query.filter(and_(*filters))
+def _get_agent_breakdown(by_model: Dict[tuple, UsageStats]) -> List[AgentCostBreakdown]:
+    """Get cost breakdown by agent type from (agent_type, agent_mode, provider, model) groups."""
+    by_agent: Dict[tuple, UsageStats] = {}
+    model_usage: Dict[str, Dict[tuple, int]] = {}
 
-    results = query.all()
+    for (agent_type, agent_mode, provider, model), stats in by_model.items():
+        by_agent.setdefault((agent_type, agent_mode), UsageStats()).merge(stats)
+        usage = model_usage.setdefault(agent_type, {})
+        usage[(provider, model)] = usage.get((provider, model), 0) + stats.requests
 
     breakdown = []
-    for row in results:
-        # Get primary provider and model (most used)
-        provider_query = db.query(
-            AICostTracking.provider,
-            AICostTracking.model,
-            func.count(AICostTracking.id).label("usage_count")
-        ).filter(
-            AICostTracking.agent_type == row.agent_type
-        ).group_by(
-            AICostTracking.provider,
-            AICostTracking.model
-        ).order_by(
-            func.count(AICostTracking.id).desc()
-        ).first()
-
-        if provider_query:
-            primary_provider = provider_query.provider
-            primary_model = provider_query.model
-        else:
-            primary_provider = "unknown"
-            primary_model = "unknown"
+    for (agent_type, agent_mode), stats in by_agent.items():
+        # Primary provider and model (most used)
+        usage = model_usage.get(agent_type)
+        primary_provider, primary_model = max(usage, key=usage.get) if usage else ("unknown", "unknown")
 
         breakdown.append(AgentCostBreakdown(
-            agent_type=row.agent_type,
-            agent_mode=row.agent_mode,
-            total_requests=row.total_requests,
-            total_cost_usd=round(float(row.total_cost or Decimal("0.0")), 6),
-            avg_cost_per_request=round(float(row.avg_cost or Decimal("0.0")), 8),
-            avg_latency_ms=round(float(row.avg_latency or 0), 2),
+            agent_type=agent_type,
+            agent_mode=agent_mode,
+            total_requests=stats.requests,
+            total_cost_usd=round(stats.cost_usd, 6),
+            avg_cost_per_request=round(stats.avg_cost_usd, 8),
+            avg_latency_ms=round(stats.avg_latency_ms, 2),
             primary_provider=primary_provider,
             primary_model=primary_model
         ))
@@ -219,48 +180,39 @@ def _get_agent_breakdown(db: Session, filters: List) -> List[AgentCostBreakdown]
     return breakdown
 
 
-def _get_lead_breakdown(db: Session, filters: List) -> List[LeadCostBreakdown]:
+def _get_lead_breakdown(
+    db: Session,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    filters: Dict[str, Any]
+) -> List[LeadCostBreakdown]:
     """Get cost breakdown by lead."""
-    # Join with leads table to get company names
-    query = db.query(
-        AICostTracking.lead_id,
-        Lead.company_name,
-        func.count(AICostTracking.id).label("total_requests"),
-        func.sum(AICostTracking.cost_usd).label("total_cost")
-    ).join(
-        Lead, AICostTracking.lead_id == Lead.id
-    ).filter(
-        AICostTracking.lead_id.isnot(None)
-    ).group_by(
-        AICostTracking.lead_id,
-        Lead.company_name
-    )
-
-    if filters:
-        query = query.filter(and_(*filters))
-
-    results = query.all()
-
-    breakdown = []
-    for row in results:
-        # Get unique agents used for this lead
-        agents_query = db.query(
-            AICostTracking.agent_type.distinct()
-        ).filter(
-            AICostTracking.lead_id == row.lead_id
+    by_lead: Dict[int, UsageStats] = {}
+    agents_by_lead: Dict[int, set] = {}
+    for (lead_id, agent_type), stats in ai_cost_lead_usage(db, start=start, end=end, **filters).items():
+        by_lead.setdefault(lead_id, UsageStats()).merge(stats)
+        agents_by_lead.setdefault(lead_id, set()).add(agent_type)
+
+    # Company names in one query per chunk instead of one per lead
+    company_names: Dict[int, str] = {}
+    lead_ids = list(by_lead)
+    for offset in range(0, len(lead_ids), 1000):
+        chunk = lead_ids[offset:offset + 1000]
+        company_names.update(
+            db.query(Lead.id, Lead.company_name).filter(Lead.id.in_(chunk)).all()
         )
 
-        if filters:
-            agents_query = agents_query.filter(and_(*filters))
-
-        agents_used = [agent[0] for agent in agents_query.all()]
+    breakdown = []
+    for lead_id, stats in by_lead.items():
+        if lead_id not in company_names:
+            continue  # Lead deleted
 
         breakdown.append(LeadCostBreakdown(
-            lead_id=row.lead_id,
-            company_name=row.company_name,
-            total_cost_usd=round(float(row.total_cost or Decimal("0.0")), 6),
-            total_requests=row.total_requests,
-            agents_used=agents_used
+            lead_id=lead_id,
+            company_name=company_names[lead_id],
+            total_cost_usd=round(stats.cost_usd, 6),
+            total_requests=stats.requests,
+            agents_used=sorted(agents_by_lead[lead_id])
         ))
 
     # Sort by total cost descending
@@ -269,40 +221,16 @@ def _get_lead_breakdown(db: Session, filters: List) -> List[LeadCostBreakdown]:
     return breakdown
 
 
-def _get_cache_statistics(db: Session, filters: List) -> CacheStats:
+def _get_cache_statistics(totals: UsageStats) -> CacheStats:
     """Get cache hit statistics with estimated savings."""
-    # Get total requests and cache hits
-    query = db.query(
-        func.count(AICostTracking.id).label("total_requests"),
-        func.sum(case((AICostTracking.cache_hit == True, 1), else_=0)).label("cache_hits")
-    )
-
-    if filters:
-        query = query.filter(and_(*filters))
-
-    result = query.first()
-
-    total_requests = result.total_requests or 0
-    cache_hits = int(result.cache_hits or 0)
+    total_requests = totals.requests
+    cache_hits = totals.cache_hits
 
     # Calculate cache hit rate
     cache_hit_rate = cache_hits / total_requests if total_requests > 0 else 0.0
 
-    # Estimate savings: get average cost of non-cached requests
-    avg_cost_query = db.query(
-        func.avg(AICostTracking.cost_usd).label("avg_cost")
-    ).filter(
-        AICostTracking.cache_hit == False
-    )
-
-    if filters:
-        avg_cost_query = avg_cost_query.filter(and_(*filters))
-
-    avg_cost_result = avg_cost_query.first()
-    avg_cost_per_request = float(avg_cost_result.avg_cost or Decimal("0.0"))
-
-    # Estimated savings = cache_hits * avg_cost_per_request
-    estimated_savings = cache_hits * avg_cost_per_request
+    # Estimated savings = cache_hits * average cost of non-cached requests
+    estimated_savings = cache_hits * totals.avg_uncached_cost_usd
 
     return CacheStats(
         total_requests=total_requests,
@@ -312,46 +240,24 @@ def _get_cache_statistics(db: Session, filters: List) -> CacheStats:
     )
 
 
-def _get_time_series(db: Session, filters: List) -> List[TimeSeriesPoint]:
+def _get_time_series(
+    db: Session,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    filters: Dict[str, Any]
+) -> List[TimeSeriesPoint]:
     """Get daily time-series data."""
-    # Get date range for time series
     # If no date filters, use last 30 days
-    date_filter_exists = any(
-        hasattr(f, "left") and hasattr(f.left, "key") and f.left.key == "timestamp"
-        for f in filters
-    )
-
-    if not date_filter_exists:
-        # Default to last 30 days
-        start_date = datetime.utcnow() - timedelta(days=30)
-        filters.append(AICostTracking.timestamp >= start_date)
-
-    # PostgreSQL date_trunc for daily grouping
-    query = db.query(
-        func.date_trunc('day', AICostTracking.timestamp).label("date"),
-        func.sum(AICostTracking.cost_usd).label("total_cost"),
-        func.count(AICostTracking.id).label("total_requests")
-    ).group_by(
-        func.date_trunc('day', AICostTracking.timestamp)
-    ).order_by(
-        func.date_trunc('day', AICostTracking.timestamp)
-    )
-
-    if filters:
-        query = query.filter(and_(*filters))
+    if start is None and end is None:
+        start = datetime.utcnow() - timedelta(days=30)
 
-    results = query.all()
+    daily = ai_cost_usage(db, ("day",), start=start, end=end, **filters)
 
-    time_series = []
-    for row in results:
-        # Convert datetime to date string
-        date_str = row.date.date().isoformat() if row.date else None
-
-        if date_str:
-            time_series.append(TimeSeriesPoint(
-                date=date_str,
-                total_cost_usd=round(float(row.total_cost or Decimal("0.0")), 6),
-                total_requests=row.total_requests
-            ))
-
-    return time_series
+    return [
+        TimeSeriesPoint(
+            date=day.date().isoformat(),
+            total_cost_usd=round(stats.cost_usd, 6),
+            total_requests=stats.requests
+        )
+        for (day,), stats in sorted(daily.items())
+    ]
@@ -11,7 +11,8 @@ from pydantic import BaseModel, EmailStr, Field, validator
 
 from app.models.database import get_db
 from app.models.security import User, EventType
-from app.services.auth import AuthService
+from app.services.auth import AuthService, PRINCIPAL_CACHE_ENABLED
+from app.services.cache.principal_cache import get_principal_cache
 from app.middleware.audit import log_security_event
 from app.core.logging import setup_logging
 
@@ -175,7 +176,7 @@ async def login(
     auth_service = AuthService(db)
 
     # Authenticate user
-    user = auth_service.authenticate_user(request.username, request.password)
+    user = await auth_service.aauthenticate_user(request.username, request.password)
 
     if not user:
         # Log failed login attempt
@@ -325,7 +326,8 @@ async def logout(
         )
 
     # Revoke all tokens for user
-    auth_service.revoke_all_tokens(user)
+    principal_cache = await get_principal_cache() if PRINCIPAL_CACHE_ENABLED else None
+    await auth_service.arevoke_all_tokens(user, principal_cache)
 
     # Log logout event
     background_tasks.add_task(
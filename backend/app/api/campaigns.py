@@ -5,15 +5,20 @@ Provides REST API for creating, managing, and analyzing multi-channel outreach c
 with A/B testing and variant optimization.
 """
 
+import os
+
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.celery_app import celery_app
 from app.models.database import get_db
 from app.models.campaign import Campaign, CampaignMessage, CampaignStatus, CampaignChannel, MessageStatus
 from app.services.outreach import CampaignService
+from app.services.cache import CampaignAnalyticsCache, get_redis_client
 from app.core.logging import setup_logging
 from app.core.exceptions import (
     ValidationError,
@@ -25,6 +30,24 @@ logger = setup_logging(__name__)
 
 router = APIRouter(prefix="/campaigns", tags=["campaigns", "outreach"])
 
+# Largest audience generated on the request; bigger campaigns are queued
+# as a generate_campaign_messages job
+INLINE_GENERATION_MAX_LEADS = 100
+
+# Seconds a cached analytics snapshot is served (0 disables the cache)
+ANALYTICS_CACHE_TTL = int(os.getenv("CAMPAIGN_ANALYTICS_CACHE_TTL", "300"))
+
+GENERATION_JOB_STATUS = {
+    "PENDING": "queued",
+    "RECEIVED": "queued",
+    "STARTED": "running",
+    "PROGRESS": "running",
+    "RETRY": "running",
+    "SUCCESS": "completed",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
 
 # ============================================================================
 # REQUEST/RESPONSE SCHEMAS
@@ -66,6 +89,7 @@ class MessageGenerationRequest(BaseModel):
     
     custom_context: Optional[str] = Field(None, description="Override campaign context for this generation")
     force_regenerate: bool = Field(False, description="Regenerate messages even if they exist")
+    background: Optional[bool] = Field(None, description="Run as a background job (default: by audience size)")
     
     class Config:
         json_schema_extra = {
@@ -76,6 +100,18 @@ class MessageGenerationRequest(BaseModel):
         }
 
 
+class GenerationJobResponse(BaseModel):
+    """Response schema for a background message generation job."""
+    
+    job_id: str
+    campaign_id: int
+    status: str
+    lead_count: Optional[int] = None
+    progress: Optional[Dict[str, Any]] = None
+    statistics: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 class MessageStatusUpdate(BaseModel):
     """Request schema for message status update."""
     
@@ -152,7 +188,26 @@ class AnalyticsResponse(BaseModel):
 # DEPENDENCY INJECTION
 # ============================================================================
 
-def get_campaign_service(db: Session = Depends(get_db)) -> CampaignService:
+async def get_analytics_cache() -> Optional[CampaignAnalyticsCache]:
+    """
+    Dependency injection for the campaign analytics snapshot cache.
+    
+    Returns:
+        CampaignAnalyticsCache, or None when disabled or Redis is not configured
+    """
+    if ANALYTICS_CACHE_TTL <= 0:
+        return None
+    try:
+        return CampaignAnalyticsCache(await get_redis_client(), ttl=ANALYTICS_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Campaign analytics cache unavailable: {e}")
+        return None
+
+
+def get_campaign_service(
+    db: Session = Depends(get_db),
+    analytics_cache: Optional[CampaignAnalyticsCache] = Depends(get_analytics_cache)
+) -> CampaignService:
     """
     Dependency injection for campaign service.
     
@@ -163,7 +218,7 @@ def get_campaign_service(db: Session = Depends(get_db)) -> CampaignService:
         HTTPException: If service initialization fails
     """
     try:
-        return CampaignService(db)
+        return CampaignService(db, analytics_cache=analytics_cache)
     except Exception as e:
         logger.error(f"Failed to initialize campaign service: {e}")
         raise HTTPException(
@@ -236,24 +291,42 @@ async def generate_messages(
     """
     Generate personalized messages for campaign leads.
     
+    Audiences up to INLINE_GENERATION_MAX_LEADS are generated on the
+    request; larger ones (or background=true) are queued as a resumable
+    Celery job and a 202 with the job_id is returned instead. Poll
+    GET /campaigns/{campaign_id}/generation-jobs/{job_id} for progress.
+    
     Args:
         campaign_id: Campaign ID
         request: Message generation parameters
         service: Campaign service instance (injected)
     
     Returns:
-        Generation statistics
+        Generation statistics, or the queued job
     
     Raises:
         HTTPException: If generation fails
     """
     try:
-        stats = service.generate_messages(
+        lead_count = await service.aprepare_generation(
             campaign_id=campaign_id,
-            custom_context=request.custom_context,
             force_regenerate=request.force_regenerate
         )
         
+        background = request.background
+        if background is None:
+            background = lead_count > INLINE_GENERATION_MAX_LEADS
+        
+        if background:
+            return _queue_generation(campaign_id, request.custom_context, lead_count)
+        
+        stats = await service.agenerate_messages(
+            campaign_id=campaign_id,
+            custom_context=request.custom_context,
+            force_regenerate=request.force_regenerate,
+            prepared=True
+        )
+        
         logger.info(f"Messages generated for campaign {campaign_id}: {stats['messages_generated']} messages")
         
         return {
@@ -262,6 +335,9 @@ async def generate_messages(
             "statistics": stats
         }
     
+    except HTTPException:
+        raise
+    
     except ResourceNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     
@@ -276,6 +352,57 @@ async def generate_messages(
         raise HTTPException(status_code=500, detail="Message generation failed")
 
 
+@router.get(
+    "/{campaign_id}/generation-jobs/{job_id}",
+    response_model=GenerationJobResponse,
+    summary="Get message generation job status",
+    description="Progress of a background message generation job"
+)
+async def get_generation_job(campaign_id: int, job_id: str) -> GenerationJobResponse:
+    """
+    Get the status of a background message generation job.
+    
+    Running jobs report progress counters; completed jobs include the
+    final statistics of the last attempt.
+    """
+    result = celery_app.AsyncResult(job_id)
+    job_status = GENERATION_JOB_STATUS.get(result.state, "running")
+    
+    response = GenerationJobResponse(job_id=job_id, campaign_id=campaign_id, status=job_status)
+    
+    if result.state == "PROGRESS":
+        response.progress = result.info
+    elif job_status == "completed":
+        response.statistics = result.result
+    elif job_status == "failed":
+        response.error = str(result.result)
+    
+    return response
+
+
+def _queue_generation(campaign_id: int, custom_context: Optional[str], lead_count: int) -> JSONResponse:
+    """Queue a background message generation job"""
+    try:
+        task = celery_app.send_task(
+            "generate_campaign_messages",
+            args=(campaign_id, custom_context),
+            queue="workflows"
+        )
+    except Exception as e:
+        logger.error(f"Failed to queue message generation: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to queue message generation: {str(e)}")
+    
+    logger.info(f"Queued message generation {task.id} for campaign {campaign_id} ({lead_count} leads)")
+    
+    response = GenerationJobResponse(
+        job_id=task.id,
+        campaign_id=campaign_id,
+        status="queued",
+        lead_count=lead_count
+    )
+    return JSONResponse(status_code=202, content=response.model_dump(mode="json"))
+
+
 @router.get(
     "/{campaign_id}/messages",
     response_model=List[MessageResponse],
@@ -336,6 +463,9 @@ async def get_analytics(
     """
     Get comprehensive campaign analytics.
     
+    Served from a Redis snapshot when cached; every write to the campaign's
+    messages or metrics (including background generation) invalidates it.
+    
     Args:
         campaign_id: Campaign ID
         service: Campaign service instance (injected)
@@ -347,7 +477,7 @@ async def get_analytics(
         HTTPException: If analytics retrieval fails
     """
     try:
-        analytics = service.get_campaign_analytics(campaign_id)
+        analytics = await service.aget_campaign_analytics(campaign_id)
         
         return AnalyticsResponse(**analytics)
     
@@ -382,7 +512,7 @@ async def activate_campaign(
         HTTPException: If activation fails
     """
     try:
-        campaign = service.activate_campaign(campaign_id)
+        campaign = await service.aactivate_campaign(campaign_id)
         
         logger.info(f"Campaign {campaign_id} activated: {campaign.name}")
         
@@ -465,7 +595,7 @@ async def update_message_status(
         HTTPException: If update fails
     """
     try:
-        message = service.update_message_status(
+        message = await service.aupdate_message_status(
             message_id=message_id,
             status=request.status,
             variant_number=request.variant_number
@@ -15,16 +15,16 @@ import os
 import csv
 import json
 import io
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import DateTime, select, func, and_, type_coerce
 
-from app.models.database import get_db
-from app.models.unified_api_call import APICallLog, ProviderType, OperationType
-from app.services.usage_tracker import UsageTracker
+from app.models.database import get_db, get_async_db
+from app.models.unified_api_call import APICallLog
 from app.schemas.costs import (
     CostSummaryResponse,
     CostBreakdownResponse,
@@ -93,6 +93,71 @@ async def calculate_budget_status(
     return daily_util, monthly_util, status
 
 
+# strftime equivalents of DATE_TRUNC for SQLite (tests and local development)
+_SQLITE_TRUNC_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+
+
+def period_bucket(db: AsyncSession, interval: str):
+    """
+    Truncate APICallLog.created_at to the start of its hour, day or month.
+
+    Args:
+        db: Async database session (its dialect picks the SQL function)
+        interval: DATE_TRUNC unit ('hour', 'day', 'month')
+
+    Returns:
+        Column expression yielding datetimes, labeled "period"
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        bucket = type_coerce(
+            func.strftime(_SQLITE_TRUNC_FORMATS[interval], APICallLog.created_at), DateTime()
+        )
+    else:
+        bucket = func.date_trunc(interval, APICallLog.created_at)
+    return bucket.label("period")
+
+
+async def fetch_period_aggregates(
+    db: AsyncSession,
+    start_date: datetime,
+    end_date: datetime,
+    interval: str
+) -> list:
+    """
+    Aggregate APICallLog rows into time buckets in a single query.
+
+    Args:
+        db: Async database session
+        start_date: Start of date range
+        end_date: End of date range
+        interval: DATE_TRUNC unit ('hour', 'day', 'month')
+
+    Returns:
+        Rows of (period, total_requests, total_cost, avg_latency), oldest first
+    """
+    if interval not in ("hour", "day", "month"):
+        raise ValueError("interval must be 'hour', 'day', or 'month'")
+
+    period = period_bucket(db, interval)
+    stmt = select(
+        period,
+        func.count(APICallLog.id).label("total_requests"),
+        func.sum(APICallLog.cost_usd).label("total_cost"),
+        func.avg(APICallLog.latency_ms).label("avg_latency"),
+    ).where(
+        and_(
+            APICallLog.created_at >= start_date,
+            APICallLog.created_at <= end_date
+        )
+    ).group_by(period).order_by(period)
+
+    return (await db.execute(stmt)).all()
+
+
 # ============================================================================
 # COST SUMMARY ENDPOINT
 # ============================================================================
@@ -100,7 +165,7 @@ async def calculate_budget_status(
 @router.get("/summary", response_model=CostSummaryResponse)
 async def get_cost_summary(
     days: int = Query(7, ge=1, le=90, description="Number of days to include in summary"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> CostSummaryResponse:
     """
     Get cost summary for the last N days with provider breakdown.
@@ -118,56 +183,50 @@ async def get_cost_summary(
         start_date = datetime.utcnow() - timedelta(days=days)
         end_date = datetime.utcnow()
 
-        tracker = UsageTracker(db=db, redis_client=None)
-
-        # Get provider breakdown
-        provider_costs = tracker.get_cost_by_provider(start_date, end_date)
+        # Provider cost and request counts in one grouped query
+        provider_rows = (await db.execute(
+            select(
+                APICallLog.provider,
+                func.sum(APICallLog.cost_usd).label("total_cost"),
+                func.count(APICallLog.id).label("total_requests")
+            ).where(
+                and_(
+                    APICallLog.created_at >= start_date,
+                    APICallLog.created_at <= end_date
+                )
+            ).group_by(APICallLog.provider)
+        )).all()
 
         # Calculate totals
-        total_cost = sum(provider_costs.values())
-        total_requests = db.query(func.count(APICallLog.id)).filter(
-            and_(
-                APICallLog.created_at >= start_date,
-                APICallLog.created_at <= end_date
-            )
-        ).scalar() or 0
+        total_cost = sum(float(row.total_cost or 0.0) for row in provider_rows)
+        total_requests = sum(row.total_requests for row in provider_rows)
 
         avg_cost_per_request = (total_cost / total_requests) if total_requests > 0 else 0.0
 
         # Build provider breakdown with percentages
         provider_breakdown = [
             ProviderCostBreakdown(
-                provider=provider,
-                total_cost_usd=cost,
-                total_requests=db.query(func.count(APICallLog.id)).filter(
-                    and_(
-                        APICallLog.provider == ProviderType(provider),
-                        APICallLog.created_at >= start_date,
-                        APICallLog.created_at <= end_date
-                    )
-                ).scalar() or 0,
-                percentage=round((cost / total_cost * 100) if total_cost > 0 else 0.0, 2)
+                provider=row.provider.value,
+                total_cost_usd=float(row.total_cost or 0.0),
+                total_requests=row.total_requests,
+                percentage=round((float(row.total_cost or 0.0) / total_cost * 100) if total_cost > 0 else 0.0, 2)
             )
-            for provider, cost in provider_costs.items()
+            for row in provider_rows
         ]
 
         # Sort by cost descending
         provider_breakdown.sort(key=lambda x: x.total_cost_usd, reverse=True)
 
         # Get daily cost trend
-        daily_aggregates = tracker.get_aggregates(
-            start_date=start_date,
-            end_date=end_date,
-            interval="day"
-        )
+        daily_aggregates = await fetch_period_aggregates(db, start_date, end_date, "day")
 
         cost_trend = [
             CostTrendPoint(
-                date=point["period"].split("T")[0],
-                cost_usd=point["total_cost_usd"],
-                requests=point["total_requests"]
+                date=row.period.date().isoformat(),
+                cost_usd=float(row.total_cost or 0.0),
+                requests=row.total_requests
             )
-            for point in daily_aggregates
+            for row in daily_aggregates
         ]
 
         logger.info(f"Cost summary generated: {days} days, ${total_cost:.6f}, {total_requests} requests")
@@ -195,7 +254,7 @@ async def get_cost_breakdown(
     group_by: str = Query("provider", regex="^(provider|model|operation)$"),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> CostBreakdownResponse:
     """
     Get cost breakdown grouped by provider, model, or operation.
@@ -226,16 +285,18 @@ async def get_cost_breakdown(
             group_field = APICallLog.operation_type
 
         # Aggregate query
-        results = db.query(
-            group_field.label("group_name"),
-            func.sum(APICallLog.cost_usd).label("total_cost"),
-            func.count(APICallLog.id).label("total_requests")
-        ).filter(
-            and_(
-                APICallLog.created_at >= start_date,
-                APICallLog.created_at <= end_date
-            )
-        ).group_by(group_field).all()
+        results = (await db.execute(
+            select(
+                group_field.label("group_name"),
+                func.sum(APICallLog.cost_usd).label("total_cost"),
+                func.count(APICallLog.id).label("total_requests")
+            ).where(
+                and_(
+                    APICallLog.created_at >= start_date,
+                    APICallLog.created_at <= end_date
+                )
+            ).group_by(group_field)
+        )).all()
 
         # Calculate totals
         total_cost = sum(row.total_cost or 0.0 for row in results)
@@ -278,7 +339,7 @@ async def get_usage_timeseries(
     start_date: datetime = Query(..., description="Start date for time series"),
     end_date: datetime = Query(..., description="End date for time series"),
     interval: str = Query("daily", regex="^(hourly|daily|monthly)$"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> UsageTimeseriesResponse:
     """
     Get time-series usage data for chart visualization.
@@ -295,45 +356,42 @@ async def get_usage_timeseries(
     - interval: Time interval (hourly, daily, monthly)
     """
     try:
-        tracker = UsageTracker(db=db, redis_client=None)
-
-        # Map interval to tracker format
+        # Map interval to DATE_TRUNC unit
         interval_map = {"hourly": "hour", "daily": "day", "monthly": "month"}
-        tracker_interval = interval_map[interval]
+        trunc_interval = interval_map[interval]
 
         # Get aggregates for all providers combined
-        aggregates = tracker.get_aggregates(
-            start_date=start_date,
-            end_date=end_date,
-            interval=tracker_interval
-        )
-
-        # Get provider-specific costs for each time period
-        data_points = []
-        for aggregate in aggregates:
-            period_start = datetime.fromisoformat(aggregate["period"])
-
-            # Calculate period end based on interval
-            if tracker_interval == "hour":
-                period_end = period_start + timedelta(hours=1)
-            elif tracker_interval == "day":
-                period_end = period_start + timedelta(days=1)
-            else:  # month
-                # Approximate month end
-                period_end = period_start + timedelta(days=30)
-
-            # Get provider costs for this period
-            provider_costs_dict = tracker.get_cost_by_provider(period_start, period_end)
-
-            data_points.append(
-                UsageTimeSeriesPoint(
-                    timestamp=aggregate["period"],
-                    total_cost_usd=aggregate["total_cost_usd"],
-                    total_requests=aggregate["total_requests"],
-                    avg_latency_ms=aggregate["avg_latency_ms"],
-                    provider_costs=provider_costs_dict
+        aggregates = await fetch_period_aggregates(db, start_date, end_date, trunc_interval)
+
+        # Provider costs for every period in one grouped query (instead of one per period)
+        period = period_bucket(db, trunc_interval)
+        provider_rows = (await db.execute(
+            select(
+                period,
+                APICallLog.provider,
+                func.sum(APICallLog.cost_usd).label("total_cost")
+            ).where(
+                and_(
+                    APICallLog.created_at >= start_date,
+                    APICallLog.created_at <= end_date
                 )
+            ).group_by(period, APICallLog.provider)
+        )).all()
+
+        provider_costs_by_period: dict = {}
+        for row in provider_rows:
+            provider_costs_by_period.setdefault(row.period, {})[row.provider.value] = float(row.total_cost or 0.0)
+
+        data_points = [
+            UsageTimeSeriesPoint(
+                timestamp=row.period.isoformat(),
+                total_cost_usd=float(row.total_cost or 0.0),
+                total_requests=row.total_requests,
+                avg_latency_ms=int(row.avg_latency or 0),
+                provider_costs=provider_costs_by_period.get(row.period, {})
             )
+            for row in aggregates
+        ]
 
         logger.info(f"Usage time series generated: {len(data_points)} data points, interval={interval}")
 
@@ -355,7 +413,7 @@ async def get_usage_timeseries(
 
 @router.get("/budget/status", response_model=BudgetStatusResponse)
 async def get_budget_status(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> BudgetStatusResponse:
     """
     Get current budget utilization status.
@@ -379,23 +437,25 @@ async def get_budget_status(
         today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
         today_end = datetime.utcnow()
 
-        daily_spend = db.query(func.sum(APICallLog.cost_usd)).filter(
-            and_(
-                APICallLog.created_at >= today_start,
-                APICallLog.created_at <= today_end
-            )
-        ).scalar() or 0.0
-
         # Calculate month-to-date spend
         month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        month_end = datetime.utcnow()
-
-        monthly_spend = db.query(func.sum(APICallLog.cost_usd)).filter(
-            and_(
-                APICallLog.created_at >= month_start,
-                APICallLog.created_at <= month_end
+        month_end = today_end
+
+        # Both sums in one round trip: today's rows are a subset of the month's
+        spend_row = (await db.execute(
+            select(
+                func.sum(APICallLog.cost_usd).filter(APICallLog.created_at >= today_start).label("daily"),
+                func.sum(APICallLog.cost_usd).label("monthly")
+            ).where(
+                and_(
+                    APICallLog.created_at >= month_start,
+                    APICallLog.created_at <= month_end
+                )
             )
-        ).scalar() or 0.0
+        )).one()
+
+        daily_spend = float(spend_row.daily or 0.0)
+        monthly_spend = float(spend_row.monthly or 0.0)
 
         # Calculate utilization and status
         daily_util, monthly_util, threshold_status = await calculate_budget_status(
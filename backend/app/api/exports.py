@@ -7,24 +7,45 @@ Integrates with QueryBuilder, PDFExporter, and ExcelExporter services.
 
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from datetime import datetime
-import csv
-import io
 import logging
 
+from app.celery_app import celery_app
 from app.models.database import get_db
 from app.models.report_template import ReportTemplate
 from app.services.analytics.query_builder import QueryBuilder, QueryValidationError
-from app.services.exports.pdf_exporter import PDFExporter
-from app.services.exports.excel_exporter import ExcelExporter
+from app.services.exports.streaming import EXPORT_FORMATS, export_filename, iter_export
+from app.services.runpod_storage import RunPodStorageService
 
 
 router = APIRouter(prefix="/exports", tags=["Exports"])
 logger = logging.getLogger(__name__)
 
+# Largest result streamed back on the request; bigger exports run as a
+# background job. PDF rendering is far slower per row than CSV/XLSX.
+INLINE_EXPORT_MAX_ROWS = {
+    "csv": 500_000,
+    "xlsx": 100_000,
+    "pdf": 10_000,
+}
+
+EXPORT_JOB_STATUS = {
+    "PENDING": "queued",
+    "RECEIVED": "queued",
+    "STARTED": "running",
+    "RETRY": "running",
+    "SUCCESS": "completed",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
+DOWNLOAD_URL_EXPIRATION = 3600
+
+EXPORT_TASK_NAME = "generate_report_export"
+
 
 # ============================================================================
 # Pydantic Schemas
@@ -37,6 +58,7 @@ class ExportRequest(BaseModel):
     format: str = Field(..., pattern="^(csv|pdf|xlsx)$")
     title: Optional[str] = "Analytics Report"
     include_summary: bool = True
+    background: Optional[bool] = None  # None = decide by row count
 
 
 class ExportResponse(BaseModel):
@@ -44,7 +66,10 @@ class ExportResponse(BaseModel):
     export_id: str
     status: str
     download_url: Optional[str] = None
-    created_at: datetime
+    filename: Optional[str] = None
+    row_count: Optional[int] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
 
 
 # ============================================================================
@@ -68,7 +93,11 @@ async def export_report(
     2. Query Config - Custom query configuration
     3. Both - Template with query overrides
 
-    Returns a streaming response with the file download.
+    Rows are read through a server-side cursor and written as they arrive.
+    Results up to INLINE_EXPORT_MAX_ROWS are streamed back as a file
+    download; larger ones (or background=true) are queued as a Celery
+    export job and a 202 with the export_id is returned instead. Poll
+    GET /exports/jobs/{export_id} for the download link.
     """
     # Determine data source
     if request.template_id:
@@ -103,17 +132,18 @@ async def export_report(
             detail="Must provide either template_id or query_config"
         )
 
-    # Execute query
+    # Validate and size the query
     try:
-        query_builder = QueryBuilder(db)
-        result = query_builder.build_and_execute(query_config)
+        row_count = QueryBuilder(db).count_rows(query_config)
 
-        if not result.data:
+        if not row_count:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No data found for the specified query"
             )
 
+    except HTTPException:
+        raise
     except QueryValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -126,26 +156,14 @@ async def export_report(
             detail=f"Query execution failed: {str(e)}"
         )
 
-    # Generate export based on format
-    try:
-        if request.format == "csv":
-            return _export_csv(result.data, result.columns, title)
-        elif request.format == "pdf":
-            return _export_pdf(result.data, result.columns, title)
-        elif request.format == "xlsx":
-            return _export_excel(result.data, result.columns, title, request.include_summary)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported format: {request.format}"
-            )
+    background = request.background
+    if background is None:
+        background = row_count > INLINE_EXPORT_MAX_ROWS[request.format]
 
-    except Exception as e:
-        logger.error(f"Export generation failed: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Export generation failed: {str(e)}"
-        )
+    if background:
+        return _queue_export(query_config, request.format, title, request.include_summary, row_count)
+
+    return _stream_export(db, query_config, request.format, title, request.include_summary)
 
 
 @router.post(
@@ -172,90 +190,119 @@ async def export_from_template(
     return await export_report(request, db)
 
 
-# ============================================================================
-# Helper Functions for Export Generation
-# ============================================================================
+@router.get(
+    "/jobs/{export_id}",
+    response_model=ExportResponse,
+    summary="Get background export status",
+    description="Status of a queued export, with a download link once completed"
+)
+async def get_export_job(export_id: str):
+    """
+    Get the status of a background export job.
 
-def _export_csv(data: list, columns: list, title: str) -> StreamingResponse:
-    """Generate CSV export as streaming response"""
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=columns)
-
-    # Write header
-    writer.writeheader()
-
-    # Write data rows
-    for row in data:
-        # Filter row to only include requested columns
-        filtered_row = {col: row.get(col, '') for col in columns}
-        writer.writerow(filtered_row)
-
-    # Convert to bytes
-    output.seek(0)
-    response = StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv"
-    )
+    Completed jobs include a time-limited presigned download URL.
+    """
+    result = celery_app.AsyncResult(export_id)
 
-    # Set filename
-    filename = f"{title.replace(' ', '_')}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    # result_extended records the task name once a job starts; other
+    # Celery task ids are not exports
+    if result.name is not None and result.name != EXPORT_TASK_NAME:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export not found: {export_id}"
+        )
 
-    return response
+    job_status = EXPORT_JOB_STATUS.get(result.state, "running")
 
+    response = ExportResponse(export_id=export_id, status=job_status, created_at=result.date_done)
 
-def _export_pdf(data: list, columns: list, title: str) -> StreamingResponse:
-    """Generate PDF export as streaming response"""
-    exporter = PDFExporter(title=title, orientation="landscape")
+    if job_status == "completed":
+        export = result.result
+        if not isinstance(export, dict) or "object_name" not in export:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Export not found: {export_id}"
+            )
+        try:
+            response.download_url = RunPodStorageService().generate_presigned_url(
+                export["object_name"], expiration=DOWNLOAD_URL_EXPIRATION
+            )
+        except Exception as e:
+            logger.error(f"Failed to create download link for export {export_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create download link: {str(e)}"
+            )
+        response.filename = export.get("filename")
+        response.row_count = export.get("row_count")
+    elif job_status == "failed":
+        response.error = str(result.result)
 
-    subtitle = f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}"
-    buffer = exporter.export_data_table(data, columns, subtitle=subtitle)
+    return response
 
-    response = StreamingResponse(
-        iter([buffer.getvalue()]),
-        media_type="application/pdf"
-    )
 
-    filename = f"{title.replace(' ', '_')}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+# ============================================================================
+# Helper Functions for Export Generation
+# ============================================================================
+
+def _stream_export(
+    db: Session,
+    query_config: dict,
+    format: str,
+    title: str,
+    include_summary: bool = True
+) -> StreamingResponse:
+    """Stream an export as the response body, reading rows batch by batch"""
+
+    def body():
+        # The request session is closed once the endpoint returns, before
+        # the body is sent; the cursor needs a session of its own.
+        stream_db = Session(bind=db.get_bind())
+        try:
+            stream = QueryBuilder(stream_db).build_and_stream(query_config)
+            yield from iter_export(format, stream.columns, stream.batches, title, include_summary)
+        except Exception as e:
+            logger.error(f"Export generation failed: {e}")
+            raise
+        finally:
+            stream_db.close()
+
+    response = StreamingResponse(body(), media_type=EXPORT_FORMATS[format]["media_type"])
+    response.headers["Content-Disposition"] = f"attachment; filename={export_filename(title, format)}"
 
     return response
 
 
-def _export_excel(data: list, columns: list, title: str, include_summary: bool = True) -> StreamingResponse:
-    """Generate Excel export as streaming response"""
-    exporter = ExcelExporter(title=title)
-
-    # Add summary sheet if requested
-    if include_summary:
-        exporter.add_summary_sheet({
-            "Report Title": title,
-            "Generated": datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC'),
-            "Total Records": len(data),
-            "Columns": len(columns)
-        })
-
-    # Add data sheet
-    exporter.add_data_sheet(
-        sheet_name="Data",
-        data=data,
-        columns=columns,
-        add_table=True,
-        add_summary_row=True,
-        freeze_header=True
-    )
+def _queue_export(
+    query_config: dict,
+    format: str,
+    title: str,
+    include_summary: bool,
+    row_count: int
+) -> JSONResponse:
+    """Queue a background export job"""
+    try:
+        task = celery_app.send_task(
+            EXPORT_TASK_NAME,
+            args=(query_config, format, title, include_summary),
+            queue="workflows"
+        )
+    except Exception as e:
+        logger.error(f"Failed to queue export: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue export: {str(e)}"
+        )
 
-    buffer = exporter.export()
+    logger.info(f"Queued {format} export {task.id} ({row_count} rows)")
 
-    response = StreamingResponse(
-        iter([buffer.getvalue()]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    response = ExportResponse(
+        export_id=task.id,
+        status="queued",
+        row_count=row_count,
+        created_at=datetime.utcnow()
     )
-
-    filename = f"{title.replace(' ', '_')}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
-
-    return response
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=response.model_dump(mode="json"))
 
 
 @router.get(
@@ -15,6 +15,8 @@ from pydantic import BaseModel, Field
 from app.models.database import get_db
 from app.models.security import User, UserConsent, ConsentType, EventType
 from app.dependencies.auth import get_current_user
+from app.services.auth import AuthService, PRINCIPAL_CACHE_ENABLED
+from app.services.cache.principal_cache import get_principal_cache
 from app.middleware.audit import log_security_event
 from app.core.logging import setup_logging
 
@@ -487,13 +489,14 @@ async def _anonymize_user_data(user_id: int, db_url: str, reason: Optional[str]
             user.full_name = "DELETED"
             user.phone = None
             user.hashed_password = "DELETED"  # Makes account unrecoverable
-            user.is_active = False
             user.last_login_ip = None
 
             # Clear all consent records
             db.query(UserConsent).filter(UserConsent.user_id == user_id).delete()
 
-            db.commit()
+            # Deactivate and revoke tokens/cached principal (commits the changes above)
+            principal_cache = await get_principal_cache() if PRINCIPAL_CACHE_ENABLED else None
+            await AuthService(db).adeactivate_user(user, principal_cache)
             logger.info(f"User data anonymized for user_id={user_id}, reason={reason}")
 
     except Exception as e:
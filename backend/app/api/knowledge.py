@@ -117,7 +117,8 @@ async def search_documents(
             query_text=request.query,
             customer_id=customer_id,
             limit=request.limit,
-            similarity_threshold=request.similarity_threshold
+            similarity_threshold=request.similarity_threshold,
+            db=db
         )
         
         logger.info(f"Found {len(results)} similar documents")
@@ -22,6 +22,7 @@ Architecture:
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, AsyncGenerator
 import json
@@ -30,7 +31,7 @@ import time
 import uuid
 from datetime import datetime
 
-from app.models.database import get_db
+from app.models.database import get_db, get_async_db
 from app.models.langgraph_models import LangGraphExecution, LangGraphCheckpoint, LangGraphToolCall
 from app.services.langgraph import (
     get_redis_checkpointer,
@@ -132,7 +133,7 @@ async def get_or_create_thread_id(
 @router.post("/invoke", response_model=AgentResponse, status_code=200)
 async def invoke_agent(
     request: InvokeAgentRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Invoke a LangGraph agent and return the complete response.
@@ -219,8 +220,7 @@ async def invoke_agent(
             graph_type="chain" if request.agent_type in ["qualification", "enrichment"] else "graph"
         )
         db.add(execution)
-        db.commit()
-        db.refresh(execution)
+        await db.commit()
         
         try:
             # Invoke appropriate agent
@@ -360,7 +360,7 @@ async def invoke_agent(
             execution.cost_usd = getattr(result, 'cost_usd', 0.0)
             execution.tokens_used = getattr(result, 'tokens_used', 0)
             
-            db.commit()
+            await db.commit()
             
             # Prepare response
             response_data = AgentResponse(
@@ -391,7 +391,7 @@ async def invoke_agent(
             execution.duration_ms = duration_ms
             execution.error_message = str(e)
             
-            db.commit()
+            await db.commit()
             
             logger.error(f"❌ {request.agent_type} agent failed: {str(e)}", exc_info=True)
             
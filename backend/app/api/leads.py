@@ -2,15 +2,19 @@
 Lead qualification API endpoints
 """
 from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
 
-from app.models import Lead, CerebrasAPICall, get_db
+from app.models import Lead, CerebrasAPICall, get_db, get_async_db
 from app.schemas import LeadQualificationRequest, LeadQualificationResponse, LeadListResponse, LeadImportResponse
 from app.services import CerebrasService, LeadScorer, SignalData
 from app.services.csv_importer import CSVImportService
 from app.services.cache_manager import CacheManager
+from app.services.telemetry_sink import record_telemetry
 from app.core.cache import get_cache
 from app.core.logging import setup_logging
 from app.core.exceptions import (
@@ -49,15 +53,16 @@ except Exception as e:
 @router.post("/qualify", response_model=LeadQualificationResponse, status_code=201)
 async def qualify_lead(
     request: LeadQualificationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     cache: CacheManager = Depends(get_cache)
 ):
     """
     Qualify a new lead using hybrid AI + rule-based scoring
 
     This endpoint implements:
-    1. Check Redis cache for existing qualification (< 10ms)
-    2. On cache miss: Call Cerebras API (~945ms) for AI insights
+    1. Check in-process and Redis cache for existing qualification (< 10ms)
+    2. On cache miss: Call Cerebras API (~945ms) for AI insights; concurrent
+       requests for the same company share the one in-flight call
     3. Apply multi-factor rule-based scoring (company size, industry, signals)
     4. Combine AI and rule-based scores with weighted average
     5. Cache the result with 24h TTL
@@ -66,28 +71,15 @@ async def qualify_lead(
     Returns the qualified lead with hybrid score, reasoning, and recommendations.
     """
 
-    # Check cache first (cache-aside pattern)
+    # Check cache first (cache-aside pattern, L1 in-process then Redis).
+    # Concurrent misses for the same company share one Cerebras call.
     logger.info(f"Qualifying lead: company={request.company_name}, industry={request.industry}")
-    cached_result = await cache.get_cached_qualification(
-        company_name=request.company_name,
-        industry=request.industry
-    )
-    
-    cache_hit = False
-    ai_score = 50.0  # Default if AI fails
-    ai_reasoning = ""
-
-    if cached_result:
-        # Cache hit - use cached AI qualification
-        ai_score = cached_result["score"]
-        ai_reasoning = cached_result["reasoning"]
-        latency_ms = cached_result.get("latency_ms", 0)
-        cache_hit = True
-        logger.info(f"Cache HIT for {request.company_name} - returning cached qualification")
-    else:
-        # Cache miss - call Cerebras API
+
+    async def qualify_with_cerebras() -> dict:
+        # Cache miss - call Cerebras API (sync SDK, keep it off the event loop)
         logger.info(f"Cache MISS for {request.company_name} - calling Cerebras API")
-        ai_score, ai_reasoning, latency_ms = cerebras_service.qualify_lead(
+        score, reasoning, latency = await run_in_threadpool(
+            cerebras_service.qualify_lead,
             company_name=request.company_name,
             company_website=request.company_website,
             company_size=request.company_size,
@@ -96,19 +88,27 @@ async def qualify_lead(
             contact_title=request.contact_title,
             notes=request.notes
         )
-        logger.info(f"AI qualification: company={request.company_name}, score={ai_score}, latency={latency_ms}ms")
+        logger.info(f"AI qualification: company={request.company_name}, score={score}, latency={latency}ms")
+        return {
+            "score": score,
+            "reasoning": reasoning,
+            "latency_ms": latency,
+            "model": cerebras_service.default_model if cerebras_service else "default"
+        }
 
-        # Cache the AI result for future requests
-        await cache.cache_qualification(
-            company_name=request.company_name,
-            industry=request.industry,
-            qualification_data={
-                "score": ai_score,
-                "reasoning": ai_reasoning,
-                "latency_ms": latency_ms,
-                "model": cerebras_service.default_model if cerebras_service else "default"
-            }
-        )
+    qualification, cache_source = await cache.get_or_compute_qualification(
+        company_name=request.company_name,
+        industry=request.industry,
+        compute=qualify_with_cerebras
+    )
+
+    ai_score = qualification["score"]
+    ai_reasoning = qualification["reasoning"]
+    latency_ms = qualification.get("latency_ms", 0)
+    # Only the request that actually called Cerebras records the API call
+    cache_hit = cache_source != "computed"
+    if cache_hit:
+        logger.info(f"Cache {cache_source} for {request.company_name} - returning cached qualification")
 
     # Apply rule-based scoring for multi-factor analysis
     lead_data = {
@@ -174,7 +174,7 @@ async def qualify_lead(
 
         cost_info = cerebras_service.calculate_cost(prompt_est, completion_est) if cerebras_service else {"cost": 0.0, "estimated_cost_usd": 0.0}
 
-        api_call = CerebrasAPICall(
+        record_telemetry(db, CerebrasAPICall, dict(
             endpoint="/chat/completions",
             model=cerebras_service.default_model if cerebras_service else "default",
             prompt_tokens=prompt_est,
@@ -186,19 +186,11 @@ async def qualify_lead(
             input_cost_usd=cost_info["input_cost_usd"],
             output_cost_usd=cost_info["output_cost_usd"],
             operation_type="lead_qualification_hybrid",
-            success=True,
-            metadata={
-                "final_score": round(final_score, 1),
-                "ai_score": round(ai_score, 1),
-                "rule_score": round(scoring_result.score, 1),
-                "tier": tier
-            }
-        )
-
-        db.add(api_call)
+            success=True
+        ))
     
-    db.commit()
-    db.refresh(lead)
+    await db.commit()
+    await db.refresh(lead)
 
     return lead
 
@@ -206,7 +198,7 @@ async def qualify_lead(
 @router.post("/qualify-lcel", response_model=LeadQualificationResponse, status_code=201)
 async def qualify_lead_lcel(
     request: LeadQualificationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Qualify a lead using LangChain LCEL chain with Cerebras + cost tracking (Phase 2.1)
@@ -293,7 +285,7 @@ async def qualify_lead_lcel(
         db.add(lead)
 
         # Track API call
-        api_call = CerebrasAPICall(
+        record_telemetry(db, CerebrasAPICall, dict(
             endpoint="/chat/completions",
             model=metadata["model"],
             prompt_tokens=metadata.get("estimated_tokens", 250) // 2,
@@ -305,18 +297,10 @@ async def qualify_lead_lcel(
             input_cost_usd=metadata.get("estimated_cost_usd", 0.000025) * 0.5,
             output_cost_usd=metadata.get("estimated_cost_usd", 0.000025) * 0.5,
             operation_type="lead_qualification_lcel",
-            success=True,
-            metadata={
-                "score": round(result.qualification_score, 1),
-                "tier": result.tier,
-                "lcel_chain": True,
-                "temperature": metadata["temperature"]
-            }
-        )
-
-        db.add(api_call)
-        db.commit()
-        db.refresh(lead)
+            success=True
+        ))
+        await db.commit()
+        await db.refresh(lead)
 
         logger.info(
             f"LCEL qualification complete: company={request.company_name}, "
@@ -328,7 +312,7 @@ async def qualify_lead_lcel(
 
     except Exception as e:
         logger.error(f"LCEL qualification failed: company={request.company_name}, error={str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise
 
 
@@ -336,25 +320,27 @@ async def qualify_lead_lcel(
 async def list_leads(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all leads with pagination
 
     Returns a list of leads ordered by creation date (newest first).
     """
-    leads = db.query(Lead).order_by(Lead.created_at.desc()).offset(skip).limit(limit).all()
-    return leads
+    result = await db.execute(
+        select(Lead).order_by(Lead.created_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.get("/{lead_id}", response_model=LeadQualificationResponse)
-async def get_lead(lead_id: int, db: Session = Depends(get_db)):
+async def get_lead(lead_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get a specific lead by ID
 
     Returns full lead details including qualification score and reasoning.
     """
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = await db.get(Lead, lead_id)
     if not lead:
         raise LeadNotFoundError(lead_id=lead_id)
     return lead
@@ -448,3 +434,65 @@ async def import_leads_from_csv(
         leads_per_second=result["leads_per_second"],
         errors=errors
     )
+
+
+@router.post("/import/csv/stream", response_model=LeadImportResponse)
+async def stream_import_leads_from_csv(
+    file: UploadFile = File(...),
+    strict_mode: bool = False,
+    commit_interval: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Streaming bulk import for large CSV files (constant memory)
+
+    Unlike `/import/csv`, the upload is never loaded into memory: it is read in
+    64KB chunks, validated row by row and written through a single PostgreSQL
+    `COPY ... FROM STDIN` session. Use this for large dealer exports (500k+ rows).
+
+    **Query Parameters**:
+    - strict_mode (bool): If True, fail on first validation error
+    - commit_interval (int): Rows per commit (default: 50,000). Rows committed
+      before a later failure stay imported.
+
+    Accepts the same columns as `/import/csv`. Only the first 100 validation
+    errors are returned; `failed_count` includes all of them.
+    """
+    if not file.filename.endswith('.csv'):
+        raise InvalidFileFormatError(
+            message="File must be a CSV file (.csv extension)",
+            context={"filename": file.filename}
+        )
+
+    file_size_mb = (file.size or 0) / (1024 * 1024)
+    if file_size_mb > csv_importer.STREAM_MAX_FILE_SIZE_MB:
+        raise FileSizeExceededError(
+            message=f"File size ({file_size_mb:.2f}MB) exceeds maximum allowed ({csv_importer.STREAM_MAX_FILE_SIZE_MB}MB)",
+            context={"filename": file.filename, "size_mb": file_size_mb, "max_size_mb": csv_importer.STREAM_MAX_FILE_SIZE_MB}
+        )
+
+    def log_progress(progress: dict) -> None:
+        logger.info(f"CSV stream import progress: {file.filename} - {progress}")
+
+    logger.info(f"Starting streaming CSV import: {file.filename} ({file_size_mb:.2f}MB, strict_mode={strict_mode})")
+
+    # COPY and file reads are blocking - keep them off the event loop
+    result = await run_in_threadpool(
+        csv_importer.stream_import_leads,
+        db,
+        file.file,
+        strict_mode=strict_mode,
+        commit_interval=commit_interval,
+        progress_callback=log_progress
+    )
+
+    return LeadImportResponse(
+        message="Leads imported successfully",
+        filename=file.filename,
+        total_leads=result["total_leads"],
+        imported_count=result["imported_count"],
+        failed_count=result["failed_count"],
+        duration_ms=result["duration_ms"],
+        leads_per_second=result["leads_per_second"],
+        errors=result["errors"]
+    )
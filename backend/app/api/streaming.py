@@ -4,7 +4,7 @@ WebSocket streaming API endpoints
 Provides real-time agent streaming via WebSocket connections with Redis pub/sub.
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Set
 import redis.asyncio as redis
 import asyncio
@@ -12,7 +12,7 @@ import json
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from app.models import get_db, AgentWorkflow, Lead
+from app.models import get_async_db, AsyncSessionLocal, AgentWorkflow, Lead
 from app.services.claude_streaming import ClaudeStreamingService
 from app.core.logging import setup_logging
 
@@ -92,7 +92,7 @@ claude_service = ClaudeStreamingService()
 async def start_agent_stream(
     lead_id: int,
     agent_type: str = "qualification",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Start a streaming agent workflow
@@ -108,7 +108,7 @@ async def start_agent_stream(
     """
     
     # Verify lead exists
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = await db.get(Lead, lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail=f"Lead {lead_id} not found")
     
@@ -124,14 +124,15 @@ async def start_agent_stream(
     )
     
     db.add(workflow)
-    db.commit()
+    await db.commit()
     
     # Generate stream ID (use workflow ID for simplicity)
     stream_id = str(workflow_id)
     
-    # Start background streaming task
+    # Start background streaming task (opens its own session - the request
+    # session is closed as soon as this handler returns)
     asyncio.create_task(
-        stream_agent_workflow(stream_id, lead_id, agent_type, db)
+        stream_agent_workflow(stream_id, lead_id, agent_type)
     )
     
     logger.info(f"Started stream {stream_id} for lead {lead_id}")
@@ -147,8 +148,7 @@ async def start_agent_stream(
 async def stream_agent_workflow(
     stream_id: str,
     lead_id: int,
-    agent_type: str,
-    db: Session
+    agent_type: str
 ):
     """
     Background task to stream agent responses via Redis
@@ -157,12 +157,12 @@ async def stream_agent_workflow(
         stream_id: Stream identifier
         lead_id: Lead being processed
         agent_type: Agent workflow type
-        db: Database session
     """
     
     try:
         # Get lead data
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
+        async with AsyncSessionLocal() as db:
+            lead = await db.get(Lead, lead_id)
         if not lead:
             await publish_error(stream_id, f"Lead {lead_id} not found")
             return
@@ -312,7 +312,7 @@ async def websocket_stream_endpoint(websocket: WebSocket, stream_id: str):
 
 
 @router.get("/status/{stream_id}")
-async def get_stream_status(stream_id: str, db: Session = Depends(get_db)):
+async def get_stream_status(stream_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get status of a streaming workflow
     
@@ -328,7 +328,7 @@ async def get_stream_status(stream_id: str, db: Session = Depends(get_db)):
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid stream_id format")
     
-    workflow = db.query(AgentWorkflow).filter(AgentWorkflow.id == workflow_uuid).first()
+    workflow = await db.get(AgentWorkflow, workflow_uuid)
     
     if not workflow:
         raise HTTPException(status_code=404, detail=f"Stream {stream_id} not found")
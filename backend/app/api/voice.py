@@ -151,12 +151,13 @@ async def websocket_voice_endpoint(websocket: WebSocket, session_id: str):
         "type": "audio",
         "data": "base64_encoded_audio",
         "sample_rate": 16000,
-        "format": "pcm"  // or "wav"
+        "format": "pcm",  // or "wav"
+        "streaming": true  // optional: pipeline LLM tokens into TTS
     }
 
     Message format (server -> client):
     {
-        "type": "state" | "transcript" | "response" | "audio" | "complete" | "error",
+        "type": "state" | "transcript" | "response_chunk" | "response" | "audio" | "complete" | "error",
         ... additional fields based on type
     }
     """
@@ -214,9 +215,13 @@ async def websocket_voice_endpoint(websocket: WebSocket, session_id: str):
                     continue
 
                 sample_rate = message.get("sample_rate", 16000)
+                process_turn = (
+                    agent.process_audio_turn_streaming if message.get("streaming")
+                    else agent.process_audio_turn
+                )
 
                 # Process voice turn and stream response
-                async for chunk in agent.process_audio_turn(
+                async for chunk in process_turn(
                     session_id=session_id,
                     audio_data=audio_data,
                     sample_rate=sample_rate
@@ -278,7 +283,8 @@ async def websocket_voice_endpoint(websocket: WebSocket, session_id: str):
 async def process_voice_audio(
     session_id: str,
     audio_file: UploadFile = File(...),
-    sample_rate: int = 16000
+    sample_rate: int = 16000,
+    streaming: bool = False
 ):
     """
     Process audio via REST API (alternative to WebSocket).
@@ -287,6 +293,7 @@ async def process_voice_audio(
         session_id: Voice session ID
         audio_file: Audio file upload
         sample_rate: Audio sample rate
+        streaming: Pipeline LLM tokens into TTS sentence by sentence
 
     Returns:
         Streaming audio response
@@ -301,8 +308,9 @@ async def process_voice_audio(
     response_audio = bytearray()
     response_text = ""
     metrics = {}
+    process_turn = agent.process_audio_turn_streaming if streaming else agent.process_audio_turn
 
-    async for chunk in agent.process_audio_turn(
+    async for chunk in process_turn(
         session_id=session_id,
         audio_data=audio_data,
         sample_rate=sample_rate
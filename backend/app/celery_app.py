@@ -5,8 +5,13 @@ This module sets up the Celery application for multi-agent workflow orchestratio
 lead processing, and background job execution.
 """
 import os
+import time
+from typing import Dict, Set
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure
+from celery.signals import task_prerun, task_postrun, task_failure, worker_init, worker_process_init, worker_process_shutdown
+from app.core.http_clients import http_clients
+from app.core.metrics import mark_process_dead, observe_task_duration, start_metrics_server
+from app.services.telemetry_sink import get_telemetry_sink
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -67,6 +72,11 @@ celery_app.conf.update(
         "app.tasks.agent_tasks.generate_report_async": {"queue": "workflows"},
         "app.tasks.agent_tasks.batch_generate_reports": {"queue": "workflows"},
         "app.tasks.agent_tasks.sync_crm_contacts": {"queue": "crm_sync"},
+        "app.tasks.agent_tasks.batch_qualify_leads": {"queue": "workflows"},
+        "app.tasks.agent_tasks.rescore_mep_e_leads": {"queue": "workflows"},
+        "app.tasks.agent_tasks.refresh_usage_rollups": {"queue": "default"},
+        "app.tasks.agent_tasks.generate_report_export": {"queue": "workflows"},
+        "app.tasks.agent_tasks.generate_campaign_messages": {"queue": "workflows"},
     },
     
     # Rate limiting (prevent API quota exhaustion)
@@ -95,20 +105,45 @@ celery_app.conf.update(
             "schedule": 86400.0,  # 24 hours in seconds
             "args": ("linkedin", "import", None),
         },
+        # Lead rescoring - all leads, micro-batched, nightly
+        "rescore-leads-nightly": {
+            "task": "batch_qualify_leads",
+            "schedule": 86400.0,  # 24 hours in seconds
+            "args": (None,),
+        },
+        # AI cost / API call analytics rollups - incremental, every 5 minutes
+        "refresh-usage-rollups": {
+            "task": "refresh_usage_rollups",
+            "schedule": 300.0,
+            "args": (40,),  # 40 x 50k rows per run; backfills catch up over several runs
+        },
     },
 )
 
 
-# Task lifecycle hooks for logging
+def task_queues() -> Set[str]:
+    """Queues tasks are routed to (for queue depth metrics)"""
+    return {route["queue"] for route in celery_app.conf.task_routes.values()} | {celery_app.conf.task_default_queue}
+
+
+# Start times of tasks running in this process, for task duration metrics
+_task_started: Dict[str, float] = {}
+
+
+# Task lifecycle hooks for logging and metrics
 @task_prerun.connect
 def task_prerun_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, **extra):
     """Log when a task starts execution"""
+    _task_started[task_id] = time.monotonic()
     logger.info(f"Task starting: {task.name} (ID: {task_id})")
 
 
 @task_postrun.connect
-def task_postrun_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, retval=None, **extra):
-    """Log when a task completes successfully"""
+def task_postrun_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, retval=None, state=None, **extra):
+    """Log when a task completes and record its duration"""
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        observe_task_duration(task.name, state or "UNKNOWN", time.monotonic() - started)
     logger.info(f"Task completed: {task.name} (ID: {task_id})")
 
 
@@ -118,5 +153,49 @@ def task_failure_handler(sender=None, task_id=None, exception=None, args=None, k
     logger.error(f"Task failed: {sender.name} (ID: {task_id}) - {str(exception)}", exc_info=True)
 
 
+# Pooled HTTP clients are per process and per event loop
+@worker_process_init.connect
+def reset_http_clients_on_fork(**kwargs):
+    """Drop HTTP clients inherited from the parent process"""
+    http_clients.reset()
+
+
+@worker_process_shutdown.connect
+def release_http_clients(**kwargs):
+    """Release pooled HTTP clients when a worker process exits"""
+    http_clients.reset()
+
+
+# Telemetry rows from tasks are batched on a sink thread per worker process
+@worker_process_init.connect
+def start_telemetry_sink(**kwargs):
+    """Start the telemetry sink in the forked worker process"""
+    if os.getenv("TELEMETRY_SINK_ENABLED", "true").lower() == "true":
+        get_telemetry_sink().start_background()
+
+
+@worker_process_shutdown.connect
+def flush_telemetry_sink(**kwargs):
+    """Flush buffered telemetry rows before the worker process exits"""
+    get_telemetry_sink().stop_background()
+
+
+# Worker metrics (task durations) are served from the main worker process;
+# set PROMETHEUS_MULTIPROC_DIR so prefork children's samples are aggregated
+@worker_init.connect
+def start_worker_metrics_server(**kwargs):
+    """Expose worker metrics on CELERY_METRICS_PORT when set"""
+    port = os.getenv("CELERY_METRICS_PORT")
+    if port:
+        start_metrics_server(int(port))
+        logger.info(f"Worker metrics served on port {port}")
+
+
+@worker_process_shutdown.connect
+def release_process_metrics(pid=None, **kwargs):
+    """Drop the exiting child's live metrics in multiprocess mode"""
+    mark_process_dead(pid or os.getpid())
+
+
 if __name__ == "__main__":
     celery_app.start()
@@ -17,7 +17,9 @@ Tier Scoring:
 - Tier 2: 1 point (Mid-market brands, solid quality)
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from app.core.substring_index import SubstringIndex
 
 # ============================================================================
 # OEM Taxonomy: 6 Categories for MEP+E Contractor Scoring
@@ -162,6 +164,62 @@ TIER_POINTS: Dict[str, int] = {
     "tier2": 1,  # Mid-market brands (solid quality)
 }
 
+# ============================================================================
+# Precompiled OEM Lookup Index
+# ============================================================================
+
+
+class OEMLookupIndex:
+    """
+    Precompiled (category, tier) lookup with the taxonomy's fuzzy semantics.
+
+    A name matches a brand when either contains the other (case-insensitive);
+    the first brand in taxonomy order wins. Instead of scanning every
+    category/tier/brand per call, known brand names resolve through an exact
+    dict and anything else through a SubstringIndex (Aho-Corasick plus
+    substring table), memoized per normalized name.
+
+    Examples:
+        >>> index = OEMLookupIndex(OEM_TAXONOMY)
+        >>> index.lookup("Tesla Powerwall")
+        ('battery', 'tier1')
+        >>> index.lookup("  tesla ")  # Inside "Tesla Solar"
+        ('solar', 'tier1')
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]]):
+        self.entries: List[Tuple[str, str]] = []
+        brands: List[str] = []
+        for category, tiers in taxonomy.items():
+            for tier_name, tier_brands in tiers.items():
+                for brand in tier_brands:
+                    self.entries.append((category, tier_name))
+                    brands.append(brand.lower())
+
+        self.matcher = SubstringIndex(brands)
+        self.exact: Dict[str, Tuple[str, str]] = {
+            brand: self.entries[self.matcher.first_match(brand)] for brand in brands
+        }
+
+    def lookup(self, oem_name: str) -> Optional[Tuple[str, str]]:
+        """(category, tier) for an OEM name, or None if not in the taxonomy"""
+        oem_lower = oem_name.lower().strip()
+        match = self.exact.get(oem_lower)
+        if match is None:
+            index = self.matcher.first_match(oem_lower)
+            match = self.entries[index] if index is not None else None
+        return match
+
+
+OEM_INDEX = OEMLookupIndex(OEM_TAXONOMY)
+
+
+def rebuild_oem_index() -> None:
+    """Recompile OEM_INDEX after OEM_TAXONOMY is modified at runtime"""
+    global OEM_INDEX
+    OEM_INDEX = OEMLookupIndex(OEM_TAXONOMY)
+
+
 # ============================================================================
 # Helper Functions for OEM Taxonomy Lookup
 # ============================================================================
@@ -185,15 +243,8 @@ def get_oem_category(oem_name: str) -> str | None:
         >>> get_oem_category("tesla")  # Case insensitive
         'solar'
     """
-    oem_lower = oem_name.lower().strip()
-
-    for category, tiers in OEM_TAXONOMY.items():
-        for tier_name, brands in tiers.items():
-            for brand in brands:
-                if brand.lower() in oem_lower or oem_lower in brand.lower():
-                    return category
-
-    return None
+    match = OEM_INDEX.lookup(oem_name)
+    return match[0] if match else None
 
 
 def get_oem_tier(oem_name: str) -> str | None:
@@ -212,15 +263,8 @@ def get_oem_tier(oem_name: str) -> str | None:
         >>> get_oem_tier("Trina Solar")
         'tier2'
     """
-    oem_lower = oem_name.lower().strip()
-
-    for category, tiers in OEM_TAXONOMY.items():
-        for tier_name, brands in tiers.items():
-            for brand in brands:
-                if brand.lower() in oem_lower or oem_lower in brand.lower():
-                    return tier_name
-
-    return None
+    match = OEM_INDEX.lookup(oem_name)
+    return match[1] if match else None
 
 
 def get_oem_tier_points(oem_name: str) -> int:
@@ -6,15 +6,16 @@ Provides utility functions for:
 - Cost per lead averaging
 - Cache hit rate analysis
 - Budget alert checking
+
+All figures come from the pre-aggregated usage rollups
+(app.services.usage_rollups), not scans of ai_cost_tracking.
 """
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, date as date_type
-from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, case
 
-from app.models.ai_cost_tracking import AICostTracking
+from app.services.usage_rollups import UsageStats, ai_cost_lead_usage, ai_cost_usage
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -45,23 +46,13 @@ async def get_daily_spend(
         if date is None:
             date = datetime.utcnow().date()
 
-        # Calculate day boundaries
+        # One day from the daily rollup (plus rows not rolled up yet)
         day_start = datetime.combine(date, datetime.min.time())
-        day_end = datetime.combine(date, datetime.max.time())
-
-        # Query total cost and requests for the day
-        result = db.query(
-            func.sum(AICostTracking.cost_usd).label("total_cost"),
-            func.count(AICostTracking.id).label("total_requests")
-        ).filter(
-            and_(
-                AICostTracking.timestamp >= day_start,
-                AICostTracking.timestamp <= day_end
-            )
-        ).first()
-
-        total_cost = float(result.total_cost or Decimal("0.0"))
-        total_requests = result.total_requests or 0
+        usage = ai_cost_usage(db, start=day_start, end=day_start + timedelta(days=1))
+        stats = usage.get((), UsageStats())
+
+        total_cost = stats.cost_usd
+        total_requests = stats.requests
 
         logger.debug(
             f"Daily spend for {date.isoformat()}: ${total_cost:.6f} "
@@ -101,31 +92,10 @@ async def get_cost_per_lead_avg(
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
 
-        # Get total cost for the period
-        total_cost_result = db.query(
-            func.sum(AICostTracking.cost_usd).label("total_cost")
-        ).filter(
-            and_(
-                AICostTracking.timestamp >= start_date,
-                AICostTracking.timestamp <= end_date,
-                AICostTracking.lead_id.isnot(None)
-            )
-        ).first()
-
-        total_cost = float(total_cost_result.total_cost or Decimal("0.0"))
-
-        # Get count of unique leads
-        unique_leads_result = db.query(
-            func.count(AICostTracking.lead_id.distinct()).label("unique_leads")
-        ).filter(
-            and_(
-                AICostTracking.timestamp >= start_date,
-                AICostTracking.timestamp <= end_date,
-                AICostTracking.lead_id.isnot(None)
-            )
-        ).first()
-
-        unique_leads = unique_leads_result.unique_leads or 0
+        # Cost and unique leads from the hourly lead rollup
+        by_lead_agent = ai_cost_lead_usage(db, start=start_date, end=end_date)
+        total_cost = sum(stats.cost_usd for stats in by_lead_agent.values())
+        unique_leads = len({lead_id for lead_id, _ in by_lead_agent})
 
         # Calculate average
         if unique_leads > 0:
@@ -170,19 +140,11 @@ async def get_cache_hit_rate(
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(hours=hours)
 
-        # Query cache statistics
-        result = db.query(
-            func.count(AICostTracking.id).label("total_requests"),
-            func.sum(case((AICostTracking.cache_hit == True, 1), else_=0)).label("cache_hits")
-        ).filter(
-            and_(
-                AICostTracking.timestamp >= start_time,
-                AICostTracking.timestamp <= end_time
-            )
-        ).first()
-
-        total_requests = result.total_requests or 0
-        cache_hits = int(result.cache_hits or 0)
+        # Cache statistics from the hourly rollup
+        stats = ai_cost_usage(db, start=start_time, end=end_time).get((), UsageStats())
+
+        total_requests = stats.requests
+        cache_hits = stats.cache_hits
 
         # Calculate hit rate
         if total_requests > 0:
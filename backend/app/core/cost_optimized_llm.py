@@ -347,7 +347,7 @@ class CostOptimizedLLMProvider:
             logger.warning(f"Could not import AICostTracking: {e}")
             return
 
-        tracking = AICostTracking(
+        values = dict(
             agent_type=config.agent_type,
             agent_mode=config.mode,
             lead_id=config.lead_id,
@@ -365,8 +365,13 @@ class CostOptimizedLLMProvider:
             cache_hit=result.get("cache_hit", False)
         )
 
+        from app.services.telemetry_sink import get_telemetry_sink
+        if get_telemetry_sink().record(AICostTracking, values):
+            logger.info(f"Tracked cost: ${result['cost_usd']:.6f} for {config.agent_type}")
+            return
+
         try:
-            self.db.add(tracking)
+            self.db.add(AICostTracking(**values))
 
             # Handle both sync and async sessions
             if self.is_async:
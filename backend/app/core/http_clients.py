@@ -0,0 +1,284 @@
+"""
+Shared pooled HTTP clients for external providers
+
+One ``httpx.AsyncClient`` per provider per event loop, so DNS, TCP and TLS
+setup is paid once and connections are reused across requests:
+- HTTP/2 when the ``h2`` package is installed (HTTP/1.1 keep-alive otherwise)
+- Per-provider keep-alive and connection limits
+- Optional per-host concurrency caps for crawlers hitting many sites
+
+httpx connection pools are bound to the event loop that created them. The
+FastAPI process has one loop for its lifetime; Celery tasks run each job in a
+fresh ``asyncio.run`` loop, so they close their clients before the loop ends.
+
+Usage:
+    from app.core.http_clients import pooled_http_client
+
+    async with pooled_http_client("close") as client:
+        response = await client.get(f"{BASE_URL}/lead/")
+"""
+
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Mapping, Optional, Tuple
+
+import httpx
+
+from app.core.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HTTPClientConfig:
+    """Connection pool settings for one provider"""
+
+    base_url: str = ""
+    timeout: float = 30.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    max_connections_per_host: Optional[int] = None  # None = bounded by max_connections only
+    http2: bool = True
+    follow_redirects: bool = False
+    max_redirects: int = 20
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+
+# Pool settings per provider (API keys stay per-request, never on the shared client)
+PROVIDER_HTTP_CONFIGS: Dict[str, HTTPClientConfig] = {
+    "close": HTTPClientConfig(
+        max_connections=20,
+        max_keepalive_connections=20,
+    ),
+    "apollo": HTTPClientConfig(
+        base_url="https://api.apollo.io/api/v1",
+        max_connections=20,
+        max_keepalive_connections=10,
+    ),
+    "linkedin": HTTPClientConfig(
+        timeout=5.0,
+        max_connections=10,
+        max_keepalive_connections=5,
+    ),
+    "hunter": HTTPClientConfig(
+        timeout=5.0,
+        max_connections=10,
+        max_keepalive_connections=5,
+    ),
+    "website_validator": HTTPClientConfig(
+        timeout=10.0,
+        max_connections=50,
+        max_keepalive_connections=20,
+        keepalive_expiry=10.0,
+        max_connections_per_host=4,
+        follow_redirects=True,
+        max_redirects=5,
+        headers={"User-Agent": "Mozilla/5.0 (compatible; SalesAgentBot/1.0; +http://example.com/bot)"},
+    ),
+    "review_scraper": HTTPClientConfig(
+        timeout=5.0,
+        max_connections=30,
+        max_keepalive_connections=15,
+        max_connections_per_host=4,
+        follow_redirects=True,
+        max_redirects=3,
+        headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"},
+    ),
+}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees its per-host slot once the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """
+    Caps concurrent requests per host on top of the pool-wide limits
+
+    httpx only limits connections per client; crawlers sharing one client
+    across many sites use this so a single slow site can't take the pool.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, semaphore),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """
+    Process-wide registry of pooled ``httpx.AsyncClient`` instances
+
+    Clients are created lazily per provider and rebuilt if requested from a
+    different event loop than the one they were created on.
+    """
+
+    def __init__(self, configs: Optional[Mapping[str, HTTPClientConfig]] = None):
+        self._configs: Dict[str, HTTPClientConfig] = dict(configs if configs is not None else PROVIDER_HTTP_CONFIGS)
+        self._clients: Dict[str, Tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]] = {}
+        if not HTTP2_AVAILABLE:
+            logger.info("h2 not installed - pooled HTTP clients will use HTTP/1.1 keep-alive")
+
+    def register(self, provider: str, config: HTTPClientConfig) -> None:
+        """Add or replace a provider's pool settings (applies to new clients)"""
+        self._configs[provider] = config
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for a provider.
+
+        Args:
+            provider: Key in the registry's provider configs
+
+        Returns:
+            Pooled AsyncClient bound to the running event loop
+
+        Raises:
+            KeyError: If the provider has no registered config
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        entry = self._clients.get(provider)
+        if entry is not None:
+            client_loop, client = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+            # Pool belongs to another (usually finished) loop and can't be reused
+            logger.debug(f"Rebuilding {provider} HTTP client for new event loop")
+
+        client = self._build(provider)
+        self._clients[provider] = (loop, client)
+        return client
+
+    def _build(self, provider: str) -> httpx.AsyncClient:
+        config = self._configs[provider]
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        http2 = config.http2 and HTTP2_AVAILABLE
+
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+        if config.max_connections_per_host:
+            transport = PerHostLimitTransport(transport, config.max_connections_per_host)
+
+        return httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=config.timeout,
+            follow_redirects=config.follow_redirects,
+            max_redirects=config.max_redirects,
+            headers=dict(config.headers),
+            transport=transport,
+        )
+
+    async def aclose(self, provider: Optional[str] = None) -> None:
+        """
+        Close pooled clients owned by the running event loop.
+
+        Args:
+            provider: Provider to close (None closes all)
+
+        Clients created on other loops are dropped without awaiting, since
+        their connections can't be closed from this loop.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        providers = [provider] if provider else list(self._clients)
+        for name in providers:
+            entry = self._clients.pop(name, None)
+            if entry is None:
+                continue
+            client_loop, client = entry
+            if client_loop is loop or client_loop is None:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"Error closing {name} HTTP client: {e}")
+
+    def reset(self) -> None:
+        """Drop all clients without closing them (forked or shut-down workers)"""
+        self._clients.clear()
+
+    def __contains__(self, provider: str) -> bool:
+        return provider in self._clients
+
+
+# Global registry instance (singleton pattern)
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Get the pooled client for a provider from the global registry"""
+    return http_clients.get(provider)
+
+
+@asynccontextmanager
+async def pooled_http_client(provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Borrow the pooled client for a provider.
+
+    Drop-in for ``async with httpx.AsyncClient() as client`` - the client
+    stays open for the next caller when the block exits.
+    """
+    yield http_clients.get(provider)
+
+
+async def close_http_clients(provider: Optional[str] = None) -> None:
+    """
+    Close pooled HTTP clients.
+
+    Call this on application shutdown and before a Celery task's event loop ends.
+    """
+    await http_clients.aclose(provider)
@@ -0,0 +1,89 @@
+"""
+Mergeable latency sketch for percentile rollups.
+
+A DDSketch: values are counted in logarithmic bins so any quantile is
+returned within a fixed relative error (1% by default), and two sketches
+merge by adding bin counts. That lets hourly rollup rows carry their latency
+distribution and p50/p95/p99 over any range be answered by merging rows
+instead of sorting raw latencies.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+
+class LatencySketch:
+    """
+    DDSketch over non-negative latencies (milliseconds).
+
+    Example:
+        sketch = LatencySketch()
+        for latency_ms in (120, 340, 95):
+            sketch.add(latency_ms)
+        sketch.quantile(0.95)  # within 1% of the exact p95
+    """
+
+    DEFAULT_RELATIVE_ACCURACY = 0.01
+    MIN_VALUE = 1e-3  # Values below this count as zero
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < self.MIN_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def add_all(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0-1), None for an empty sketch."""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # Midpoint of the bin (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (bin indexes become string keys)."""
+        return {
+            "alpha": self.relative_accuracy,
+            "zero": self.zero_count,
+            "bins": {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "LatencySketch":
+        if not data:
+            return cls()
+        sketch = cls(data.get("alpha", cls.DEFAULT_RELATIVE_ACCURACY))
+        sketch.zero_count = data.get("zero", 0)
+        sketch.bins = {int(index): count for index, count in data.get("bins", {}).items()}
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
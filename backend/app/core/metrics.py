@@ -1,43 +1,263 @@
 """
 Prometheus metrics integration for FastAPI.
 
-Provides middleware for request metrics and an endpoint to expose metrics.
+Provides a pure-ASGI middleware for request metrics, recording helpers for
+LLM calls, cache lookups and Celery tasks, and an endpoint to expose metrics.
+
+Labels are kept low-cardinality: requests are labelled by route template
+(``/api/leads/{lead_id}``, not ``/api/leads/123``), LLM calls by provider and
+model, caches by key prefix and tasks by task name.
 """
 
+import os
 import time
-from typing import Callable
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, PlainTextResponse
+from typing import Dict, Iterable, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "unmatched"  # 404s and other requests no route matched
 
 REQUEST_COUNT = Counter(
     "http_requests_total",
     "Total HTTP requests",
-    ["method", "path", "status"]
+    ["method", "route", "status"]
 )
 
 REQUEST_LATENCY = Histogram(
     "http_request_duration_seconds",
-    "HTTP request latency in seconds",
-    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5)
+    "HTTP request latency in seconds (until the response body is sent)",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5, 10)
+)
+
+LLM_REQUESTS = Counter(
+    "llm_requests_total",
+    "LLM provider requests",
+    ["provider", "model", "outcome"]
+)
+
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLM provider request latency in seconds",
+    ["provider", "model"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1, 2, 5, 10, 30, 60)
+)
+
+LLM_TOKENS = Histogram(
+    "llm_tokens_per_request",
+    "LLM tokens per request",
+    ["provider", "model", "direction"],
+    buckets=(16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+)
+
+LLM_COST = Histogram(
+    "llm_cost_usd_per_request",
+    "LLM cost per request in USD",
+    ["provider", "model"],
+    buckets=(0.000001, 0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by result (hit ratio = hit / (hit + miss))",
+    ["cache", "result"]
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time in seconds",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
 )
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
+class MetricsMiddleware:
+    """
+    Pure ASGI request metrics middleware.
+
+    Unlike BaseHTTPMiddleware it does not wrap the response in a new task
+    and body stream, so streaming responses pass through untouched. The
+    route template is read from the scope after routing has run.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Bound label children, so steady-state requests skip labels() lookups
+        self._counters: Dict[Tuple[str, str, int], Counter] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
         status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            return response
+            await self.app(scope, receive, send_with_status)
         finally:
-            duration = time.time() - start_time
-            path = request.url.path
-            REQUEST_COUNT.labels(request.method, path, str(status_code)).inc()
-            REQUEST_LATENCY.observe(duration)
+            self._observe(scope["method"], route_template(scope), status_code, time.perf_counter() - start_time)
+
+    def _observe(self, method: str, route: str, status_code: int, duration: float) -> None:
+        counter = self._counters.get((method, route, status_code))
+        if counter is None:
+            counter = self._counters[(method, route, status_code)] = REQUEST_COUNT.labels(method, route, str(status_code))
+        counter.inc()
+
+        histogram = self._histograms.get((method, route))
+        if histogram is None:
+            histogram = self._histograms[(method, route)] = REQUEST_LATENCY.labels(method, route)
+        histogram.observe(duration)
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled the request (e.g. /api/leads/{lead_id})"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not path:
+        return UNMATCHED_ROUTE
+    return scope.get("root_path", "") + path
+
+
+def observe_llm_call(
+    provider: str,
+    model: str,
+    latency_seconds: Optional[float] = None,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+    cost_usd: Optional[float] = None,
+    success: bool = True
+) -> None:
+    """
+    Record one LLM provider request.
+
+    Args:
+        provider: Provider name (e.g. "cerebras", "anthropic")
+        model: Model identifier
+        latency_seconds: Request latency, if measured
+        prompt_tokens: Input tokens, if reported
+        completion_tokens: Output tokens, if reported
+        cost_usd: Request cost, if known
+        success: Whether the request succeeded
+    """
+    LLM_REQUESTS.labels(provider, model, "success" if success else "error").inc()
+    if latency_seconds is not None:
+        LLM_LATENCY.labels(provider, model).observe(latency_seconds)
+    if prompt_tokens is not None:
+        LLM_TOKENS.labels(provider, model, "prompt").observe(prompt_tokens)
+    if completion_tokens is not None:
+        LLM_TOKENS.labels(provider, model, "completion").observe(completion_tokens)
+    if cost_usd is not None:
+        LLM_COST.labels(provider, model).observe(cost_usd)
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    """Count cache hits or misses for a cache prefix"""
+    if count:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc(count)
+
+
+def observe_task_duration(task: str, state: str, duration_seconds: float) -> None:
+    """Record a finished Celery task's run time"""
+    CELERY_TASK_DURATION.labels(task, state).observe(duration_seconds)
+
+
+class CeleryQueueDepthCollector:
+    """
+    Reports Celery queue depth from the Redis broker at scrape time.
+
+    Celery's Redis transport keeps each queue as a list named after it, so
+    depth is one LLEN per queue. Queues that cannot be read are skipped.
+    """
+
+    def __init__(self, broker_url: str, queues: Iterable[str], timeout: float = 0.5):
+        """
+        Initialize collector.
+
+        Args:
+            broker_url: Redis broker URL
+            queues: Queue names to report
+            timeout: Redis socket timeout in seconds (bounds scrape time)
+        """
+        import redis
+        self.queues = sorted(set(queues))
+        self.redis = redis.from_url(broker_url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    def collect(self):
+        depth = GaugeMetricFamily("celery_queue_depth", "Messages waiting in a Celery queue", labels=["queue"])
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for queue in self.queues:
+                pipe.llen(queue)
+            lengths = pipe.execute()
+        except Exception:
+            lengths = []
+        for queue, length in zip(self.queues, lengths):
+            depth.add_metric([queue], length)
+        yield depth
+
+    def describe(self):
+        # Registering must not query the broker
+        return []
+
+
+# Scrape-time collectors, also added to the multiprocess registry
+_collectors = []
+
+
+def register_celery_queue_collector(broker_url: str, queues: Iterable[str]) -> None:
+    """Expose celery_queue_depth for the given queues"""
+    collector = CeleryQueueDepthCollector(broker_url, queues)
+    REGISTRY.register(collector)
+    _collectors.append(collector)
+
+
+def _registry() -> CollectorRegistry:
+    """Default registry, or all processes' samples in prometheus multiprocess mode"""
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    from prometheus_client import multiprocess
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _collectors:
+        registry.register(collector)
+    return registry
+
+
+def start_metrics_server(port: int) -> None:
+    """
+    Serve /metrics on a separate port (Celery workers have no HTTP app).
+
+    Set PROMETHEUS_MULTIPROC_DIR so samples recorded in prefork child
+    processes are aggregated.
+    """
+    from prometheus_client import start_http_server
+    start_http_server(port, registry=_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a finished process's live gauges in multiprocess mode"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
 
 
 def metrics_endpoint() -> PlainTextResponse:
-    return PlainTextResponse(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return PlainTextResponse(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
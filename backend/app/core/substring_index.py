@@ -0,0 +1,128 @@
+"""
+Precompiled substring lookup for small keyword vocabularies
+
+Answers "which is the first key (in priority order) that occurs in the text,
+or that the text occurs in?" - the fuzzy-match rule used by the OEM taxonomy
+and industry lookups - without scanning every key per call:
+
+- keys inside the text: Aho-Corasick automaton over all keys, one pass over
+  the text regardless of vocabulary size
+- text inside a key: table of every substring of every key (vocabularies are
+  a few hundred short names, so the table stays small)
+
+Results are memoized per text, so repeated lookups are dict hits.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+
+class SubstringIndex:
+    """
+    First-match substring index over an ordered list of keys.
+
+    Matching is on the strings as given; callers normalize (e.g. lowercase)
+    both keys and texts the same way.
+
+    Examples:
+        >>> index = SubstringIndex(["tesla solar", "tesla", "sunpower"])
+        >>> index.first_match("tesla")  # inside "tesla solar"
+        0
+        >>> index.first_match("sunpower x22 panels")
+        2
+        >>> index.first_match("panasonic") is None
+        True
+    """
+
+    def __init__(self, keys: Sequence[str], cache_size: int = 65536):
+        """
+        Build the automaton and substring table.
+
+        Args:
+            keys: Keys in priority order (lower index wins)
+            cache_size: Max memoized texts (cache is cleared when full)
+        """
+        self.keys = list(keys)
+        self.cache_size = cache_size
+        self._cache: Dict[str, Optional[int]] = {}
+
+        # text-in-key: every substring of every key -> lowest key index
+        self._within: Dict[str, int] = {}
+        for index, key in enumerate(self.keys):
+            for start in range(len(key) + 1):
+                for end in range(start, len(key) + 1):
+                    self._within.setdefault(key[start:end], index)
+
+        # key-in-text: Aho-Corasick goto/fail/output tables
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [-1]  # Lowest key index ending at (or suffix-linked from) each state
+        for index, key in enumerate(self.keys):
+            state = 0
+            for char in key:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(-1)
+                state = next_state
+            if self._out[state] == -1 or index < self._out[state]:
+                self._out[state] = index
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail_target if fail_target != next_state else 0
+                self._out[next_state] = self._min_index(self._out[next_state], self._out[self._fail[next_state]])
+
+    @staticmethod
+    def _min_index(a: int, b: int) -> int:
+        if a == -1:
+            return b
+        if b == -1:
+            return a
+        return min(a, b)
+
+    def _keys_in_text(self, text: str) -> int:
+        """Lowest index of a key occurring in text, or -1"""
+        best = self._out[0]  # Empty key matches everything
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            best = self._min_index(best, self._out[state])
+            if best == 0:
+                break
+        return best
+
+    def first_match(self, text: str) -> Optional[int]:
+        """
+        Index of the first key that occurs in text or that text occurs in.
+
+        Args:
+            text: Normalized text to look up
+
+        Returns:
+            Key index, or None if nothing matches
+        """
+        try:
+            return self._cache[text]
+        except KeyError:
+            pass
+
+        best = self._min_index(self._keys_in_text(text), self._within.get(text, -1))
+        result = None if best == -1 else best
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[text] = result
+        return result
@@ -3,6 +3,7 @@ Application dependencies for FastAPI.
 """
 from .auth import (
     get_current_user,
+    get_current_principal,
     get_current_active_user,
     get_current_superuser,
     get_optional_current_user,
@@ -21,6 +22,7 @@ from .rate_limit import (
 
 __all__ = [
     "get_current_user",
+    "get_current_principal",
     "get_current_active_user",
     "get_current_superuser",
     "get_optional_current_user",
@@ -9,7 +9,8 @@ from sqlalchemy.orm import Session
 
 from app.models.database import get_db
 from app.models.security import User
-from app.services.auth import AuthService
+from app.services.auth import AuthService, AuthenticatedPrincipal, PRINCIPAL_CACHE_ENABLED
+from app.services.cache.principal_cache import get_principal_cache
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -59,6 +60,40 @@ async def get_current_user(
     return user
 
 
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> AuthenticatedPrincipal:
+    """
+    Dependency to resolve the current principal (roles and permissions) from JWT token.
+
+    Served from the in-process and Redis principal caches when possible, so
+    authorization-only endpoints skip the users query. Use get_current_user
+    when the endpoint needs the User row itself.
+
+    Args:
+        credentials: JWT Bearer token from Authorization header
+        db: Database session (only used on a cache miss)
+
+    Returns:
+        Current authenticated principal
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    principal_cache = await get_principal_cache() if PRINCIPAL_CACHE_ENABLED else None
+    principal = await AuthService(db).aget_current_principal(credentials.credentials, principal_cache)
+
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return principal
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -124,13 +159,13 @@ class RoleChecker:
 
     async def __call__(
         self,
-        current_user: User = Depends(get_current_user),
+        principal: AuthenticatedPrincipal = Depends(get_current_principal),
     ) -> bool:
         """
         Check if the current user has any of the allowed roles.
 
         Args:
-            current_user: Current authenticated user
+            principal: Current authenticated principal
 
         Returns:
             True if user has required role
@@ -139,17 +174,16 @@ class RoleChecker:
             HTTPException: If user doesn't have required role
         """
         # Superusers bypass role checks
-        if current_user.is_superuser:
+        if principal.is_superuser:
             return True
 
         # Check if user has any of the allowed roles
-        user_roles = [role.name for role in current_user.roles]
-        if any(role in self.allowed_roles for role in user_roles):
+        if not principal.roles.isdisjoint(self.allowed_roles):
             return True
 
         logger.warning(
-            f"Access denied for user {current_user.username}. "
-            f"Required roles: {self.allowed_roles}, User roles: {user_roles}"
+            f"Access denied for user {principal.username}. "
+            f"Required roles: {self.allowed_roles}, User roles: {sorted(principal.roles)}"
         )
 
         raise HTTPException(
@@ -177,15 +211,13 @@ class PermissionChecker:
 
     async def __call__(
         self,
-        current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db),
+        principal: AuthenticatedPrincipal = Depends(get_current_principal),
     ) -> bool:
         """
         Check if the current user has all required permissions.
 
         Args:
-            current_user: Current authenticated user
-            db: Database session
+            principal: Current authenticated principal
 
         Returns:
             True if user has all required permissions
@@ -194,20 +226,18 @@ class PermissionChecker:
             HTTPException: If user doesn't have required permissions
         """
         # Superusers bypass permission checks
-        if current_user.is_superuser:
+        if principal.is_superuser:
             return True
 
-        auth_service = AuthService(db)
-
         # Check each required permission
-        missing_permissions = []
-        for permission in self.required_permissions:
-            if not auth_service.check_permission(current_user, permission):
-                missing_permissions.append(permission)
+        missing_permissions = [
+            permission for permission in self.required_permissions
+            if permission not in principal.permissions
+        ]
 
         if missing_permissions:
             logger.warning(
-                f"Access denied for user {current_user.username}. "
+                f"Access denied for user {principal.username}. "
                 f"Missing permissions: {missing_permissions}"
             )
 
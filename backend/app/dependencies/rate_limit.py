@@ -8,7 +8,7 @@ from typing import Optional
 from fastapi import Request, HTTPException, status
 import redis.asyncio as redis
 
-from app.services.rate_limiter import RateLimiter, RateLimitExceeded
+from app.services.rate_limiter import AtomicRateLimiter, RateLimiter, RateLimitExceeded
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -33,10 +33,13 @@ async def get_rate_limiter() -> RateLimiter:
             _redis_client = await redis.from_url(redis_url)
             logger.info(f"Redis client initialized for rate limiting: {redis_url}")
 
-        _rate_limiter = RateLimiter(
+        # Check-and-record is one atomic script call; leasing is opt-in
+        _rate_limiter = AtomicRateLimiter(
             redis_client=_redis_client,
             fail_open=True,  # Allow requests on Redis errors
             timeout_ms=100,  # 100ms timeout for Redis ops
+            lease_requests=int(os.getenv("RATE_LIMIT_LEASE_REQUESTS", "0")),
+            lease_tokens=int(os.getenv("RATE_LIMIT_LEASE_TOKENS", "0")),
         )
 
     return _rate_limiter
@@ -147,6 +150,10 @@ async def cleanup_rate_limiter():
     """
     global _rate_limiter, _redis_client
 
+    if isinstance(_rate_limiter, AtomicRateLimiter):
+        # Hand unused leased capacity back before the connection goes away
+        await _rate_limiter.close()
+
     if _redis_client:
         await _redis_client.close()
         _redis_client = None
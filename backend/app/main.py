@@ -35,10 +35,12 @@ from app.api import pipeline  # Pipeline testing endpoints
 # HubSpot removed - replaced with Close CRM
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.core.metrics import MetricsMiddleware, metrics_endpoint, register_celery_queue_collector
 from app.core.cache import get_cache_manager
+from app.core.http_clients import close_http_clients
+from app.services.telemetry_sink import get_telemetry_sink
 from sqlalchemy import text
-from app.models.database import engine
+from app.models.database import engine, async_engine
 from app.core.exceptions import (
     SalesAgentException,
     ValidationError,
@@ -124,6 +126,39 @@ from app.middleware.audit import AuditLoggingMiddleware
 app.add_middleware(AuditLoggingMiddleware)
 app.add_middleware(MetricsMiddleware)
 
+# Celery queue depth is read from the broker when /metrics is scraped
+from app.celery_app import task_queues
+register_celery_queue_collector(os.getenv("REDIS_URL", "redis://localhost:6379/0"), task_queues())
+
+
+# Batch API-call, cost and audit rows instead of committing one per request
+TELEMETRY_SINK_ENABLED = os.getenv("TELEMETRY_SINK_ENABLED", "true").lower() == "true"
+
+
+@app.on_event("startup")
+async def start_telemetry_sink():
+    """Start buffering telemetry rows on the app's event loop."""
+    if TELEMETRY_SINK_ENABLED:
+        await get_telemetry_sink().start()
+
+
+@app.on_event("shutdown")
+async def flush_telemetry_sink():
+    """Flush buffered telemetry rows before connections are closed."""
+    await get_telemetry_sink().stop()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """Close pooled async DB connections on shutdown."""
+    await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+async def close_pooled_http_clients():
+    """Close pooled provider HTTP connections on shutdown."""
+    await close_http_clients()
+
 
 # Exception Handlers - Ordered from specific to general
 @app.exception_handler(SalesAgentException)
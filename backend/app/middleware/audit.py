@@ -1,40 +1,52 @@
 """
 Audit logging middleware for capturing all API requests and security events.
-Uses FastAPI background tasks for non-blocking database writes.
+Events are buffered by the telemetry sink and written in batches; without a
+running sink they fall back to per-event writes in the threadpool.
 """
+import asyncio
 import time
 import uuid
 import json
+from functools import partial
 from typing import Optional, Callable
-from fastapi import Request, Response, BackgroundTasks
+from fastapi import Request, Response
 from fastapi.routing import APIRoute
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.models.security import SecurityEvent, EventType
 from app.models.database import SessionLocal
+from app.services.telemetry_sink import get_telemetry_sink
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
 
 
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
+class AuditLoggingMiddleware:
     """
-    Middleware to capture all API requests for audit logging.
-    Logs are written asynchronously using background tasks to avoid blocking.
+    Pure ASGI middleware to capture all API requests for audit logging.
+    Logs are written without blocking the response, and response bodies
+    (including streams) pass through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process each request and log audit information.
 
         Args:
-            request: The incoming HTTP request
-            call_next: The next middleware/endpoint in the chain
-
-        Returns:
-            The HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
         # Generate unique request ID for tracing
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
@@ -45,53 +57,29 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         # Extract client information
         client_ip = self._get_client_ip(request)
         user_agent = request.headers.get("user-agent", "")
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers for tracing
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
 
         # Process the request
         try:
-            response = await call_next(request)
-
-            # Calculate latency
-            latency_ms = int((time.time() - start_time) * 1000)
-
-            # Schedule background task for audit logging
-            if hasattr(request.app.state, "background_tasks"):
-                background_tasks = request.app.state.background_tasks
-            else:
-                background_tasks = BackgroundTasks()
-
-            # Log the request
-            background_tasks.add_task(
-                self._log_audit_event,
-                request_id=request_id,
-                method=request.method,
-                path=str(request.url.path),
-                status_code=response.status_code,
-                latency_ms=latency_ms,
-                ip_address=client_ip,
-                user_agent=user_agent,
-                user_id=getattr(request.state, "user_id", None),
-            )
-
-            # Add request ID to response headers for tracing
-            response.headers["X-Request-ID"] = request_id
-
-            return response
+            await self.app(scope, receive, send_with_request_id)
 
         except Exception as e:
             # Log the error
             latency_ms = int((time.time() - start_time) * 1000)
 
             # Log error event
-            if hasattr(request.app.state, "background_tasks"):
-                background_tasks = request.app.state.background_tasks
-            else:
-                background_tasks = BackgroundTasks()
-
-            background_tasks.add_task(
-                self._log_audit_event,
+            self._schedule_audit_event(
                 request_id=request_id,
                 method=request.method,
-                path=str(request.url.path),
+                path=scope["path"],
                 status_code=500,
                 latency_ms=latency_ms,
                 ip_address=client_ip,
@@ -104,6 +92,37 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             # Re-raise the exception
             raise
 
+        # Calculate latency
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        # Log the request
+        self._schedule_audit_event(
+            request_id=request_id,
+            method=request.method,
+            path=scope["path"],
+            status_code=status_code,
+            latency_ms=latency_ms,
+            ip_address=client_ip,
+            user_agent=user_agent,
+            user_id=getattr(request.state, "user_id", None),
+        )
+
+    def _schedule_audit_event(self, **event) -> None:
+        """
+        Log an audit event without blocking the response.
+
+        With a running telemetry sink logging only enqueues the row, so it
+        happens inline; otherwise the database write runs in the threadpool.
+
+        Args:
+            **event: _log_audit_event arguments
+        """
+        if get_telemetry_sink().running:
+            self._log_audit_event(**event)
+            return
+
+        asyncio.get_running_loop().run_in_executor(None, partial(self._log_audit_event, **event))
+
     def _get_client_ip(self, request: Request) -> str:
         """
         Extract the client's real IP address, considering proxy headers.
@@ -144,8 +163,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         metadata: Optional[dict] = None,
     ):
         """
-        Log an audit event to the database.
-        This runs in a background task to avoid blocking the response.
+        Log an audit event to the telemetry sink or the database.
 
         Args:
             request_id: Unique request identifier
@@ -159,7 +177,6 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             event_type: Type of security event
             metadata: Additional context data
         """
-        db = SessionLocal()
         try:
             # Determine event type based on path and method
             if event_type is None:
@@ -178,7 +195,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             })
 
             # Create audit log entry
-            audit_event = SecurityEvent(
+            _write_security_event(dict(
                 event_type=event_type,
                 user_id=user_id,
                 resource=resource,
@@ -190,11 +207,8 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 request_path=path,
                 status_code=status_code,
                 latency_ms=latency_ms,
-                metadata=event_metadata,
-            )
-
-            db.add(audit_event)
-            db.commit()
+                event_metadata=event_metadata,
+            ))
 
             logger.debug(
                 f"Audit logged: {event_type.value} - {method} {path} "
@@ -203,9 +217,6 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
 
         except Exception as e:
             logger.error(f"Failed to log audit event: {e}", exc_info=True)
-            db.rollback()
-        finally:
-            db.close()
 
     def _determine_event_type(self, method: str, path: str, status_code: int) -> EventType:
         """
@@ -333,7 +344,6 @@ def log_security_event(
         metadata: Additional context data
         request: The HTTP request (for extracting IP, user agent, etc.)
     """
-    db = SessionLocal()
     try:
         # Extract request context if available
         ip_address = None
@@ -355,7 +365,7 @@ def log_security_event(
             request_id = getattr(request.state, "request_id", None)
 
         # Create audit event
-        audit_event = SecurityEvent(
+        _write_security_event(dict(
             event_type=event_type,
             user_id=user_id,
             resource=resource,
@@ -363,11 +373,8 @@ def log_security_event(
             ip_address=ip_address,
             user_agent=user_agent,
             request_id=request_id,
-            metadata=metadata,
-        )
-
-        db.add(audit_event)
-        db.commit()
+            event_metadata=metadata,
+        ))
 
         logger.info(
             f"Security event logged: {event_type.value} - "
@@ -376,6 +383,24 @@ def log_security_event(
 
     except Exception as e:
         logger.error(f"Failed to log security event: {e}", exc_info=True)
+
+
+def _write_security_event(values: dict) -> None:
+    """
+    Buffer a SecurityEvent row on the telemetry sink, or commit it directly.
+
+    Args:
+        values: SecurityEvent column values
+    """
+    if get_telemetry_sink().record(SecurityEvent, values):
+        return
+
+    db = SessionLocal()
+    try:
+        db.add(SecurityEvent(**values))
+        db.commit()
+    except Exception:
         db.rollback()
+        raise
     finally:
         db.close()
\ No newline at end of file
@@ -1,7 +1,15 @@
 """
 Database models for the sales agent application
 """
-from .database import Base, get_db, engine, SessionLocal
+from .database import (
+    Base,
+    get_db,
+    get_async_db,
+    engine,
+    async_engine,
+    SessionLocal,
+    AsyncSessionLocal
+)
 from .lead import Lead
 from .report import Report
 from .api_call import CerebrasAPICall
@@ -15,6 +23,7 @@ from .agent_models import (
 from .customer_models import (
     Customer,
     KnowledgeDocument,
+    KnowledgeChunk,
     CustomerAgent,
     CustomerQuota
 )
@@ -65,8 +74,11 @@ from .pipeline_models import PipelineTestExecution
 __all__ = [
     "Base",
     "get_db",
+    "get_async_db",
     "engine",
+    "async_engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "Lead",
     "Report",
     "CerebrasAPICall",
@@ -77,6 +89,7 @@ __all__ = [
     "BookedMeeting",
     "Customer",
     "KnowledgeDocument",
+    "KnowledgeChunk",
     "CustomerAgent",
     "CustomerQuota",
     "SocialMediaActivity",
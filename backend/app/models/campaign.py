@@ -171,6 +171,7 @@ class CampaignMessage(Base):
     # Indexes
     __table_args__ = (
         Index('idx_campaign_message_status', 'campaign_id', 'status'),
+        Index('idx_campaign_message_campaign_id', 'campaign_id', 'id'),  # Analytics join, index-only
         Index('idx_message_lead', 'lead_id', 'status'),
         CheckConstraint('selected_variant >= 0 AND selected_variant <= 2', name='check_variant_range'),
         CheckConstraint('generation_cost >= 0', name='check_positive_generation_cost'),
@@ -213,6 +214,11 @@ class MessageVariantAnalytics(Base):
     # Indexes
     __table_args__ = (
         Index('idx_variant_analytics', 'message_id', 'variant_number'),
+        # Per-tone campaign aggregation reads the counters from the index alone (PostgreSQL)
+        Index(
+            'idx_variant_analytics_message_tone', 'message_id', 'tone',
+            postgresql_include=['times_selected', 'times_opened', 'times_clicked', 'times_replied']
+        ),
         CheckConstraint('variant_number >= 0 AND variant_number <= 2', name='check_analytics_variant_range'),
         CheckConstraint('times_selected >= 0', name='check_positive_selected'),
         CheckConstraint('times_opened >= 0', name='check_positive_opened'),
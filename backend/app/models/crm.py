@@ -8,11 +8,67 @@ All sensitive data (tokens, API keys) is encrypted using Fernet symmetric encryp
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, JSON, Float, Boolean, ForeignKey, Index
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
+from typing import Optional
+import re
 from app.models.database import Base
 
 
+# ========== Dedup Key Normalization ==========
+# Shared by CRMContact (persisted match keys) and the deduplication engine,
+# so lookups and stored values are always normalized the same way.
+
+COMPANY_SUFFIXES = [
+    'incorporated', 'corporation', 'technologies', 'technology',
+    'solutions', 'enterprises', 'holdings', 'services',
+    'limited', 'company', 'group', 'inc', 'corp', 'llc',
+    'ltd', 'co', 'tech'
+]
+
+# Matches suffix at word boundary, optionally preceded/followed by punctuation/space
+_COMPANY_SUFFIX_PATTERNS = [
+    re.compile(rf'[\s,.]?\b{re.escape(suffix)}\b[\s,.]?') for suffix in COMPANY_SUFFIXES
+]
+
+COMPANY_BLOCK_KEY_LENGTH = 3
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Normalize phone number to digits only"""
+    if not phone:
+        return ""
+    return re.sub(r'\D', '', phone)
+
+
+def normalize_company_name(company: Optional[str]) -> str:
+    """Normalize company name for fuzzy matching (lowercase, no suffixes/punctuation)"""
+    if not company:
+        return ""
+
+    normalized = company.lower()
+    for pattern in _COMPANY_SUFFIX_PATTERNS:
+        normalized = pattern.sub(' ', normalized)
+
+    # Remove punctuation except spaces, collapse whitespace
+    normalized = re.sub(r'[^\w\s]', '', normalized)
+    return ' '.join(normalized.split())
+
+
+def company_block_key(normalized_company: Optional[str]) -> Optional[str]:
+    """Blocking key for fuzzy company candidates (normalized name prefix)"""
+    if not normalized_company:
+        return None
+    return normalized_company.replace(' ', '')[:COMPANY_BLOCK_KEY_LENGTH] or None
+
+
+def extract_email_domain(email: Optional[str]) -> Optional[str]:
+    """Lowercased domain part of an email address"""
+    if not email or '@' not in email:
+        return None
+    return email.rsplit('@', 1)[-1].lower() or None
+
+
 class CRMCredential(Base):
     """
     Encrypted CRM credentials for OAuth and API key authentication.
@@ -76,6 +132,12 @@ class CRMContact(Base):
     phone = Column(String(50), nullable=True)
     linkedin_url = Column(String(500), nullable=True)
     
+    # Persisted dedup match keys (kept in sync by the validators below)
+    email_domain = Column(String(255), nullable=True)
+    phone_normalized = Column(String(50), nullable=True)
+    company_normalized = Column(String(255), nullable=True)
+    company_block_key = Column(String(10), nullable=True)
+    
     # Platform-specific IDs stored as JSON
     # Example: {"hubspot": "12345", "apollo": "67890", "linkedin": "abc123"}
     external_ids = Column(JSON, nullable=False, default=dict)
@@ -100,8 +162,29 @@ class CRMContact(Base):
         Index('idx_crm_contact_source', 'source_platform'),
         Index('idx_crm_contact_sync_status', 'sync_status'),
         Index('idx_crm_contact_last_synced', 'last_synced_at'),
+        Index('idx_crm_contact_email_domain', 'email_domain'),
+        Index('idx_crm_contact_phone_normalized', 'phone_normalized'),
+        Index('idx_crm_contact_company_block', 'company_block_key'),
+        # Trigram index on company_normalized is Postgres-only (see migration 014)
     )
 
+    @validates('email')
+    def _set_email_domain(self, key, value):
+        self.email_domain = extract_email_domain(value)
+        return value
+
+    @validates('phone')
+    def _set_phone_normalized(self, key, value):
+        self.phone_normalized = normalize_phone(value) or None
+        return value
+
+    @validates('company')
+    def _set_company_normalized(self, key, value):
+        normalized = normalize_company_name(value)
+        self.company_normalized = normalized or None
+        self.company_block_key = company_block_key(normalized)
+        return value
+
 
 class CRMSyncLog(Base):
     """
@@ -135,6 +218,11 @@ class CRMSyncLog(Base):
     
     # Status
     status = Column(String(50), default="running", index=True)  # running, completed, failed
+
+    # Incremental sync checkpoint - committed with each page so interrupted runs resume
+    sync_since = Column(DateTime, nullable=True)  # Window lower bound (remote date_updated >=)
+    sync_cursor = Column(String(255), nullable=True)  # Page cursor within the window, NULL once complete
+    high_watermark = Column(DateTime, nullable=True)  # Newest remote date_updated written
     
     # Relationships
     credential = relationship("CRMCredential", back_populates="sync_logs")
@@ -143,6 +231,7 @@ class CRMSyncLog(Base):
     __table_args__ = (
         Index('idx_sync_log_platform_status', 'platform', 'status'),
         Index('idx_sync_log_started', 'started_at'),
+        Index('idx_sync_log_checkpoint', 'credential_id', 'platform', 'started_at'),
     )
 
 
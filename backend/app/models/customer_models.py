@@ -1,7 +1,7 @@
 """
 Customer and knowledge base models for multi-tenant platform
 """
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -133,11 +133,50 @@ class KnowledgeDocument(Base):
     
     # Relationships
     customer = relationship("Customer", back_populates="knowledge_documents")
+    chunks = relationship("KnowledgeChunk", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<KnowledgeDocument(id={self.id}, customer_id={self.customer_id}, filename='{self.filename}')>"
 
 
+class KnowledgeChunk(Base):
+    """
+    Embedded text chunk of a knowledge base document
+
+    Semantic search ranks chunks (not whole documents) by cosine distance:
+    - customer_id is denormalized from the document so the tenant filter
+      runs in the same query as the vector ordering
+    - embedding has an HNSW index (vector_cosine_ops) on PostgreSQL,
+      created in migration 017_knowledge_chunks
+    """
+    __tablename__ = "knowledge_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Customer Isolation
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    document_id = Column(Integer, ForeignKey("knowledge_documents.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Content
+    chunk_index = Column(Integer, nullable=False)  # Position within the document
+    chunk_text = Column(Text, nullable=False)
+
+    # Vector Embedding (384 dimensions for all-MiniLM-L6-v2, L2-normalized)
+    embedding = Column(Vector(384), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relationships
+    document = relationship("KnowledgeDocument", back_populates="chunks")
+
+    __table_args__ = (
+        Index('idx_knowledge_chunks_document_order', 'document_id', 'chunk_index'),
+    )
+
+    def __repr__(self):
+        return f"<KnowledgeChunk(id={self.id}, document_id={self.document_id}, chunk_index={self.chunk_index})>"
+
+
 class CustomerAgent(Base):
     """
     Agent deployments for customers
@@ -4,6 +4,7 @@ Database configuration and base models
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.exc import OperationalError, DBAPIError
 import os
 import logging
@@ -49,6 +50,37 @@ engine = create_engine(
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for async def routes (psycopg3 async driver, same URL scheme).
+# Has its own pool so blocking sync work (Celery, CSV COPY) can't starve the API.
+async_engine = create_async_engine(
+    DATABASE_URL,
+    echo=os.getenv("DATABASE_ECHO", "false").lower() == "true",
+
+    # Connection Pool Configuration
+    pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE", "20")),  # Sized for concurrent requests
+    max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "20")),
+
+    # Connection Resilience
+    pool_pre_ping=True,
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    pool_timeout=int(os.getenv("ASYNC_DB_POOL_TIMEOUT", "10")),  # Fail fast instead of queueing
+
+    # Query Configuration
+    connect_args={
+        "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "10")),
+        "options": "-c statement_timeout=30000"
+    }
+)
+
+# expire_on_commit=False: ORM objects stay readable after commit without
+# an implicit (and in async, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -56,6 +88,7 @@ Base = declarative_base()
 from app.models.lead import Lead
 from app.models.api_call import CerebrasAPICall
 from app.models.ai_cost_tracking import AICostTracking
+from app.models.usage_rollups import RollupWatermark, AICostRollup, AICostLeadRollup, APICallRollup
 from app.models.agent_models import (
     AgentExecution, AgentWorkflow, EnrichedLead,
     MarketingCampaign, BookedMeeting
@@ -79,6 +112,16 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency function for FastAPI to get async database sessions.
+
+    Use from `async def` routes so queries don't block the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 async def check_database_health() -> dict:
     """
     Check database connectivity and health.
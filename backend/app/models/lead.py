@@ -1,7 +1,7 @@
 """
 Lead model for storing and managing sales leads
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, Boolean, Index, CheckConstraint
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, Boolean, Index, CheckConstraint, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -21,6 +21,8 @@ class Lead(Base):
         Index('idx_leads_created_at', 'created_at'),
         Index('idx_leads_updated_at', 'updated_at'),
         Index('idx_leads_qualified_at', 'qualified_at'),
+        # Normalized company name lookups (dealer import dedup)
+        Index('idx_leads_company_name_key', text('lower(trim(company_name))')),
         # CHECK constraint to enforce valid score range (0-100)
         CheckConstraint('qualification_score >= 0 AND qualification_score <= 100', name='check_score_range'),
     )
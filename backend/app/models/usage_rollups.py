@@ -0,0 +1,105 @@
+"""
+Pre-aggregated usage rollups for cost and latency analytics.
+
+Raw tracking tables (ai_cost_tracking, api_call_logs) grow by millions of
+rows; the analytics endpoints read these rollups instead. Each rollup row
+holds additive counters for one time bucket and dimension combination, plus
+a mergeable latency sketch (see app.core.latency_sketch) where percentiles
+are needed. Rows are maintained incrementally by
+app.services.usage_rollups.refresh_usage_rollups, which advances a
+RollupWatermark over the raw table's primary key.
+
+Dimension columns are NOT NULL ('' stands for a missing value) so the
+unique constraints also cover rows without e.g. an agent_mode.
+"""
+
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Float, DateTime, JSON, Index, UniqueConstraint
+)
+from sqlalchemy.sql import func
+from app.models.database import Base
+
+
+class RollupWatermark(Base):
+    """Highest raw row id folded into a family of rollups."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)  # "ai_cost_tracking", "api_call_logs"
+    last_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RollupMetricsMixin:
+    """Additive counters shared by all rollup tables."""
+
+    granularity = Column(String(10), nullable=False)  # "hour" or "day"
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # UTC
+
+    request_count = Column(BigInteger, nullable=False, default=0)
+    success_count = Column(BigInteger, nullable=False, default=0)
+    cache_hits = Column(BigInteger, nullable=False, default=0)
+    total_cost_usd = Column(Float, nullable=False, default=0.0)
+    uncached_requests = Column(BigInteger, nullable=False, default=0)
+    uncached_cost_usd = Column(Float, nullable=False, default=0.0)
+    latency_count = Column(BigInteger, nullable=False, default=0)  # Rows with a latency
+    latency_sum_ms = Column(BigInteger, nullable=False, default=0)
+
+
+class AICostRollup(RollupMetricsMixin, Base):
+    """ai_cost_tracking by hour/day, agent, provider and model."""
+
+    __tablename__ = "ai_cost_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    agent_type = Column(String(50), nullable=False)
+    agent_mode = Column(String(20), nullable=False, default="")
+    provider = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    latency_sketch = Column(JSON, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'granularity', 'bucket_start', 'agent_type', 'agent_mode', 'provider', 'model',
+            name='uq_ai_cost_rollup_bucket'
+        ),
+        Index('idx_ai_cost_rollup_agent', 'granularity', 'agent_type', 'bucket_start'),
+    )
+
+
+class AICostLeadRollup(RollupMetricsMixin, Base):
+    """ai_cost_tracking by hour, lead and agent (lead cost breakdowns)."""
+
+    __tablename__ = "ai_cost_lead_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    lead_id = Column(Integer, nullable=False)
+    agent_type = Column(String(50), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'granularity', 'bucket_start', 'lead_id', 'agent_type',
+            name='uq_ai_cost_lead_rollup_bucket'
+        ),
+        Index('idx_ai_cost_lead_rollup_lead', 'lead_id', 'bucket_start'),
+    )
+
+
+class APICallRollup(RollupMetricsMixin, Base):
+    """api_call_logs by hour/day, provider, model and operation."""
+
+    __tablename__ = "api_call_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    provider = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    operation_type = Column(String(50), nullable=False)
+    latency_sketch = Column(JSON, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'granularity', 'bucket_start', 'provider', 'model', 'operation_type',
+            name='uq_api_call_rollup_bucket'
+        ),
+        Index('idx_api_call_rollup_provider', 'granularity', 'provider', 'bucket_start'),
+    )
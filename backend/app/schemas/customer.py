@@ -98,6 +98,7 @@ class DocumentUploadResponse(BaseModel):
     file_url: str
     text_preview: str
     text_length: int
+    chunk_count: int = 0
     embedding_dimension: int
     icp_criteria: Dict
     created_at: str
@@ -120,6 +121,7 @@ class DocumentSearchResult(BaseModel):
     icp_criteria: Dict
     created_at: str
     similarity_score: float
+    matched_text: Optional[str] = None  # Best matching chunk
 
 
 class DocumentSearchRequest(BaseModel):
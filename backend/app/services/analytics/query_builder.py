@@ -11,7 +11,7 @@ Security Features:
 - No raw SQL execution
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
@@ -31,6 +31,8 @@ from app.models.analytics_models import (
 
 logger = logging.getLogger(__name__)
 
+STREAM_BATCH_SIZE = 2000  # Rows fetched per server-side cursor round trip
+
 
 @dataclass
 class QueryResult:
@@ -41,6 +43,13 @@ class QueryResult:
     columns: List[str]
 
 
+@dataclass
+class QueryStream:
+    """Streaming query result: column names plus an iterator of row batches"""
+    columns: List[str]
+    batches: Iterator[List[Dict[str, Any]]]
+
+
 class QueryBuilderError(Exception):
     """Base exception for query builder errors"""
     pass
@@ -155,6 +164,58 @@ class QueryBuilder:
             logger.error(f"Query execution failed: {e}")
             raise QueryBuilderError(f"Query execution failed: {str(e)}")
 
+    def build_and_stream(
+        self,
+        query_config: Dict[str, Any],
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> QueryStream:
+        """
+        Build and execute a query, streaming rows through a server-side cursor.
+
+        Unlike build_and_execute(), rows are never all in memory: they are
+        fetched batch_size at a time (yield_per) and handed out as lists of
+        dicts, so exports of any size run in constant memory. The session
+        must stay open until the batches are consumed.
+
+        Args:
+            query_config: Same configuration as build_and_execute()
+            batch_size: Rows per batch
+
+        Returns:
+            QueryStream with column names and a batch iterator
+
+        Raises:
+            QueryValidationError: If configuration is invalid
+        """
+        query = self._build_query(query_config)
+
+        try:
+            result = self.db.execute(query.execution_options(yield_per=batch_size))
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            raise QueryBuilderError(f"Query execution failed: {str(e)}")
+
+        columns = list(result.keys())
+
+        def batches() -> Iterator[List[Dict[str, Any]]]:
+            try:
+                for partition in result.partitions():
+                    yield [dict(zip(columns, row)) for row in partition]
+            finally:
+                result.close()
+
+        return QueryStream(columns=columns, batches=batches())
+
+    def count_rows(self, query_config: Dict[str, Any]) -> int:
+        """
+        Count the rows a query configuration would return (honouring limit).
+
+        Raises:
+            QueryValidationError: If configuration is invalid
+        """
+        query = self._build_query(query_config)
+        return self.db.execute(select(func.count()).select_from(query.subquery())).scalar() or 0
+
     def _build_query(self, config: Dict[str, Any]) -> Select:
         """Build SQLAlchemy Core SELECT query from configuration"""
 
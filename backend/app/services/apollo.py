@@ -12,10 +12,12 @@ Rate Limits: 600 calls/hour (10 calls/minute)
 
 import os
 import httpx
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Mapping
 from datetime import datetime
 
 from app.core.logging import setup_logging
+from app.core.http_clients import get_http_client
 from app.core.exceptions import (
     MissingAPIKeyError,
     APIAuthenticationError,
@@ -28,6 +30,62 @@ from app.services.crm.base import Contact
 
 logger = setup_logging(__name__)
 
+BULK_MATCH_MAX_DETAILS = 10  # Apollo's per-request limit for /people/bulk_match
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ApolloRateLimit:
+    """Apollo rate-limit state reported in response headers (None when absent)."""
+    minute_requests_left: Optional[int] = None
+    hourly_requests_left: Optional[int] = None
+    daily_requests_left: Optional[int] = None
+    retry_after: Optional[int] = None  # Seconds, sent with 429 responses
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "ApolloRateLimit":
+        return cls(
+            minute_requests_left=_int_header(headers, "x-minute-requests-left"),
+            hourly_requests_left=_int_header(headers, "x-hourly-requests-left"),
+            daily_requests_left=_int_header(headers, "x-24-hour-requests-left"),
+            retry_after=_int_header(headers, "retry-after"),
+        )
+
+    @property
+    def daily_quota_exhausted(self) -> bool:
+        """The rolling 24-hour quota is used up; pausing won't help a batch run."""
+        return self.daily_requests_left == 0
+
+    def pause_seconds(self, now: Optional[datetime] = None) -> float:
+        """
+        How long to hold further requests, based on the minute/hourly windows.
+
+        Returns:
+            Seconds until the next request may be sent (0 if not throttled)
+        """
+        now = now or datetime.utcnow()
+        if self.retry_after:
+            return float(self.retry_after)
+        if self.hourly_requests_left == 0:
+            return 3600 - (now.minute * 60 + now.second)
+        if self.minute_requests_left == 0:
+            return 60 - now.second
+        return 0.0
+
+
+@dataclass
+class BulkMatchResult:
+    """Response of one /people/bulk_match call."""
+    matches: List[Optional[Dict[str, Any]]]  # Person per requested detail (None = no match), in request order
+    credits_consumed: int = 0
+    rate_limit: ApolloRateLimit = field(default_factory=ApolloRateLimit)
+
 
 class ApolloService:
     """
@@ -63,17 +121,18 @@ class ApolloService:
                 context={"api_key": "APOLLO_API_KEY"}
             )
         
-        # HTTP client for async requests
-        self.client = httpx.AsyncClient(
-            base_url=self.API_BASE_URL,
-            timeout=self.TIMEOUT,
-            headers={
-                "Content-Type": "application/json",
-                "Cache-Control": "no-cache",
-                "accept": "application/json",
-                "x-api-key": self.api_key
-            }
-        )
+        # Sent per request - the pooled client is shared across API keys
+        self.headers = {
+            "Content-Type": "application/json",
+            "Cache-Control": "no-cache",
+            "accept": "application/json",
+            "x-api-key": self.api_key
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled Apollo client (base_url is the Apollo API)"""
+        return get_http_client("apollo")
     
     async def enrich_contact(
         self,
@@ -134,7 +193,9 @@ class ApolloService:
         try:
             response = await self.client.post(
                 "/people/match",
-                params=params
+                params=params,
+                headers=self.headers,
+                timeout=self.TIMEOUT
             )
             
             # Handle response
@@ -212,7 +273,9 @@ class ApolloService:
         try:
             response = await self.client.post(
                 "/organizations/enrich",
-                params={"domain": clean_domain}
+                params={"domain": clean_domain},
+                headers=self.headers,
+                timeout=self.TIMEOUT
             )
             
             # Handle response
@@ -303,53 +366,92 @@ class ApolloService:
             APIAuthenticationError: If API key is invalid
             APIRateLimitError: If rate limit exceeded
         """
-        if len(contacts) > 10:
+        result = await self.bulk_match_people(contacts, reveal_personal_emails)
+        enriched_contacts = [self._map_person_to_contact(person) for person in result.matches if person]
+
+        logger.info(
+            f"Bulk enrichment complete: {len(enriched_contacts)} contacts enriched, "
+            f"{result.credits_consumed} credits consumed"
+        )
+
+        return enriched_contacts
+
+    async def bulk_match_people(
+        self,
+        details: List[Dict[str, str]],
+        reveal_personal_emails: bool = False
+    ) -> BulkMatchResult:
+        """
+        Match up to 10 people in one /people/bulk_match call.
+
+        Unlike bulk_enrich_contacts, returns the raw Apollo person objects
+        aligned with the request (None where Apollo found no match) plus the
+        credits consumed and rate-limit headers, for batch callers.
+
+        Args:
+            details: Person details (email, first_name, last_name, domain, ...)
+            reveal_personal_emails: Get personal emails (consumes extra credits)
+
+        Returns:
+            BulkMatchResult
+
+        Raises:
+            ValidationError: If more than 10 details
+            APIAuthenticationError: If API key is invalid
+            APIRateLimitError: If rate limit exceeded (retry_after set from headers)
+            APIConnectionError: If request fails
+        """
+        if len(details) > BULK_MATCH_MAX_DETAILS:
             raise ValidationError(
                 "Bulk enrichment limited to 10 contacts per request",
-                context={"provided": len(contacts), "max": 10}
+                context={"provided": len(details), "max": BULK_MATCH_MAX_DETAILS}
             )
-        
+
         # Build request body
         request_body = {
-            "details": contacts,
+            "details": details,
             "reveal_personal_emails": reveal_personal_emails
         }
-        
+
         try:
             response = await self.client.post(
                 "/people/bulk_match",
-                json=request_body
+                json=request_body,
+                headers=self.headers,
+                timeout=self.TIMEOUT
             )
-            
+
+            rate_limit = ApolloRateLimit.from_headers(response.headers)
+
             if response.status_code == 200:
                 data = response.json()
-                enriched_contacts = []
-                
-                for match in data.get("matches", []):
-                    person = match.get("person")
-                    if person:
-                        enriched_contacts.append(self._map_person_to_contact(person))
-                
-                logger.info(
-                    f"Bulk enrichment complete: {len(enriched_contacts)} contacts enriched, "
-                    f"{data.get('credits_consumed', 0)} credits consumed"
+                matches = [(match or {}).get("person") for match in data.get("matches") or []]
+                # Apollo returns one entry per detail; pad defensively
+                matches += [None] * (len(details) - len(matches))
+
+                return BulkMatchResult(
+                    matches=matches[:len(details)],
+                    credits_consumed=data.get("credits_consumed") or 0,
+                    rate_limit=rate_limit
                 )
-                
-                return enriched_contacts
-            
+
             elif response.status_code == 401:
                 raise APIAuthenticationError("Invalid Apollo API key")
-            
+
             elif response.status_code == 429:
                 error_data = response.json()
-                raise APIRateLimitError(f"Apollo rate limit exceeded: {error_data.get('message')}")
-            
+                raise APIRateLimitError(
+                    f"Apollo rate limit exceeded: {error_data.get('message')}",
+                    context={"status_code": 429, "response": error_data},
+                    retry_after=int(rate_limit.pause_seconds()) or None
+                )
+
             else:
                 raise APIConnectionError(f"Apollo API error: HTTP {response.status_code}")
-        
+
         except httpx.TimeoutException:
             raise APITimeoutError(f"Apollo bulk enrichment timed out after {self.TIMEOUT}s")
-        
+
         except httpx.RequestError as e:
             raise APIConnectionError(f"Failed to connect to Apollo API: {str(e)}")
     
@@ -450,7 +552,9 @@ class ApolloService:
         try:
             response = await self.client.post(
                 "/mixed_people/search",
-                json=search_params
+                json=search_params,
+                headers=self.headers,
+                timeout=self.TIMEOUT
             )
             
             # Handle response
@@ -551,5 +655,10 @@ class ApolloService:
         }
     
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """
+        Release resources owned by this service.
+
+        The HTTP client is the process-wide pool shared with concurrent
+        requests, so it is left open; it is closed on application or
+        worker shutdown (close_http_clients).
+        """
@@ -0,0 +1,243 @@
+"""
+Cache-first bulk Apollo enrichment.
+
+Enriching a lead import one /people/match call per email spends one HTTP
+round trip (and one credit) per contact, including contacts enriched on a
+previous run. ApolloEnrichmentBatcher instead:
+
+1. Looks every email up in ApolloPersonCache with a single MGET
+2. Sends only the misses to /people/bulk_match, 10 per call
+3. Paces calls through the shared rate limiter ("apollo" provider) and
+   honours Apollo's rate-limit headers - an exhausted minute/hourly window
+   pauses every worker sharing the limiter, an exhausted daily quota ends
+   the run
+4. Writes all results back to the cache in one pipeline, including
+   "no match" results so they aren't paid for again
+
+Usage:
+    batcher = ApolloEnrichmentBatcher(ApolloService(), cache=await get_apollo_person_cache(),
+                                      rate_limiter=await get_rate_limiter())
+    result = await batcher.enrich_emails(emails)
+    for email, person in result.people.items():
+        ...
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.exceptions import APIConnectionError, APIRateLimitError, APITimeoutError
+from app.core.logging import setup_logging
+from app.services.apollo import BULK_MATCH_MAX_DETAILS, ApolloRateLimit, ApolloService
+from app.services.cache.apollo_cache import ApolloPersonCache
+from app.services.rate_limiter import RateLimiter
+
+logger = setup_logging(__name__)
+
+RATE_LIMIT_PROVIDER = "apollo"
+RATE_LIMIT_ENDPOINT = "/people/bulk_match"
+
+
+@dataclass
+class EnrichmentBatchStats:
+    """Counters for one enrich_emails run."""
+    requested: int = 0
+    cache_hits: int = 0
+    api_calls: int = 0
+    matched: int = 0
+    not_found: int = 0
+    failed: int = 0
+    credits_consumed: int = 0
+    throttled_seconds: float = 0.0
+    daily_quota_exhausted: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class EnrichmentBatchResult:
+    """Outcome of enrich_emails."""
+    people: Dict[str, Optional[Dict[str, Any]]]  # Normalized email -> Apollo person (None = no match)
+    failed: List[str] = field(default_factory=list)  # Not enriched (errors or quota); retry later
+    stats: EnrichmentBatchStats = field(default_factory=EnrichmentBatchStats)
+
+
+class ApolloEnrichmentBatcher:
+    """
+    Enrich many emails through the Apollo cache and /people/bulk_match.
+
+    cache and rate_limiter are optional; without a limiter only Apollo's
+    own 429/Retry-After responses slow the run down.
+    """
+
+    def __init__(
+        self,
+        apollo: ApolloService,
+        cache: Optional[ApolloPersonCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        batch_size: int = BULK_MATCH_MAX_DETAILS,
+        max_concurrency: int = 2,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        limiter_key: Optional[str] = None,
+        reveal_personal_emails: bool = False,
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            apollo: Apollo service used for /people/bulk_match
+            cache: Apollo person cache (None disables caching)
+            rate_limiter: Shared rate limiter (None relies on Apollo's 429s)
+            batch_size: Emails per bulk_match call (max 10)
+            max_concurrency: bulk_match calls in flight
+            max_retries: Retries per batch on 429s, timeouts and connection errors
+            backoff_seconds: Base retry delay when Apollo sends no Retry-After
+            limiter_key: Rate limiter identity (default: the API key, so every
+                worker using that key shares its quota)
+            reveal_personal_emails: Ask Apollo for personal emails (extra credits)
+        """
+        self.apollo = apollo
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.batch_size = max(1, min(batch_size, BULK_MATCH_MAX_DETAILS))
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.limiter_key = limiter_key or apollo.api_key
+        self.reveal_personal_emails = reveal_personal_emails
+
+    async def enrich_emails(self, emails: Iterable[str]) -> EnrichmentBatchResult:
+        """
+        Enrich emails, cache first.
+
+        Args:
+            emails: Emails to enrich (normalized and de-duplicated)
+
+        Returns:
+            EnrichmentBatchResult keyed by normalized email
+
+        Raises:
+            APIAuthenticationError: If the Apollo API key is invalid
+        """
+        stats = EnrichmentBatchStats()
+        emails = list(dict.fromkeys(
+            ApolloPersonCache.normalize_email(e) for e in emails if e and e.strip()
+        ))
+        stats.requested = len(emails)
+
+        people: Dict[str, Optional[Dict[str, Any]]] = {}
+        if self.cache and emails:
+            people.update(await self.cache.get_people(emails))
+            stats.cache_hits = len(people)
+
+        misses = [email for email in emails if email not in people]
+        batches = [misses[i:i + self.batch_size] for i in range(0, len(misses), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+        failed: List[str] = []
+
+        async def run(batch: List[str]) -> None:
+            async with semaphore:
+                if stats.daily_quota_exhausted:
+                    failed.extend(batch)
+                    return
+                matches = await self._match_batch(batch, stats)
+                if matches is None:
+                    failed.extend(batch)
+                else:
+                    fetched.update(zip(batch, matches))
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+
+        if self.cache and fetched:
+            await self.cache.set_people(fetched)
+
+        people.update(fetched)
+        stats.matched = sum(1 for person in people.values() if person)
+        stats.not_found = len(people) - stats.matched
+        stats.failed = len(failed)
+
+        logger.info(f"Apollo batch enrichment complete: {stats.as_dict()}")
+        return EnrichmentBatchResult(people=people, failed=failed, stats=stats)
+
+    async def _match_batch(
+        self,
+        batch: List[str],
+        stats: EnrichmentBatchStats
+    ) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """Call bulk_match for one batch, with retries; None if it failed."""
+        details = [{"email": email} for email in batch]
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(stats)
+            try:
+                stats.api_calls += 1
+                result = await self.apollo.bulk_match_people(details, self.reveal_personal_emails)
+            except APIRateLimitError as e:
+                delay = e.retry_after or self.backoff_seconds * 2 ** attempt
+                logger.warning(f"Apollo rate limited (attempt {attempt + 1}), retrying in {delay:.1f}s")
+                await self._pause(delay, stats)
+                continue
+            except (APITimeoutError, APIConnectionError) as e:
+                delay = self.backoff_seconds * 2 ** attempt
+                logger.warning(f"Apollo bulk_match failed (attempt {attempt + 1}): {e}")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(delay)
+                continue
+
+            stats.credits_consumed += result.credits_consumed
+            await self._observe(result.rate_limit, stats)
+            return result.matches
+
+        logger.error(f"Apollo bulk_match gave up on {len(batch)} emails after {self.max_retries + 1} attempts")
+        return None
+
+    async def _acquire(self, stats: EnrichmentBatchStats) -> None:
+        """Wait until the shared limiter allows one more Apollo call."""
+        if self.rate_limiter is None:
+            return
+
+        while True:
+            paused = await self.rate_limiter.paused_for(self.limiter_key, RATE_LIMIT_PROVIDER)
+            if paused > 0:
+                await self._sleep(paused, stats)
+                continue
+
+            result = await self.rate_limiter.check_rate_limit(
+                self.limiter_key, RATE_LIMIT_PROVIDER, RATE_LIMIT_ENDPOINT
+            )
+            if result.allowed:
+                await self.rate_limiter.record_request(self.limiter_key, RATE_LIMIT_PROVIDER, RATE_LIMIT_ENDPOINT)
+                return
+            await self._sleep(result.retry_after or 1, stats)
+
+    async def _observe(self, rate_limit: ApolloRateLimit, stats: EnrichmentBatchStats) -> None:
+        """Apply Apollo's rate-limit headers from a successful call."""
+        if rate_limit.daily_quota_exhausted:
+            if not stats.daily_quota_exhausted:
+                logger.warning("Apollo daily request quota exhausted; stopping batch enrichment")
+            stats.daily_quota_exhausted = True
+            return
+
+        pause = rate_limit.pause_seconds()
+        if pause > 0:
+            if self.rate_limiter is not None:
+                # Held by every worker sharing the limiter; picked up by _acquire
+                await self.rate_limiter.pause(self.limiter_key, RATE_LIMIT_PROVIDER, pause)
+            else:
+                await self._sleep(pause, stats)
+
+    async def _pause(self, seconds: float, stats: EnrichmentBatchStats) -> None:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.pause(self.limiter_key, RATE_LIMIT_PROVIDER, seconds)
+        else:
+            await self._sleep(seconds, stats)
+
+    @staticmethod
+    async def _sleep(seconds: float, stats: EnrichmentBatchStats) -> None:
+        started = time.monotonic()
+        await asyncio.sleep(seconds)
+        stats.throttled_seconds += time.monotonic() - started
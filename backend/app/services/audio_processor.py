@@ -2,14 +2,21 @@
 Real-time audio processing service for conversation intelligence
 
 Handles audio buffering, format conversion, and coordination with transcription service.
+PCM, WAV and WebM streams are segmented into utterances by voice activity, so
+STT runs once per utterance right after end-of-speech.
 """
 
 import asyncio
 import logging
 import time
 from typing import Optional, Dict, Any, List, Callable
-from collections import deque
-import io
+
+from .audio_segmenter import (
+    EnergyVAD,
+    SpeechSegment,
+    UtteranceSegmenter,
+    create_frame_decoder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,63 +36,216 @@ class AudioBuffer:
     """
     Buffer for accumulating audio chunks before transcription.
 
-    Manages sliding window of audio data to ensure we have enough context
-    for accurate transcription.
+    Chunks are written once into a preallocated bytearray and addressed by
+    stream byte offsets; frame decoders read memoryview slices, so buffered
+    audio is never re-joined per chunk. For formats with a frame decoder
+    (pcm, wav, webm) duration is measured from decoded frames and an energy
+    VAD cuts utterance segments at end-of-speech. Other formats fall back to
+    a bitrate-estimated duration and min/max thresholds.
     """
 
-    def __init__(self, min_duration_ms: int = 2000, max_duration_ms: int = 5000):
+    ESTIMATED_BYTES_PER_SECOND = 100_000  # Typical WebM bitrate, fallback only
+    INITIAL_CAPACITY = 256 * 1024
+
+    def __init__(
+        self,
+        min_duration_ms: int = 2000,
+        max_duration_ms: int = 5000,
+        audio_format: Optional[str] = None,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        end_silence_ms: int = 500
+    ):
         """
         Initialize audio buffer.
 
         Args:
             min_duration_ms: Minimum audio duration before triggering transcription
+                (formats without a frame decoder only)
             max_duration_ms: Maximum audio duration before forcing transcription
+                (also the longest utterance segment)
+            audio_format: Stream format; taken from the first chunk if omitted
+            sample_rate: Sample rate for raw PCM streams
+            channels: Channel count for raw PCM streams
+            end_silence_ms: Silence that ends an utterance
         """
         self.min_duration_ms = min_duration_ms
         self.max_duration_ms = max_duration_ms
-
-        self.chunks: deque[AudioChunk] = deque()
-        self.total_bytes = 0
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.end_silence_ms = end_silence_ms
+
+        self.audio_format: Optional[str] = None
+        self.decoder = None
+        self.segmenter: Optional[UtteranceSegmenter] = None
+
+        self._buf = bytearray(self.INITIAL_CAPACITY)
+        self._base = 0  # Stream offset of _buf[0]
+        self._write = 0  # Stream offset one past the last written byte
+        self._parse = 0  # Stream offset of the first byte not yet decoded
+        self._live = 0  # Stream offset of the first byte still needed
+        self._init_segment = b""
+        self._init_captured = False
+
+        self.num_chunks = 0
         self.total_duration_ms = 0
         self.first_chunk_timestamp: Optional[float] = None
 
-    def add_chunk(self, chunk: AudioChunk):
-        """Add an audio chunk to the buffer."""
-        self.chunks.append(chunk)
-        self.total_bytes += chunk.size_bytes
+        if audio_format:
+            self._configure(audio_format)
+
+    @property
+    def supports_segmentation(self) -> bool:
+        """True when utterances are cut by VAD rather than by size."""
+        return self.decoder is not None
+
+    @property
+    def total_bytes(self) -> int:
+        """Buffered bytes still needed for transcription."""
+        return self._write - self._live
+
+    def _configure(self, audio_format: str):
+        self.audio_format = audio_format
+        self.decoder = create_frame_decoder(audio_format, self.sample_rate, self.channels)
+        if self.decoder:
+            self.segmenter = self._new_segmenter()
+
+    def _new_segmenter(self, vad: Optional[EnergyVAD] = None) -> UtteranceSegmenter:
+        return UtteranceSegmenter(
+            vad=vad or EnergyVAD(min_energy=self.decoder.min_energy),
+            end_silence_ms=self.end_silence_ms,
+            max_segment_ms=self.max_duration_ms
+        )
+
+    def add_chunk(self, chunk: AudioChunk) -> List[SpeechSegment]:
+        """
+        Add an audio chunk to the buffer.
+
+        Returns:
+            Utterance segments completed by this chunk (always empty for
+            formats without a frame decoder)
+        """
+        if self.audio_format is None:
+            self._configure(chunk.format)
+
+        self._append(chunk.data)
+        self.num_chunks += 1
 
         if self.first_chunk_timestamp is None:
             self.first_chunk_timestamp = chunk.timestamp
 
-        # Estimate duration based on typical bitrate (100KB/sec for WebM)
-        estimated_duration_ms = (self.total_bytes / 100_000) * 1000
-        self.total_duration_ms = estimated_duration_ms
+        if not self.decoder:
+            # Estimate duration based on typical bitrate
+            self.total_duration_ms = (self.total_bytes / self.ESTIMATED_BYTES_PER_SECOND) * 1000
+            return []
+
+        return self._decode()
+
+    def _append(self, data: bytes):
+        """Copy chunk bytes into the buffer, compacting or growing it if full."""
+        size = len(data)
+        if self._write + size - self._base > len(self._buf):
+            keep = self._write - self._live
+            live = self._buf[self._live - self._base:self._write - self._base]
+            if keep + size > len(self._buf):
+                # Allocate a new array instead of resizing (views may be exported)
+                self._buf = bytearray(max(keep + size, len(self._buf) * 2))
+            self._buf[:keep] = live
+            self._base = self._live
+
+        offset = self._write - self._base
+        self._buf[offset:offset + size] = data
+        self._write += size
+
+    def _decode(self) -> List[SpeechSegment]:
+        view = memoryview(self._buf)[self._parse - self._base:self._write - self._base]
+        try:
+            frames, consumed = self.decoder.feed(view, self._parse)
+        except ValueError as e:
+            # Undecodable stream: keep buffering by size like other formats
+            logger.warning(f"Cannot decode {self.audio_format} audio ({e}); falling back to size-based buffering")
+            self.decoder = None
+            self.segmenter = None
+            self._parse = self._write
+            self.total_duration_ms = (self.total_bytes / self.ESTIMATED_BYTES_PER_SECOND) * 1000
+            return []
+        self._parse += consumed
+
+        if not self._init_captured and self.decoder.init_end is not None:
+            if self.decoder.keeps_init_segment:
+                self._init_segment = bytes(self._buf[self._live - self._base:self.decoder.init_end - self._base])
+            self._init_captured = True
+            self._live = self.decoder.init_end
+
+        segments = []
+        for frame in frames:
+            bounds = self.segmenter.process(frame)
+            if bounds:
+                segments.append(self._cut(*bounds))
+
+        if self._init_captured:
+            keep_from = self.segmenter.keep_from
+            self._live = max(self._live, self._parse if keep_from is None else keep_from)
+        self.total_duration_ms = self.segmenter.buffered_ms
+        return segments
+
+    def _cut(self, start: int, end: int, duration_ms: float) -> SpeechSegment:
+        """Build a self-contained segment file from a buffered byte range."""
+        data = memoryview(self._buf)[start - self._base:end - self._base]
+        prefix = self._init_segment + self.decoder.segment_prefix(start, end - start)
+        self._live = max(self._live, end)
+        return SpeechSegment(
+            audio=b"".join((prefix, data)),
+            audio_format=self.decoder.output_format,
+            duration_ms=duration_ms,
+            start_offset=start,
+            end_offset=end
+        )
+
+    def flush_segment(self) -> Optional[SpeechSegment]:
+        """End the utterance in progress, if any (e.g. when the stream stops)."""
+        if not self.decoder:
+            return None
+        bounds = self.segmenter.flush(self._parse)
+        if not bounds:
+            return None
+        segment = self._cut(*bounds)
+        self.total_duration_ms = 0
+        return segment
 
     def is_ready_for_transcription(self) -> bool:
         """Check if buffer has enough audio for transcription."""
-        return self.total_duration_ms >= self.min_duration_ms
+        return not self.decoder and self.total_duration_ms >= self.min_duration_ms
 
     def should_force_transcription(self) -> bool:
         """Check if buffer should be forcibly transcribed (too full)."""
-        return self.total_duration_ms >= self.max_duration_ms
+        return not self.decoder and self.total_duration_ms >= self.max_duration_ms
 
     def get_combined_audio(self) -> bytes:
-        """Combine all chunks into a single audio buffer."""
-        return b''.join(chunk.data for chunk in self.chunks)
+        """Return all buffered audio (with container header) as one buffer."""
+        data = memoryview(self._buf)[self._live - self._base:self._write - self._base]
+        return b"".join((self._init_segment, data))
 
     def clear(self):
-        """Clear the buffer."""
-        self.chunks.clear()
-        self.total_bytes = 0
+        """Clear the buffer (the decoder keeps its position in the stream)."""
+        self._live = self._parse if self.decoder else self._write
+        if not self.decoder:
+            self._parse = self._write
+        if self.segmenter:
+            self.segmenter = self._new_segmenter(self.segmenter.vad)
+        self.num_chunks = 0
         self.total_duration_ms = 0
         self.first_chunk_timestamp = None
 
     def get_info(self) -> Dict[str, Any]:
         """Get buffer information."""
         return {
-            "num_chunks": len(self.chunks),
+            "num_chunks": self.num_chunks,
             "total_bytes": self.total_bytes,
             "estimated_duration_ms": self.total_duration_ms,
+            "audio_format": self.audio_format,
+            "vad_segmentation": self.supports_segmentation,
+            "in_speech": bool(self.segmenter and self.segmenter.in_speech),
             "is_ready": self.is_ready_for_transcription(),
             "should_force": self.should_force_transcription(),
         }
@@ -106,6 +266,7 @@ class AudioProcessor:
         on_transcription_callback: Optional[Callable] = None,
         min_buffer_duration_ms: int = 2000,
         max_buffer_duration_ms: int = 5000,
+        sample_rate: int = 16000,
     ):
         """
         Initialize audio processor.
@@ -115,13 +276,15 @@ class AudioProcessor:
             transcription_service: TranscriptionService instance
             on_transcription_callback: Async callback when transcription completes
             min_buffer_duration_ms: Minimum audio duration before transcription
+                (formats without VAD segmentation)
             max_buffer_duration_ms: Maximum audio duration before forcing transcription
+            sample_rate: Sample rate of raw PCM input
         """
         self.conversation_id = conversation_id
         self.transcription_service = transcription_service
         self.on_transcription_callback = on_transcription_callback
 
-        self.buffer = AudioBuffer(min_buffer_duration_ms, max_buffer_duration_ms)
+        self.buffer = AudioBuffer(min_buffer_duration_ms, max_buffer_duration_ms, sample_rate=sample_rate)
 
         self.sequence_number = 0
         self.is_processing = False
@@ -143,7 +306,8 @@ class AudioProcessor:
         """
         Process an incoming audio chunk.
 
-        Buffers the chunk and triggers transcription when appropriate.
+        Buffers the chunk and transcribes any utterance it completes. Formats
+        without VAD segmentation are transcribed on buffer duration instead.
 
         Args:
             audio_data: Raw audio bytes
@@ -170,17 +334,76 @@ class AudioProcessor:
         self.total_audio_bytes += len(audio_data)
 
         # Add to buffer
-        self.buffer.add_chunk(chunk)
+        segments = self.buffer.add_chunk(chunk)
 
         logger.debug(f"Audio chunk {chunk.sequence_number} added: {len(audio_data)} bytes. Buffer: {self.buffer.get_info()}")
 
-        # Check if we should transcribe
-        should_transcribe = force_transcribe or self.buffer.is_ready_for_transcription() or self.buffer.should_force_transcription()
+        result = None
+        for segment in segments:
+            result = await self._transcribe_segment(segment)
+
+        if force_transcribe:
+            return await self.flush(audio_format) or result
+
+        # Check if we should transcribe (formats without VAD segmentation)
+        should_transcribe = self.buffer.is_ready_for_transcription() or self.buffer.should_force_transcription()
 
         if should_transcribe and not self.is_processing:
             return await self._trigger_transcription(audio_format)
 
-        return None
+        return result
+
+    async def _transcribe_segment(self, segment: SpeechSegment) -> Dict[str, Any]:
+        """
+        Transcribe one VAD utterance segment.
+
+        Args:
+            segment: Completed utterance
+
+        Returns:
+            Transcription result
+        """
+        self.is_processing = True
+
+        try:
+            logger.info(
+                f"Transcribing utterance for {self.conversation_id}: "
+                f"{segment.duration_ms:.0f}ms, {len(segment.audio)} bytes"
+            )
+
+            result = await self.transcription_service.transcribe_audio(
+                audio_data=segment.audio,
+                audio_format=segment.audio_format,
+            )
+
+            self.total_transcriptions += 1
+
+            # Add metadata (measured duration replaces the service's estimate)
+            result["conversation_id"] = self.conversation_id
+            result["sequence_number"] = self.sequence_number - 1
+            result["duration_seconds"] = round(segment.duration_ms / 1000, 3)
+            result["buffer_info"] = self.buffer.get_info()
+
+            await self._notify(result)
+
+            logger.info(f"Transcription completed: '{result['text'][:50]}...' ({result['latency_ms']}ms)")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Transcription failed for {self.conversation_id}: {e}")
+            raise
+
+        finally:
+            self.is_processing = False
+
+    async def _notify(self, result: Dict[str, Any]):
+        """Call the transcription callback, if provided."""
+        if self.on_transcription_callback:
+            try:
+                await self.on_transcription_callback(result)
+            except Exception as e:
+                logger.error(f"Transcription callback error: {e}")
 
     async def _trigger_transcription(self, audio_format: str) -> Dict[str, Any]:
         """
@@ -215,18 +438,13 @@ class AudioProcessor:
 
             # Add metadata
             result["conversation_id"] = self.conversation_id
-            result["sequence_number"] = self.sequence_number - len(self.buffer.chunks)
+            result["sequence_number"] = self.sequence_number - self.buffer.num_chunks
             result["buffer_info"] = buffer_info
 
             # Clear buffer
             self.buffer.clear()
 
-            # Call callback if provided
-            if self.on_transcription_callback:
-                try:
-                    await self.on_transcription_callback(result)
-                except Exception as e:
-                    logger.error(f"Transcription callback error: {e}")
+            await self._notify(result)
 
             logger.info(f"Transcription completed: '{result['text'][:50]}...' ({result['latency_ms']}ms)")
 
@@ -252,7 +470,14 @@ class AudioProcessor:
         Returns:
             Transcription result if buffer not empty, None otherwise
         """
-        if len(self.buffer.chunks) == 0:
+        if self.buffer.supports_segmentation:
+            segment = self.buffer.flush_segment()
+            if segment is None:
+                return None
+            logger.info(f"Flushing utterance in progress for {self.conversation_id}")
+            return await self._transcribe_segment(segment)
+
+        if self.buffer.num_chunks == 0:
             return None
 
         logger.info(f"Flushing audio buffer for {self.conversation_id}")
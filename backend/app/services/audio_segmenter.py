@@ -0,0 +1,433 @@
+"""
+Voice-activity segmentation for streamed audio
+
+Turns a stream of audio chunks into utterance segments at end-of-speech:
+- Frame decoders measure real duration and per-frame energy
+  - PCM (raw s16le or WAV): 20ms frames, RMS energy
+  - WebM/Opus (MediaRecorder): container-level parsing of (Simple)Blocks;
+    duration from the Opus TOC byte, packet size as the energy proxy
+    (Opus VBR spends very few bytes on silence)
+- EnergyVAD classifies frames against an adaptive noise floor
+- UtteranceSegmenter applies min-speech / end-silence hangover rules and
+  returns byte ranges to cut, so the caller can slice its buffer directly
+"""
+
+import logging
+import struct
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# EBML / Matroska element IDs
+EBML_ID = 0x1A45DFA3
+SEGMENT_ID = 0x18538067
+CLUSTER_ID = 0x1F43B675
+TIMECODE_ID = 0xE7
+BLOCK_GROUP_ID = 0xA0
+BLOCK_ID = 0xA1
+SIMPLE_BLOCK_ID = 0xA3
+
+# Master elements whose children are parsed in place (may have unknown size)
+DESCEND_IDS = {SEGMENT_ID, CLUSTER_ID, BLOCK_GROUP_ID}
+
+# Opus frame duration (ms) by TOC config, RFC 6716 section 3.1
+OPUS_FRAME_MS = (
+    [10, 20, 40, 60] * 3      # SILK NB/MB/WB
+    + [10, 20] * 2            # Hybrid SWB/FB
+    + [2.5, 5, 10, 20] * 4    # CELT NB/WB/SWB/FB
+)
+
+
+@dataclass
+class AudioFrame:
+    """One decoded frame, addressed by absolute stream byte offsets."""
+    start: int  # First byte of the frame
+    end: int  # One past the last byte of the frame
+    duration_ms: float
+    energy: float
+
+
+@dataclass
+class SpeechSegment:
+    """A complete utterance ready for transcription."""
+    audio: bytes  # Self-contained file (container header included)
+    audio_format: str
+    duration_ms: float
+    start_offset: int
+    end_offset: int
+
+
+def _read_vint(view: memoryview, pos: int, keep_marker: bool) -> Optional[Tuple[int, int]]:
+    """Read an EBML variable-length integer; None if incomplete."""
+    if pos >= len(view):
+        return None
+    first = view[pos]
+    if first == 0:
+        raise ValueError("Invalid EBML variable-length integer")
+
+    length = 1
+    mask = 0x80
+    while not first & mask:
+        mask >>= 1
+        length += 1
+    if pos + length > len(view):
+        return None
+
+    value = first if keep_marker else first & (mask - 1)
+    for i in range(1, length):
+        value = (value << 8) | view[pos + i]
+    return value, length
+
+
+def opus_packet_duration_ms(packet: memoryview) -> float:
+    """Duration of an Opus packet from its TOC byte (RFC 6716 section 3.1)."""
+    if not len(packet):
+        return 0.0
+    toc = packet[0]
+    frame_ms = OPUS_FRAME_MS[toc >> 3]
+    code = toc & 0x03
+    if code == 0:
+        frames = 1
+    elif code in (1, 2):
+        frames = 2
+    else:
+        frames = packet[1] & 0x3F if len(packet) > 1 else 1
+    return frame_ms * frames
+
+
+class PCMFrameDecoder:
+    """
+    Splits 16-bit little-endian PCM into fixed frames with RMS energy.
+
+    Accepts raw PCM or a WAV stream (the RIFF header is parsed and dropped);
+    segments are re-wrapped as WAV so they can be sent to STT as-is.
+    """
+
+    output_format = "wav"
+    keeps_init_segment = False  # Segments get a fresh WAV header instead
+    min_energy = 300.0  # RMS of int16 samples, about -40 dBFS
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1, frame_ms: int = 20, wav: bool = False):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_ms = frame_ms
+        self._expect_wav_header = wav
+        self._frame_bytes = self._compute_frame_bytes()
+        self.init_end: Optional[int] = None if wav else 0  # Stream offset where audio data begins
+
+    def _compute_frame_bytes(self) -> int:
+        return int(self.sample_rate * self.frame_ms / 1000) * self.channels * 2
+
+    def _parse_wav_header(self, view: memoryview) -> Optional[int]:
+        """Return the offset of the data chunk payload; None if incomplete."""
+        if len(view) < 12:
+            return None
+        if bytes(view[0:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+            raise ValueError("Invalid WAV header")
+
+        pos = 12
+        while pos + 8 <= len(view):
+            chunk_id = bytes(view[pos:pos + 4])
+            chunk_size = struct.unpack_from("<I", view, pos + 4)[0]
+            if chunk_id == b"data":
+                return pos + 8
+            if chunk_id == b"fmt ":
+                if pos + 8 + 16 > len(view):
+                    return None
+                _, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", view, pos + 8)
+                if bits != 16:
+                    raise ValueError(f"Unsupported WAV sample width: {bits} bits")
+                self.channels = channels
+                self.sample_rate = sample_rate
+                self._frame_bytes = self._compute_frame_bytes()
+            pos += 8 + chunk_size + (chunk_size & 1)
+        return None
+
+    def feed(self, view: memoryview, offset: int) -> Tuple[List[AudioFrame], int]:
+        """
+        Decode complete frames from unparsed bytes.
+
+        Args:
+            view: Unparsed bytes, starting at stream offset `offset`
+            offset: Absolute stream offset of view[0]
+
+        Returns:
+            (frames, bytes consumed)
+        """
+        consumed = 0
+        if self._expect_wav_header:
+            data_start = self._parse_wav_header(view)
+            if data_start is None:
+                return [], 0
+            self._expect_wav_header = False
+            self.init_end = offset + data_start
+            consumed = data_start
+
+        n_frames = (len(view) - consumed) // self._frame_bytes
+        if n_frames == 0:
+            return [], consumed
+
+        samples = np.frombuffer(
+            view[consumed:consumed + n_frames * self._frame_bytes], dtype="<i2"
+        ).reshape(n_frames, -1).astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples, axis=1))
+
+        frames = []
+        start = offset + consumed
+        for energy in rms:
+            frames.append(AudioFrame(
+                start=start,
+                end=start + self._frame_bytes,
+                duration_ms=self.frame_ms,
+                energy=float(energy)
+            ))
+            start += self._frame_bytes
+        return frames, consumed + n_frames * self._frame_bytes
+
+    def segment_prefix(self, start_offset: int, data_length: int) -> bytes:
+        """WAV header for a segment of `data_length` PCM bytes."""
+        byte_rate = self.sample_rate * self.channels * 2
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + data_length, b"WAVE",
+            b"fmt ", 16, 1, self.channels, self.sample_rate, byte_rate, self.channels * 2, 16,
+            b"data", data_length
+        )
+
+
+class WebMFrameDecoder:
+    """
+    Incremental Matroska/WebM parser yielding Opus packets as frames.
+
+    Only the container is parsed (no audio decoding). Everything before the
+    first Cluster is the init segment. Segments start at a block; they are
+    prefixed with the init segment and a synthesized unknown-size Cluster
+    header carrying the enclosing cluster's timecode, so each is a playable
+    file and no audio is repeated across segments.
+    """
+
+    output_format = "webm"
+    keeps_init_segment = True
+    min_energy = 40.0  # Opus bytes per 20ms, about 16 kbit/s
+    MAX_TRACKED_CLUSTERS = 64
+
+    def __init__(self):
+        self.init_end: Optional[int] = None
+        self._cluster_start: Optional[int] = None
+        self._cluster_timecodes: Deque[Tuple[int, int]] = deque(maxlen=self.MAX_TRACKED_CLUSTERS)
+
+    def feed(self, view: memoryview, offset: int) -> Tuple[List[AudioFrame], int]:
+        """
+        Parse complete elements from unparsed bytes.
+
+        Args:
+            view: Unparsed bytes, starting at stream offset `offset`
+            offset: Absolute stream offset of view[0]
+
+        Returns:
+            (frames, bytes consumed)
+        """
+        frames: List[AudioFrame] = []
+        pos = 0
+
+        while True:
+            element_id = _read_vint(view, pos, keep_marker=True)
+            if element_id is None:
+                break
+            size = _read_vint(view, pos + element_id[1], keep_marker=False)
+            if size is None:
+                break
+
+            header_len = element_id[1] + size[1]
+            unknown_size = size[0] == (1 << (7 * size[1])) - 1
+
+            if element_id[0] in DESCEND_IDS or unknown_size:
+                if element_id[0] == CLUSTER_ID:
+                    self._cluster_start = offset + pos
+                    if self.init_end is None:
+                        self.init_end = offset + pos
+                pos += header_len
+                continue
+
+            end = pos + header_len + size[0]
+            if end > len(view):
+                break
+
+            if element_id[0] == TIMECODE_ID and self._cluster_start is not None:
+                timecode = int.from_bytes(view[pos + header_len:end], "big")
+                self._cluster_timecodes.append((self._cluster_start, timecode))
+            elif element_id[0] in (SIMPLE_BLOCK_ID, BLOCK_ID) and self._cluster_start is not None:
+                frame = self._parse_block(view[pos + header_len:end], offset + pos, offset + end)
+                if frame:
+                    frames.append(frame)
+            pos = end
+
+        return frames, pos
+
+    def _parse_block(self, block: memoryview, start: int, end: int) -> Optional[AudioFrame]:
+        track = _read_vint(block, 0, keep_marker=False)
+        if track is None:
+            return None
+        # Track number, int16 relative timecode, flags byte
+        payload = block[track[1] + 3:]
+        duration_ms = opus_packet_duration_ms(payload)
+        if duration_ms <= 0:
+            return None
+        return AudioFrame(
+            start=start,
+            end=end,
+            duration_ms=duration_ms,
+            energy=len(payload) * 20.0 / duration_ms
+        )
+
+    def segment_prefix(self, start_offset: int, data_length: int) -> bytes:
+        """Cluster header re-opening the cluster that contains `start_offset`."""
+        timecode = 0
+        for cluster_start, cluster_timecode in self._cluster_timecodes:
+            if cluster_start > start_offset:
+                break
+            timecode = cluster_timecode
+
+        timecode_bytes = timecode.to_bytes(max(1, (timecode.bit_length() + 7) // 8), "big")
+        return (
+            CLUSTER_ID.to_bytes(4, "big")
+            + b"\x01\xff\xff\xff\xff\xff\xff\xff"  # Unknown size
+            + bytes([TIMECODE_ID, 0x80 | len(timecode_bytes)])
+            + timecode_bytes
+        )
+
+
+class EnergyVAD:
+    """
+    Energy threshold VAD with an adaptive noise floor.
+
+    A frame is speech when its energy exceeds both `min_energy` and
+    `ratio` times the running noise floor (EMA over non-speech frames).
+    """
+
+    def __init__(self, min_energy: float, ratio: float = 3.0, floor_alpha: float = 0.05):
+        self.min_energy = min_energy
+        self.ratio = ratio
+        self.floor_alpha = floor_alpha
+        self.noise_floor: Optional[float] = None
+
+    def is_speech(self, energy: float) -> bool:
+        threshold = self.min_energy
+        if self.noise_floor is not None:
+            threshold = max(threshold, self.noise_floor * self.ratio)
+
+        speech = energy > threshold
+        if not speech:
+            if self.noise_floor is None:
+                self.noise_floor = energy
+            else:
+                self.noise_floor += self.floor_alpha * (energy - self.noise_floor)
+        return speech
+
+
+class UtteranceSegmenter:
+    """
+    Hangover state machine over VAD decisions.
+
+    An utterance starts after `min_speech_ms` of consecutive speech (plus
+    up to `pre_roll_ms` of leading audio) and ends after `end_silence_ms`
+    of silence, or is cut at `max_segment_ms`.
+    """
+
+    def __init__(
+        self,
+        vad: EnergyVAD,
+        min_speech_ms: float = 120,
+        end_silence_ms: float = 500,
+        pre_roll_ms: float = 200,
+        max_segment_ms: float = 15000
+    ):
+        self.vad = vad
+        self.min_speech_ms = min_speech_ms
+        self.end_silence_ms = end_silence_ms
+        self.pre_roll_ms = pre_roll_ms
+        self.max_segment_ms = max_segment_ms
+
+        self.in_speech = False
+        self._recent: Deque[AudioFrame] = deque()
+        self._recent_ms = 0.0
+        self._speech_run_ms = 0.0
+        self._silence_ms = 0.0
+        self._segment_start: Optional[int] = None
+        self._segment_ms = 0.0
+
+    @property
+    def buffered_ms(self) -> float:
+        """Audio duration the caller still needs to keep."""
+        return self._segment_ms if self.in_speech else self._recent_ms
+
+    @property
+    def keep_from(self) -> Optional[int]:
+        """Earliest stream offset still needed, or None if nothing is."""
+        if self.in_speech:
+            return self._segment_start
+        return self._recent[0].start if self._recent else None
+
+    def process(self, frame: AudioFrame) -> Optional[Tuple[int, int, float]]:
+        """
+        Feed one frame.
+
+        Returns:
+            (start_offset, end_offset, duration_ms) when an utterance ends
+        """
+        speech = self.vad.is_speech(frame.energy)
+
+        if not self.in_speech:
+            self._recent.append(frame)
+            self._recent_ms += frame.duration_ms
+            self._speech_run_ms = self._speech_run_ms + frame.duration_ms if speech else 0.0
+
+            while self._recent and self._recent_ms - self._recent[0].duration_ms >= self.pre_roll_ms + self._speech_run_ms:
+                self._recent_ms -= self._recent.popleft().duration_ms
+
+            if self._speech_run_ms >= self.min_speech_ms:
+                self.in_speech = True
+                self._segment_start = self._recent[0].start
+                self._segment_ms = self._recent_ms
+                self._silence_ms = 0.0
+            return None
+
+        self._segment_ms += frame.duration_ms
+        self._silence_ms = 0.0 if speech else self._silence_ms + frame.duration_ms
+
+        if self._silence_ms >= self.end_silence_ms or self._segment_ms >= self.max_segment_ms:
+            return self._end_segment(frame.end)
+        return None
+
+    def flush(self, end_offset: int) -> Optional[Tuple[int, int, float]]:
+        """End an utterance in progress (e.g. when the stream stops)."""
+        if not self.in_speech:
+            return None
+        return self._end_segment(end_offset)
+
+    def _end_segment(self, end_offset: int) -> Tuple[int, int, float]:
+        result = (self._segment_start, end_offset, self._segment_ms)
+        self.in_speech = False
+        self._recent.clear()
+        self._recent_ms = 0.0
+        self._speech_run_ms = 0.0
+        self._silence_ms = 0.0
+        self._segment_start = None
+        self._segment_ms = 0.0
+        return result
+
+
+def create_frame_decoder(audio_format: str, sample_rate: int = 16000, channels: int = 1):
+    """Frame decoder for a format, or None if it can't be segmented."""
+    audio_format = (audio_format or "").lower()
+    if audio_format in ("pcm", "raw", "s16le", "linear16"):
+        return PCMFrameDecoder(sample_rate=sample_rate, channels=channels)
+    if audio_format == "wav":
+        return PCMFrameDecoder(sample_rate=sample_rate, channels=channels, wav=True)
+    if audio_format == "webm":
+        return WebMFrameDecoder()
+    return None
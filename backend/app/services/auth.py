@@ -1,20 +1,26 @@
 """
 Authentication and authorization service for JWT token management and user authentication.
 """
+import asyncio
+import json
 import os
 import secrets
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, FrozenSet, Tuple
 
 import jwt
 from jwt import PyJWTError
 from pwdlib import PasswordHash
 from pwdlib.hashers.bcrypt import BcryptHasher
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.security import User, Role, Permission
 from app.core.logging import setup_logging
 from app.core.exceptions import APIAuthenticationError
+from app.services.cache.principal_cache import PrincipalCache
+from app.services.cache_manager import LocalLRUCache
 
 logger = setup_logging(__name__)
 
@@ -32,6 +38,78 @@ JWT_REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "
 # Password hashing configuration
 password_hash = PasswordHash((BcryptHasher(),))  # Uses bcrypt explicitly
 
+# bcrypt is CPU-bound (hundreds of ms per verify); async routes run it on
+# this bounded pool instead of the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+# Principal caching (see AuthService.aget_current_principal)
+PRINCIPAL_CACHE_ENABLED = os.getenv("PRINCIPAL_CACHE_ENABLED", "true").lower() == "true"
+# Revocation, deactivation and role changes only drop the in-process entry of
+# the worker they run on; this TTL bounds how long other workers keep serving
+# the stale principal
+PRINCIPAL_LOCAL_TTL_SECONDS = float(os.getenv("PRINCIPAL_LOCAL_TTL_SECONDS", "30"))
+_local_principals = LocalLRUCache(max_entries=10000, ttl_seconds=PRINCIPAL_LOCAL_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class AuthenticatedPrincipal:
+    """
+    Authorization view of a user, resolved once per user and token version.
+
+    Role and permission names are precomputed frozensets, so authorization
+    checks are set lookups instead of relationship loads.
+    """
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    is_superuser: bool
+    token_version: int
+    roles: FrozenSet[str] = frozenset()
+    permissions: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedPrincipal":
+        """Build a principal from a user with roles and permissions loaded"""
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            token_version=user.refresh_token_version,
+            roles=frozenset(role.name for role in user.roles),
+            permissions=frozenset(perm.name for role in user.roles for perm in role.permissions),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AuthenticatedPrincipal":
+        return cls(**{**data, "roles": frozenset(data["roles"]), "permissions": frozenset(data["permissions"])})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "username": self.username,
+            "email": self.email,
+            "is_active": self.is_active,
+            "is_superuser": self.is_superuser,
+            "token_version": self.token_version,
+            "roles": sorted(self.roles),
+            "permissions": sorted(self.permissions),
+        }
+
+    def has_role(self, role_name: str) -> bool:
+        return role_name in self.roles
+
+    def has_permission(self, permission_name: str) -> bool:
+        """Superusers have all permissions"""
+        return self.is_superuser or permission_name in self.permissions
+
+
+def _principal_key(user_id: int, token_version: int) -> str:
+    return f"{user_id}:{token_version}"
+
 
 class AuthService:
     """
@@ -109,6 +187,27 @@ class AuthService:
         """
         Authenticate a user with username/email and password.
 
+        Verifies the password on the calling thread; async routes should use
+        aauthenticate_user.
+
+        Args:
+            username: Username or email
+            password: Plain text password
+
+        Returns:
+            User object if authentication successful, None otherwise
+        """
+        user = self._get_login_user(username)
+        if not user:
+            return None
+
+        verified, updated_hash = _verify_and_update(password, user.hashed_password)
+        return self._complete_login(user, username, verified, updated_hash)
+
+    async def aauthenticate_user(self, username: str, password: str) -> Optional[User]:
+        """
+        Authenticate a user, verifying the password on the password-hash pool.
+
         Args:
             username: Username or email
             password: Plain text password
@@ -116,6 +215,15 @@ class AuthService:
         Returns:
             User object if authentication successful, None otherwise
         """
+        user = self._get_login_user(username)
+        if not user:
+            return None
+
+        verified, updated_hash = await _run_password_hash(_verify_and_update, password, user.hashed_password)
+        return self._complete_login(user, username, verified, updated_hash)
+
+    def _get_login_user(self, username: str) -> Optional[User]:
+        """Find a user by username or email, or None if missing or locked"""
         # Find user by username or email
         user = self.db.query(User).filter(
             (User.username == username) | (User.email == username)
@@ -130,11 +238,17 @@ class AuthService:
             logger.warning(f"Authentication failed: Account locked for user '{username}'")
             return None
 
-        # Verify password
-        try:
-            password_hash.verify(password, user.hashed_password)
-        except Exception:
-            # Password verification failed
+        return user
+
+    def _complete_login(
+        self,
+        user: User,
+        username: str,
+        verified: bool,
+        updated_hash: Optional[str] = None,
+    ) -> Optional[User]:
+        """Record a login attempt's outcome; returns the user if the password was verified"""
+        if not verified:
             user.failed_login_attempts += 1
 
             # Lock account after 5 failed attempts
@@ -146,9 +260,9 @@ class AuthService:
             logger.warning(f"Authentication failed: Invalid password for '{username}'")
             return None
 
-        # Check if password needs rehashing (algorithm upgrade)
-        if password_hash.needs_rehash(user.hashed_password):
-            user.hashed_password = password_hash.hash(password)
+        # Store the rehashed password if the hash was outdated (algorithm upgrade)
+        if updated_hash:
+            user.hashed_password = updated_hash
             logger.info(f"Password rehashed for user '{username}'")
 
         # Reset failed attempts and update login info
@@ -184,6 +298,7 @@ class AuthService:
             "username": user.username,
             "email": user.email,
             "roles": [role.name for role in user.roles],
+            "version": user.refresh_token_version,  # Token version for revocation
             "exp": expire,
             "iat": datetime.now(timezone.utc),
             "type": "access",
@@ -291,13 +406,109 @@ class AuthService:
         """
         Revoke all tokens for a user by incrementing the refresh token version.
 
+        Also drops this process's cached principal for the revoked version;
+        use arevoke_all_tokens to drop the shared Redis entry as well.
+
         Args:
             user: User object
         """
+        revoked_version = user.refresh_token_version
         user.refresh_token_version += 1
         self.db.commit()
+        _local_principals.delete(_principal_key(user.id, revoked_version))
         logger.info(f"Revoked all tokens for user {user.username}")
 
+    async def arevoke_all_tokens(self, user: User, principal_cache: Optional[PrincipalCache] = None):
+        """
+        Revoke all tokens for a user and drop their cached principals.
+
+        Args:
+            user: User object
+            principal_cache: Shared Redis principal cache, if enabled
+        """
+        revoked_version = user.refresh_token_version
+        self.revoke_all_tokens(user)
+        await self.ainvalidate_principal(user, principal_cache, token_version=revoked_version)
+
+    async def ainvalidate_principal(
+        self,
+        user: User,
+        principal_cache: Optional[PrincipalCache] = None,
+        token_version: Optional[int] = None,
+    ):
+        """
+        Drop a user's cached principal after their flags, roles or permissions change.
+
+        Drops this process's entry and the shared Redis entry; other workers
+        keep their in-process copy for up to PRINCIPAL_LOCAL_TTL_SECONDS.
+
+        Args:
+            user: User object
+            principal_cache: Shared Redis principal cache, if enabled
+            token_version: Token version to drop (default: the user's current version)
+        """
+        version = user.refresh_token_version if token_version is None else token_version
+        _local_principals.delete(_principal_key(user.id, version))
+
+        if principal_cache:
+            try:
+                await principal_cache.invalidate(user.id, version)
+            except Exception as e:
+                logger.warning(f"Failed to invalidate cached principal for user {user.id}: {e}")
+
+    async def adeactivate_user(self, user: User, principal_cache: Optional[PrincipalCache] = None):
+        """
+        Deactivate a user, revoking their tokens and cached principal.
+
+        Commits any other pending changes in the session along with it.
+
+        Args:
+            user: User object
+            principal_cache: Shared Redis principal cache, if enabled
+        """
+        user.is_active = False
+        await self.arevoke_all_tokens(user, principal_cache)
+        logger.info(f"Deactivated user {user.username}")
+
+    async def aset_user_roles(
+        self,
+        user: User,
+        role_names: List[str],
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
+        """
+        Replace a user's roles and drop their cached principal.
+
+        Args:
+            user: User object
+            role_names: Names of the roles the user should have
+            principal_cache: Shared Redis principal cache, if enabled
+        """
+        user.roles = self.db.query(Role).filter(Role.name.in_(role_names)).all()
+        self.db.commit()
+        await self.ainvalidate_principal(user, principal_cache)
+        logger.info(f"Set roles for user {user.username}: {sorted(role.name for role in user.roles)}")
+
+    async def aset_role_permissions(
+        self,
+        role: Role,
+        permission_names: List[str],
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
+        """
+        Replace a role's permissions and drop the cached principals of its users.
+
+        Args:
+            role: Role object
+            permission_names: Names of the permissions the role should grant
+            principal_cache: Shared Redis principal cache, if enabled
+        """
+        role.permissions = self.db.query(Permission).filter(Permission.name.in_(permission_names)).all()
+        self.db.commit()
+        for user in role.users:
+            await self.ainvalidate_principal(user, principal_cache)
+        logger.info(f"Set permissions for role {role.name}: {sorted(permission_names)}")
+
     def get_current_user(self, token: str) -> Optional[User]:
         """
         Get the current user from a JWT token.
@@ -321,8 +532,98 @@ class AuthService:
             logger.warning(f"User {user_id} not found or inactive")
             return None
 
+        # Access tokens issued before a revocation carry the old version
+        if payload.get("version") not in (None, user.refresh_token_version):
+            logger.warning(f"Access token revoked for user {user_id}")
+            return None
+
         return user
 
+    def load_principal(self, user_id: int) -> Optional[AuthenticatedPrincipal]:
+        """
+        Load a user's principal with roles and permissions in one round of queries.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            AuthenticatedPrincipal, or None if the user does not exist
+        """
+        user = self.db.query(User).options(
+            selectinload(User.roles).selectinload(Role.permissions)
+        ).filter(User.id == user_id).first()
+
+        if not user:
+            return None
+
+        return AuthenticatedPrincipal.from_user(user)
+
+    async def aget_current_principal(
+        self,
+        token: str,
+        principal_cache: Optional[PrincipalCache] = None,
+    ) -> Optional[AuthenticatedPrincipal]:
+        """
+        Resolve the principal for a JWT access token.
+
+        Looks the principal up in the in-process cache, then the shared Redis
+        cache, then the database, keyed by user id and the token's version.
+        Only active users whose current token version matches are cached, so
+        revoke_all_tokens makes older tokens miss and fail the version check.
+
+        Args:
+            token: JWT access token
+            principal_cache: Shared Redis principal cache, if enabled
+
+        Returns:
+            AuthenticatedPrincipal if the token is valid, None otherwise
+        """
+        payload = self.verify_token(token, token_type="access")
+        if not payload:
+            return None
+
+        user_id = int(payload.get("sub"))
+        token_version = payload.get("version")
+
+        # Tokens issued before access tokens carried a version are not cached
+        cacheable = PRINCIPAL_CACHE_ENABLED and token_version is not None
+        if cacheable:
+            key = _principal_key(user_id, token_version)
+            cached = _local_principals.get(key)
+            if cached:
+                return AuthenticatedPrincipal.from_dict(json.loads(cached))
+
+            if principal_cache:
+                try:
+                    data = await principal_cache.get_principal(user_id, token_version)
+                except Exception as e:
+                    logger.warning(f"Principal cache lookup failed for user {user_id}: {e}")
+                    data = None
+                if data:
+                    _local_principals.set(key, json.dumps(data))
+                    return AuthenticatedPrincipal.from_dict(data)
+
+        principal = self.load_principal(user_id)
+
+        if not principal or not principal.is_active:
+            logger.warning(f"User {user_id} not found or inactive")
+            return None
+
+        if token_version not in (None, principal.token_version):
+            logger.warning(f"Access token revoked for user {user_id}")
+            return None
+
+        if cacheable:
+            data = principal.as_dict()
+            _local_principals.set(key, json.dumps(data))
+            if principal_cache:
+                try:
+                    await principal_cache.set_principal(data)
+                except Exception as e:
+                    logger.warning(f"Failed to cache principal for user {user_id}: {e}")
+
+        return principal
+
     def check_permission(self, user: User, permission_name: str) -> bool:
         """
         Check if a user has a specific permission.
@@ -471,7 +772,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         True if password matches, False otherwise
     """
     try:
-        password_hash.verify(plain_password, hashed_password)
-        return True
+        return password_hash.verify(plain_password, hashed_password)
+    except Exception:
+        return False
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the bounded password-hash pool, off the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await _run_password_hash(verify_password, plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also returns a new hash if the stored one is outdated"""
+    try:
+        return password_hash.verify_and_update(plain_password, hashed_password)
     except Exception:
-        return False
\ No newline at end of file
+        return False, None
+
+
+async def _run_password_hash(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, func, *args)
\ No newline at end of file
@@ -0,0 +1,329 @@
+"""
+Batch Lead Qualification Worker
+
+Micro-batching rescoring for large lead sets (nightly 50k-lead runs):
+- Leads are loaded in keyset-paginated chunks (no per-lead sessions)
+- Each chunk is split into small prompt batches scored by one async Cerebras
+  request each, run concurrently with bounded concurrency
+- Requests are paced to RateLimiter PROVIDER_LIMITS (requests and tokens per
+  minute), optionally also checked against the shared Redis RateLimiter
+- Scores are written back with one bulk ``UPDATE ... FROM (VALUES ...)`` per chunk
+
+Runs entirely inside one coroutine - callers (Celery tasks) never wait on
+child task results.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Lead, CerebrasAPICall, AsyncSessionLocal
+from app.services.cerebras import CerebrasService
+from app.services.rate_limiter import PROVIDER_LIMITS, RateLimiter
+from app.core.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+
+@dataclass
+class BatchQualificationProgress:
+    """Running counters for a batch qualification run"""
+    leads_loaded: int = 0
+    leads_scored: int = 0
+    leads_failed: int = 0
+    requests: int = 0
+    failed_requests: int = 0
+    tokens_used: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter() - self.started_at) * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed_ms = self.elapsed_ms
+        return {
+            "leads_loaded": self.leads_loaded,
+            "leads_scored": self.leads_scored,
+            "leads_failed": self.leads_failed,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "tokens_used": self.tokens_used,
+            "elapsed_ms": elapsed_ms,
+            "leads_per_second": round(self.leads_scored / (elapsed_ms / 1000), 2) if elapsed_ms > 0 else 0
+        }
+
+
+class ProviderPacer:
+    """
+    Local sliding-window pacer for a provider's per-minute limits
+
+    Waits (without blocking the loop) until one more request, and its
+    estimated tokens, fit inside the last 60 seconds of traffic.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "ProviderPacer":
+        limits = PROVIDER_LIMITS[provider]
+        return cls(limits["requests_per_minute"], limits["tokens_per_minute"])
+
+    def _expire(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= self.WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._tokens_in_window -= tokens
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+
+                requests_ok = len(self._window) < self.requests_per_minute
+                tokens_ok = (
+                    self.tokens_per_minute is None
+                    or not self._window
+                    or self._tokens_in_window + estimated_tokens <= self.tokens_per_minute
+                )
+                if requests_ok and tokens_ok:
+                    self._window.append((now, estimated_tokens))
+                    self._tokens_in_window += estimated_tokens
+                    return
+
+                # Sleep until the oldest request leaves the window
+                await asyncio.sleep(max(0.01, self.WINDOW_SECONDS - (now - self._window[0][0])))
+
+
+class BatchQualificationWorker:
+    """
+    Concurrent, rate-limited bulk lead qualification
+
+    Usage:
+        worker = BatchQualificationWorker()
+        stats = await worker.run(lead_ids)        # specific leads
+        stats = await worker.run()                # every lead (nightly rescoring)
+    """
+
+    PROVIDER = "cerebras"
+    LEADS_PER_REQUEST = 20  # Leads packed into one prompt
+    MAX_CONCURRENCY = 8  # In-flight Cerebras requests
+    CHUNK_SIZE = 1000  # Leads loaded and written back per round trip
+    EST_TOKENS_PER_LEAD = 150  # Prompt + completion estimate for pacing
+    RATE_LIMIT_USER_ID = "batch_qualification_worker"
+
+    def __init__(
+        self,
+        cerebras_service: Optional[CerebrasService] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        rate_limiter: Optional[RateLimiter] = None,
+        leads_per_request: int = LEADS_PER_REQUEST,
+        max_concurrency: int = MAX_CONCURRENCY,
+        chunk_size: int = CHUNK_SIZE
+    ):
+        """
+        Initialize batch qualification worker.
+
+        Args:
+            cerebras_service: Service used for scoring (created if omitted)
+            session_factory: Async session factory for reads and bulk writes
+            rate_limiter: Shared Redis RateLimiter to check/record against (optional)
+            leads_per_request: Leads packed into each prompt
+            max_concurrency: Max concurrent Cerebras requests
+            chunk_size: Leads per load/UPDATE round trip
+        """
+        self.cerebras = cerebras_service or CerebrasService()
+        self.session_factory = session_factory
+        self.rate_limiter = rate_limiter
+        self.leads_per_request = leads_per_request
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.pacer = ProviderPacer.for_provider(self.PROVIDER)
+
+    async def run(
+        self,
+        lead_ids: Optional[Sequence[int]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Qualify leads and write scores back in bulk.
+
+        Args:
+            lead_ids: Leads to score; None scores every lead (keyset by id)
+            progress_callback: Called with progress counters after each chunk
+
+        Returns:
+            Final counters including leads_per_second
+        """
+        progress = BatchQualificationProgress()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self.session_factory() as db:
+            async for chunk in self._iter_lead_chunks(db, lead_ids):
+                progress.leads_loaded += len(chunk)
+
+                batches = [
+                    chunk[i:i + self.leads_per_request]
+                    for i in range(0, len(chunk), self.leads_per_request)
+                ]
+                outcomes = await asyncio.gather(
+                    *(self._score_batch(batch, semaphore) for batch in batches)
+                )
+
+                scores: List[Tuple[int, float, str, int]] = []
+                api_calls: List[CerebrasAPICall] = []
+                for batch, (results, latency_ms, usage, error) in zip(batches, outcomes):
+                    progress.requests += 1
+                    tokens = usage["prompt_tokens"] + usage["completion_tokens"]
+                    progress.tokens_used += tokens
+                    if error:
+                        progress.failed_requests += 1
+
+                    for lead_id, (score, reasoning) in results.items():
+                        scores.append((lead_id, score, reasoning, latency_ms))
+                    progress.leads_failed += len(batch) - len(results)
+
+                    cost_info = self.cerebras.calculate_cost(usage["prompt_tokens"], usage["completion_tokens"])
+                    api_calls.append(CerebrasAPICall(
+                        endpoint="/chat/completions",
+                        model=self.cerebras.default_model,
+                        prompt_tokens=usage["prompt_tokens"],
+                        completion_tokens=usage["completion_tokens"],
+                        total_tokens=tokens,
+                        latency_ms=latency_ms,
+                        cache_hit=False,
+                        cost_usd=cost_info["total_cost_usd"],
+                        input_cost_usd=cost_info["input_cost_usd"],
+                        output_cost_usd=cost_info["output_cost_usd"],
+                        operation_type="batch_lead_qualification",
+                        success=error is None,
+                        error_message=error
+                    ))
+
+                await self._bulk_update_scores(db, scores)
+                db.add_all(api_calls)
+                await db.commit()
+                progress.leads_scored += len(scores)
+
+                if progress_callback:
+                    progress_callback(progress.as_dict())
+
+        stats = progress.as_dict()
+        logger.info(f"Batch qualification complete: {stats}")
+        return stats
+
+    async def _iter_lead_chunks(self, db: AsyncSession, lead_ids: Optional[Sequence[int]]):
+        """Yield lists of lead dicts, CHUNK_SIZE at a time"""
+        columns = (
+            Lead.id, Lead.company_name, Lead.company_website, Lead.company_size,
+            Lead.industry, Lead.contact_name, Lead.contact_title, Lead.notes
+        )
+
+        if lead_ids is not None:
+            ids = list(lead_ids)
+            for i in range(0, len(ids), self.chunk_size):
+                rows = (await db.execute(
+                    select(*columns).where(Lead.id.in_(ids[i:i + self.chunk_size]))
+                )).mappings().all()
+                if rows:
+                    yield [dict(row) for row in rows]
+            return
+
+        last_id = 0
+        while True:
+            rows = (await db.execute(
+                select(*columns).where(Lead.id > last_id).order_by(Lead.id).limit(self.chunk_size)
+            )).mappings().all()
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield [dict(row) for row in rows]
+
+    async def _score_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Dict[int, Tuple[float, str]], int, Dict[str, int], Optional[str]]:
+        """Score one prompt batch; failures are returned, not raised"""
+        estimated_tokens = self.EST_TOKENS_PER_LEAD * len(batch)
+
+        async with semaphore:
+            await self.pacer.acquire(estimated_tokens)
+            await self._check_shared_limit(estimated_tokens)
+
+            try:
+                results, latency_ms, usage = await self.cerebras.aqualify_leads_batch(batch)
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} leads failed: {e}")
+                return {}, 0, {"prompt_tokens": 0, "completion_tokens": 0}, str(e)
+
+        if self.rate_limiter:
+            await self.rate_limiter.record_request(
+                self.RATE_LIMIT_USER_ID, self.PROVIDER, "/chat/completions",
+                tokens_used=usage["prompt_tokens"] + usage["completion_tokens"]
+            )
+
+        return results, latency_ms, usage, None
+
+    async def _check_shared_limit(self, estimated_tokens: int) -> None:
+        """Wait for the shared Redis limiter too, when one is configured"""
+        if not self.rate_limiter:
+            return
+        while True:
+            result = await self.rate_limiter.check_rate_limit(
+                self.RATE_LIMIT_USER_ID, self.PROVIDER, "/chat/completions", estimated_tokens
+            )
+            if result.allowed:
+                return
+            await asyncio.sleep(result.retry_after or 1)
+
+    async def _bulk_update_scores(
+        self,
+        db: AsyncSession,
+        scores: List[Tuple[int, float, str, int]]
+    ) -> None:
+        """Write all scores for a chunk with one UPDATE ... FROM (VALUES ...)"""
+        if not scores:
+            return
+
+        params: Dict[str, Any] = {
+            "model": self.cerebras.default_model,
+            "qualified_at": datetime.now(timezone.utc),
+        }
+        values = []
+        for i, (lead_id, score, reasoning, latency_ms) in enumerate(scores):
+            values.append(
+                f"(CAST(:id_{i} AS INTEGER), CAST(:score_{i} AS DOUBLE PRECISION), "
+                f"CAST(:reasoning_{i} AS TEXT), CAST(:latency_{i} AS INTEGER))"
+            )
+            params[f"id_{i}"] = lead_id
+            params[f"score_{i}"] = round(score, 1)
+            params[f"reasoning_{i}"] = reasoning
+            params[f"latency_{i}"] = latency_ms
+
+        await db.execute(
+            text(
+                "UPDATE leads SET "
+                "qualification_score = v.score, "
+                "qualification_reasoning = v.reasoning, "
+                "qualification_model = :model, "
+                "qualification_latency_ms = v.latency_ms, "
+                "qualified_at = :qualified_at "
+                f"FROM (VALUES {', '.join(values)}) AS v(id, score, reasoning, latency_ms) "
+                "WHERE leads.id = v.id"
+            ),
+            params
+        )
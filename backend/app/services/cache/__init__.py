@@ -5,15 +5,26 @@ Provides Redis-based caching for:
 - LinkedIn enrichment data (expensive scrapes)
 - Qualification scores (repeated company lookups)
 - Growth strategy templates (reusable patterns)
+- Campaign analytics snapshots (dashboard aggregates)
+- Authenticated principals (per-request authorization)
+- Apollo person matches (bulk enrichment credits)
 """
 
 from .base import CacheBase, get_redis_client
+from .serialization import CacheCodec
 from .enrichment_cache import EnrichmentCache
 from .qualification_cache import QualificationCache
+from .campaign_analytics_cache import CampaignAnalyticsCache
+from .principal_cache import PrincipalCache
+from .apollo_cache import ApolloPersonCache
 
 __all__ = [
     "CacheBase",
     "get_redis_client",
+    "CacheCodec",
     "EnrichmentCache",
     "QualificationCache",
+    "CampaignAnalyticsCache",
+    "PrincipalCache",
+    "ApolloPersonCache",
 ]
@@ -0,0 +1,94 @@
+"""
+Apollo person match caching for bulk enrichment runs.
+
+Apollo /people/match and /people/bulk_match charge credits per matched person:
+- Cost: 1 credit per match (more with personal emails revealed)
+- Latency: ~500ms per HTTP call
+- Rate limit: per-minute, hourly and daily request quotas
+
+Misses are cached too (shorter TTL) so re-running an import does not pay
+again for emails Apollo has no record of. Lookups and writes for a whole
+batch go to Redis in one MGET and one pipeline.
+"""
+
+import logging
+from typing import Optional, Dict, Any, Iterable, Mapping
+import redis.asyncio as redis
+
+from .base import CacheBase
+
+logger = logging.getLogger(__name__)
+
+
+class ApolloPersonCache(CacheBase):
+    """
+    Cache for Apollo person matches, keyed by normalized email.
+
+    Cache duration: 30 days for matches, 1 day for "no match"
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        ttl: int = 86400 * 30,
+        not_found_ttl: int = 86400
+    ):
+        super().__init__(
+            redis_client=redis_client,
+            prefix="apollo_person",
+            default_ttl=ttl
+        )
+        self.not_found_ttl = not_found_ttl
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """Normalize an email for consistent cache keys."""
+        return email.strip().lower()
+
+    async def get_people(self, emails: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Look up cached matches for many emails in one MGET.
+
+        Args:
+            emails: Emails to look up
+
+        Returns:
+            {normalized email: person dict, or None for a cached "no match"}
+            for cached emails only; uncached emails are absent
+        """
+        cached = await self.get_many(self.normalize_email(e) for e in emails)
+        return {
+            email: entry.get("person") if entry.get("found") else None
+            for email, entry in cached.items()
+        }
+
+    async def set_people(self, people: Mapping[str, Optional[Dict[str, Any]]]) -> bool:
+        """
+        Cache match results for many emails in one pipeline.
+
+        Args:
+            people: {email: person dict, or None when Apollo found no match}
+
+        Returns:
+            True if successful
+        """
+        entries = {
+            self.normalize_email(email): {"found": person is not None, "person": person}
+            for email, person in people.items()
+        }
+        not_found_ttls = {
+            email: self.not_found_ttl for email, entry in entries.items() if not entry["found"]
+        }
+        return await self.set_many(entries, ttls=not_found_ttls)
+
+
+async def get_apollo_person_cache() -> ApolloPersonCache:
+    """
+    Get Apollo person cache instance.
+
+    Returns:
+        ApolloPersonCache instance
+    """
+    from .base import get_redis_client
+    redis_client = await get_redis_client()
+    return ApolloPersonCache(redis_client)
@@ -4,23 +4,37 @@ Base cache infrastructure for Redis-backed caching.
 Provides:
 - Redis client singleton
 - Base cache class with common operations
-- Cache hit/miss tracking
-- TTL management
+- Batch get_many/set_many (one MGET / one pipeline per batch)
+- Pluggable serialization and zstd compression (see serialization.py)
+- Cache hit/miss tracking (Prometheus cache_requests_total, plus Redis
+  counters flushed from in-process totals every CACHE_STATS_FLUSH_SECONDS)
+- TTL management with per-key jitter
 """
 
 import os
-import json
+import time
+import random
 import hashlib
 import logging
-from typing import Optional, Dict, Any
-from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable, Mapping, List
 import redis.asyncio as redis
 
+from app.core.metrics import record_cache_lookup
+from .serialization import CacheCodec
+
 logger = logging.getLogger(__name__)
 
 # Global Redis client (singleton)
 _redis_client: Optional[redis.Redis] = None
 
+CACHE_TTL_JITTER = float(os.getenv("CACHE_TTL_JITTER", "0.1"))  # Up to +10% per key
+CACHE_STATS_FLUSH_SECONDS = float(os.getenv("CACHE_STATS_FLUSH_SECONDS", "10"))
+
+# In-process hit/miss totals not yet written to Redis: {prefix: [hits, misses]}.
+# Shared by every instance of a cache, since factories build one per call.
+_pending_stats: Dict[str, List[int]] = {}
+_last_stats_flush: Dict[str, float] = {}
+
 
 async def get_redis_client() -> redis.Redis:
     """
@@ -33,11 +47,8 @@ async def get_redis_client() -> redis.Redis:
 
     if _redis_client is None:
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        _redis_client = redis.from_url(
-            redis_url,
-            decode_responses=True,
-            encoding="utf-8"
-        )
+        # Bytes responses: cached values may be msgpack and/or zstd-compressed
+        _redis_client = redis.from_url(redis_url)
         logger.info(f"✅ Initialized Redis cache client: {redis_url}")
 
     return _redis_client
@@ -48,17 +59,20 @@ class CacheBase:
     Base class for all cache implementations.
 
     Provides common caching patterns:
-    - get/set with TTL
+    - get/set with TTL, get_many/set_many for batches
     - hit/miss tracking
     - key hashing
-    - JSON serialization
+    - serialization (orjson/msgpack/json) with optional zstd compression
     """
 
     def __init__(
         self,
         redis_client: redis.Redis,
         prefix: str,
-        default_ttl: int = 86400
+        default_ttl: int = 86400,
+        serializer: Optional[str] = None,
+        compress: Optional[bool] = None,
+        ttl_jitter: float = CACHE_TTL_JITTER
     ):
         """
         Initialize cache.
@@ -67,10 +81,16 @@ class CacheBase:
             redis_client: Redis client instance
             prefix: Cache key prefix (e.g., "linkedin", "qual")
             default_ttl: Default TTL in seconds (default: 24 hours)
+            serializer: "orjson", "msgpack" or "json" (default: CACHE_SERIALIZER)
+            compress: zstd-compress large values (default: CACHE_COMPRESSION)
+            ttl_jitter: Max fraction added to each key's TTL, so keys written
+                together don't all expire together
         """
         self.redis = redis_client
         self.prefix = prefix
         self.default_ttl = default_ttl
+        self.ttl_jitter = ttl_jitter
+        self.codec = CacheCodec(serializer, compress, binary_safe=self._binary_safe(redis_client))
 
         # Tracking keys for hits/misses
         self.hits_key = f"cache:hits:{prefix}"
@@ -92,6 +112,53 @@ class CacheBase:
 
         return f"{self.prefix}:{identifier}"
 
+    @staticmethod
+    def _binary_safe(redis_client: redis.Redis) -> bool:
+        """False if the client decodes responses to str (binary values would fail to decode)."""
+        pool = getattr(redis_client, "connection_pool", None)
+        return not getattr(pool, "connection_kwargs", {}).get("decode_responses", False)
+
+    def _jittered_ttl(self, ttl: Optional[int]) -> int:
+        ttl = ttl or self.default_ttl
+        return ttl + random.randint(0, int(ttl * self.ttl_jitter))
+
+    async def _track(self, hits: int, misses: int) -> None:
+        """
+        Count hits/misses: Prometheus now, Redis counters at most every
+        CACHE_STATS_FLUSH_SECONDS (one pipelined INCRBY pair per flush).
+        """
+        record_cache_lookup(self.prefix, hit=True, count=hits)
+        record_cache_lookup(self.prefix, hit=False, count=misses)
+
+        pending = _pending_stats.setdefault(self.prefix, [0, 0])
+        pending[0] += hits
+        pending[1] += misses
+
+        now = time.monotonic()
+        last_flush = _last_stats_flush.setdefault(self.prefix, now)
+        if now - last_flush >= CACHE_STATS_FLUSH_SECONDS:
+            await self.flush_stats()
+
+    async def flush_stats(self) -> None:
+        """Write in-process hit/miss totals to the Redis counters."""
+        _last_stats_flush[self.prefix] = time.monotonic()
+        hits, misses = _pending_stats.pop(self.prefix, (0, 0))
+        if not hits and not misses:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if hits:
+                pipe.incrby(self.hits_key, hits)
+            if misses:
+                pipe.incrby(self.misses_key, misses)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache stats for {self.prefix}: {e}")
+            pending = _pending_stats.setdefault(self.prefix, [0, 0])
+            pending[0] += hits
+            pending[1] += misses
+
     async def get(
         self,
         identifier: str,
@@ -112,16 +179,48 @@ class CacheBase:
 
         if cached:
             if track:
-                await self.redis.incr(self.hits_key)
+                await self._track(hits=1, misses=0)
                 logger.debug(f"🎯 Cache HIT: {self.prefix}:{identifier[:50]}")
-            return json.loads(cached)
+            return self.codec.decode(cached)
 
         if track:
-            await self.redis.incr(self.misses_key)
+            await self._track(hits=0, misses=1)
             logger.debug(f"❌ Cache MISS: {self.prefix}:{identifier[:50]}")
 
         return None
 
+    async def get_many(
+        self,
+        identifiers: Iterable[str],
+        track: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get cached data for many identifiers in one MGET.
+
+        Args:
+            identifiers: Cache identifiers
+            track: Whether to track hit/miss stats
+
+        Returns:
+            {identifier: cached data} for hits only; misses are absent
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        if not identifiers:
+            return {}
+
+        values = await self.redis.mget([self._make_key(i) for i in identifiers])
+        cached = {
+            identifier: self.codec.decode(value)
+            for identifier, value in zip(identifiers, values)
+            if value
+        }
+
+        if track:
+            await self._track(hits=len(cached), misses=len(identifiers) - len(cached))
+            logger.debug(f"🎯 Cache get_many {self.prefix}: {len(cached)}/{len(identifiers)} hits")
+
+        return cached
+
     async def set(
         self,
         identifier: str,
@@ -140,13 +239,13 @@ class CacheBase:
             True if successful
         """
         key = self._make_key(identifier)
-        ttl = ttl or self.default_ttl
+        ttl = self._jittered_ttl(ttl)
 
         try:
             await self.redis.setex(
                 key,
                 ttl,
-                json.dumps(data)
+                self.codec.encode(data)
             )
             logger.debug(f"💾 Cached: {self.prefix}:{identifier[:50]} (TTL: {ttl}s)")
             return True
@@ -154,6 +253,39 @@ class CacheBase:
             logger.error(f"Failed to cache {key}: {e}")
             return False
 
+    async def set_many(
+        self,
+        items: Mapping[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Mapping[str, int]] = None
+    ) -> bool:
+        """
+        Set cached data for many identifiers in one pipeline.
+
+        Args:
+            items: {identifier: data}
+            ttl: Time-to-live in seconds (default: self.default_ttl)
+            ttls: Per-identifier TTL overrides
+
+        Returns:
+            True if successful
+        """
+        if not items:
+            return True
+
+        pipe = self.redis.pipeline(transaction=False)
+        for identifier, data in items.items():
+            item_ttl = ttls.get(identifier, ttl) if ttls else ttl
+            pipe.setex(self._make_key(identifier), self._jittered_ttl(item_ttl), self.codec.encode(data))
+
+        try:
+            await pipe.execute()
+            logger.debug(f"💾 Cached {len(items)} items: {self.prefix}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache {len(items)} items for {self.prefix}: {e}")
+            return False
+
     async def delete(self, identifier: str) -> bool:
         """
         Delete cached data.
@@ -175,6 +307,7 @@ class CacheBase:
         Returns:
             Dict with hits, misses, hit_rate, etc.
         """
+        await self.flush_stats()
         hits = int(await self.redis.get(self.hits_key) or 0)
         misses = int(await self.redis.get(self.misses_key) or 0)
         total = hits + misses
@@ -194,6 +327,7 @@ class CacheBase:
 
     async def clear_stats(self):
         """Clear hit/miss tracking stats."""
+        _pending_stats.pop(self.prefix, None)
         await self.redis.delete(self.hits_key)
         await self.redis.delete(self.misses_key)
         logger.info(f"Cleared stats for cache: {self.prefix}")
@@ -0,0 +1,84 @@
+"""
+Campaign analytics snapshot caching for the campaign dashboard.
+
+Campaign analytics aggregate every variant-analytics row of a campaign:
+- Cost: one grouped scan over up to millions of rows per dashboard load
+- Change frequency: only when a message status is updated, messages are
+  (re)generated (inline or by the Celery job) or the campaign is activated,
+  all of which invalidate the snapshot
+
+The TTL only bounds staleness for writes that bypass CampaignService and
+CampaignGenerationEngine (e.g. manual SQL).
+"""
+
+import logging
+from typing import Optional, Dict, Any
+import redis.asyncio as redis
+
+from .base import CacheBase
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignAnalyticsCache(CacheBase):
+    """
+    Cache for computed campaign analytics snapshots.
+
+    Cache duration: 5 minutes (invalidated on writes)
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: int = 300):
+        super().__init__(
+            redis_client=redis_client,
+            prefix="campaign_analytics",
+            default_ttl=ttl
+        )
+
+    async def get_snapshot(self, campaign_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get cached analytics snapshot for a campaign.
+
+        Args:
+            campaign_id: Campaign ID
+
+        Returns:
+            Snapshot dict or None
+        """
+        return await self.get(str(campaign_id), track=True)
+
+    async def set_snapshot(self, campaign_id: int, snapshot: Dict[str, Any]) -> bool:
+        """
+        Cache analytics snapshot for a campaign.
+
+        Args:
+            campaign_id: Campaign ID
+            snapshot: JSON-serializable analytics snapshot
+
+        Returns:
+            True if successful
+        """
+        return await self.set(str(campaign_id), snapshot)
+
+    async def invalidate(self, campaign_id: int) -> bool:
+        """
+        Drop the cached snapshot for a campaign.
+
+        Args:
+            campaign_id: Campaign ID
+
+        Returns:
+            True if a snapshot was cached
+        """
+        return await self.delete(str(campaign_id))
+
+
+async def get_campaign_analytics_cache() -> CampaignAnalyticsCache:
+    """
+    Get campaign analytics cache instance.
+
+    Returns:
+        CampaignAnalyticsCache instance
+    """
+    from .base import get_redis_client
+    redis_client = await get_redis_client()
+    return CampaignAnalyticsCache(redis_client)
@@ -14,7 +14,7 @@ Caching saves:
 
 import hashlib
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Mapping
 from urllib.parse import urlparse
 import redis.asyncio as redis
 
@@ -109,12 +109,7 @@ class EnrichmentCache(CacheBase):
         normalized_url = self._normalize_linkedin_url(linkedin_url)
 
         # Add metadata to cached data
-        enriched_data = {
-            **profile_data,
-            "cached_at": None,  # Will be added by serialization
-            "source": "linkedin_browserbase",
-            "cache_ttl_days": (ttl or self.default_ttl) / 86400
-        }
+        enriched_data = self._profile_entry(profile_data, ttl)
 
         success = await self.set(normalized_url, enriched_data, ttl)
 
@@ -126,6 +121,58 @@ class EnrichmentCache(CacheBase):
 
         return success
 
+    async def get_profiles(self, linkedin_urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached LinkedIn profiles for many URLs in one MGET.
+
+        Args:
+            linkedin_urls: LinkedIn profile URLs
+
+        Returns:
+            {linkedin_url: profile data} for cached profiles only
+        """
+        normalized = {url: self._normalize_linkedin_url(url) for url in linkedin_urls}
+        cached = await self.get_many(normalized.values())
+
+        profiles = {url: cached[key] for url, key in normalized.items() if key in cached}
+        if profiles:
+            logger.info(f"🎯 LinkedIn Cache HIT: {len(profiles)}/{len(normalized)} profiles")
+        return profiles
+
+    def _profile_entry(self, profile_data: Dict[str, Any], ttl: Optional[int]) -> Dict[str, Any]:
+        return {
+            **profile_data,
+            "cached_at": None,  # Will be added by serialization
+            "source": "linkedin_browserbase",
+            "cache_ttl_days": (ttl or self.default_ttl) / 86400
+        }
+
+    async def set_profiles(
+        self,
+        profiles: Mapping[str, Dict[str, Any]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Cache LinkedIn profiles for many URLs in one pipeline.
+
+        Args:
+            profiles: {linkedin_url: profile data}
+            ttl: Optional custom TTL (default: 7 days)
+
+        Returns:
+            True if successful
+        """
+        entries = {
+            self._normalize_linkedin_url(url): self._profile_entry(data, ttl)
+            for url, data in profiles.items()
+        }
+        success = await self.set_many(entries, ttl)
+
+        if success and entries:
+            logger.info(f"💾 Cached {len(entries)} LinkedIn profiles")
+
+        return success
+
     async def get_enrichment_stats(self) -> Dict[str, Any]:
         """
         Get detailed enrichment cache statistics with cost savings.
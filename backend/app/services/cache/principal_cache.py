@@ -0,0 +1,86 @@
+"""
+Authenticated principal caching for request authorization.
+
+Every authenticated request resolves the caller's roles and permissions:
+- Cost: a users query plus role/permission relationship loads per request
+- Change frequency: only on logout, deactivation or role/permission changes
+
+Entries are keyed by user id and token version, so tokens issued before a
+revocation never match a principal cached after it. AuthService drops the
+entry on each change (arevoke_all_tokens, adeactivate_user, aset_user_roles,
+aset_role_permissions); writes that bypass those helpers are only picked up
+when the entry expires.
+"""
+
+import logging
+from typing import Optional, Dict, Any
+import redis.asyncio as redis
+
+from .base import CacheBase
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache(CacheBase):
+    """
+    Cache for authenticated principals (user flags, roles, permissions).
+
+    Cache duration: 5 minutes (invalidated on revocation, deactivation and role changes)
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: int = 300):
+        super().__init__(
+            redis_client=redis_client,
+            prefix="principal",
+            default_ttl=ttl
+        )
+
+    async def get_principal(self, user_id: int, token_version: int) -> Optional[Dict[str, Any]]:
+        """
+        Get cached principal for a user and token version.
+
+        Args:
+            user_id: User ID
+            token_version: Token version the access token was issued with
+
+        Returns:
+            Principal dict or None
+        """
+        return await self.get(f"{user_id}:{token_version}", track=True)
+
+    async def set_principal(self, principal: Dict[str, Any]) -> bool:
+        """
+        Cache a principal.
+
+        Args:
+            principal: Principal dict with "id" and "token_version"
+
+        Returns:
+            True if successful
+        """
+        return await self.set(f"{principal['id']}:{principal['token_version']}", principal)
+
+    async def invalidate(self, user_id: int, token_version: int) -> bool:
+        """
+        Drop the cached principal for a user and token version.
+
+        Args:
+            user_id: User ID
+            token_version: Token version to drop
+
+        Returns:
+            True if a principal was cached
+        """
+        return await self.delete(f"{user_id}:{token_version}")
+
+
+async def get_principal_cache() -> PrincipalCache:
+    """
+    Get principal cache instance.
+
+    Returns:
+        PrincipalCache instance
+    """
+    from .base import get_redis_client
+    redis_client = await get_redis_client()
+    return PrincipalCache(redis_client)
@@ -13,7 +13,7 @@ Caching saves:
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Mapping, Tuple
 import redis.asyncio as redis
 
 from .base import CacheBase
@@ -130,6 +130,58 @@ class QualificationCache(CacheBase):
 
         return success
 
+    async def get_qualifications(
+        self,
+        companies: Iterable[Tuple[str, Optional[str]]]
+    ) -> Dict[Tuple[str, Optional[str]], Dict[str, Any]]:
+        """
+        Get cached qualification scores for many companies in one MGET.
+
+        Args:
+            companies: (company_name, industry) pairs, e.g. from a lead CSV
+
+        Returns:
+            {(company_name, industry): cached result} for cached companies only
+        """
+        keys = {company: self._make_company_key(*company) for company in companies}
+        cached = await self.get_many(keys.values())
+
+        results = {company: cached[key] for company, key in keys.items() if key in cached}
+        if results:
+            logger.info(f"🎯 Qualification Cache HIT: {len(results)}/{len(keys)} companies")
+        return results
+
+    async def set_qualifications(
+        self,
+        results: Mapping[Tuple[str, Optional[str]], Dict[str, Any]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Cache qualification results for many companies in one pipeline.
+
+        Args:
+            results: {(company_name, industry): qualification result}
+            ttl: Optional custom TTL (default: 24 hours)
+
+        Returns:
+            True if successful
+        """
+        entries = {
+            self._make_company_key(company_name, industry): {
+                **result,
+                "company_name": company_name,
+                "industry": industry,
+                "cache_ttl_hours": (ttl or self.default_ttl) / 3600
+            }
+            for (company_name, industry), result in results.items()
+        }
+        success = await self.set_many(entries, ttl)
+
+        if success and entries:
+            logger.info(f"💾 Cached {len(entries)} qualifications")
+
+        return success
+
     async def get_qualification_stats(self) -> Dict[str, Any]:
         """
         Get detailed qualification cache statistics with savings.
@@ -0,0 +1,194 @@
+"""
+Value encoding for Redis caches.
+
+CacheBase stores values through a CacheCodec:
+- Serializer: orjson (default when installed), msgpack, or stdlib json
+- Compression: zstd for payloads of at least CACHE_COMPRESS_MIN_BYTES when
+  the zstandard package is installed (large enrichment profiles shrink 3-5x)
+
+Uncompressed JSON is stored as plain JSON text, so existing entries stay
+readable and keys can still be inspected with redis-cli. Everything else
+starts with a 3-byte header: NUL, serializer tag, compression tag. JSON
+never starts with NUL, so values written with any settings decode.
+
+Configuration (environment):
+- CACHE_SERIALIZER: "orjson" | "msgpack" | "json" (default: orjson if installed)
+- CACHE_COMPRESSION: "zstd" | "none" (default: zstd if installed)
+- CACHE_COMPRESS_MIN_BYTES: smallest payload worth compressing (default: 1024)
+"""
+
+import json
+import logging
+import os
+from typing import Any, Optional, Union
+
+# Fast JSON - optional dependency
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Binary serialization - optional dependency
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Compression - optional dependency
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+HEADER_MARKER = b"\x00"
+NO_COMPRESSION = b"-"
+ZSTD_COMPRESSION = b"z"
+
+
+class JsonSerializer:
+    """Compact stdlib JSON (always available)."""
+    name = "json"
+    tag = b"j"
+    binary = False
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":"), default=str).encode()
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """orjson: same JSON text, several times faster to encode and decode."""
+    name = "orjson"
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackSerializer:
+    """MessagePack: smaller than JSON for numeric-heavy payloads."""
+    name = "msgpack"
+    tag = b"m"
+    binary = True
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=str, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+_SERIALIZERS = {
+    "json": (JsonSerializer, True),
+    "orjson": (OrjsonSerializer, orjson is not None),
+    "msgpack": (MsgpackSerializer, msgpack is not None),
+}
+
+
+def get_serializer(name: Optional[str] = None):
+    """
+    Get a serializer by name, falling back to JSON when its package is missing.
+
+    Args:
+        name: "orjson", "msgpack" or "json" (default: CACHE_SERIALIZER, then orjson)
+
+    Returns:
+        Serializer instance
+    """
+    name = (name or os.getenv("CACHE_SERIALIZER") or ("orjson" if orjson else "json")).lower()
+    if name not in _SERIALIZERS:
+        raise ValueError(f"Unknown cache serializer: {name}. Use one of {sorted(_SERIALIZERS)}")
+
+    serializer_class, available = _SERIALIZERS[name]
+    if not available:
+        logger.warning(f"{name} not installed - caching with stdlib json")
+        return JsonSerializer()
+    return serializer_class()
+
+
+class CacheCodec:
+    """
+    Encodes cache values to bytes and back.
+
+    Usage:
+        codec = CacheCodec(serializer="msgpack", compress=True)
+        stored = codec.encode({"name": "Acme"})
+        assert codec.decode(stored) == {"name": "Acme"}
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compress: Optional[bool] = None,
+        compress_min_bytes: Optional[int] = None,
+        binary_safe: bool = True
+    ):
+        """
+        Initialize codec.
+
+        Args:
+            serializer: Serializer name (default: CACHE_SERIALIZER, then orjson)
+            compress: zstd-compress large payloads (default: CACHE_COMPRESSION,
+                then on when zstandard is installed)
+            compress_min_bytes: Smallest payload to compress (default: CACHE_COMPRESS_MIN_BYTES or 1024)
+            binary_safe: False when the Redis client decodes responses to str;
+                values are then always stored as plain JSON text
+        """
+        if compress is None:
+            compress = os.getenv("CACHE_COMPRESSION", "zstd" if zstandard else "none").lower() == "zstd"
+        if compress and zstandard is None:
+            logger.warning("zstandard not installed - cache compression disabled")
+            compress = False
+
+        self.serializer = get_serializer(serializer)
+        if not binary_safe and (self.serializer.binary or compress):
+            logger.warning(
+                "Redis client decodes responses - caching as plain JSON "
+                "(use decode_responses=False for msgpack/zstd)"
+            )
+            self.serializer = OrjsonSerializer() if orjson else JsonSerializer()
+            compress = False
+
+        self.compress = compress
+        self.compress_min_bytes = (
+            compress_min_bytes if compress_min_bytes is not None
+            else int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+        )
+        self._compressor = zstandard.ZstdCompressor(level=3) if compress else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, data: Any) -> bytes:
+        """Serialize (and maybe compress) a value for storage."""
+        payload = self.serializer.dumps(data)
+
+        if self._compressor and len(payload) >= self.compress_min_bytes:
+            return HEADER_MARKER + self.serializer.tag + ZSTD_COMPRESSION + self._compressor.compress(payload)
+        if not self.serializer.binary:
+            return payload
+        return HEADER_MARKER + self.serializer.tag + NO_COMPRESSION + payload
+
+    def decode(self, value: Union[bytes, str]) -> Any:
+        """Decode a stored value written with any codec settings."""
+        if isinstance(value, str):
+            value = value.encode()
+
+        if not value.startswith(HEADER_MARKER):
+            return (orjson.loads if orjson else json.loads)(value)
+
+        tag, compression, payload = value[1:2], value[2:3], value[3:]
+        if compression == ZSTD_COMPRESSION:
+            if self._decompressor is None:
+                raise ValueError("Cached value is zstd-compressed but zstandard is not installed")
+            payload = self._decompressor.decompress(payload)
+
+        if tag == MsgpackSerializer.tag:
+            if msgpack is None:
+                raise ValueError("Cached value is msgpack-encoded but msgpack is not installed")
+            return MsgpackSerializer().loads(payload)
+        return (orjson.loads if orjson else json.loads)(payload)
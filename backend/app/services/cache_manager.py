@@ -1,20 +1,94 @@
 """
 Redis Cache Manager for Lead Qualifications
 
-Implements cache-aside pattern with graceful degradation and monitoring.
+Implements cache-aside pattern with graceful degradation and monitoring:
+- L1: bounded in-process LRU/TTL cache (no network round trip)
+- L2: shared Redis cache (24h TTL with jitter)
+- Single-flight: concurrent misses on one key share a single computation
+- Stats counters batched locally and flushed to Redis in one pipeline
 """
 
-from typing import Optional, Any
+from typing import Optional, Any, Awaitable, Callable, Dict, Tuple
+from collections import Counter, OrderedDict
 from redis import asyncio as aioredis
+import asyncio
 import json
 import hashlib
 import random
+import time
 from datetime import timedelta
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
+STAT_NAMES = ("hits", "misses", "errors", "l1_hits", "coalesced")
+
+
+class LocalLRUCache:
+    """
+    In-process LRU cache with per-entry TTL.
+
+    Bounded by both entry count and total bytes of the stored (serialized)
+    values; least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 16 * 1024 * 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        """Store a value; returns False if it is larger than the whole cache"""
+        size = len(value)
+        self.delete(key)
+        if size > self.max_bytes:
+            return False
+
+        self._entries[key] = (value, time.monotonic() + (ttl_seconds or self.ttl_seconds))
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+        return True
+
+    def delete(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[0])
+        return True
+
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+        return count
+
 
 class CacheManager:
     """
@@ -24,21 +98,43 @@ class CacheManager:
     - Hash-based deterministic cache keys
     - 24-hour TTL with jitter to prevent cache stampede
     - Graceful degradation when Redis unavailable
-    - Hit/miss/error rate tracking
+    - Hit/miss/error rate tracking, per tier (L1 in-process, L2 Redis)
+    - Single-flight coalescing of concurrent misses on the same key
     - Async operation for FastAPI integration
     """
+
+    STATS_FLUSH_INTERVAL_SECONDS = 5.0
     
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        l1_max_entries: Optional[int] = None,
+        l1_max_bytes: Optional[int] = None,
+        l1_ttl_seconds: Optional[float] = None
+    ):
         """
         Initialize cache manager with Redis connection.
         
         Args:
             redis_url: Redis connection URL (default: from env or localhost)
+            l1_max_entries: Max in-process entries (default: CACHE_L1_MAX_ENTRIES or 10000)
+            l1_max_bytes: Max in-process bytes (default: CACHE_L1_MAX_BYTES or 16MB)
+            l1_ttl_seconds: In-process TTL; bounds staleness after another
+                worker invalidates a key (default: CACHE_L1_TTL_SECONDS or 300)
         """
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self._redis: Optional[aioredis.Redis] = None
         self.default_ttl = timedelta(hours=24)
         self._connected = False
+
+        self.l1 = LocalLRUCache(
+            max_entries=l1_max_entries or int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000")),
+            max_bytes=l1_max_bytes or int(os.getenv("CACHE_L1_MAX_BYTES", str(16 * 1024 * 1024))),
+            ttl_seconds=l1_ttl_seconds or float(os.getenv("CACHE_L1_TTL_SECONDS", "300"))
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._pending_stats: Counter = Counter()
+        self._last_stats_flush = time.monotonic()
     
     async def _get_redis(self) -> Optional[aioredis.Redis]:
         """
@@ -110,59 +206,144 @@ class CacheManager:
     async def _increment_stat(self, stat_name: str):
         """
         Increment cache statistics counter.
+
+        Counts are kept in-process and flushed to Redis at most every
+        STATS_FLUSH_INTERVAL_SECONDS, instead of one INCR per request.
         
         Args:
-            stat_name: Counter name (hits, misses, errors)
+            stat_name: Counter name (hits, misses, errors, l1_hits, coalesced)
         """
+        self._pending_stats[stat_name] += 1
+        if time.monotonic() - self._last_stats_flush >= self.STATS_FLUSH_INTERVAL_SECONDS:
+            await self._flush_stats()
+
+    async def _flush_stats(self):
+        """Push pending stat counts to Redis with one pipelined INCRBY batch."""
+        self._last_stats_flush = time.monotonic()
+        if not self._pending_stats:
+            return
+
+        pending, self._pending_stats = self._pending_stats, Counter()
         try:
             redis = await self._get_redis()
-            if redis:
-                await redis.incr(f"cache:stats:{stat_name}")
+            if not redis:
+                raise ConnectionError("Redis unavailable")
+            pipe = redis.pipeline(transaction=False)
+            for stat_name, count in pending.items():
+                pipe.incrby(f"cache:stats:{stat_name}", count)
+            await pipe.execute()
         except Exception as e:
-            # Don't fail on stats errors
-            logger.debug(f"Failed to increment stat {stat_name}: {e}")
-    
-    async def get_cached_qualification(
-        self, 
-        company_name: str, 
-        industry: Optional[str] = None
-    ) -> Optional[dict]:
-        """
-        Retrieve cached lead qualification result.
-        
-        Args:
-            company_name: Company name
-            industry: Company industry (optional)
-        
-        Returns:
-            Cached qualification data or None if cache miss/error
-        """
-        key = self._generate_key(
-            "lead_qual", 
+            # Keep the counts for the next flush; don't fail on stats errors
+            self._pending_stats.update(pending)
+            logger.debug(f"Failed to flush cache stats: {e}")
+
+    def _qualification_key(self, company_name: str, industry: Optional[str]) -> str:
+        return self._generate_key(
+            "lead_qual",
             company=company_name,
             industry=industry or ""
         )
-        
+
+    async def _lookup(self, key: str, company_name: str) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Look a key up in L1, then Redis.
+
+        Returns:
+            (data, tier) where tier is "l1" or "l2", or (None, None) on miss/error
+        """
+        cached = self.l1.get(key)
+        if cached is not None:
+            await self._increment_stat("hits")
+            await self._increment_stat("l1_hits")
+            logger.debug(f"L1 cache HIT for {company_name}")
+            return json.loads(cached), "l1"
+
         try:
             redis = await self._get_redis()
             if not redis:
                 await self._increment_stat("errors")
-                return None
+                return None, None
             
             cached = await redis.get(key)
             if cached:
+                self.l1.set(key, cached)
                 await self._increment_stat("hits")
                 logger.info(f"Cache HIT for {company_name}")
-                return json.loads(cached)
+                return json.loads(cached), "l2"
             else:
                 await self._increment_stat("misses")
                 logger.info(f"Cache MISS for {company_name}")
-                return None
+                return None, None
                 
         except Exception as e:
             await self._increment_stat("errors")
             logger.error(f"Cache read error for {company_name}: {e}")
-            return None
+            return None, None
+    
+    async def get_cached_qualification(
+        self, 
+        company_name: str, 
+        industry: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Retrieve cached lead qualification result.
+        
+        Args:
+            company_name: Company name
+            industry: Company industry (optional)
+        
+        Returns:
+            Cached qualification data or None if cache miss/error
+        """
+        data, _ = await self._lookup(self._qualification_key(company_name, industry), company_name)
+        return data
+
+    async def get_or_compute_qualification(
+        self,
+        company_name: str,
+        industry: Optional[str],
+        compute: Callable[[], Awaitable[dict]],
+        ttl: Optional[timedelta] = None
+    ) -> Tuple[dict, str]:
+        """
+        Return a cached qualification, computing and caching it on a miss.
+
+        Concurrent misses for the same key share one in-flight computation
+        (single-flight), so a burst of identical requests makes one LLM call.
+        The computation runs as its own task and is not cancelled if the
+        caller that started it goes away.
+
+        Args:
+            company_name: Company name
+            industry: Company industry (optional)
+            compute: Coroutine factory producing the qualification data
+            ttl: Redis time to live (default: 24h with jitter)
+
+        Returns:
+            (qualification_data, source) where source is "l1", "l2",
+            "computed" (this call ran compute) or "coalesced"
+        """
+        key = self._qualification_key(company_name, industry)
+
+        data, tier = await self._lookup(key, company_name)
+        if data is not None:
+            return data, tier
+
+        task = self._inflight.get(key)
+        if task is not None:
+            await self._increment_stat("coalesced")
+            logger.info(f"Coalesced qualification for {company_name} onto in-flight request")
+            return await asyncio.shield(task), "coalesced"
+
+        async def compute_and_cache() -> dict:
+            result = await compute()
+            await self.cache_qualification(company_name, industry, result, ttl)
+            return result
+
+        task = asyncio.ensure_future(compute_and_cache())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None)
+        return await asyncio.shield(task), "computed"
     
     async def cache_qualification(
         self,
@@ -183,11 +364,10 @@ class CacheManager:
         Returns:
             True if cached successfully, False otherwise
         """
-        key = self._generate_key(
-            "lead_qual",
-            company=company_name,
-            industry=industry or ""
-        )
+        key = self._qualification_key(company_name, industry)
+        ttl_seconds = self._get_ttl_with_jitter(ttl or self.default_ttl)
+        payload = json.dumps(qualification_data)
+        self.l1.set(key, payload, min(ttl_seconds, self.l1.ttl_seconds))
         
         try:
             redis = await self._get_redis()
@@ -195,13 +375,7 @@ class CacheManager:
                 await self._increment_stat("errors")
                 return False
             
-            ttl_seconds = self._get_ttl_with_jitter(ttl or self.default_ttl)
-            
-            await redis.setex(
-                key,
-                ttl_seconds,
-                json.dumps(qualification_data)
-            )
+            await redis.setex(key, ttl_seconds, payload)
             
             logger.info(f"Cached qualification for {company_name} (TTL: {ttl_seconds}s)")
             return True
@@ -226,16 +400,13 @@ class CacheManager:
         Returns:
             True if invalidated successfully, False otherwise
         """
-        key = self._generate_key(
-            "lead_qual",
-            company=company_name,
-            industry=industry or ""
-        )
+        key = self._qualification_key(company_name, industry)
+        evicted = self.l1.delete(key)
         
         try:
             redis = await self._get_redis()
             if not redis:
-                return False
+                return evicted
             
             deleted = await redis.delete(key)
             if deleted:
@@ -253,6 +424,7 @@ class CacheManager:
         Returns:
             Number of keys deleted
         """
+        self.l1.clear()
         try:
             redis = await self._get_redis()
             if not redis:
@@ -274,53 +446,72 @@ class CacheManager:
             logger.error(f"Cache clear error: {e}")
             return 0
     
+    def _empty_stats(self) -> dict:
+        return {
+            "connected": False,
+            "hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "hit_rate": 0.0,
+            "total_operations": 0,
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "coalesced": 0,
+            "l1_hit_rate": 0.0,
+            "l2_hit_rate": 0.0,
+            "l1_entries": len(self.l1),
+            "l1_bytes": self.l1.size_bytes
+        }
+
     async def get_cache_stats(self) -> dict:
         """
         Retrieve cache performance statistics.
+
+        Pending local counts are flushed first. ``hits`` covers both tiers;
+        ``l1_hit_rate`` is over all lookups and ``l2_hit_rate`` is over the
+        lookups that reached Redis.
         
         Returns:
-            Dict with hits, misses, errors, hit_rate, total_operations
+            Dict with hits, misses, errors, hit_rate, total_operations and
+            per-tier hit counts/rates
         """
         try:
             redis = await self._get_redis()
             if not redis:
-                return {
-                    "connected": False,
-                    "hits": 0,
-                    "misses": 0,
-                    "errors": 0,
-                    "hit_rate": 0.0,
-                    "total_operations": 0
-                }
-            
-            # Get all stat counters
-            hits = int(await redis.get("cache:stats:hits") or 0)
-            misses = int(await redis.get("cache:stats:misses") or 0)
-            errors = int(await redis.get("cache:stats:errors") or 0)
+                return self._empty_stats()
+
+            await self._flush_stats()
+            values = await redis.mget([f"cache:stats:{name}" for name in STAT_NAMES])
+            counts = {name: int(value or 0) for name, value in zip(STAT_NAMES, values)}
+
+            hits = counts["hits"]
+            misses = counts["misses"]
+            l1_hits = min(counts["l1_hits"], hits)
+            l2_hits = hits - l1_hits
             
             total = hits + misses
             hit_rate = (hits / total * 100) if total > 0 else 0.0
+            l2_lookups = total - l1_hits
             
             return {
                 "connected": self._connected,
                 "hits": hits,
                 "misses": misses,
-                "errors": errors,
+                "errors": counts["errors"],
                 "hit_rate": round(hit_rate, 2),
-                "total_operations": total
+                "total_operations": total,
+                "l1_hits": l1_hits,
+                "l2_hits": l2_hits,
+                "coalesced": counts["coalesced"],
+                "l1_hit_rate": round(l1_hits / total * 100, 2) if total > 0 else 0.0,
+                "l2_hit_rate": round(l2_hits / l2_lookups * 100, 2) if l2_lookups > 0 else 0.0,
+                "l1_entries": len(self.l1),
+                "l1_bytes": self.l1.size_bytes
             }
             
         except Exception as e:
             logger.error(f"Failed to get cache stats: {e}")
-            return {
-                "connected": False,
-                "hits": 0,
-                "misses": 0,
-                "errors": 0,
-                "hit_rate": 0.0,
-                "total_operations": 0,
-                "error": str(e)
-            }
+            return {**self._empty_stats(), "error": str(e)}
     
     async def health_check(self) -> dict:
         """
@@ -358,8 +549,9 @@ class CacheManager:
             }
     
     async def close(self):
-        """Close Redis connection gracefully."""
+        """Flush pending stats and close Redis connection gracefully."""
         if self._redis:
+            await self._flush_stats()
             try:
                 await self._redis.close()
                 logger.info("Redis connection closed")
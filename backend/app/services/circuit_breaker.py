@@ -2,13 +2,24 @@
 
 Implements a three-state circuit breaker (CLOSED, OPEN, HALF_OPEN) to prevent
 cascading failures when external services are unavailable.
+
+DistributedCircuitBreaker keeps the state in Redis so every API and Celery
+worker trips together; create_circuit_breaker() picks the mode from
+CIRCUIT_BREAKER_DISTRIBUTED.
 """
 
 import asyncio
 import logging
+import os
+import time
+import uuid
+import weakref
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Callable, Any, TypeVar, Optional
+from typing import Callable, Any, TypeVar, Optional, Dict, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +95,10 @@ class CircuitBreaker:
         """Get current failure count."""
         return self._failure_count
 
+    def is_open(self) -> bool:
+        """Check if calls are currently being rejected."""
+        return self._state == CircuitState.OPEN and not self._should_attempt_reset()
+
     async def call(self, func: Callable[..., T], *args, **kwargs) -> T:
         """
         Execute a function with circuit breaker protection.
@@ -251,3 +266,518 @@ class CircuitBreaker:
             "last_state_change": self._last_state_change.isoformat(),
             "time_until_retry": self._time_until_retry() if self._state == CircuitState.OPEN else 0.0
         }
+
+
+CIRCUIT_EVENTS_CHANNEL = "circuit_breaker:events"
+_STATE_TTL_SECONDS = 86400  # Idle breakers fall back to CLOSED
+
+# State lives in hash KEYS[1] (state, failures, successes, opened_at); KEYS[2]
+# is the half-open probe lock. Times come from the Redis server clock so
+# every worker agrees on when recovery_timeout has elapsed.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local fields = redis.call('HMGET', KEYS[1], 'state', 'failures', 'opened_at')
+local state = fields[1] or 'closed'
+local failures = tonumber(fields[2]) or 0
+
+if state == 'closed' then
+    return {state, 1, 0, 0, failures}
+end
+
+if state == 'open' then
+    local wait = (tonumber(fields[3]) or 0) + tonumber(ARGV[1]) - now
+    if wait > 0 then
+        return {state, 0, 0, math.ceil(wait * 1000), failures}
+    end
+    state = 'half_open'
+    redis.call('HSET', KEYS[1], 'state', state, 'successes', 0)
+    redis.call('PUBLISH', ARGV[4], ARGV[5] .. ':' .. state)
+end
+
+-- HALF_OPEN: one probe cluster-wide, holders of the lock run it
+if redis.call('SET', KEYS[2], ARGV[2], 'NX', 'PX', ARGV[3]) then
+    return {state, 1, 1, 0, failures}
+end
+return {state, 0, 0, math.max(redis.call('PTTL', KEYS[2]), 0), failures}
+"""
+
+_FAILURE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+redis.call('HSET', KEYS[1], 'successes', 0)
+
+local new_state = state
+if state == 'half_open' or state == 'open' or failures >= tonumber(ARGV[1]) then
+    new_state = 'open'
+    redis.call('HSET', KEYS[1], 'state', new_state, 'opened_at', now)
+end
+if redis.call('GET', KEYS[2]) == ARGV[2] then
+    redis.call('DEL', KEYS[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+if new_state ~= state then
+    redis.call('PUBLISH', ARGV[3], ARGV[4] .. ':' .. new_state)
+end
+return {new_state, failures}
+"""
+
+_SUCCESS_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'half_open' then
+    if redis.call('GET', KEYS[2]) ~= ARGV[2] then
+        return {state, 0}
+    end
+    redis.call('DEL', KEYS[2])
+    local successes = redis.call('HINCRBY', KEYS[1], 'successes', 1)
+    if successes >= tonumber(ARGV[1]) then
+        state = 'closed'
+        redis.call('HSET', KEYS[1], 'state', state, 'failures', 0, 'successes', 0)
+        redis.call('PUBLISH', ARGV[3], ARGV[4] .. ':' .. state)
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+elseif state == 'closed' then
+    redis.call('HSET', KEYS[1], 'failures', 0)
+end
+return {state, 0}
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Loop-bound async Redis clients, one per (url) for the running event loop
+_redis_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, redis.Redis]] = {}
+
+
+def _redis_for(url: str) -> redis.Redis:
+    loop = asyncio.get_running_loop()
+    entry = _redis_clients.get(url)
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    # Celery runs each task in a fresh loop; the old pool can't be reused
+    client = redis.from_url(url, decode_responses=True)
+    _redis_clients[url] = (loop, client)
+    return client
+
+
+class _BreakerEvents:
+    """One pub/sub subscription per Redis client fanning state changes to local breakers."""
+
+    def __init__(self):
+        self._breakers: Dict[str, "weakref.WeakSet[DistributedCircuitBreaker]"] = {}
+        # Keyed by id(client): breakers may use different Redis servers, and a
+        # listener on one must not stand in for another
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._subscribed: Dict[int, asyncio.Event] = {}
+        self._retry_at: Dict[int, float] = {}
+
+    def register(self, breaker: "DistributedCircuitBreaker") -> None:
+        self._breakers.setdefault(breaker.name, weakref.WeakSet()).add(breaker)
+
+    async def ensure_listening(self, client: redis.Redis) -> None:
+        """Start the client's listener and wait until it is subscribed.
+
+        Events published before SUBSCRIBE completes would be lost, leaving
+        this worker on its stale cached state until the cache expires.
+        """
+        loop = asyncio.get_running_loop()
+        key = id(client)
+        task = self._tasks.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            if time.monotonic() < self._retry_at.get(key, 0.0):
+                return
+            # The running task holds its client, so a live entry's id can't be reused
+            self._tasks = {k: t for k, t in self._tasks.items() if not t.done()}
+            self._subscribed = {k: e for k, e in self._subscribed.items() if k in self._tasks}
+            self._subscribed[key] = asyncio.Event()
+            self._tasks[key] = loop.create_task(self._listen(client, self._subscribed[key]))
+        await self._subscribed[key].wait()
+
+    async def aclose(self) -> None:
+        """Cancel the listeners running on this event loop."""
+        loop = asyncio.get_running_loop()
+        tasks = [t for t in self._tasks.values() if t.get_loop() is loop and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {k: t for k, t in self._tasks.items() if not t.done()}
+        self._subscribed = {k: e for k, e in self._subscribed.items() if k in self._tasks}
+
+    async def _listen(self, client: redis.Redis, subscribed: asyncio.Event) -> None:
+        pubsub = None
+        try:
+            pubsub = client.pubsub()
+            await pubsub.subscribe(CIRCUIT_EVENTS_CHANNEL)
+            subscribed.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                name, _, state = message["data"].rpartition(":")
+                for breaker in list(self._breakers.get(name, ())):
+                    breaker._apply_event(state)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Local caches still expire on their own; resubscribe later
+            self._retry_at[id(client)] = time.monotonic() + 5.0
+            logger.warning(f"Circuit breaker event listener stopped: {e}")
+        finally:
+            # Never leave callers waiting on a listener that failed to subscribe
+            subscribed.set()
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+_events = _BreakerEvents()
+
+_LOCAL = object()  # Sentinel: Redis unavailable, use in-process state
+
+
+class DistributedCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker whose state is shared by all workers through Redis.
+
+    - State and failure counts live in Redis, updated by Lua scripts, so the
+      first workers to see an outage open the circuit for everyone
+    - A short local cache keeps the CLOSED fast path free of Redis calls;
+      pub/sub events invalidate it as soon as any worker changes state
+    - HALF_OPEN allows exactly one probe cluster-wide (a Redis lock with
+      probe_timeout expiry), other workers fail fast until it finishes
+    - If Redis is unreachable the breaker falls back to in-process state
+    """
+
+    KEY_PREFIX = "circuit_breaker"
+    REDIS_RETRY_SECONDS = 5.0
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 60,
+        success_threshold: int = 2,
+        redis_url: Optional[str] = None,
+        cache_ttl: float = 1.0,
+        probe_timeout: float = 30.0,
+        redis_timeout_ms: int = 100,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        """
+        Initialize distributed circuit breaker.
+
+        Args:
+            name: Identifier shared by every worker protecting the same service
+            failure_threshold: Cluster-wide consecutive failures before opening
+            recovery_timeout: Seconds to wait before attempting recovery
+            success_threshold: Consecutive probe successes needed to close
+            redis_url: Redis connection URL (defaults to REDIS_URL)
+            cache_ttl: Seconds a worker trusts its cached state without Redis
+            probe_timeout: Seconds before an unfinished probe's lock expires
+            redis_timeout_ms: Redis operation timeout in milliseconds
+            redis_client: Client to use instead of a per-event-loop one from redis_url
+                (decode_responses=True)
+        """
+        super().__init__(name, failure_threshold, recovery_timeout, success_threshold)
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.cache_ttl = cache_ttl
+        self.probe_timeout = probe_timeout
+        self.redis_timeout = redis_timeout_ms / 1000.0
+        self._client = redis_client
+
+        self._state_key = f"{self.KEY_PREFIX}:{name}"
+        self._probe_key = f"{self.KEY_PREFIX}:{name}:probe"
+
+        # Local view of the shared state
+        self._cached_state = CircuitState.CLOSED
+        self._cached_failures = 0
+        self._cached_until = 0.0  # time.monotonic()
+        self._blocked_until = 0.0
+        self._redis_down_until = 0.0
+
+        _events.register(self)
+
+    @property
+    def state(self) -> CircuitState:
+        """Get the last known shared state (local state while Redis is down)."""
+        if self._redis_available():
+            return self._cached_state
+        return self._state
+
+    @property
+    def failure_count(self) -> int:
+        """Get the last known cluster-wide failure count."""
+        if self._redis_available():
+            return self._cached_failures
+        return self._failure_count
+
+    def is_open(self) -> bool:
+        """Check if calls are currently being rejected."""
+        if not self._redis_available():
+            return super().is_open()
+        return self._cached_state != CircuitState.CLOSED and time.monotonic() < self._blocked_until
+
+    async def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Execute a function with cluster-wide circuit breaker protection.
+
+        Args:
+            func: Async function to execute
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func execution
+
+        Raises:
+            CircuitBreakerError: If the circuit is OPEN or another worker is probing
+            Exception: Original exception from func if execution fails
+        """
+        probe = await self._acquire()
+        if probe is _LOCAL:
+            return await super().call(func, *args, **kwargs)
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            await self._record_failure(e, probe)
+            raise
+        except BaseException:
+            await self._release_probe(probe)
+            raise
+
+        await self._record_success(probe)
+        return result
+
+    async def call_streaming(self, func):
+        """
+        Execute a streaming function with cluster-wide circuit breaker protection.
+
+        Args:
+            func: Async generator function to execute
+
+        Yields:
+            Chunks from the streaming function
+
+        Raises:
+            CircuitBreakerError: If the circuit is OPEN or another worker is probing
+        """
+        probe = await self._acquire()
+        if probe is _LOCAL:
+            async for chunk in super().call_streaming(func):
+                yield chunk
+            return
+
+        try:
+            async for chunk in func():
+                yield chunk
+        except Exception as e:
+            await self._record_failure(e, probe)
+            raise
+        except BaseException:
+            # Cancelled, or the consumer closed the stream early
+            await self._release_probe(probe)
+            raise
+
+        await self._record_success(probe)
+
+    async def _acquire(self) -> Any:
+        """
+        Admit a call or raise CircuitBreakerError.
+
+        Returns:
+            Probe token if this call is the cluster's HALF_OPEN probe, None for a
+            normal call, or _LOCAL when Redis is unavailable
+        """
+        if not self._redis_available():
+            return _LOCAL
+
+        now = time.monotonic()
+        if now < self._cached_until:
+            if self._cached_state == CircuitState.CLOSED:
+                return None
+            if now < self._blocked_until:
+                self._raise_blocked(self._blocked_until - now)
+
+        token = uuid.uuid4().hex
+        try:
+            async with asyncio.timeout(self.redis_timeout):
+                client = self._redis()
+                await _events.ensure_listening(client)
+                state, allowed, is_probe, retry_ms, failures = await client.eval(
+                    _ACQUIRE_SCRIPT, 2, self._state_key, self._probe_key,
+                    self.recovery_timeout, token, int(self.probe_timeout * 1000),
+                    CIRCUIT_EVENTS_CHANNEL, self.name,
+                )
+        except (asyncio.TimeoutError, RedisError, OSError) as e:
+            self._mark_redis_down(e)
+            return _LOCAL
+
+        self._cache(CircuitState(state), int(failures), int(retry_ms) / 1000.0)
+        if not allowed:
+            self._raise_blocked(int(retry_ms) / 1000.0)
+        if is_probe:
+            logger.debug(f"Circuit breaker '{self.name}': Probing recovery in HALF_OPEN state")
+            return token
+        return None
+
+    async def _record_success(self, probe: Optional[str]) -> None:
+        # CLOSED with no failures on record: nothing to write
+        if probe is None and self._cached_failures == 0:
+            return
+        try:
+            async with asyncio.timeout(self.redis_timeout):
+                state, _ = await self._redis().eval(
+                    _SUCCESS_SCRIPT, 2, self._state_key, self._probe_key,
+                    self.success_threshold, probe or "", CIRCUIT_EVENTS_CHANNEL,
+                    self.name, _STATE_TTL_SECONDS,
+                )
+        except (asyncio.TimeoutError, RedisError, OSError) as e:
+            self._mark_redis_down(e)
+            await self._on_success()
+            return
+
+        state = CircuitState(state)
+        if state == CircuitState.CLOSED and self._cached_state != CircuitState.CLOSED:
+            logger.info(f"Circuit breaker '{self.name}': CLOSED (recovered)")
+        self._cache(state, 0 if state == CircuitState.CLOSED else self._cached_failures, 0.0)
+
+    async def _record_failure(self, exception: Exception, probe: Optional[str]) -> None:
+        try:
+            async with asyncio.timeout(self.redis_timeout):
+                state, failures = await self._redis().eval(
+                    _FAILURE_SCRIPT, 2, self._state_key, self._probe_key,
+                    self.failure_threshold, probe or "", CIRCUIT_EVENTS_CHANNEL,
+                    self.name, _STATE_TTL_SECONDS,
+                )
+        except (asyncio.TimeoutError, RedisError, OSError) as e:
+            self._mark_redis_down(e)
+            await self._on_failure(exception)
+            return
+
+        state = CircuitState(state)
+        logger.warning(
+            f"Circuit breaker '{self.name}': Failure #{failures} (cluster-wide) "
+            f"- {type(exception).__name__}: {str(exception)}"
+        )
+        if state == CircuitState.OPEN and self._cached_state != CircuitState.OPEN:
+            logger.error(
+                f"Circuit breaker '{self.name}': OPEN "
+                f"(failures={failures}, timeout={self.recovery_timeout}s)"
+            )
+        self._cache(state, int(failures), float(self.recovery_timeout) if state == CircuitState.OPEN else 0.0)
+
+    async def _release_probe(self, probe: Optional[str]) -> None:
+        """
+        Give up the HALF_OPEN probe lock without recording an outcome.
+
+        A cancelled probe says nothing about the provider; releasing the lock
+        lets the next caller probe instead of waiting out probe_timeout.
+        """
+        if probe is None:
+            return
+        try:
+            # Shielded: runs while the caller's task is being cancelled
+            await asyncio.shield(self._release_probe_lock(probe))
+        except (asyncio.TimeoutError, RedisError, OSError) as e:
+            self._mark_redis_down(e)
+
+    async def _release_probe_lock(self, probe: str) -> None:
+        async with asyncio.timeout(self.redis_timeout):
+            await self._redis().eval(_RELEASE_SCRIPT, 1, self._probe_key, probe)
+
+    def _apply_event(self, state: str) -> None:
+        """Pub/sub update from any worker: adopt the new state immediately."""
+        try:
+            new_state = CircuitState(state)
+        except ValueError:
+            return
+        if new_state == CircuitState.HALF_OPEN:
+            # Let the next call ask Redis whether it may probe
+            self._cached_until = 0.0
+            return
+        self._cache(
+            new_state,
+            0 if new_state == CircuitState.CLOSED else self._cached_failures,
+            float(self.recovery_timeout) if new_state == CircuitState.OPEN else 0.0,
+        )
+
+    def _cache(self, state: CircuitState, failures: int, blocked_for: float) -> None:
+        now = time.monotonic()
+        if state != self._cached_state:
+            self._last_state_change = datetime.now()
+        self._cached_state = state
+        self._cached_failures = failures
+        self._blocked_until = now + blocked_for
+        if state == CircuitState.OPEN:
+            # Fail fast locally until recovery may start (pub/sub reports earlier changes)
+            self._cached_until = self._blocked_until
+        elif state == CircuitState.HALF_OPEN:
+            self._cached_until = now + min(self.cache_ttl, blocked_for)
+        else:
+            self._cached_until = now + self.cache_ttl
+
+    def _raise_blocked(self, retry_after: float) -> None:
+        if self._cached_state == CircuitState.HALF_OPEN:
+            raise CircuitBreakerError(
+                f"Circuit breaker '{self.name}' is HALF_OPEN and another worker is probing. "
+                f"Retry after {retry_after:.1f}s"
+            )
+        raise CircuitBreakerError(
+            f"Circuit breaker '{self.name}' is OPEN. "
+            f"Retry after {retry_after:.1f}s"
+        )
+
+    def _redis(self) -> redis.Redis:
+        return self._client or _redis_for(self.redis_url)
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+        logger.warning(
+            f"Circuit breaker '{self.name}': Redis unavailable ({error}), "
+            f"using local state for {self.REDIS_RETRY_SECONDS:.0f}s"
+        )
+
+    def get_status(self) -> dict:
+        """Get current circuit breaker status for monitoring."""
+        if not self._redis_available():
+            return {**super().get_status(), "distributed": False}
+        return {
+            "name": self.name,
+            "state": self._cached_state.value,
+            "failure_count": self._cached_failures,
+            "success_count": 0,
+            "last_failure": None,
+            "last_state_change": self._last_state_change.isoformat(),
+            "time_until_retry": max(0.0, self._blocked_until - time.monotonic()) if self.is_open() else 0.0,
+            "distributed": True,
+        }
+
+
+def create_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Create a circuit breaker in the configured mode.
+
+    Returns a DistributedCircuitBreaker when CIRCUIT_BREAKER_DISTRIBUTED is
+    true (state shared by every worker using the same name), otherwise an
+    in-process CircuitBreaker.
+
+    Args:
+        name: Identifier for the protected service (e.g. "cerebras")
+        **kwargs: CircuitBreaker / DistributedCircuitBreaker settings
+    """
+    if os.getenv("CIRCUIT_BREAKER_DISTRIBUTED", "false").lower() in ("1", "true", "yes"):
+        return DistributedCircuitBreaker(name, **kwargs)
+    for key in ("redis_url", "cache_ttl", "probe_timeout", "redis_timeout_ms", "redis_client"):
+        kwargs.pop(key, None)
+    return CircuitBreaker(name, **kwargs)
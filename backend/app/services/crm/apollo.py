@@ -5,12 +5,16 @@ Implements API key authentication and contact enrichment for Apollo.io
 using the v1 API.
 """
 
-from typing import Optional, Dict, List, Any
+from typing import TYPE_CHECKING, Optional, Dict, List, Any
 from datetime import datetime, timedelta
 import httpx
 import logging
 import json
 
+from app.core.exceptions import APIAuthenticationError
+from app.core.http_clients import pooled_http_client
+from app.services.cache.apollo_cache import ApolloPersonCache
+from app.services.rate_limiter import AtomicRateLimiter
 from app.services.crm.base import (
     CRMProvider,
     Contact,
@@ -24,16 +28,38 @@ from app.services.crm.base import (
     CRMNetworkError,
 )
 
+if TYPE_CHECKING:
+    from app.services.apollo_enrichment_batcher import ApolloEnrichmentBatcher
+
 logger = logging.getLogger(__name__)
 
 
+def build_enrichment_record(email: str, person: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape an Apollo person like ApolloProvider.enrich_contact results.
+
+    Args:
+        email: Email that was enriched (used when Apollo withholds the address)
+        person: Apollo person object
+
+    Returns:
+        Dict with "contact", "apollo_person" and "enrichment_date"
+    """
+    contact = ApolloProvider._map_apollo_to_contact({**person, "email": person.get("email") or email})
+    return {
+        "contact": contact.dict(),
+        "apollo_person": person,
+        "enrichment_date": datetime.utcnow().isoformat()
+    }
+
+
 class ApolloProvider(CRMProvider):
     """
     Apollo.io integration using API key authentication.
 
     Features:
     - API key authentication (X-Api-Key header)
-    - Contact enrichment from email
+    - Contact enrichment from email (cache-first, batched via /people/bulk_match)
     - Person data retrieval by Apollo ID
     - Redis-based rate limiting (600 req/hour per endpoint)
     - Rich data mapping (title, company, LinkedIn, phone, location)
@@ -70,6 +96,8 @@ class ApolloProvider(CRMProvider):
         if not self.api_key:
             raise CRMValidationError("Apollo API key is required")
 
+        self._batcher = None
+
     async def authenticate(self) -> bool:
         """
         Verify authentication by making a test API call.
@@ -82,7 +110,7 @@ class ApolloProvider(CRMProvider):
         """
         try:
             # Test auth with a simple person match (using Apollo's demo email)
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("apollo") as client:
                 response = await client.post(
                     f"{self.BASE_URL}/people/match",
                     headers={
@@ -120,7 +148,8 @@ class ApolloProvider(CRMProvider):
         logger.info("Apollo uses API key authentication - no token refresh needed")
         return self.api_key
 
-    def _map_apollo_to_contact(self, person: Dict[str, Any]) -> Contact:
+    @staticmethod
+    def _map_apollo_to_contact(person: Dict[str, Any]) -> Contact:
         """
         Map Apollo person response to unified Contact model.
 
@@ -189,7 +218,7 @@ class ApolloProvider(CRMProvider):
         try:
             await self._check_rate_limit()
 
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("apollo") as client:
                 response = await client.post(
                     f"{self.BASE_URL}/people/match",
                     headers={
@@ -246,59 +275,66 @@ class ApolloProvider(CRMProvider):
         """
         Enrich contact data using email address (Apollo's primary use case).
 
+        Served from the Apollo person cache when possible; see enrich_contacts.
+
         Args:
             email: Email address to enrich
 
         Returns:
-            Dict with enriched contact data and Apollo person object
+            Dict with enriched contact data and Apollo person object,
+            or None if Apollo has no match
 
         Raises:
-            CRMNotFoundError: If email not found
             CRMRateLimitError: If rate limit exceeded
+            CRMNetworkError: If Apollo could not be reached
         """
-        try:
-            await self._check_rate_limit()
+        results = await self.enrich_contacts([email])
+        return results.get(ApolloPersonCache.normalize_email(email))
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/people/match",
-                    headers={
-                        "X-Api-Key": self.api_key,
-                        "Content-Type": "application/json",
-                        "Cache-Control": "no-cache",
-                    },
-                    params={
-                        "email": email,
-                        # "reveal_phone_number": "false",  # Costs extra credits
-                        # "reveal_personal_emails": "false"  # Costs extra credits
-                    },
-                    timeout=30.0
-                )
-
-                await self._update_rate_limit(response)
-
-                if response.status_code == 404:
-                    logger.info(f"Email {email} not found in Apollo")
-                    return None
-                elif response.status_code == 429:
-                    data = response.json()
-                    raise CRMRateLimitError(data.get("message", "Rate limit exceeded"))
-                elif response.status_code >= 400:
-                    logger.error(f"Apollo enrichment error: {response.status_code}")
-                    return None
+    async def enrich_contacts(self, emails: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Enrich many emails: cache first, then /people/bulk_match in batches of 10.
 
-                person = response.json()
-                contact = self._map_apollo_to_contact(person)
+        Args:
+            emails: Email addresses to enrich
 
-                return {
-                    "contact": contact.dict(),
-                    "apollo_person": person,
-                    "enrichment_date": datetime.utcnow().isoformat()
-                }
+        Returns:
+            {normalized email: enrich_contact-style dict, or None if Apollo
+            has no match}; emails that could not be enriched are absent
 
-        except httpx.HTTPError as e:
-            logger.error(f"Network error enriching {email}: {e}")
-            raise CRMNetworkError(f"Network error: {e}")
+        Raises:
+            CRMAuthenticationError: If the API key is invalid
+            CRMRateLimitError: If Apollo's daily quota ran out before any email was enriched
+            CRMNetworkError: If no email could be enriched
+        """
+        try:
+            result = await self._get_batcher().enrich_emails(emails)
+        except APIAuthenticationError as e:
+            raise CRMAuthenticationError(str(e))
+
+        if result.failed and not result.people:
+            if result.stats.daily_quota_exhausted:
+                raise CRMRateLimitError("Apollo daily request quota exhausted")
+            raise CRMNetworkError(f"Apollo enrichment failed for {len(result.failed)} emails")
+
+        return {
+            email: build_enrichment_record(email, person) if person else None
+            for email, person in result.people.items()
+        }
+
+    def _get_batcher(self) -> "ApolloEnrichmentBatcher":
+        """Batcher sharing the Apollo rate limit (keyed by API key) across workers."""
+        # Imported here: app.services.apollo imports this package (crm.base)
+        from app.services.apollo import ApolloService
+        from app.services.apollo_enrichment_batcher import ApolloEnrichmentBatcher
+
+        if self._batcher is None:
+            self._batcher = ApolloEnrichmentBatcher(
+                ApolloService(api_key=self.api_key),
+                cache=ApolloPersonCache(self.redis) if self.redis else None,
+                rate_limiter=AtomicRateLimiter(self.redis) if self.redis else None,
+            )
+        return self._batcher
 
     async def sync_contacts(
         self,
@@ -346,50 +382,30 @@ class ApolloProvider(CRMProvider):
         contacts_created = 0
         contacts_updated = 0
         contacts_failed = 0
-        total_processed = 0
         errors_list = []
 
         logger.info(f"Starting Apollo enrichment for {len(emails)} email addresses")
 
-        # Enrich each email address
+        try:
+            enriched = await self.enrich_contacts(emails)
+        except (CRMRateLimitError, CRMNetworkError) as e:
+            logger.warning(f"Apollo enrichment failed: {e}")
+            enriched = {}
+
         for email in emails:
-            total_processed += 1
-
-            try:
-                # Use existing enrich_contact method
-                enrichment_result = await self.enrich_contact(email)
-
-                if enrichment_result:
-                    # Successfully enriched
-                    contacts_created += 1
-                    logger.debug(f"Enriched contact: {email}")
-                else:
-                    # Email not found in Apollo
-                    contacts_failed += 1
-                    errors_list.append({
-                        "email": email,
-                        "error": "Contact not found in Apollo database"
-                    })
-                    logger.debug(f"Contact not found: {email}")
-
-            except CRMRateLimitError as e:
-                # Rate limit hit - stop processing
-                contacts_failed += 1
-                errors_list.append({
-                    "email": email,
-                    "error": f"Rate limit exceeded: {str(e)}"
-                })
-                logger.warning(f"Rate limit exceeded at email {total_processed}/{len(emails)}")
-                break
-
-            except Exception as e:
-                # Other error - log and continue
-                contacts_failed += 1
-                errors_list.append({
-                    "email": email,
-                    "error": str(e)
-                })
-                logger.error(f"Failed to enrich {email}: {e}")
+            normalized = ApolloPersonCache.normalize_email(email)
+            if enriched.get(normalized):
+                contacts_created += 1
+                continue
+
+            contacts_failed += 1
+            if normalized in enriched:
+                error = "Contact not found in Apollo database"
+            else:
+                error = "Not enriched (rate limit or API error); retry later"
+            errors_list.append({"email": email, "error": error})
+
+        total_processed = len(emails)
 
         logger.info(
             f"Apollo sync completed: {contacts_created} enriched, "
@@ -13,6 +13,7 @@ import httpx
 import logging
 import base64
 
+from app.core.http_clients import pooled_http_client
 from app.services.crm.base import (
     CRMProvider,
     Contact,
@@ -97,7 +98,7 @@ class CloseProvider(CRMProvider):
         """
         try:
             # Test auth with a simple API call to get current user
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("close") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/me/",
                     headers={
@@ -204,7 +205,7 @@ class CloseProvider(CRMProvider):
         try:
             await self._check_rate_limit()
 
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("close") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/contact/{contact_id}/",
                     headers={
@@ -314,7 +315,7 @@ class CloseProvider(CRMProvider):
                 ]
             }
 
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("close") as client:
                 response = await client.post(
                     f"{self.BASE_URL}/lead/",
                     headers={
@@ -379,7 +380,7 @@ class CloseProvider(CRMProvider):
             if contact.phone:
                 update_data["phones"] = [{"phone": contact.phone}]
 
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("close") as client:
                 response = await client.put(
                     f"{self.BASE_URL}/contact/{contact_id}/",
                     headers={
@@ -466,7 +467,7 @@ class CloseProvider(CRMProvider):
                 while has_more:
                     await self._check_rate_limit()
 
-                    async with httpx.AsyncClient() as client:
+                    async with pooled_http_client("close") as client:
                         response = await client.get(
                             f"{self.BASE_URL}/lead/",
                             headers={
@@ -525,6 +526,115 @@ class CloseProvider(CRMProvider):
             logger.error(f"Error during Close CRM sync: {e}")
             raise
 
+    async def fetch_lead_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        updated_since: Optional[datetime] = None,
+        query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of leads, oldest date_updated first.
+
+        Args:
+            skip: Offset within the (updated_since) window
+            limit: Page size
+            updated_since: Only leads with date_updated >= this (UTC)
+            query: Optional Close search query
+
+        Returns:
+            Close list response ({"data": [...], "has_more": bool})
+
+        Raises:
+            CRMRateLimitError: If rate limit exceeded
+            CRMAuthenticationError: If the API key is rejected
+            CRMNetworkError: On network or API errors
+        """
+        await self._check_rate_limit()
+
+        params: Dict[str, Any] = {
+            "_limit": limit,
+            "_skip": skip,
+            "_order_by": "date_updated",
+        }
+        if query:
+            params["query"] = query
+        if updated_since:
+            params["date_updated__gte"] = updated_since.strftime("%Y-%m-%dT%H:%M:%S")
+
+        try:
+            async with pooled_http_client("close") as client:
+                response = await client.get(
+                    f"{self.BASE_URL}/lead/",
+                    headers={
+                        "Authorization": self.auth_header,
+                        "Content-Type": "application/json",
+                    },
+                    params=params,
+                    timeout=30.0
+                )
+        except httpx.HTTPError as e:
+            logger.error(f"Network error fetching Close leads (skip={skip}): {e}")
+            raise CRMNetworkError(f"Network error: {e}")
+
+        await self._update_rate_limit(response)
+
+        if response.status_code == 429:
+            self._handle_rate_limit_error(response)
+        elif response.status_code == 401:
+            raise CRMAuthenticationError("Invalid Close CRM API key")
+        elif response.status_code >= 400:
+            raise CRMNetworkError(f"Close CRM API error: {response.status_code}")
+
+        return response.json()
+
+    def map_lead_to_rows(self, lead: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Map a Close lead to crm_contacts column values for bulk upserts.
+
+        Lighter than _map_lead_to_contact (no model validation per contact);
+        contacts without an email are skipped since email is the upsert key.
+
+        Args:
+            lead: Close lead object from API response
+
+        Returns:
+            One dict per contact with an email
+        """
+        rows = []
+        lead_id = lead.get("id")
+        lead_name = lead.get("name") or None
+
+        for contact_data in lead.get("contacts", []):
+            emails = contact_data.get("emails") or []
+            email = (emails[0].get("email") or "").strip() if emails else ""
+            if not email or "@" not in email:
+                continue
+
+            phones = contact_data.get("phones") or []
+            name_parts = (contact_data.get("name") or "").split(" ", 1)
+
+            external_ids = {"close_lead": lead_id}
+            if contact_data.get("id"):
+                external_ids["close"] = contact_data["id"]
+
+            rows.append({
+                "email": email,
+                "first_name": name_parts[0] or None,
+                "last_name": name_parts[1] if len(name_parts) > 1 else None,
+                "title": contact_data.get("title") or None,
+                "company": lead_name,
+                "phone": (phones[0].get("phone") or None) if phones else None,
+                "external_ids": external_ids,
+                "enrichment_data": {
+                    "close_lead_id": lead_id,
+                    "lead_status": lead.get("status_label"),
+                    "lead_url": lead.get("url"),
+                },
+            })
+
+        return rows
+
     async def get_updated_contacts(self, since: datetime) -> List[Contact]:
         """
         Get contacts updated since a specific datetime.
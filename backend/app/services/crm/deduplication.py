@@ -12,6 +12,10 @@ Features:
 - Company name fuzzy matching via Levenshtein distance (60-90% confidence)
 - Phone number normalization and matching (70% confidence)
 - Aggregate confidence scoring with threshold (85% = duplicate alert)
+- Indexed lookups on persisted match keys (email_domain, phone_normalized,
+  company_normalized/company_block_key) - no full-table scans
+- Bulk mode: find_duplicates_bulk() dedups a whole import with one query per
+  field, using the same fuzzy company candidates as find_duplicates()
 
 Usage:
     ```python
@@ -30,18 +34,29 @@ Usage:
     if result.is_duplicate:
         print(f"Duplicate found! Confidence: {result.confidence}%")
         print(f"Matched contacts: {result.matches}")
+
+    # Dedup an entire import (results in input order)
+    results = await dedup.find_duplicates_bulk([
+        {"email": "jane@acme.com", "company": "Acme"},
+        {"email": "bob@globex.com", "phone": "555-0100"},
+    ])
     ```
 """
 
 import re
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-
-from app.models.crm import CRMContact
+from sqlalchemy import String, column, func, select, true, values
+
+from app.models.crm import (
+    CRMContact,
+    normalize_phone,
+    normalize_company_name,
+    company_block_key,
+)
 from app.models.lead import Lead
 from app.core.logging import setup_logging
 
@@ -110,6 +125,14 @@ class DeduplicationEngine:
     PHONE_MATCH_CONFIDENCE = 70.0
     COMPANY_NAME_BASE_CONFIDENCE = 60.0  # Minimum for fuzzy match
 
+    # Fuzzy company matching
+    COMPANY_SIMILARITY_THRESHOLD = 0.7
+    TRIGRAM_CANDIDATE_THRESHOLD = 0.3  # pg_trgm similarity() pre-filter
+    FUZZY_CANDIDATE_LIMIT = 200
+
+    # Max values per IN (...) clause in bulk lookups
+    BULK_QUERY_CHUNK_SIZE = 1000
+
     def __init__(
         self,
         db: Session,
@@ -148,12 +171,14 @@ class DeduplicationEngine:
         """
         checked_fields = []
         potential_matches: Dict[int, List[MatchDetails]] = {}  # contact_id -> [match_details]
+        contacts_by_id: Dict[int, CRMContact] = {}  # Already loaded by the match queries
 
         # 1. Email exact match (primary key)
         if email:
             checked_fields.append("email")
             matches = await self._match_by_email(email)
             for contact in matches:
+                contacts_by_id[contact.id] = contact
                 if contact.id not in potential_matches:
                     potential_matches[contact.id] = []
                 potential_matches[contact.id].append(MatchDetails(
@@ -171,6 +196,7 @@ class DeduplicationEngine:
             if domain:
                 matches = await self._match_by_domain(domain)
                 for contact in matches:
+                    contacts_by_id[contact.id] = contact
                     if contact.id not in potential_matches:
                         potential_matches[contact.id] = []
                     potential_matches[contact.id].append(MatchDetails(
@@ -186,6 +212,7 @@ class DeduplicationEngine:
             checked_fields.append("linkedin_url")
             matches = await self._match_by_linkedin_url(linkedin_url)
             for contact in matches:
+                contacts_by_id[contact.id] = contact
                 if contact.id not in potential_matches:
                     potential_matches[contact.id] = []
                 potential_matches[contact.id].append(MatchDetails(
@@ -203,6 +230,7 @@ class DeduplicationEngine:
             if normalized_phone:
                 matches = await self._match_by_phone(normalized_phone)
                 for contact in matches:
+                    contacts_by_id[contact.id] = contact
                     if contact.id not in potential_matches:
                         potential_matches[contact.id] = []
                     potential_matches[contact.id].append(MatchDetails(
@@ -218,6 +246,7 @@ class DeduplicationEngine:
             checked_fields.append("company")
             matches = await self._match_by_company_fuzzy(company)
             for contact, similarity in matches:
+                contacts_by_id[contact.id] = contact
                 if contact.id not in potential_matches:
                     potential_matches[contact.id] = []
                 # Scale confidence based on similarity (60% base + 30% * similarity)
@@ -230,11 +259,170 @@ class DeduplicationEngine:
                     reason=f"Company name similarity: {similarity:.1%} ('{company}' vs '{contact.company}')"
                 ))
 
-        # Calculate aggregate confidence for each contact
+        result = self._build_result(potential_matches, contacts_by_id, checked_fields)
+
+        logger.info(
+            f"Deduplication check: {len(result.matches)} potential matches found, "
+            f"highest confidence: {result.confidence:.1f}%, duplicate: {result.is_duplicate}"
+        )
+
+        return result
+
+    async def find_duplicates_bulk(
+        self,
+        contacts: List[Dict[str, Any]]
+    ) -> List[DeduplicationResult]:
+        """
+        Find potential duplicates for an entire import in one pass.
+
+        Runs one indexed IN (...) query per field for the whole batch (chunked)
+        and one trigram candidate query for all company names, then scores
+        every input contact in memory. Each contact dict accepts the
+        same keys as find_duplicates(): email, company, linkedin_url, phone,
+        company_website.
+
+        Args:
+            contacts: Contacts to check
+
+        Returns:
+            One DeduplicationResult per input contact, in input order
+        """
+        # Normalize every input once
+        prepared = []
+        emails: Set[str] = set()
+        domains: Set[str] = set()
+        linkedin_urls: Set[str] = set()
+        phones: Set[str] = set()
+        company_names: Set[str] = set()
+
+        for contact in contacts:
+            email = (contact.get("email") or "").lower() or None
+            domain = self._extract_domain(contact.get("email") or contact.get("company_website"))
+            linkedin_url = (contact.get("linkedin_url") or "").lower().rstrip('/') or None
+            phone = self._normalize_phone(contact.get("phone")) or None
+            company_normalized = self._normalize_company_name(contact.get("company"))
+
+            if email:
+                emails.add(email)
+            if domain:
+                domains.add(domain)
+            if linkedin_url:
+                linkedin_urls.add(linkedin_url)
+            if phone:
+                phones.update(self._phone_variants(phone))
+            if company_normalized:
+                company_names.add(company_normalized)
+
+            prepared.append((contact, email, domain, linkedin_url, phone, company_normalized))
+
+        # One query per field for the whole batch
+        by_email: Dict[str, List[CRMContact]] = {}
+        for row in self._load_in_chunks(func.lower(CRMContact.email), emails):
+            by_email.setdefault(row.email.lower(), []).append(row)
+
+        by_domain: Dict[str, List[CRMContact]] = {}
+        for row in self._load_in_chunks(CRMContact.email_domain, domains):
+            by_domain.setdefault(row.email_domain, []).append(row)
+
+        by_linkedin: Dict[str, List[CRMContact]] = {}
+        for row in self._load_in_chunks(func.lower(func.rtrim(CRMContact.linkedin_url, '/')), linkedin_urls):
+            by_linkedin.setdefault(row.linkedin_url.lower().rstrip('/'), []).append(row)
+
+        by_phone: Dict[str, List[CRMContact]] = {}
+        for row in self._load_in_chunks(CRMContact.phone_normalized, phones):
+            by_phone.setdefault(row.phone_normalized, []).append(row)
+
+        # Same candidate generation as find_duplicates, batched
+        by_company = self._company_candidates(company_names)
+
+        results = []
+        for contact, email, domain, linkedin_url, phone, company_normalized in prepared:
+            checked_fields = []
+            potential_matches: Dict[int, List[MatchDetails]] = {}
+            contacts_by_id: Dict[int, CRMContact] = {}
+
+            def add(match: CRMContact, detail: MatchDetails) -> None:
+                contacts_by_id[match.id] = match
+                potential_matches.setdefault(match.id, []).append(detail)
+
+            if email:
+                checked_fields.append("email")
+                for match in by_email.get(email, []):
+                    add(match, MatchDetails(
+                        field_name="email",
+                        matched_value=match.email,
+                        confidence=self.EMAIL_EXACT_MATCH_CONFIDENCE,
+                        match_type="exact",
+                        reason=f"Exact email match: {contact.get('email')}"
+                    ))
+
+            if contact.get("email") or contact.get("company_website"):
+                checked_fields.append("domain")
+                for match in by_domain.get(domain, []):
+                    add(match, MatchDetails(
+                        field_name="domain",
+                        matched_value=match.email or "",
+                        confidence=self.DOMAIN_MATCH_CONFIDENCE,
+                        match_type="domain",
+                        reason=f"Same domain: @{domain}"
+                    ))
+
+            if linkedin_url:
+                checked_fields.append("linkedin_url")
+                for match in by_linkedin.get(linkedin_url, []):
+                    add(match, MatchDetails(
+                        field_name="linkedin_url",
+                        matched_value=match.linkedin_url or "",
+                        confidence=self.LINKEDIN_URL_EXACT_MATCH_CONFIDENCE,
+                        match_type="exact",
+                        reason=f"Exact LinkedIn URL match: {contact.get('linkedin_url')}"
+                    ))
+
+            if contact.get("phone"):
+                checked_fields.append("phone")
+                if phone:
+                    for variant in self._phone_variants(phone):
+                        for match in by_phone.get(variant, []):
+                            add(match, MatchDetails(
+                                field_name="phone",
+                                matched_value=match.phone or "",
+                                confidence=self.PHONE_MATCH_CONFIDENCE,
+                                match_type="normalized",
+                                reason=f"Phone number match: {phone}"
+                            ))
+
+            if contact.get("company"):
+                checked_fields.append("company")
+                for match, similarity in self._score_company_candidates(
+                    company_normalized, by_company.get(company_normalized, [])
+                ):
+                    add(match, MatchDetails(
+                        field_name="company",
+                        matched_value=match.company or "",
+                        confidence=self.COMPANY_NAME_BASE_CONFIDENCE + (30.0 * similarity),
+                        match_type="fuzzy",
+                        reason=f"Company name similarity: {similarity:.1%} ('{contact.get('company')}' vs '{match.company}')"
+                    ))
+
+            results.append(self._build_result(potential_matches, contacts_by_id, checked_fields))
+
+        logger.info(
+            f"Bulk deduplication check: {len(contacts)} contacts, "
+            f"{sum(1 for r in results if r.is_duplicate)} duplicates"
+        )
+
+        return results
+
+    def _build_result(
+        self,
+        potential_matches: Dict[int, List[MatchDetails]],
+        contacts_by_id: Dict[int, CRMContact],
+        checked_fields: List[str]
+    ) -> DeduplicationResult:
+        """Aggregate per-field matches into a DeduplicationResult"""
         duplicate_matches = []
         for contact_id, match_details_list in potential_matches.items():
-            # Get contact object
-            contact = self.db.query(CRMContact).filter(CRMContact.id == contact_id).first()
+            contact = contacts_by_id.get(contact_id)
             if not contact:
                 continue
 
@@ -257,11 +445,6 @@ class DeduplicationEngine:
         # Get overall confidence (highest match or 0 if no matches)
         overall_confidence = duplicate_matches[0].confidence if duplicate_matches else 0.0
 
-        logger.info(
-            f"Deduplication check: {len(duplicate_matches)} potential matches found, "
-            f"highest confidence: {overall_confidence:.1f}%, duplicate: {is_duplicate}"
-        )
-
         return DeduplicationResult(
             is_duplicate=is_duplicate,
             confidence=overall_confidence,
@@ -270,6 +453,15 @@ class DeduplicationEngine:
             checked_fields=checked_fields
         )
 
+    def _load_in_chunks(self, column, values: Iterable[str]) -> List[CRMContact]:
+        """Load contacts where column IN values, chunked to bound query size"""
+        values = list(values)
+        rows: List[CRMContact] = []
+        for i in range(0, len(values), self.BULK_QUERY_CHUNK_SIZE):
+            chunk = values[i:i + self.BULK_QUERY_CHUNK_SIZE]
+            rows.extend(self.db.query(CRMContact).filter(column.in_(chunk)).all())
+        return rows
+
     # ========== Field-Specific Matching Methods ==========
 
     async def _match_by_email(self, email: str) -> List[CRMContact]:
@@ -279,10 +471,9 @@ class DeduplicationEngine:
         ).all()
 
     async def _match_by_domain(self, domain: str) -> List[CRMContact]:
-        """Find contacts with same email domain"""
-        pattern = f"%@{domain}"
+        """Find contacts with same email domain (indexed email_domain)"""
         return self.db.query(CRMContact).filter(
-            CRMContact.email.ilike(pattern)
+            CRMContact.email_domain == domain.lower()
         ).all()
 
     async def _match_by_linkedin_url(self, linkedin_url: str) -> List[CRMContact]:
@@ -295,65 +486,111 @@ class DeduplicationEngine:
         ).all()
 
     async def _match_by_phone(self, normalized_phone: str) -> List[CRMContact]:
-        """Find contacts with matching phone number (normalized)"""
-        # Query contacts and filter in Python (phone normalization complex for SQL)
-        all_contacts = self.db.query(CRMContact).filter(
-            CRMContact.phone.isnot(None)
+        """Find contacts with matching phone number (indexed phone_normalized)"""
+        return self.db.query(CRMContact).filter(
+            CRMContact.phone_normalized.in_(self._phone_variants(normalized_phone))
         ).all()
 
-        matches = []
-        for contact in all_contacts:
-            if not contact.phone:
-                continue
-            
-            contact_normalized = self._normalize_phone(contact.phone)
-            
-            # Direct match
-            if contact_normalized == normalized_phone:
-                matches.append(contact)
-                continue
-            
-            # Handle US country code "1": try matching with/without it
-            # Case 1: Contact has leading "1", query doesn't
-            if contact_normalized.startswith('1') and len(contact_normalized) > len(normalized_phone):
-                if contact_normalized[1:] == normalized_phone:
-                    matches.append(contact)
-                    continue
-            
-            # Case 2: Query has leading "1", contact doesn't
-            if normalized_phone.startswith('1') and len(normalized_phone) > len(contact_normalized):
-                if normalized_phone[1:] == contact_normalized:
-                    matches.append(contact)
-                    continue
-
-        return matches
-
     async def _match_by_company_fuzzy(
         self,
         company_name: str,
-        similarity_threshold: float = 0.7
+        similarity_threshold: Optional[float] = None
     ) -> List[tuple[CRMContact, float]]:
         """
         Find contacts with similar company names using fuzzy matching.
 
+        Candidates come from _company_candidates (shared with the bulk path);
+        Levenshtein similarity is only computed for that small candidate set.
+
         Returns:
             List of (contact, similarity_score) tuples
         """
-        # Get all contacts with company names (limit to reasonable set for performance)
-        contacts = self.db.query(CRMContact).filter(
-            CRMContact.company.isnot(None)
-        ).limit(1000).all()  # Limit for performance
+        normalized_input = self._normalize_company_name(company_name)
+        if not normalized_input:
+            return []
+
+        candidates = self._company_candidates([normalized_input])[normalized_input]
+        return self._score_company_candidates(normalized_input, candidates, similarity_threshold)
+
+    def _company_candidates(self, normalized_names: Iterable[str]) -> Dict[str, List[CRMContact]]:
+        """
+        Fuzzy company candidates for each normalized company name.
+
+        PostgreSQL: the best FUZZY_CANDIDATE_LIMIT pg_trgm matches per name from
+        the company_normalized GIN index, one LATERAL query per chunk of names.
+        Elsewhere: contacts sharing the name's company_block_key prefix.
+
+        Returns:
+            {normalized name: candidate contacts}
+        """
+        names = [name for name in dict.fromkeys(normalized_names) if name]
+        candidates: Dict[str, List[CRMContact]] = {name: [] for name in names}
+        if not names:
+            return candidates
+
+        if self.db.get_bind().dialect.name != "postgresql":
+            by_block: Dict[str, List[CRMContact]] = {}
+            rows = self._load_in_chunks(CRMContact.company_block_key, {company_block_key(name) for name in names})
+            for row in sorted(rows, key=lambda row: row.id):
+                by_block.setdefault(row.company_block_key, []).append(row)
+            for name in names:
+                candidates[name] = by_block.get(company_block_key(name), [])[:self.FUZZY_CANDIDATE_LIMIT]
+            return candidates
+
+        candidate_ids: Dict[str, List[int]] = {}
+        for i in range(0, len(names), self.BULK_QUERY_CHUNK_SIZE):
+            inputs = values(column("name", String), name="inputs").data(
+                [(name,) for name in names[i:i + self.BULK_QUERY_CHUNK_SIZE]]
+            )
+            similarity = func.similarity(CRMContact.company_normalized, inputs.c.name)
+            # % is the indexable operator (pg_trgm.similarity_threshold, default 0.3);
+            # the explicit similarity() check pins the threshold to ours
+            matched = (
+                select(CRMContact.id.label("contact_id"))
+                .where(
+                    CRMContact.company_normalized.op("%")(inputs.c.name),
+                    similarity >= self.TRIGRAM_CANDIDATE_THRESHOLD
+                )
+                .order_by(similarity.desc(), CRMContact.id)
+                .limit(self.FUZZY_CANDIDATE_LIMIT)
+                .lateral("matched")
+            )
+            rows = self.db.execute(
+                select(inputs.c.name, matched.c.contact_id).select_from(inputs).join(matched, true())
+            )
+            for name, contact_id in rows:
+                candidate_ids.setdefault(name, []).append(contact_id)
+
+        contacts = {
+            contact.id: contact
+            for contact in self._load_in_chunks(CRMContact.id, {i for ids in candidate_ids.values() for i in ids})
+        }
+        for name, ids in candidate_ids.items():
+            candidates[name] = [contacts[contact_id] for contact_id in ids if contact_id in contacts]
+        return candidates
+
+    def _score_company_candidates(
+        self,
+        normalized_input: str,
+        candidates: List[CRMContact],
+        similarity_threshold: Optional[float] = None
+    ) -> List[tuple[CRMContact, float]]:
+        """Levenshtein-score candidate contacts against a normalized company name"""
+        if similarity_threshold is None:
+            similarity_threshold = self.COMPANY_SIMILARITY_THRESHOLD
 
         matches = []
-        normalized_input = self._normalize_company_name(company_name)
+        for contact in candidates:
+            normalized_contact = contact.company_normalized or self._normalize_company_name(contact.company)
+            if not normalized_contact:
+                continue
 
-        for contact in contacts:
-            if not contact.company:
+            # Length gap alone bounds similarity - skip the O(n*m) distance when it can't pass
+            max_len = max(len(normalized_input), len(normalized_contact))
+            if 1.0 - abs(len(normalized_input) - len(normalized_contact)) / max_len < similarity_threshold:
                 continue
 
-            normalized_contact = self._normalize_company_name(contact.company)
             similarity = self._calculate_levenshtein_similarity(normalized_input, normalized_contact)
-
             if similarity >= similarity_threshold:
                 matches.append((contact, similarity))
 
@@ -382,41 +619,22 @@ class DeduplicationEngine:
 
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number to digits only"""
-        if not phone:
-            return ""
-        # Remove all non-digit characters
-        return re.sub(r'\D', '', phone)
+        return normalize_phone(phone)
+
+    def _phone_variants(self, normalized_phone: str) -> List[str]:
+        """
+        Stored phone values that match a normalized phone.
+
+        Handles the US country code "1" on either side: with and without it.
+        """
+        variants = [normalized_phone, f"1{normalized_phone}"]
+        if normalized_phone.startswith('1') and len(normalized_phone) > 1:
+            variants.append(normalized_phone[1:])
+        return variants
 
     def _normalize_company_name(self, company: str) -> str:
         """Normalize company name for fuzzy matching"""
-        if not company:
-            return ""
-
-        # Convert to lowercase
-        normalized = company.lower()
-
-        # Remove common suffixes using word boundaries
-        suffixes = [
-            'incorporated', 'corporation', 'technologies', 'technology',
-            'solutions', 'enterprises', 'holdings', 'services',
-            'limited', 'company', 'group', 'inc', 'corp', 'llc', 
-            'ltd', 'co', 'tech'
-        ]
-
-        # Build regex pattern with word boundaries
-        # Matches suffix at word boundary, optionally preceded by punctuation/space
-        for suffix in suffixes:
-            # Match: [space/comma/period][suffix][end/punctuation/space]
-            pattern = rf'[\s,.]?\b{re.escape(suffix)}\b[\s,.]?'
-            normalized = re.sub(pattern, ' ', normalized)
-
-        # Remove punctuation except spaces
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-
-        # Remove extra whitespace
-        normalized = ' '.join(normalized.split())
-
-        return normalized.strip()
+        return normalize_company_name(company)
 
     def _calculate_levenshtein_similarity(self, str1: str, str2: str) -> float:
         """
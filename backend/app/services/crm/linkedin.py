@@ -38,6 +38,7 @@ import base64
 from urllib.parse import urlencode
 import logging
 
+from app.core.http_clients import pooled_http_client
 from app.services.crm.base import (
     CRMProvider,
     Contact,
@@ -220,7 +221,7 @@ class LinkedInProvider(CRMProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -278,7 +279,7 @@ class LinkedInProvider(CRMProvider):
 
         try:
             headers = {'Authorization': f'Bearer {self.access_token}'}
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/v2/me",
                     headers=headers
@@ -325,7 +326,7 @@ class LinkedInProvider(CRMProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -382,7 +383,7 @@ class LinkedInProvider(CRMProvider):
         headers = {'Authorization': f'Bearer {self.access_token}'}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/v2/me",
                     headers=headers
@@ -416,7 +417,7 @@ class LinkedInProvider(CRMProvider):
         headers = {'Authorization': f'Bearer {self.access_token}'}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/v2/emailAddress?q=members&projection=(elements*(handle~))",
                     headers=headers
@@ -0,0 +1,422 @@
+"""
+Pipelined Close CRM Sync Engine
+
+Incremental, resumable import of Close leads into crm_contacts:
+- Fetch: a producer task pages through leads (oldest date_updated first),
+  running up to PREFETCH_PAGES ahead of the writer
+- Merge + write: each page is mapped to rows and written with one
+  ``INSERT ... ON CONFLICT (email) DO UPDATE`` (remote non-empty values win,
+  external_ids / enrichment_data are merged), off the event loop
+- Checkpoint: the page's cursor and high watermark are committed in the same
+  transaction as its rows, in the run's CRMSyncLog
+
+A run starts from the previous run's high watermark, so scheduled syncs only
+touch changed leads. A failed or interrupted run leaves its cursor behind and
+the next run resumes from it. Upserts are idempotent, so overlap between
+windows is harmless.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, cast, select, or_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.types import JSON
+
+from app.models.crm import (
+    CRMContact,
+    CRMSyncLog,
+    normalize_phone,
+    normalize_company_name,
+    company_block_key,
+    extract_email_domain,
+)
+from app.services.crm.base import SyncResult, CRMRateLimitError
+from app.services.crm.close import CloseProvider
+from app.services.retry_handler import RetryWithBackoff
+from app.core.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+UPSERT_BATCH_SIZE = 1000  # Rows per INSERT statement (bind parameter limits)
+
+# Columns where a non-empty remote value replaces the local one
+_PREFER_REMOTE_COLUMNS = (
+    "first_name", "last_name", "title", "company", "phone",
+    "phone_normalized", "company_normalized", "company_block_key",
+)
+
+
+@dataclass
+class SyncCheckpoint:
+    """Position of an incremental sync: window start, offset in it, newest row seen"""
+    since: Optional[datetime] = None
+    cursor: Optional[int] = 0
+    high_watermark: Optional[datetime] = None
+
+
+def parse_close_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Close ISO-8601 timestamp -> naive UTC datetime (as stored in the DB)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _contact_values(row: Dict[str, Any], platform: str, now: datetime) -> Dict[str, Any]:
+    """Full crm_contacts row incl. dedup match keys (Core inserts skip @validates)"""
+    normalized_company = normalize_company_name(row.get("company"))
+    return {
+        "email": row["email"],
+        "first_name": row.get("first_name"),
+        "last_name": row.get("last_name"),
+        "title": row.get("title"),
+        "company": row.get("company"),
+        "phone": row.get("phone"),
+        "linkedin_url": row.get("linkedin_url"),
+        "email_domain": extract_email_domain(row["email"]),
+        "phone_normalized": normalize_phone(row.get("phone")) or None,
+        "company_normalized": normalized_company or None,
+        "company_block_key": company_block_key(normalized_company),
+        # Always objects, so the ON CONFLICT JSON merge never sees JSON null
+        "external_ids": row.get("external_ids") or {},
+        "enrichment_data": row.get("enrichment_data") or {},
+        "source_platform": platform,
+        "last_synced_at": now,
+        "sync_status": "active",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def bulk_upsert_contacts(
+    db: Session,
+    rows: Sequence[Dict[str, Any]],
+    platform: str
+) -> Tuple[int, int]:
+    """
+    Merge contact rows into crm_contacts with INSERT ... ON CONFLICT (email).
+
+    Non-empty remote fields overwrite local ones; external_ids and
+    enrichment_data are merged key by key. Does not commit.
+
+    Args:
+        db: Database session (PostgreSQL or SQLite)
+        rows: Mapped rows (see CloseProvider.map_lead_to_rows)
+        platform: Source platform recorded on new contacts
+
+    Returns:
+        Tuple of (created, updated) counts
+    """
+    if not rows:
+        return 0, 0
+
+    # Last occurrence wins when a page repeats an email
+    by_email = {row["email"]: row for row in rows}
+    now = datetime.utcnow()
+    values = [_contact_values(row, platform, now) for row in by_email.values()]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        def merge_json(column, incoming):
+            merged = func.coalesce(cast(column, JSONB), cast("{}", JSONB)).op("||")(cast(incoming, JSONB))
+            return cast(merged, JSON)
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        def merge_json(column, incoming):
+            return func.json_patch(func.coalesce(column, "{}"), func.coalesce(incoming, "{}"))
+    else:
+        raise NotImplementedError(f"Bulk contact upsert not supported on {dialect}")
+
+    table = CRMContact.__table__
+    created = updated = 0
+
+    for start in range(0, len(values), UPSERT_BATCH_SIZE):
+        batch = values[start:start + UPSERT_BATCH_SIZE]
+        emails = [value["email"] for value in batch]
+        existing = set(db.execute(select(table.c.email).where(table.c.email.in_(emails))).scalars())
+
+        stmt = insert(table).values(batch)
+        excluded = stmt.excluded
+        set_ = {
+            column: func.coalesce(func.nullif(excluded[column], ""), table.c[column])
+            for column in _PREFER_REMOTE_COLUMNS
+        }
+        set_.update({
+            "external_ids": merge_json(table.c.external_ids, excluded.external_ids),
+            "enrichment_data": merge_json(table.c.enrichment_data, excluded.enrichment_data),
+            "last_synced_at": excluded.last_synced_at,
+            "updated_at": excluded.updated_at,
+            "sync_status": excluded.sync_status,
+        })
+        db.execute(stmt.on_conflict_do_update(index_elements=[table.c.email], set_=set_))
+
+        updated += len(existing)
+        created += len(batch) - len(existing)
+
+    return created, updated
+
+
+class CloseSyncEngine:
+    """
+    Pipelined incremental Close -> crm_contacts import
+
+    Usage:
+        engine = CloseSyncEngine(db, close_provider, credential_id)
+        result = await engine.run()              # incremental from last watermark
+        result = await engine.run(full=True)     # everything, ignoring checkpoints
+    """
+
+    PLATFORM = "close"
+    PAGE_SIZE = 100  # Close list endpoint maximum
+    PREFETCH_PAGES = 2  # Pages fetched ahead of the writer
+    WINDOW_RESET_SKIP = 5000  # Re-anchor the window at the newest row past this offset
+    WATERMARK_OVERLAP = timedelta(minutes=5)  # Re-read recent edits (clock skew, same-second writes)
+    MAX_RATE_LIMIT_WAITS = 20
+
+    def __init__(
+        self,
+        db: Session,
+        provider: CloseProvider,
+        credential_id: int,
+        retry_handler: Optional[RetryWithBackoff] = None,
+        page_size: int = PAGE_SIZE,
+        prefetch_pages: int = PREFETCH_PAGES
+    ):
+        """
+        Initialize Close sync engine.
+
+        Args:
+            db: Database session for upserts and sync logs
+            provider: Authenticated CloseProvider
+            credential_id: CRMCredential the checkpoints belong to
+            retry_handler: Backoff for failed page fetches
+            page_size: Leads per page
+            prefetch_pages: Pages buffered between fetcher and writer
+        """
+        self.db = db
+        self.provider = provider
+        self.credential_id = credential_id
+        self.retry_handler = retry_handler or RetryWithBackoff(max_retries=3, base_delay=2.0, max_delay=60.0)
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+
+    async def run(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        full: bool = False
+    ) -> SyncResult:
+        """
+        Import changed leads and checkpoint progress page by page.
+
+        Args:
+            filters: Optional Close filters
+                - query: Search query for leads
+                - updated_date_gte: Explicit window start (skips checkpoints)
+            full: Ignore checkpoints and import every lead
+
+        Returns:
+            SyncResult for the run (also recorded in CRMSyncLog)
+        """
+        filters = filters or {}
+        started_at = datetime.utcnow()
+
+        if full:
+            checkpoint = SyncCheckpoint()
+        elif filters.get("updated_date_gte"):
+            since = filters["updated_date_gte"]
+            checkpoint = SyncCheckpoint(since=since if isinstance(since, datetime) else parse_close_datetime(since))
+        else:
+            checkpoint = await asyncio.to_thread(self._load_checkpoint)
+
+        sync_log = CRMSyncLog(
+            credential_id=self.credential_id,
+            platform=self.PLATFORM,
+            operation="import",
+            contacts_processed=0,
+            contacts_created=0,
+            contacts_updated=0,
+            contacts_failed=0,
+            started_at=started_at,
+            status="running",
+            sync_since=checkpoint.since,
+            sync_cursor=str(checkpoint.cursor or 0),
+            high_watermark=checkpoint.high_watermark,
+        )
+        await asyncio.to_thread(self._commit_log, sync_log, True)
+        logger.info(
+            f"Close sync {sync_log.id} starting: since={checkpoint.since}, cursor={checkpoint.cursor}"
+        )
+
+        errors: List[Dict[str, Any]] = []
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch_pages)
+        fetcher = asyncio.create_task(self._fetch_pages(checkpoint, filters.get("query"), queue))
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+
+                leads, page_checkpoint = item
+                await asyncio.to_thread(self._write_page, sync_log, leads, page_checkpoint, errors)
+
+            sync_log.status = "completed" if sync_log.contacts_failed == 0 else "failed"
+            sync_log.sync_cursor = None
+        except Exception as e:
+            logger.error(f"Close sync {sync_log.id} failed at cursor {sync_log.sync_cursor}: {e}")
+            errors.append({"error": str(e), "cursor": sync_log.sync_cursor})
+            sync_log.status = "failed"
+        finally:
+            if not fetcher.done():
+                fetcher.cancel()
+            sync_log.completed_at = datetime.utcnow()
+            sync_log.duration_seconds = (sync_log.completed_at - started_at).total_seconds()
+            sync_log.errors = errors[:100] or None
+            await asyncio.to_thread(self._commit_log, sync_log)
+
+        logger.info(
+            f"Close sync {sync_log.id} {sync_log.status}: {sync_log.contacts_processed} leads, "
+            f"{sync_log.contacts_created} created, {sync_log.contacts_updated} updated "
+            f"in {sync_log.duration_seconds:.1f}s"
+        )
+
+        return SyncResult(
+            platform=self.PLATFORM,
+            operation="import",
+            contacts_processed=sync_log.contacts_processed,
+            contacts_created=sync_log.contacts_created,
+            contacts_updated=sync_log.contacts_updated,
+            contacts_failed=sync_log.contacts_failed + (1 if sync_log.status == "failed" else 0),
+            errors=errors,
+            started_at=started_at,
+            completed_at=sync_log.completed_at,
+            duration_seconds=sync_log.duration_seconds,
+        )
+
+    def _load_checkpoint(self) -> SyncCheckpoint:
+        """Resume an unfinished run, else continue from the last high watermark"""
+        last = self.db.query(CRMSyncLog).filter(
+            CRMSyncLog.credential_id == self.credential_id,
+            CRMSyncLog.platform == self.PLATFORM,
+            or_(CRMSyncLog.sync_cursor.isnot(None), CRMSyncLog.high_watermark.isnot(None))
+        ).order_by(CRMSyncLog.started_at.desc()).first()
+
+        if last is None:
+            return SyncCheckpoint()
+
+        if last.sync_cursor is not None:
+            # Interrupted or failed run - pick up at its last committed page
+            return SyncCheckpoint(
+                since=last.sync_since,
+                cursor=int(last.sync_cursor),
+                high_watermark=last.high_watermark,
+            )
+
+        return SyncCheckpoint(
+            since=last.high_watermark - self.WATERMARK_OVERLAP,
+            high_watermark=last.high_watermark,
+        )
+
+    async def _fetch_pages(
+        self,
+        checkpoint: SyncCheckpoint,
+        query: Optional[str],
+        queue: asyncio.Queue
+    ) -> None:
+        """Producer: page through leads and hand each page to the writer"""
+        since, skip = checkpoint.since, checkpoint.cursor or 0
+
+        try:
+            while True:
+                page = await self.retry_handler.execute(self._fetch_page, skip, since, query)
+                leads = page.get("data", [])
+                has_more = bool(page.get("has_more")) and bool(leads)
+                skip += len(leads)
+
+                # Large windows: restart at the newest date_updated instead of
+                # skipping ever deeper (rows at that timestamp are re-upserted)
+                if has_more and skip >= self.WINDOW_RESET_SKIP:
+                    newest = parse_close_datetime(leads[-1].get("date_updated"))
+                    if newest and (since is None or newest > since):
+                        since, skip = newest, 0
+
+                await queue.put((leads, SyncCheckpoint(since=since, cursor=skip if has_more else None)))
+                if not has_more:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
+            return
+
+        await queue.put(None)
+
+    async def _fetch_page(self, skip: int, since: Optional[datetime], query: Optional[str]) -> Dict[str, Any]:
+        """Fetch one page, waiting out Close rate limits"""
+        for _ in range(self.MAX_RATE_LIMIT_WAITS):
+            try:
+                return await self.provider.fetch_lead_page(
+                    skip=skip, limit=self.page_size, updated_since=since, query=query
+                )
+            except CRMRateLimitError as e:
+                retry_after = e.retry_after or (e.context or {}).get("retry_after", 60)
+                logger.info(f"Close rate limited at skip={skip}, waiting {retry_after}s")
+                await asyncio.sleep(retry_after)
+        raise CRMRateLimitError(f"Close CRM still rate limited after {self.MAX_RATE_LIMIT_WAITS} waits")
+
+    def _write_page(
+        self,
+        sync_log: CRMSyncLog,
+        leads: List[Dict[str, Any]],
+        checkpoint: SyncCheckpoint,
+        errors: List[Dict[str, Any]]
+    ) -> None:
+        """Upsert one page and commit it together with the checkpoint (worker thread)"""
+        rows: List[Dict[str, Any]] = []
+        failed = 0
+        newest = sync_log.high_watermark
+
+        for lead in leads:
+            try:
+                rows.extend(self.provider.map_lead_to_rows(lead))
+            except Exception as e:
+                failed += 1
+                errors.append({"lead_id": lead.get("id"), "error": str(e)})
+                continue
+            updated_at = parse_close_datetime(lead.get("date_updated"))
+            if updated_at and (newest is None or updated_at > newest):
+                newest = updated_at
+
+        try:
+            created, updated = bulk_upsert_contacts(self.db, rows, self.PLATFORM)
+
+            sync_log.contacts_processed += len(leads)
+            sync_log.contacts_created += created
+            sync_log.contacts_updated += updated
+            sync_log.contacts_failed += failed
+            sync_log.sync_since = checkpoint.since
+            sync_log.sync_cursor = None if checkpoint.cursor is None else str(checkpoint.cursor)
+            sync_log.high_watermark = newest
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def _commit_log(self, sync_log: CRMSyncLog, add: bool = False) -> None:
+        if add:
+            self.db.add(sync_log)
+        self.db.commit()
@@ -29,7 +29,8 @@ from app.services.crm import (
     CRMException,
     CRMRateLimitError,
 )
-from app.services.circuit_breaker import CircuitBreaker
+from app.services.crm.sync_engine import CloseSyncEngine
+from app.services.circuit_breaker import CircuitBreaker, create_circuit_breaker
 from app.services.retry_handler import RetryWithBackoff
 from app.models.crm import CRMCredential, CRMContact, CRMSyncLog
 from app.core.logging import setup_logging
@@ -67,7 +68,7 @@ class CRMSyncService:
         """
         self.db = db
         self.redis = redis_client
-        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or create_circuit_breaker("crm_sync")
         self.retry_handler = retry_handler or RetryWithBackoff(
             max_retries=3,
             base_delay=2.0,
@@ -160,6 +161,23 @@ class CRMSyncService:
             # Initialize provider
             provider = self._get_provider(platform, credentials)
 
+            # Close imports run through the pipelined, checkpointed engine
+            # (it records its own CRMSyncLog rows)
+            if platform.lower() == "close" and direction in ("import", "bidirectional"):
+                engine = CloseSyncEngine(
+                    self.db,
+                    provider,
+                    credential_record.id,
+                    retry_handler=self.retry_handler
+                )
+                logger.info(f"Starting pipelined import sync for {platform}")
+                result = await self.circuit_breaker.call(
+                    engine.run, filters, full=bool(filters and filters.get("full"))
+                )
+                if direction == "bidirectional":
+                    await provider.sync_contacts("export", filters)
+                return result
+
             # Wrap sync operation with circuit breaker and retry logic
             async def sync_with_resilience():
                 return await self.retry_handler.execute(
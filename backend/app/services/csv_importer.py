@@ -3,11 +3,18 @@ CSV Lead Import Service
 
 Bulk import leads from CSV files with PostgreSQL COPY command for high performance.
 Target: 1,000 leads in < 5 seconds
+
+Streaming mode (``stream_import_leads``) reads the upload in fixed-size chunks,
+validates rows lazily and feeds a single psycopg3 ``COPY ... FROM STDIN`` session,
+so memory stays bounded regardless of file size (500k+ row dealer exports).
 """
 
+import codecs
 import csv
 import io
-from typing import List, Dict, Any, Tuple, Optional
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator, BinaryIO, Callable
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
@@ -23,6 +30,33 @@ from app.core.exceptions import (
 logger = setup_logging(__name__)
 
 
+@dataclass
+class StreamImportProgress:
+    """Running counters for a streaming CSV import"""
+    rows_read: int = 0
+    rows_valid: int = 0
+    rows_failed: int = 0
+    imported_count: int = 0
+    commits: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter() - self.started_at) * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed_ms = self.elapsed_ms
+        return {
+            "rows_read": self.rows_read,
+            "imported_count": self.imported_count,
+            "failed_count": self.rows_failed,
+            "commits": self.commits,
+            "elapsed_ms": elapsed_ms,
+            "leads_per_second": round(self.imported_count / (elapsed_ms / 1000), 2) if elapsed_ms > 0 else 0
+        }
+
+
 class CSVImportService:
     """
     Service for bulk importing leads from CSV files using PostgreSQL COPY
@@ -36,6 +70,25 @@ class CSVImportService:
 
     BATCH_SIZE = 100  # Changed from 500 to 100 as per Task 23 requirements
     MAX_FILE_SIZE_MB = 10
+
+    # Streaming mode settings
+    STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read from the upload per iteration
+    STREAM_COMMIT_INTERVAL = 50_000  # Rows per COPY/commit in streaming mode
+    STREAM_MAX_FILE_SIZE_MB = 2048
+    MAX_REPORTED_ERRORS = 100  # Error messages kept for the response (all are counted)
+    MAX_ERROR_RATE = 0.1  # Reject import when more than 10% of rows are invalid
+
+    LEAD_COLUMNS = [
+        "company_name",
+        "company_website",
+        "company_size",
+        "industry",
+        "contact_name",
+        "contact_email",
+        "contact_phone",
+        "contact_title",
+        "notes",
+    ]
     REQUIRED_FIELDS = ["company_name"]  # Simplified: only company_name is truly required
     OPTIONAL_FIELDS = [
         "industry",
@@ -70,9 +123,9 @@ class CSVImportService:
             Tuple of (is_valid, error_message)
         """
         # Check required fields
-        for field in self.REQUIRED_FIELDS:
-            if field not in row or not row[field] or not row[field].strip():
-                return False, f"Row {row_num}: Missing required field '{field}'"
+        for required in self.REQUIRED_FIELDS:
+            if required not in row or not row[required] or not row[required].strip():
+                return False, f"Row {row_num}: Missing required field '{required}'"
 
         # Validate company_name length
         if len(row["company_name"]) > 255:
@@ -86,6 +139,30 @@ class CSVImportService:
 
         return True, ""
 
+    def _validate_headers(self, fieldnames: Optional[List[str]]) -> None:
+        """
+        Validate the CSV header row
+
+        Raises:
+            InvalidFileFormatError: If the header is missing or lacks required columns
+        """
+        if not fieldnames:
+            raise InvalidFileFormatError(
+                message="CSV file is empty or has no header row",
+                context={"format": "csv"}
+            )
+
+        missing_required = set(self.REQUIRED_FIELDS) - set(fieldnames)
+        if missing_required:
+            raise InvalidFileFormatError(
+                message=f"CSV missing required columns: {', '.join(missing_required)}",
+                context={"missing_columns": list(missing_required), "found_columns": list(fieldnames)}
+            )
+
+    def _to_lead_data(self, cleaned_row: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a cleaned CSV row onto the lead columns used for import"""
+        return {column: cleaned_row.get(column) for column in self.LEAD_COLUMNS}
+
     def parse_csv_file(self, csv_content: str, strict_mode: bool = False) -> Tuple[List[Dict[str, Any]], List[str]]:
         """
         Parse CSV content into list of lead dictionaries
@@ -105,19 +182,7 @@ class CSVImportService:
             csv_file = io.StringIO(csv_content)
             reader = csv.DictReader(csv_file)
 
-            if not reader.fieldnames:
-                raise InvalidFileFormatError(
-                    message="CSV file is empty or has no header row",
-                    context={"format": "csv"}
-                )
-
-            # Validate CSV headers
-            missing_required = set(self.REQUIRED_FIELDS) - set(reader.fieldnames)
-            if missing_required:
-                raise InvalidFileFormatError(
-                    message=f"CSV missing required columns: {', '.join(missing_required)}",
-                    context={"missing_columns": list(missing_required), "found_columns": list(reader.fieldnames)}
-                )
+            self._validate_headers(reader.fieldnames)
 
             leads = []
             errors = []
@@ -137,20 +202,7 @@ class CSVImportService:
                     errors.append(error_msg)
                     continue
 
-                # Prepare lead data
-                lead_data = {
-                    "company_name": cleaned_row["company_name"],
-                    "company_website": cleaned_row.get("company_website"),
-                    "company_size": cleaned_row.get("company_size"),
-                    "industry": cleaned_row.get("industry"),
-                    "contact_name": cleaned_row.get("contact_name"),
-                    "contact_email": cleaned_row.get("contact_email"),
-                    "contact_phone": cleaned_row.get("contact_phone"),
-                    "contact_title": cleaned_row.get("contact_title"),
-                    "notes": cleaned_row.get("notes"),
-                }
-
-                leads.append(lead_data)
+                leads.append(self._to_lead_data(cleaned_row))
 
             # If too many errors, reject the entire import
             if errors and len(errors) > len(leads) * 0.1:  # More than 10% error rate
@@ -190,6 +242,7 @@ class CSVImportService:
             DatabaseError: If database import operation fails
         """
         import_start = datetime.now()
+        created_at = import_start.isoformat()
         total_leads = len(leads)
         imported_count = 0
 
@@ -214,7 +267,7 @@ class CSVImportService:
                         lead.get("contact_phone"),
                         lead.get("contact_title"),
                         lead.get("notes"),
-                        datetime.now().isoformat(),  # created_at
+                        created_at,
                     ]
                     csv_writer.writerow(row)
 
@@ -286,3 +339,237 @@ class CSVImportService:
                 message=f"Bulk import failed: {str(e)}",
                 context={"error_type": type(e).__name__, "imported_so_far": imported_count, "total": total_leads}
             )
+
+    # ------------------------------------------------------------------
+    # Streaming import (constant memory)
+    # ------------------------------------------------------------------
+
+    def iter_csv_lines(self, stream: BinaryIO, chunk_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Decode a binary upload into CSV lines, reading a fixed-size chunk at a time
+
+        Lines keep their terminators so ``csv.reader`` can reassemble quoted
+        fields that span multiple lines. A UTF-8 BOM is stripped.
+
+        Args:
+            stream: Binary file-like object (e.g. ``UploadFile.file``)
+            chunk_size: Bytes per read (default: STREAM_CHUNK_SIZE)
+
+        Yields:
+            Decoded lines
+
+        Raises:
+            InvalidFileFormatError: If the content is not valid UTF-8
+        """
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                pending += decoder.decode(chunk)
+                lines = pending.split("\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line + "\n"
+            pending += decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise InvalidFileFormatError(
+                message="File must be UTF-8 encoded",
+                context={"format": "csv"}
+            )
+
+        if pending:
+            yield pending
+
+    def iter_valid_leads(
+        self,
+        lines: Iterable[str],
+        progress: StreamImportProgress,
+        strict_mode: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily validate CSV lines and yield lead dictionaries
+
+        Invalid rows are counted on ``progress``; only the first
+        MAX_REPORTED_ERRORS messages are kept so memory stays bounded.
+
+        Args:
+            lines: Iterable of CSV lines including the header row
+            progress: Counters updated as rows are consumed
+            strict_mode: If True, raise on the first invalid row
+
+        Yields:
+            Validated lead dictionaries
+
+        Raises:
+            InvalidFileFormatError: If the header or CSV syntax is invalid
+            LeadValidationError: If a row is invalid in strict mode
+        """
+        try:
+            reader = csv.DictReader(lines)
+            self._validate_headers(reader.fieldnames)
+
+            for idx, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+                progress.rows_read += 1
+                cleaned_row = {k: v.strip() if v else None for k, v in row.items()}
+
+                is_valid, error_msg = self.validate_row(cleaned_row, idx)
+                if not is_valid:
+                    if strict_mode:
+                        raise LeadValidationError(
+                            message=error_msg,
+                            context={"row_number": idx, "row_data": cleaned_row}
+                        )
+                    progress.rows_failed += 1
+                    if len(progress.errors) < self.MAX_REPORTED_ERRORS:
+                        progress.errors.append(error_msg)
+                    continue
+
+                progress.rows_valid += 1
+                yield self._to_lead_data(cleaned_row)
+
+        except csv.Error as e:
+            raise InvalidFileFormatError(
+                message=f"CSV parsing error: {str(e)}",
+                context={"error_type": type(e).__name__, "row_number": progress.rows_read + 1}
+            )
+
+    def _check_error_rate(self, progress: StreamImportProgress) -> None:
+        """Reject the import when invalid rows exceed MAX_ERROR_RATE of valid rows"""
+        if progress.rows_failed and progress.rows_failed > progress.rows_valid * self.MAX_ERROR_RATE:
+            raise LeadValidationError(
+                message=f"Too many validation errors ({progress.rows_failed}). Import rejected.",
+                context={
+                    "error_count": progress.rows_failed,
+                    "valid_count": progress.rows_valid,
+                    "committed_count": progress.imported_count,
+                    "sample_errors": progress.errors[:5]
+                }
+            )
+
+    def stream_import_leads(
+        self,
+        db: Session,
+        stream: BinaryIO,
+        strict_mode: bool = False,
+        commit_interval: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a CSV upload into the leads table through psycopg3 ``COPY``
+
+        The upload is read in chunks, validated row by row and written with
+        ``cursor.copy().write_row()`` on a single raw connection, so memory
+        use does not grow with file size. Every ``commit_interval`` rows the
+        COPY block is closed and committed; the error-rate check runs at each
+        boundary so a mostly-invalid file is rejected before it is committed,
+        and once more after the last block for trailing invalid rows.
+
+        Args:
+            db: SQLAlchemy database session (psycopg3 driver)
+            stream: Binary file-like object positioned at the start of the CSV
+            strict_mode: If True, fail on first validation error
+            commit_interval: Rows per COPY/commit (default: STREAM_COMMIT_INTERVAL)
+            progress_callback: Called with a progress dict after each commit
+
+        Returns:
+            Dictionary with import statistics
+
+        Raises:
+            InvalidFileFormatError: If CSV format or encoding is invalid
+            LeadValidationError: If validation fails in strict mode or too many errors
+            DatabaseConnectionError: If database connection fails
+            DatabaseError: If the COPY operation fails
+        """
+        commit_interval = commit_interval or self.STREAM_COMMIT_INTERVAL
+        progress = StreamImportProgress()
+        created_at = datetime.now()  # One timestamp for the whole import
+        leads = self.iter_valid_leads(self.iter_csv_lines(stream), progress, strict_mode)
+
+        copy_sql = f"COPY leads ({', '.join(self.LEAD_COLUMNS)}, created_at) FROM STDIN"
+
+        try:
+            raw_conn = db.connection().connection
+            cursor = raw_conn.cursor()
+        except AttributeError as e:
+            logger.error(f"Database connection error: {str(e)}", exc_info=True)
+            raise DatabaseConnectionError(
+                message="Failed to access database connection",
+                context={"error": str(e)}
+            )
+
+        try:
+            exhausted = False
+            while not exhausted:
+                rows_in_block = 0
+                with cursor.copy(copy_sql) as copy:
+                    for lead in leads:
+                        copy.write_row([lead[column] for column in self.LEAD_COLUMNS] + [created_at])
+                        rows_in_block += 1
+                        if rows_in_block >= commit_interval:
+                            break
+                    else:
+                        exhausted = True
+
+                if rows_in_block == 0:
+                    continue
+
+                self._check_error_rate(progress)
+                raw_conn.commit()
+                progress.imported_count += rows_in_block
+                progress.commits += 1
+
+                snapshot = progress.as_dict()
+                logger.info(
+                    f"Streamed {snapshot['imported_count']} leads "
+                    f"({snapshot['failed_count']} invalid, {snapshot['leads_per_second']} leads/s)"
+                )
+                if progress_callback:
+                    progress_callback(snapshot)
+
+            # Invalid rows after the last committed block never reach a boundary check
+            self._check_error_rate(progress)
+
+            if progress.imported_count == 0:
+                raise LeadValidationError(
+                    message="No valid leads found in CSV file",
+                    context={"error_count": progress.rows_failed, "sample_errors": progress.errors[:10]}
+                )
+
+        except (InvalidFileFormatError, LeadValidationError, DatabaseConnectionError, DatabaseError):
+            raw_conn.rollback()
+            raise
+        except Exception as e:
+            raw_conn.rollback()
+            logger.error(f"Streaming CSV import failed: {str(e)}", exc_info=True)
+            raise DatabaseError(
+                message=f"Streaming import failed: {str(e)}",
+                context={
+                    "error_type": type(e).__name__,
+                    "imported_so_far": progress.imported_count,
+                    "rows_read": progress.rows_read
+                }
+            )
+        finally:
+            cursor.close()
+
+        duration_ms = progress.elapsed_ms
+        result = {
+            "total_leads": progress.rows_read,
+            "imported_count": progress.imported_count,
+            "failed_count": progress.rows_failed,
+            "commits": progress.commits,
+            "duration_ms": duration_ms,
+            "leads_per_second": round(progress.imported_count / (duration_ms / 1000), 2) if duration_ms > 0 else 0,
+            "errors": progress.errors
+        }
+
+        logger.info(
+            f"Streaming CSV import completed: {result['imported_count']} imported, "
+            f"{result['failed_count']} failed in {duration_ms}ms ({result['leads_per_second']} leads/s)"
+        )
+        return result
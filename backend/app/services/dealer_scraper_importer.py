@@ -10,15 +10,32 @@ Key Features:
 - Preserves ICP scoring and multi-OEM analysis
 - Enhances with AI qualification and enrichment
 - Supports tiered prospect prioritization
+
+Bulk pipeline (import_contractors_csv):
+- CSV read in chunks with explicit dtypes (ZIPs/phones stay strings)
+- Mapping and MEP+E scoring vectorized over each chunk's columns
+- One executemany INSERT (new dealers) and one bulk UPDATE (known dealers)
+  per chunk, keyed on company name + phone digits
+- AI qualification/enrichment of new leads afterwards, bounded concurrency,
+  results written back in bulk
 """
 
 import pandas as pd
+import numpy as np
 import asyncio
-from typing import Dict, Any, List, Optional
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
 from app.core.logging import setup_logging
+from app.models.database import SessionLocal
+from app.models.lead import Lead
 from app.services.leads import LeadService
 from app.services.langgraph.agents.qualification_agent import QualificationAgent
 from app.services.langgraph.agents.enrichment_agent import EnrichmentAgent
@@ -26,6 +43,54 @@ from app.services.scoring.mep_e_scorer import MEPEScorer, calculate_mep_e_score
 
 logger = setup_logging(__name__)
 
+CSV_CHUNK_SIZE = 5000
+DEFAULT_MAX_CONCURRENCY = 10
+
+NON_DIGITS = re.compile(r'\D+')
+
+# Explicit read_csv dtypes (columns absent from a file are ignored)
+TEXT_COLUMNS = [
+    'name', 'phone', 'website', 'email', 'street', 'city', 'state', 'zip', 'domain',
+    'ICP_Tier', 'OEMs_Certified', 'tier', 'oem_source', 'scraped_from_zip', 'collection_date',
+    'linkedin_url', 'address_full', 'certifications', 'adwords_keywords', 'seo_keywords',
+    'meta_custom_audience', 'meta_ads_targeting', 'srec_state_priority',
+]
+NUMERIC_COLUMNS = [
+    'ICP_Score', 'OEM_Count', 'employee_count', 'estimated_revenue', 'rating',
+    'review_count', 'coperniq_score', 'distance_miles',
+]
+FLAG_COLUMNS = [
+    'has_hvac', 'has_solar', 'has_inverters', 'has_generator', 'has_battery', 'has_plumbing',
+    'has_electrical', 'has_roofing', 'has_ops_maintenance', 'has_heat_pump', 'has_ev_charger',
+    'has_smart_panel', 'has_microgrid', 'is_mep_r_contractor', 'is_resimercial', 'is_commercial',
+    'is_residential', 'is_self_performing', 'is_gc', 'is_sub',
+]
+CSV_DTYPES = {
+    **{column: 'string' for column in TEXT_COLUMNS},
+    **{column: 'float64' for column in NUMERIC_COLUMNS},
+    **{column: 'boolean' for column in FLAG_COLUMNS},
+}
+
+# MEP+E score_batch() outputs stored on Lead
+MEP_E_LEAD_COLUMNS = [
+    'mep_e_score', 'total_oem_count', 'hvac_oem_count', 'solar_oem_count', 'battery_oem_count',
+    'generator_oem_count', 'smart_panel_oem_count', 'iot_oem_count', 'has_hvac', 'has_solar',
+    'has_battery', 'has_generator', 'has_ev_charger', 'has_smart_panel', 'has_heat_pump',
+    'has_microgrid', 'has_commercial', 'has_ops_maintenance', 'renewable_readiness_score',
+    'asset_centric_score', 'projects_service_score',
+]
+
+# Dealer fields promoted to Lead columns; every other mapped field goes to additional_data
+PROMOTED_FIELDS = {'name', 'phone', 'website', 'email'}
+
+INDUSTRY_CAPABILITIES = [
+    ('has_hvac', 'HVAC'),
+    ('has_solar', 'Solar'),
+    ('has_generator', 'Generator'),
+    ('has_electrical', 'Electrical'),
+    ('has_plumbing', 'Plumbing'),
+]
+
 
 class DealerScraperImporter:
     """
@@ -106,67 +171,99 @@ class DealerScraperImporter:
         file_path: str,
         batch_size: int = 50,
         qualification_enabled: bool = True,
-        enrichment_enabled: bool = True
+        enrichment_enabled: bool = True,
+        db: Optional[Session] = None,
+        chunk_size: int = CSV_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
     ) -> Dict[str, Any]:
         """
         Import contractors from dealer scraper CSV file.
-        
+
+        Each CSV chunk is mapped and scored as a whole and upserted with one
+        INSERT and one UPDATE statement. New leads are then qualified and
+        enriched concurrently; dealers already in the database keep their
+        qualification score and enrichment data.
+
         Args:
             file_path: Path to the CSV file
-            batch_size: Number of records to process per batch
+            batch_size: Leads per qualification/enrichment write-back
             qualification_enabled: Whether to run AI qualification
             enrichment_enabled: Whether to run AI enrichment
-            
+            db: Database session (a new SessionLocal session if omitted)
+            chunk_size: CSV rows read, mapped and written per round trip
+            max_concurrency: Max concurrent qualification/enrichment calls
+
         Returns:
             Import summary with statistics
         """
+        owns_session = db is None
+        db = db or SessionLocal()
+        started = time.perf_counter()
+
         try:
             logger.info(f"Starting dealer scraper import: {file_path}")
-            
-            # Load CSV data
-            df = pd.read_csv(file_path)
-            total_records = len(df)
-            
-            logger.info(f"Loaded {total_records} contractor records")
-            
-            # Process in batches
+
+            total_records = 0
             processed = 0
-            qualified = 0
-            enriched = 0
+            inserted = 0
+            updated = 0
             errors = 0
-            
-            for i in range(0, total_records, batch_size):
-                batch_df = df.iloc[i:i + batch_size]
-                batch_results = await self._process_batch(
-                    batch_df,
-                    qualification_enabled,
-                    enrichment_enabled
+            new_leads: List[Dict[str, Any]] = []
+
+            for chunk_number, chunk in enumerate(self._read_csv_chunks(file_path, chunk_size), start=1):
+                total_records += len(chunk)
+                leads = self._map_contractors_to_leads(chunk)
+                errors += len(chunk) - len(leads)
+
+                try:
+                    chunk_new, chunk_updated = self._upsert_leads(db, leads)
+                    db.commit()
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    logger.error(f"Failed to write dealer chunk {chunk_number}: {e}")
+                    errors += len(leads)
+                    continue
+
+                new_leads.extend(chunk_new)
+                processed += len(leads)
+                inserted += len(chunk_new)
+                updated += chunk_updated
+                logger.info(
+                    f"Imported chunk {chunk_number}: {len(leads)} leads "
+                    f"({len(chunk_new)} new, {chunk_updated} updated)"
                 )
-                
-                processed += batch_results['processed']
-                qualified += batch_results['qualified']
-                enriched += batch_results['enriched']
-                errors += batch_results['errors']
-                
-                logger.info(f"Processed batch {i//batch_size + 1}: {batch_results['processed']} records")
-            
+
+            import_seconds = time.perf_counter() - started
+
+            qualified, enriched = await self._qualify_and_enrich(
+                db,
+                new_leads,
+                qualification_enabled,
+                enrichment_enabled,
+                batch_size,
+                max_concurrency
+            )
+
             # Generate summary
             summary = {
                 'total_records': total_records,
                 'processed': processed,
+                'inserted': inserted,
+                'updated': updated,
                 'qualified': qualified,
                 'enriched': enriched,
                 'errors': errors,
                 'success_rate': (processed - errors) / total_records * 100 if total_records > 0 else 0,
                 'qualification_rate': qualified / processed * 100 if processed > 0 else 0,
                 'enrichment_rate': enriched / processed * 100 if processed > 0 else 0,
+                'records_per_second': round(total_records / import_seconds, 1) if import_seconds > 0 else 0,
                 'import_timestamp': datetime.now().isoformat(),
                 'source_file': file_path
             }
-            
+
             logger.info(f"Dealer scraper import completed: {summary}")
             return summary
-            
+
         except Exception as e:
             logger.error(f"Dealer scraper import failed: {e}")
             return {
@@ -177,74 +274,266 @@ class DealerScraperImporter:
                 'enriched': 0,
                 'errors': 1
             }
-    
-    async def _process_batch(
+        finally:
+            if owns_session:
+                db.close()
+
+    def _read_csv_chunks(self, file_path: str, chunk_size: int):
+        """Yield DataFrames of chunk_size rows with CSV_DTYPES applied"""
+        header = pd.read_csv(file_path, nrows=0).columns
+        dtypes = {column: dtype for column, dtype in CSV_DTYPES.items() if column in header}
+        yield from pd.read_csv(file_path, dtype=dtypes, chunksize=chunk_size)
+
+    def _map_contractors_to_leads(self, contractors: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Map a chunk of dealer scraper rows to Lead column dicts (vectorized _map_contractor_to_lead).
+
+        Rows without a company name are dropped.
+        """
+        contractors = contractors.reset_index(drop=True)
+        n = len(contractors)
+
+        def column(name: str, default: Any = np.nan) -> pd.Series:
+            if name in contractors:
+                return contractors[name]
+            return pd.Series([default] * n, index=contractors.index)
+
+        def flag(name: str) -> pd.Series:
+            return column(name, False).fillna(False).astype(bool)
+
+        oem_scoring = self.parse_oem_frame(contractors)
+        icp_score = column('ICP_Score').fillna(0).astype(float)
+
+        # Derived fields
+        capability_codes = sum(flag(field).astype(int) * (1 << bit) for bit, (field, _) in enumerate(INDUSTRY_CAPABILITIES))
+        industry = capability_codes.map({code: self._industry_for_code(code) for code in range(1 << len(INDUSTRY_CAPABILITIES))})
+
+        employees = column('employee_count').fillna(0).astype(float)
+        company_size = np.select(
+            [employees <= 0, employees <= 10, employees <= 50, employees <= 200],
+            ['Unknown', 'Small (1-10)', 'Medium (11-50)', 'Large (51-200)'],
+            'Enterprise (200+)'
+        )
+
+        oem_count = column('OEM_Count').fillna(0).astype(float)
+        rating = column('rating').fillna(0).astype(float)
+        priority_score = (
+            icp_score
+            + np.where(oem_count > 1, 10 * oem_count, 0)
+            + 5 * flag('has_ops_maintenance') + 5 * flag('is_mep_r_contractor') + 5 * flag('is_resimercial')
+            + np.select([rating >= 4.5, rating >= 4.0], [10, 5], 0)
+        ).clip(upper=100)
+
+        frame = pd.DataFrame({
+            'company_name': column('name').astype('string').str.strip(),
+            'company_website': column('website').astype('string').fillna(column('domain').astype('string')),
+            'company_size': company_size,
+            'industry': industry,
+            'contact_email': column('email').astype('string'),
+            'contact_phone': column('phone').astype('string'),
+            # Higher of the dealer ICP score and the MEP+E score
+            'qualification_score': np.maximum(icp_score, oem_scoring['mep_e_score']).clip(0, 100),
+            **{name: oem_scoring[name] for name in MEP_E_LEAD_COLUMNS},
+            'oems_certified': oem_scoring['oems_certified'],
+            'oem_tiers': oem_scoring['oem_tiers'],
+        })
+
+        # Remaining dealer fields (and derived ones) go to additional_data
+        extra = pd.DataFrame({
+            lead_field: contractors[dealer_field]
+            for dealer_field, lead_field in self.field_mapping.items()
+            if dealer_field in contractors and dealer_field not in PROMOTED_FIELDS
+        }, index=contractors.index)
+        if 'address_full' in contractors:
+            extra['address'] = contractors['address_full'].fillna(column('street'))
+        extra['icp_score'] = icp_score
+        extra['icp_tier'] = oem_scoring['tier']  # MEP+E tier overrides ICP_Tier
+        extra['priority_score'] = priority_score
+        extra['qualified'] = oem_scoring['tier'].isin(['PLATINUM', 'GOLD'])
+        extra['lead_source'] = 'dealer_scraper'
+        extra['import_timestamp'] = datetime.now().isoformat()
+
+        leads = self._frame_records(frame)
+        for lead, extra_record in zip(leads, self._frame_records(extra)):
+            lead['additional_data'] = {key: value for key, value in extra_record.items() if value is not None}
+        return [lead for lead in leads if lead['company_name']]
+
+    @staticmethod
+    def _frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Row dicts with native Python values and None for missing (faster than to_dict('records'))"""
+        columns = [
+            frame[name].astype(object).where(frame[name].notna(), None).tolist()
+            for name in frame.columns
+        ]
+        names = list(frame.columns)
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    @staticmethod
+    def _industry_for_code(code: int) -> str:
+        capabilities = [label for bit, (_, label) in enumerate(INDUSTRY_CAPABILITIES) if code >> bit & 1]
+        if not capabilities:
+            return 'General Contractor'
+        elif len(capabilities) > 2:
+            return 'Multi-Trade Contractor'
+        return ', '.join(capabilities)
+
+    @staticmethod
+    def _dedup_key(company_name: Optional[str], phone: Optional[str]) -> Tuple[str, str]:
+        """Dealer identity: case-folded name plus phone digits"""
+        return (company_name or '').strip().lower(), NON_DIGITS.sub('', phone or '')
+
+    def _upsert_leads(self, db: Session, leads: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Insert new dealers and update known ones, one statement each.
+
+        Known dealers keep qualification_score and their additional_data
+        keys (e.g. enrichment) that the import does not set.
+
+        Returns:
+            (inserted lead dicts with 'id', number of updated leads)
+        """
+        # Last row wins for dealers repeated within the chunk
+        by_key = {self._dedup_key(lead['company_name'], lead['contact_phone']): lead for lead in leads}
+
+        existing = self._find_leads(db, {lead['company_name'] for lead in by_key.values()})
+
+        new_leads, updates = [], []
+        for key, lead in by_key.items():
+            row = existing.get(key)
+            if row is None:
+                new_leads.append(lead)
+                continue
+            values = {name: value for name, value in lead.items() if name != 'qualification_score'}
+            values['id'] = row.id
+            values['additional_data'] = {**(row.additional_data or {}), **lead['additional_data']}
+            updates.append(values)
+
+        if new_leads:
+            # Plain executemany (RETURNING forces row-at-a-time inserts on some drivers), then one id lookup
+            db.execute(insert(Lead), new_leads)
+            inserted = self._find_leads(db, {lead['company_name'] for lead in new_leads}, with_data=False, exact=True)
+            for lead in new_leads:
+                lead['id'] = inserted[self._dedup_key(lead['company_name'], lead['contact_phone'])].id
+        if updates:
+            db.execute(update(Lead), updates)
+
+        return new_leads, len(updates)
+
+    def _find_leads(
+        self, db: Session, company_names, with_data: bool = True, exact: bool = False
+    ) -> Dict[Tuple[str, str], Any]:
+        """
+        Existing leads with any of the given names, by _dedup_key().
+
+        Names are compared trimmed and case-folded like _dedup_key() (using
+        idx_leads_company_name_key), or as stored when exact is set.
+        """
+        if not company_names:
+            return {}
+        columns = [Lead.id, Lead.company_name, Lead.contact_phone]
+        if with_data:
+            columns.append(Lead.additional_data)
+        if exact:
+            condition = Lead.company_name.in_(list(company_names))
+        else:
+            names = {self._dedup_key(name, None)[0] for name in company_names}
+            condition = func.lower(func.trim(Lead.company_name)).in_(list(names))
+        rows = db.execute(select(*columns).where(condition)).all()
+        return {self._dedup_key(row.company_name, row.contact_phone): row for row in rows}
+
+    async def _qualify_and_enrich(
         self,
-        batch_df: pd.DataFrame,
+        db: Session,
+        leads: List[Dict[str, Any]],
         qualification_enabled: bool,
-        enrichment_enabled: bool
-    ) -> Dict[str, int]:
-        """Process a batch of contractor records."""
-        processed = 0
+        enrichment_enabled: bool,
+        batch_size: int,
+        max_concurrency: int
+    ) -> Tuple[int, int]:
+        """
+        Qualify/enrich imported leads concurrently, writing results back per batch.
+
+        Failures are logged and skipped. Returns (qualified, enriched) counts.
+        """
+        if not leads or not (qualification_enabled or enrichment_enabled):
+            return 0, 0
+
+        semaphore = asyncio.Semaphore(max_concurrency)
         qualified = 0
         enriched = 0
-        errors = 0
-        
-        for _, row in batch_df.iterrows():
-            try:
-                # Map contractor data to lead format
-                lead_data = self._map_contractor_to_lead(row)
-                
-                # Create lead record
-                lead = await self.lead_service.create_lead(lead_data)
-                processed += 1
-                
-                # Run AI qualification if enabled
-                if qualification_enabled:
-                    try:
-                        qualification_result = await self.qualification_agent.qualify_lead(lead_data)
-                        if qualification_result.get('qualified', False):
-                            qualified += 1
-                            # Update lead with qualification results
-                            await self.lead_service.update_lead(
-                                lead.id,
-                                {
-                                    'qualification_score': qualification_result.get('score', 0),
-                                    'qualification_reasoning': qualification_result.get('reasoning', ''),
-                                    'qualified': True
-                                }
-                            )
-                    except Exception as e:
-                        logger.warning(f"Qualification failed for {lead_data.get('company_name')}: {e}")
-                
-                # Run AI enrichment if enabled
-                if enrichment_enabled:
-                    try:
-                        enrichment_result = await self.enrichment_agent.enrich_lead(lead_data)
-                        if enrichment_result.get('enriched', False):
-                            enriched += 1
-                            # Update lead with enrichment results
-                            await self.lead_service.update_lead(
-                                lead.id,
-                                {
-                                    'enrichment_data': enrichment_result.get('data', {}),
-                                    'enriched': True
-                                }
-                            )
-                    except Exception as e:
-                        logger.warning(f"Enrichment failed for {lead_data.get('company_name')}: {e}")
-                
-            except Exception as e:
-                logger.error(f"Failed to process contractor {row.get('name', 'Unknown')}: {e}")
-                errors += 1
-        
-        return {
-            'processed': processed,
-            'qualified': qualified,
-            'enriched': enriched,
-            'errors': errors
-        }
-    
+
+        for i in range(0, len(leads), batch_size):
+            batch = leads[i:i + batch_size]
+            outcomes = await asyncio.gather(*(
+                self._process_lead(lead, qualification_enabled, enrichment_enabled, semaphore)
+                for lead in batch
+            ))
+
+            rows = []
+            for lead, (qualification, enrichment) in zip(batch, outcomes):
+                values = {}
+                if qualification is not None:
+                    result, latency_ms = qualification
+                    values.update({
+                        'qualification_score': result.qualification_score,
+                        'qualification_reasoning': result.qualification_reasoning,
+                        'qualification_model': self.qualification_agent.model,
+                        'qualification_latency_ms': latency_ms,
+                        'qualified_at': datetime.utcnow(),
+                    })
+                    qualified += result.tier in ('hot', 'warm')
+                if enrichment is not None and enrichment.enriched_data:
+                    lead['additional_data'] = {**lead['additional_data'], 'enrichment': enrichment.enriched_data}
+                    values['additional_data'] = lead['additional_data']
+                    enriched += 1
+                if values:
+                    rows.append({'id': lead['id'], **values})
+
+            if rows:
+                try:
+                    db.execute(update(Lead), rows)
+                    db.commit()
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    logger.error(f"Failed to write qualification/enrichment for {len(rows)} leads: {e}")
+
+        return qualified, enriched
+
+    async def _process_lead(
+        self,
+        lead: Dict[str, Any],
+        qualification_enabled: bool,
+        enrichment_enabled: bool,
+        semaphore: asyncio.Semaphore
+    ):
+        """Run qualification and enrichment for one lead; failures return None"""
+        qualification = enrichment = None
+        async with semaphore:
+            if qualification_enabled:
+                try:
+                    result, latency_ms, _ = await self.qualification_agent.qualify(
+                        company_name=lead['company_name'],
+                        lead_id=lead['id'],
+                        company_website=lead['company_website'],
+                        company_size=lead['company_size'],
+                        industry=lead['industry'],
+                        notes=f"MEP+E score {lead['mep_e_score']}/100, OEMs: {', '.join(lead['oems_certified'])}"
+                    )
+                    qualification = (result, latency_ms)
+                except Exception as e:
+                    logger.warning(f"Qualification failed for {lead['company_name']}: {e}")
+
+            if enrichment_enabled and lead['company_website']:
+                try:
+                    enrichment = await self.enrichment_agent.enrich_from_company(
+                        company_name=lead['company_name'],
+                        website=lead['company_website']
+                    )
+                except Exception as e:
+                    logger.warning(f"Enrichment failed for {lead['company_name']}: {e}")
+
+        return qualification, enrichment
+
     def _map_contractor_to_lead(self, contractor_row: pd.Series) -> Dict[str, Any]:
         """Map contractor data from dealer scraper to sales-agent lead format."""
         lead_data = {}
@@ -482,6 +771,56 @@ class DealerScraperImporter:
 
         return oem_scoring_result
 
+    def parse_oem_frame(self, contractors: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized parse_oem_data() over a chunk of dealer-scraper rows.
+
+        Args:
+            contractors: DataFrame with dealer-scraper CSV columns
+
+        Returns:
+            DataFrame on the input index with the MEPEScorer.score_batch()
+            columns plus oems_certified and oem_tiers
+        """
+        n = len(contractors)
+
+        def flag(name: str) -> pd.Series:
+            if name not in contractors:
+                return pd.Series(False, index=contractors.index)
+            return contractors[name].fillna(False).astype(bool)
+
+        if 'OEMs_Certified' in contractors:
+            oems_certified = [
+                [oem.strip() for oem in oems.split(',') if oem.strip()] if isinstance(oems, str) else []
+                for oems in contractors['OEMs_Certified'].astype(object)
+            ]
+        else:
+            oems_certified = [[] for _ in range(n)]
+
+        scoring = self.mep_e_scorer.score_batch(pd.DataFrame({
+            'oems_certified': oems_certified,
+            'has_heat_pump': flag('has_heat_pump'),
+            'has_ev_charger': flag('has_ev_charger'),
+            'has_smart_panel': flag('has_smart_panel'),
+            'has_microgrid': flag('has_microgrid'),
+            'has_commercial': flag('is_commercial') | flag('is_resimercial'),
+            'has_ops_maintenance': flag('has_ops_maintenance'),
+        }, index=contractors.index))
+
+        # {oem_source: tier} when the row carries a single-OEM tier
+        oem_tiers = [{} for _ in range(n)]
+        if 'tier' in contractors and 'oem_source' in contractors:
+            tiers = contractors['tier'].astype(object).to_numpy()
+            sources = contractors['oem_source'].astype(object).to_numpy()
+            has_tier = contractors['tier'].notna() & contractors['oem_source'].fillna('').astype(bool)
+            for position in np.flatnonzero(has_tier.to_numpy()):
+                if oems_certified[position]:
+                    oem_tiers[position] = {sources[position]: tiers[position]}
+
+        scoring['oems_certified'] = oems_certified
+        scoring['oem_tiers'] = oem_tiers
+        return scoring
+
     def _integrate_oem_scoring(self, lead_data: Dict[str, Any], oem_scoring: Dict[str, Any]) -> Dict[str, Any]:
         """
         Integrate OEM scoring results into lead data.
@@ -29,12 +29,20 @@ Usage:
 
 from .base import BaseDeepAgent
 from .memory import LongTermMemory
-from .subagents import SubagentCoordinator
-from .master_agent import MasterDeepAgent
 
 __all__ = [
     "BaseDeepAgent",
-    "LongTermMemory", 
-    "SubagentCoordinator",
-    "MasterDeepAgent"
+    "LongTermMemory",
 ]
+
+# Subagent coordination (subagents.py) is not in this tree yet and the master
+# agent depends on it; importing a submodule such as .memory runs this file,
+# so only that missing module is tolerated
+try:
+    from .subagents import SubagentCoordinator
+    from .master_agent import MasterDeepAgent
+except ModuleNotFoundError as e:
+    if e.name != f"{__name__}.subagents":
+        raise
+else:
+    __all__ += ["SubagentCoordinator", "MasterDeepAgent"]
@@ -7,12 +7,20 @@ Provides persistent memory across agent sessions using Redis for:
 - Pattern recognition
 - Knowledge accumulation
 
+Entries and patterns are indexed so no operation scans the keyspace:
+- Sorted sets rank entries/patterns by importance and access recency (eviction)
+- An inverted token index maps words to pattern keys (relevance lookup)
+- Reads and writes are batched through pipelines
+
 Based on LangChain Deep Agents memory framework.
 """
 
 import json
+import re
 import time
-from typing import Dict, Any, List, Optional, Union
+import uuid
+from collections import Counter
+from typing import Dict, Any, List, Optional, Union, Iterable, Iterator, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
@@ -24,6 +32,14 @@ from app.core.config import settings
 
 logger = setup_logging(__name__)
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words too common to narrow a pattern lookup
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "to", "was", "with",
+})
+
 
 @dataclass
 class MemoryEntry:
@@ -51,12 +67,20 @@ class LongTermMemory:
     - Context-aware retrieval
     """
     
+    # An importance of 1.0 outranks an untouched entry for this long
+    IMPORTANCE_HORIZON_SECONDS = 7 * 24 * 3600
+    RELEVANCE_THRESHOLD = 0.3
+    MAX_QUERY_TOKENS = 32
+    MAX_POSTINGS_PER_TOKEN = 1000  # Newest patterns kept per token
+    FETCH_BATCH_SIZE = 500
+    
     def __init__(
         self,
         agent_id: str,
         ttl_days: int = 30,
         max_entries: int = 1000,
-        redis_url: Optional[str] = None
+        redis_url: Optional[str] = None,
+        max_patterns: int = 10000
     ):
         """
         Initialize Long-term Memory system.
@@ -66,10 +90,12 @@ class LongTermMemory:
             ttl_days: Time-to-live for memory entries in days
             max_entries: Maximum number of entries to store
             redis_url: Redis connection URL (defaults to settings)
+            max_patterns: Maximum number of learned patterns to store
         """
         self.agent_id = agent_id
         self.ttl_days = ttl_days
         self.max_entries = max_entries
+        self.max_patterns = max_patterns
         self.redis_url = redis_url or settings.REDIS_URL
         
         # Redis connection
@@ -81,8 +107,17 @@ class LongTermMemory:
         self.patterns_key = f"deep_agent_patterns:{agent_id}"
         self.learning_key = f"deep_agent_learning:{agent_id}"
         
+        # Index keys (outside the entry/pattern prefixes)
+        self.memory_index_key = f"deep_agent_memory_index:{agent_id}"
+        self.pattern_index_key = f"deep_agent_pattern_index:{agent_id}"
+        self.pattern_tokens_key = f"deep_agent_pattern_tokens:{agent_id}"
+        
         logger.info(f"LongTermMemory initialized: agent_id={agent_id}, ttl_days={ttl_days}")
     
+    @property
+    def ttl_seconds(self) -> int:
+        return self.ttl_days * 24 * 3600
+    
     async def _get_redis_client(self) -> redis.Redis:
         """Get Redis client connection."""
         if not self.redis_client:
@@ -102,7 +137,7 @@ class LongTermMemory:
             session_id: Session identifier
             context_data: Context data to save
             entry_type: Type of memory entry
-            
+        
         Returns:
             True if saved successfully
         """
@@ -122,30 +157,33 @@ class LongTermMemory:
             # Calculate importance score
             entry.importance_score = self._calculate_importance_score(context_data)
             
-            # Store in Redis with TTL
+            # Store entry, session index and retention rank in one round trip
             entry_key = f"{self.memory_key}:{entry.key}"
-            await redis_client.hset(
+            session_index_key = f"{self.context_key}:{session_id}"
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(
                 entry_key,
                 mapping={
                     "data": json.dumps(asdict(entry), default=str),
                     "timestamp": entry.timestamp.isoformat()
                 }
             )
-            
-            # Set TTL
-            await redis_client.expire(entry_key, self.ttl_days * 24 * 3600)
-            
-            # Add to session index
-            session_index_key = f"{self.context_key}:{session_id}"
-            await redis_client.sadd(session_index_key, entry.key)
-            await redis_client.expire(session_index_key, self.ttl_days * 24 * 3600)
+            pipe.expire(entry_key, self.ttl_seconds)
+            pipe.sadd(session_index_key, entry.key)
+            pipe.expire(session_index_key, self.ttl_seconds)
+            pipe.zadd(
+                self.memory_index_key,
+                {entry.key: self._retention_score(entry.importance_score, time.time())}
+            )
+            pipe.expire(self.memory_index_key, self.ttl_seconds)
+            await pipe.execute()
             
             # Cleanup old entries if needed
             await self._cleanup_old_entries()
             
             logger.debug(f"Context saved: session={session_id}, type={entry_type}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to save context: {e}", exc_info=True)
             return False
@@ -156,7 +194,7 @@ class LongTermMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Loaded context data
         """
@@ -165,27 +203,36 @@ class LongTermMemory:
             
             # Get session entries
             session_index_key = f"{self.context_key}:{session_id}"
-            entry_keys = await redis_client.smembers(session_index_key)
+            entry_keys = list(await redis_client.smembers(session_index_key))
             
             if not entry_keys:
                 return {}
             
-            # Load entries
-            context_data = {}
+            # Load entries in one pipelined batch
+            pipe = redis_client.pipeline(transaction=False)
             for entry_key in entry_keys:
-                full_key = f"{self.memory_key}:{entry_key}"
-                entry_data = await redis_client.hget(full_key, "data")
-                
+                pipe.hget(f"{self.memory_key}:{entry_key}", "data")
+            entries_data = await pipe.execute()
+            
+            context_data = {}
+            accessed = {}
+            expired = []
+            for entry_key, entry_data in zip(entry_keys, entries_data):
                 if entry_data:
                     entry = json.loads(entry_data)
                     context_data[entry_key] = entry["content"]
-                    
-                    # Update access tracking
-                    await self._update_access_tracking(entry_key)
+                    accessed[entry_key] = entry.get("importance_score", 0.5)
+                else:
+                    expired.append(entry_key)
+            
+            # Update access tracking
+            await self._update_access_tracking(accessed)
+            if expired:
+                await self._drop_entries(expired)
             
             logger.debug(f"Context loaded: session={session_id}, entries={len(context_data)}")
             return context_data
-            
+        
         except Exception as e:
             logger.error(f"Failed to load context: {e}", exc_info=True)
             return {}
@@ -201,41 +248,90 @@ class LongTermMemory:
         Args:
             pattern_data: Pattern data to learn
             pattern_type: Type of pattern
-            
+        
         Returns:
             True if pattern learned successfully
         """
+        return await self.learn_patterns([(pattern_data, pattern_type)]) == 1
+    
+    async def learn_patterns(
+        self,
+        patterns: Iterable[Tuple[Dict[str, Any], str]]
+    ) -> int:
+        """
+        Learn a batch of patterns in one pipelined round trip.
+        
+        Args:
+            patterns: (pattern_data, pattern_type) pairs
+        
+        Returns:
+            Number of patterns stored
+        """
         try:
             redis_client = await self._get_redis_client()
             
-            # Create pattern entry
-            pattern_key = f"{pattern_type}:{int(time.time())}"
-            pattern_entry = {
-                "pattern_data": pattern_data,
+            pipe = redis_client.pipeline(transaction=False)
+            learned = 0
+            for pattern_data, pattern_type in patterns:
+                self._queue_pattern(pipe, pattern_data, pattern_type)
+                learned += 1
+            if not learned:
+                return 0
+            pipe.expire(self.pattern_index_key, self.ttl_seconds)
+            pipe.zcard(self.pattern_index_key)
+            results = await pipe.execute()
+            
+            pattern_count = results[-1]
+            if pattern_count > self.max_patterns:
+                await self._evict_patterns(pattern_count - self.max_patterns)
+            
+            logger.debug(f"Patterns learned: count={learned}")
+            return learned
+        
+        except Exception as e:
+            logger.error(f"Failed to learn pattern: {e}", exc_info=True)
+            return 0
+    
+    def _queue_pattern(self, pipe, pattern_data: Dict[str, Any], pattern_type: str) -> str:
+        """Queue a pattern hash plus its rank and token postings on a pipeline."""
+        now = time.time()
+        pattern_key = f"{pattern_type}:{int(now)}:{uuid.uuid4().hex[:8]}"
+        confidence = float(pattern_data.get("confidence", 0.5))
+        tokens = self._pattern_tokens(pattern_data)
+        
+        full_key = f"{self.patterns_key}:{pattern_key}"
+        pipe.hset(
+            full_key,
+            mapping={
+                "pattern_data": json.dumps(pattern_data, default=str),
                 "pattern_type": pattern_type,
                 "timestamp": datetime.now().isoformat(),
                 "agent_id": self.agent_id,
-                "confidence": pattern_data.get("confidence", 0.5)
+                "confidence": confidence,
+                "tokens": " ".join(sorted(tokens))
             }
-            
-            # Store pattern
-            await redis_client.hset(
-                f"{self.patterns_key}:{pattern_key}",
-                mapping=pattern_entry
-            )
-            
-            # Set TTL
-            await redis_client.expire(
-                f"{self.patterns_key}:{pattern_key}",
-                self.ttl_days * 24 * 3600
-            )
-            
-            logger.debug(f"Pattern learned: type={pattern_type}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to learn pattern: {e}", exc_info=True)
-            return False
+        )
+        pipe.expire(full_key, self.ttl_seconds)
+        self._queue_pattern_postings(pipe, pattern_key, tokens, confidence, now)
+        
+        return pattern_key
+    
+    def _queue_pattern_postings(
+        self,
+        pipe,
+        pattern_key: str,
+        tokens: Iterable[str],
+        confidence: float,
+        learned_at: float
+    ) -> None:
+        """Queue a pattern's retention rank and token postings on a pipeline."""
+        pipe.zadd(self.pattern_index_key, {pattern_key: self._retention_score(confidence, learned_at)})
+        
+        for token in tokens:
+            token_key = f"{self.pattern_tokens_key}:{token}"
+            pipe.zadd(token_key, {pattern_key: learned_at})
+            pipe.zremrangebyrank(token_key, 0, -(self.MAX_POSTINGS_PER_TOKEN + 1))
+            pipe.expire(token_key, self.ttl_seconds)
     
     async def get_relevant_patterns(
         self,
@@ -246,37 +342,64 @@ class LongTermMemory:
         """
         Get patterns relevant to a query.
         
+        Candidates come from the token index, so only patterns sharing a
+        word with the query are read.
+        
         Args:
             query: Query to find relevant patterns
             pattern_type: Filter by pattern type
             limit: Maximum number of patterns to return
-            
+        
         Returns:
-            List of relevant patterns
+            List of relevant patterns, most relevant first
         """
         try:
             redis_client = await self._get_redis_client()
             
-            # Get all pattern keys
-            pattern_keys = await redis_client.keys(f"{self.patterns_key}:*")
-            
-            patterns = []
-            for key in pattern_keys:
-                pattern_data = await redis_client.hgetall(key)
-                if pattern_data:
-                    patterns.append(pattern_data)
-            
-            # Simple relevance scoring (in production, use vector similarity)
-            scored_patterns = []
-            for pattern in patterns:
-                score = self._calculate_relevance_score(query, pattern)
-                if score > 0.3:  # Threshold for relevance
-                    scored_patterns.append((score, pattern))
-            
-            # Sort by relevance and return top results
-            scored_patterns.sort(key=lambda x: x[0], reverse=True)
-            return [pattern for score, pattern in scored_patterns[:limit]]
-            
+            query_tokens = sorted(self._tokenize(query))[:self.MAX_QUERY_TOKENS]
+            if not query_tokens:
+                return []
+            
+            # Postings for every query token in one round trip
+            pipe = redis_client.pipeline(transaction=False)
+            for token in query_tokens:
+                pipe.zrange(f"{self.pattern_tokens_key}:{token}", 0, -1)
+            postings = await pipe.execute()
+            
+            # Relevance = share of query tokens the pattern contains
+            matches = Counter()
+            for pattern_keys in postings:
+                matches.update(pattern_keys)
+            
+            prefix = f"{pattern_type}:" if pattern_type else None
+            candidates = []
+            for pattern_key, count in matches.items():
+                score = count / len(query_tokens)
+                if score > self.RELEVANCE_THRESHOLD and (prefix is None or pattern_key.startswith(prefix)):
+                    candidates.append((score, pattern_key))
+            candidates.sort(reverse=True)
+            
+            # Fetch the best candidates until enough live patterns are found
+            results = []
+            expired = []
+            for start in range(0, len(candidates), self.FETCH_BATCH_SIZE):
+                batch = candidates[start:start + self.FETCH_BATCH_SIZE]
+                pipe = redis_client.pipeline(transaction=False)
+                for _, pattern_key in batch:
+                    pipe.hgetall(f"{self.patterns_key}:{pattern_key}")
+                for (score, pattern_key), pattern in zip(batch, await pipe.execute()):
+                    if not pattern:
+                        expired.append(pattern_key)
+                        continue
+                    results.append(self._decode_pattern(pattern_key, pattern, score))
+                    if len(results) >= limit:
+                        break
+                if len(results) >= limit:
+                    break
+            
+            await self._touch_patterns(results, expired, query_tokens)
+            return results
+        
         except Exception as e:
             logger.error(f"Failed to get relevant patterns: {e}", exc_info=True)
             return []
@@ -287,24 +410,22 @@ class LongTermMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             Memory summary
         """
         try:
             redis_client = await self._get_redis_client()
             
-            # Get session entries count
-            session_index_key = f"{self.context_key}:{session_id}"
-            entry_count = await redis_client.scard(session_index_key)
-            
-            # Get patterns count
-            pattern_keys = await redis_client.keys(f"{self.patterns_key}:*")
-            pattern_count = len(pattern_keys)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.scard(f"{self.context_key}:{session_id}")
+            pipe.zcard(self.pattern_index_key)
+            entry_count, pattern_count = await pipe.execute()
             
-            # Get learning entries count
-            learning_keys = await redis_client.keys(f"{self.learning_key}:*")
-            learning_count = len(learning_keys)
+            # Learning entries have no index; SCAN doesn't block Redis like KEYS
+            learning_count = 0
+            async for _ in redis_client.scan_iter(match=f"{self.learning_key}:*", count=1000):
+                learning_count += 1
             
             return {
                 "session_id": session_id,
@@ -314,7 +435,7 @@ class LongTermMemory:
                 "learning_entries": learning_count,
                 "memory_health": "healthy" if entry_count > 0 else "empty"
             }
-            
+        
         except Exception as e:
             logger.error(f"Failed to get memory summary: {e}", exc_info=True)
             return {"error": str(e)}
@@ -325,7 +446,7 @@ class LongTermMemory:
         
         Args:
             session_id: Session identifier
-            
+        
         Returns:
             True if cleared successfully
         """
@@ -334,23 +455,111 @@ class LongTermMemory:
             
             # Get session entries
             session_index_key = f"{self.context_key}:{session_id}"
-            entry_keys = await redis_client.smembers(session_index_key)
+            entry_keys = list(await redis_client.smembers(session_index_key))
             
-            # Delete entries
+            # Delete entries, their ranks and the session index together
+            pipe = redis_client.pipeline(transaction=False)
             for entry_key in entry_keys:
-                full_key = f"{self.memory_key}:{entry_key}"
-                await redis_client.delete(full_key)
-            
-            # Delete session index
-            await redis_client.delete(session_index_key)
+                pipe.delete(f"{self.memory_key}:{entry_key}")
+            if entry_keys:
+                pipe.zrem(self.memory_index_key, *entry_keys)
+            pipe.delete(session_index_key)
+            await pipe.execute()
             
             logger.info(f"Session cleared: {session_id}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to clear session: {e}", exc_info=True)
             return False
     
+    async def rebuild_memory_index(self) -> int:
+        """
+        Index memory entries and patterns written before the indexes existed.
+        
+        Walks both keyspaces with SCAN (non-blocking). Entries are ranked by
+        their stored importance and timestamp; patterns without token
+        postings get their rank and postings. Safe to run repeatedly.
+        
+        Returns:
+            Number of entries and patterns indexed
+        """
+        indexed = await self._scan_and_index(f"{self.memory_key}:", self._index_entries)
+        patterns = await self._scan_and_index(f"{self.patterns_key}:", self._index_patterns)
+        
+        await self._cleanup_old_entries()
+        if patterns:
+            redis_client = await self._get_redis_client()
+            pattern_count = await redis_client.zcard(self.pattern_index_key)
+            if pattern_count > self.max_patterns:
+                await self._evict_patterns(pattern_count - self.max_patterns)
+        logger.info(
+            f"Memory index rebuilt: agent_id={self.agent_id}, entries={indexed}, patterns={patterns}"
+        )
+        return indexed + patterns
+    
+    async def _scan_and_index(self, prefix: str, index_batch) -> int:
+        redis_client = await self._get_redis_client()
+        indexed = 0
+        
+        batch = []
+        async for full_key in redis_client.scan_iter(match=f"{prefix}*", count=1000):
+            batch.append(full_key)
+            if len(batch) >= self.FETCH_BATCH_SIZE:
+                indexed += await index_batch(batch, prefix)
+                batch = []
+        if batch:
+            indexed += await index_batch(batch, prefix)
+        return indexed
+    
+    async def _index_entries(self, full_keys: List[str], prefix: str) -> int:
+        redis_client = await self._get_redis_client()
+        pipe = redis_client.pipeline(transaction=False)
+        for full_key in full_keys:
+            pipe.hmget(full_key, "data", "last_accessed")
+        
+        ranks = {}
+        for full_key, (entry_data, last_accessed) in zip(full_keys, await pipe.execute()):
+            if not entry_data:
+                continue
+            entry = json.loads(entry_data)
+            accessed_at = datetime.fromisoformat(last_accessed or entry["timestamp"]).timestamp()
+            ranks[full_key[len(prefix):]] = self._retention_score(
+                entry.get("importance_score", 0.5), accessed_at
+            )
+        
+        if ranks:
+            await redis_client.zadd(self.memory_index_key, ranks)
+            await redis_client.expire(self.memory_index_key, self.ttl_seconds)
+        return len(ranks)
+    
+    async def _index_patterns(self, full_keys: List[str], prefix: str) -> int:
+        redis_client = await self._get_redis_client()
+        pipe = redis_client.pipeline(transaction=False)
+        for full_key in full_keys:
+            pipe.hmget(full_key, "pattern_data", "confidence", "timestamp", "tokens")
+        
+        fields = await pipe.execute()
+        
+        indexed = 0
+        pipe = redis_client.pipeline(transaction=False)
+        for full_key, (pattern_data, confidence, timestamp, tokens) in zip(full_keys, fields):
+            # Patterns stored with a token list are already indexed
+            if pattern_data is None or tokens is not None:
+                continue
+            tokens = self._pattern_tokens(pattern_data)
+            learned_at = datetime.fromisoformat(timestamp).timestamp() if timestamp else time.time()
+            pipe.hset(full_key, "tokens", " ".join(sorted(tokens)))
+            self._queue_pattern_postings(
+                pipe, full_key[len(prefix):], tokens, float(confidence or 0.5), learned_at
+            )
+            indexed += 1
+        
+        if indexed:
+            pipe.expire(self.pattern_index_key, self.ttl_seconds)
+            await pipe.execute()
+        return indexed
+    
     def _calculate_importance_score(self, context_data: Dict[str, Any]) -> float:
         """Calculate importance score for context data."""
         score = 0.5  # Base score
@@ -367,69 +576,169 @@ class LongTermMemory:
     
     def _calculate_relevance_score(self, query: str, pattern: Dict[str, Any]) -> float:
         """Calculate relevance score for pattern matching."""
-        # Simple keyword matching (in production, use vector similarity)
-        query_lower = query.lower()
-        pattern_text = str(pattern.get("pattern_data", "")).lower()
-        
-        # Count matching words
-        query_words = set(query_lower.split())
-        pattern_words = set(pattern_text.split())
+        # Same measure the token index computes: share of query words matched
+        query_words = self._tokenize(query)
+        pattern_words = self._pattern_tokens(pattern.get("pattern_data"))
         matches = len(query_words.intersection(pattern_words))
         
         return matches / max(len(query_words), 1)
     
-    async def _update_access_tracking(self, entry_key: str) -> None:
-        """Update access tracking for memory entries."""
+    def _pattern_tokens(self, pattern_data: Union[Dict[str, Any], str, None]) -> set:
+        """Index words of a pattern: its data values, not keys or pattern type."""
+        if isinstance(pattern_data, str):
+            try:
+                pattern_data = json.loads(pattern_data)
+            except ValueError:
+                return self._tokenize(pattern_data)
+        return self._tokenize(" ".join(self._pattern_values(pattern_data)))
+    
+    @classmethod
+    def _pattern_values(cls, value: Any) -> Iterator[str]:
+        if isinstance(value, dict):
+            for item in value.values():
+                yield from cls._pattern_values(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield from cls._pattern_values(item)
+        elif value is not None:
+            yield str(value)
+    
+    @staticmethod
+    def _tokenize(text: str) -> set:
+        """Lowercase words used for the pattern token index."""
+        return {
+            token for token in _TOKEN_RE.findall(text.lower())
+            if len(token) > 1 and token not in _STOPWORDS
+        }
+    
+    def _retention_score(self, importance: float, accessed_at: float) -> float:
+        """Eviction rank: recent access plus an importance bonus (lowest goes first)."""
+        return accessed_at + importance * self.IMPORTANCE_HORIZON_SECONDS
+    
+    @staticmethod
+    def _decode_pattern(pattern_key: str, pattern: Dict[str, str], score: float) -> Dict[str, Any]:
+        decoded = {k: v for k, v in pattern.items() if k != "tokens"}
+        decoded["pattern_key"] = pattern_key
+        decoded["pattern_data"] = json.loads(pattern.get("pattern_data") or "{}")
+        decoded["confidence"] = float(pattern.get("confidence", 0.5))
+        decoded["relevance_score"] = score
+        return decoded
+    
+    async def _update_access_tracking(self, entries: Dict[str, float]) -> None:
+        """
+        Update access tracking for memory entries.
+        
+        Args:
+            entries: Entry key -> importance score of each accessed entry
+        """
+        if not entries:
+            return
+        try:
+            redis_client = await self._get_redis_client()
+            now = time.time()
+            last_accessed = datetime.now().isoformat()
+            
+            pipe = redis_client.pipeline(transaction=False)
+            for entry_key, importance in entries.items():
+                full_key = f"{self.memory_key}:{entry_key}"
+                pipe.hincrby(full_key, "access_count", 1)
+                pipe.hset(full_key, "last_accessed", last_accessed)
+            # xx: don't resurrect entries evicted in the meantime
+            pipe.zadd(
+                self.memory_index_key,
+                {key: self._retention_score(importance, now) for key, importance in entries.items()},
+                xx=True
+            )
+            await pipe.execute()
+        
+        except Exception as e:
+            logger.warning(f"Failed to update access tracking: {e}")
+    
+    async def _touch_patterns(
+        self,
+        patterns: List[Dict[str, Any]],
+        expired: List[str],
+        query_tokens: List[str]
+    ) -> None:
+        """Refresh returned patterns' recency and unindex expired ones."""
+        if not patterns and not expired:
+            return
+        try:
+            redis_client = await self._get_redis_client()
+            now = time.time()
+            
+            pipe = redis_client.pipeline(transaction=False)
+            if patterns:
+                pipe.zadd(
+                    self.pattern_index_key,
+                    {p["pattern_key"]: self._retention_score(p["confidence"], now) for p in patterns},
+                    xx=True
+                )
+            if expired:
+                # TTL removed the hash, so only the query's own postings are known
+                pipe.zrem(self.pattern_index_key, *expired)
+                for token in query_tokens:
+                    pipe.zrem(f"{self.pattern_tokens_key}:{token}", *expired)
+            await pipe.execute()
+        
+        except Exception as e:
+            logger.warning(f"Failed to update pattern access tracking: {e}")
+    
+    async def _evict_patterns(self, count: int) -> None:
+        """Delete the lowest-ranked patterns and their token postings."""
         try:
             redis_client = await self._get_redis_client()
-            full_key = f"{self.memory_key}:{entry_key}"
+            victims = await redis_client.zrange(self.pattern_index_key, 0, count - 1)
+            if not victims:
+                return
             
-            # Increment access count
-            await redis_client.hincrby(full_key, "access_count", 1)
+            pipe = redis_client.pipeline(transaction=False)
+            for pattern_key in victims:
+                pipe.hget(f"{self.patterns_key}:{pattern_key}", "tokens")
+            victim_tokens = await pipe.execute()
             
-            # Update last accessed
-            await redis_client.hset(full_key, "last_accessed", datetime.now().isoformat())
+            pipe = redis_client.pipeline(transaction=False)
+            for pattern_key, tokens in zip(victims, victim_tokens):
+                pipe.delete(f"{self.patterns_key}:{pattern_key}")
+                for token in (tokens or "").split():
+                    pipe.zrem(f"{self.pattern_tokens_key}:{token}", pattern_key)
+            pipe.zrem(self.pattern_index_key, *victims)
+            await pipe.execute()
             
+            logger.info(f"Pattern cleanup: deleted {len(victims)}")
+        
         except Exception as e:
-            logger.warning(f"Failed to update access tracking: {e}")
+            logger.error(f"Failed to evict patterns: {e}", exc_info=True)
+    
+    async def _drop_entries(self, entry_keys: List[str]) -> None:
+        """Delete memory entries with their session index and rank."""
+        redis_client = await self._get_redis_client()
+        pipe = redis_client.pipeline(transaction=False)
+        for entry_key in entry_keys:
+            session_id = entry_key.rsplit(":", 1)[0]
+            pipe.delete(f"{self.memory_key}:{entry_key}")
+            pipe.srem(f"{self.context_key}:{session_id}", entry_key)
+        pipe.zrem(self.memory_index_key, *entry_keys)
+        await pipe.execute()
     
     async def _cleanup_old_entries(self) -> None:
         """Clean up old entries to maintain memory limits."""
         try:
             redis_client = await self._get_redis_client()
             
-            # Get all memory entries
-            memory_keys = await redis_client.keys(f"{self.memory_key}:*")
-            
-            if len(memory_keys) <= self.max_entries:
+            entry_count = await redis_client.zcard(self.memory_index_key)
+            if entry_count <= self.max_entries:
                 return
             
-            # Get entries with metadata
-            entries_with_metadata = []
-            for key in memory_keys:
-                entry_data = await redis_client.hget(key, "data")
-                if entry_data:
-                    entry = json.loads(entry_data)
-                    entries_with_metadata.append((key, entry))
-            
-            # Sort by importance and access count
-            entries_with_metadata.sort(
-                key=lambda x: (
-                    x[1].get("importance_score", 0.5),
-                    x[1].get("access_count", 0)
-                ),
-                reverse=True
+            # Lowest rank = least important and least recently used
+            entries_to_delete = await redis_client.zrange(
+                self.memory_index_key, 0, entry_count - self.max_entries - 1
             )
+            if entries_to_delete:
+                await self._drop_entries(entries_to_delete)
             
-            # Keep top entries, delete the rest
-            entries_to_keep = entries_with_metadata[:self.max_entries]
-            entries_to_delete = entries_with_metadata[self.max_entries:]
-            
-            for key, _ in entries_to_delete:
-                await redis_client.delete(key)
-            
-            logger.info(f"Memory cleanup: kept {len(entries_to_keep)}, deleted {len(entries_to_delete)}")
-            
+            logger.info(f"Memory cleanup: kept {self.max_entries}, deleted {len(entries_to_delete)}")
+        
         except Exception as e:
             logger.error(f"Failed to cleanup old entries: {e}", exc_info=True)
     
@@ -450,7 +759,7 @@ class LongTermMemory:
                 "memory_usage_bytes": memory_info,
                 "agent_id": self.agent_id
             }
-            
+        
         except Exception as e:
             return {
                 "status": "unhealthy",
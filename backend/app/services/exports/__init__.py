@@ -8,11 +8,17 @@ Provides export functionality for analytics reports in multiple formats:
 """
 
 from .pdf_exporter import PDFExporter, export_to_pdf
-from .excel_exporter import ExcelExporter, export_to_excel
+from .excel_exporter import ExcelExporter, StreamingExcelExporter, export_to_excel
+from .streaming import EXPORT_FORMATS, iter_csv, iter_export, write_export
 
 __all__ = [
     'PDFExporter',
     'export_to_pdf',
     'ExcelExporter',
+    'StreamingExcelExporter',
     'export_to_excel',
+    'EXPORT_FORMATS',
+    'iter_csv',
+    'iter_export',
+    'write_export',
 ]
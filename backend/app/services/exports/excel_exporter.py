@@ -5,15 +5,17 @@ Professional Excel generation using openpyxl with multi-sheet support,
 formatting, formulas, and charts.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, BinaryIO
 from datetime import datetime
 from io import BytesIO
+from itertools import chain
 import logging
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from openpyxl.chart import BarChart, PieChart, LineChart, Reference
 
 
@@ -168,8 +170,8 @@ class ExcelExporter:
             adjusted_width = min(max_length + 2, 50)  # Max width of 50
             ws.column_dimensions[column_letter].width = adjusted_width
 
-    def _format_as_table(self, ws, num_rows: int, num_cols: int) -> None:
-        """Format range as Excel table with filters"""
+    def _format_as_table(self, ws, num_rows: int, num_cols: int, headers: Optional[List[str]] = None) -> None:
+        """Format range as Excel table with filters (headers: column names, if not readable from ws)"""
         # Define table range
         end_column = get_column_letter(num_cols)
         table_range = f"A1:{end_column}{num_rows + 1}"
@@ -187,6 +189,9 @@ class ExcelExporter:
         )
         table.tableStyleInfo = style
 
+        if headers:
+            table.tableColumns = [TableColumn(id=i, name=header) for i, header in enumerate(headers, start=1)]
+
         ws.add_table(table)
 
     def add_chart_sheet(
@@ -304,6 +309,160 @@ class ExcelExporter:
         return buffer
 
 
+class StreamingExcelExporter(ExcelExporter):
+    """
+    Constant-memory Excel exporter using openpyxl write-only mode.
+
+    ExcelExporter keeps a cell object for every value until export();
+    here rows are serialized to a temporary file as they are appended, so
+    a sheet can hold any number of rows. Write-only sheets are written top
+    to bottom, so column widths are estimated from the first batch and the
+    summary sheet is created after the data (but placed first).
+    """
+
+    def __init__(self, title: str):
+        """
+        Initialize streaming Excel exporter.
+
+        Args:
+            title: Workbook title (used as filename base)
+        """
+        self.title = title
+        self.workbook = Workbook(write_only=True)
+
+    def add_data_sheet(
+        self,
+        sheet_name: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        columns: List[str],
+        add_table: bool = True,
+        add_summary_row: bool = False,
+        freeze_header: bool = True
+    ) -> int:
+        """
+        Add a data sheet from an iterable of row batches.
+
+        Args:
+            sheet_name: Name of the sheet
+            batches: Iterable of row batches (lists of dictionaries)
+            columns: List of column names to include
+            add_table: Whether to format as Excel table
+            add_summary_row: Whether to add sum/count summary row
+            freeze_header: Whether to freeze the header row
+
+        Returns:
+            Number of data rows written
+        """
+        batches = iter(batches)
+        first_batch = next(batches, [])
+        if not first_batch:
+            logger.warning(f"No data provided for sheet: {sheet_name}")
+            return 0
+
+        ws = self.workbook.create_sheet(title=sheet_name)
+
+        # Column widths and frozen panes precede the rows in the sheet XML
+        headers = [self._format_column_name(col) for col in columns]
+        for col_num, (col_name, header) in enumerate(zip(columns, headers), start=1):
+            max_length = max(
+                [len(header)] + [len(str(row.get(col_name))) for row in first_batch if row.get(col_name) is not None]
+            )
+            ws.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, 50)
+        if freeze_header:
+            ws.freeze_panes = 'A2'
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = PatternFill(start_color="3B82F6", end_color="3B82F6", fill_type="solid")
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        row_count = 0
+        for batch in chain([first_batch], batches):
+            for row_data in batch:
+                ws.append([self._value_cell(ws, row_data.get(col_name)) for col_name in columns])
+            row_count += len(batch)
+
+        if add_summary_row:
+            ws.append(self._summary_cells(ws, row_count + 2, columns, first_batch[0]))
+
+        if add_table:
+            # Write-only sheets can't read the header cells back
+            self._format_as_table(ws, row_count, len(columns), headers=headers)
+
+        return row_count
+
+    def _value_cell(self, ws, value: Any) -> Any:
+        """Cell value, wrapped in a WriteOnlyCell only when it needs a number format"""
+        if isinstance(value, datetime):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.number_format = 'yyyy-mm-dd hh:mm'
+            return cell
+        if isinstance(value, float):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.number_format = '#,##0.00'
+            return cell
+        if isinstance(value, int):
+            return value
+        return str(value) if value is not None else ''
+
+    def _summary_cells(self, ws, row_num: int, columns: List[str], sample_row: Dict[str, Any]) -> List[Any]:
+        """Summary row cells with SUM formulas for numeric columns"""
+        fill = PatternFill(start_color="E5E7EB", end_color="E5E7EB", fill_type="solid")
+        cells = []
+        for col_num, col_name in enumerate(columns, start=1):
+            sample_value = sample_row.get(col_name)
+            if col_num == 1:
+                cell = WriteOnlyCell(ws, value="TOTAL")
+            elif isinstance(sample_value, (int, float)):
+                col_letter = get_column_letter(col_num)
+                cell = WriteOnlyCell(ws, value=f"=SUM({col_letter}2:{col_letter}{row_num - 1})")
+                if isinstance(sample_value, float):
+                    cell.number_format = '#,##0.00'
+            else:
+                cells.append(None)
+                continue
+            cell.font = Font(bold=True)
+            cell.fill = fill
+            cells.append(cell)
+        return cells
+
+    def add_summary_sheet(
+        self,
+        metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Add a summary/cover sheet with metadata, placed before other sheets.
+
+        Args:
+            metadata: Dictionary with report metadata
+        """
+        ws = self.workbook.create_sheet(title="Summary", index=0)
+        ws.column_dimensions['A'].width = 20
+        ws.column_dimensions['B'].width = 40
+
+        title = WriteOnlyCell(ws, value=self.title)
+        title.font = Font(size=20, bold=True, color="1F2937")
+        ws.append([title])
+        ws.append([])
+
+        for key, value in metadata.items():
+            label = WriteOnlyCell(ws, value=f"{key}:")
+            label.font = Font(bold=True)
+            ws.append([label, str(value)])
+
+    def export(self, out: BinaryIO) -> None:
+        """
+        Write the workbook to a binary file object.
+
+        A write-only workbook can only be saved once.
+        """
+        self.workbook.save(out)
+
+
 # Convenience function for simple exports
 def export_to_excel(
     data: List[Dict[str, Any]],
@@ -5,7 +5,7 @@ Professional PDF generation using ReportLab with tables, charts, and branding.
 Supports landscape/portrait orientation, custom headers/footers, and multi-page tables.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, BinaryIO
 from datetime import datetime
 from io import BytesIO
 import logging
@@ -24,6 +24,7 @@ from reportlab.platypus import (
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.pdfgen.canvas import Canvas
 
 
 logger = logging.getLogger(__name__)
@@ -169,34 +170,7 @@ class PDFExporter:
         if table_data:
             # Create table
             table = Table(table_data, repeatRows=1)
-
-            # Apply table styling
-            table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-
-                # Data rows
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#1f2937')),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-
-                # Grid
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-
-                # Padding
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ]))
+            table.setStyle(self._data_table_style())
 
             story.append(table)
         else:
@@ -217,6 +191,143 @@ class PDFExporter:
         buffer.seek(0)
         return buffer
 
+    def _data_table_style(self) -> TableStyle:
+        """Table style for data exports (header row plus striped rows)"""
+        return TableStyle([
+            # Header row
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+            # Data rows
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#1f2937')),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+
+            # Grid
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
+
+            # Padding
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+        ])
+
+    def export_data_table_stream(
+        self,
+        batches: Iterable[List[Dict[str, Any]]],
+        columns: List[str],
+        out: BinaryIO,
+        subtitle: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> int:
+        """
+        Export row batches as a PDF table, rendering one page at a time.
+
+        export_data_table() lays out a single Table holding every row, which
+        needs memory (and layout time) proportional to the whole report.
+        Here each page gets its own Table of at most one page of rows, drawn
+        straight onto the canvas, so only the current page's rows are held;
+        finished pages are kept as compact content streams until the file is
+        written. Columns share the page width equally so pages line up.
+
+        Args:
+            batches: Iterable of row batches (lists of dictionaries)
+            columns: List of column names to include
+            out: Binary file object the PDF is written to
+            subtitle: Optional subtitle text
+            metadata: Optional metadata (author, subject)
+
+        Returns:
+            Number of rows written
+        """
+        margin = 72
+        page_width, page_height = self.page_size
+        frame_width = page_width - 2 * margin
+        col_widths = [frame_width / len(columns)] * len(columns)
+
+        canvas = Canvas(out, pagesize=self.page_size, pageCompression=1)
+        canvas.setTitle(self.title)
+        canvas.setAuthor(metadata.get('author', 'Sales Agent System') if metadata else 'Sales Agent System')
+        canvas.setSubject(metadata.get('subject', 'Analytics Report') if metadata else 'Analytics Report')
+
+        # Title block on the first page
+        top = page_height - margin
+        heading = [(self.title, 'CustomTitle')]
+        if subtitle:
+            heading.append((subtitle, 'CustomSubtitle'))
+        heading.append((f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", 'CustomSubtitle'))
+        for text, style_name in heading:
+            style = self.styles[style_name]
+            paragraph = Paragraph(text, style)
+            _, height = paragraph.wrap(frame_width, top - margin)
+            paragraph.drawOn(canvas, margin, top - height)
+            top -= height + style.spaceAfter
+        top -= 0.3 * inch
+
+        # Cells are single-line strings, so every data row has the same height
+        headers = [self._format_column_name(col) for col in columns]
+        header_height = self._page_table([headers], col_widths).wrap(frame_width, page_height)[1]
+        row_height = self._page_table([headers, headers], col_widths).wrap(frame_width, page_height)[1] - header_height
+
+        def capacity(page_top: float) -> int:
+            return max(1, int((page_top - margin - header_height) // row_height))
+
+        def draw_rows(rows: List[List[str]], page_top: float) -> float:
+            table = self._page_table([headers] + rows, col_widths)
+            _, height = table.wrap(frame_width, page_top - margin)
+            table.drawOn(canvas, margin, page_top - height)
+            return page_top - height
+
+        def new_page() -> float:
+            self._add_page_number(canvas, None)
+            canvas.showPage()
+            return page_height - margin
+
+        row_count = 0
+        page_rows: List[List[str]] = []
+        for batch in batches:
+            for row in batch:
+                page_rows.append([self._format_cell(row.get(col, '')) for col in columns])
+                if len(page_rows) >= capacity(top):
+                    draw_rows(page_rows, top)
+                    row_count += len(page_rows)
+                    page_rows = []
+                    top = new_page()
+
+        if page_rows:
+            top = draw_rows(page_rows, top)
+            row_count += len(page_rows)
+        elif row_count == 0:
+            paragraph = Paragraph("No data available", self.styles['Normal'])
+            _, height = paragraph.wrap(frame_width, top - margin)
+            paragraph.drawOn(canvas, margin, top - height)
+            top -= height
+
+        # Summary line, on a new page if this one is full
+        summary = Paragraph(f"Total Records: {row_count}", self.styles['SectionHeader'])
+        _, height = summary.wrap(frame_width, page_height)
+        top -= 0.5 * inch
+        if top - height < margin:
+            top = new_page()
+        summary.drawOn(canvas, margin, top - height)
+
+        self._add_page_number(canvas, None)
+        canvas.save()
+        return row_count
+
+    def _page_table(self, rows: List[List[str]], col_widths: List[float]) -> Table:
+        table = Table(rows, colWidths=col_widths, repeatRows=1)
+        table.setStyle(self._data_table_style())
+        return table
+
     def _prepare_table_data(
         self,
         data: List[Dict[str, Any]],
@@ -241,33 +352,31 @@ class PDFExporter:
 
         # Data rows
         for row in data:
-            formatted_row = []
-            for col in columns:
-                value = row.get(col, '')
-
-                # Format value based on type
-                if isinstance(value, (int, float)):
-                    if isinstance(value, float):
-                        formatted_value = f"{value:.2f}"
-                    else:
-                        formatted_value = str(value)
-                elif isinstance(value, datetime):
-                    formatted_value = value.strftime('%Y-%m-%d %H:%M')
-                elif value is None:
-                    formatted_value = 'N/A'
-                else:
-                    formatted_value = str(value)
-
-                # Truncate long strings
-                if len(formatted_value) > 100:
-                    formatted_value = formatted_value[:97] + '...'
-
-                formatted_row.append(formatted_value)
-
-            table_data.append(formatted_row)
+            table_data.append([self._format_cell(row.get(col, '')) for col in columns])
 
         return table_data
 
+    def _format_cell(self, value: Any) -> str:
+        """Format a value as table cell text"""
+        # Format value based on type
+        if isinstance(value, (int, float)):
+            if isinstance(value, float):
+                formatted_value = f"{value:.2f}"
+            else:
+                formatted_value = str(value)
+        elif isinstance(value, datetime):
+            formatted_value = value.strftime('%Y-%m-%d %H:%M')
+        elif value is None:
+            formatted_value = 'N/A'
+        else:
+            formatted_value = str(value)
+
+        # Truncate long strings
+        if len(formatted_value) > 100:
+            formatted_value = formatted_value[:97] + '...'
+
+        return formatted_value
+
     def _format_column_name(self, column: str) -> str:
         """Format column name for display"""
         # Replace underscores with spaces and capitalize
@@ -0,0 +1,161 @@
+"""
+Streaming Export Pipeline
+
+Writes report exports from an iterable of row batches (see
+QueryBuilder.build_and_stream) without materializing the full result set:
+- CSV: encoded chunk per batch, sent as it is produced
+- XLSX: openpyxl write-only workbook
+- PDF: page-at-a-time canvas rendering
+
+XLSX and PDF are zip/xref formats that cannot be sent until complete, so
+iter_export spools them to a temporary file (in memory while small) and
+streams the file back.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List
+import logging
+
+from .pdf_exporter import PDFExporter
+from .excel_exporter import StreamingExcelExporter
+
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS: Dict[str, Dict[str, str]] = {
+    "csv": {"media_type": "text/csv", "extension": "csv"},
+    "pdf": {"media_type": "application/pdf", "extension": "pdf"},
+    "xlsx": {
+        "media_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "extension": "xlsx",
+    },
+}
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def export_filename(title: str, fmt: str) -> str:
+    """Download filename for an export"""
+    extension = EXPORT_FORMATS[fmt]["extension"]
+    return f"{title.replace(' ', '_')}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def iter_csv(columns: List[str], batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """
+    Yield a CSV document as one UTF-8 chunk per batch.
+
+    Args:
+        columns: Column names (also the header row)
+        batches: Iterable of row batches (lists of dictionaries)
+    """
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+
+    for batch in batches:
+        writer.writerows(batch)
+        yield output.getvalue().encode('utf-8')
+        output.seek(0)
+        output.truncate()
+
+    if output.tell():
+        yield output.getvalue().encode('utf-8')
+
+
+def write_export(
+    fmt: str,
+    columns: List[str],
+    batches: Iterable[List[Dict[str, Any]]],
+    out: BinaryIO,
+    title: str,
+    include_summary: bool = True
+) -> int:
+    """
+    Write an export in the given format to a binary file object.
+
+    Args:
+        fmt: Export format (csv, pdf, xlsx)
+        columns: Column names to include
+        batches: Iterable of row batches (lists of dictionaries)
+        out: Binary file object to write to
+        title: Report title
+        include_summary: Add a summary sheet (xlsx only)
+
+    Returns:
+        Number of data rows written
+    """
+    generated = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
+
+    if fmt == "csv":
+        row_count = 0
+
+        def counted(batches):
+            nonlocal row_count
+            for batch in batches:
+                row_count += len(batch)
+                yield batch
+
+        for chunk in iter_csv(columns, counted(batches)):
+            out.write(chunk)
+        return row_count
+
+    if fmt == "pdf":
+        exporter = PDFExporter(title=title, orientation="landscape")
+        return exporter.export_data_table_stream(
+            batches, columns, out, subtitle=f"Generated: {generated}"
+        )
+
+    if fmt == "xlsx":
+        exporter = StreamingExcelExporter(title=title)
+        row_count = exporter.add_data_sheet(
+            sheet_name="Data",
+            batches=batches,
+            columns=columns,
+            add_table=True,
+            add_summary_row=True,
+            freeze_header=True
+        )
+        if include_summary:
+            exporter.add_summary_sheet({
+                "Report Title": title,
+                "Generated": generated,
+                "Total Records": row_count,
+                "Columns": len(columns)
+            })
+        exporter.export(out)
+        return row_count
+
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def iter_export(
+    fmt: str,
+    columns: List[str],
+    batches: Iterable[List[Dict[str, Any]]],
+    title: str,
+    include_summary: bool = True,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield an export in the given format as byte chunks.
+
+    CSV chunks are produced while rows are read; XLSX and PDF are written
+    to a spooled temporary file first and then read back in chunks.
+    """
+    if fmt == "csv":
+        yield from iter_csv(columns, batches)
+        return
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        row_count = write_export(fmt, columns, batches, spool, title, include_summary)
+        logger.info(f"Spooled {fmt} export: {row_count} rows, {spool.tell()} bytes")
+        spool.seek(0)
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
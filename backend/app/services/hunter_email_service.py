@@ -14,6 +14,8 @@ from pydantic import BaseModel, EmailStr
 import os
 import logging
 
+from app.core.http_clients import pooled_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,7 +94,7 @@ class HunterEmailService:
         try:
             logger.info(f"Starting Hunter.io domain search for: {domain}")
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_http_client("hunter") as client:
                 response = await client.get(
                     f"{self.base_url}/domain-search",
                     params={
@@ -100,7 +102,8 @@ class HunterEmailService:
                         "api_key": self.api_key,
                         "limit": 50,  # Max contacts to return
                         "type": "personal"  # Personal emails only
-                    }
+                    },
+                    timeout=self.timeout
                 )
 
                 # Handle rate limiting
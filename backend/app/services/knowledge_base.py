@@ -3,11 +3,20 @@ Knowledge Base service for customer document management and ICP extraction
 
 Handles document upload, parsing, embedding generation, and vector similarity search
 Uses RunPod S3 storage and PostgreSQL for metadata
+
+Semantic search ranks embedded document chunks (KnowledgeChunk):
+- PostgreSQL + pgvector >= 0.8: top-k cosine query on the HNSW index with an
+  iterative scan, so the customer filter doesn't starve the result
+- PostgreSQL + older pgvector: exact top-k over the customer's chunks
+- other databases (SQLite in tests/development): exact search over an
+  in-memory per-customer index loaded from the chunk table
 """
 import os
 import io
 import hashlib
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 # Document parsing
@@ -26,21 +35,39 @@ except ImportError:
 # Embeddings - optional dependency
 try:
     from sentence_transformers import SentenceTransformer
-    import numpy as np
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SentenceTransformer = None
-    np = None
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
+import numpy as np
+
 # RunPod storage and database
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 from app.services.runpod_storage import RunPodStorageService
-from app.models.customer_models import KnowledgeDocument
+from app.services.vector_index import InMemoryVectorIndex, normalize_rows
+from app.models.customer_models import KnowledgeDocument, KnowledgeChunk, PGVECTOR_AVAILABLE
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
 
+# Chunking: ~1000 character windows on whitespace, 200 characters of overlap
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+EMBEDDING_BATCH_SIZE = 64
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Chunks fetched per requested document (several chunks of one document can rank together)
+SEARCH_CANDIDATE_MULTIPLIER = 4
+# Lower bound for hnsw.ef_search (HNSW returns at most ef_search rows)
+HNSW_MIN_EF_SEARCH = 40
+# pgvector 0.8+ keeps scanning the HNSW graph until enough rows pass the
+# customer filter; older versions filter after the scan and can return far
+# fewer than k rows for small tenants, so they rank the tenant's chunks exactly
+PGVECTOR_ITERATIVE_SCAN_VERSION = (0, 8, 0)
+
 
 class KnowledgeBaseService:
     """
@@ -69,6 +96,15 @@ class KnowledgeBaseService:
         self.embedding_model = SentenceTransformer(self.embedding_model_name)
         self.embedding_dimension = 384  # Dimension for all-MiniLM-L6-v2
 
+        # LRU cache of query embeddings (repeated searches skip the model)
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
+        # Fallback search index for databases without pgvector
+        self.local_index = InMemoryVectorIndex(self.embedding_dimension)
+        # Whether the pgvector extension supports hnsw.iterative_scan (checked on first search)
+        self._iterative_scan: Optional[bool] = None
+
         logger.info(f"Initialized Knowledge Base with embedding model: {self.embedding_model_name}")
 
     def upload_document(
@@ -110,8 +146,10 @@ class KnowledgeBaseService:
             # Extract text from document
             extracted_text = self._extract_text(file_content, filename, content_type)
 
-            # Generate embedding for the full document
-            embedding = self._generate_embedding(extracted_text)
+            # Embed all chunks in batches; the document embedding is their normalized mean
+            chunks = self._chunk_text(extracted_text)
+            chunk_embeddings = self._generate_embeddings(chunks)
+            embedding = normalize_rows(chunk_embeddings.mean(axis=0))[0].tolist() if chunks else None
 
             # Extract ICP criteria from document
             icp_data = self._extract_icp_criteria(extracted_text)
@@ -131,10 +169,12 @@ class KnowledgeBaseService:
                 icp_data=icp_data,
                 processing_status='completed'
             )
+            knowledge_doc.chunks = self._build_chunks(int(customer_id), chunks, chunk_embeddings)
 
             db.add(knowledge_doc)
             db.commit()
             db.refresh(knowledge_doc)
+            self._index_chunks(knowledge_doc.customer_id, knowledge_doc.chunks, chunk_embeddings)
 
             logger.info(f"Uploaded document {doc_id} for customer {customer_id}")
 
@@ -144,6 +184,7 @@ class KnowledgeBaseService:
                 'file_url': file_url,
                 'text_preview': extracted_text[:500],
                 'text_length': len(extracted_text),
+                'chunk_count': len(chunks),
                 'embedding_dimension': self.embedding_dimension,
                 'icp_criteria': icp_data,
                 'created_at': knowledge_doc.created_at.isoformat()
@@ -209,32 +250,108 @@ class KnowledgeBaseService:
             logger.error(f"DOCX extraction error: {e}")
             raise
 
-    def _generate_embedding(self, text: str) -> List[float]:
+    def _chunk_text(self, text: str) -> List[str]:
         """
-        Generate vector embedding for text
+        Split text into overlapping chunks of about CHUNK_SIZE characters
+
+        Chunks end on whitespace where possible and overlap by CHUNK_OVERLAP
+        characters so a passage cut at a boundary is still whole in one chunk.
 
         Args:
-            text: Input text
+            text: Extracted document text
 
         Returns:
-            384-dimensional embedding vector
+            List of non-empty chunk strings
         """
-        try:
-            # Truncate text if too long (model max is typically 512 tokens)
-            max_length = 8000  # characters, roughly ~2000 tokens
-            if len(text) > max_length:
-                text = text[:max_length]
+        text = " ".join(text.split())
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + CHUNK_SIZE, len(text))
+            if end < len(text):
+                boundary = text.rfind(" ", start + CHUNK_OVERLAP + 1, end)
+                if boundary != -1:
+                    end = boundary
+            chunks.append(text[start:end])
+            if end == len(text):
+                break
+            next_start = text.find(" ", max(end - CHUNK_OVERLAP, start + 1), end)
+            start = next_start + 1 if next_start != -1 else end
+        return chunks
+
+    def _generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate L2-normalized embeddings for many texts in batched model calls
 
-            # Generate embedding
-            embedding = self.embedding_model.encode(text, show_progress_bar=False)
+        Args:
+            texts: Input texts
 
-            # Convert to list for JSON serialization
-            return embedding.tolist()
+        Returns:
+            (len(texts), 384) float32 array
+        """
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+
+        try:
+            embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            return np.asarray(embeddings, dtype=np.float32)
 
         except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
+            logger.error(f"Failed to generate embeddings for {len(texts)} texts: {e}")
             raise
 
+    def _generate_embedding(self, text: str) -> List[float]:
+        """
+        Generate vector embedding for text
+
+        Args:
+            text: Input text
+
+        Returns:
+            384-dimensional embedding vector
+        """
+        # Truncate text if too long (model max is typically 512 tokens)
+        max_length = 8000  # characters, roughly ~2000 tokens
+        return self._generate_embeddings([text[:max_length]])[0].tolist()
+
+    def _embed_query(self, query_text: str) -> np.ndarray:
+        """Query embedding, served from the LRU cache when the query was seen recently"""
+        key = " ".join(query_text.split()).lower()
+        with self._query_cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return cached
+
+        embedding = self._generate_embeddings([key])[0]
+
+        with self._query_cache_lock:
+            self._query_cache[key] = embedding
+            while len(self._query_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return embedding
+
+    def _build_chunks(self, customer_id: int, chunks: List[str], embeddings: np.ndarray) -> List[KnowledgeChunk]:
+        return [
+            KnowledgeChunk(
+                customer_id=customer_id,
+                chunk_index=i,
+                chunk_text=chunk,
+                embedding=embeddings[i].tolist()
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+
+    def _index_chunks(self, customer_id: int, chunks: List[KnowledgeChunk], embeddings: np.ndarray) -> None:
+        """Add committed chunks to the local index if the customer's partition is loaded"""
+        if chunks and customer_id in self.local_index:
+            self.local_index.add(customer_id, [chunk.id for chunk in chunks], embeddings)
+
     def _extract_icp_criteria(self, text: str) -> Dict:
         """
         Extract ICP (Ideal Customer Profile) criteria from document text
@@ -322,6 +439,9 @@ class KnowledgeBaseService:
         """
         Search for similar documents using vector similarity (pgvector)
 
+        Ranks the customer's chunks by cosine similarity to the query and
+        scores each document by its best matching chunk.
+
         Args:
             query_text: Search query
             customer_id: Customer ID for filtering
@@ -330,33 +450,43 @@ class KnowledgeBaseService:
             db: Database session
 
         Returns:
-            List of similar documents with similarity scores
+            List of similar documents with similarity scores, most similar first
         """
         try:
-            # Generate query embedding
-            query_embedding = self._generate_embedding(query_text)
+            query_embedding = self._embed_query(query_text)
+            candidates = limit * SEARCH_CANDIDATE_MULTIPLIER
 
-            # Query PostgreSQL for customer documents
-            # Using pgvector for similarity search
-            documents = db.query(KnowledgeDocument).filter(
-                KnowledgeDocument.customer_id == int(customer_id),
-                KnowledgeDocument.processing_status == 'completed'
-            ).limit(limit).all()
+            if self._use_pgvector(db):
+                matches = self._search_pgvector(db, int(customer_id), query_embedding, candidates)
+            else:
+                matches = self._search_local(db, int(customer_id), query_embedding, candidates)
 
-            if not documents:
+            # Best chunk per document, above the threshold
+            best: Dict[int, Tuple[float, str]] = {}
+            for document_pk, chunk_text, similarity in matches:
+                if similarity >= similarity_threshold and document_pk not in best:
+                    best[document_pk] = (similarity, chunk_text)
+
+            if not best:
                 return []
 
-            # For now, return documents without vector similarity scoring
-            # TODO: Implement pgvector cosine similarity once pgvector extension is enabled
+            documents = db.query(KnowledgeDocument).filter(
+                KnowledgeDocument.id.in_(list(best)),
+                KnowledgeDocument.processing_status == 'completed'
+            ).all()
+            documents.sort(key=lambda doc: best[doc.id][0], reverse=True)
+
             results = []
-            for doc in documents:
+            for doc in documents[:limit]:
+                similarity, chunk_text = best[doc.id]
                 results.append({
                     'document_id': doc.document_id,
                     'filename': doc.filename,
                     'file_url': doc.runpod_url,
                     'icp_criteria': doc.icp_data,
                     'created_at': doc.created_at.isoformat(),
-                    'similarity_score': 0.85  # Placeholder until pgvector integration
+                    'similarity_score': round(similarity, 4),
+                    'matched_text': chunk_text
                 })
 
             logger.info(f"Found {len(results)} documents for customer {customer_id}")
@@ -366,6 +496,122 @@ class KnowledgeBaseService:
             logger.error(f"Failed to search documents for customer {customer_id}: {e}")
             raise
 
+    def _use_pgvector(self, db: Session) -> bool:
+        return PGVECTOR_AVAILABLE and db.get_bind().dialect.name == "postgresql"
+
+    def _search_pgvector(
+        self,
+        db: Session,
+        customer_id: int,
+        query_embedding: np.ndarray,
+        k: int
+    ) -> List[Tuple[int, str, float]]:
+        """Top-k chunks of one customer by cosine distance, most similar first"""
+        distance = KnowledgeChunk.embedding.cosine_distance(query_embedding.tolist())
+        columns = (KnowledgeChunk.document_id, KnowledgeChunk.chunk_text, distance.label("distance"))
+        tenant_filter = KnowledgeChunk.customer_id == customer_id
+
+        if self._supports_iterative_scan(db):
+            # SET LOCAL takes no bind parameters; ef_search is an int we computed
+            db.execute(text(f"SET LOCAL hnsw.ef_search = {max(HNSW_MIN_EF_SEARCH, int(k))}"))
+            db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+            query = select(*columns).where(tenant_filter).order_by(distance).limit(k)
+        else:
+            # MATERIALIZED keeps the planner from ordering by the HNSW index,
+            # which would apply the customer filter after the scan
+            tenant_chunks = select(*columns).where(tenant_filter).cte("tenant_chunks").prefix_with("MATERIALIZED")
+            query = select(tenant_chunks).order_by(tenant_chunks.c.distance).limit(k)
+
+        matches = [(row.document_id, row.chunk_text, 1.0 - float(row.distance)) for row in db.execute(query)]
+        # relaxed_order may return rows slightly out of distance order
+        matches.sort(key=lambda match: match[2], reverse=True)
+        return matches
+
+    def _supports_iterative_scan(self, db: Session) -> bool:
+        """Whether the installed pgvector has hnsw.iterative_scan (0.8+)"""
+        if self._iterative_scan is None:
+            version = db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar()
+            try:
+                parsed = tuple(int(part) for part in (version or "0").split(".")[:3])
+            except ValueError:
+                parsed = (0,)
+            self._iterative_scan = parsed >= PGVECTOR_ITERATIVE_SCAN_VERSION
+            logger.info(
+                f"pgvector {version}: "
+                f"{'HNSW iterative scan' if self._iterative_scan else 'exact per-customer scan'} for chunk search"
+            )
+        return self._iterative_scan
+
+    def _search_local(
+        self,
+        db: Session,
+        customer_id: int,
+        query_embedding: np.ndarray,
+        k: int
+    ) -> List[Tuple[int, str, float]]:
+        """Top-k chunks from the in-memory index, loading the customer's chunks on first use"""
+        if customer_id not in self.local_index:
+            rows = db.execute(
+                select(KnowledgeChunk.id, KnowledgeChunk.embedding)
+                .where(KnowledgeChunk.customer_id == customer_id)
+            ).all()
+            self.local_index.add(
+                customer_id,
+                [row.id for row in rows],
+                [row.embedding for row in rows] if rows else None
+            )
+
+        hits = self.local_index.search(customer_id, query_embedding, k)
+        if not hits:
+            return []
+
+        chunks = {
+            row.id: row
+            for row in db.execute(
+                select(KnowledgeChunk.id, KnowledgeChunk.document_id, KnowledgeChunk.chunk_text)
+                .where(KnowledgeChunk.id.in_([chunk_id for chunk_id, _ in hits]))
+            )
+        }
+        return [
+            (chunks[chunk_id].document_id, chunks[chunk_id].chunk_text, similarity)
+            for chunk_id, similarity in hits
+            if chunk_id in chunks
+        ]
+
+    def reindex_documents(self, db: Session, customer_id: Optional[str] = None) -> int:
+        """
+        Chunk and embed completed documents that have no chunks yet
+
+        Backfills documents uploaded before chunk-level search existed.
+
+        Args:
+            db: Database session (committed per document)
+            customer_id: Restrict to one customer; None reindexes all
+
+        Returns:
+            Number of documents reindexed
+        """
+        query = db.query(KnowledgeDocument).filter(
+            KnowledgeDocument.processing_status == 'completed',
+            ~KnowledgeDocument.chunks.any()
+        )
+        if customer_id is not None:
+            query = query.filter(KnowledgeDocument.customer_id == int(customer_id))
+
+        reindexed = 0
+        for doc in query.all():
+            chunks = self._chunk_text(doc.text_content or "")
+            if not chunks:
+                continue
+            embeddings = self._generate_embeddings(chunks)
+            doc.chunks = self._build_chunks(doc.customer_id, chunks, embeddings)
+            db.commit()
+            self._index_chunks(doc.customer_id, doc.chunks, embeddings)
+            reindexed += 1
+
+        logger.info(f"Reindexed {reindexed} knowledge documents")
+        return reindexed
+
     def get_customer_documents(
         self,
         customer_id: str,
@@ -441,9 +687,12 @@ class KnowledgeBaseService:
                 except Exception as e:
                     logger.warning(f"Failed to delete file from RunPod: {e}")
 
-            # Delete from PostgreSQL
+            chunk_ids = [chunk.id for chunk in doc.chunks]
+
+            # Delete from PostgreSQL (chunks cascade)
             db.delete(doc)
             db.commit()
+            self.local_index.remove(doc.customer_id, chunk_ids)
 
             logger.info(f"Deleted document {document_id} for customer {customer_id}")
 
@@ -55,6 +55,11 @@ from app.services.langgraph.tools import (
     get_lead_tool
 )
 from app.services.cache.enrichment_cache import get_enrichment_cache
+from app.services.cache.apollo_cache import ApolloPersonCache, get_apollo_person_cache
+from app.services.apollo import ApolloService
+from app.services.apollo_enrichment_batcher import ApolloEnrichmentBatcher
+from app.services.crm.apollo import build_enrichment_record
+from app.services.rate_limiter import AtomicRateLimiter
 from app.core.logging import setup_logging
 from app.core.exceptions import ValidationError
 from app.core.cost_optimized_llm import CostOptimizedLLMProvider, LLMConfig
@@ -155,6 +160,7 @@ class EnrichmentAgent:
         self.provider = provider
         self.use_cache = use_cache
         self.cache = None  # Initialize on first use
+        self.apollo_batcher: Optional[ApolloEnrichmentBatcher] = None  # enrich_batch prefetch, lazy
 
         # Cost tracking
         self.track_costs = track_costs
@@ -430,7 +436,8 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
         self,
         email: Optional[str] = None,
         linkedin_url: Optional[str] = None,
-        lead_id: Optional[int] = None
+        lead_id: Optional[int] = None,
+        apollo_person: Optional[Dict[str, Any]] = None
     ) -> EnrichmentResult:
         """
         Enrich a contact using ReAct agent with multiple tools and intelligent caching.
@@ -446,6 +453,8 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
             email: Email address for Apollo enrichment
             linkedin_url: LinkedIn profile URL for scraping
             lead_id: Close CRM lead ID for existing data
+            apollo_person: Apollo person already matched for email (enrich_batch
+                prefetch); used as the Apollo.io result instead of a tool call
 
         Returns:
             EnrichmentResult with enriched_data, confidence_score, and metadata
@@ -508,6 +517,15 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
             request_parts.append(f"LinkedIn: {linkedin_url}")
         if lead_id:
             request_parts.append(f"CRM Lead ID: {lead_id}")
+        if apollo_person:
+            apollo_record = build_enrichment_record(email, apollo_person)
+            contact = apollo_record["contact"]
+            request_parts.append(
+                "Apollo.io data (already retrieved): "
+                f"name={contact.get('first_name')} {contact.get('last_name')}, "
+                f"title={contact.get('title')}, company={contact.get('company')}, "
+                f"linkedin={contact.get('linkedin_url')}"
+            )
 
         request_message = (
             f"Enrich this contact using all available tools:\n" +
@@ -535,6 +553,9 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
 
             # Extract tool results and errors
             tool_results, data_sources, errors = self._extract_tool_results(messages)
+            if apollo_person and "enrich_contact_tool" not in tool_results:
+                tool_results["enrich_contact_tool"] = apollo_record
+                data_sources.insert(0, "apollo.io")
 
             # Track which tools were called
             tools_called = list(tool_results.keys())
@@ -1016,6 +1037,10 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
         """
         Enrich multiple contacts in parallel using asyncio.
 
+        Contacts with an email are first matched against Apollo.io in bulk
+        (cache first, then /people/bulk_match 10 at a time) instead of one
+        Apollo call per contact.
+
         Args:
             contacts: List of dicts with email/linkedin_url/lead_id
             max_concurrency: Max concurrent enrichments (default: 5)
@@ -1033,10 +1058,13 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
         import asyncio
 
         semaphore = asyncio.Semaphore(max_concurrency)
+        apollo_people = await self._prefetch_apollo(contacts)
 
         async def enrich_with_semaphore(contact: Dict[str, Any]):
             async with semaphore:
-                return await self.enrich(**contact)
+                email = contact.get("email")
+                person = apollo_people.get(ApolloPersonCache.normalize_email(email)) if email else None
+                return await self.enrich(**contact, apollo_person=person)
 
         tasks = [enrich_with_semaphore(contact) for contact in contacts]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -1054,6 +1082,34 @@ Be strategic about tool use - don't call the same tool twice unless explicitly n
 
         return enrichment_results
 
+    async def _prefetch_apollo(self, contacts: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Bulk-match the batch's emails against Apollo.io.
+
+        Returns:
+            {normalized email: Apollo person or None}; empty if Apollo is not
+            configured or the lookup failed
+        """
+        emails = [contact["email"] for contact in contacts if contact.get("email")]
+        if not emails:
+            return {}
+
+        try:
+            if self.apollo_batcher is None:
+                if not os.getenv("APOLLO_API_KEY"):
+                    return {}
+                cache = await get_apollo_person_cache() if self.use_cache else None
+                self.apollo_batcher = ApolloEnrichmentBatcher(
+                    ApolloService(),
+                    cache=cache,
+                    rate_limiter=AtomicRateLimiter(cache.redis) if cache else None,
+                )
+            result = await self.apollo_batcher.enrich_emails(emails)
+            return result.people
+        except Exception as e:
+            logger.warning(f"Apollo bulk prefetch failed, enriching without it: {e}")
+            return {}
+
     async def _log_enrichment_cost(
         self,
         enriched_data: Dict[str, Any],
@@ -17,12 +17,12 @@ Integration:
 import os
 import asyncio
 import logging
-from typing import Any, Dict, Optional, Callable, TypeVar, Literal
+from typing import Any, Dict, Optional, Callable, TypeVar, Literal, Union
 from functools import wraps
 
 from langgraph.graph import StateGraph
 from langgraph.checkpoint.redis.aio import AsyncRedisSaver
-from app.services.circuit_breaker import CircuitBreaker
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerError, create_circuit_breaker
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -278,7 +278,7 @@ def merge_metadata(existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, A
 
 def wrap_node_with_resilience(
     func: Callable,
-    circuit_breaker: Optional[CircuitBreaker] = None,
+    circuit_breaker: Optional[Union[CircuitBreaker, str]] = None,
     max_retries: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 60.0
@@ -291,7 +291,8 @@ def wrap_node_with_resilience(
 
     Args:
         func: Async node function to wrap (must accept state dict)
-        circuit_breaker: Optional CircuitBreaker instance for fault isolation
+        circuit_breaker: Optional CircuitBreaker instance, or a name to create one
+            with create_circuit_breaker() (shared across workers when distributed)
         max_retries: Maximum retry attempts (default: 3)
         base_delay: Base delay in seconds for exponential backoff (default: 1.0)
         max_delay: Maximum delay between retries (default: 60.0)
@@ -331,9 +332,13 @@ def wrap_node_with_resilience(
            - Automatic state management (CLOSED/OPEN/HALF_OPEN transitions)
            - Fail-fast when circuit is OPEN
         2. If no circuit breaker: Manual retry logic with exponential backoff
-        3. Retry on failure up to max_retries attempts
+        3. Retry on failure up to max_retries attempts (an OPEN circuit fails
+           fast instead of sleeping through retries)
         4. Raise exception after all retries exhausted
     """
+    if isinstance(circuit_breaker, str):
+        circuit_breaker = create_circuit_breaker(circuit_breaker)
+
     @wraps(func)
     async def wrapped(state: Dict[str, Any]) -> Dict[str, Any]:
         if circuit_breaker:
@@ -347,6 +352,10 @@ def wrap_node_with_resilience(
                     logger.debug(f"Node {func.__name__} succeeded on attempt {attempt + 1}")
                     return result
 
+                except CircuitBreakerError:
+                    # Circuit is open (possibly tripped by another worker) - don't wait it out
+                    raise
+
                 except Exception as e:
                     last_exception = e
 
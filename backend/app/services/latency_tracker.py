@@ -0,0 +1,181 @@
+"""Online latency and cost tracking for adaptive model routing.
+
+Keeps a per provider/model EWMA of latency and cost plus a ring buffer of
+recent latencies for tail quantiles. ModelRouter uses it to rank candidates
+by observed performance and to pick the delay before firing a hedged request.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """
+    Streaming latency/cost statistics for one provider/model.
+
+    The EWMA tracks the typical latency; the ring buffer of the last
+    `window` samples gives the p95 used as the hedge delay. Samples older than
+    `stale_after_seconds` are dropped on the next record, so a model that was
+    demoted (and stopped receiving traffic) is re-measured from scratch.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 200, stale_after_seconds: float = 60.0):
+        """
+        Initialize statistics.
+
+        Args:
+            alpha: EWMA smoothing factor (higher = reacts faster)
+            window: Number of recent latency samples kept for quantiles
+            stale_after_seconds: Age after which the statistics are discarded
+        """
+        self.alpha = alpha
+        self.stale_after_seconds = stale_after_seconds
+        self.updated_at = 0.0
+        self.ewma_latency_ms: Optional[float] = None
+        self.ewma_cost_usd: Optional[float] = None
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self._sorted: Optional[List[float]] = None
+
+    def record(self, latency_ms: float, cost_usd: Optional[float] = None) -> None:
+        """Record one observed latency (and cost, when known)."""
+        if self.is_stale():
+            self.samples.clear()
+            self.ewma_latency_ms = None
+        self.updated_at = time.monotonic()
+        self.samples.append(latency_ms)
+        self._sorted = None
+        self.ewma_latency_ms = self._blend(self.ewma_latency_ms, latency_ms)
+        if cost_usd is not None:
+            self.ewma_cost_usd = self._blend(self.ewma_cost_usd, cost_usd)
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.updated_at > self.stale_after_seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank quantile of the recent samples, None when empty."""
+        if not self.samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self.samples)
+        rank = max(0, math.ceil(q * len(self._sorted)) - 1)
+        return self._sorted[rank]
+
+    @property
+    def p95_ms(self) -> Optional[float]:
+        return self.quantile(0.95)
+
+    def _blend(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1 - self.alpha) * current
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1) if self.ewma_latency_ms is not None else None,
+            "p95_latency_ms": round(self.p95_ms, 1) if self.samples else None,
+            "ewma_cost_usd": self.ewma_cost_usd,
+            "samples": len(self.samples),
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+class LatencyTracker:
+    """
+    Per provider/model latency statistics with hedge-delay selection.
+
+    Until a model has `min_samples` recent observations its configured
+    max_latency_ms stands in for both the EWMA and the p95, so cold (or
+    stale) models are ranked by their static config and never hedged too
+    early.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        window: int = 200,
+        min_samples: int = 10,
+        hedge_quantile: float = 0.95,
+        min_hedge_delay_ms: float = 50.0,
+        stale_after_seconds: float = 60.0,
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            alpha: EWMA smoothing factor
+            window: Samples kept per model for quantiles
+            min_samples: Observations needed before stats replace the config
+            hedge_quantile: Latency quantile after which a backup is fired
+            min_hedge_delay_ms: Lower bound on the hedge delay
+            stale_after_seconds: Age after which a model counts as cold again
+        """
+        self.alpha = alpha
+        self.window = window
+        self.min_samples = min_samples
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay_ms = min_hedge_delay_ms
+        self.stale_after_seconds = stale_after_seconds
+        self._stats: Dict[Tuple[str, str], LatencyStats] = {}
+
+    def stats(self, provider: str, model: str) -> LatencyStats:
+        key = (provider, model)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = LatencyStats(self.alpha, self.window, self.stale_after_seconds)
+        return stats
+
+    def record_success(self, provider: str, model: str, latency_ms: float, cost_usd: float) -> None:
+        stats = self.stats(provider, model)
+        stats.successes += 1
+        stats.record(latency_ms, cost_usd)
+
+    def record_failure(self, provider: str, model: str, latency_ms: float) -> None:
+        """A failed call still cost its caller `latency_ms` of waiting."""
+        stats = self.stats(provider, model)
+        stats.failures += 1
+        stats.record(latency_ms)
+
+    def record_cancelled(self, provider: str, model: str, elapsed_ms: float) -> None:
+        """
+        Record a hedge loser that was cancelled after `elapsed_ms`.
+
+        Its real latency is unknown but at least `elapsed_ms`; recording the
+        lower bound keeps a slow model's stats moving instead of freezing at
+        the last time it won.
+        """
+        self.stats(provider, model).record(elapsed_ms)
+
+    def is_warm(self, provider: str, model: str) -> bool:
+        stats = self._stats.get((provider, model))
+        return stats is not None and len(stats.samples) >= self.min_samples and not stats.is_stale()
+
+    def expected_latency_ms(self, provider: str, model: str, default_ms: float) -> float:
+        if not self.is_warm(provider, model):
+            return default_ms
+        return self._stats[(provider, model)].ewma_latency_ms
+
+    def tail_latency_ms(self, provider: str, model: str, default_ms: float) -> float:
+        if not self.is_warm(provider, model):
+            return default_ms
+        return self._stats[(provider, model)].quantile(self.hedge_quantile)
+
+    def expected_cost_usd(self, provider: str, model: str, default_usd: float) -> float:
+        stats = self._stats.get((provider, model))
+        if stats is None or stats.ewma_cost_usd is None:
+            return default_usd
+        return stats.ewma_cost_usd
+
+    def hedge_delay_ms(self, provider: str, model: str, default_ms: float) -> float:
+        """Delay before firing a backup for an in-flight call to provider/model."""
+        return max(self.min_hedge_delay_ms, self.tail_latency_ms(provider, model, default_ms))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {f"{provider}/{model}": stats.to_dict() for (provider, model), stats in self._stats.items()}
@@ -2,15 +2,20 @@
 Multi-factor lead scoring service for intelligent lead qualification
 """
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+import re
+from typing import Dict, Any, Optional, List, Mapping, Sequence, Tuple, Union
 from pydantic import BaseModel, Field, validator
 import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 
 from app.core.logging import setup_logging
+from app.core.substring_index import SubstringIndex
 
 logger = setup_logging(__name__)
 
+NUMBER_PATTERN = re.compile(r'\d+')
+
 
 class ScoringWeights(BaseModel):
     """Configurable scoring weights for different factors"""
@@ -136,6 +141,10 @@ class LeadScorer:
         self.default_industry_multiplier = 1.0
         self.default_size_score = 50
 
+        # Precompiled partial-match index over industry names (first key wins)
+        self._industry_keys = list(self.industry_multipliers)
+        self._industry_index = SubstringIndex([key.lower() for key in self._industry_keys])
+
         logger.info("LeadScorer initialized with weights: %s", self.weights.dict())
 
     def calculate_score(
@@ -212,6 +221,80 @@ class LeadScorer:
             tier=tier
         )
 
+    def score_batch(
+        self,
+        leads: Union[pd.DataFrame, Mapping[str, Sequence[Any]]],
+        signals: Optional[Sequence[Optional[SignalData]]] = None
+    ) -> pd.DataFrame:
+        """
+        Score many leads at once (vectorized calculate_score())
+
+        Size and industry scores are computed once per distinct value and
+        broadcast; weighting, confidence and tiers are array operations.
+        Reasoning and recommendations are not generated - use
+        calculate_score() for a single lead's explanation.
+
+        Args:
+            leads: DataFrame (or mapping of column name to array/list) with
+                company_size and industry columns
+            signals: Optional SignalData (or None) per row
+
+        Returns:
+            DataFrame on the input index with score, confidence, tier and
+            the company_size/industry/signals factor scores
+        """
+        frame = leads if isinstance(leads, pd.DataFrame) else pd.DataFrame(leads)
+        n = len(frame)
+
+        def factor(column: str, score_fn) -> Tuple[np.ndarray, np.ndarray]:
+            values = frame[column] if column in frame else pd.Series([None] * n, index=frame.index, dtype=object)
+            codes, uniques = pd.factorize(values)
+            table = np.array([score_fn(value) for value in uniques] + [score_fn(None)], dtype=float)
+            return table[codes], codes >= 0  # code -1 (missing) picks the trailing None score
+
+        size_scores, has_size = factor('company_size', self.get_size_score)
+        industry_scores, has_industry = factor('industry', self.get_industry_score)
+
+        signals_scores = np.full(n, 50.0)
+        has_signals = np.zeros(n, dtype=bool)
+        completeness = np.zeros(n)
+        if signals is not None:
+            for i, row_signals in enumerate(signals):
+                if row_signals:
+                    signals_scores[i] = self.analyze_signals(row_signals)
+                    has_signals[i] = True
+                    completeness[i] = self._get_signals_completeness(row_signals)
+
+        weighted_scores = (
+            size_scores * self.weights.company_size +
+            industry_scores * self.weights.industry +
+            signals_scores * self.weights.signals
+        )
+
+        # Same branches as _calculate_confidence()
+        data_points = has_size.astype(int) + has_industry + has_signals
+        signal_bonus = np.where(data_points == 1, 0.20, 0.15) * completeness * has_signals
+        confidence = np.select(
+            [data_points == 3, data_points == 2, data_points == 1],
+            [0.85 + signal_bonus, 0.65 + signal_bonus, 0.40 + signal_bonus],
+            0.25
+        )
+
+        def round_to(values: np.ndarray, digits: int) -> np.ndarray:
+            # Python round() on each value: np.round differs on binary ties (0.665)
+            return np.fromiter((round(value, digits) for value in values.tolist()), dtype=float, count=n)
+
+        return pd.DataFrame({
+            "score": round_to(weighted_scores, 1),
+            "confidence": round_to(np.minimum(confidence, 1.0), 2),
+            "tier": np.select(
+                [weighted_scores >= 80, weighted_scores >= 65, weighted_scores >= 50], ["A", "B", "C"], "D"
+            ),
+            "company_size": round_to(size_scores, 1),
+            "industry": round_to(industry_scores, 1),
+            "signals": round_to(signals_scores, 1),
+        }, index=frame.index)
+
     def get_industry_score(self, industry: Optional[str]) -> float:
         """
         Get industry-specific score with multiplier
@@ -234,11 +317,11 @@ class LeadScorer:
             multiplier = self.industry_multipliers[industry_normalized]
         else:
             # Check for partial matches
-            multiplier = self.default_industry_multiplier
-            for key, value in self.industry_multipliers.items():
-                if key.lower() in industry.lower() or industry.lower() in key.lower():
-                    multiplier = value
-                    break
+            match = self._industry_index.first_match(industry.lower())
+            if match is not None:
+                multiplier = self.industry_multipliers[self._industry_keys[match]]
+            else:
+                multiplier = self.default_industry_multiplier
 
         # Convert multiplier to 0-100 score
         # 1.2x multiplier = 100 score, 0.7x = 35 score
@@ -278,8 +361,7 @@ class LeadScorer:
             return 50.0
 
         # Try to extract numbers
-        import re
-        numbers = re.findall(r'\d+', company_size)
+        numbers = NUMBER_PATTERN.findall(company_size)
         if numbers:
             # Get the larger number as employee count
             max_employees = max(map(int, numbers))
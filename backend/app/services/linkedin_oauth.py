@@ -27,6 +27,7 @@ import base64
 from urllib.parse import urlencode
 import logging
 
+from app.core.http_clients import pooled_http_client
 from app.services.crm.base import (
     CRMProvider,
     Contact,
@@ -197,7 +198,7 @@ class LinkedInProvider(CRMProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -255,7 +256,7 @@ class LinkedInProvider(CRMProvider):
 
         try:
             headers = {'Authorization': f'Bearer {self.access_token}'}
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/v2/me",
                     headers=headers
@@ -302,7 +303,7 @@ class LinkedInProvider(CRMProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -359,7 +360,7 @@ class LinkedInProvider(CRMProvider):
         headers = {'Authorization': f'Bearer {self.access_token}'}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/v2/me",
                     headers=headers
@@ -393,7 +394,7 @@ class LinkedInProvider(CRMProvider):
         headers = {'Authorization': f'Bearer {self.access_token}'}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_http_client("linkedin") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/v2/emailAddress?q=members&projection=(elements*(handle~))",
                     headers=headers
@@ -2,6 +2,10 @@
 
 Routes AI requests to optimal models based on task type, latency, and cost constraints.
 Implements resilience patterns to handle service failures gracefully.
+
+In adaptive mode (MODEL_ROUTER_ADAPTIVE=true) candidates are ranked by observed
+EWMA latency and cost, and a backup request is fired on the next candidate once
+the in-flight one passes its p95 latency; the first success wins.
 """
 
 import asyncio
@@ -16,7 +20,9 @@ from typing import Optional, List, Dict, Any, AsyncIterator
 import aiohttp
 from openai import OpenAI, AsyncOpenAI
 
-from .circuit_breaker import CircuitBreaker, CircuitBreakerError
+from app.core.metrics import observe_llm_call
+from .circuit_breaker import CircuitBreaker, CircuitBreakerError, create_circuit_breaker
+from .latency_tracker import LatencyTracker
 from .retry_handler import RetryWithBackoff, RetryStrategies, RetryExhaustedError
 
 logger = logging.getLogger(__name__)
@@ -54,6 +60,7 @@ class ModelResponse:
     fallback_used: bool = False
     retry_count: int = 0
     error: Optional[str] = None
+    hedged: bool = False        # A backup request was fired (adaptive mode)
 
 
 class ModelRouter:
@@ -66,16 +73,43 @@ class ModelRouter:
     - Exponential backoff retry for transient failures
     - Automatic fallback on primary model failure
     - Cost and latency tracking
+    - Adaptive mode: latency/cost-ranked candidates with hedged requests
     """
 
-    def __init__(self):
-        """Initialize model router with configurations and clients."""
-        # Circuit breakers for each provider
+    def __init__(
+        self,
+        adaptive: Optional[bool] = None,
+        hedging: bool = True,
+        max_hedges: int = 1,
+        cost_weight: float = 0.5,
+        latency_tracker: Optional[LatencyTracker] = None
+    ):
+        """
+        Initialize model router with configurations and clients.
+
+        Args:
+            adaptive: Rank models by observed latency/cost (default: MODEL_ROUTER_ADAPTIVE env)
+            hedging: Fire backup requests after the p95 delay in adaptive mode
+            max_hedges: Maximum backup requests per routed request
+            cost_weight: Weight of cost (relative to the cost budget) against
+                latency (relative to the latency budget) when ranking models
+            latency_tracker: Shared tracker (default: a new one per router)
+        """
+        if adaptive is None:
+            adaptive = os.getenv("MODEL_ROUTER_ADAPTIVE", "false").lower() == "true"
+        self.adaptive = adaptive
+        self.hedging = hedging
+        self.max_hedges = max_hedges
+        self.cost_weight = cost_weight
+        self.latency_tracker = latency_tracker or LatencyTracker()
+        self.hedge_stats = {"requests": 0, "hedges_fired": 0, "hedges_won": 0}
+
+        # Circuit breakers for each provider (shared across workers when distributed)
         self.circuit_breakers: Dict[str, CircuitBreaker] = {
-            "cerebras": CircuitBreaker("cerebras", failure_threshold=5, recovery_timeout=60),
-            "anthropic": CircuitBreaker("anthropic", failure_threshold=3, recovery_timeout=120),
-            "deepseek": CircuitBreaker("deepseek", failure_threshold=5, recovery_timeout=90),
-            "ollama": CircuitBreaker("ollama", failure_threshold=10, recovery_timeout=30),
+            "cerebras": create_circuit_breaker("cerebras", failure_threshold=5, recovery_timeout=60),
+            "anthropic": create_circuit_breaker("anthropic", failure_threshold=3, recovery_timeout=120),
+            "deepseek": create_circuit_breaker("deepseek", failure_threshold=5, recovery_timeout=90),
+            "ollama": create_circuit_breaker("ollama", failure_threshold=10, recovery_timeout=30),
         }
 
         # Retry strategies for each provider
@@ -219,6 +253,21 @@ class ModelRouter:
                 f"latency<={max_latency_ms}ms, cost<=${max_cost_usd}"
             )
 
+        if self.adaptive:
+            candidates = self._rank_models(
+                filtered_models,
+                max_latency_ms or 10000,
+                max_cost_usd or 1.0
+            )
+            return await self._route_hedged(
+                task_type,
+                candidates,
+                prompt,
+                system_prompt,
+                temperature,
+                max_tokens
+            )
+
         # Separate primary and fallback models
         primary_models = [m for m in filtered_models if not m.fallback]
         fallback_models = [m for m in filtered_models if m.fallback]
@@ -370,6 +419,167 @@ class ModelRouter:
             f"Check circuit breaker status."
         )
 
+    def _rank_models(
+        self,
+        models: List[ModelConfig],
+        max_latency_ms: int,
+        max_cost_usd: float
+    ) -> List[ModelConfig]:
+        """
+        Order candidates by observed latency and cost for adaptive routing.
+
+        Primary models stay ahead of fallbacks unless their observed p95 has
+        exceeded their configured max_latency_ms (slow but not failing), in
+        which case they are demoted among the fallbacks. Providers whose
+        circuit breaker is open go last.
+
+        Args:
+            models: Candidates that passed the static constraints
+            max_latency_ms: Request latency budget (normalizes latency)
+            max_cost_usd: Request cost budget (normalizes cost)
+
+        Returns:
+            Candidates in the order they should be tried
+        """
+        tracker = self.latency_tracker
+
+        def score(m: ModelConfig) -> float:
+            latency = tracker.expected_latency_ms(m.provider, m.model, m.max_latency_ms)
+            cost = tracker.expected_cost_usd(m.provider, m.model, m.max_cost_usd)
+            return latency / max_latency_ms + self.cost_weight * cost / max_cost_usd
+
+        def tier(m: ModelConfig) -> int:
+            breaker = self.circuit_breakers.get(m.provider)
+            if breaker is not None and breaker.is_open():
+                return 2
+            if m.fallback:
+                return 1
+            if tracker.tail_latency_ms(m.provider, m.model, m.max_latency_ms) > m.max_latency_ms:
+                return 1
+            return 0
+
+        return sorted(models, key=lambda m: (tier(m), score(m)))
+
+    async def _route_hedged(
+        self,
+        task_type: TaskType,
+        candidates: List[ModelConfig],
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> ModelResponse:
+        """
+        Call candidates in order, hedging slow calls with the next candidate.
+
+        Once the newest in-flight call passes its model's p95 latency a backup
+        is started on the next candidate (at most max_hedges times); the first
+        success is returned and the remaining calls are cancelled. A call that
+        fails with CircuitBreakerError or RetryExhaustedError immediately
+        hands over to the next candidate, as in fixed-order routing.
+
+        Raises:
+            RuntimeError: If every candidate failed
+        """
+        self.hedge_stats["requests"] += 1
+        in_flight: Dict[asyncio.Task, ModelConfig] = {}
+        next_index = 0
+        hedges = 0
+
+        def launch() -> ModelConfig:
+            nonlocal next_index
+            config = candidates[next_index]
+            next_index += 1
+            task = asyncio.create_task(
+                self._tracked_call(config, prompt, system_prompt, temperature, max_tokens)
+            )
+            in_flight[task] = config
+            return config
+
+        latest = launch()
+        try:
+            while in_flight:
+                timeout = None
+                if self.hedging and hedges < self.max_hedges and next_index < len(candidates):
+                    timeout = self.latency_tracker.hedge_delay_ms(
+                        latest.provider, latest.model, latest.max_latency_ms
+                    ) / 1000
+
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedges += 1
+                    self.hedge_stats["hedges_fired"] += 1
+                    logger.info(
+                        f"Hedging {latest.provider}/{latest.model} after {timeout * 1000:.0f}ms "
+                        f"with {candidates[next_index].provider}/{candidates[next_index].model}"
+                    )
+                    latest = launch()
+                    continue
+
+                for task in done:
+                    config = in_flight.pop(task)
+                    try:
+                        response = task.result()
+                    except (CircuitBreakerError, RetryExhaustedError) as e:
+                        logger.warning(
+                            f"Adaptive route {config.provider}/{config.model} failed: {e}"
+                        )
+                        continue
+
+                    response.fallback_used = config.fallback
+                    response.hedged = hedges > 0
+                    if hedges > 0 and config is not candidates[0]:
+                        self.hedge_stats["hedges_won"] += 1
+                    return response
+
+                if not in_flight and next_index < len(candidates):
+                    latest = launch()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        raise RuntimeError(
+            f"All models failed for task type {task_type}. "
+            f"Check circuit breaker status."
+        )
+
+    async def _tracked_call(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> ModelResponse:
+        """_call_model that feeds the latency tracker (including cancelled hedge losers)."""
+        start_time = time.monotonic()
+        try:
+            response = await self._call_model(
+                config, prompt, system_prompt, temperature, max_tokens
+            )
+        except asyncio.CancelledError:
+            self.latency_tracker.record_cancelled(
+                config.provider, config.model, (time.monotonic() - start_time) * 1000
+            )
+            raise
+        except CircuitBreakerError:
+            raise
+        except Exception:
+            self.latency_tracker.record_failure(
+                config.provider, config.model, (time.monotonic() - start_time) * 1000
+            )
+            raise
+
+        self.latency_tracker.record_success(
+            config.provider, config.model, (time.monotonic() - start_time) * 1000, response.cost_usd
+        )
+        return response
+
     def _filter_by_constraints(
         self,
         models: List[ModelConfig],
@@ -499,6 +709,15 @@ class ModelRouter:
                     chunk["metadata"]["provider"] = config.provider
                     chunk["metadata"]["model"] = config.model
                     chunk["metadata"]["latency_ms"] = int((time.time() - start_time) * 1000)
+                    tokens = chunk["metadata"].get("tokens_used", {})
+                    observe_llm_call(
+                        config.provider,
+                        config.model,
+                        time.time() - start_time,
+                        prompt_tokens=tokens.get("prompt"),
+                        completion_tokens=tokens.get("completion"),
+                        cost_usd=chunk["metadata"].get("cost_usd")
+                    )
                 else:
                     # For token chunks, add at top level
                     chunk["provider"] = config.provider
@@ -512,6 +731,7 @@ class ModelRouter:
 
         except Exception as e:
             latency_ms = int((time.time() - start_time) * 1000)
+            observe_llm_call(config.provider, config.model, latency_ms / 1000, success=False)
             logger.error(
                 f"Streaming call failed: {config.provider}/{config.model} "
                 f"after {latency_ms}ms - {type(e).__name__}: {str(e)}"
@@ -551,6 +771,14 @@ class ModelRouter:
 
             latency_ms = int((time.time() - start_time) * 1000)
             response.latency_ms = latency_ms
+            observe_llm_call(
+                config.provider,
+                config.model,
+                latency_ms / 1000,
+                prompt_tokens=response.tokens_used.get("prompt"),
+                completion_tokens=response.tokens_used.get("completion"),
+                cost_usd=response.cost_usd
+            )
 
             logger.info(
                 f"Model call succeeded: {config.provider}/{config.model} "
@@ -561,6 +789,7 @@ class ModelRouter:
 
         except Exception as e:
             latency_ms = int((time.time() - start_time) * 1000)
+            observe_llm_call(config.provider, config.model, latency_ms / 1000, success=False)
             logger.error(
                 f"Model call failed: {config.provider}/{config.model} "
                 f"after {latency_ms}ms - {type(e).__name__}: {str(e)}"
@@ -976,6 +1205,12 @@ class ModelRouter:
                 name: strategy.get_config()
                 for name, strategy in self.retry_strategies.items()
             },
+            "adaptive": {
+                "enabled": self.adaptive,
+                "hedging": self.hedging,
+                "hedge_stats": dict(self.hedge_stats),
+                "models": self.latency_tracker.get_status(),
+            },
             "routing_rules": {
                 task_type.value: [
                     {
@@ -1,6 +1,7 @@
 """Outreach campaign services package"""
 
 from app.services.outreach.message_generator import MessageGenerator
+from app.services.outreach.generation_engine import CampaignGenerationEngine
 from app.services.outreach.campaign_service import CampaignService
 
-__all__ = ["MessageGenerator", "CampaignService"]
+__all__ = ["MessageGenerator", "CampaignGenerationEngine", "CampaignService"]
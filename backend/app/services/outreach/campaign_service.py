@@ -4,8 +4,9 @@ Campaign Orchestration Service
 Manages campaign lifecycle, message generation, A/B testing, and analytics.
 """
 
+import asyncio
 import os
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import func
@@ -21,6 +22,8 @@ from app.models.campaign import (
 )
 from app.models.lead import Lead
 from app.services.outreach.message_generator import MessageGenerator
+from app.services.outreach.generation_engine import CampaignGenerationEngine, campaign_lead_filters
+from app.services.cache.campaign_analytics_cache import CampaignAnalyticsCache
 from app.core.logging import setup_logging
 from app.core.exceptions import (
     ValidationError,
@@ -37,20 +40,22 @@ class CampaignService:
     
     Features:
     - Campaign creation with audience targeting
-    - Bulk message generation with 3 variants per lead
-    - A/B testing analytics and variant performance tracking
+    - Bulk message generation with 3 variants per lead (concurrent, cached, resumable)
+    - A/B testing analytics and variant performance tracking (optionally cached in Redis)
     - Campaign activation and status management
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, analytics_cache: Optional[CampaignAnalyticsCache] = None):
         """
         Initialize campaign service.
         
         Args:
             db: SQLAlchemy database session
+            analytics_cache: Optional Redis snapshot cache for campaign analytics
         """
         self.db = db
         self.message_generator = MessageGenerator()
+        self.analytics_cache = analytics_cache
     
     def create_campaign(
         self,
@@ -107,22 +112,20 @@ class CampaignService:
         
         return campaign
     
-    def generate_messages(
+    def prepare_generation(
         self,
         campaign_id: int,
-        custom_context: Optional[str] = None,
         force_regenerate: bool = False
-    ) -> Dict[str, Any]:
+    ) -> int:
         """
-        Generate personalized messages for all qualified leads in campaign.
+        Validate a generation request and clear old messages if regenerating.
         
         Args:
             campaign_id: Campaign ID
-            custom_context: Override campaign's custom_context for this generation
             force_regenerate: Regenerate messages even if they already exist
         
         Returns:
-            Dictionary with generation statistics
+            Number of leads matching the campaign's targeting
         
         Raises:
             ResourceNotFoundError: If campaign not found
@@ -148,34 +151,12 @@ class CampaignService:
                 context={"campaign_id": campaign_id, "existing_messages": existing_count}
             )
         
-        # Delete existing messages if force regenerating
-        if force_regenerate and existing_count > 0:
-            self.db.query(CampaignMessage).filter(
-                CampaignMessage.campaign_id == campaign_id
-            ).delete()
-            logger.info(f"Deleted {existing_count} existing messages for campaign {campaign_id}")
-        
-        # Build lead query with targeting filters
-        leads_query = self.db.query(Lead)
-        
-        if campaign.min_qualification_score is not None:
-            leads_query = leads_query.filter(
-                Lead.qualification_score >= campaign.min_qualification_score
-            )
-        
-        if campaign.target_industries:
-            leads_query = leads_query.filter(
-                Lead.industry.in_(campaign.target_industries)
-            )
-        
-        if campaign.target_company_sizes:
-            leads_query = leads_query.filter(
-                Lead.company_size.in_(campaign.target_company_sizes)
-            )
+        # Count leads matching the targeting filters
+        lead_count = self.db.query(func.count(Lead.id)).filter(
+            *campaign_lead_filters(campaign)
+        ).scalar()
         
-        qualified_leads = leads_query.all()
-        
-        if not qualified_leads:
+        if not lead_count:
             raise ValidationError(
                 "No qualified leads found matching campaign criteria",
                 context={
@@ -186,82 +167,91 @@ class CampaignService:
                 }
             )
         
-        # Generate messages for each lead
-        stats = {
-            "messages_generated": 0,
-            "leads_processed": len(qualified_leads),
-            "total_cost": 0.0,
-            "failed": 0
-        }
+        # Delete existing messages if force regenerating (see aprepare_generation()
+        # for the variant that also invalidates the cached analytics snapshot)
+        if force_regenerate and existing_count > 0:
+            self.db.query(CampaignMessage).filter(
+                CampaignMessage.campaign_id == campaign_id
+            ).delete()
+            campaign.total_messages = 0
+            campaign.total_cost = 0.0
+            self.db.commit()
+            logger.info(f"Deleted {existing_count} existing messages for campaign {campaign_id}")
         
-        context_to_use = custom_context if custom_context is not None else campaign.custom_context
+        return lead_count
+    
+    async def aprepare_generation(
+        self,
+        campaign_id: int,
+        force_regenerate: bool = False
+    ) -> int:
+        """
+        prepare_generation() that also invalidates the cached analytics snapshot.
+        """
+        lead_count = self.prepare_generation(campaign_id, force_regenerate)
+        if force_regenerate:
+            await self._invalidate_analytics(campaign_id)
+        return lead_count
+    
+    async def agenerate_messages(
+        self,
+        campaign_id: int,
+        custom_context: Optional[str] = None,
+        force_regenerate: bool = False,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        prepared: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Generate personalized messages for all qualified leads in campaign.
         
-        for lead in qualified_leads:
-            try:
-                # Build lead context
-                lead_context = {
-                    "company_name": lead.company_name,
-                    "contact_name": lead.contact_name,
-                    "contact_title": lead.contact_title,
-                    "contact_email": lead.contact_email,
-                    "qualification_score": lead.qualification_score,
-                    "research_summary": lead.qualification_reasoning,
-                    "industry": lead.industry,
-                    "company_size": lead.company_size
-                }
-                
-                # Generate 3 variants
-                result = self.message_generator.generate_message_variants(
-                    channel=campaign.channel.value,
-                    lead_context=lead_context,
-                    custom_context=context_to_use,
-                    template=campaign.message_template
-                )
-                
-                # Create message record
-                message = CampaignMessage(
-                    campaign_id=campaign_id,
-                    lead_id=lead.id,
-                    variants=result["variants"],
-                    selected_variant=0,  # Default to first variant
-                    status=MessageStatus.PENDING,
-                    generation_cost=result["cost_usd"]
-                )
-                self.db.add(message)
-                self.db.flush()  # Get message.id for analytics
-                
-                # Create analytics records for each variant
-                for i, variant in enumerate(result["variants"]):
-                    analytics = MessageVariantAnalytics(
-                        message_id=message.id,
-                        variant_number=i,
-                        tone=MessageTone(variant["tone"]),
-                        subject=variant.get("subject"),
-                        body=variant["body"]
-                    )
-                    self.db.add(analytics)
-                
-                stats["messages_generated"] += 1
-                stats["total_cost"] += result["cost_usd"]
-                
-            except Exception as e:
-                logger.error(f"Failed to generate message for lead {lead.id}: {e}")
-                stats["failed"] += 1
-                continue
+        Leads are streamed in chunks and generated concurrently; identical
+        lead profiles share one LLM call. Large campaigns should use the
+        generate_campaign_messages Celery task instead (see the API).
         
-        # Update campaign totals
-        campaign.total_messages = stats["messages_generated"]
-        campaign.total_cost = stats["total_cost"]
+        Args:
+            campaign_id: Campaign ID
+            custom_context: Override campaign's custom_context for this generation
+            force_regenerate: Regenerate messages even if they already exist
+            progress_callback: Called with progress counters after each chunk
+            prepared: aprepare_generation() already validated this request
+                (and cleared old messages), so skip doing it again
         
-        self.db.commit()
+        Returns:
+            Dictionary with generation statistics
+        
+        Raises:
+            ResourceNotFoundError: If campaign not found
+            ResourceConflictError: If messages already exist and force_regenerate=False
+            ValidationError: If no qualified leads found
+        """
+        if not prepared:
+            await self.aprepare_generation(campaign_id, force_regenerate)
+        
+        engine = CampaignGenerationEngine(
+            self.db, self.message_generator, analytics_cache=self.analytics_cache
+        )
+        stats = await engine.run(campaign_id, custom_context, progress_callback)
         
         logger.info(
             f"Generated {stats['messages_generated']} messages for campaign {campaign_id} "
-            f"(Cost: ${stats['total_cost']:.4f})"
+            f"(Cost: ${stats['total_cost']:.4f}, cache hits: {stats['cache_hits']})"
         )
         
         return stats
     
+    def generate_messages(
+        self,
+        campaign_id: int,
+        custom_context: Optional[str] = None,
+        force_regenerate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around agenerate_messages() for scripts and workers.
+        
+        Must not be called from a running event loop.
+        """
+        return asyncio.run(self.agenerate_messages(campaign_id, custom_context, force_regenerate))
+    
     def get_campaign_analytics(self, campaign_id: int) -> Dict[str, Any]:
         """
         Get comprehensive analytics for a campaign including A/B test results.
@@ -282,27 +272,28 @@ class CampaignService:
                 context={"campaign_id": campaign_id}
             )
         
-        # Get variant performance grouped by tone
+        # Variant performance by tone: one grouped scan over the campaign's analytics rows
+        totals = self.db.query(
+            MessageVariantAnalytics.tone,
+            func.coalesce(func.sum(MessageVariantAnalytics.times_selected), 0),
+            func.coalesce(func.sum(MessageVariantAnalytics.times_opened), 0),
+            func.coalesce(func.sum(MessageVariantAnalytics.times_clicked), 0),
+            func.coalesce(func.sum(MessageVariantAnalytics.times_replied), 0)
+        ).join(
+            CampaignMessage, CampaignMessage.id == MessageVariantAnalytics.message_id
+        ).filter(
+            CampaignMessage.campaign_id == campaign_id
+        ).group_by(MessageVariantAnalytics.tone).all()
+        
+        totals_by_tone = {MessageTone(row[0]): row[1:] for row in totals}
+        
         variant_performance = []
         
         for tone in MessageTone:
-            # Get all analytics for this tone across all campaign messages
-            analytics = self.db.query(MessageVariantAnalytics).filter(
-                MessageVariantAnalytics.message_id.in_(
-                    self.db.query(CampaignMessage.id).filter(
-                        CampaignMessage.campaign_id == campaign_id
-                    )
-                ),
-                MessageVariantAnalytics.tone == tone
-            ).all()
-            
-            if not analytics:
+            if tone not in totals_by_tone:
                 continue
             
-            total_selected = sum(a.times_selected for a in analytics)
-            total_opened = sum(a.times_opened for a in analytics)
-            total_clicked = sum(a.times_clicked for a in analytics)
-            total_replied = sum(a.times_replied for a in analytics)
+            total_selected, total_opened, total_clicked, total_replied = (int(v) for v in totals_by_tone[tone])
             
             variant_performance.append({
                 "tone": tone.value,
@@ -356,6 +347,78 @@ class CampaignService:
             "top_performing_messages": top_performing
         }
     
+    async def aget_campaign_analytics(self, campaign_id: int) -> Dict[str, Any]:
+        """
+        Get campaign analytics as a JSON-serializable snapshot, cached in Redis.
+        
+        Snapshots are served from the analytics cache when configured and
+        invalidated by every write path: aupdate_message_status(),
+        aprepare_generation(), aactivate_campaign() and the generation engine
+        (agenerate_messages() and the background Celery task).
+        Cache errors fall back to computing the analytics.
+        
+        Args:
+            campaign_id: Campaign ID
+        
+        Returns:
+            get_campaign_analytics() result with the campaign as a dict
+        
+        Raises:
+            ResourceNotFoundError: If campaign not found
+        """
+        if self.analytics_cache:
+            try:
+                snapshot = await self.analytics_cache.get_snapshot(campaign_id)
+                if snapshot is not None:
+                    return snapshot
+            except Exception as e:
+                logger.warning(f"Campaign analytics cache read failed for {campaign_id}: {e}")
+        
+        analytics = self.get_campaign_analytics(campaign_id)
+        campaign = analytics["campaign"]
+        snapshot = {
+            **analytics,
+            "campaign": {
+                column.name: getattr(campaign, column.name)
+                for column in Campaign.__table__.columns
+            }
+        }
+        snapshot["campaign"]["status"] = campaign.status.value
+        snapshot["campaign"]["channel"] = campaign.channel.value
+        for field in ("created_at", "updated_at", "activated_at", "completed_at"):
+            value = snapshot["campaign"][field]
+            snapshot["campaign"][field] = value.isoformat() if value else None
+        
+        if self.analytics_cache:
+            try:
+                await self.analytics_cache.set_snapshot(campaign_id, snapshot)
+            except Exception as e:
+                logger.warning(f"Campaign analytics cache write failed for {campaign_id}: {e}")
+        
+        return snapshot
+    
+    async def aupdate_message_status(
+        self,
+        message_id: int,
+        status: str,
+        variant_number: Optional[int] = None
+    ) -> CampaignMessage:
+        """
+        update_message_status() that also invalidates the cached analytics snapshot.
+        """
+        message = self.update_message_status(message_id, status, variant_number)
+        await self._invalidate_analytics(message.campaign_id)
+        return message
+    
+    async def _invalidate_analytics(self, campaign_id: int) -> None:
+        """Drop a campaign's cached analytics snapshot, if caching is configured"""
+        if not self.analytics_cache:
+            return
+        try:
+            await self.analytics_cache.invalidate(campaign_id)
+        except Exception as e:
+            logger.warning(f"Campaign analytics cache invalidation failed for {campaign_id}: {e}")
+    
     def update_message_status(
         self,
         message_id: int,
@@ -477,6 +540,14 @@ class CampaignService:
         logger.info(f"Campaign {campaign_id} activated with {campaign.total_messages} messages")
         return campaign
     
+    async def aactivate_campaign(self, campaign_id: int) -> Campaign:
+        """
+        activate_campaign() that also invalidates the cached analytics snapshot.
+        """
+        campaign = self.activate_campaign(campaign_id)
+        await self._invalidate_analytics(campaign_id)
+        return campaign
+    
     def get_campaign_messages(
         self,
         campaign_id: int,
@@ -0,0 +1,352 @@
+"""
+Campaign Message Generation Engine
+
+Bulk, resumable message generation for large campaigns (5k+ leads):
+- Targeted leads are streamed with ``yield_per`` from a dedicated read
+  session, skipping leads that already have a message in the campaign
+- Prompts are hashed; identical lead profiles (same prompt) share one LLM
+  call through an LRU content-hash cache, concurrent duplicates included
+- Generation runs concurrently with bounded concurrency, optionally paced
+  to the provider's per-minute limits
+- CampaignMessage and MessageVariantAnalytics rows are inserted in bulk and
+  committed once per chunk, so an interrupted run resumes where it stopped
+- Each commit invalidates the campaign's cached analytics snapshot, so the
+  dashboard reflects API and background (Celery) runs alike
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.campaign import (
+    Campaign,
+    CampaignMessage,
+    MessageVariantAnalytics,
+    MessageStatus,
+    MessageTone
+)
+from app.models.lead import Lead
+from app.core.logging import setup_logging
+from app.core.exceptions import ResourceNotFoundError
+
+logger = setup_logging(__name__)
+
+# Lead columns used to build the generation context
+LEAD_CONTEXT_COLUMNS = (
+    Lead.id, Lead.company_name, Lead.contact_name, Lead.contact_title, Lead.contact_email,
+    Lead.qualification_score, Lead.qualification_reasoning, Lead.industry, Lead.company_size
+)
+
+
+def campaign_lead_filters(campaign: Campaign) -> List[Any]:
+    """Lead WHERE clauses for a campaign's audience targeting"""
+    filters = []
+    if campaign.min_qualification_score is not None:
+        filters.append(Lead.qualification_score >= campaign.min_qualification_score)
+    if campaign.target_industries:
+        filters.append(Lead.industry.in_(campaign.target_industries))
+    if campaign.target_company_sizes:
+        filters.append(Lead.company_size.in_(campaign.target_company_sizes))
+    return filters
+
+
+def lead_context_from_row(row: Any) -> Dict[str, Any]:
+    """Generation context for one lead row"""
+    return {
+        "company_name": row["company_name"],
+        "contact_name": row["contact_name"],
+        "contact_title": row["contact_title"],
+        "contact_email": row["contact_email"],
+        "qualification_score": row["qualification_score"],
+        "research_summary": row["qualification_reasoning"],
+        "industry": row["industry"],
+        "company_size": row["company_size"]
+    }
+
+
+@dataclass
+class GenerationProgress:
+    """Running counters for a campaign generation run"""
+    leads_processed: int = 0
+    messages_generated: int = 0
+    failed: int = 0
+    llm_calls: int = 0
+    cache_hits: int = 0
+    tokens_used: int = 0
+    total_cost: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter() - self.started_at) * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed_ms = self.elapsed_ms
+        return {
+            "leads_processed": self.leads_processed,
+            "messages_generated": self.messages_generated,
+            "failed": self.failed,
+            "llm_calls": self.llm_calls,
+            "cache_hits": self.cache_hits,
+            "tokens_used": self.tokens_used,
+            "total_cost": round(self.total_cost, 6),
+            "elapsed_ms": elapsed_ms,
+            "messages_per_second": round(self.messages_generated / (elapsed_ms / 1000), 2) if elapsed_ms > 0 else 0
+        }
+
+
+class CampaignGenerationEngine:
+    """
+    Concurrent, cached, resumable campaign message generation
+
+    Usage:
+        engine = CampaignGenerationEngine(db, MessageGenerator())
+        stats = await engine.run(campaign_id, progress_callback=report)
+
+    Leads whose generation fails get no message and are retried by the
+    next run for the same campaign.
+    """
+
+    MAX_CONCURRENCY = 8  # In-flight LLM requests
+    CHUNK_SIZE = 500  # Leads per streamed batch / bulk insert / commit
+    CACHE_SIZE = 10_000  # Generated results kept by prompt hash
+    EST_TOKENS_PER_MESSAGE = 1200  # Prompt + 3 variants, for pacing
+
+    def __init__(
+        self,
+        db: Session,
+        message_generator: Any,
+        max_concurrency: int = MAX_CONCURRENCY,
+        chunk_size: int = CHUNK_SIZE,
+        cache_size: int = CACHE_SIZE,
+        pacer: Optional[Any] = None,
+        analytics_cache: Optional[Any] = None
+    ):
+        """
+        Initialize generation engine.
+
+        Args:
+            db: Session used for campaign reads and bulk writes
+            message_generator: MessageGenerator (or any object with
+                build_variant_prompt() and async agenerate_from_prompt())
+            max_concurrency: Max concurrent LLM requests
+            chunk_size: Leads per streamed batch and commit
+            cache_size: Max generated results cached by prompt hash
+            pacer: Optional ProviderPacer for per-minute provider limits
+            analytics_cache: Optional CampaignAnalyticsCache to invalidate on writes
+        """
+        self.db = db
+        self.message_generator = message_generator
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.pacer = pacer
+        self.analytics_cache = analytics_cache
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def pending_leads_query(self, campaign: Campaign):
+        """Targeted leads that do not have a message in the campaign yet"""
+        has_message = exists().where(
+            CampaignMessage.campaign_id == campaign.id,
+            CampaignMessage.lead_id == Lead.id
+        )
+        return select(*LEAD_CONTEXT_COLUMNS).where(*campaign_lead_filters(campaign), ~has_message)
+
+    async def run(
+        self,
+        campaign_id: int,
+        custom_context: Optional[str] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate messages for every targeted lead still missing one.
+
+        Args:
+            campaign_id: Campaign ID
+            custom_context: Override campaign's custom_context for this run
+            progress_callback: Called with progress counters after each chunk
+
+        Returns:
+            Final counters including messages_per_second
+
+        Raises:
+            ResourceNotFoundError: If campaign not found
+        """
+        campaign = self.db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        if not campaign:
+            raise ResourceNotFoundError(
+                f"Campaign {campaign_id} not found",
+                context={"campaign_id": campaign_id}
+            )
+
+        channel = campaign.channel.value
+        template = campaign.message_template
+        context_to_use = custom_context if custom_context is not None else campaign.custom_context
+
+        progress = GenerationProgress()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Commits below would invalidate a server-side cursor on the write session
+        stream_db = Session(bind=self.db.get_bind())
+        try:
+            stmt = self.pending_leads_query(campaign).order_by(Lead.id).execution_options(yield_per=self.chunk_size)
+            for rows in stream_db.execute(stmt).mappings().partitions():
+                contexts = [lead_context_from_row(row) for row in rows]
+                prompts = [
+                    self.message_generator.build_variant_prompt(channel, context, context_to_use, template)
+                    for context in contexts
+                ]
+                outcomes = await asyncio.gather(
+                    *(self._generate(prompt, channel, semaphore, progress) for prompt in prompts)
+                )
+
+                generated = []
+                for row, context, (result, cost, error) in zip(rows, contexts, outcomes):
+                    if error:
+                        logger.error(f"Failed to generate message for lead {row['id']}: {error}")
+                        progress.failed += 1
+                        continue
+                    generated.append((row["id"], context, result, cost))
+                    progress.total_cost += cost
+
+                self._insert_messages(campaign.id, generated)
+                self.db.commit()
+                if generated:
+                    await self._invalidate_analytics(campaign.id)
+
+                progress.leads_processed += len(rows)
+                progress.messages_generated += len(generated)
+                if progress_callback:
+                    progress_callback(progress.as_dict())
+        finally:
+            stream_db.close()
+
+        self._refresh_campaign_totals(campaign)
+        await self._invalidate_analytics(campaign.id)
+
+        stats = progress.as_dict()
+        logger.info(f"Campaign {campaign_id} generation complete: {stats}")
+        return stats
+
+    async def _generate(
+        self,
+        prompt: str,
+        channel: str,
+        semaphore: asyncio.Semaphore,
+        progress: GenerationProgress
+    ) -> Tuple[Optional[Dict[str, Any]], float, Optional[str]]:
+        """
+        Generate (or reuse) variants for one prompt
+
+        Returns (result, cost attributed to this message, error). Only the
+        message that triggered the LLM call carries its cost; failures are
+        returned, not raised.
+        """
+        key = hashlib.sha256(f"{channel}\0{prompt}".encode()).hexdigest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            progress.cache_hits += 1
+            return cached, 0.0, None
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                result = await asyncio.shield(pending)
+            except Exception as e:
+                return None, 0.0, str(e)
+            progress.cache_hits += 1
+            return result, 0.0, None
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            async with semaphore:
+                if self.pacer:
+                    await self.pacer.acquire(self.EST_TOKENS_PER_MESSAGE)
+                result = await self.message_generator.agenerate_from_prompt(prompt, channel)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            return None, 0.0, str(e)
+        finally:
+            self._in_flight.pop(key, None)
+
+        future.set_result(result)
+        progress.llm_calls += 1
+        progress.tokens_used += result.get("tokens_used", 0)
+
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result, result["cost_usd"], None
+
+    def _insert_messages(
+        self,
+        campaign_id: int,
+        generated: List[Tuple[int, Dict[str, Any], Dict[str, Any], float]]
+    ) -> None:
+        """Insert a chunk's messages and their variant analytics rows in bulk"""
+        if not generated:
+            return
+
+        self.db.execute(insert(CampaignMessage), [
+            {
+                "campaign_id": campaign_id,
+                "lead_id": lead_id,
+                "variants": result["variants"],
+                "selected_variant": 0,  # Default to first variant
+                "status": MessageStatus.PENDING,
+                "personalization_data": context,
+                "generation_cost": cost
+            }
+            for lead_id, context, result, cost in generated
+        ])
+
+        # Each lead has at most one message per campaign (pending leads only)
+        message_ids = dict(self.db.execute(
+            select(CampaignMessage.lead_id, CampaignMessage.id).where(
+                CampaignMessage.campaign_id == campaign_id,
+                CampaignMessage.lead_id.in_([lead_id for lead_id, _, _, _ in generated])
+            )
+        ).all())
+
+        self.db.execute(insert(MessageVariantAnalytics), [
+            {
+                "message_id": message_ids[lead_id],
+                "variant_number": i,
+                "tone": MessageTone(variant["tone"]),
+                "subject": variant.get("subject"),
+                "body": variant["body"]
+            }
+            for lead_id, _, result, _ in generated
+            for i, variant in enumerate(result["variants"])
+        ])
+
+    async def _invalidate_analytics(self, campaign_id: int) -> None:
+        """Drop the campaign's cached analytics snapshot, if caching is configured"""
+        if not self.analytics_cache:
+            return
+        try:
+            await self.analytics_cache.invalidate(campaign_id)
+        except Exception as e:
+            logger.warning(f"Campaign analytics cache invalidation failed for {campaign_id}: {e}")
+
+    def _refresh_campaign_totals(self, campaign: Campaign) -> None:
+        """Recount campaign totals from stored messages (correct across resumed runs)"""
+        total_messages, total_cost = self.db.query(
+            func.count(CampaignMessage.id),
+            func.coalesce(func.sum(CampaignMessage.generation_cost), 0.0)
+        ).filter(CampaignMessage.campaign_id == campaign.id).one()
+
+        campaign.total_messages = total_messages
+        campaign.total_cost = float(total_cost)
+        self.db.commit()
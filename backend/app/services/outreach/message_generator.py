@@ -7,7 +7,7 @@ Generates personalized outreach messages with 3 variants for A/B testing using C
 import os
 import time
 from typing import Dict, List, Optional, Any
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import re
 
 from app.core.logging import setup_logging
@@ -47,6 +47,11 @@ class MessageGenerator:
             api_key=self.api_key,
             base_url=self.api_base
         )
+        # Async client for concurrent bulk generation (CampaignGenerationEngine)
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_base
+        )
         
         # Default model (llama3.1-8b for sub-1s inference)
         self.default_model = os.getenv("CEREBRAS_DEFAULT_MODEL", "llama3.1-8b")
@@ -73,40 +78,12 @@ class MessageGenerator:
         start_time = time.time()
         
         # Build prompt for variant generation
-        prompt = self._build_variant_prompt(channel, lead_context, custom_context, template)
+        prompt = self.build_variant_prompt(channel, lead_context, custom_context, template)
         
         try:
             # Single API call generates all 3 variants
-            response = self.client.chat.completions.create(
-                model=self.default_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert sales copywriter specializing in personalized outreach."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=800,  # ~200 tokens per variant
-                temperature=0.7
-            )
-            
-            # Extract variants from response
-            content = response.choices[0].message.content
-            variants = self._parse_variants(content, channel)
-            
-            # Calculate metrics
-            latency_ms = int((time.time() - start_time) * 1000)
-            tokens_used = response.usage.total_tokens if hasattr(response, 'usage') else 600
-            cost_usd = (tokens_used / 1_000_000) * self.COST_PER_1M_TOKENS
-            
-            logger.info(
-                f"Generated {len(variants)} variants in {latency_ms}ms "
-                f"({tokens_used} tokens, ${cost_usd:.6f})"
-            )
-            
-            return {
-                "variants": variants,
-                "generation_time_ms": latency_ms,
-                "cost_usd": cost_usd,
-                "tokens_used": tokens_used
-            }
+            response = self.client.chat.completions.create(**self._completion_params(prompt))
+            return self._variants_result(response, channel, start_time)
         
         except Exception as e:
             logger.error(f"Message generation failed: {e}", exc_info=True)
@@ -115,7 +92,69 @@ class MessageGenerator:
                 details={"channel": channel, "lead": lead_context.get("company_name")}
             )
     
-    def _build_variant_prompt(
+    async def agenerate_from_prompt(self, prompt: str, channel: str) -> Dict[str, Any]:
+        """
+        Async variant generation for an already built prompt.
+        
+        Used by bulk campaign generation, which builds (and dedupes) prompts
+        itself and runs many of these concurrently.
+        
+        Args:
+            prompt: Prompt from build_variant_prompt()
+            channel: Communication channel (email, linkedin, sms)
+        
+        Returns:
+            Dict with variants, generation_time_ms, cost_usd and tokens_used
+        """
+        start_time = time.time()
+        
+        try:
+            response = await self.async_client.chat.completions.create(**self._completion_params(prompt))
+            return self._variants_result(response, channel, start_time)
+        
+        except Exception as e:
+            logger.error(f"Message generation failed: {e}")
+            raise CerebrasAPIError(
+                f"Failed to generate message variants: {str(e)}",
+                details={"channel": channel}
+            )
+    
+    def _completion_params(self, prompt: str) -> Dict[str, Any]:
+        """Chat completion arguments for one 3-variant generation"""
+        return {
+            "model": self.default_model,
+            "messages": [
+                {"role": "system", "content": "You are an expert sales copywriter specializing in personalized outreach."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 800,  # ~200 tokens per variant
+            "temperature": 0.7
+        }
+    
+    def _variants_result(self, response: Any, channel: str, start_time: float) -> Dict[str, Any]:
+        """Parse a completion into variants with latency and cost"""
+        # Extract variants from response
+        content = response.choices[0].message.content
+        variants = self._parse_variants(content, channel)
+        
+        # Calculate metrics
+        latency_ms = int((time.time() - start_time) * 1000)
+        tokens_used = response.usage.total_tokens if hasattr(response, 'usage') else 600
+        cost_usd = (tokens_used / 1_000_000) * self.COST_PER_1M_TOKENS
+        
+        logger.info(
+            f"Generated {len(variants)} variants in {latency_ms}ms "
+            f"({tokens_used} tokens, ${cost_usd:.6f})"
+        )
+        
+        return {
+            "variants": variants,
+            "generation_time_ms": latency_ms,
+            "cost_usd": cost_usd,
+            "tokens_used": tokens_used
+        }
+    
+    def build_variant_prompt(
         self,
         channel: str,
         lead_context: Dict[str, Any],
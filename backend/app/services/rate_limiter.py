@@ -2,10 +2,16 @@
 Redis-based rate limiting with sliding window algorithm.
 
 Provides distributed rate limiting for API providers with request and token-based limits.
+
+AtomicRateLimiter checks and records in a single Lua script call, so concurrent
+API and Celery workers can't overshoot a provider quota, and can lease blocks
+of capacity per process to cut Redis round trips under heavy load.
 """
 import asyncio
 import time
 import hashlib
+import math
+import uuid
 from typing import Optional, Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -40,6 +46,10 @@ PROVIDER_LIMITS = {
         "requests_per_minute": 30,
         "tokens_per_minute": 50_000,
     },
+    "apollo": {
+        "requests_per_minute": 50,
+        "tokens_per_minute": None,  # Billed in credits, not tokens
+    },
 }
 
 
@@ -53,6 +63,7 @@ class RateLimitResult:
     reset_time: float  # Unix timestamp
     retry_after: Optional[int] = None  # Seconds until retry allowed
     headers: Dict[str, str] = None
+    reservation: Optional["RateLimitReservation"] = None  # Set by AtomicRateLimiter
 
     def __post_init__(self):
         """Generate HTTP headers."""
@@ -368,6 +379,51 @@ class RateLimiter:
             logger.error(f"Redis error in _check_token_limit: {e}")
             raise
 
+    async def pause(self, user_id: str, provider: str, seconds: float) -> None:
+        """
+        Hold all requests for a user and provider, e.g. when the upstream API
+        reports an exhausted quota (429 / Retry-After) that our window missed.
+
+        Args:
+            user_id: User identifier
+            provider: Provider name
+            seconds: How long to pause (an existing longer pause is kept)
+        """
+        milliseconds = int(seconds * 1000)
+        if milliseconds <= 0:
+            return
+
+        key = self._pause_key(user_id, provider)
+        try:
+            async with asyncio.timeout(self.timeout):
+                if milliseconds > await self.redis.pttl(key):
+                    await self.redis.set(key, 1, px=milliseconds)
+            logger.warning(f"Paused {provider} requests for {seconds:.1f}s")
+        except (asyncio.TimeoutError, RedisError, RedisConnectionError) as e:
+            logger.error(f"Redis error pausing {provider} requests: {e}")
+
+    async def paused_for(self, user_id: str, provider: str) -> float:
+        """
+        Seconds left on a pause set by pause() (0 if none; fails open).
+
+        Args:
+            user_id: User identifier
+            provider: Provider name
+
+        Returns:
+            Remaining pause in seconds
+        """
+        try:
+            async with asyncio.timeout(self.timeout):
+                remaining_ms = await self.redis.pttl(self._pause_key(user_id, provider))
+        except (asyncio.TimeoutError, RedisError, RedisConnectionError) as e:
+            logger.error(f"Redis error reading {provider} pause: {e}")
+            return 0.0
+        return max(0, remaining_ms) / 1000.0
+
+    def _pause_key(self, user_id: str, provider: str) -> str:
+        return f"rate_limit:{self._hash_user_id(user_id)}:{provider.lower()}:paused"
+
     def _hash_user_id(self, user_id: str) -> str:
         """
         Hash user ID for privacy.
@@ -458,3 +514,546 @@ class RateLimiter:
         except (RedisError, RedisConnectionError) as e:
             logger.error(f"Error getting rate limit status: {e}")
             return {"error": str(e)}
+
+
+WINDOW_SECONDS = 60
+
+# Shared by the scripts: grants are sorted-set members "<id>:<requests>:<tokens>"
+# scored by Redis server time (one clock for every worker). KEYS[2] is a hash
+# of running totals so a check only reads the grants that just expired.
+_WINDOW_LUA = """
+local function weights(member)
+    local r, tk = string.match(member, ':(%d+):(%d+)$')
+    return tonumber(r), tonumber(tk)
+end
+
+local function now_seconds()
+    local t = redis.call('TIME')
+    return tonumber(t[1]) + tonumber(t[2]) / 1000000
+end
+
+local function adjust(totals, requests, tokens)
+    redis.call('HINCRBY', totals, 'requests', requests)
+    redis.call('HINCRBY', totals, 'tokens', tokens)
+end
+
+local function add_grant(key, totals, score, member, ttl)
+    local r, tk = weights(member)
+    redis.call('ZADD', key, score, member)
+    adjust(totals, r, tk)
+    redis.call('EXPIRE', key, ttl)
+    redis.call('EXPIRE', totals, ttl)
+end
+
+-- Swap a grant for its settled replacement ('' drops it); returns false if absent
+local function replace_grant(key, totals, member, replacement, ttl)
+    local score = redis.call('ZSCORE', key, member)
+    if not score then
+        return false
+    end
+    local r, tk = weights(member)
+    redis.call('ZREM', key, member)
+    adjust(totals, -r, -tk)
+    if replacement ~= '' then
+        add_grant(key, totals, score, replacement, ttl)
+    end
+    return true
+end
+
+-- Drop expired grants and return the window's (requests, tokens) in use
+local function window_usage(key, totals, now, window)
+    local cutoff = now - window
+    if redis.call('EXISTS', totals) == 0 then
+        -- Totals lost (eviction): rebuild from the live grants
+        redis.call('ZREMRANGEBYSCORE', key, '-inf', cutoff)
+        for _, member in ipairs(redis.call('ZRANGE', key, 0, -1)) do
+            local r, tk = weights(member)
+            adjust(totals, r, tk)
+        end
+    else
+        for _, member in ipairs(redis.call('ZRANGEBYSCORE', key, '-inf', cutoff)) do
+            local r, tk = weights(member)
+            adjust(totals, -r, -tk)
+        end
+        redis.call('ZREMRANGEBYSCORE', key, '-inf', cutoff)
+    end
+    local used = redis.call('HMGET', totals, 'requests', 'tokens')
+    return tonumber(used[1]) or 0, tonumber(used[2]) or 0
+end
+"""
+
+# Check and record in one step. An optional lease being returned (ARGV[9]) is
+# swapped for its consumed-only replacement (ARGV[10]) in the same round trip.
+_ACQUIRE_SCRIPT = _WINDOW_LUA + """
+local key, totals = KEYS[1], KEYS[2]
+local window = tonumber(ARGV[1])
+local request_limit = tonumber(ARGV[2])
+local token_limit = tonumber(ARGV[3])
+local want_requests = tonumber(ARGV[4])
+local want_tokens = tonumber(ARGV[5])
+local min_requests = tonumber(ARGV[6])
+local min_tokens = tonumber(ARGV[7])
+local ttl = window * 2
+
+local now = now_seconds()
+if ARGV[9] ~= '' then
+    replace_grant(key, totals, ARGV[9], ARGV[10], ttl)
+end
+
+local used_requests, used_tokens = window_usage(key, totals, now, window)
+local free_requests = request_limit - used_requests
+local free_tokens = want_tokens
+if token_limit >= 0 then
+    free_tokens = token_limit - used_tokens
+end
+
+if free_requests >= min_requests and free_tokens >= min_tokens then
+    local grant_requests = math.min(want_requests, free_requests)
+    local grant_tokens = math.min(want_tokens, free_tokens)
+    add_grant(key, totals, now, ARGV[8] .. ':' .. grant_requests .. ':' .. grant_tokens, ttl)
+    return {1, grant_requests, grant_tokens, free_requests - grant_requests, free_tokens - grant_tokens, 0}
+end
+
+-- Denied: find when enough of the oldest grants will have left the window
+local retry_ms = window * 1000
+local freed_requests, freed_tokens = 0, 0
+local entries = redis.call('ZRANGE', key, 0, -1, 'WITHSCORES')
+for i = 1, #entries, 2 do
+    local r, tk = weights(entries[i])
+    freed_requests = freed_requests + r
+    freed_tokens = freed_tokens + tk
+    if free_requests + freed_requests >= min_requests and free_tokens + freed_tokens >= min_tokens then
+        retry_ms = math.ceil((tonumber(entries[i + 1]) + window - now) * 1000)
+        break
+    end
+end
+return {0, 0, 0, math.max(free_requests, 0), math.max(free_tokens, 0), retry_ms}
+"""
+
+# Replace a grant with its settled weights (ARGV[2], '' drops it), keeping its
+# place in the window. With ARGV[3] == '1' a missing grant is added at now.
+_SETTLE_SCRIPT = _WINDOW_LUA + """
+local key, totals = KEYS[1], KEYS[2]
+local ttl = tonumber(ARGV[4])
+if replace_grant(key, totals, ARGV[1], ARGV[2], ttl) then
+    return 1
+end
+if ARGV[3] == '1' and ARGV[2] ~= '' then
+    add_grant(key, totals, now_seconds(), ARGV[2], ttl)
+    return 1
+end
+return 0
+"""
+
+
+@dataclass
+class RateLimitReservation:
+    """Capacity charged to the shared window by one AtomicRateLimiter check."""
+
+    key: str
+    member_id: str
+    requests: int
+    tokens: int
+    leased: bool = False
+    settled: bool = False
+
+    @property
+    def member(self) -> str:
+        return f"{self.member_id}:{self.requests}:{self.tokens}"
+
+
+@dataclass
+class _Lease:
+    """Block of window capacity reserved in Redis and handed out in-process."""
+
+    key: str
+    member_id: str
+    requests: int
+    tokens: int
+    requests_left: int
+    tokens_left: int
+    expires_at: float  # time.monotonic()
+    reset_time: float
+
+    @property
+    def member(self) -> str:
+        return f"{self.member_id}:{self.requests}:{self.tokens}"
+
+    def covers(self, tokens: int) -> bool:
+        return (
+            self.requests_left > 0
+            and self.tokens_left >= tokens
+            and time.monotonic() < self.expires_at
+        )
+
+    def consumed_member(self) -> str:
+        """Member recording only what was used ('' if nothing was)."""
+        used_requests = self.requests - self.requests_left
+        used_tokens = max(0, self.tokens - self.tokens_left)
+        if used_requests == 0 and used_tokens == 0:
+            return ""
+        return f"{self.member_id}:{used_requests}:{used_tokens}"
+
+
+class AtomicRateLimiter(RateLimiter):
+    """
+    Rate limiter that checks and records in a single Redis round trip.
+
+    RateLimiter checks the window and relies on a later record_request, so
+    concurrent workers can all pass the check before any of them records.
+    Here a Lua script enforces the request and token windows from
+    PROVIDER_LIMITS and charges the grant atomically; settle() then refunds
+    (or charges) the difference between estimated and actual tokens.
+
+    With lease_requests > 0 each process reserves a block of requests/tokens
+    per user and provider and serves checks from it locally, returning the
+    unused part when the lease is renewed, expires or close() is called.
+    Leased capacity counts against the shared window while held, so leases
+    can never overshoot the quota; they can only delay other workers.
+
+    Usage:
+        limiter = AtomicRateLimiter(redis_client, lease_requests=10, lease_tokens=20_000)
+        result = await limiter.check_rate_limit("worker", "cerebras", "/qualify", estimated_tokens=800)
+        if not result.allowed:
+            raise RateLimitExceeded(result, "cerebras")
+        ...
+        await limiter.settle(result, tokens_used=usage.total_tokens)
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        fail_open: bool = True,
+        timeout_ms: int = 100,
+        lease_requests: int = 0,
+        lease_tokens: int = 0,
+        lease_seconds: float = 2.0,
+    ):
+        """
+        Initialize atomic rate limiter.
+
+        Args:
+            redis_client: Async Redis client instance
+            fail_open: Allow requests on Redis errors (default: True)
+            timeout_ms: Redis operation timeout in milliseconds (default: 100)
+            lease_requests: Requests reserved per lease (0 disables leasing)
+            lease_tokens: Tokens reserved per lease (raised to the request's estimate)
+            lease_seconds: How long a process may hold a lease before returning it
+        """
+        super().__init__(redis_client, fail_open=fail_open, timeout_ms=timeout_ms)
+        self.lease_requests = lease_requests
+        self.lease_tokens = lease_tokens
+        self.lease_seconds = lease_seconds
+
+        self._acquire_script = redis_client.register_script(_ACQUIRE_SCRIPT)
+        self._settle_script = redis_client.register_script(_SETTLE_SCRIPT)
+        self._leases: Dict[str, _Lease] = {}
+        self._lease_locks: Dict[str, asyncio.Lock] = {}
+
+    async def check_rate_limit(
+        self,
+        user_id: str,
+        provider: str,
+        endpoint: str,
+        estimated_tokens: int = 0,
+    ) -> RateLimitResult:
+        """
+        Check the rate limit and, if allowed, record the request.
+
+        Args:
+            user_id: User identifier (API key hash or IP address)
+            provider: AI provider name (cerebras, openrouter, etc.)
+            endpoint: API endpoint being called
+            estimated_tokens: Estimated token count, reserved until settle()
+
+        Returns:
+            RateLimitResult; allowed results carry the reservation for settle()
+        """
+        provider_limits = self.limits.get(provider.lower())
+        if not provider_limits:
+            logger.warning(f"Unknown provider '{provider}', allowing request")
+            return RateLimitResult(
+                allowed=True,
+                requests_remaining=999,
+                tokens_remaining=None,
+                reset_time=time.time() + WINDOW_SECONDS,
+            )
+
+        key = self._window_key(user_id, provider)
+        estimated_tokens = max(0, estimated_tokens)
+
+        try:
+            if self.lease_requests > 0:
+                return await self._check_leased(key, provider, provider_limits, estimated_tokens)
+
+            async with asyncio.timeout(self.timeout):
+                return await self._acquire(
+                    key, provider, provider_limits,
+                    requests=1, tokens=estimated_tokens,
+                    min_requests=1, min_tokens=estimated_tokens,
+                )
+
+        except asyncio.TimeoutError:
+            logger.error(f"Redis timeout ({self.timeout}s) checking rate limit")
+            return self._handle_redis_error("timeout")
+
+        except (RedisError, RedisConnectionError) as e:
+            logger.error(f"Redis error checking rate limit: {e}")
+            return self._handle_redis_error(str(e))
+
+    async def settle(self, result: RateLimitResult, tokens_used: int) -> None:
+        """
+        True up a reservation to the tokens the call actually used.
+
+        Refunds an over-estimate, or charges an overrun, so the token window
+        reflects real usage. Leased reservations are settled in-process and
+        reach Redis when the lease is returned.
+
+        Args:
+            result: Allowed result returned by check_rate_limit
+            tokens_used: Actual tokens consumed
+        """
+        reservation = result.reservation
+        if reservation is None or reservation.settled:
+            return
+        reservation.settled = True
+        tokens_used = max(0, tokens_used)
+
+        if reservation.leased:
+            lease = self._leases.get(reservation.key)
+            if lease is not None and lease.member_id == reservation.member_id:
+                lease.tokens_left += reservation.tokens - tokens_used
+            return
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._settle_script(
+                    keys=[reservation.key, f"{reservation.key}_totals"],
+                    args=[
+                        reservation.member,
+                        f"{reservation.member_id}:{reservation.requests}:{tokens_used}",
+                        "0",
+                        WINDOW_SECONDS * 2,
+                    ],
+                )
+        except (asyncio.TimeoutError, RedisError) as e:
+            logger.warning(f"Failed to settle rate limit reservation: {e}")
+            # Don't raise - the estimate stays charged until it leaves the window
+
+    async def record_request(
+        self,
+        user_id: str,
+        provider: str,
+        endpoint: str,
+        tokens_used: int = 0,
+    ) -> None:
+        """
+        Charge token usage that wasn't reserved through check_rate_limit.
+
+        Requests are already counted by check_rate_limit; callers holding its
+        result should use settle() so the estimate is replaced, not added to.
+
+        Args:
+            user_id: User identifier
+            provider: AI provider name
+            endpoint: API endpoint that was called
+            tokens_used: Tokens consumed outside a reservation
+        """
+        provider_limits = self.limits.get(provider.lower())
+        if tokens_used <= 0 or not provider_limits or provider_limits["tokens_per_minute"] is None:
+            return
+
+        key = self._window_key(user_id, provider)
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._settle_script(
+                    keys=[key, f"{key}_totals"],
+                    args=["", f"{uuid.uuid4().hex[:16]}:0:{tokens_used}", "1", WINDOW_SECONDS * 2],
+                )
+        except (asyncio.TimeoutError, RedisError) as e:
+            logger.warning(f"Failed to record request: {e}")
+            # Don't raise - recording is best-effort
+
+    async def close(self) -> None:
+        """Return unused leased capacity to the shared window."""
+        leases, self._leases = self._leases, {}
+        for lease in leases.values():
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._settle_script(
+                        keys=[lease.key, f"{lease.key}_totals"],
+                        args=[lease.member, lease.consumed_member(), "0", WINDOW_SECONDS * 2],
+                    )
+            except (asyncio.TimeoutError, RedisError) as e:
+                logger.warning(f"Failed to return rate limit lease: {e}")
+
+    async def get_status(self, user_id: str, provider: str) -> Dict:
+        """
+        Get current rate limit status for monitoring.
+
+        Args:
+            user_id: User identifier
+            provider: AI provider name
+
+        Returns:
+            Dictionary with current usage stats (leased capacity counts as used)
+        """
+        provider_limits = self.limits.get(provider.lower())
+        if not provider_limits:
+            return {"error": f"Unknown provider: {provider}"}
+
+        try:
+            now = time.time()
+            members = await self.redis.zrangebyscore(
+                self._window_key(user_id, provider), now - WINDOW_SECONDS, "+inf"
+            )
+            request_count, token_count = 0, 0
+            for member in members:
+                if isinstance(member, bytes):
+                    member = member.decode()
+                _, requests, tokens = member.rsplit(":", 2)
+                request_count += int(requests)
+                token_count += int(tokens)
+
+            request_limit = provider_limits["requests_per_minute"]
+            token_limit = provider_limits["tokens_per_minute"]
+            return {
+                "provider": provider,
+                "user_hash": self._hash_user_id(user_id)[:8],
+                "requests": {
+                    "limit": request_limit,
+                    "used": request_count,
+                    "remaining": max(0, request_limit - request_count),
+                },
+                "tokens": {
+                    "limit": token_limit,
+                    "used": token_count,
+                    "remaining": max(0, token_limit - token_count),
+                } if token_limit is not None else None,
+            }
+
+        except (RedisError, RedisConnectionError) as e:
+            logger.error(f"Error getting rate limit status: {e}")
+            return {"error": str(e)}
+
+    async def _check_leased(
+        self,
+        key: str,
+        provider: str,
+        provider_limits: Dict,
+        estimated_tokens: int,
+    ) -> RateLimitResult:
+        """Serve a check from the process's lease, renewing it when it runs out."""
+        lock = self._lease_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            lease = self._leases.get(key)
+            if lease is None or not lease.covers(estimated_tokens):
+                retiring = self._leases.pop(key, None)
+                async with asyncio.timeout(self.timeout):
+                    result = await self._acquire(
+                        key, provider, provider_limits,
+                        requests=self.lease_requests,
+                        tokens=max(self.lease_tokens, estimated_tokens),
+                        min_requests=1, min_tokens=estimated_tokens,
+                        retiring=retiring,
+                    )
+                if not result.allowed:
+                    return result
+
+                grant = result.reservation
+                lease = _Lease(
+                    key=key,
+                    member_id=grant.member_id,
+                    requests=grant.requests,
+                    tokens=grant.tokens,
+                    requests_left=grant.requests,
+                    tokens_left=grant.tokens,
+                    expires_at=time.monotonic() + self.lease_seconds,
+                    reset_time=result.reset_time,
+                )
+                self._leases[key] = lease
+
+            lease.requests_left -= 1
+            lease.tokens_left -= estimated_tokens
+            return RateLimitResult(
+                allowed=True,
+                requests_remaining=lease.requests_left,
+                tokens_remaining=lease.tokens_left if provider_limits["tokens_per_minute"] is not None else None,
+                reset_time=lease.reset_time,
+                reservation=RateLimitReservation(
+                    key=key,
+                    member_id=lease.member_id,
+                    requests=1,
+                    tokens=estimated_tokens,
+                    leased=True,
+                ),
+            )
+
+    async def _acquire(
+        self,
+        key: str,
+        provider: str,
+        provider_limits: Dict,
+        requests: int,
+        tokens: int,
+        min_requests: int,
+        min_tokens: int,
+        retiring: Optional[_Lease] = None,
+    ) -> RateLimitResult:
+        """
+        Run the acquire script for up to (requests, tokens), at least the minimums.
+
+        Returns:
+            RateLimitResult whose reservation holds what was granted
+        """
+        token_limit = provider_limits["tokens_per_minute"]
+        member_id = uuid.uuid4().hex[:16]
+
+        allowed, granted_requests, granted_tokens, requests_remaining, tokens_remaining, retry_ms = (
+            await self._acquire_script(
+                keys=[key, f"{key}_totals"],
+                args=[
+                    WINDOW_SECONDS,
+                    provider_limits["requests_per_minute"],
+                    -1 if token_limit is None else token_limit,
+                    requests,
+                    tokens,
+                    min_requests,
+                    min_tokens,
+                    member_id,
+                    retiring.member if retiring else "",
+                    retiring.consumed_member() if retiring else "",
+                ],
+            )
+        )
+
+        now = time.time()
+        if not allowed:
+            retry_after = max(1, math.ceil(int(retry_ms) / 1000))
+            logger.warning(
+                f"Rate limit exceeded for {provider}: key={key.split(':')[1][:8]}, "
+                f"requests_remaining={requests_remaining}, tokens_remaining={tokens_remaining}"
+            )
+            return RateLimitResult(
+                allowed=False,
+                requests_remaining=int(requests_remaining),
+                tokens_remaining=int(tokens_remaining) if token_limit is not None else None,
+                reset_time=now + retry_after,
+                retry_after=retry_after,
+            )
+
+        return RateLimitResult(
+            allowed=True,
+            requests_remaining=int(requests_remaining),
+            tokens_remaining=int(tokens_remaining) if token_limit is not None else None,
+            reset_time=now + WINDOW_SECONDS,
+            reservation=RateLimitReservation(
+                key=key,
+                member_id=member_id,
+                requests=int(granted_requests),
+                tokens=int(granted_tokens),
+            ),
+        )
+
+    def _window_key(self, user_id: str, provider: str) -> str:
+        return f"rate_limit:{self._hash_user_id(user_id)}:{provider.lower()}:window"
@@ -15,6 +15,8 @@ import logging
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from bs4 import BeautifulSoup
+
+from app.core.http_clients import get_http_client
 import re
 
 logger = logging.getLogger(__name__)
@@ -56,16 +58,10 @@ class ReviewScraperService:
     TIMEOUT_SECONDS = 5
     MAX_REDIRECTS = 3
 
-    def __init__(self):
-        """Initialize HTTP client for scraping"""
-        self.client = httpx.AsyncClient(
-            timeout=self.TIMEOUT_SECONDS,
-            follow_redirects=True,
-            max_redirects=self.MAX_REDIRECTS,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-        )
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled client (timeout, redirects and User-Agent in PROVIDER_HTTP_CONFIGS)"""
+        return get_http_client("review_scraper")
 
     async def get_reviews(
         self,
@@ -454,8 +450,7 @@ class ReviewScraperService:
         )
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """No-op: the pooled HTTP client is shared and closed on app/worker shutdown"""
 
 
 # Singleton instance
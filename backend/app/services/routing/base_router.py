@@ -15,7 +15,7 @@ from typing import Dict, List, Optional, Any, AsyncIterator, Union
 from contextlib import asynccontextmanager
 
 from app.core.exceptions import RoutingError, ProviderError
-from app.services.circuit_breaker import CircuitBreaker
+from app.services.circuit_breaker import CircuitBreakerError, create_circuit_breaker
 from app.services.retry_handler import RetryWithBackoff
 
 logger = logging.getLogger(__name__)
@@ -104,8 +104,9 @@ class BaseRouter(ABC):
         
         # Initialize circuit breakers and retry handlers for each provider
         for provider_type, config in providers.items():
-            self.circuit_breakers[provider_type] = CircuitBreaker(
-                **config.circuit_breaker_config
+            # Named per provider so distributed breakers share state cluster-wide
+            self.circuit_breakers[provider_type] = create_circuit_breaker(
+                provider_type.value, **config.circuit_breaker_config
             )
             self.retry_handlers[provider_type] = RetryWithBackoff(
                 **config.retry_config
@@ -204,6 +205,8 @@ class BaseRouter(ABC):
         
         try:
             return await circuit_breaker.call(operation)
+        except CircuitBreakerError:
+            raise
         except Exception as e:
             logger.error(f"Circuit breaker error for {provider_type}: {e}")
             raise CircuitBreakerError(f"Circuit breaker open for {provider_type}") from e
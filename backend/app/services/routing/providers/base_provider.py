@@ -13,6 +13,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, AsyncIterator
 
 from app.core.exceptions import ProviderError
+from app.core.metrics import observe_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -201,8 +202,26 @@ class BaseProvider(ABC):
         timeout = timeout_seconds or self.timeout_seconds
         return await asyncio.wait_for(coro, timeout=timeout)
     
+    @property
+    def provider_name(self) -> str:
+        """Metrics label for this provider (e.g. "cerebras" for CerebrasProvider)."""
+        return self.__class__.__name__.replace("Provider", "").lower()
+
     def _log_request(self, request, response: Optional[ProviderResponse] = None, error: Optional[Exception] = None):
-        """Log request details for monitoring."""
+        """Log request details and record provider metrics for monitoring."""
+        if response:
+            usage = response.metadata
+            observe_llm_call(
+                self.provider_name,
+                self.model,
+                response.latency_ms / 1000,
+                prompt_tokens=usage.get("prompt_tokens", usage.get("input_tokens")),
+                completion_tokens=usage.get("completion_tokens", usage.get("output_tokens")),
+                cost_usd=response.cost_usd
+            )
+        elif error:
+            observe_llm_call(self.provider_name, self.model, success=False)
+
         log_data = {
             "provider": self.__class__.__name__,
             "model": self.model,
@@ -0,0 +1,131 @@
+"""
+Bulk MEP+E Rescoring
+
+Recomputes MEP+E scores, OEM category counts, capability flags and ICP
+category scores for stored leads (e.g. after an OEM taxonomy change):
+- Leads are read in keyset-paginated chunks of only the scoring columns
+- Each chunk is scored in one MEPEScorer.score_batch() call
+- Only leads whose stored values changed are written, with one
+  executemany UPDATE by primary key per chunk
+"""
+
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.lead import Lead
+from app.services.scoring.mep_e_scorer import MEPEScorer
+from app.core.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+CHUNK_SIZE = 5000
+
+# Score inputs: OEM list plus the capability flags stored on the lead.
+# has_smart_panel is an input only: at import it is set from the OEM list, so
+# writing the derived value back would change the next rescore's input.
+INPUT_COLUMNS = [
+    "oems_certified",
+    "has_heat_pump",
+    "has_microgrid",
+    "has_smart_panel",
+    "has_ev_charger",
+    "has_commercial",
+    "has_ops_maintenance",
+]
+
+# Lead columns written back from score_batch() output
+OUTPUT_COLUMNS = [
+    "mep_e_score",
+    "total_oem_count",
+    "hvac_oem_count",
+    "solar_oem_count",
+    "battery_oem_count",
+    "generator_oem_count",
+    "smart_panel_oem_count",
+    "iot_oem_count",
+    "has_hvac",
+    "has_solar",
+    "has_battery",
+    "has_generator",
+    "renewable_readiness_score",
+    "asset_centric_score",
+    "projects_service_score",
+]
+
+
+def _iter_lead_frames(
+    db: Session,
+    lead_ids: Optional[Sequence[int]],
+    chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of scoring inputs and current outputs, chunk_size leads at a time"""
+    columns = ["id"] + INPUT_COLUMNS + OUTPUT_COLUMNS
+    selected = [getattr(Lead, column) for column in columns]
+
+    if lead_ids is not None:
+        ids = list(lead_ids)
+        for i in range(0, len(ids), chunk_size):
+            rows = db.execute(select(*selected).where(Lead.id.in_(ids[i:i + chunk_size]))).all()
+            if rows:
+                yield pd.DataFrame(rows, columns=columns)
+        return
+
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(*selected).where(Lead.id > last_id).order_by(Lead.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield pd.DataFrame(rows, columns=columns)
+
+
+def rescore_mep_e_leads(
+    db: Session,
+    lead_ids: Optional[Sequence[int]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    scorer: Optional[MEPEScorer] = None
+) -> Dict[str, Any]:
+    """
+    Rescore stored leads with MEPEScorer.score_batch() and write changes back.
+
+    Args:
+        db: Database session (committed after each chunk)
+        lead_ids: Leads to rescore; None rescores every lead
+        chunk_size: Leads per read/score/write round trip
+        scorer: Scorer to use (default MEPEScorer())
+
+    Returns:
+        Dict with leads_scored, leads_updated and leads_per_second
+    """
+    scorer = scorer or MEPEScorer()
+    started = time.perf_counter()
+    scored = updated = 0
+
+    for frame in _iter_lead_frames(db, lead_ids, chunk_size):
+        scores = scorer.score_batch(frame)[OUTPUT_COLUMNS]
+        current = frame[OUTPUT_COLUMNS].astype(scores.dtypes.to_dict())
+        changed = (scores != current).any(axis=1).to_numpy()
+
+        rows: List[Dict[str, Any]] = scores[changed].assign(id=frame["id"][changed]).to_dict("records")
+        if rows:
+            db.execute(update(Lead), rows)
+        db.commit()
+
+        scored += len(frame)
+        updated += len(rows)
+        logger.info(f"MEP+E rescoring: {scored} leads scored, {updated} updated")
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "leads_scored": scored,
+        "leads_updated": updated,
+        "leads_per_second": round(scored / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    logger.info(f"MEP+E rescoring complete: {stats}")
+    return stats
@@ -15,15 +15,35 @@ Tier Classification:
 - GOLD (60-79): Strong fit - ready for outreach
 - SILVER (40-59): Medium fit - nurture campaigns
 - BRONZE (20-39): Low fit - long-term follow-up
+
+Bulk rescoring uses MEPEScorer.score_batch(), which scores a whole frame of
+leads with NumPy array operations and resolves each distinct OEM name once.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from app.config import oem_taxonomy
 from app.config.oem_taxonomy import (
+    TIER_POINTS,
     categorize_oems,
     count_oems_by_category,
     get_oem_tier_points,
 )
 
+OEM_CATEGORIES = ["hvac", "solar", "battery", "generator", "smart_panel", "iot"]
+
+# Explicit capability flags copied through to calculate_mep_e_score() output
+EXPLICIT_CAPABILITIES = [
+    "has_ev_charger",
+    "has_heat_pump",
+    "has_microgrid",
+    "has_commercial",
+    "has_ops_maintenance",
+]
+
 
 class MEPEScorer:
     """
@@ -161,6 +181,128 @@ class MEPEScorer:
         # Ensure score is between 0-100
         return int(min(max(total_score, 0), 100))
 
+    def score_batch(
+        self, leads: Union[pd.DataFrame, Mapping[str, Sequence[Any]]]
+    ) -> pd.DataFrame:
+        """
+        Score many leads at once (vectorized calculate_mep_e_score()).
+
+        OEM lists are flattened into one array, each distinct OEM name is
+        resolved once through the precompiled taxonomy index, and every
+        scoring component is computed with NumPy array operations over all
+        rows. Results match calculate_mep_e_score() row for row, except
+        that missing flags (None/NaN) count as False.
+
+        Args:
+            leads: DataFrame (or mapping of column name to array/list) with
+                an oems_certified column of OEM name lists and optional
+                has_heat_pump, has_microgrid, has_smart_panel,
+                has_ev_charger, has_commercial, has_ops_maintenance columns
+
+        Returns:
+            DataFrame on the input index with the calculate_mep_e_score()
+            keys as columns (mep_e_score, tier, OEM counts, capability flags,
+            ICP category scores)
+
+        Examples:
+            >>> scorer = MEPEScorer()
+            >>> frame = pd.DataFrame({
+            ...     'oems_certified': [['Daikin', 'Generac', 'Span'], []],
+            ...     'has_heat_pump': [True, False],
+            ... })
+            >>> scorer.score_batch(frame)[['mep_e_score', 'tier']].values.tolist()
+            [[38, 'BRONZE'], [0, 'BRONZE']]
+        """
+        frame = leads if isinstance(leads, pd.DataFrame) else pd.DataFrame(leads)
+        n = len(frame)
+
+        def flag(column: str) -> np.ndarray:
+            if column not in frame:
+                return np.zeros(n, dtype=bool)
+            return frame[column].fillna(False).to_numpy(dtype=bool)
+
+        # Flatten OEM lists: one entry per (row, OEM)
+        oem_lists = [
+            oems if isinstance(oems, (list, tuple)) else []
+            for oems in (frame["oems_certified"] if "oems_certified" in frame else [None] * n)
+        ]
+        total_oems = np.fromiter((len(oems) for oems in oem_lists), dtype=np.int64, count=n)
+        rows = np.repeat(np.arange(n), total_oems)
+        codes, names = pd.factorize(pd.Series([oem for oems in oem_lists for oem in oems], dtype=object))
+
+        # Resolve each distinct name once
+        category_of = np.full(len(names), -1, dtype=np.int64)
+        points_of = np.zeros(len(names), dtype=np.int64)
+        index = oem_taxonomy.OEM_INDEX
+        for i, name in enumerate(names):
+            match = index.lookup(name)
+            if match:
+                category_of[i] = OEM_CATEGORIES.index(match[0])
+                points_of[i] = TIER_POINTS.get(match[1], 0)
+
+        # Category counts: each distinct OEM string counts once per row
+        counts = np.zeros((n, len(OEM_CATEGORIES)), dtype=np.int64)
+        width = max(len(names), 1)
+        matched = category_of[codes] >= 0
+        pairs = np.unique(rows[matched] * width + codes[matched])
+        np.add.at(counts, (pairs // width, category_of[pairs % width]), 1)
+        hvac, solar, battery, generator, smart_panel, iot = counts.T
+
+        has_heat_pump = flag("has_heat_pump")
+        has_microgrid = flag("has_microgrid")
+        has_smart_panel = flag("has_smart_panel")
+        has_ev_charger = flag("has_ev_charger")
+        has_commercial = flag("has_commercial")
+        has_ops_maintenance = flag("has_ops_maintenance")
+
+        # Component 1-4, as in calculate_score()
+        coverage_score = ((counts > 0).sum(axis=1) / 6.0) * 40
+        tier_score = np.minimum(np.bincount(rows, weights=points_of[codes], minlength=n), 30)
+        transition_bonus = np.minimum(
+            5 * has_heat_pump + 5 * has_microgrid + 5 * (solar >= 2) + 5 * (battery >= 2)
+            + 4 * has_smart_panel + 4 * (iot >= 2),
+            20,
+        )
+        multi_oem_bonus = np.select([total_oems >= 8, total_oems >= 5, total_oems >= 3], [10, 7, 4], 0)
+        total_score = coverage_score + tier_score + transition_bonus + multi_oem_bonus
+        scores = np.where(total_oems > 0, np.clip(total_score, 0, 100).astype(np.int64), 0)
+
+        # ICP categories, as in calculate_icp_category_scores()
+        renewable = np.minimum(
+            np.minimum(solar * 25, 50) + np.minimum(battery * 25, 50)
+            + 20 * has_heat_pump + 20 * has_microgrid + 10 * has_ev_charger,
+            100,
+        )
+        asset_centric = np.minimum(
+            40 * has_ops_maintenance + np.minimum(generator * 15, 30) + np.minimum(smart_panel * 15, 30)
+            + 30 * has_commercial + np.minimum(iot * 10, 20),
+            100,
+        )
+        projects_service = 50 * (total_oems >= 3) + 50 * (has_commercial & has_ops_maintenance)
+        projects_service = np.minimum(
+            np.where(projects_service == 0, np.minimum((scores * 0.6).astype(np.int64), 100), projects_service),
+            100,
+        )
+
+        result = {
+            "mep_e_score": scores,
+            "tier": np.select([scores >= 80, scores >= 60, scores >= 40], ["PLATINUM", "GOLD", "SILVER"], "BRONZE"),
+            "total_oem_count": total_oems,
+            **{f"{category}_oem_count": counts[:, i] for i, category in enumerate(OEM_CATEGORIES)},
+            "has_hvac": hvac > 0,
+            "has_solar": solar > 0,
+            "has_battery": battery > 0,
+            "has_generator": generator > 0,
+            "has_smart_panel": smart_panel > 0,
+        }
+        for key in EXPLICIT_CAPABILITIES:
+            result[key] = flag(key)
+        result["renewable_readiness_score"] = renewable
+        result["asset_centric_score"] = asset_centric
+        result["projects_service_score"] = projects_service
+
+        return pd.DataFrame(result, index=frame.index)
+
     def classify_tier(self, score: int) -> str:
         """
         Classify lead into tier based on MEP+E score.
@@ -378,13 +520,7 @@ def calculate_mep_e_score(lead_data: Dict[str, Any]) -> Dict[str, Any]:
     capabilities = scorer.detect_capabilities(lead_data.get("oems_certified", []))
 
     # Merge explicit capabilities from lead_data
-    for key in [
-        "has_ev_charger",
-        "has_heat_pump",
-        "has_microgrid",
-        "has_commercial",
-        "has_ops_maintenance",
-    ]:
+    for key in EXPLICIT_CAPABILITIES:
         if key in lead_data:
             capabilities[key] = lead_data[key]
 
@@ -0,0 +1,321 @@
+"""
+Buffered Telemetry Sink
+
+Shared in-process writer for high-volume telemetry rows (API-call logs,
+AI cost tracking, audit/security events). Writers hand over column values
+instead of committing one row per request:
+- Rows go into a bounded asyncio queue; when it is full the oldest
+  (default) or the newest row is dropped and counted, so request latency
+  never waits on the database
+- The queue is flushed every ``batch_size`` rows or ``flush_interval``
+  seconds with one multi-row INSERT per table, off the event loop
+- Remaining rows are flushed on shutdown (FastAPI shutdown event, Celery
+  worker_process_shutdown)
+
+Rows are only buffered while the sink is running; writers fall back to
+their direct session writes otherwise (tests, scripts, solo workers).
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Table, inspect, insert
+from sqlalchemy.orm import Session
+
+from app.models.database import SessionLocal
+from app.core.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+_STOP = object()  # Queue sentinel: flush what is left and exit
+
+
+@dataclass
+class TelemetrySinkStats:
+    """Counters since the sink was created"""
+    queued: int = 0
+    written: int = 0
+    dropped: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes
+        }
+
+
+class TelemetrySink:
+    """
+    Bounded, batching writer for append-only telemetry rows
+
+    Usage:
+        sink = get_telemetry_sink()
+        await sink.start()  # or sink.start_background() outside an event loop
+        sink.record(APICallLog, {"provider": ..., "model": ...})
+        await sink.stop()  # flushes buffered rows
+
+    record() is thread-safe. Rows are plain column values, so buffered
+    telemetry never holds sessions or ORM instances. Columns with a
+    server-side timestamp default are stamped when the row is recorded,
+    not when it is flushed.
+    """
+
+    MAX_QUEUE_SIZE = 10_000  # Buffered rows before the overflow policy applies
+    BATCH_SIZE = 500  # Rows per flush
+    FLUSH_INTERVAL = 1.0  # Max seconds a row waits for a flush
+    STOP_TIMEOUT = 30.0  # Max seconds to wait for the final flush
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        overflow: str = "drop_oldest"
+    ):
+        """
+        Initialize telemetry sink.
+
+        Args:
+            session_factory: Creates the sessions flushes are written with
+            max_queue_size: Max buffered rows
+            batch_size: Max rows per flush
+            flush_interval: Max seconds between a row and its flush
+            overflow: "drop_oldest" or "drop_newest" when the queue is full
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+
+        self.session_factory = session_factory
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.stats = TelemetrySinkStats()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._columns: Dict[type, Tuple[Table, Dict[str, str], List[str]]] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether record() currently buffers rows"""
+        return self._task is not None and not self._closing
+
+    async def start(self) -> None:
+        """Start flushing on the running event loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        # Unbounded so the stop sentinel always fits; max_queue_size is enforced in _enqueue
+        self._queue = asyncio.Queue()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Telemetry sink started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s, max_queue_size={self.max_queue_size})"
+        )
+
+    async def stop(self) -> None:
+        """Stop accepting rows and flush everything buffered"""
+        if self._task is None:
+            return
+        self._closing = True
+        await asyncio.sleep(0)  # Let rows handed over from other threads land first
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+        self._loop = None
+        logger.info(f"Telemetry sink stopped: {self.stats.as_dict()}")
+
+    def start_background(self) -> None:
+        """Start the sink on a dedicated event loop thread (Celery workers, scripts)"""
+        if self._task is not None:
+            return
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="telemetry-sink", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop_background(self, timeout: float = STOP_TIMEOUT) -> None:
+        """Flush and stop a sink started with start_background()"""
+        if self._thread is None:
+            return
+        loop = self._loop
+        try:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def record(self, model: type, values: Dict[str, Any]) -> bool:
+        """
+        Buffer one row for a model.
+
+        Args:
+            model: Mapped model class (e.g. APICallLog)
+            values: Mapped attribute name -> value
+
+        Returns:
+            False if the sink is not running (caller writes the row itself)
+
+        Raises:
+            KeyError: If a key is not a column attribute of the model
+        """
+        if not self.running:
+            return False
+
+        table, column_keys, stamped = self._model_columns(model)
+        row = {column_keys[key]: value for key, value in values.items()}
+        if stamped:
+            now = datetime.now(timezone.utc)
+            for key in stamped:
+                row.setdefault(key, now)
+
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._enqueue(table, row)
+        else:
+            self._loop.call_soon_threadsafe(self._enqueue, table, row)
+        return True
+
+    def _model_columns(self, model: type) -> Tuple[Table, Dict[str, str], List[str]]:
+        """Table, attribute -> column key map, and columns stamped at record time"""
+        columns = self._columns.get(model)
+        if columns is None:
+            mapper = inspect(model)
+            column_keys = {attr.key: attr.columns[0].key for attr in mapper.column_attrs}
+            stamped = [
+                column.key for column in mapper.local_table.columns
+                if column.server_default is not None and isinstance(column.type, DateTime)
+            ]
+            columns = self._columns[model] = (mapper.local_table, column_keys, stamped)
+        return columns
+
+    def _enqueue(self, table: Table, row: Dict[str, Any]) -> None:
+        """Add a row on the sink's loop, applying the overflow policy"""
+        if self._queue.qsize() >= self.max_queue_size:
+            self.stats.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            self._queue.get_nowait()
+        self._queue.put_nowait((table, row))
+        self.stats.queued += 1
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._flush(batch)
+
+    async def _next_batch(self) -> Tuple[List[Tuple[Table, Dict[str, Any]]], bool]:
+        """Wait for a row, then collect up to batch_size rows or until flush_interval"""
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _flush(self, batch: List[Tuple[Table, Dict[str, Any]]]) -> None:
+        """Write a batch, retrying once; a batch that fails twice is dropped"""
+        # One executemany (multi-row INSERT) per table and column set
+        groups: Dict[Tuple[Table, Tuple[str, ...]], List[Dict[str, Any]]] = defaultdict(list)
+        for table, row in batch:
+            groups[(table, tuple(sorted(row)))].append(row)
+
+        for attempt in range(2):
+            try:
+                await asyncio.to_thread(self._write, groups)
+            except Exception as e:
+                logger.warning(f"Telemetry flush of {len(batch)} rows failed (attempt {attempt + 1}): {e}")
+                continue
+            self.stats.written += len(batch)
+            self.stats.flushes += 1
+            return
+
+        self.stats.dropped += len(batch)
+        self.stats.failed_flushes += 1
+        logger.error(f"Dropped {len(batch)} telemetry rows after failed flushes")
+
+    def _write(self, groups: Dict[Tuple[Table, Tuple[str, ...]], List[Dict[str, Any]]]) -> None:
+        db = self.session_factory()
+        try:
+            for (table, _), rows in groups.items():
+                db.execute(insert(table), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+_telemetry_sink: Optional[TelemetrySink] = None
+
+
+def get_telemetry_sink() -> TelemetrySink:
+    """
+    Get the process-wide telemetry sink.
+
+    Returns:
+        TelemetrySink instance (started by the app or worker lifecycle hooks)
+    """
+    global _telemetry_sink
+    if _telemetry_sink is None:
+        _telemetry_sink = TelemetrySink()
+    return _telemetry_sink
+
+
+def record_telemetry(db: Any, model: type, values: Dict[str, Any]) -> None:
+    """
+    Buffer a telemetry row, or add it to `db` when the sink is not running.
+
+    In the fallback the row is committed with the caller's transaction.
+    """
+    if not get_telemetry_sink().record(model, values):
+        db.add(model(**values))
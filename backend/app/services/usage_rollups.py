@@ -0,0 +1,615 @@
+"""
+Incrementally maintained usage rollups for cost and latency analytics.
+
+refresh_usage_rollups() folds new ai_cost_tracking / api_call_logs rows into
+hourly and daily rollup tables (app.models.usage_rollups), advancing a
+per-table watermark over the raw primary key in the same transaction as the
+rollup update, so every raw row is counted exactly once. It runs as the
+refresh_usage_rollups Celery beat task and can be re-run at any time.
+
+Readers (ai_cost_usage, ai_cost_lead_usage, api_call_usage) answer a
+[start, end) range from three parts that never overlap:
+- whole days/hours inside the range: rollup rows
+- partial hours at the range edges: raw rows (an index range scan)
+- rows newer than the watermark (not rolled up yet): raw rows
+so results match a raw-table query exactly while reading a few hundred
+rollup rows instead of millions of raw rows.
+
+Usage:
+    refresh_usage_rollups(db)
+
+    by_agent = ai_cost_usage(db, ("agent_type", "agent_mode"), start=start, end=end)
+    daily = ai_cost_usage(db, ("day",), start=start)
+    latency = api_call_usage(db, (), start=start, end=end, with_latency=True, provider="cerebras")
+    latency[()].sketch.quantile(0.95)
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.core.latency_sketch import LatencySketch
+from app.models.ai_cost_tracking import AICostTracking
+from app.models.unified_api_call import APICallLog
+from app.models.usage_rollups import AICostLeadRollup, AICostRollup, APICallRollup, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+HOUR = "hour"
+DAY = "day"
+_STEPS = {HOUR: timedelta(hours=1), DAY: timedelta(days=1)}
+
+REFRESH_BATCH_SIZE = 50_000  # Raw rows folded per transaction
+SETTLE_SECONDS = 60  # Leave just-written rows for the next run (in-flight transactions)
+IN_CHUNK = 1000  # Max values per IN (...) clause
+
+_METRIC_COLUMNS = (
+    "request_count", "success_count", "cache_hits", "total_cost_usd",
+    "uncached_requests", "uncached_cost_usd", "latency_count", "latency_sum_ms",
+)
+
+
+@dataclass
+class UsageStats:
+    """Additive usage counters for one group of raw rows or rollup rows."""
+    requests: int = 0
+    successes: int = 0
+    cache_hits: int = 0
+    cost_usd: float = 0.0
+    uncached_requests: int = 0
+    uncached_cost_usd: float = 0.0
+    latency_count: int = 0
+    latency_sum_ms: int = 0
+    sketch: Optional[LatencySketch] = None
+
+    @property
+    def avg_cost_usd(self) -> float:
+        return self.cost_usd / self.requests if self.requests else 0.0
+
+    @property
+    def avg_uncached_cost_usd(self) -> float:
+        return self.uncached_cost_usd / self.uncached_requests if self.uncached_requests else 0.0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return self.latency_sum_ms / self.latency_count if self.latency_count else 0.0
+
+    def add(
+        self,
+        cost_usd: Any,
+        cache_hit: Optional[bool],
+        latency_ms: Optional[int],
+        success: Optional[bool] = True,
+        with_sketch: bool = False
+    ) -> None:
+        """Count one raw row."""
+        cost = float(cost_usd or 0)
+        self.requests += 1
+        self.cost_usd += cost
+        if success is not False:
+            self.successes += 1
+        if cache_hit:
+            self.cache_hits += 1
+        else:
+            self.uncached_requests += 1
+            self.uncached_cost_usd += cost
+        if latency_ms is not None:
+            self.latency_count += 1
+            self.latency_sum_ms += latency_ms
+            if with_sketch:
+                if self.sketch is None:
+                    self.sketch = LatencySketch()
+                self.sketch.add(latency_ms)
+
+    def merge(self, other: "UsageStats") -> None:
+        self.requests += other.requests
+        self.successes += other.successes
+        self.cache_hits += other.cache_hits
+        self.cost_usd += other.cost_usd
+        self.uncached_requests += other.uncached_requests
+        self.uncached_cost_usd += other.uncached_cost_usd
+        self.latency_count += other.latency_count
+        self.latency_sum_ms += other.latency_sum_ms
+        if other.sketch is not None:
+            if self.sketch is None:
+                self.sketch = LatencySketch()
+            self.sketch.merge(other.sketch)
+
+    @classmethod
+    def from_rollup(cls, row: Any, with_sketch: bool = False) -> "UsageStats":
+        # Rollup rows or SUM() aggregates of them (numeric on PostgreSQL)
+        return cls(
+            requests=int(row.request_count),
+            successes=int(row.success_count),
+            cache_hits=int(row.cache_hits),
+            cost_usd=float(row.total_cost_usd),
+            uncached_requests=int(row.uncached_requests),
+            uncached_cost_usd=float(row.uncached_cost_usd),
+            latency_count=int(row.latency_count),
+            latency_sum_ms=int(row.latency_sum_ms),
+            sketch=LatencySketch.from_dict(row.latency_sketch) if with_sketch else None,
+        )
+
+    def rollup_values(self) -> Dict[str, Any]:
+        """Metric column values for a new rollup row."""
+        return {
+            "request_count": self.requests,
+            "success_count": self.successes,
+            "cache_hits": self.cache_hits,
+            "total_cost_usd": self.cost_usd,
+            "uncached_requests": self.uncached_requests,
+            "uncached_cost_usd": self.uncached_cost_usd,
+            "latency_count": self.latency_count,
+            "latency_sum_ms": self.latency_sum_ms,
+        }
+
+    def add_to_rollup(self, row: Any) -> None:
+        """Add these counters into a rollup ORM row."""
+        row.request_count = (row.request_count or 0) + self.requests
+        row.success_count = (row.success_count or 0) + self.successes
+        row.cache_hits = (row.cache_hits or 0) + self.cache_hits
+        row.total_cost_usd = (row.total_cost_usd or 0.0) + self.cost_usd
+        row.uncached_requests = (row.uncached_requests or 0) + self.uncached_requests
+        row.uncached_cost_usd = (row.uncached_cost_usd or 0.0) + self.uncached_cost_usd
+        row.latency_count = (row.latency_count or 0) + self.latency_count
+        row.latency_sum_ms = (row.latency_sum_ms or 0) + self.latency_sum_ms
+        if self.sketch is not None:
+            sketch = LatencySketch.from_dict(row.latency_sketch)
+            sketch.merge(self.sketch)
+            row.latency_sketch = sketch.to_dict()  # New object so the JSON change is flushed
+
+
+@dataclass(frozen=True)
+class _Rollup:
+    """One rollup table fed from a raw table."""
+    model: Any
+    dims: Tuple[str, ...]  # Columns shared by the raw table and the rollup
+    granularities: Tuple[str, ...]  # Coarsest first
+    sketch: bool = False
+    required: Tuple[str, ...] = ()  # Raw rows with NULL here are not rolled up
+
+
+@dataclass(frozen=True)
+class _Source:
+    """A raw tracking table and the rollups maintained from it."""
+    name: str
+    raw: Any
+    time_column: str
+    success_column: Optional[str]
+    rollups: Tuple[_Rollup, ...]
+
+    @property
+    def timestamp(self):
+        return getattr(self.raw, self.time_column)
+
+
+AI_COST_ROLLUP = _Rollup(AICostRollup, ("agent_type", "agent_mode", "provider", "model"), (DAY, HOUR), sketch=True)
+AI_COST_LEAD_ROLLUP = _Rollup(AICostLeadRollup, ("lead_id", "agent_type"), (HOUR,), required=("lead_id",))
+API_CALL_ROLLUP = _Rollup(APICallRollup, ("provider", "model", "operation_type"), (DAY, HOUR), sketch=True)
+
+AI_COST_SOURCE = _Source("ai_cost_tracking", AICostTracking, "timestamp", None, (AI_COST_ROLLUP, AI_COST_LEAD_ROLLUP))
+API_CALL_SOURCE = _Source("api_call_logs", APICallLog, "created_at", "success", (API_CALL_ROLLUP,))
+
+_SOURCES = (AI_COST_SOURCE, API_CALL_SOURCE)
+
+
+# ========== Time buckets ==========
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Aware UTC datetime; naive values are taken to be UTC already."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _floor(value: datetime, granularity: str) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    if granularity == DAY:
+        value = value.replace(hour=0)
+    return value
+
+
+def _ceil(value: datetime, granularity: str) -> datetime:
+    floored = _floor(value, granularity)
+    return floored if floored == value else floored + _STEPS[granularity]
+
+
+def _plan_range(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    granularities: Sequence[str]
+) -> Tuple[List[Tuple[str, Optional[datetime], Optional[datetime]]], List[Tuple[Optional[datetime], Optional[datetime]]]]:
+    """
+    Split [start, end) into bucket-aligned rollup segments and raw edges.
+
+    E.g. 09:40 Mon - 14:10 Wed with (day, hour) becomes raw 09:40-10:00,
+    hours 10:00-00:00, day Tuesday, hours 00:00-14:00, raw 14:00-14:10.
+    None means unbounded.
+
+    Returns:
+        (rollup segments as (granularity, start, end), raw segments as (start, end))
+    """
+    rollup_segments: List[Tuple[str, Optional[datetime], Optional[datetime]]] = []
+    raw_segments: List[Tuple[Optional[datetime], Optional[datetime]]] = []
+
+    def split(seg_start, seg_end, levels):
+        if not levels:
+            if seg_start is None or seg_end is None or seg_start < seg_end:
+                raw_segments.append((seg_start, seg_end))
+            return
+
+        granularity = levels[0]
+        inner_start = _ceil(seg_start, granularity) if seg_start is not None else None
+        inner_end = _floor(seg_end, granularity) if seg_end is not None else None
+        if inner_start is not None and inner_end is not None and inner_start >= inner_end:
+            split(seg_start, seg_end, levels[1:])
+            return
+
+        if seg_start is not None and seg_start < inner_start:
+            split(seg_start, inner_start, levels[1:])
+        rollup_segments.append((granularity, inner_start, inner_end))
+        if seg_end is not None and inner_end < seg_end:
+            split(inner_end, seg_end, levels[1:])
+
+    split(start, end, tuple(granularities))
+    return rollup_segments, raw_segments
+
+
+def _between(column, start: Optional[datetime], end: Optional[datetime]) -> List[Any]:
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
+
+
+# ========== Dimensions ==========
+
+def _dim(value: Any) -> Any:
+    """Raw column value as stored in a rollup dimension column."""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _undim(value: Any) -> Any:
+    return None if value == "" else value
+
+
+def _chunks(values: Sequence[Any], size: int = IN_CHUNK) -> Iterable[Sequence[Any]]:
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+
+# ========== Refresh ==========
+
+def _raw_columns(source: _Source) -> List[Any]:
+    names = {"id", source.time_column, "cost_usd", "cache_hit", "latency_ms"}
+    if source.success_column:
+        names.add(source.success_column)
+    for rollup in source.rollups:
+        names.update(rollup.dims)
+    return [getattr(source.raw, name) for name in sorted(names)]
+
+
+def _add_raw_row(stats: UsageStats, source: _Source, row: Any, with_sketch: bool) -> None:
+    stats.add(
+        row.cost_usd,
+        row.cache_hit,
+        row.latency_ms,
+        getattr(row, source.success_column) if source.success_column else True,
+        with_sketch,
+    )
+
+
+def _lock_watermark(db: Session, name: str) -> RollupWatermark:
+    watermark = db.query(RollupWatermark).filter(RollupWatermark.name == name).with_for_update().one_or_none()
+    if watermark is None:
+        watermark = RollupWatermark(name=name, last_id=0)
+        db.add(watermark)
+        db.flush()
+    return watermark
+
+
+def _fold_rows(db: Session, source: _Source, rows: Sequence[Any]) -> None:
+    """Aggregate a batch of raw rows and add it into every rollup of the source."""
+    for rollup in source.rollups:
+        groups: Dict[Tuple, UsageStats] = defaultdict(UsageStats)
+        for row in rows:
+            if any(getattr(row, name) is None for name in rollup.required):
+                continue
+            timestamp = _utc(getattr(row, source.time_column))
+            dims = tuple(_dim(getattr(row, name)) for name in rollup.dims)
+            for granularity in rollup.granularities:
+                _add_raw_row(groups[(granularity, _floor(timestamp, granularity)) + dims], source, row, rollup.sketch)
+
+        if groups:
+            _upsert_groups(db, rollup, groups)
+
+
+def _upsert_groups(db: Session, rollup: _Rollup, groups: Dict[Tuple, UsageStats]) -> None:
+    """Add grouped counters into existing rollup rows, creating missing ones."""
+    model = rollup.model
+    bucket_starts = sorted({key[1] for key in groups})
+    first_dim_values = sorted({key[2] for key in groups})
+
+    existing: Dict[Tuple, Any] = {}
+    for starts in _chunks(bucket_starts):
+        for values in _chunks(first_dim_values):
+            query = db.query(model).filter(
+                model.bucket_start.in_(starts),
+                getattr(model, rollup.dims[0]).in_(values),
+            )
+            for row in query:
+                key = (row.granularity, _utc(row.bucket_start)) + tuple(getattr(row, name) for name in rollup.dims)
+                existing[key] = row
+
+    # Existing buckets are updated through the ORM; new ones (the bulk of a
+    # backfill) go in as a single executemany INSERT
+    new_rows = []
+    for key, stats in groups.items():
+        row = existing.get(key)
+        if row is not None:
+            stats.add_to_rollup(row)
+            continue
+        values = {"granularity": key[0], "bucket_start": key[1], **dict(zip(rollup.dims, key[2:]))}
+        values.update(stats.rollup_values())
+        if rollup.sketch:
+            values["latency_sketch"] = stats.sketch.to_dict() if stats.sketch is not None else None
+        new_rows.append(values)
+
+    if new_rows:
+        db.flush()
+        db.execute(insert(model.__table__), new_rows)
+
+
+def _refresh_source(
+    db: Session,
+    source: _Source,
+    batch_size: int,
+    settle_seconds: float,
+    max_batches: Optional[int]
+) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+    columns = _raw_columns(source)
+    processed = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        watermark = _lock_watermark(db, source.name)
+        rows = (
+            db.query(*columns)
+            .filter(source.raw.id > watermark.last_id)
+            .order_by(source.raw.id)
+            .limit(batch_size)
+            .all()
+        )
+
+        # Stop at the first unsettled row; ids are not committed strictly in order
+        settled = len(rows)
+        for i, row in enumerate(rows):
+            if _utc(getattr(row, source.time_column)) > cutoff:
+                settled = i
+                break
+        rows = rows[:settled]
+
+        if rows:
+            _fold_rows(db, source, rows)
+            watermark.last_id = rows[-1].id
+        db.commit()
+
+        processed += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    return processed
+
+
+def refresh_usage_rollups(
+    db: Session,
+    batch_size: int = REFRESH_BATCH_SIZE,
+    settle_seconds: float = SETTLE_SECONDS,
+    max_batches: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Fold raw tracking rows written since the last refresh into the rollups.
+
+    Each batch is committed together with its watermark, so an interrupted
+    refresh resumes where it stopped and concurrent refreshes serialize on
+    the watermark row lock.
+
+    Args:
+        db: Database session
+        batch_size: Raw rows per transaction
+        settle_seconds: Skip rows younger than this (may have lower-id rows still committing)
+        max_batches: Stop after this many batches per table (None = catch up fully)
+
+    Returns:
+        Raw rows folded per source table
+    """
+    processed = {}
+    for source in _SOURCES:
+        processed[source.name] = _refresh_source(db, source, batch_size, settle_seconds, max_batches)
+        if processed[source.name]:
+            logger.info(f"Rolled up {processed[source.name]} {source.name} rows")
+    return processed
+
+
+# ========== Queries ==========
+
+def _watermark_id(db: Session, name: str) -> int:
+    watermark = db.query(RollupWatermark.last_id).filter(RollupWatermark.name == name).scalar()
+    return watermark or 0
+
+
+def _group_key(group_by: Sequence[str], timestamp: Optional[datetime], dims: Dict[str, Any]) -> Tuple:
+    return tuple(
+        _floor(timestamp, name) if name in _STEPS else _undim(_dim(dims[name]))
+        for name in group_by
+    )
+
+
+def _collect(
+    db: Session,
+    source: _Source,
+    rollup: _Rollup,
+    group_by: Sequence[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    with_latency: bool,
+    filters: Dict[str, Any]
+) -> Dict[Tuple, UsageStats]:
+    """Merge rollup rows and raw rows for [start, end) into per-group stats."""
+    start, end = _utc(start), _utc(end)
+    filters = {name: value for name, value in filters.items() if value is not None}
+    with_sketch = with_latency and rollup.sketch
+    results: Dict[Tuple, UsageStats] = defaultdict(UsageStats)
+
+    # Filters on columns the rollup does not carry (e.g. lead_id for model
+    # breakdowns) are answered from raw rows; such slices are small and indexed
+    use_rollups = all(name in rollup.dims for name in filters)
+    watermark = _watermark_id(db, source.name) if use_rollups else 0
+
+    # Grouping by hour can't use day rows
+    granularities = rollup.granularities
+    time_groups = [_STEPS[name] for name in group_by if name in _STEPS]
+    if time_groups:
+        granularities = tuple(g for g in granularities if _STEPS[g] <= min(time_groups))
+
+    if watermark and granularities:
+        rollup_segments, raw_segments = _plan_range(start, end, granularities)
+    else:
+        rollup_segments, raw_segments = [], [(start, end)]
+
+    model = rollup.model
+    if rollup_segments:
+        # Counters are summed in SQL; sketches have to be merged here
+        dim_columns = [getattr(model, name) for name in group_by if name not in _STEPS]
+        if with_sketch:
+            columns = [model.bucket_start, *(getattr(model, name) for name in _METRIC_COLUMNS), *dim_columns, model.latency_sketch]
+            group_columns = []
+        else:
+            group_columns = ([model.bucket_start] if time_groups else []) + dim_columns
+            columns = group_columns + [func.sum(getattr(model, name)).label(name) for name in _METRIC_COLUMNS]
+
+        # One (granularity, bucket_start) index range per segment
+        for granularity, seg_start, seg_end in rollup_segments:
+            query = db.query(*columns).filter(
+                model.granularity == granularity, *_between(model.bucket_start, seg_start, seg_end)
+            )
+            for name, value in filters.items():
+                query = query.filter(getattr(model, name) == _dim(value))
+            if group_columns:
+                query = query.group_by(*group_columns)
+
+            for row in query:
+                if row.request_count is None:  # SUM over no rows
+                    continue
+                dims = {name: getattr(row, name) for name in group_by if name not in _STEPS}
+                key = _group_key(group_by, _utc(row.bucket_start) if time_groups else None, dims)
+                results[key].merge(UsageStats.from_rollup(row, with_sketch))
+
+    # One query per raw edge (timestamp index range), plus the rows past the
+    # watermark (primary key range, at most a few refresh intervals' worth)
+    # that fall inside rolled-up buckets. A single OR'ed filter would make
+    # the planner walk the whole [start, end) timestamp range.
+    raw = source.raw
+    raw_filters = [getattr(raw, name).isnot(None) for name in rollup.required]
+    raw_filters += [getattr(raw, name) == value for name, value in filters.items()]
+
+    def add_rows(query, in_rollups: bool = False) -> None:
+        for row in query:
+            timestamp = _utc(getattr(row, source.time_column))
+            if in_rollups and not any(
+                (seg_start is None or seg_start <= timestamp) and (seg_end is None or timestamp < seg_end)
+                for _, seg_start, seg_end in rollup_segments
+            ):
+                continue
+            dims = {name: getattr(row, name) for name in group_by if name not in _STEPS}
+            _add_raw_row(results[_group_key(group_by, timestamp, dims)], source, row, with_sketch)
+
+    for seg_start, seg_end in raw_segments:
+        add_rows(db.query(*_raw_columns(source)).filter(*_between(source.timestamp, seg_start, seg_end), *raw_filters))
+    if rollup_segments:
+        add_rows(db.query(*_raw_columns(source)).filter(raw.id > watermark, *raw_filters), in_rollups=True)
+
+    return dict(results)
+
+
+def ai_cost_usage(
+    db: Session,
+    group_by: Sequence[str] = (),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    with_latency: bool = False,
+    **filters: Any
+) -> Dict[Tuple, UsageStats]:
+    """
+    AI cost usage grouped by agent_type/agent_mode/provider/model and/or "day"/"hour".
+
+    Args:
+        db: Database session
+        group_by: Group fields; () returns a single total under the key ()
+        start: Range start (inclusive), None for unbounded
+        end: Range end (exclusive), None for unbounded
+        with_latency: Include a latency sketch per group
+        **filters: Equality filters (agent_type, agent_mode, provider, model, lead_id)
+
+    Returns:
+        Dict mapping group key tuples to UsageStats
+    """
+    return _collect(db, AI_COST_SOURCE, AI_COST_ROLLUP, group_by, start, end, with_latency, filters)
+
+
+def ai_cost_lead_usage(
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    **filters: Any
+) -> Dict[Tuple[int, str], UsageStats]:
+    """
+    AI cost usage of rows with a lead, keyed by (lead_id, agent_type).
+
+    Args:
+        db: Database session
+        start: Range start (inclusive), None for unbounded
+        end: Range end (exclusive), None for unbounded
+        **filters: Equality filters (lead_id, agent_type)
+    """
+    return _collect(
+        db, AI_COST_SOURCE, AI_COST_LEAD_ROLLUP, ("lead_id", "agent_type"), start, end, False, filters
+    )
+
+
+def api_call_usage(
+    db: Session,
+    group_by: Sequence[str] = (),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    with_latency: bool = False,
+    **filters: Any
+) -> Dict[Tuple, UsageStats]:
+    """
+    Unified API call usage grouped by provider/model/operation_type and/or "day"/"hour".
+
+    Args:
+        db: Database session
+        group_by: Group fields; () returns a single total under the key ()
+        start: Range start (inclusive), None for unbounded
+        end: Range end (exclusive), None for unbounded
+        with_latency: Include a latency sketch per group
+        **filters: Equality filters (provider, model, operation_type)
+    """
+    return _collect(db, API_CALL_SOURCE, API_CALL_ROLLUP, group_by, start, end, with_latency, filters)
@@ -13,6 +13,8 @@ import logging
 from redis import asyncio as aioredis
 
 from app.models.unified_api_call import APICallLog, ProviderType, OperationType
+from app.services.usage_rollups import api_call_usage
+from app.services.telemetry_sink import get_telemetry_sink
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +57,7 @@ class UsageTracker:
     - Redis caching for real-time metrics (5min TTL, >90% hit rate)
     - Time-series aggregations (hourly, daily, monthly)
     - Cost analysis by provider/model/operation
-    - Latency percentile calculations (p50, p95, p99)
+    - Latency percentile calculations (p50, p95, p99) from rollup sketches
     """
 
     REDIS_CACHE_KEY = "usage:realtime:last24h"
@@ -156,7 +158,8 @@ class UsageTracker:
             error_message: Error details if call failed
 
         Returns:
-            Created APICallLog instance
+            APICallLog instance (not yet persisted when buffered by the
+            telemetry sink)
         """
         total_tokens = prompt_tokens + completion_tokens
 
@@ -165,8 +168,7 @@ class UsageTracker:
             provider, model, prompt_tokens, completion_tokens
         )
 
-        # Create log entry
-        log_entry = APICallLog(
+        values = dict(
             provider=provider,
             model=model,
             endpoint=endpoint,
@@ -184,9 +186,12 @@ class UsageTracker:
             error_message=error_message
         )
 
-        self.db.add(log_entry)
-        self.db.commit()
-        self.db.refresh(log_entry)
+        # Buffered by the telemetry sink when running (flushed in batches)
+        log_entry = APICallLog(**values)
+        if not get_telemetry_sink().record(APICallLog, values):
+            self.db.add(log_entry)
+            self.db.commit()
+            self.db.refresh(log_entry)
 
         # Invalidate Redis cache asynchronously (don't block)
         if self._cache_enabled and self.redis:
@@ -403,30 +408,25 @@ class UsageTracker:
         Returns:
             Dict with p50, p95, p99 latency values in milliseconds
         """
-        # Use PostgreSQL percentile_cont function
-        conditions = [
-            APICallLog.created_at >= start_date,
-            APICallLog.created_at <= end_date
-        ]
-
-        if provider:
-            conditions.append(APICallLog.provider == provider)
-
-        stmt = select(
-            sql_func.percentile_cont(0.50).within_group(APICallLog.latency_ms).label("p50"),
-            sql_func.percentile_cont(0.95).within_group(APICallLog.latency_ms).label("p95"),
-            sql_func.percentile_cont(0.99).within_group(APICallLog.latency_ms).label("p99"),
-        ).where(and_(*conditions))
-
-        result = self.db.execute(stmt).first()
+        # Merge hourly/daily latency sketches instead of sorting raw latencies;
+        # values are within 1% of the exact percentiles
+        filters = {"provider": provider} if provider else {}
+        usage = api_call_usage(
+            self.db,
+            start=start_date,
+            end=end_date + timedelta(microseconds=1),  # Inclusive end_date
+            with_latency=True,
+            **filters
+        )
 
-        if not result:
+        stats = usage.get(())
+        if not stats or stats.sketch is None:
             return {"p50": 0, "p95": 0, "p99": 0}
 
         return {
-            "p50": int(result.p50 or 0),
-            "p95": int(result.p95 or 0),
-            "p99": int(result.p99 or 0),
+            "p50": int(round(stats.sketch.quantile(0.50))),
+            "p95": int(round(stats.sketch.quantile(0.95))),
+            "p99": int(round(stats.sketch.quantile(0.99))),
         }
 
     def get_success_rate(
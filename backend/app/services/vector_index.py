@@ -0,0 +1,123 @@
+"""
+In-memory vector index
+
+Exact cosine top-k over L2-normalized embeddings, partitioned by customer.
+Used by KnowledgeBaseService when the database is not PostgreSQL with
+pgvector (SQLite in tests and local development), and as the exact
+baseline when measuring HNSW recall.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """Return float32 rows scaled to unit length (zero rows stay zero)"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class InMemoryVectorIndex:
+    """
+    Per-customer matrix of normalized embeddings with brute-force search.
+
+    Rows added since the last search are kept as pending blocks and
+    concatenated on the next search, so bulk loads stay linear.
+
+    Examples:
+        >>> index = InMemoryVectorIndex(dimension=2)
+        >>> index.add(1, [10, 11], [[1.0, 0.0], [0.0, 1.0]])
+        >>> index.search(1, [0.9, 0.1], k=1)[0][0]
+        10
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._ids: Dict[int, np.ndarray] = {}
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._pending: Dict[int, List[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def __contains__(self, customer_id: int) -> bool:
+        return customer_id in self._ids or customer_id in self._pending
+
+    def __len__(self) -> int:
+        return sum(self.size(customer_id) for customer_id in set(self._ids) | set(self._pending))
+
+    def size(self, customer_id: int) -> int:
+        """Number of vectors stored for a customer"""
+        pending = sum(len(ids) for ids, _ in self._pending.get(customer_id, []))
+        return len(self._ids.get(customer_id, ())) + pending
+
+    def add(self, customer_id: int, ids: Sequence[int], vectors) -> None:
+        """
+        Add vectors for a customer (an empty add marks the customer as loaded).
+
+        Args:
+            customer_id: Partition key
+            ids: Caller's id per vector (e.g. chunk primary keys)
+            vectors: (len(ids), dimension) array-like; normalized here
+        """
+        ids_array = np.asarray(ids, dtype=np.int64)
+        matrix = normalize_rows(vectors) if len(ids_array) else np.empty((0, self.dimension), dtype=np.float32)
+        if matrix.shape != (len(ids_array), self.dimension):
+            raise ValueError(f"Expected {len(ids_array)} vectors of dimension {self.dimension}, got {matrix.shape}")
+        self._pending.setdefault(customer_id, []).append((ids_array, matrix))
+
+    def remove(self, customer_id: int, ids: Iterable[int]) -> None:
+        """Drop vectors by id from a customer's partition"""
+        self._compact(customer_id)
+        if customer_id not in self._ids:
+            return
+        keep = ~np.isin(self._ids[customer_id], np.fromiter(ids, dtype=np.int64))
+        self._ids[customer_id] = self._ids[customer_id][keep]
+        self._vectors[customer_id] = self._vectors[customer_id][keep]
+
+    def clear(self, customer_id: Optional[int] = None) -> None:
+        """Forget one customer's partition (it must be loaded again), or all"""
+        if customer_id is None:
+            self._ids.clear()
+            self._vectors.clear()
+            self._pending.clear()
+            return
+        self._ids.pop(customer_id, None)
+        self._vectors.pop(customer_id, None)
+        self._pending.pop(customer_id, None)
+
+    def _compact(self, customer_id: int) -> None:
+        blocks = self._pending.pop(customer_id, None)
+        if not blocks:
+            return
+        if customer_id in self._ids:
+            blocks.insert(0, (self._ids[customer_id], self._vectors[customer_id]))
+        self._ids[customer_id] = np.concatenate([ids for ids, _ in blocks])
+        self._vectors[customer_id] = np.concatenate([vectors for _, vectors in blocks])
+
+    def search(self, customer_id: int, query, k: int) -> List[Tuple[int, float]]:
+        """
+        Top-k vectors by cosine similarity within a customer's partition.
+
+        Args:
+            customer_id: Partition to search
+            query: Query embedding (normalized here)
+            k: Maximum results
+
+        Returns:
+            List of (id, cosine similarity), most similar first
+        """
+        self._compact(customer_id)
+        vectors = self._vectors.get(customer_id)
+        if vectors is None or not len(vectors) or k <= 0:
+            return []
+
+        scores = vectors @ normalize_rows(query)[0]
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        ids = self._ids[customer_id]
+        return [(int(ids[i]), float(scores[i])) for i in top]
@@ -8,11 +8,17 @@ Implements the TalkingNode architecture for sub-2000ms voice turns:
 4. WebSocket streaming
 
 Based on Cerebras's ReasoningNode pattern for minimal latency.
+
+Streaming turns (process_audio_turn_streaming) pipeline steps 2 and 3:
+Cerebras tokens are cut at sentence/clause boundaries and each chunk is
+synthesized while later tokens are still being generated, so
+time-to-first-audio no longer includes the full completion.
 """
 
 import asyncio
 import json
 import logging
+import re
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -24,10 +30,72 @@ import redis.asyncio as redis
 
 from .cartesia_service import CartesiaService, VoiceConfig, VoiceEmotion, VoiceSpeed
 from .cerebras import CerebrasService
+from app.models import Lead, AsyncSessionLocal
 from app.core.exceptions import VoiceSessionNotFoundError, MissingAPIKeyError
 
 logger = logging.getLogger(__name__)
 
+# Speech chunk boundaries for streaming TTS
+SENTENCE_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s")
+CLAUSE_BOUNDARY = re.compile(r"[,;:\u2014]\s")
+MIN_CLAUSE_CHARS = 40  # Don't cut clauses shorter than this (choppy prosody)
+MAX_CHUNK_CHARS = 200  # Force a cut at whitespace past this length
+
+
+def _find_speech_boundary(text: str, min_clause_chars: int, max_chars: int) -> Optional[int]:
+    """Return the index to cut `text` at, or None to keep buffering."""
+    sentence = SENTENCE_BOUNDARY.search(text)
+    if sentence:
+        return sentence.end()
+
+    if len(text) >= min_clause_chars:
+        clause_end = None
+        for match in CLAUSE_BOUNDARY.finditer(text):
+            if match.end() >= min_clause_chars:
+                clause_end = match.end()
+        if clause_end:
+            return clause_end
+
+    if len(text) >= max_chars:
+        space = text.rfind(" ", 0, max_chars)
+        return space + 1 if space > 0 else max_chars
+
+    return None
+
+
+async def iter_speech_chunks(
+    tokens: AsyncIterator[str],
+    min_clause_chars: int = MIN_CLAUSE_CHARS,
+    max_chars: int = MAX_CHUNK_CHARS
+) -> AsyncIterator[str]:
+    """
+    Regroup streamed LLM tokens into speakable chunks.
+
+    Chunks end at sentence boundaries, at clause boundaries once at least
+    `min_clause_chars` are buffered, or at whitespace past `max_chars`.
+
+    Args:
+        tokens: Async iterator of text deltas
+        min_clause_chars: Minimum chunk length for clause-level cuts
+        max_chars: Hard chunk length limit
+
+    Yields:
+        Stripped, non-empty text chunks in order
+    """
+    buffer = ""
+    async for token in tokens:
+        buffer += token
+        while True:
+            cut = _find_speech_boundary(buffer, min_clause_chars, max_chars)
+            if cut is None:
+                break
+            chunk, buffer = buffer[:cut].strip(), buffer[cut:]
+            if chunk:
+                yield chunk
+
+    if buffer.strip():
+        yield buffer.strip()
+
 
 class ConversationState(str, Enum):
     """Voice conversation states."""
@@ -49,7 +117,8 @@ class VoiceTurn:
     stt_latency_ms: Optional[int] = None
     inference_latency_ms: Optional[int] = None
     tts_latency_ms: Optional[int] = None
-    total_latency_ms: Optional[int] = None
+    total_latency_ms: Optional[int] = None  # Turn start to first audio chunk
+    turn_duration_ms: Optional[int] = None  # Turn start to last audio chunk
     timestamp: datetime = field(default_factory=datetime.now)
     error: Optional[str] = None
 
@@ -63,6 +132,7 @@ class VoiceSession:
     state: ConversationState = ConversationState.IDLE
     turns: List[VoiceTurn] = field(default_factory=list)
     context: Dict[str, Any] = field(default_factory=dict)
+    lead_data: Optional[Dict[str, Any]] = None  # Prefetched at session creation
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     total_turns: int = 0
@@ -116,6 +186,33 @@ If you don't understand something, ask for clarification naturally."""
 
         return response.get("text", "I'm sorry, I didn't catch that. Could you repeat?")
 
+    async def stream_reason(
+        self,
+        transcript: str,
+        context: Dict[str, Any],
+        lead_data: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the AI response as tokens are generated.
+
+        Args:
+            transcript: User's speech transcript
+            context: Conversation context
+            lead_data: Optional lead information
+
+        Yields:
+            Response text deltas
+        """
+        prompt = self._build_prompt(transcript, context, lead_data)
+
+        async for token in self.cerebras.astream_completion(
+            prompt=prompt,
+            system_prompt=self.system_prompt,
+            temperature=0.7,
+            max_tokens=150  # Keep responses concise for voice
+        ):
+            yield token
+
     def _build_prompt(
         self,
         transcript: str,
@@ -161,17 +258,30 @@ class VoiceAgent:
     Total target: <2000ms turn latency
     """
 
-    def __init__(self, redis_url: Optional[str] = None):
-        """Initialize voice agent with all required services."""
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        cartesia_service: Optional[CartesiaService] = None,
+        cerebras_service: Optional[CerebrasService] = None
+    ):
+        """
+        Initialize voice agent with all required services.
+
+        Args:
+            redis_url: Redis URL for session persistence
+            cartesia_service: Voice service (created if omitted)
+            cerebras_service: Inference service (created if omitted)
+        """
         # Initialize services
-        self.cartesia = CartesiaService()
+        self.cartesia = cartesia_service or CartesiaService()
         
         # Initialize Cerebras service (optional - may fail if SDK not installed)
-        try:
-            self.cerebras = CerebrasService()
-        except (ImportError, MissingAPIKeyError):
-            self.cerebras = None
-            logger.warning("CerebrasService unavailable. Voice agent features will be limited.")
+        self.cerebras = cerebras_service
+        if self.cerebras is None:
+            try:
+                self.cerebras = CerebrasService()
+            except (ImportError, MissingAPIKeyError):
+                logger.warning("CerebrasService unavailable. Voice agent features will be limited.")
         
         if self.cerebras:
             self.talking_node = TalkingNode(self.cerebras)
@@ -186,6 +296,9 @@ class VoiceAgent:
         # Active sessions
         self.sessions: Dict[str, VoiceSession] = {}
 
+        # In-flight lead context prefetches, keyed by session ID
+        self._lead_prefetch: Dict[str, asyncio.Task] = {}
+
         # Performance tracking
         self.latency_buffer: List[int] = []
         self.max_buffer_size = 100
@@ -244,6 +357,10 @@ class VoiceAgent:
         # Store session
         self.sessions[session_id] = session
 
+        # Load lead context in the background so turns don't query the DB
+        if lead_id:
+            self._lead_prefetch[session_id] = asyncio.create_task(self._get_lead_data(lead_id))
+
         # Persist to Redis
         await self._save_session_to_redis(session)
 
@@ -317,10 +434,8 @@ class VoiceAgent:
             # 2. AI Reasoning (target: 633ms)
             inference_start = time.perf_counter()
 
-            # Get lead data if available
-            lead_data = None
-            if session.lead_id:
-                lead_data = await self._get_lead_data(session.lead_id)
+            # Get lead data if available (prefetched at session creation)
+            lead_data = await self._get_session_lead_data(session)
 
             # Generate response using TalkingNode
             ai_response = await self.talking_node.reason(
@@ -339,16 +454,7 @@ class VoiceAgent:
             }
 
             # Update conversation context
-            if "recent_turns" not in session.context:
-                session.context["recent_turns"] = []
-
-            session.context["recent_turns"].append({
-                "user": turn.user_transcript,
-                "assistant": ai_response
-            })
-
-            # Keep only last 10 turns in context
-            session.context["recent_turns"] = session.context["recent_turns"][-10:]
+            self._append_recent_turn(session, turn)
 
             # Update state
             session.state = ConversationState.SPEAKING
@@ -400,46 +506,189 @@ class VoiceAgent:
                     }
                 }
 
-            # Update state
-            session.state = ConversationState.IDLE
+            turn.turn_duration_ms = int((time.perf_counter() - turn_start) * 1000)
+
+            async for message in self._complete_turn(session, turn):
+                yield message
+
+        except Exception as e:
+            # Handle errors
+            session.state = ConversationState.ERROR
+            turn.error = str(e)
+            session.turns.append(turn)
+
+            logger.error(f"Voice turn failed: {e}")
+
             yield {
-                "type": "state",
-                "state": "idle"
+                "type": "error",
+                "error": str(e),
+                "turn_id": turn_id
             }
 
-            # Save turn to session
-            session.turns.append(turn)
-            session.total_turns += 1
-            session.updated_at = datetime.now()
+    async def process_audio_turn_streaming(
+        self,
+        session_id: str,
+        audio_data: bytes,
+        sample_rate: int = 16000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a voice turn with LLM and TTS pipelined.
 
-            # Update average latency
-            if session.total_turns > 0:
-                total_latency = sum(t.total_latency_ms for t in session.turns if t.total_latency_ms)
-                session.average_latency_ms = total_latency / session.total_turns
+        Cerebras tokens are streamed and cut into sentence/clause chunks
+        (iter_speech_chunks); the first chunk is synthesized while later
+        tokens are still generating. Emits the same message types as
+        process_audio_turn, plus "response_chunk" for each spoken chunk.
 
-            # Persist to Redis
-            await self._save_session_to_redis(session)
+        Metrics: inference_latency_ms is the time to the first speech chunk,
+        tts_latency_ms the time from that chunk to its first audio, and
+        total_latency_ms the time to first audio.
+
+        Args:
+            session_id: Session identifier
+            audio_data: User's audio input
+            sample_rate: Audio sample rate
+
+        Yields:
+            Dict chunks with status updates and audio data
+        """
+        if session_id not in self.sessions:
+            raise VoiceSessionNotFoundError(f"Session {session_id} not found", context={"session_id": session_id})
+
+        session = self.sessions[session_id]
+        turn_id = str(uuid4())
+        turn = VoiceTurn(turn_id=turn_id, user_audio=audio_data)
+        turn_start = time.perf_counter()
+        producer: Optional[asyncio.Task] = None
 
-            # Final completion message
+        try:
+            session.state = ConversationState.LISTENING
             yield {
-                "type": "complete",
+                "type": "state",
+                "state": "listening",
                 "turn_id": turn_id,
-                "metrics": {
-                    "stt_latency_ms": turn.stt_latency_ms,
-                    "inference_latency_ms": turn.inference_latency_ms,
-                    "tts_latency_ms": turn.tts_latency_ms,
-                    "total_latency_ms": turn.total_latency_ms,
-                    "session_average_ms": session.average_latency_ms
+                "timestamp": datetime.now().isoformat()
+            }
+
+            # 1. Speech-to-Text (lead context was prefetched meanwhile)
+            stt_result = await self.cartesia.speech_to_text(
+                audio_data=audio_data,
+                sample_rate=sample_rate,
+                language=session.voice_config.language
+            )
+            turn.user_transcript = stt_result["transcript"]
+            turn.stt_latency_ms = stt_result["latency_ms"]
+
+            yield {
+                "type": "transcript",
+                "text": turn.user_transcript,
+                "confidence": stt_result["confidence"],
+                "latency_ms": turn.stt_latency_ms
+            }
+
+            session.state = ConversationState.PROCESSING
+            yield {
+                "type": "state",
+                "state": "processing"
+            }
+
+            # 2. Stream tokens into speech chunks on a producer task so
+            # generation continues while chunks are being synthesized
+            lead_data = await self._get_session_lead_data(session)
+            inference_start = time.perf_counter()
+            chunks: asyncio.Queue = asyncio.Queue()
+
+            async def produce_chunks():
+                try:
+                    async for chunk in iter_speech_chunks(self.talking_node.stream_reason(
+                        transcript=turn.user_transcript,
+                        context=session.context,
+                        lead_data=lead_data
+                    )):
+                        await chunks.put(chunk)
+                finally:
+                    await chunks.put(None)
+
+            producer = asyncio.create_task(produce_chunks())
+
+            # 3. Synthesize chunks in order as they arrive
+            spoken: List[str] = []
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+
+                if not spoken:
+                    turn.inference_latency_ms = int((time.perf_counter() - inference_start) * 1000)
+                    session.state = ConversationState.SPEAKING
+                    yield {
+                        "type": "state",
+                        "state": "speaking"
+                    }
+                spoken.append(chunk)
+
+                yield {
+                    "type": "response_chunk",
+                    "text": chunk,
+                    "index": len(spoken) - 1
                 }
+
+                tts_start = time.perf_counter()
+                async for audio_chunk in self.cartesia.stream_to_session(
+                    session_id=session_id,
+                    text=chunk
+                ):
+                    if turn.total_latency_ms is None:
+                        turn.tts_latency_ms = int((time.perf_counter() - tts_start) * 1000)
+                        turn.total_latency_ms = int((time.perf_counter() - turn_start) * 1000)
+                        self._record_latency(turn.total_latency_ms)
+
+                        if turn.total_latency_ms > 2000:
+                            logger.warning(
+                                f"Turn latency {turn.total_latency_ms}ms exceeds 2000ms target"
+                            )
+
+                    yield {
+                        "type": "audio",
+                        "data": audio_chunk,
+                        "format": {
+                            "encoding": session.voice_config.encoding,
+                            "sample_rate": session.voice_config.sample_rate,
+                            "container": session.voice_config.container
+                        }
+                    }
+
+            # Surface generation errors raised after the last chunk
+            await producer
+
+            turn.ai_response = " ".join(spoken)
+            turn.turn_duration_ms = int((time.perf_counter() - turn_start) * 1000)
+
+            logger.info(
+                f"Streaming voice turn {turn_id} completed: "
+                f"STT={turn.stt_latency_ms}ms, "
+                f"FirstChunk={turn.inference_latency_ms}ms, "
+                f"FirstAudio={turn.total_latency_ms}ms, "
+                f"Duration={turn.turn_duration_ms}ms, "
+                f"Chunks={len(spoken)}"
+            )
+
+            yield {
+                "type": "response",
+                "text": turn.ai_response,
+                "latency_ms": turn.inference_latency_ms
             }
 
+            self._append_recent_turn(session, turn)
+
+            async for message in self._complete_turn(session, turn, speech_chunks=len(spoken)):
+                yield message
+
         except Exception as e:
-            # Handle errors
             session.state = ConversationState.ERROR
             turn.error = str(e)
             session.turns.append(turn)
 
-            logger.error(f"Voice turn failed: {e}")
+            logger.error(f"Streaming voice turn failed: {e}")
 
             yield {
                 "type": "error",
@@ -447,6 +696,63 @@ class VoiceAgent:
                 "turn_id": turn_id
             }
 
+        finally:
+            if producer and not producer.done():
+                producer.cancel()
+
+    async def _complete_turn(
+        self,
+        session: VoiceSession,
+        turn: VoiceTurn,
+        **extra_metrics: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Record a finished turn on the session and emit idle/complete messages."""
+        # Update state
+        session.state = ConversationState.IDLE
+        yield {
+            "type": "state",
+            "state": "idle"
+        }
+
+        # Save turn to session
+        session.turns.append(turn)
+        session.total_turns += 1
+        session.updated_at = datetime.now()
+
+        # Update average latency
+        if session.total_turns > 0:
+            total_latency = sum(t.total_latency_ms for t in session.turns if t.total_latency_ms)
+            session.average_latency_ms = total_latency / session.total_turns
+
+        # Persist to Redis
+        await self._save_session_to_redis(session)
+
+        # Final completion message
+        yield {
+            "type": "complete",
+            "turn_id": turn.turn_id,
+            "metrics": {
+                "stt_latency_ms": turn.stt_latency_ms,
+                "inference_latency_ms": turn.inference_latency_ms,
+                "tts_latency_ms": turn.tts_latency_ms,
+                "total_latency_ms": turn.total_latency_ms,
+                "turn_duration_ms": turn.turn_duration_ms,
+                "session_average_ms": session.average_latency_ms,
+                **extra_metrics
+            }
+        }
+
+    def _append_recent_turn(self, session: VoiceSession, turn: VoiceTurn):
+        """Add a turn to the conversation context (last 10 turns kept)."""
+        if "recent_turns" not in session.context:
+            session.context["recent_turns"] = []
+
+        session.context["recent_turns"].append({
+            "user": turn.user_transcript,
+            "assistant": turn.ai_response
+        })
+        session.context["recent_turns"] = session.context["recent_turns"][-10:]
+
     async def adjust_voice_emotion(
         self,
         session_id: str,
@@ -477,6 +783,11 @@ class VoiceAgent:
         if session_id in self.sessions:
             session = self.sessions[session_id]
 
+            # Drop a lead prefetch that never got used
+            prefetch = self._lead_prefetch.pop(session_id, None)
+            if prefetch and not prefetch.done():
+                prefetch.cancel()
+
             # Close Cartesia session
             await self.cartesia.close_voice_session(session_id)
 
@@ -613,11 +924,29 @@ class VoiceAgent:
 
         return session
 
+    async def _get_session_lead_data(self, session: VoiceSession) -> Optional[Dict[str, Any]]:
+        """Return the session's lead context, awaiting the prefetch on first use."""
+        if session.lead_data is None and session.lead_id:
+            prefetch = self._lead_prefetch.pop(session.session_id, None)
+            session.lead_data = await (prefetch or self._get_lead_data(session.lead_id))
+        return session.lead_data
+
     async def _get_lead_data(self, lead_id: int) -> Optional[Dict[str, Any]]:
-        """Get lead data for context (placeholder for actual DB query)."""
-        # TODO: Integrate with actual database
+        """Load lead fields used for conversation context."""
+        try:
+            async with AsyncSessionLocal() as db:
+                lead = await db.get(Lead, lead_id)
+        except Exception as e:
+            logger.warning(f"Failed to load lead {lead_id} for voice context: {e}")
+            return None
+
+        if not lead:
+            return None
+
         return {
-            "company_name": "Example Corp",
-            "industry": "Technology",
-            "company_size": "100-500"
-        }
\ No newline at end of file
+            "company_name": lead.company_name,
+            "industry": lead.industry,
+            "company_size": lead.company_size,
+            "contact_name": lead.contact_name,
+            "contact_title": lead.contact_title
+        }
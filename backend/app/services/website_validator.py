@@ -14,6 +14,8 @@ import time
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from bs4 import BeautifulSoup
+
+from app.core.http_clients import get_http_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -80,16 +82,10 @@ class WebsiteValidator:
         "president", "founder", "co-founder"
     ]
 
-    def __init__(self):
-        """Initialize website validator with HTTP client"""
-        self.client = httpx.AsyncClient(
-            timeout=self.TIMEOUT_SECONDS,
-            follow_redirects=True,
-            max_redirects=self.MAX_REDIRECTS,
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; SalesAgentBot/1.0; +http://example.com/bot)"
-            }
-        )
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled client (timeout, redirects and User-Agent in PROVIDER_HTTP_CONFIGS)"""
+        return get_http_client("website_validator")
 
     async def validate(self, website_url: str) -> WebsiteValidationResult:
         """
@@ -288,8 +284,7 @@ class WebsiteValidator:
             return []
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """No-op: the pooled HTTP client is shared and closed on app/worker shutdown"""
 
 
 # Singleton instance
@@ -9,6 +9,7 @@ from app.tasks.agent_tasks import (
     execute_workflow_task,
     qualify_lead_async,
     enrich_lead_async,
+    batch_qualify_leads_task,
     ping_task
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "execute_workflow_task", 
     "qualify_lead_async",
     "enrich_lead_async",
+    "batch_qualify_leads_task",
     "ping_task"
 ]
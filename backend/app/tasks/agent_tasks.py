@@ -8,7 +8,7 @@ This module defines async tasks for agent-based lead processing, including:
 - Background enrichment tasks
 """
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from celery import group, chain, chord
 from celery.exceptions import SoftTimeLimitExceeded, Retry
 from sqlalchemy.orm import Session
@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from app.celery_app import celery_app
 from app.models import Lead, CerebrasAPICall, get_db
 from app.services import CerebrasService
+from app.services.telemetry_sink import record_telemetry
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -103,7 +104,7 @@ def qualify_lead_async(
                 completion_est = len(reasoning) // 4
                 cost_info = cerebras_service.calculate_cost(prompt_est, completion_est)
                 
-                api_call = CerebrasAPICall(
+                record_telemetry(db, CerebrasAPICall, dict(
                     endpoint="/chat/completions",
                     model=cerebras_service.default_model,
                     prompt_tokens=prompt_est,
@@ -114,8 +115,7 @@ def qualify_lead_async(
                     cost_usd=cost_info["total_cost_usd"],
                     operation_type="async_lead_qualification",
                     success=True
-                )
-                db.add(api_call)
+                ))
                 db.commit()
                 
                 logger.info(f"Lead {lead_id} qualified: score={score}, latency={latency_ms}ms")
@@ -398,7 +398,7 @@ def sync_crm_contacts_task(
         crm_platform: Platform to sync with (close, apollo, linkedin)
         operation: Sync direction (import, export, bidirectional)
         filters: Optional platform-specific filters
-            - Close: query, created_date_gte, updated_date_gte
+            - Close: query, updated_date_gte, full (ignore sync checkpoints)
             - Apollo: emails (required list)
             - LinkedIn: profile_urls (required list)
 
@@ -433,14 +433,19 @@ def sync_crm_contacts_task(
                 redis_client=redis_client
             )
 
+            async def _sync():
+                try:
+                    return await sync_service.sync_platform(
+                        platform=crm_platform,
+                        direction=operation,
+                        filters=filters
+                    )
+                finally:
+                    from app.core.http_clients import close_http_clients
+                    await close_http_clients()  # Pools are bound to this event loop
+
             # Run async sync operation
-            result = asyncio.run(
-                sync_service.sync_platform(
-                    platform=crm_platform,
-                    direction=operation,
-                    filters=filters
-                )
-            )
+            result = asyncio.run(_sync())
 
             # Convert SyncResult to dict for Celery serialization
             result_dict = {
@@ -535,38 +540,322 @@ def execute_workflow_task(self, workflow_id: str, lead_id: int, workflow_config:
         raise
 
 
+def _run_batch_qualification(lead_ids: Optional[List[int]]) -> Dict[str, Any]:
+    """Run BatchQualificationWorker to completion in this worker process"""
+    import asyncio
+    from app.services.batch_qualifier import BatchQualificationWorker
+
+    def log_progress(progress: Dict[str, Any]) -> None:
+        logger.info(f"Batch qualification progress: {progress}")
+
+    async def _run():
+        # Shared Redis limiter is optional - the local pacer already honors PROVIDER_LIMITS
+        rate_limiter = None
+        try:
+            import os
+            import redis.asyncio as aioredis
+            from app.services.rate_limiter import RateLimiter
+            redis_client = aioredis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+            await redis_client.ping()
+            rate_limiter = RateLimiter(redis_client)
+        except Exception as e:
+            logger.warning(f"Redis not available for batch qualification rate limiting: {e}")
+
+        try:
+            return await BatchQualificationWorker(rate_limiter=rate_limiter).run(
+                lead_ids, progress_callback=log_progress
+            )
+        finally:
+            from app.models import async_engine
+            await async_engine.dispose()  # Pool is bound to this event loop
+
+    return asyncio.run(_run())
+
+
+@celery_app.task(name="batch_qualify_leads", bind=True)
+def batch_qualify_leads_task(self, lead_ids: Optional[List[int]] = None):
+    """
+    Rescore leads with micro-batched, concurrent LLM qualification
+
+    Packs leads into small prompts, runs them concurrently within the
+    Cerebras PROVIDER_LIMITS and writes scores back with bulk UPDATEs.
+    Scheduled nightly for all leads (lead_ids=None).
+
+    Args:
+        lead_ids: Leads to rescore; None rescores every lead
+
+    Returns:
+        Dict with counters and leads_per_second
+    """
+    try:
+        logger.info(f"Batch qualifying {'all' if lead_ids is None else len(lead_ids)} leads")
+        return _run_batch_qualification(lead_ids)
+
+    except SoftTimeLimitExceeded:
+        logger.warning("Soft time limit exceeded for batch qualification")
+        raise
+
+    except Exception as exc:
+        logger.error(f"Error in batch qualification: {exc}", exc_info=True)
+        raise
+
+
 @celery_app.task(name="batch_process_leads", bind=True)
 def batch_process_leads_task(self, lead_ids: List[int], workflow_id: str = "qualify"):
     """
     Process multiple leads in parallel
     
-    Uses Celery group to execute workflows for multiple leads concurrently.
+    The "qualify" workflow runs in-process through BatchQualificationWorker
+    (batched prompts, bounded concurrency, bulk UPDATE). Other workflows are
+    fanned out as a Celery group and returned immediately - this task never
+    blocks on child results, which could deadlock a small worker pool.
     
     Args:
         lead_ids: List of lead database IDs
         workflow_id: Workflow to execute for each lead
         
     Returns:
-        Dict with batch processing results
+        Dict with batch processing results (qualify) or the dispatched group id
     """
     try:
         logger.info(f"Batch processing {len(lead_ids)} leads with workflow {workflow_id}")
         
+        if workflow_id == "qualify":
+            stats = _run_batch_qualification(lead_ids)
+            return {
+                "batch_size": len(lead_ids),
+                "workflow": workflow_id,
+                "results": stats
+            }
+        
         # Create group of workflow tasks
         job = group([
             execute_workflow_task.s(workflow_id, lead_id)
             for lead_id in lead_ids
         ])
         
-        # Execute in parallel
-        results = job.apply_async().get()
+        # Dispatch only - callers poll the group id for results
+        group_result = job.apply_async()
         
         return {
             "batch_size": len(lead_ids),
             "workflow": workflow_id,
-            "results": results
+            "group_id": group_result.id,
+            "task_ids": [child.id for child in group_result.children or []]
         }
         
     except Exception as exc:
         logger.error(f"Error in batch processing: {exc}")
         raise
+
+
+# ============================================================================
+# MEP+E RESCORING TASKS
+# ============================================================================
+
+@celery_app.task(name="rescore_mep_e_leads", bind=True, soft_time_limit=1500, time_limit=1800)
+def rescore_mep_e_leads_task(self, lead_ids: Optional[List[int]] = None):
+    """
+    Recompute MEP+E scores for stored leads (e.g. after a taxonomy change)
+
+    Scores keyset-paginated chunks with the vectorized MEPEScorer.score_batch()
+    and writes only changed leads back, one bulk UPDATE per chunk.
+
+    Args:
+        lead_ids: Leads to rescore; None rescores every lead
+
+    Returns:
+        Dict with leads_scored, leads_updated and leads_per_second
+    """
+    from app.services.scoring.bulk_rescorer import rescore_mep_e_leads
+
+    db: Session = next(get_db())
+    try:
+        logger.info(f"Rescoring MEP+E for {'all' if lead_ids is None else len(lead_ids)} leads")
+        return rescore_mep_e_leads(db, lead_ids)
+
+    except SoftTimeLimitExceeded:
+        logger.warning("Soft time limit exceeded for MEP+E rescoring")
+        raise
+
+    except Exception as exc:
+        logger.error(f"Error rescoring MEP+E leads: {exc}", exc_info=True)
+        raise
+
+    finally:
+        db.close()
+
+
+# ============================================================================
+# ANALYTICS ROLLUP TASKS
+# ============================================================================
+
+@celery_app.task(name="refresh_usage_rollups", bind=True)
+def refresh_usage_rollups_task(self, max_batches: Optional[int] = None):
+    """
+    Fold new AI cost / API call tracking rows into the analytics rollups
+
+    Incremental: each run only reads raw rows above the stored watermark.
+    The first run backfills all history, so it is chunked by max_batches
+    and resumes on the next beat if it hits the time limit.
+
+    Args:
+        max_batches: Stop after this many batches per table (None = catch up)
+
+    Returns:
+        Dict with raw rows folded per table
+    """
+    from app.services.usage_rollups import refresh_usage_rollups
+
+    db: Session = next(get_db())
+    try:
+        return {"rows_rolled_up": refresh_usage_rollups(db, max_batches=max_batches)}
+
+    except SoftTimeLimitExceeded:
+        logger.warning("Soft time limit exceeded for usage rollup refresh; resuming next run")
+        raise
+
+    except Exception as exc:
+        logger.error(f"Error refreshing usage rollups: {exc}", exc_info=True)
+        raise
+
+    finally:
+        db.close()
+
+
+# ============================================================================
+# REPORT EXPORT TASKS
+# ============================================================================
+
+@celery_app.task(name="generate_report_export", bind=True, soft_time_limit=1500, time_limit=1800)
+def generate_report_export_task(
+    self,
+    query_config: Dict[str, Any],
+    format: str,
+    title: str,
+    include_summary: bool = True
+):
+    """
+    Write a large report export to object storage
+
+    Rows are streamed from a server-side cursor into a temporary file,
+    which is uploaded to RunPod storage as exports/<task_id>.<ext>. The
+    export status endpoint turns the object name into a download link.
+
+    Args:
+        query_config: QueryBuilder configuration
+        format: Export format (csv, pdf, xlsx)
+        title: Report title
+        include_summary: Add a summary sheet (xlsx only)
+
+    Returns:
+        Dict with storage object name, filename and row count
+    """
+    import tempfile
+    from app.services.analytics.query_builder import QueryBuilder
+    from app.services.exports.streaming import EXPORT_FORMATS, export_filename, write_export
+    from app.services.runpod_storage import RunPodStorageService
+
+    db: Session = next(get_db())
+    try:
+        logger.info(f"Starting {format} export '{title}' (task {self.request.id})")
+        stream = QueryBuilder(db).build_and_stream(query_config)
+
+        object_name = f"exports/{self.request.id}.{EXPORT_FORMATS[format]['extension']}"
+        with tempfile.TemporaryFile() as out:
+            row_count = write_export(format, stream.columns, stream.batches, out, title, include_summary)
+            out.seek(0)
+            RunPodStorageService().upload_fileobj(out, object_name, EXPORT_FORMATS[format]["media_type"])
+
+        logger.info(f"Export {self.request.id} complete: {row_count} rows -> {object_name}")
+        return {
+            "object_name": object_name,
+            "filename": export_filename(title, format),
+            "format": format,
+            "row_count": row_count,
+        }
+
+    except SoftTimeLimitExceeded:
+        logger.warning(f"Soft time limit exceeded for report export (task {self.request.id})")
+        raise
+
+    except Exception as exc:
+        logger.error(f"Error generating report export: {exc}", exc_info=True)
+        raise
+
+    finally:
+        db.close()
+
+
+# ============================================================================
+# CAMPAIGN MESSAGE GENERATION TASKS
+# ============================================================================
+
+@celery_app.task(
+    name="generate_campaign_messages",
+    bind=True,
+    acks_late=True,
+    max_retries=20,
+    soft_time_limit=1500,
+    time_limit=1800
+)
+def generate_campaign_messages_task(self, campaign_id: int, custom_context: Optional[str] = None):
+    """
+    Generate campaign messages in the background, resumably
+
+    Each chunk of messages is committed as it completes and the run only
+    picks up leads without a message, so a retry (after the soft time
+    limit or a lost worker - the task is acked late) continues where the
+    previous attempt stopped. Validation and force_regenerate cleanup are
+    done by the API before queueing. Progress counters are published as
+    the PROGRESS task state, and each committed chunk invalidates the
+    campaign's cached analytics snapshot.
+
+    Args:
+        campaign_id: Campaign ID
+        custom_context: Override campaign's custom_context for this generation
+
+    Returns:
+        Dict with generation counters for this attempt
+    """
+    import asyncio
+    from app.services.batch_qualifier import ProviderPacer
+    from app.services.outreach import CampaignGenerationEngine, MessageGenerator
+
+    def report_progress(progress: Dict[str, Any]) -> None:
+        self.update_state(state="PROGRESS", meta={"campaign_id": campaign_id, **progress})
+
+    async def _run(db: Session) -> Dict[str, Any]:
+        # Redis client per run: each asyncio.run starts a new event loop
+        import os
+        import redis.asyncio as aioredis
+        from app.services.cache import CampaignAnalyticsCache
+
+        redis_client = aioredis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        try:
+            engine = CampaignGenerationEngine(
+                db,
+                MessageGenerator(),
+                pacer=ProviderPacer.for_provider("cerebras"),
+                analytics_cache=CampaignAnalyticsCache(redis_client)
+            )
+            return await engine.run(campaign_id, custom_context, progress_callback=report_progress)
+        finally:
+            await redis_client.aclose()
+
+    db: Session = next(get_db())
+    try:
+        logger.info(f"Generating messages for campaign {campaign_id} (attempt {self.request.retries + 1})")
+        return asyncio.run(_run(db))
+
+    except SoftTimeLimitExceeded:
+        logger.warning(f"Soft time limit exceeded for campaign {campaign_id} generation; resuming")
+        db.rollback()
+        raise self.retry(countdown=5)
+
+    except Exception as exc:
+        logger.error(f"Error generating messages for campaign {campaign_id}: {exc}", exc_info=True)
+        raise
+
+    finally:
+        db.close()
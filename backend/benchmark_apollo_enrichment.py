@@ -0,0 +1,222 @@
+"""
+Apollo Enrichment Benchmark - Per-Email /people/match vs Cache-First Bulk Match
+
+Runs --contacts lead emails (with --duplicate-pct repeated addresses and
+--unknown-pct addresses Apollo can't match) against an in-process mock Apollo
+API (httpx MockTransport; each call sleeps --latency-ms plus --per-detail-ms
+per person matched) and compares Apollo calls, credits and wall time for:
+- per-email: one ApolloService.enrich_contact (/people/match) per lead,
+  --concurrency at a time (previous batch_enrich_companies / sync_contacts)
+- bulk (cold): ApolloEnrichmentBatcher, empty Apollo person cache
+- bulk (rerun): the same run again, served from the cache
+- per-email (rerun): the previous path again, which has no cache
+
+Credits are charged per matched person, as Apollo bills them. The cache uses
+an in-process Redis stand-in unless --redis-url is given; the shared rate
+limiter is not used (the mock never throttles).
+
+Usage:
+    python benchmark_apollo_enrichment.py
+    python benchmark_apollo_enrichment.py --contacts 10000 --latency-ms 40 --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+DEFAULT_CONTACTS = 10_000
+DEFAULT_LATENCY_MS = 10.0
+DEFAULT_PER_DETAIL_MS = 2.0
+DEFAULT_CONCURRENCY = 5
+
+
+class InMemoryRedis:
+    """Async Redis stand-in (GET/MGET/SETEX/INCRBY and pipelines)"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def incrby(self, key, amount):
+        self.data[key] = int(self.data.get(key, 0)) + amount
+
+    def pipeline(self, transaction=True):
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class MockApollo:
+    """Mock Apollo API; matches every email except @unknown.example"""
+
+    def __init__(self, latency_ms: float, per_detail_ms: float):
+        self.latency = latency_ms / 1000
+        self.per_detail = per_detail_ms / 1000
+        self.calls = 0
+        self.credits = 0
+
+    def person(self, email: str):
+        if email.endswith("@unknown.example"):
+            return None
+        self.credits += 1
+        name = email.split("@")[0]
+        return {"id": f"p-{name}", "email": email, "first_name": name, "last_name": "Bench", "title": "CFO",
+                "organization": {"name": "Bench Corp"}}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        import json
+        self.calls += 1
+        if request.url.path.endswith("/people/bulk_match"):
+            details = json.loads(request.content)["details"]
+            await asyncio.sleep(self.latency + self.per_detail * len(details))
+            before = self.credits
+            matches = [self.person(d["email"]) for d in details]
+            return httpx.Response(200, headers={"x-minute-requests-left": "1000"}, json={
+                "matches": [{"person": p} if p else None for p in matches],
+                "credits_consumed": self.credits - before,
+            })
+        await asyncio.sleep(self.latency + self.per_detail)
+        return httpx.Response(200, json={"person": self.person(request.url.params["email"])})
+
+
+def make_emails(contacts: int, duplicate_pct: float, unknown_pct: float) -> List[str]:
+    rng = random.Random(42)
+    unique = int(contacts * (1 - duplicate_pct / 100))
+    emails = [
+        f"lead{i}@unknown.example" if rng.random() < unknown_pct / 100 else f"lead{i}@customer.example"
+        for i in range(unique)
+    ]
+    emails += [rng.choice(emails) for _ in range(contacts - unique)]
+    rng.shuffle(emails)
+    return emails
+
+
+async def run_per_email(service, emails: List[str], concurrency: int) -> Dict[str, Any]:
+    """Previous path: one /people/match per lead"""
+    semaphore = asyncio.Semaphore(concurrency)
+    matched = 0
+
+    async def enrich(email):
+        nonlocal matched
+        async with semaphore:
+            try:
+                await service.enrich_contact(email=email)
+                matched += 1
+            except Exception:
+                pass  # No match
+
+    await asyncio.gather(*(enrich(email) for email in emails))
+    return {"matched": matched}
+
+
+async def run_bulk(service, cache, emails: List[str], concurrency: int) -> Dict[str, Any]:
+    from app.services.apollo_enrichment_batcher import ApolloEnrichmentBatcher
+
+    batcher = ApolloEnrichmentBatcher(service, cache=cache, max_concurrency=concurrency)
+    result = await batcher.enrich_emails(emails)
+    normalized = [email.lower() for email in emails]
+    return {"matched": sum(1 for email in normalized if result.people.get(email))}
+
+
+async def bench(args) -> List[Dict[str, Any]]:
+    from app.services.apollo import ApolloService
+    from app.services.cache.apollo_cache import ApolloPersonCache
+
+    mock = MockApollo(args.latency_ms, args.per_detail_ms)
+    client = httpx.AsyncClient(
+        base_url="https://api.apollo.io/api/v1",
+        transport=httpx.MockTransport(mock.handler),
+        limits=httpx.Limits(max_connections=20),
+    )
+
+    class BenchmarkApolloService(ApolloService):
+        @property
+        def client(self):
+            return client
+
+    service = BenchmarkApolloService(api_key="benchmark")
+    if args.redis_url:
+        import redis.asyncio as redis
+        redis_client = redis.from_url(args.redis_url, decode_responses=True)
+        await ApolloPersonCache(redis_client).clear_all()
+    else:
+        redis_client = InMemoryRedis()
+    cache = ApolloPersonCache(redis_client)
+
+    emails = make_emails(args.contacts, args.duplicate_pct, args.unknown_pct)
+    cases = [
+        ("per-email", lambda: run_per_email(service, emails, args.concurrency)),
+        ("bulk (cold)", lambda: run_bulk(service, cache, emails, args.concurrency)),
+        ("bulk (rerun)", lambda: run_bulk(service, cache, emails, args.concurrency)),
+        ("per-email (rerun)", lambda: run_per_email(service, emails, args.concurrency)),
+    ]
+
+    results = []
+    for name, run in cases:
+        calls, credits = mock.calls, mock.credits
+        started = time.perf_counter()
+        outcome = await run()
+        results.append({
+            "mode": name,
+            "wall_s": time.perf_counter() - started,
+            "calls": mock.calls - calls,
+            "credits": mock.credits - credits,
+            "matched": outcome["matched"],
+        })
+        print(f"  {results[-1]}")
+
+    await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-email vs cache-first bulk Apollo enrichment")
+    parser.add_argument("--contacts", type=int, default=DEFAULT_CONTACTS)
+    parser.add_argument("--duplicate-pct", type=float, default=10.0, help="Leads repeating an earlier email")
+    parser.add_argument("--unknown-pct", type=float, default=15.0, help="Emails Apollo has no match for")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS, help="Mock latency per call")
+    parser.add_argument("--per-detail-ms", type=float, default=DEFAULT_PER_DETAIL_MS,
+                        help="Mock latency per person matched")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Apollo calls in flight")
+    parser.add_argument("--redis-url", help="Redis for the Apollo person cache (default: in-process fake)")
+    args = parser.parse_args()
+
+    results = asyncio.run(bench(args))
+
+    baseline = results[0]
+    print(f"\n{args.contacts:,} contacts, {args.latency_ms:g} ms + {args.per_detail_ms:g} ms/person mock latency")
+    print("=" * 72)
+    print(f"{'mode':<18} {'calls':>8} {'credits':>8} {'matched':>8} {'wall s':>8} {'speedup':>9}")
+    print("-" * 72)
+    for r in results:
+        speedup = baseline["wall_s"] / r["wall_s"] if r["wall_s"] else float("inf")
+        print(f"{r['mode']:<18} {r['calls']:>8,} {r['credits']:>8,} {r['matched']:>8,} "
+              f"{r['wall_s']:>8.2f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
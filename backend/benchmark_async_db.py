@@ -0,0 +1,183 @@
+"""
+Async DB Benchmark - Event-Loop Lag and Throughput, Sync vs Async Sessions
+
+Simulates N concurrent `async def` request handlers running the hot lead and
+cost queries, and measures:
+- requests per second
+- p50/p99 request latency
+- event-loop lag (how late a 10ms heartbeat task wakes up)
+
+Modes:
+- sync: SessionLocal + db.execute() inside the coroutine (old get_db path,
+  blocks the event loop for every query)
+- async: AsyncSessionLocal + await db.execute() (get_async_db path)
+
+Pass --url to instead drive a running API over HTTP (e.g. before/after a
+deploy); the lag probe then measures the client loop only, so compare RPS
+and latency.
+
+Usage:
+    python benchmark_async_db.py
+    python benchmark_async_db.py --concurrency 200 --requests 2000
+    python benchmark_async_db.py --url http://localhost:8001/api/v1/leads/
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select, func
+
+HEARTBEAT_INTERVAL_S = 0.01
+
+
+def _lead_list_stmt():
+    from app.models import Lead
+    return select(Lead).order_by(Lead.created_at.desc()).limit(100)
+
+
+def _cost_summary_stmt():
+    from app.models.unified_api_call import APICallLog
+    return select(
+        APICallLog.provider,
+        func.sum(APICallLog.cost_usd),
+        func.count(APICallLog.id)
+    ).group_by(APICallLog.provider)
+
+
+async def _sync_request() -> None:
+    from app.models import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.execute(_lead_list_stmt()).scalars().all()
+        db.execute(_cost_summary_stmt()).all()
+    finally:
+        db.close()
+
+
+async def _async_request() -> None:
+    from app.models import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        (await db.execute(_lead_list_stmt())).scalars().all()
+        (await db.execute(_cost_summary_stmt())).all()
+
+
+def _http_request_factory(url: str) -> Callable[[], Awaitable[None]]:
+    import httpx
+
+    client = httpx.AsyncClient(timeout=30.0, limits=httpx.Limits(max_connections=500))
+
+    async def request() -> None:
+        response = await client.get(url)
+        response.raise_for_status()
+
+    return request
+
+
+async def _heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    """Record how late each 10ms sleep wakes up (event-loop lag)"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL_S
+        await asyncio.sleep(HEARTBEAT_INTERVAL_S)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _measure(
+    request: Callable[[], Awaitable[None]],
+    concurrency: int,
+    total_requests: int
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    lags: List[float] = []
+    errors = 0
+    stop = asyncio.Event()
+
+    async def one() -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await request()
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+
+    return {
+        "seconds": round(elapsed, 2),
+        "rps": round(total_requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else 0.0,
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "lag_p99_ms": round(_percentile(lags, 99), 1),
+        "lag_max_ms": round(max(lags), 1) if lags else 0.0,
+        "errors": errors,
+    }
+
+
+async def run(concurrency: int, total_requests: int, url: str = None) -> List[Dict[str, Any]]:
+    results = []
+
+    if url:
+        print(f"HTTP GET {url} ({total_requests} requests, concurrency={concurrency})")
+        stats = await _measure(_http_request_factory(url), concurrency, total_requests)
+        print(f"  http:  {stats}")
+        return [{"mode": "http", **stats}]
+
+    for mode, request in (("sync", _sync_request), ("async", _async_request)):
+        print(f"{mode}: {total_requests} requests, concurrency={concurrency}")
+        stats = await _measure(request, concurrency, total_requests)
+        print(f"  {mode}: {stats}")
+        results.append({"mode": mode, **stats})
+
+    from app.models import async_engine
+    await async_engine.dispose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-loop lag for sync vs async DB sessions")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--url", help="Drive a running API endpoint over HTTP instead")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.concurrency, args.requests, args.url))
+
+    print("\n" + "=" * 80)
+    print(f"{'mode':<6} {'seconds':>8} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'lag p99':>9} {'lag max':>9} {'errors':>7}")
+    print("-" * 80)
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['seconds']:>8} {r['rps']:>9} {r['p50_ms']:>9} {r['p99_ms']:>9} "
+            f"{r['lag_p99_ms']:>9} {r['lag_max_ms']:>9} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Authentication Benchmark - Per-Request User Loads vs Cached Principals
+
+Drives a FastAPI app in-process (no server, no sockets) with authenticated
+requests to an endpoint guarded by PermissionChecker(["read:leads",
+"write:leads"]) and measures per-request time and throughput for:
+- previous: get_current_user + AuthService.check_permission per permission
+  (users query, then lazy role/permission loads; previous PermissionChecker)
+- uncached: get_current_principal with principal caching disabled (one
+  users query plus selectin loads of roles and permissions)
+- redis: principal served from the Redis principal cache (in-process L1
+  cleared before each request; in-process fake unless --redis-url is given)
+- local: principal served from the in-process principal cache
+
+Then runs --logins concurrent logins while a heartbeat task ticks every
+millisecond, comparing bcrypt on the event loop (authenticate_user) with
+the bounded password-hash pool (aauthenticate_user).
+
+Runs on a temporary SQLite database unless --database-url points at a
+scratch PostgreSQL database (its auth tables are dropped and recreated).
+
+Usage:
+    python benchmark_auth.py
+    python benchmark_auth.py --requests 20000 --logins 16 --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+DEFAULT_REQUESTS = 5_000
+DEFAULT_LOGINS = 8
+ROUNDS = 3
+PASSWORD = "Benchmark1"
+REQUIRED_PERMISSIONS = ["read:leads", "write:leads"]
+
+
+class InMemoryRedis:
+    """Async Redis stand-in for the redis case when no --redis-url is given"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+
+
+def seed(session_factory) -> str:
+    """Create default roles and a manager user; returns an access token"""
+    from app.services.auth import AuthService
+
+    with session_factory() as db:
+        service = AuthService(db)
+        service.create_default_roles_and_permissions()
+        user = service.create_user("bench", "bench@example.com", PASSWORD, role_names=["manager"])
+        return service.create_access_token(user)
+
+
+def build_app(stack: str, session_factory) -> FastAPI:
+    from app.dependencies.auth import PermissionChecker, get_current_user
+    from app.models.database import get_db
+    from app.services.auth import AuthService
+
+    def bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def previous_permission_checker(current_user=Depends(get_current_user), db=Depends(get_db)):
+        """Previous PermissionChecker.__call__"""
+        auth_service = AuthService(db)
+        missing = [p for p in REQUIRED_PERMISSIONS if not auth_service.check_permission(current_user, p)]
+        if missing:
+            raise HTTPException(status_code=403)
+        return True
+
+    checker = previous_permission_checker if stack == "previous" else PermissionChecker(REQUIRED_PERMISSIONS)
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = bench_db
+
+    @app.get("/leads/{lead_id}", dependencies=[Depends(checker)])
+    async def get_lead(lead_id: int):
+        return {"id": lead_id}
+
+    return app
+
+
+async def drive(app, token: str, requests: int, clear_local: bool = False) -> List[float]:
+    """Send authenticated requests straight into the ASGI app; returns per-request seconds"""
+    from app.services import auth
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    headers = [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())]
+    timings = []
+    for i in range(requests):
+        if clear_local:
+            auth._local_principals.clear()
+        path = f"/leads/{i}"
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": headers, "client": ("127.0.0.1", 5000), "server": ("bench", 80),
+        }
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        timings.append(time.perf_counter() - started)
+    assert set(statuses) == {200}, f"unexpected statuses: {set(statuses)}"
+    return timings
+
+
+def bench_requests(stack: str, session_factory, token: str, requests: int, redis_client) -> Dict[str, Any]:
+    from app.dependencies import auth as auth_dependencies
+    from app.services import auth
+    from app.services.cache.principal_cache import PrincipalCache
+
+    auth.PRINCIPAL_CACHE_ENABLED = stack in ("redis", "local")
+    principal_cache = PrincipalCache(redis_client) if stack == "redis" else None
+
+    async def get_principal_cache():
+        return principal_cache
+
+    auth_dependencies.get_principal_cache = get_principal_cache
+    auth._local_principals.clear()
+
+    app = build_app(stack, session_factory)
+    loop = asyncio.new_event_loop()
+    clear_local = stack == "redis"
+    loop.run_until_complete(drive(app, token, 200, clear_local))  # Warm up
+    rounds = [loop.run_until_complete(drive(app, token, requests, clear_local)) for _ in range(ROUNDS)]
+    loop.close()
+
+    p50 = statistics.median(statistics.median(r) for r in rounds)
+    return {"stack": stack, "p50_us": p50 * 1e6, "rps": requests / statistics.median(sum(r) for r in rounds)}
+
+
+async def bench_logins(session_factory, logins: int, pooled: bool) -> Dict[str, Any]:
+    """Concurrent logins next to a 1 ms heartbeat; reports wall time and the longest loop stall"""
+    from app.services.auth import AuthService
+
+    stalls = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    async def login():
+        with session_factory() as db:
+            service = AuthService(db)
+            if pooled:
+                user = await service.aauthenticate_user("bench", PASSWORD)
+            else:
+                user = service.authenticate_user("bench", PASSWORD)
+            assert user is not None
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker
+
+    return {
+        "mode": "pool" if pooled else "event loop",
+        "wall_s": elapsed,
+        "logins_per_s": logins / elapsed,
+        "max_stall_ms": max(stalls) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark authenticated request throughput and login latency")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--logins", type=int, default=DEFAULT_LOGINS, help="Concurrent logins")
+    parser.add_argument("--database-url", help="Scratch PostgreSQL database (default: temporary SQLite)")
+    parser.add_argument("--redis-url", help="Redis for the redis case (default: in-process fake)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CEREBRAS_API_KEY", "benchmark")
+    from app.models.database import Base
+    from app.models.security import Permission, Role, SecurityEvent, User, UserConsent, role_permissions, user_roles
+
+    tables = [User.__table__, Role.__table__, Permission.__table__, user_roles, role_permissions,
+              SecurityEvent.__table__, UserConsent.__table__]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.database_url or f"sqlite:///{os.path.join(tmp, 'auth.db')}")
+        Base.metadata.drop_all(engine, tables=tables)
+        Base.metadata.create_all(engine, tables=tables)
+        session_factory = sessionmaker(bind=engine)
+        token = seed(session_factory)
+
+        if args.redis_url:
+            import redis.asyncio as redis
+            redis_client = redis.from_url(args.redis_url, decode_responses=True)
+        else:
+            redis_client = InMemoryRedis()
+
+        results: List[Dict[str, Any]] = []
+        for stack in ("previous", "uncached", "redis", "local"):
+            results.append(bench_requests(stack, session_factory, token, args.requests, redis_client))
+            print(f"  {results[-1]}")
+
+        logins = [asyncio.run(bench_logins(session_factory, args.logins, pooled)) for pooled in (False, True)]
+        engine.dispose()
+
+    baseline = results[0]["p50_us"]
+    print("\n" + "=" * 52)
+    print(f"{'stack':<10} {'p50 us':>10} {'req/s':>10} {'speedup':>10}")
+    print("-" * 52)
+    for r in results:
+        print(f"{r['stack']:<10} {r['p50_us']:>10.1f} {r['rps']:>10,.0f} {baseline / r['p50_us']:>9.1f}x")
+
+    print(f"\n{args.logins} concurrent logins")
+    print("=" * 52)
+    print(f"{'bcrypt on':<12} {'wall s':>8} {'logins/s':>10} {'max loop stall ms':>19}")
+    print("-" * 52)
+    for r in logins:
+        print(f"{r['mode']:<12} {r['wall_s']:>8.2f} {r['logins_per_s']:>10.1f} {r['max_stall_ms']:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Cache Batching Benchmark - Per-Key GET/INCR vs MGET/Pipeline with Compression
+
+Writes --keys enrichment-profile-sized values (~3 KB of JSON each) through
+CacheBase, reads them back together with --miss-pct extra uncached keys, and
+reports Redis round trips, bytes stored and wall time for:
+- previous: per-key GET + INCR and SETEX of json.dumps (previous CacheBase)
+- per-key: CacheBase.get/set (compact JSON, buffered hit/miss counters)
+- batched/json: get_many/set_many in --batch sized pages, no compression
+- batched/orjson+zstd: get_many/set_many, orjson, zstd for values >= 1 KB
+- batched/msgpack+zstd: as above with msgpack (if installed)
+
+Uses an in-process Redis stand-in that adds --rtt-ms per round trip unless
+--redis-url points at a scratch Redis (its bench:* keys are deleted).
+
+Usage:
+    python benchmark_cache_batching.py
+    python benchmark_cache_batching.py --keys 10000 --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_KEYS = 10_000
+DEFAULT_BATCH = 500
+DEFAULT_RTT_MS = 0.2
+PREFIX = "bench"
+
+WORDS = ("revenue operations finance growth platform enterprise pipeline automation analytics "
+         "strategy customer partner cloud security data sales marketing product engineering").split()
+
+
+class InMemoryRedis:
+    """Async Redis stand-in; each awaited call or pipeline execute is one round trip"""
+
+    def __init__(self, rtt_ms: float):
+        self.rtt = rtt_ms / 1000
+        self.data = {}
+        self.round_trips = 0
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+
+    async def get(self, key):
+        await self._round_trip()
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        await self._round_trip()
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        await self._round_trip()
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    async def incr(self, key):
+        await self.incrby(key, 1)
+
+    async def incrby(self, key, amount):
+        await self._round_trip()
+        self.data[key] = int(self.data.get(key, 0)) + amount
+
+    def pipeline(self, transaction=True):
+        return InMemoryPipeline(self)
+
+    def stored_bytes(self, keys):
+        return sum(len(self.data[key]) for key in keys if key in self.data)
+
+
+class InMemoryPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(lambda: self.redis.data.__setitem__(key, value))
+
+    def incrby(self, key, amount):
+        self.commands.append(lambda: self.redis.data.__setitem__(key, int(self.redis.data.get(key, 0)) + amount))
+
+    async def execute(self):
+        await self.redis._round_trip()
+        return [command() for command in self.commands]
+
+
+class CountingRedis:
+    """Counts round trips made through a real redis.asyncio client"""
+
+    def __init__(self, client):
+        self.client = client
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name == "pipeline":
+            def pipeline(*args, **kwargs):
+                pipe = attr(*args, **kwargs)
+                execute = pipe.execute
+
+                async def counted_execute(*a, **kw):
+                    self.round_trips += 1
+                    return await execute(*a, **kw)
+
+                pipe.execute = counted_execute
+                return pipe
+            return pipeline
+        if asyncio.iscoroutinefunction(attr):
+            async def counted(*args, **kwargs):
+                self.round_trips += 1
+                return await attr(*args, **kwargs)
+            return counted
+        return attr
+
+    async def stored_bytes_async(self, keys):
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.strlen(key)
+        return sum(await pipe.execute())
+
+
+def make_profile(rng: random.Random, i: int) -> Dict[str, Any]:
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    return {
+        "linkedin_url": f"https://linkedin.com/in/person-{i}",
+        "name": f"Person {i}",
+        "headline": sentence(8),
+        "summary": sentence(60),
+        "location": rng.choice(["Austin, TX", "New York, NY", "Denver, CO", "Seattle, WA"]),
+        "skills": [rng.choice(WORDS) for _ in range(15)],
+        "experience": [
+            {"company": f"Company {rng.randint(1, 500)}", "title": sentence(3), "description": sentence(25),
+             "start_year": rng.randint(2000, 2020), "end_year": rng.randint(2020, 2025)}
+            for _ in range(5)
+        ],
+        "followers": rng.randint(0, 20_000),
+    }
+
+
+async def run_previous(client, identifiers, profiles, batch):
+    """Previous CacheBase.set/get (json.dumps, GET + INCR per key)"""
+    for identifier, profile in zip(identifiers, profiles):
+        await client.setex(f"{PREFIX}:{identifier}", 86400, json.dumps(profile))
+    write_done = time.perf_counter()
+    for identifier in identifiers + [f"missing-{i}" for i in range(len(identifiers) // 10)]:
+        cached = await client.get(f"{PREFIX}:{identifier}")
+        if cached:
+            await client.incr(f"cache:hits:{PREFIX}")
+            json.loads(cached)
+        else:
+            await client.incr(f"cache:misses:{PREFIX}")
+    return write_done
+
+
+async def run_per_key(cache, identifiers, profiles, batch):
+    for identifier, profile in zip(identifiers, profiles):
+        await cache.set(identifier, profile)
+    write_done = time.perf_counter()
+    for identifier in identifiers + [f"missing-{i}" for i in range(len(identifiers) // 10)]:
+        await cache.get(identifier)
+    return write_done
+
+
+async def run_batched(cache, identifiers, profiles, batch):
+    for start in range(0, len(identifiers), batch):
+        await cache.set_many(dict(zip(identifiers[start:start + batch], profiles[start:start + batch])))
+    write_done = time.perf_counter()
+    lookups = identifiers + [f"missing-{i}" for i in range(len(identifiers) // 10)]
+    for start in range(0, len(lookups), batch):
+        await cache.get_many(lookups[start:start + batch])
+    return write_done
+
+
+async def bench(args) -> List[Dict[str, Any]]:
+    from app.services.cache import base
+    from app.services.cache.base import CacheBase
+    from app.services.cache.serialization import msgpack
+
+    rng = random.Random(42)
+    identifiers = [f"profile-{i}" for i in range(args.keys)]
+    profiles = [make_profile(rng, i) for i in range(args.keys)]
+
+    cases = [
+        ("previous", run_previous, None),
+        ("per-key", run_per_key, {"serializer": "json", "compress": False}),
+        ("batched/json", run_batched, {"serializer": "json", "compress": False}),
+        ("batched/orjson+zstd", run_batched, {"serializer": "orjson", "compress": True}),
+    ]
+    if msgpack is not None:
+        cases.append(("batched/msgpack+zstd", run_batched, {"serializer": "msgpack", "compress": True}))
+
+    real = None
+    if args.redis_url:
+        import redis.asyncio as redis
+        real = redis.from_url(args.redis_url)
+
+    results = []
+    for name, run, codec in cases:
+        if real is not None:
+            keys = [key async for key in real.scan_iter(f"{PREFIX}:*")]
+            if keys:
+                await real.delete(*keys)
+            await real.delete(f"cache:hits:{PREFIX}", f"cache:misses:{PREFIX}")
+            client = CountingRedis(real)
+        else:
+            client = InMemoryRedis(args.rtt_ms)
+
+        base._pending_stats.clear()
+        target = client if codec is None else CacheBase(client, prefix=PREFIX, **codec)
+
+        started = time.perf_counter()
+        write_done = await run(target, identifiers, profiles, args.batch)
+        finished = time.perf_counter()
+        if codec is not None:
+            await target.flush_stats()
+
+        keys = [f"{PREFIX}:{identifier}" for identifier in identifiers]
+        stored = await client.stored_bytes_async(keys) if real is not None else client.stored_bytes(keys)
+        results.append({
+            "mode": name,
+            "round_trips": client.round_trips,
+            "stored_mb": stored / 1e6,
+            "write_s": write_done - started,
+            "read_s": finished - write_done,
+        })
+        print(f"  {results[-1]}")
+
+    if real is not None:
+        await real.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-key vs batched, compressed Redis caching")
+    parser.add_argument("--keys", type=int, default=DEFAULT_KEYS)
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="Keys per get_many/set_many call")
+    parser.add_argument("--rtt-ms", type=float, default=DEFAULT_RTT_MS, help="Round-trip time of the in-process fake")
+    parser.add_argument("--redis-url", help="Scratch Redis (default: in-process fake)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CACHE_STATS_FLUSH_SECONDS", "10")
+    results = asyncio.run(bench(args))
+
+    baseline = results[0]
+    print(f"\n{args.keys:,} keys (+10% misses on read), pages of {args.batch}")
+    print("=" * 84)
+    print(f"{'mode':<22} {'round trips':>12} {'stored MB':>10} {'write s':>8} {'read s':>8} {'speedup':>9}")
+    print("-" * 84)
+    for r in results:
+        speedup = (baseline["write_s"] + baseline["read_s"]) / (r["write_s"] + r["read_s"])
+        print(f"{r['mode']:<22} {r['round_trips']:>12,} {r['stored_mb']:>10.2f} {r['write_s']:>8.2f} "
+              f"{r['read_s']:>8.2f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
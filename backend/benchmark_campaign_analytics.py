@@ -0,0 +1,207 @@
+"""
+Campaign Analytics Benchmark - Per-Tone Scans vs Grouped Aggregation
+
+Seeds one large campaign (--rows variant-analytics rows, 3 per message)
+next to smaller campaigns and measures the latency of computing its
+analytics:
+- per-tone: one MessageVariantAnalytics query per tone with
+  IN (SELECT campaign message ids), rows summed in Python (previous
+  CampaignService.get_campaign_analytics path)
+- grouped: current get_campaign_analytics() - one GROUP BY tone over the
+  campaign_messages join
+- cached: aget_campaign_analytics() served from the Redis snapshot
+  (in-process fake unless --redis-url is given)
+
+Runs on a temporary SQLite database unless --database-url points at a
+scratch PostgreSQL database (its campaign tables are dropped and recreated).
+
+Usage:
+    python benchmark_campaign_analytics.py
+    python benchmark_campaign_analytics.py --rows 1000000 --database-url postgresql+psycopg://localhost/bench
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.campaign import (
+    Campaign,
+    CampaignMessage,
+    MessageStatus,
+    MessageTone,
+    MessageVariantAnalytics,
+)
+from app.models.database import Base
+from app.models.lead import Lead
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_REPEATS = 5
+OTHER_CAMPAIGNS = 4
+OTHER_CAMPAIGN_MESSAGES = 20_000
+INSERT_BATCH_SIZE = 20_000
+TONES = list(MessageTone)
+TABLES = [Lead.__table__, Campaign.__table__, CampaignMessage.__table__, MessageVariantAnalytics.__table__]
+
+
+class InMemoryRedis:
+    """Async Redis stand-in for the cached case when no --redis-url is given"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+
+
+def seed(engine, rows: int) -> int:
+    """Insert the benchmark campaign plus smaller ones; returns the big campaign's id"""
+    rng = random.Random(rows)
+    messages = rows // 3
+    sizes = [(1, messages)] + [(i + 2, OTHER_CAMPAIGN_MESSAGES) for i in range(OTHER_CAMPAIGNS)]
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(insert(Campaign.__table__), [
+            {"id": campaign_id, "name": f"Campaign {campaign_id}", "status": "ACTIVE", "channel": "EMAIL",
+             "total_messages": count, "total_sent": count, "total_delivered": count, "total_cost": 0.0}
+            for campaign_id, count in sizes
+        ])
+
+    message_id = 0
+    for campaign_id, count in sizes:
+        for offset in range(0, count, INSERT_BATCH_SIZE):
+            batch = range(message_id + offset + 1, message_id + min(count, offset + INSERT_BATCH_SIZE) + 1)
+            with engine.begin() as conn:
+                conn.execute(insert(CampaignMessage.__table__), [
+                    {"id": i, "campaign_id": campaign_id, "variants": [], "selected_variant": 0,
+                     "status": MessageStatus.SENT.name, "generation_cost": 0.0}
+                    for i in batch
+                ])
+                analytics = []
+                for i in batch:
+                    for variant, tone in enumerate(TONES):
+                        selected = rng.randint(0, 3)
+                        opened = rng.randint(0, selected)
+                        clicked = rng.randint(0, opened)
+                        analytics.append({
+                            "message_id": i, "variant_number": variant, "tone": tone.name, "body": "body",
+                            "times_selected": selected, "times_opened": opened,
+                            "times_clicked": clicked, "times_replied": rng.randint(0, clicked),
+                        })
+                conn.execute(insert(MessageVariantAnalytics.__table__), analytics)
+        message_id += count
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"  seeded {message_id * 3:,} variant-analytics rows in {time.perf_counter() - started:.1f}s")
+    return 1
+
+
+def per_tone_analytics(db, campaign_id: int) -> List[Dict[str, Any]]:
+    """Previous path: one IN (subquery) scan per tone, aggregated in Python"""
+    variant_performance = []
+    for tone in MessageTone:
+        analytics = db.query(MessageVariantAnalytics).filter(
+            MessageVariantAnalytics.message_id.in_(
+                db.query(CampaignMessage.id).filter(CampaignMessage.campaign_id == campaign_id)
+            ),
+            MessageVariantAnalytics.tone == tone
+        ).all()
+        if not analytics:
+            continue
+        variant_performance.append({
+            "tone": tone.value,
+            "times_selected": sum(a.times_selected for a in analytics),
+            "times_opened": sum(a.times_opened for a in analytics),
+            "times_clicked": sum(a.times_clicked for a in analytics),
+            "times_replied": sum(a.times_replied for a in analytics),
+        })
+        db.expunge_all()
+    return variant_performance
+
+
+def measure(case: str, fn: Callable[[], Any], repeats: int) -> Dict[str, Any]:
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    return {"case": case, "p50_ms": statistics.median(latencies) * 1000, "max_ms": max(latencies) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-tone vs grouped campaign analytics")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Variant-analytics rows in the campaign")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--database-url", help="Scratch PostgreSQL database (default: temporary SQLite)")
+    parser.add_argument("--redis-url", help="Redis for the cached case (default: in-process fake)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CEREBRAS_API_KEY", "benchmark")
+    from app.services.cache import CampaignAnalyticsCache
+    from app.services.outreach import CampaignService
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(args.database_url or f"sqlite:///{os.path.join(tmpdir, 'analytics.db')}")
+        Base.metadata.drop_all(engine, tables=TABLES)
+        Base.metadata.create_all(engine, tables=TABLES)
+        campaign_id = seed(engine, args.rows)
+        db = sessionmaker(bind=engine)()
+
+        if args.redis_url:
+            import redis.asyncio as redis
+            redis_client = redis.from_url(args.redis_url, decode_responses=True)
+        else:
+            redis_client = InMemoryRedis()
+        service = CampaignService(db, analytics_cache=CampaignAnalyticsCache(redis_client))
+
+        expected = per_tone_analytics(db, campaign_id)
+        grouped = service.get_campaign_analytics(campaign_id)["ab_testing"]["variant_performance"]
+        assert [{k: p[k] for k in expected[0]} for p in grouped] == expected, "grouped totals differ"
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(service.aget_campaign_analytics(campaign_id))  # Warm the snapshot
+
+        results = [
+            measure("per-tone", lambda: per_tone_analytics(db, campaign_id), args.repeats),
+            measure("grouped", lambda: service.get_campaign_analytics(campaign_id), args.repeats),
+            measure("cached", lambda: loop.run_until_complete(service.aget_campaign_analytics(campaign_id)), args.repeats),
+        ]
+
+        loop.run_until_complete(service.analytics_cache.invalidate(campaign_id))
+        loop.close()
+        db.close()
+        if args.database_url:
+            Base.metadata.drop_all(engine, tables=TABLES)
+        engine.dispose()
+
+    print("\n" + "=" * 50)
+    print(f"{'case':<12} {'p50 ms':>12} {'max ms':>12}")
+    print("-" * 50)
+    for r in results:
+        print(f"{r['case']:<12} {r['p50_ms']:>12.1f} {r['max_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
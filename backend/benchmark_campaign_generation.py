@@ -0,0 +1,189 @@
+"""
+Campaign Generation Benchmark - Sequential vs Concurrent Message Generation
+
+Seeds a synthetic campaign audience (a share of leads repeat another lead's
+profile, as duplicate imports do) and measures messages/second against a
+stub LLM with fixed latency:
+- sequential: .all() + one blocking generate call, add and flush per lead
+  (previous CampaignService.generate_messages path); timed on the first
+  --sequential-leads leads
+- engine: CampaignGenerationEngine (yield_per streaming, prompt-hash cache,
+  bounded concurrency, bulk inserts per chunk) at several concurrency levels
+
+Writes to a temporary SQLite database in WAL mode.
+
+Usage:
+    python benchmark_campaign_generation.py
+    python benchmark_campaign_generation.py --leads 5000 --latency-ms 400
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.campaign import Campaign, CampaignChannel, CampaignMessage, MessageVariantAnalytics
+from app.models.database import Base
+from app.models.lead import Lead
+
+DEFAULT_LEADS = 5000
+DEFAULT_SEQUENTIAL_LEADS = 100
+DEFAULT_LATENCY_MS = 300
+DEFAULT_DUPLICATE_RATE = 0.2
+CONCURRENCY_LEVELS = (8, 32)
+TABLES = [Lead.__table__, Campaign.__table__, CampaignMessage.__table__, MessageVariantAnalytics.__table__]
+
+
+class StubLLMGenerator:
+    """MessageGenerator stand-in: real prompt building, fixed-latency completions"""
+
+    def __init__(self, latency_ms: int):
+        os.environ.setdefault("CEREBRAS_API_KEY", "benchmark")
+        from app.services.outreach import MessageGenerator
+        self._generator = MessageGenerator()
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def build_variant_prompt(self, *args) -> str:
+        return self._generator.build_variant_prompt(*args)
+
+    def _result(self) -> Dict[str, Any]:
+        self.calls += 1
+        variants = [
+            {"tone": tone, "subject": f"{tone} subject", "body": f"{tone} body " * 40}
+            for tone in ("professional", "friendly", "direct")
+        ]
+        return {"variants": variants, "generation_time_ms": int(self.latency * 1000), "cost_usd": 0.00001, "tokens_used": 650}
+
+    def generate_message_variants(self, channel, lead_context, custom_context=None, template=None) -> Dict[str, Any]:
+        self.build_variant_prompt(channel, lead_context, custom_context, template)
+        time.sleep(self.latency)
+        return self._result()
+
+    async def agenerate_from_prompt(self, prompt: str, channel: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+
+def seed(session_factory, leads: int, duplicate_rate: float) -> int:
+    rng = random.Random(leads)
+    db = session_factory()
+    campaign = Campaign(name="Benchmark", channel=CampaignChannel.EMAIL, min_qualification_score=50)
+    db.add(campaign)
+    profiles = []
+    for i in range(leads):
+        if profiles and rng.random() < duplicate_rate:
+            profile = rng.choice(profiles)
+        else:
+            profile = {
+                "company_name": f"Company {i}", "contact_name": f"Contact {i}", "contact_title": "Owner",
+                "qualification_score": rng.randint(50, 99), "qualification_reasoning": "Installs commercial solar",
+                "industry": "Solar",
+            }
+            profiles.append(profile)
+        db.add(Lead(**profile))
+    db.commit()
+    campaign_id = campaign.id
+    db.close()
+    return campaign_id
+
+
+def run_sequential(session_factory, campaign_id: int, limit: int, latency_ms: int) -> Dict[str, Any]:
+    """Previous path: one blocking generate call and flush per lead"""
+    from app.models.campaign import MessageStatus, MessageTone
+    generator = StubLLMGenerator(latency_ms)
+    db = session_factory()
+    started = time.perf_counter()
+    campaign = db.get(Campaign, campaign_id)
+    leads = db.query(Lead).filter(Lead.qualification_score >= campaign.min_qualification_score).limit(limit).all()
+    for lead in leads:
+        lead_context = {
+            "company_name": lead.company_name, "contact_name": lead.contact_name,
+            "contact_title": lead.contact_title, "qualification_score": lead.qualification_score,
+            "research_summary": lead.qualification_reasoning,
+        }
+        result = generator.generate_message_variants("email", lead_context)
+        message = CampaignMessage(
+            campaign_id=campaign_id, lead_id=lead.id, variants=result["variants"],
+            selected_variant=0, status=MessageStatus.PENDING, generation_cost=result["cost_usd"]
+        )
+        db.add(message)
+        db.flush()
+        for i, variant in enumerate(result["variants"]):
+            db.add(MessageVariantAnalytics(
+                message_id=message.id, variant_number=i, tone=MessageTone(variant["tone"]),
+                subject=variant.get("subject"), body=variant["body"]
+            ))
+    db.commit()
+    seconds = time.perf_counter() - started
+    db.close()
+    return {"case": "sequential", "messages": len(leads), "llm_calls": generator.calls, "seconds": seconds}
+
+
+def run_engine(session_factory, campaign_id: int, latency_ms: int, concurrency: int) -> Dict[str, Any]:
+    from app.services.outreach import CampaignGenerationEngine
+    generator = StubLLMGenerator(latency_ms)
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        stats = asyncio.run(CampaignGenerationEngine(db, generator, max_concurrency=concurrency).run(campaign_id))
+        seconds = time.perf_counter() - started
+    finally:
+        db.close()
+    return {
+        "case": f"engine c={concurrency}", "messages": stats["messages_generated"],
+        "llm_calls": stats["llm_calls"], "seconds": seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark campaign message generation against a stub LLM")
+    parser.add_argument("--leads", type=int, default=DEFAULT_LEADS)
+    parser.add_argument("--sequential-leads", type=int, default=DEFAULT_SEQUENTIAL_LEADS, help="Leads in the sequential case")
+    parser.add_argument("--latency-ms", type=int, default=DEFAULT_LATENCY_MS, help="Stub LLM latency per call")
+    parser.add_argument("--duplicate-rate", type=float, default=DEFAULT_DUPLICATE_RATE, help="Share of leads repeating a profile")
+    args = parser.parse_args()
+
+    # Per-message generation logging would dominate the output
+    logging.disable(logging.INFO)
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cases = [("sequential", None)] + [("engine", c) for c in CONCURRENCY_LEVELS]
+        for case, concurrency in cases:
+            engine = create_engine(f"sqlite:///{os.path.join(tmpdir, f'{case}-{concurrency}.db')}")
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            Base.metadata.create_all(engine, tables=TABLES)
+            session_factory = sessionmaker(bind=engine)
+            campaign_id = seed(session_factory, args.leads, args.duplicate_rate)
+
+            if case == "sequential":
+                limit = min(args.sequential_leads, args.leads)
+                results.append(run_sequential(session_factory, campaign_id, limit, args.latency_ms))
+            else:
+                results.append(run_engine(session_factory, campaign_id, args.latency_ms, concurrency))
+            print(f"  {results[-1]}")
+            engine.dispose()
+
+    print("\n" + "=" * 66)
+    print(f"{'case':<16} {'messages':>10} {'llm calls':>10} {'seconds':>10} {'messages/s':>12}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r['case']:<16} {r['messages']:>10,} {r['llm_calls']:>10,} {r['seconds']:>10.2f} {r['messages'] / r['seconds']:>12,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+AI Cost Analytics Benchmark - Raw Table Scans vs Usage Rollups
+
+Seeds ai_cost_tracking with synthetic rows spread over 90 days (ids increase
+with timestamp, as in production) and times the analytics reads both ways:
+- daily_spend: one day's cost and request count (get_daily_spend)
+- agent_breakdown: 30-day breakdown by agent/mode plus primary provider/model
+  (raw: the previous per-agent N+1 query)
+- time_series: 30 days of daily cost
+- p95_latency: 7-day p95 (raw: fetch and sort every latency)
+
+Rollup reads use the same unaligned window ends as the raw queries, so they
+include the raw edge rows. The refresh itself is timed as a full backfill
+and as an incremental run over a fresh slice of rows.
+
+By default rows live in a temporary SQLite file. Pass --database to seed the
+tables in DATABASE_URL with generate_series (PostgreSQL); this requires an
+empty ai_cost_tracking table, and benchmark rows and rollups are deleted
+afterwards.
+
+Usage:
+    python benchmark_cost_rollups.py
+    python benchmark_cost_rollups.py --rows 1000000 10000000 --database
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models.ai_cost_tracking import AICostTracking
+from app.models.usage_rollups import AICostLeadRollup, AICostRollup, RollupWatermark
+from app.services.usage_rollups import ai_cost_usage, refresh_usage_rollups
+
+DEFAULT_ROW_COUNTS = [10_000_000]
+SPAN_DAYS = 90
+INSERT_BATCH_SIZE = 20_000
+INCREMENTAL_ROWS = 10_000
+REPEATS = 3
+
+AGENTS = ["qualification", "enrichment", "growth", "marketing", "bdr", "conversation", "reengagement"]
+MODES = ["passthrough", "smart_router"]
+MODELS = [("cerebras", "llama3.1-8b"), ("anthropic", "claude-3-5-sonnet"), ("deepseek", "deepseek-chat"), ("ollama", "llama3.1")]
+
+
+def seed_sqlite(session, rows: int, start: datetime, step_seconds: float, first_index: int = 0) -> None:
+    """Insert `rows` synthetic cost rows via executemany"""
+    rng = random.Random(rows + first_index)
+    for offset in range(0, rows, INSERT_BATCH_SIZE):
+        batch = []
+        for i in range(first_index + offset, first_index + min(rows, offset + INSERT_BATCH_SIZE)):
+            provider, model = MODELS[rng.randrange(len(MODELS))]
+            cache_hit = rng.random() < 0.25
+            batch.append({
+                "timestamp": start + timedelta(seconds=i * step_seconds),
+                "agent_type": AGENTS[i % len(AGENTS)],
+                "agent_mode": MODES[i % 2],
+                "lead_id": None,
+                "prompt_tokens": 200,
+                "completion_tokens": 80,
+                "provider": provider,
+                "model": model,
+                "cost_usd": 0 if cache_hit else round(rng.random() / 1000, 8),
+                "latency_ms": int(rng.lognormvariate(6, 0.7)),
+                "cache_hit": cache_hit,
+            })
+        session.execute(insert(AICostTracking.__table__), batch)
+        session.commit()
+
+
+def seed_postgres(session, rows: int, start: datetime, step_seconds: float, first_index: int = 0) -> None:
+    """Insert `rows` synthetic cost rows server-side with generate_series"""
+    session.execute(text("""
+        INSERT INTO ai_cost_tracking (
+            timestamp, agent_type, agent_mode, prompt_tokens, completion_tokens,
+            provider, model, cost_usd, latency_ms, cache_hit
+        )
+        SELECT
+            CAST(:start AS timestamptz) + g * CAST(:step AS double precision) * interval '1 second',
+            (ARRAY[:agents])[1 + g % :agent_count],
+            CASE WHEN g % 2 = 0 THEN 'passthrough' ELSE 'smart_router' END,
+            200, 80,
+            (ARRAY[:providers])[1 + (g / 7) % :model_count],
+            (ARRAY[:models])[1 + (g / 7) % :model_count],
+            CASE WHEN random() < 0.25 THEN 0 ELSE round(CAST(random() / 1000 AS numeric), 8) END,
+            CAST(exp(6 + 0.7 * sqrt(-2 * ln(1 - random())) * cos(2 * pi() * random())) AS integer),
+            false
+        FROM generate_series(CAST(:first AS bigint), CAST(:last AS bigint)) AS g
+        ORDER BY g
+    """), {
+        "start": start, "step": step_seconds, "first": first_index, "last": first_index + rows - 1,
+        "agents": AGENTS, "agent_count": len(AGENTS),
+        "providers": [p for p, _ in MODELS], "models": [m for _, m in MODELS], "model_count": len(MODELS),
+    })
+    session.execute(text("UPDATE ai_cost_tracking SET cache_hit = true WHERE cost_usd = 0"))
+    session.commit()
+
+
+# Previous raw-table queries
+
+def raw_daily_spend(session, day: datetime) -> Any:
+    return session.query(
+        func.sum(AICostTracking.cost_usd), func.count(AICostTracking.id)
+    ).filter(
+        AICostTracking.timestamp >= day, AICostTracking.timestamp < day + timedelta(days=1)
+    ).first()
+
+
+def raw_agent_breakdown(session, start: datetime, end: datetime) -> List[Any]:
+    rows = session.query(
+        AICostTracking.agent_type,
+        AICostTracking.agent_mode,
+        func.count(AICostTracking.id),
+        func.sum(AICostTracking.cost_usd),
+        func.avg(AICostTracking.latency_ms),
+    ).filter(
+        AICostTracking.timestamp >= start, AICostTracking.timestamp < end
+    ).group_by(AICostTracking.agent_type, AICostTracking.agent_mode).all()
+
+    # N+1: most used provider/model per agent, over the whole table
+    return [
+        session.query(
+            AICostTracking.provider, AICostTracking.model, func.count(AICostTracking.id)
+        ).filter(
+            AICostTracking.agent_type == row.agent_type
+        ).group_by(
+            AICostTracking.provider, AICostTracking.model
+        ).order_by(func.count(AICostTracking.id).desc()).first()
+        for row in rows
+    ]
+
+
+def raw_time_series(session, start: datetime, end: datetime) -> List[Any]:
+    return session.query(
+        func.date(AICostTracking.timestamp), func.sum(AICostTracking.cost_usd), func.count(AICostTracking.id)
+    ).filter(
+        AICostTracking.timestamp >= start, AICostTracking.timestamp < end
+    ).group_by(func.date(AICostTracking.timestamp)).all()
+
+
+def raw_p95(session, start: datetime, end: datetime) -> float:
+    latencies = sorted(
+        latency for (latency,) in session.query(AICostTracking.latency_ms).filter(
+            AICostTracking.timestamp >= start, AICostTracking.timestamp < end, AICostTracking.latency_ms.isnot(None)
+        )
+    )
+    return latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+
+
+def _timed(fn: Callable[[], Any], repeats: int = REPEATS) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2)}
+
+
+def _cleanup(session) -> None:
+    for model in (AICostRollup, AICostLeadRollup):
+        session.query(model).delete()
+    session.query(AICostTracking).delete()
+    session.query(RollupWatermark).filter(RollupWatermark.name == "ai_cost_tracking").update({"last_id": 0})
+    session.commit()
+
+
+def run(row_counts: List[int], use_database: bool) -> List[Dict[str, Any]]:
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rows in row_counts:
+            if use_database:
+                from app.models.database import engine
+                seed = seed_postgres
+            else:
+                engine = create_engine(f"sqlite:///{os.path.join(tmpdir, f'costs_{rows}.db')}")
+                Base.metadata.create_all(engine)
+                seed = seed_sqlite
+            session = sessionmaker(bind=engine)()
+            if use_database and session.query(AICostTracking.id).first() is not None:
+                session.close()
+                raise SystemExit("--database needs an empty ai_cost_tracking table")
+
+            try:
+                print(f"\n{rows:,} rows")
+                step_seconds = SPAN_DAYS * 86400 / rows
+                origin = datetime(2026, 1, 1)
+                started = time.perf_counter()
+                seed(session, rows, origin, step_seconds)
+                print(f"  seeded in {time.perf_counter() - started:.1f}s")
+
+                # Unaligned window ends, like "now" in the API
+                end = origin + timedelta(seconds=rows * step_seconds) - timedelta(minutes=37)
+                day = datetime(end.year, end.month, end.day) - timedelta(days=1)
+                month_start, week_start = end - timedelta(days=30), end - timedelta(days=7)
+
+                cases = [
+                    ("daily_spend", lambda: raw_daily_spend(session, day),
+                     lambda: ai_cost_usage(session, start=day, end=day + timedelta(days=1))),
+                    ("agent_breakdown", lambda: raw_agent_breakdown(session, month_start, end),
+                     lambda: ai_cost_usage(session, ("agent_type", "agent_mode", "provider", "model"), start=month_start, end=end)),
+                    ("time_series", lambda: raw_time_series(session, month_start, end),
+                     lambda: ai_cost_usage(session, ("day",), start=month_start, end=end)),
+                    ("p95_latency", lambda: raw_p95(session, week_start, end),
+                     lambda: ai_cost_usage(session, start=week_start, end=end, with_latency=True)[()].sketch.quantile(0.95)),
+                ]
+                raw_stats = {name: _timed(raw_fn) for name, raw_fn, _ in cases}
+
+                started = time.perf_counter()
+                refreshed = refresh_usage_rollups(session, settle_seconds=0)["ai_cost_tracking"]
+                backfill_s = time.perf_counter() - started
+                print(f"  backfill: {refreshed:,} rows in {backfill_s:.1f}s ({refreshed / backfill_s:,.0f} rows/s)")
+
+                for name, _, rollup_fn in cases:
+                    rollup_stats = _timed(rollup_fn)
+                    speedup = round(raw_stats[name]["p50_ms"] / max(rollup_stats["p50_ms"], 0.01), 1)
+                    print(f"  {name:<16} raw {raw_stats[name]}  rollup {rollup_stats}  {speedup}x")
+                    results.append({
+                        "rows": rows, "case": name, "raw_ms": raw_stats[name]["p50_ms"],
+                        "rollup_ms": rollup_stats["p50_ms"], "speedup": speedup,
+                    })
+
+                seed(session, INCREMENTAL_ROWS, origin, step_seconds / 10, first_index=rows * 10)
+                started = time.perf_counter()
+                refreshed = refresh_usage_rollups(session, settle_seconds=0)["ai_cost_tracking"]
+                print(f"  incremental: {refreshed:,} rows in {(time.perf_counter() - started) * 1000:.0f}ms")
+            finally:
+                if use_database:
+                    session.rollback()
+                    _cleanup(session)
+                session.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AI cost analytics on raw rows vs rollups")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS)
+    parser.add_argument("--database", action="store_true", help="Seed DATABASE_URL (PostgreSQL) instead of SQLite")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.database)
+
+    print("\n" + "=" * 66)
+    print(f"{'rows':>12}  {'case':<16} {'raw ms':>10} {'rollup ms':>10} {'speedup':>9}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r['rows']:>12,}  {r['case']:<16} {r['raw_ms']:>10} {r['rollup_ms']:>10} {r['speedup']:>8}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+CRM Deduplication Benchmark - Indexed Match Keys vs Full-Table Scans
+
+Measures DeduplicationEngine lookup latency against 10k, 100k and 1M
+crm_contacts rows:
+- legacy_phone: load every contact with a phone and normalize in Python
+  (the pre-index _match_by_phone behaviour)
+- phone / company / email: indexed find_duplicates() single lookups
+- bulk: find_duplicates_bulk() over a 1,000 contact import
+
+By default contacts live in a temporary SQLite file (blocking-key fuzzy path).
+Pass --database to use crm_contacts in DATABASE_URL (PostgreSQL pg_trgm path);
+benchmark rows are deleted afterwards.
+
+Usage:
+    python benchmark_crm_dedup.py
+    python benchmark_crm_dedup.py --rows 10000 100000 --database
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.crm import (
+    CRMContact,
+    normalize_phone,
+    normalize_company_name,
+    company_block_key,
+)
+from app.services.crm.deduplication import DeduplicationEngine
+
+DEFAULT_ROW_COUNTS = [10_000, 100_000, 1_000_000]
+LEGACY_MAX_ROWS = 100_000  # Full scans at 1M rows take minutes
+INSERT_BATCH_SIZE = 10_000
+BULK_IMPORT_SIZE = 1_000
+LOOKUPS = 20
+
+WORDS = ["Solar", "Sun", "Bright", "Peak", "Volt", "Summit", "Green", "Power", "Energy", "Home"]
+SUFFIXES = ["LLC", "Inc", "Corp", "Co", "Solutions", "Services", ""]
+
+
+def _company(rng: random.Random, i: int) -> str:
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i % 5000} {rng.choice(SUFFIXES)}".strip()
+
+
+def seed_contacts(session, rows: int) -> None:
+    """Insert `rows` synthetic contacts (with match keys) via executemany"""
+    rng = random.Random(rows)
+    now = datetime.utcnow()
+    for start in range(0, rows, INSERT_BATCH_SIZE):
+        batch = []
+        for i in range(start, min(rows, start + INSERT_BATCH_SIZE)):
+            company = _company(rng, i)
+            phone = f"+1 (555) {i % 1000:03d}-{i % 10000:04d}"
+            normalized = normalize_company_name(company)
+            batch.append({
+                "email": f"bench{i}@dealer{i % 20000}.example.com",
+                "company": company,
+                "phone": phone,
+                "email_domain": f"dealer{i % 20000}.example.com",
+                "phone_normalized": normalize_phone(phone),
+                "company_normalized": normalized or None,
+                "company_block_key": company_block_key(normalized),
+                "external_ids": {},
+                "source_platform": "benchmark",
+                "created_at": now,
+                "updated_at": now,
+            })
+        session.execute(insert(CRMContact.__table__), batch)
+        session.commit()
+
+
+def legacy_phone_scan(session, normalized_phone: str) -> List[CRMContact]:
+    """Pre-index behaviour: normalize every phone in Python"""
+    matches = []
+    for contact in session.query(CRMContact).filter(CRMContact.phone.isnot(None)).all():
+        contact_normalized = normalize_phone(contact.phone)
+        if contact_normalized in (normalized_phone, f"1{normalized_phone}") or (
+            normalized_phone.startswith("1") and normalized_phone[1:] == contact_normalized
+        ):
+            matches.append(contact)
+    return matches
+
+
+def _timed(fn, repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2)}
+
+
+def run(row_counts: List[int], use_database: bool) -> List[Dict[str, Any]]:
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rows in row_counts:
+            if use_database:
+                from app.models.database import engine
+            else:
+                engine = create_engine(f"sqlite:///{os.path.join(tmpdir, f'crm_{rows}.db')}")
+                CRMContact.__table__.create(engine)
+            session = sessionmaker(bind=engine)()
+            dedup = DeduplicationEngine(db=session)
+            loop = asyncio.new_event_loop()
+
+            try:
+                print(f"\n{rows:,} contacts")
+                start = time.perf_counter()
+                seed_contacts(session, rows)
+                print(f"  seeded in {time.perf_counter() - start:.1f}s")
+
+                rng = random.Random(0)
+
+                def phone():
+                    loop.run_until_complete(dedup.find_duplicates(phone=f"555-{rng.randrange(1000):03d}-0042"))
+
+                def company():
+                    loop.run_until_complete(dedup.find_duplicates(company=_company(rng, rng.randrange(rows))))
+
+                def email():
+                    i = rng.randrange(rows)
+                    loop.run_until_complete(dedup.find_duplicates(email=f"bench{i}@dealer{i % 20000}.example.com"))
+
+                def bulk():
+                    contacts = [
+                        {
+                            "email": f"new{i}@dealer{rng.randrange(40000)}.example.com",
+                            "company": _company(rng, rng.randrange(rows)),
+                            "phone": f"555{rng.randrange(10_000_000):07d}",
+                        }
+                        for i in range(BULK_IMPORT_SIZE)
+                    ]
+                    loop.run_until_complete(dedup.find_duplicates_bulk(contacts))
+
+                cases = [("phone", phone, LOOKUPS), ("company", company, LOOKUPS), ("email", email, LOOKUPS), ("bulk", bulk, 3)]
+                if rows <= LEGACY_MAX_ROWS:
+                    cases.insert(0, ("legacy_phone", lambda: legacy_phone_scan(session, "5550420042"), 3))
+
+                for name, fn, repeats in cases:
+                    stats = _timed(fn, repeats)
+                    print(f"  {name:<13} {stats}")
+                    results.append({"rows": rows, "case": name, **stats})
+            finally:
+                if use_database:
+                    session.execute(text("DELETE FROM crm_contacts WHERE source_platform = 'benchmark'"))
+                    session.commit()
+                session.close()
+                loop.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CRM deduplication lookups")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS)
+    parser.add_argument("--database", action="store_true", help="Use crm_contacts in DATABASE_URL instead of SQLite")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.database)
+
+    print("\n" + "=" * 56)
+    print(f"{'rows':>10}  {'case':<13} {'p50 ms':>10} {'max ms':>10}")
+    print("-" * 56)
+    for r in results:
+        print(f"{r['rows']:>10,}  {r['case']:<13} {r['p50_ms']:>10} {r['max_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
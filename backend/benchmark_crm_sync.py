@@ -0,0 +1,215 @@
+"""
+Close CRM Sync Benchmark - Sequential Sync vs Pipelined CloseSyncEngine
+
+Serves a local fake Close API (uvicorn) holding N synthetic leads and syncs
+them into a temporary SQLite crm_contacts table two ways:
+- sequential: fetch a page, map it, upsert each contact through the ORM,
+  commit, then fetch the next page (the pre-engine flow)
+- pipelined: CloseSyncEngine (prefetching fetcher, bulk ON CONFLICT upserts,
+  per-page checkpoints)
+
+Then re-runs the engine after touching 1% of the leads to show an
+incremental (watermark) sync only reads changed records.
+
+Usage:
+    python benchmark_crm_sync.py
+    python benchmark_crm_sync.py --leads 100000 --page-latency-ms 80
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn
+from cryptography.fernet import Fernet
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("CRM_ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+from app.core.http_clients import close_http_clients
+from app.models.crm import CRMContact, CRMCredential, CRMSyncLog
+from app.services.crm.base import CRMCredentials, CredentialEncryption
+from app.services.crm.close import CloseProvider
+from app.services.crm.sync_engine import CloseSyncEngine
+
+BASE_TIME = datetime(2026, 1, 1)
+
+
+class FakeCloseAPI:
+    """ASGI app implementing GET /api/v1/lead/ (skip/limit, date_updated__gte, ordered)"""
+
+    def __init__(self, leads: int, page_latency_ms: float):
+        self.page_latency_ms = page_latency_ms
+        self.leads: List[Dict[str, Any]] = [self._lead(i, BASE_TIME + timedelta(seconds=i)) for i in range(leads)]
+
+    @staticmethod
+    def _lead(i: int, updated: datetime) -> Dict[str, Any]:
+        return {
+            "id": f"lead_{i}",
+            "name": f"Solar Dealer {i} LLC",
+            "status_label": "Potential",
+            "url": f"https://app.close.com/lead/lead_{i}/",
+            "date_updated": updated.isoformat() + "+00:00",
+            "contacts": [{
+                "id": f"cont_{i}",
+                "name": f"Owner {i}",
+                "title": "Owner",
+                "emails": [{"email": f"owner{i}@dealer{i}.example.com"}],
+                "phones": [{"phone": f"+1 555 {i % 1000:03d} {i % 10000:04d}"}],
+            }],
+        }
+
+    def touch(self, fraction: float) -> int:
+        """Mark a fraction of leads as updated now; keeps the list ordered"""
+        step = max(1, int(1 / fraction))
+        newest = datetime.fromisoformat(self.leads[-1]["date_updated"][:19])
+        touched = [lead for i, lead in enumerate(self.leads) if i % step == 0]
+        for n, lead in enumerate(touched, 1):
+            lead["date_updated"] = (newest + timedelta(seconds=n)).isoformat() + "+00:00"
+        self.leads.sort(key=lambda lead: lead["date_updated"])
+        return len(touched)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        params = {k: v[0] for k, v in parse_qs(scope["query_string"].decode()).items()}
+        skip, limit = int(params.get("_skip", 0)), int(params.get("_limit", 100))
+
+        window = self.leads
+        since = params.get("date_updated__gte")
+        if since:
+            start = next((i for i, lead in enumerate(window) if lead["date_updated"][:19] >= since), len(window))
+            window = window[start:]
+
+        if self.page_latency_ms:
+            await asyncio.sleep(self.page_latency_ms / 1000)
+
+        body = json.dumps({"data": window[skip:skip + limit], "has_more": skip + limit < len(window)}).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def start_server(api: FakeCloseAPI) -> Tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(api, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/api/v1"
+
+
+def make_provider(base_url: str) -> CloseProvider:
+    provider = CloseProvider(CRMCredentials(
+        platform="close", api_key=CredentialEncryption.encrypt_credential("benchmark")
+    ))
+    provider.BASE_URL = base_url
+    return provider
+
+
+async def sequential_sync(session, provider: CloseProvider) -> int:
+    """Fetch -> map -> per-row ORM upsert -> commit, one page at a time"""
+    skip, processed = 0, 0
+    while True:
+        page = await provider.fetch_lead_page(skip=skip, limit=100)
+        leads = page.get("data", [])
+        for lead in leads:
+            for row in provider.map_lead_to_rows(lead):
+                contact = session.query(CRMContact).filter(CRMContact.email == row["email"]).first()
+                if contact is None:
+                    contact = CRMContact(email=row["email"], external_ids={}, source_platform="close")
+                    session.add(contact)
+                for field in ("first_name", "last_name", "title", "company", "phone"):
+                    if row.get(field):
+                        setattr(contact, field, row[field])
+                contact.external_ids = {**(contact.external_ids or {}), **row["external_ids"]}
+                contact.enrichment_data = {**(contact.enrichment_data or {}), **row["enrichment_data"]}
+                contact.last_synced_at = datetime.utcnow()
+        session.commit()
+        processed += len(leads)
+        skip += len(leads)
+        if not page.get("has_more") or not leads:
+            return processed
+
+
+def new_database(tmpdir: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(tmpdir, name)}", connect_args={"check_same_thread": False})
+    for model in (CRMCredential, CRMContact, CRMSyncLog):
+        model.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    credential = CRMCredential(platform="close", api_key="benchmark")
+    session.add(credential)
+    session.commit()
+    return session, credential.id
+
+
+async def run(leads: int, page_latency_ms: float) -> List[Dict[str, Any]]:
+    api = FakeCloseAPI(leads, page_latency_ms)
+    server, base_url = start_server(api)
+    results = []
+
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            provider = make_provider(base_url)
+
+            session, _ = new_database(tmpdir, "sequential.db")
+            start = time.perf_counter()
+            processed = await sequential_sync(session, provider)
+            results.append({"case": "sequential", "leads": processed, "seconds": time.perf_counter() - start})
+            session.close()
+
+            session, credential_id = new_database(tmpdir, "pipelined.db")
+            engine = CloseSyncEngine(session, provider, credential_id)
+            start = time.perf_counter()
+            result = await engine.run()
+            results.append({"case": "pipelined", "leads": result.contacts_processed, "seconds": time.perf_counter() - start})
+
+            touched = api.touch(0.01)
+            start = time.perf_counter()
+            result = await engine.run()
+            results.append({
+                "case": f"incremental ({touched} changed)",
+                "leads": result.contacts_processed,
+                "seconds": time.perf_counter() - start,
+            })
+            session.close()
+    finally:
+        await close_http_clients()
+        server.should_exit = True
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Close CRM sync throughput")
+    parser.add_argument("--leads", type=int, default=100_000)
+    parser.add_argument("--page-latency-ms", type=float, default=50.0, help="Simulated Close API latency per page")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.leads, args.page_latency_ms))
+
+    print(f"\n{args.leads:,} leads, {args.page_latency_ms}ms per page")
+    print("=" * 64)
+    print(f"{'case':<28} {'leads':>10} {'seconds':>10} {'leads/s':>12}")
+    print("-" * 64)
+    for r in results:
+        rate = r["leads"] / r["seconds"] if r["seconds"] else 0
+        print(f"{r['case']:<28} {r['leads']:>10,} {r['seconds']:>10.1f} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+CSV Import Benchmark - Streaming COPY vs Buffered Import
+
+Measures throughput and peak Python memory of the CSV lead import paths at
+10k, 100k and 1M rows:
+- buffered: parse_csv_file() + bulk_import_leads() (whole file in memory)
+- streaming: stream_import_leads() (chunked read + single COPY session)
+
+By default rows are written to a null COPY sink so the benchmark measures
+read/validate/serialize overhead without a database. Pass --database to
+COPY into the real leads table from DATABASE_URL (rows are deleted afterwards).
+
+Usage:
+    python benchmark_csv_import.py
+    python benchmark_csv_import.py --rows 10000 100000 --database
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.csv_importer import CSVImportService
+
+DEFAULT_ROW_COUNTS = [10_000, 100_000, 1_000_000]
+BUFFERED_MAX_ROWS = 100_000  # The buffered path needs the whole file in memory
+
+INDUSTRIES = ["Solar", "HVAC", "Electrical", "Roofing", "Plumbing", "Generators"]
+SIZES = ["1-10", "11-50", "51-200", "201-500"]
+
+
+class _NullCopy:
+    """Discards COPY rows (psycopg3 Copy stand-in)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        pass
+
+
+class _NullCursor:
+    def copy(self, sql):
+        return _NullCopy()
+
+    def copy_expert(self, sql, buffer):
+        buffer.read()
+
+    def close(self):
+        pass
+
+
+class _NullConnection:
+    def cursor(self):
+        return _NullCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _NullSession:
+    """Minimal Session stand-in exposing connection().connection"""
+
+    class _Conn:
+        connection = _NullConnection()
+
+    def connection(self):
+        return self._Conn()
+
+
+def generate_csv(path: str, rows: int) -> int:
+    """Write a synthetic dealer export with `rows` leads; returns file size in bytes"""
+    rng = random.Random(rows)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("company_name,industry,company_website,company_size,contact_name,contact_email,contact_phone,notes\n")
+        for i in range(rows):
+            f.write(
+                f"Dealer {i} LLC,{rng.choice(INDUSTRIES)},https://dealer{i}.example.com,"
+                f"{rng.choice(SIZES)},Owner {i},owner{i}@dealer{i}.example.com,"
+                f"(555) {i % 1000:03d}-{i % 10000:04d},\"Certified installer, region {i % 50}\"\n"
+            )
+    return os.path.getsize(path)
+
+
+def _measure(fn) -> Dict[str, Any]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(result["imported_count"] / elapsed, 1) if elapsed > 0 else 0,
+        "peak_mb": round(peak / (1024 * 1024), 2),
+        "imported": result["imported_count"],
+    }
+
+
+def run(row_counts: List[int], use_database: bool) -> List[Dict[str, Any]]:
+    importer = CSVImportService(batch_size=5_000)
+    results = []
+
+    if use_database:
+        from sqlalchemy import text
+        from app.models.database import SessionLocal
+        session_factory = SessionLocal
+    else:
+        session_factory = _NullSession
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rows in row_counts:
+            path = os.path.join(tmpdir, f"leads_{rows}.csv")
+            size_mb = generate_csv(path, rows) / (1024 * 1024)
+            print(f"\n{rows:,} rows ({size_mb:.1f}MB)")
+
+            def streaming():
+                db = session_factory()
+                try:
+                    with open(path, "rb") as f:
+                        return importer.stream_import_leads(db, f)
+                finally:
+                    if use_database:
+                        db.execute(text("DELETE FROM leads WHERE company_name LIKE 'Dealer % LLC'"))
+                        db.commit()
+                        db.close()
+
+            stream_stats = _measure(streaming)
+            print(f"  streaming: {stream_stats}")
+            results.append({"rows": rows, "mode": "streaming", **stream_stats})
+
+            if rows <= BUFFERED_MAX_ROWS:
+                def buffered():
+                    db = session_factory()
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            leads, _ = importer.parse_csv_file(f.read())
+                        return importer.bulk_import_leads(db, leads)
+                    finally:
+                        if use_database:
+                            db.execute(text("DELETE FROM leads WHERE company_name LIKE 'Dealer % LLC'"))
+                            db.commit()
+                            db.close()
+
+                buffered_stats = _measure(buffered)
+                print(f"  buffered:  {buffered_stats}")
+                results.append({"rows": rows, "mode": "buffered", **buffered_stats})
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV lead import throughput")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS)
+    parser.add_argument("--database", action="store_true", help="COPY into DATABASE_URL instead of a null sink")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.database)
+
+    print("\n" + "=" * 72)
+    print(f"{'rows':>10}  {'mode':<10} {'seconds':>9} {'rows/s':>12} {'peak MB':>9}")
+    print("-" * 72)
+    for r in results:
+        print(f"{r['rows']:>10,}  {r['mode']:<10} {r['seconds']:>9} {r['rows_per_second']:>12,} {r['peak_mb']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Dealer Import Benchmark - Per-Row vs Bulk DealerScraperImporter
+
+Writes a synthetic dealer-scraper CSV and measures records/second of:
+- per-row: read_csv + iterrows() + _map_contractor_to_lead() + one INSERT
+  and commit per lead (previous _process_batch path, AI steps disabled);
+  timed on the first --per-row-rows rows
+- bulk: import_contractors_csv() (chunked typed read, vectorized mapping
+  and MEP+E scoring, one INSERT/UPDATE per chunk), AI steps disabled
+
+Both write to a temporary SQLite database; --repeat re-imports the same
+file so the bulk case also measures the update path.
+
+Usage:
+    python benchmark_dealer_import.py
+    python benchmark_dealer_import.py --rows 100000 --per-row-rows 5000
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config.oem_taxonomy import OEM_TAXONOMY
+from app.models.database import Base
+from app.models.lead import Lead
+
+DEFAULT_ROWS = 100_000
+DEFAULT_PER_ROW_ROWS = 5_000
+
+FLAGS = [
+    'has_hvac', 'has_solar', 'has_generator', 'has_battery', 'has_electrical', 'has_plumbing',
+    'has_ops_maintenance', 'is_commercial', 'is_resimercial', 'is_mep_r_contractor',
+]
+FIELDS = [
+    'name', 'phone', 'website', 'email', 'street', 'city', 'state', 'zip', 'domain',
+    'ICP_Score', 'ICP_Tier', 'OEM_Count', 'OEMs_Certified', 'employee_count', 'rating',
+    'review_count', 'tier', 'oem_source',
+] + FLAGS
+STATES = ['CA', 'TX', 'FL', 'NY', 'MA', 'NJ', 'AZ', 'CO']
+
+
+def write_dealer_csv(path: str, rows: int) -> None:
+    rng = random.Random(rows)
+    brands = [brand for tiers in OEM_TAXONOMY.values() for tier_brands in tiers.values() for brand in tier_brands]
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for i in range(rows):
+            oems = rng.sample(brands, rng.choice([0, 1, 1, 2, 3, 5]))
+            writer.writerow([
+                f"Dealer {i} Energy", f"555-{i:07d}", f"https://dealer{i}.example.com", f"info@dealer{i}.example.com",
+                f"{i} Main St", "Springfield", rng.choice(STATES), f"{rng.randint(1000, 99999):05d}",
+                f"dealer{i}.example.com", rng.randint(10, 95), rng.choice(['GOLD', 'SILVER', 'BRONZE']),
+                len(oems), ", ".join(oems), rng.choice(['', 5, 25, 120, 400]), round(rng.uniform(3, 5), 1),
+                rng.randint(0, 500), rng.choice(['', 'Elite Plus', 'Premier']), oems[0] if oems else '',
+            ] + [rng.random() < 0.35 for _ in FLAGS])
+
+
+def make_importer():
+    with patch("app.services.dealer_scraper_importer.QualificationAgent"), \
+            patch("app.services.dealer_scraper_importer.EnrichmentAgent"):
+        from app.services.dealer_scraper_importer import DealerScraperImporter
+        return DealerScraperImporter()
+
+
+def run_per_row(importer, path: str, rows: int, session_factory) -> float:
+    """Previous path: iterrows + per-row mapping + INSERT/commit per lead"""
+    columns = {column.name for column in Lead.__table__.columns}
+    started = time.perf_counter()
+    df = pd.read_csv(path, nrows=rows)
+    db = session_factory()
+    for _, row in df.iterrows():
+        lead_data = importer._map_contractor_to_lead(row)
+        lead = Lead(**{key: value for key, value in lead_data.items() if key in columns and key != 'qualification_score'})
+        db.add(lead)
+        db.commit()
+    db.close()
+    return time.perf_counter() - started
+
+
+def run_bulk(importer, path: str, session_factory) -> Dict[str, Any]:
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        summary = asyncio.run(importer.import_contractors_csv(
+            path, db=db, qualification_enabled=False, enrichment_enabled=False
+        ))
+        summary['seconds'] = time.perf_counter() - started
+        return summary
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs bulk dealer scraper import")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--per-row-rows", type=int, default=DEFAULT_PER_ROW_ROWS, help="Rows in the per-row case")
+    parser.add_argument("--repeat", action="store_true", help="Re-import the file (update path)")
+    args = parser.parse_args()
+
+    # Per-chunk progress logging would dominate the output
+    logging.disable(logging.INFO)
+    importer = make_importer()
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "dealers.csv")
+        write_dealer_csv(path, args.rows)
+        print(f"wrote {args.rows:,} dealer rows ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+        for case in ("per-row", "bulk"):
+            engine = create_engine(f"sqlite:///{os.path.join(tmpdir, case + '.db')}")
+            Base.metadata.create_all(engine, tables=[Lead.__table__])
+            session_factory = sessionmaker(bind=engine)
+
+            if case == "per-row":
+                rows = min(args.per_row_rows, args.rows)
+                seconds = run_per_row(importer, path, rows, session_factory)
+                results.append({"case": "per-row insert", "rows": rows, "seconds": seconds})
+            else:
+                summary = run_bulk(importer, path, session_factory)
+                results.append({"case": "bulk insert", "rows": summary['total_records'], "seconds": summary['seconds']})
+                if args.repeat:
+                    summary = run_bulk(importer, path, session_factory)
+                    results.append({"case": "bulk update", "rows": summary['total_records'], "seconds": summary['seconds']})
+            print(f"  {results[-1]}")
+            engine.dispose()
+
+    print("\n" + "=" * 60)
+    print(f"{'case':<18} {'rows':>10} {'seconds':>10} {'records/s':>12}")
+    print("-" * 60)
+    for r in results:
+        print(f"{r['case']:<18} {r['rows']:>10,} {r['seconds']:>10.2f} {r['rows'] / r['seconds']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
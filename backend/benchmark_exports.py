@@ -0,0 +1,186 @@
+"""
+Report Export Benchmark - Buffered vs Streaming Exports
+
+Seeds the leads table with synthetic rows and measures peak memory and
+wall time of each export path, each case in a fresh worker process:
+- buffered: QueryBuilder.build_and_execute() + the in-memory exporters
+  (previous /exports/report behaviour)
+- streaming: QueryBuilder.build_and_stream() + write_export() (server-side
+  cursor, chunked CSV, write-only XLSX, page-at-a-time PDF)
+
+Peak memory is the worker's max RSS above its RSS once imports are done.
+Buffered PDF rendering runs at a couple of thousand rows/s, so the PDF cases use the first
+--pdf-rows rows; --buffered-rows caps the buffered XLSX case the same way
+(it needs several GB at 1M rows).
+
+Usage:
+    python benchmark_exports.py
+    python benchmark_exports.py --rows 1000000 --pdf-rows 50000 --buffered-rows 1000000
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_PDF_ROWS = 50_000
+DEFAULT_BUFFERED_ROWS = 250_000
+INSERT_BATCH_SIZE = 20_000
+
+COLUMNS = [
+    "id", "company_name", "contact_name", "contact_email", "industry",
+    "qualification_score", "total_oem_count", "created_at",
+]
+INDUSTRIES = ["HVAC", "Solar", "Electrical", "Plumbing", "Roofing"]
+
+
+def seed(database_url: str, rows: int) -> None:
+    """Insert `rows` synthetic leads via executemany"""
+    from sqlalchemy import create_engine, insert
+
+    from app.models.database import Base
+    from app.models.lead import Lead
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine, tables=[Lead.__table__])
+    origin = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, INSERT_BATCH_SIZE):
+            conn.execute(insert(Lead.__table__), [
+                {
+                    "company_name": f"Dealer {i} Home Services",
+                    "contact_name": f"Contact {i}",
+                    "contact_email": f"owner{i}@dealer{i}.example.com",
+                    "industry": INDUSTRIES[i % len(INDUSTRIES)],
+                    "qualification_score": (i * 37 % 1000) / 10,
+                    "total_oem_count": i % 7,
+                    "created_at": origin + timedelta(seconds=i * 13),
+                }
+                for i in range(offset, min(rows, offset + INSERT_BATCH_SIZE))
+            ])
+    engine.dispose()
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _export_case(database_url: str, mode: str, fmt: str, max_id: Optional[int], queue) -> None:
+    """Run one export in this (fresh) process and report rows, time and memory"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.lead import Lead  # noqa: F401
+    from app.services.analytics.query_builder import QueryBuilder
+    from app.services.exports import ExcelExporter, PDFExporter, write_export
+    import csv
+    import io
+
+    session = sessionmaker(bind=create_engine(database_url))()
+    query_config = {"table": "leads", "columns": COLUMNS, "order_by": [{"column": "id", "direction": "asc"}]}
+    if max_id:
+        query_config["filters"] = [{"column": "id", "operator": "<=", "value": max_id}]
+
+    baseline = _rss_mb()
+    started = time.perf_counter()
+    with tempfile.TemporaryFile() as out:
+        if mode == "streaming":
+            stream = QueryBuilder(session).build_and_stream(query_config)
+            row_count = write_export(fmt, stream.columns, stream.batches, out, "Benchmark Report")
+        else:
+            result = QueryBuilder(session).build_and_execute(query_config)
+            row_count = len(result.data)
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=result.columns)
+                writer.writeheader()
+                writer.writerows(result.data)
+                out.write(buffer.getvalue().encode("utf-8"))
+            elif fmt == "xlsx":
+                exporter = ExcelExporter(title="Benchmark Report")
+                exporter.add_data_sheet("Data", result.data, result.columns, add_summary_row=True)
+                out.write(exporter.export().getvalue())
+            else:
+                exporter = PDFExporter(title="Benchmark Report", orientation="landscape")
+                out.write(exporter.export_data_table(result.data, result.columns).getvalue())
+        size = out.tell()
+
+    session.close()
+    queue.put({
+        "rows": row_count,
+        "seconds": round(time.perf_counter() - started, 1),
+        "peak_mb": round(_max_rss_mb() - baseline, 1),
+        "size_mb": round(size / (1024 * 1024), 1),
+    })
+
+
+def run_case(database_url: str, mode: str, fmt: str, max_id: Optional[int]) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    worker = ctx.Process(target=_export_case, args=(database_url, mode, fmt, max_id, queue))
+    worker.start()
+    worker.join()
+    if worker.exitcode != 0:
+        raise RuntimeError(f"{mode} {fmt} export failed (exit code {worker.exitcode})")
+    return queue.get()
+
+
+def run(rows: int, pdf_rows: int, buffered_rows: int) -> List[Dict[str, Any]]:
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_url = f"sqlite:///{os.path.join(tmpdir, 'exports.db')}"
+        started = time.perf_counter()
+        seed(database_url, rows)
+        print(f"seeded {rows:,} leads in {time.perf_counter() - started:.1f}s")
+
+        for fmt in ("csv", "xlsx", "pdf"):
+            for mode in ("buffered", "streaming"):
+                max_id = None
+                if fmt == "pdf":
+                    max_id = pdf_rows
+                elif mode == "buffered" and fmt == "xlsx":
+                    max_id = buffered_rows
+                stats = run_case(database_url, mode, fmt, max_id if max_id and max_id < rows else None)
+                print(f"  {fmt:<5} {mode:<10} {stats}")
+                results.append({"format": fmt, "mode": mode, **stats})
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark buffered vs streaming report exports")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--pdf-rows", type=int, default=DEFAULT_PDF_ROWS, help="Rows in the PDF cases")
+    parser.add_argument("--buffered-rows", type=int, default=DEFAULT_BUFFERED_ROWS, help="Rows in the buffered XLSX case")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.pdf_rows, args.buffered_rows)
+
+    print("\n" + "=" * 60)
+    print(f"{'format':<8} {'mode':<10} {'rows':>10} {'seconds':>9} {'peak MB':>9} {'file MB':>8}")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r['format']:<8} {r['mode']:<10} {r['rows']:>10,} {r['seconds']:>9} "
+            f"{r['peak_mb']:>9} {r['size_mb']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
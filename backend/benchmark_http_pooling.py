@@ -0,0 +1,150 @@
+"""
+HTTP Client Pooling Benchmark - Per-Call Clients vs Shared Pool
+
+Runs a local mock provider API (uvicorn, HTTP/1.1) and measures requests
+per second for the two client patterns used by provider integrations:
+- per_call: ``async with httpx.AsyncClient()`` around every request
+  (the previous CloseProvider / HunterEmailService behaviour)
+- pooled: ``pooled_http_client(provider)`` from the shared registry
+
+The mock server is local and plain HTTP, so the gap shown here is TCP
+connection setup alone; against real providers, DNS and TLS handshakes
+widen it further.
+
+Usage:
+    python benchmark_http_pooling.py
+    python benchmark_http_pooling.py --requests 5000 --concurrency 50 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import uvicorn
+
+from app.core.http_clients import HTTPClientConfig, http_clients, pooled_http_client
+
+PROVIDER = "benchmark"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_mock_api(latency_ms: float):
+    """Minimal ASGI app answering every request with a small JSON page"""
+    body = b'{"data": [{"id": "lead_1", "name": "Dealer"}], "has_more": true}'
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def start_server(latency_ms: float) -> Tuple[uvicorn.Server, str]:
+    port = _free_port()
+    config = uvicorn.Config(
+        make_mock_api(latency_ms), host="127.0.0.1", port=port,
+        log_level="warning", access_log=False, backlog=4096
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def _per_call(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url, timeout=30.0)
+        response.raise_for_status()
+
+
+async def _pooled(url: str) -> None:
+    async with pooled_http_client(PROVIDER) as client:
+        response = await client.get(url, timeout=30.0)
+        response.raise_for_status()
+
+
+async def run_case(name: str, url: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    request_fn = _pooled if name == "pooled" else _per_call
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await request_fn(f"{url}/lead/?_skip={i}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    await http_clients.aclose(PROVIDER)
+    latencies.sort()
+    return {
+        "case": name,
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call HTTP clients")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated provider latency")
+    args = parser.parse_args()
+
+    http_clients.register(PROVIDER, HTTPClientConfig(
+        http2=False,  # uvicorn serves HTTP/1.1 only
+        max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency,
+    ))
+
+    server, url = start_server(args.latency_ms)
+    try:
+        results = [
+            asyncio.run(run_case(name, url, args.requests, args.concurrency))
+            for name in ("per_call", "pooled")
+        ]
+    finally:
+        server.should_exit = True
+
+    print(f"\n{args.requests} requests, concurrency {args.concurrency}, {args.latency_ms}ms server latency")
+    print("=" * 56)
+    print(f"{'case':<10} {'req/s':>12} {'p50 ms':>10} {'p99 ms':>10}")
+    print("-" * 56)
+    for r in results:
+        print(f"{r['case']:<10} {r['requests_per_second']:>12} {r['p50_ms']:>10} {r['p99_ms']:>10}")
+
+    speedup = results[1]["requests_per_second"] / results[0]["requests_per_second"]
+    print(f"\nPooled clients: {speedup:.1f}x requests per second")
+
+
+if __name__ == "__main__":
+    main()
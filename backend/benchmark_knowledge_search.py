@@ -0,0 +1,233 @@
+"""
+Knowledge Search Benchmark - Recall and Latency of Chunk Vector Search
+
+Builds a synthetic corpus of embedded chunks (clustered 384-d unit vectors
+spread over customers of uneven size) and measures top-k search per query:
+- exact: InMemoryVectorIndex brute force (the SQLite/test fallback, and the
+  ground truth for recall)
+- hnsw: customer filter + cosine ORDER BY on the HNSW index at several
+  hnsw.ef_search values, with pgvector filtering after the scan
+- hnsw iterative: the same with hnsw.iterative_scan = relaxed_order (what
+  KnowledgeBaseService issues on pgvector 0.8+)
+- exact per-customer: the MATERIALIZED per-customer scan used on older pgvector
+The pgvector cases need --database-url pointing at a scratch PostgreSQL
+database with the vector extension available (its knowledge tables are
+dropped and recreated).
+
+Queries are perturbed copies of random chunks; recall@k is the fraction of
+the exact top-k returned, over all queries and over queries for small
+customers (< SMALL_CUSTOMER_SHARE of the corpus), where post-scan filtering
+loses the most. "< k rows" is the share of queries returning short results.
+
+Usage:
+    python benchmark_knowledge_search.py
+    python benchmark_knowledge_search.py --database-url postgresql://localhost/kb_bench
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app.services.vector_index import InMemoryVectorIndex, normalize_rows
+
+DEFAULT_CHUNKS = 100_000
+DEFAULT_QUERIES = 200
+DIMENSION = 384
+TOPICS = 500
+CHUNKS_PER_DOCUMENT = 20
+TOP_K = 10
+EF_SEARCH_VALUES = (40, 100, 200)
+# Customer share of the corpus: one large tenant, a few mid-size, many small
+CUSTOMER_WEIGHTS = [0.4, 0.15, 0.1, 0.1] + [0.25 / 20] * 20
+INSERT_BATCH_SIZE = 5000
+# Customers below this share of the corpus are where post-scan filtering loses results
+SMALL_CUSTOMER_SHARE = 0.02
+
+
+def make_corpus(chunks: int, seed: int = 7) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (customer_id per chunk, normalized embeddings)"""
+    rng = np.random.default_rng(seed)
+    centroids = normalize_rows(rng.normal(size=(TOPICS, DIMENSION)))
+    topics = rng.integers(0, TOPICS, size=chunks)
+    vectors = normalize_rows(centroids[topics] + rng.normal(scale=0.08, size=(chunks, DIMENSION)))
+    customers = rng.choice(len(CUSTOMER_WEIGHTS), size=chunks, p=CUSTOMER_WEIGHTS) + 1
+    return customers, vectors
+
+
+def make_queries(customers: np.ndarray, vectors: np.ndarray, count: int, seed: int = 11) -> List[Tuple[int, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(vectors), size=count)
+    noisy = normalize_rows(vectors[picks] + rng.normal(scale=0.05, size=(count, DIMENSION)))
+    return [(int(customers[i]), noisy[n]) for n, i in enumerate(picks)]
+
+
+def _summary(case: str, latencies: List[float], recalls: Optional[List[float]]) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "case": case,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "recall": round(statistics.mean(recalls), 4) if recalls is not None else 1.0,
+    }
+
+
+def run_exact(customers, vectors, queries) -> Tuple[Dict[str, Any], List[set]]:
+    index = InMemoryVectorIndex(DIMENSION)
+    ids = np.arange(1, len(vectors) + 1)
+    for customer_id in np.unique(customers):
+        mask = customers == customer_id
+        index.add(int(customer_id), ids[mask], vectors[mask])
+
+    truth, latencies = [], []
+    for customer_id, query in queries:
+        started = time.perf_counter()
+        hits = index.search(customer_id, query, TOP_K)
+        latencies.append(time.perf_counter() - started)
+        truth.append({chunk_id for chunk_id, _ in hits})
+    return _summary("exact (in-memory)", latencies, None), truth
+
+
+def _small_customers(customers: np.ndarray) -> set:
+    """Customers holding under SMALL_CUSTOMER_SHARE of the corpus"""
+    ids, counts = np.unique(customers, return_counts=True)
+    return {int(c) for c, n in zip(ids, counts) if n / len(customers) < SMALL_CUSTOMER_SHARE}
+
+
+def _run_case(db, case, queries, truth, small, build_query, settings) -> Dict[str, Any]:
+    """Run every query through one pgvector query shape; recall overall and for small customers"""
+    from sqlalchemy import text
+    from app.models.customer_models import KnowledgeChunk
+
+    latencies, recalls, small_recalls, short = [], [], [], 0
+    for (customer_id, query), expected in zip(queries, truth):
+        started = time.perf_counter()
+        for setting in settings:
+            db.execute(text(setting))
+        distance = KnowledgeChunk.embedding.cosine_distance(query.tolist())
+        rows = db.execute(build_query(customer_id, distance)).scalars().all()
+        db.rollback()
+        latencies.append(time.perf_counter() - started)
+
+        recall = len(expected & set(rows)) / len(expected)
+        recalls.append(recall)
+        if customer_id in small:
+            small_recalls.append(recall)
+        short += len(rows) < len(expected)
+
+    summary = _summary(case, latencies, recalls)
+    summary["small_recall"] = round(statistics.mean(small_recalls), 4) if small_recalls else None
+    summary["short_pct"] = round(100 * short / len(queries), 1)
+    return summary
+
+
+def run_pgvector(database_url: str, customers, vectors, queries, truth) -> List[Dict[str, Any]]:
+    from sqlalchemy import create_engine, insert, select, text
+    from sqlalchemy.orm import Session
+
+    from app.models.database import Base
+    from app.models.customer_models import Customer, KnowledgeChunk, KnowledgeDocument
+
+    engine = create_engine(database_url)
+    tables = [Customer.__table__, KnowledgeDocument.__table__, KnowledgeChunk.__table__]
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+
+    started = time.perf_counter()
+    customer_ids = [int(c) for c in np.unique(customers)]
+    documents = len(vectors) // CHUNKS_PER_DOCUMENT + 1
+    with engine.begin() as conn:
+        conn.execute(insert(Customer.__table__), [
+            {"id": c, "company_name": f"Customer {c}", "email": f"c{c}@example.com", "api_key": f"key-{c}"}
+            for c in customer_ids
+        ])
+        conn.execute(insert(KnowledgeDocument.__table__), [
+            {"id": d + 1, "customer_id": int(customers[d * CHUNKS_PER_DOCUMENT]) if d * CHUNKS_PER_DOCUMENT < len(vectors) else 1,
+             "document_id": f"doc-{d}", "filename": f"doc-{d}.txt", "processing_status": "completed"}
+            for d in range(documents)
+        ])
+        for offset in range(0, len(vectors), INSERT_BATCH_SIZE):
+            conn.execute(insert(KnowledgeChunk.__table__), [
+                {"id": i + 1, "customer_id": int(customers[i]), "document_id": i // CHUNKS_PER_DOCUMENT + 1,
+                 "chunk_index": i % CHUNKS_PER_DOCUMENT, "chunk_text": f"chunk {i}", "embedding": vectors[i].tolist()}
+                for i in range(offset, min(len(vectors), offset + INSERT_BATCH_SIZE))
+            ])
+        conn.execute(text(
+            "CREATE INDEX idx_knowledge_chunks_embedding_hnsw ON knowledge_chunks "
+            "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+        ))
+        conn.execute(text("ANALYZE knowledge_chunks"))
+    print(f"  seeded and indexed {len(vectors):,} chunks in {time.perf_counter() - started:.1f}s")
+
+    with engine.connect() as conn:
+        version = conn.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar()
+    iterative = tuple(int(part) for part in version.split(".")[:2]) >= (0, 8)
+    print(f"  pgvector {version}")
+
+    cases = [(f"hnsw ef={ef}", ef, False) for ef in EF_SEARCH_VALUES]
+    if iterative:
+        cases += [(f"hnsw ef={ef} iterative", ef, True) for ef in EF_SEARCH_VALUES]
+
+    def hnsw_query(customer_id, distance):
+        return select(KnowledgeChunk.id).where(KnowledgeChunk.customer_id == customer_id).order_by(distance).limit(TOP_K)
+
+    def exact_query(customer_id, distance):
+        tenant = (
+            select(KnowledgeChunk.id, distance.label("distance"))
+            .where(KnowledgeChunk.customer_id == customer_id)
+            .cte("tenant_chunks").prefix_with("MATERIALIZED")
+        )
+        return select(tenant.c.id).order_by(tenant.c.distance).limit(TOP_K)
+
+    small = _small_customers(customers)
+    results = []
+    with Session(engine) as db:
+        for case, ef_search, iterative_scan in cases:
+            settings = [f"SET LOCAL hnsw.ef_search = {ef_search}"]
+            if iterative_scan:
+                settings.append("SET LOCAL hnsw.iterative_scan = relaxed_order")
+            results.append(_run_case(db, case, queries, truth, small, hnsw_query, settings))
+        results.append(_run_case(db, "exact per-customer", queries, truth, small, exact_query, []))
+
+    Base.metadata.drop_all(engine, tables=tables)
+    engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark knowledge chunk vector search")
+    parser.add_argument("--chunks", type=int, default=DEFAULT_CHUNKS)
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--database-url", help="Scratch PostgreSQL database with pgvector (enables the HNSW cases)")
+    args = parser.parse_args()
+
+    customers, vectors = make_corpus(args.chunks)
+    queries = make_queries(customers, vectors, args.queries)
+    print(f"{args.chunks:,} chunks, {len(np.unique(customers))} customers, {args.queries} queries, top-{TOP_K}")
+
+    exact, truth = run_exact(customers, vectors, queries)
+    results = [exact]
+    if args.database_url:
+        results += run_pgvector(args.database_url, customers, vectors, queries, truth)
+
+    print("\n" + "=" * 86)
+    print(f"{'case':<26} {'p50 ms':>8} {'p95 ms':>8} {'recall@' + str(TOP_K):>10} "
+          f"{'small-tenant':>13} {'< k rows':>9}")
+    print("-" * 86)
+    for r in results:
+        small_recall = r.get("small_recall", 1.0)
+        print(f"{r['case']:<26} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['recall']:>10} "
+              f"{small_recall if small_recall is not None else '-':>13} {str(r.get('short_pct', 0.0)) + '%':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Lead Scoring Benchmark - Per-Row vs Batch Scoring
+
+Scores synthetic dealer leads (OEM lists with brand variants and unknown
+brands, capability flags, company size/industry) four ways:
+- mep_e per-row, linear scan: calculate_mep_e_score() with the previous
+  category/tier/brand substring scan for every OEM lookup
+- mep_e per-row, indexed: calculate_mep_e_score() on the precompiled index
+- mep_e batch: MEPEScorer.score_batch() over one DataFrame
+- lead per-row vs batch: LeadScorer.calculate_score() vs score_batch()
+
+Then times rescore_mep_e_leads() writing the scores back to a temporary
+SQLite database.
+
+Usage:
+    python benchmark_lead_scoring.py
+    python benchmark_lead_scoring.py --rows 400000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.config import oem_taxonomy
+from app.config.oem_taxonomy import OEM_TAXONOMY
+from app.models.database import Base
+from app.models.lead import Lead
+from app.services.lead_scorer import LeadScorer
+from app.services.scoring.bulk_rescorer import rescore_mep_e_leads
+from app.services.scoring.mep_e_scorer import MEPEScorer, calculate_mep_e_score
+
+DEFAULT_ROWS = 100_000
+FLAGS = ["has_heat_pump", "has_microgrid", "has_smart_panel", "has_ev_charger", "has_commercial", "has_ops_maintenance"]
+SIZES = ["1-10", "11-50", "51-200", "201-500", "250 employees", "mid-size", None]
+INDUSTRIES = ["Construction", "HVAC Contractor", "Solar Installer", "Electrical", "Software", None]
+
+
+def make_leads(rows: int) -> List[Dict[str, Any]]:
+    rng = random.Random(rows)
+    brands = [brand for tiers in OEM_TAXONOMY.values() for tier_brands in tiers.values() for brand in tier_brands]
+    variants = brands + [f"{brand} Certified Dealer" for brand in brands] + [f"Local Brand {i}" for i in range(40)]
+    leads = []
+    for _ in range(rows):
+        lead = {"oems_certified": rng.sample(variants, rng.choice([0, 1, 2, 3, 4, 6, 9]))}
+        for flag in FLAGS:
+            lead[flag] = rng.random() < 0.3
+        lead["company_size"] = rng.choice(SIZES)
+        lead["industry"] = rng.choice(INDUSTRIES)
+        leads.append(lead)
+    return leads
+
+
+def _scan(oem_name: str, field: int):
+    """Previous lookup: scan every category, tier and brand"""
+    oem_lower = oem_name.lower().strip()
+    for category, tiers in OEM_TAXONOMY.items():
+        for tier_name, brands in tiers.items():
+            for brand in brands:
+                if brand.lower() in oem_lower or oem_lower in brand.lower():
+                    return (category, tier_name)[field]
+    return None
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> List[Dict[str, Any]]:
+    leads = make_leads(rows)
+    frame = pd.DataFrame(leads)
+    mep_scorer = MEPEScorer()
+    lead_scorer = LeadScorer()
+    results = []
+
+    def record(case: str, seconds: float) -> None:
+        results.append({"case": case, "seconds": round(seconds, 2), "rows_per_second": round(rows / seconds)})
+        print(f"  {case:<30} {seconds:8.2f}s  {rows / seconds:>12,.0f} rows/s")
+
+    print(f"{rows:,} leads")
+
+    with patch.object(oem_taxonomy, "get_oem_category", lambda name: _scan(name, 0)), \
+            patch.object(oem_taxonomy, "get_oem_tier", lambda name: _scan(name, 1)):
+        record("mep_e per-row (linear scan)", _timed(lambda: [calculate_mep_e_score(lead) for lead in leads]))
+    record("mep_e per-row (indexed)", _timed(lambda: [calculate_mep_e_score(lead) for lead in leads]))
+    record("mep_e score_batch", _timed(lambda: mep_scorer.score_batch(frame)))
+    record("lead per-row", _timed(lambda: [lead_scorer.calculate_score(lead) for lead in leads]))
+    record("lead score_batch", _timed(lambda: lead_scorer.score_batch(frame)))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'leads.db')}")
+        Base.metadata.create_all(engine, tables=[Lead.__table__])
+        with engine.begin() as conn:
+            conn.execute(insert(Lead.__table__), [
+                {"company_name": f"Dealer {i}", "oems_certified": lead["oems_certified"],
+                 **{flag: lead[flag] for flag in FLAGS}}
+                for i, lead in enumerate(leads)
+            ])
+        session = sessionmaker(bind=engine)()
+        try:
+            record("rescore_mep_e_leads (SQLite)", _timed(lambda: rescore_mep_e_leads(session)))
+        finally:
+            session.close()
+            engine.dispose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs batch lead scoring")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    args = parser.parse_args()
+
+    # Per-chunk progress logging would dominate the write-back timing output
+    logging.disable(logging.INFO)
+    results = run(args.rows)
+
+    print("\n" + "=" * 60)
+    print(f"{'case':<32} {'seconds':>10} {'rows/s':>14}")
+    print("-" * 60)
+    for r in results:
+        print(f"{r['case']:<32} {r['seconds']:>10} {r['rows_per_second']:>14,}")
+
+
+if __name__ == "__main__":
+    main()
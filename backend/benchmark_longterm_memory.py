@@ -0,0 +1,170 @@
+"""
+Deep Agent Memory Benchmark - KEYS Scan vs Indexed Pattern Store
+
+Loads N synthetic patterns into Redis through LongTermMemory and measures
+get_relevant_patterns latency two ways:
+- scan: KEYS over the pattern prefix, one HGETALL per key and Python scoring
+  of every pattern (the pre-index lookup)
+- indexed: token-index candidates plus pipelined HGETALL of the best ones
+
+The scan lookup is skipped above --scan-max patterns; at 1M it blocks Redis
+for minutes per query.
+
+Usage:
+    python benchmark_longterm_memory.py --redis-url redis://localhost:6379/15
+    python benchmark_longterm_memory.py --sizes 1000 100000 1000000 --queries 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.deepagents.memory import LongTermMemory
+
+LOAD_BATCH = 1000
+
+
+def make_vocabulary(size: int) -> List[str]:
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return list({"".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size * 2)})[:size]
+
+
+class PatternFactory:
+    """Patterns with Zipf-distributed words, like real interaction notes"""
+
+    def __init__(self, vocabulary: List[str], seed: int = 42):
+        self.vocabulary = vocabulary
+        self.weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        self.rng = random.Random(seed)
+
+    def words(self, k: int) -> List[str]:
+        return self.rng.choices(self.vocabulary, weights=self.weights, k=k)
+
+    def pattern(self) -> Dict[str, Any]:
+        return {
+            "industry": " ".join(self.words(1)),
+            "action": " ".join(self.words(6)),
+            "confidence": round(self.rng.random(), 2),
+        }
+
+
+async def scan_lookup(memory: LongTermMemory, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """The pre-index get_relevant_patterns: KEYS, per-key HGETALL, score everything"""
+    redis_client = await memory._get_redis_client()
+    patterns = []
+    for key in await redis_client.keys(f"{memory.patterns_key}:*"):
+        pattern = await redis_client.hgetall(key)
+        if pattern:
+            patterns.append(pattern)
+
+    scored = []
+    for pattern in patterns:
+        score = memory._calculate_relevance_score(query, pattern)
+        if score > memory.RELEVANCE_THRESHOLD:
+            scored.append((score, pattern))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [pattern for _, pattern in scored[:limit]]
+
+
+async def load_patterns(memory: LongTermMemory, factory: PatternFactory, count: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, count, LOAD_BATCH):
+        batch = [(factory.pattern(), "interaction") for _ in range(min(LOAD_BATCH, count - offset))]
+        await memory.learn_patterns(batch)
+    return time.perf_counter() - start
+
+
+async def time_queries(lookup, queries: List[str]) -> Dict[str, float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await lookup(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)],
+    }
+
+
+async def clear_agent(memory: LongTermMemory) -> None:
+    redis_client = await memory._get_redis_client()
+    prefixes = (memory.patterns_key, memory.pattern_index_key, memory.pattern_tokens_key)
+    for prefix in prefixes:
+        batch = []
+        async for key in redis_client.scan_iter(match=f"{prefix}*", count=5000):
+            batch.append(key)
+            if len(batch) >= 5000:
+                await redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            await redis_client.unlink(*batch)
+
+
+async def run(redis_url: str, sizes: List[int], queries: int, scan_max: int) -> List[Dict[str, Any]]:
+    vocabulary = make_vocabulary(5000)
+    results = []
+
+    for size in sizes:
+        memory = LongTermMemory(f"benchmark_{size}", redis_url=redis_url, max_patterns=size)
+        await clear_agent(memory)
+        factory = PatternFactory(vocabulary)
+        query_words = PatternFactory(vocabulary, seed=size)
+        query_set = [" ".join(query_words.words(3)) for _ in range(queries)]
+
+        try:
+            load_seconds = await load_patterns(memory, factory, size)
+            indexed = await time_queries(memory.get_relevant_patterns, query_set)
+            scan = None
+            if size <= scan_max:
+                # Fewer scan queries; each one reads every pattern
+                scan = await time_queries(lambda q: scan_lookup(memory, q), query_set[:max(5, queries // 20)])
+
+            results.append({
+                "patterns": size,
+                "load_per_second": size / load_seconds,
+                "indexed": indexed,
+                "scan": scan,
+            })
+        finally:
+            await clear_agent(memory)
+            await memory.redis_client.aclose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LongTermMemory pattern lookup")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="Redis DB to fill (cleaned up afterwards)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-max", type=int, default=100_000, help="Skip the KEYS scan lookup above this size")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.redis_url, args.sizes, args.queries, args.scan_max))
+
+    print(f"\n{args.queries} queries per size")
+    print("=" * 78)
+    print(f"{'patterns':>10} {'load/s':>10} {'indexed p50':>12} {'indexed p99':>12} {'scan p50':>12} {'scan p99':>12}")
+    print("-" * 78)
+    for r in results:
+        scan_p50 = f"{r['scan']['p50_ms']:.1f}" if r["scan"] else "skipped"
+        scan_p99 = f"{r['scan']['p99_ms']:.1f}" if r["scan"] else "skipped"
+        print(
+            f"{r['patterns']:>10,} {r['load_per_second']:>10,.0f} "
+            f"{r['indexed']['p50_ms']:>12.2f} {r['indexed']['p99_ms']:>12.2f} {scan_p50:>12} {scan_p99:>12}"
+        )
+    print("\nLatencies in ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Metrics Middleware Benchmark - BaseHTTPMiddleware vs Pure ASGI Instrumentation
+
+Drives a FastAPI app in-process (no server, no sockets) with requests to
+/leads/{lead_id} for --ids distinct ids and measures per-request time for
+each middleware stack, plus the number of http_requests_total series created:
+- bare: no middleware
+- previous: metrics + audit as BaseHTTPMiddleware subclasses, metrics
+  labelled by raw path (previous app.core.metrics / app.middleware.audit)
+- current: pure-ASGI MetricsMiddleware (route template labels) +
+  AuditLoggingMiddleware
+
+Audit event persistence is stubbed in both stacks; only middleware overhead
+is measured.
+
+Usage:
+    python benchmark_metrics_middleware.py
+    python benchmark_metrics_middleware.py --requests 50000 --ids 5000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from starlette.middleware.base import BaseHTTPMiddleware
+
+DEFAULT_REQUESTS = 20_000
+DEFAULT_IDS = 2_000
+ROUNDS = 5
+
+# Previous instrumentation, on a private registry
+_previous_registry = CollectorRegistry()
+PREVIOUS_REQUEST_COUNT = Counter(
+    "http_requests_total", "Total HTTP requests", ["method", "path", "status"], registry=_previous_registry
+)
+PREVIOUS_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", registry=_previous_registry,
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5)
+)
+
+
+class PreviousMetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            PREVIOUS_REQUEST_COUNT.labels(request.method, request.url.path, str(status_code)).inc()
+            PREVIOUS_REQUEST_LATENCY.observe(time.time() - start_time)
+
+
+class PreviousAuditMiddleware(BaseHTTPMiddleware):
+    """Previous AuditLoggingMiddleware.dispatch with the event write stubbed"""
+
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        request.headers.get("x-forwarded-for")
+        request.headers.get("user-agent", "")
+        response = await call_next(request)
+        int((time.time() - start_time) * 1000)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/leads/{lead_id}")
+    async def get_lead(lead_id: int):
+        return {"id": lead_id}
+
+    if stack == "previous":
+        app.add_middleware(PreviousAuditMiddleware)
+        app.add_middleware(PreviousMetricsMiddleware)
+    elif stack == "current":
+        from app.core.metrics import MetricsMiddleware
+        from app.middleware.audit import AuditLoggingMiddleware
+        app.add_middleware(AuditLoggingMiddleware)
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app, requests: int, ids: int) -> List[float]:
+    """Send requests straight into the ASGI app; returns per-request seconds"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    timings = []
+    for i in range(requests):
+        path = f"/leads/{i % ids}"
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"bench"), (b"user-agent", b"bench")], "client": ("127.0.0.1", 5000),
+            "server": ("bench", 80),
+        }
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def series_count(stack: str) -> int:
+    from prometheus_client import REGISTRY
+    registry = _previous_registry if stack == "previous" else REGISTRY
+    for family in registry.collect():
+        if family.name == "http_requests":
+            return sum(1 for s in family.samples if s.name == "http_requests_total")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request instrumentation middleware overhead")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--ids", type=int, default=DEFAULT_IDS, help="Distinct lead ids requested")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CEREBRAS_API_KEY", "benchmark")
+    # Audit rows are enqueued when the sink runs; stub the enqueue itself
+    from app.middleware import audit
+
+    class BenchmarkSink:
+        running = True
+
+    audit.get_telemetry_sink = lambda: BenchmarkSink()
+    audit.AuditLoggingMiddleware._log_audit_event = lambda self, **event: None
+
+    results: List[Dict[str, Any]] = []
+    for stack in ("bare", "previous", "current"):
+        app = build_app(stack)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(drive(app, 500, args.ids))  # Warm up
+        rounds = [statistics.median(loop.run_until_complete(drive(app, args.requests, args.ids))) for _ in range(ROUNDS)]
+        loop.close()
+        results.append({"stack": stack, "p50_us": statistics.median(rounds) * 1e6, "series": series_count(stack)})
+        print(f"  {results[-1]}")
+
+    bare = results[0]["p50_us"]
+    print("\n" + "=" * 56)
+    print(f"{'stack':<10} {'p50 us':>10} {'overhead us':>12} {'request series':>16}")
+    print("-" * 56)
+    for r in results:
+        series = "-" if r["stack"] == "bare" else f"{r['series']:,}"
+        print(f"{r['stack']:<10} {r['p50_us']:>10.1f} {r['p50_us'] - bare:>12.1f} {series:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Model Routing Simulation - Fixed Order vs Adaptive vs Hedged
+
+Runs ModelRouter.route_request against stub providers with injected latency
+distributions (lognormal body plus a heavy tail) instead of real APIs:
+- fixed: the routing_rules order (primary until it fails)
+- adaptive: candidates ranked by observed EWMA latency and cost, no hedging
+- hedged: adaptive ranking plus a backup request after the p95 delay
+
+The primary degrades (5x slower, still succeeding) for the middle third of
+each run. Stub calls are billed when they start, so a cancelled hedge loser
+counts at full price; "hedge overhead" is billed cost beyond the winners'.
+
+Usage:
+    python benchmark_model_routing.py
+    python benchmark_model_routing.py --requests 5000 --concurrency 50 --time-scale 0.02
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.latency_tracker import LatencyTracker
+from app.services.model_router import ModelConfig, ModelResponse, ModelRouter, TaskType
+
+PRIMARY = ModelConfig(provider="anthropic", model="stub-primary", max_latency_ms=5000, max_cost_usd=0.01)
+BACKUP = ModelConfig(provider="cerebras", model="stub-backup", max_latency_ms=2000, max_cost_usd=0.001, fallback=True)
+
+
+class LatencyProfile:
+    """Lognormal latency around a median with a probability of a slow tail"""
+
+    def __init__(self, median_ms: float, sigma: float, tail_probability: float, tail_factor: float):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.tail_probability = tail_probability
+        self.tail_factor = tail_factor
+
+    def sample(self, rng: random.Random, slowdown: float = 1.0) -> float:
+        latency = rng.lognormvariate(math.log(self.median_ms), self.sigma) * slowdown
+        if rng.random() < self.tail_probability:
+            latency *= self.tail_factor
+        return latency
+
+
+class StubProviders:
+    """Replacement for ModelRouter._execute_model_call with simulated latency and billing"""
+
+    def __init__(self, profiles: Dict[str, LatencyProfile], time_scale: float, seed: int = 7):
+        self.profiles = profiles
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.degraded = False
+        self.billed_usd = 0.0
+        self.calls: Dict[str, int] = {model: 0 for model in profiles}
+
+    async def __call__(self, config, prompt, system_prompt, temperature, max_tokens) -> ModelResponse:
+        slowdown = 5.0 if self.degraded and config.model == PRIMARY.model else 1.0
+        latency_ms = self.profiles[config.model].sample(self.rng, slowdown)
+        self.calls[config.model] += 1
+        self.billed_usd += config.max_cost_usd
+        await asyncio.sleep(latency_ms / 1000 * self.time_scale)
+        return ModelResponse(
+            content="stub",
+            model_used=config.model,
+            provider=config.provider,
+            latency_ms=int(latency_ms),
+            cost_usd=config.max_cost_usd,
+        )
+
+
+def make_profiles() -> Dict[str, LatencyProfile]:
+    return {
+        PRIMARY.model: LatencyProfile(median_ms=900, sigma=0.35, tail_probability=0.04, tail_factor=6),
+        BACKUP.model: LatencyProfile(median_ms=600, sigma=0.4, tail_probability=0.03, tail_factor=5),
+    }
+
+
+async def run_case(name: str, requests: int, concurrency: int, time_scale: float) -> Dict[str, Any]:
+    router = ModelRouter(
+        adaptive=name != "fixed",
+        hedging=name == "hedged",
+        # Hedge delay floor and staleness in real (scaled) time
+        latency_tracker=LatencyTracker(min_hedge_delay_ms=50 * time_scale, stale_after_seconds=60 * time_scale),
+    )
+    # The router measures real (scaled) time, so scale the configured latency budgets too
+    router.routing_rules[TaskType.CONTENT_GENERATION] = [
+        replace(config, max_latency_ms=int(config.max_latency_ms * time_scale)) for config in (PRIMARY, BACKUP)
+    ]
+    stubs = StubProviders(make_profiles(), time_scale)
+    router._execute_model_call = stubs
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    winner_cost = 0.0
+
+    async def one(i: int) -> None:
+        nonlocal winner_cost
+        async with semaphore:
+            stubs.degraded = requests // 3 <= i < 2 * requests // 3
+            start = time.perf_counter()
+            response = await router.route_request(TaskType.CONTENT_GENERATION, "benchmark prompt")
+            latencies.append((time.perf_counter() - start) * 1000 / time_scale)
+            winner_cost += response.cost_usd
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+
+    latencies.sort()
+    return {
+        "case": name,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "max_ms": latencies[-1],
+        "cost_per_request": stubs.billed_usd / requests,
+        "hedge_overhead": (stubs.billed_usd - winner_cost) / winner_cost if winner_cost else 0.0,
+        "hedge_rate": router.hedge_stats["hedges_fired"] / requests,
+        "calls": dict(stubs.calls),
+    }
+
+
+async def run(requests: int, concurrency: int, time_scale: float) -> List[Dict[str, Any]]:
+    return [await run_case(name, requests, concurrency, time_scale) for name in ("fixed", "adaptive", "hedged")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate fixed-order, adaptive and hedged model routing")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Real seconds per simulated second")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests, args.concurrency, args.time_scale))
+
+    print(f"\n{args.requests} requests, concurrency {args.concurrency}, primary degraded 5x for the middle third")
+    print("=" * 100)
+    print(
+        f"{'case':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+        f"{'$/request':>10} {'overhead':>9} {'hedged':>7}  calls"
+    )
+    print("-" * 100)
+    for r in results:
+        calls = ", ".join(f"{model}={count}" for model, count in r["calls"].items())
+        print(
+            f"{r['case']:<10} {r['p50_ms']:>8,.0f} {r['p95_ms']:>8,.0f} {r['p99_ms']:>8,.0f} {r['max_ms']:>8,.0f} "
+            f"{r['cost_per_request']:>10.5f} {r['hedge_overhead']:>8.1%} {r['hedge_rate']:>7.1%}  {calls}"
+        )
+    print("\nLatencies in simulated ms; overhead = billed cost beyond the winning calls")
+
+
+if __name__ == "__main__":
+    main()
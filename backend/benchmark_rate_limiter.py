@@ -0,0 +1,110 @@
+"""
+Rate Limiter Microbenchmark - Check Overhead per Request
+
+Measures the Redis overhead each admitted request pays for rate limiting:
+- legacy: RateLimiter.check_rate_limit + record_request (separate round trips,
+  not atomic across workers)
+- atomic: AtomicRateLimiter.check_rate_limit + settle (one script call each)
+- leased: AtomicRateLimiter with local leases (one script call per lease)
+
+Each case runs against a real Redis with limits raised so nothing is denied.
+
+Usage:
+    python benchmark_rate_limiter.py --redis-url redis://localhost:6379/15
+    python benchmark_rate_limiter.py --checks 20000 --concurrency 50 --lease-requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import redis.asyncio as redis
+
+from app.services.rate_limiter import AtomicRateLimiter, RateLimiter
+
+PROVIDER = "benchmark"
+LIMITS = {"requests_per_minute": 10_000_000, "tokens_per_minute": 10_000_000_000}
+
+
+async def one_check(limiter: RateLimiter, user_id: str) -> None:
+    result = await limiter.check_rate_limit(user_id, PROVIDER, "/benchmark", estimated_tokens=800)
+    if isinstance(limiter, AtomicRateLimiter):
+        await limiter.settle(result, tokens_used=600)
+    else:
+        await limiter.record_request(user_id, PROVIDER, "/benchmark", tokens_used=600)
+
+
+async def run_case(name: str, limiter: RateLimiter, checks: int, concurrency: int) -> Dict[str, Any]:
+    user_id = f"benchmark_{name}_{time.time_ns()}"
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def timed() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await one_check(limiter, user_id)
+            latencies.append((time.perf_counter() - start) * 1_000_000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(checks)))
+    elapsed = time.perf_counter() - start
+
+    if isinstance(limiter, AtomicRateLimiter):
+        await limiter.close()
+
+    latencies.sort()
+    return {
+        "case": name,
+        "checks_per_second": checks / elapsed,
+        "p50_us": statistics.median(latencies),
+        "p99_us": latencies[max(0, int(len(latencies) * 0.99) - 1)],
+    }
+
+
+async def run(redis_url: str, checks: int, concurrency: int, lease_requests: int) -> List[Dict[str, Any]]:
+    client = redis.from_url(redis_url)
+    limiters = {
+        "legacy": RateLimiter(client, timeout_ms=1000),
+        "atomic": AtomicRateLimiter(client, timeout_ms=1000),
+        "leased": AtomicRateLimiter(
+            client, timeout_ms=1000, lease_requests=lease_requests, lease_tokens=lease_requests * 800
+        ),
+    }
+    for limiter in limiters.values():
+        limiter.limits = {PROVIDER: LIMITS}
+
+    try:
+        return [await run_case(name, limiter, checks, concurrency) for name, limiter in limiters.items()]
+    finally:
+        async for key in client.scan_iter(match="rate_limit:*", count=1000):
+            await client.unlink(key)
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter overhead per check")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="Redis DB to use (rate_limit:* keys are removed)")
+    parser.add_argument("--checks", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--lease-requests", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.redis_url, args.checks, args.concurrency, args.lease_requests))
+
+    print(f"\n{args.checks} checks, concurrency {args.concurrency}, lease of {args.lease_requests} requests")
+    print("=" * 56)
+    print(f"{'case':<10} {'checks/s':>12} {'p50 us':>12} {'p99 us':>12}")
+    print("-" * 56)
+    for r in results:
+        print(f"{r['case']:<10} {r['checks_per_second']:>12,.0f} {r['p50_us']:>12,.0f} {r['p99_us']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Telemetry Write Benchmark - Per-Row Commits vs Buffered Telemetry Sink
+
+Simulates --requests API requests that each log one APICallLog row and
+measures the per-request overhead of the telemetry write plus the DB
+commits it costs:
+- direct: add + commit + refresh per row on the request path (previous
+  UsageTracker.log_api_call path)
+- sink: TelemetrySink.record() per row; rows are flushed in multi-row
+  INSERTs by size/interval and on stop (drain time reported separately)
+
+Runs on a temporary SQLite database in WAL mode unless --database-url points
+at a scratch PostgreSQL database (its api_call_logs table is dropped and
+recreated).
+
+Usage:
+    python benchmark_telemetry.py
+    python benchmark_telemetry.py --requests 50000 --database-url postgresql+psycopg://localhost/bench
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models.unified_api_call import APICallLog, OperationType, ProviderType
+
+DEFAULT_REQUESTS = 10_000
+TABLES = [APICallLog.__table__]
+
+
+def api_call(i: int) -> Dict[str, Any]:
+    return {
+        "provider": ProviderType.CEREBRAS, "model": "llama3.1-8b", "endpoint": "/chat/completions",
+        "prompt_tokens": 250, "completion_tokens": 120, "total_tokens": 370, "cost_usd": 0.000006,
+        "latency_ms": 900 + i % 100, "operation_type": OperationType.QUALIFICATION, "user_id": f"user-{i % 50}",
+    }
+
+
+def count_commits(engine) -> List[int]:
+    commits = [0]
+
+    @event.listens_for(engine, "commit")
+    def on_commit(conn):
+        commits[0] += 1
+
+    return commits
+
+
+def summarize(case: str, overheads: List[float], request_seconds: float, drain_seconds: float, commits: int, rows: int) -> Dict[str, Any]:
+    overheads.sort()
+    total = request_seconds + drain_seconds
+    return {
+        "case": case,
+        "p50_us": statistics.median(overheads) * 1e6,
+        "p99_us": overheads[int(len(overheads) * 0.99)] * 1e6,
+        "commits": commits,
+        "commits_per_s": commits / total,
+        "rows_per_s": rows / total,
+        "drain_ms": drain_seconds * 1000,
+    }
+
+
+def run_direct(session_factory, commits: List[int], requests: int) -> Dict[str, Any]:
+    """Previous path: one add/commit/refresh on the request path per row"""
+    db = session_factory()
+    overheads = []
+    started = time.perf_counter()
+    for i in range(requests):
+        t = time.perf_counter()
+        log_entry = APICallLog(**api_call(i))
+        db.add(log_entry)
+        db.commit()
+        db.refresh(log_entry)
+        overheads.append(time.perf_counter() - t)
+    seconds = time.perf_counter() - started
+    db.close()
+    return summarize("direct", overheads, seconds, 0.0, commits[0], requests)
+
+
+def run_sink(session_factory, commits: List[int], requests: int) -> Dict[str, Any]:
+    """Buffered path: record() per row, flushed by the sink on the same loop"""
+    from app.services.telemetry_sink import TelemetrySink
+    sink = TelemetrySink(session_factory, max_queue_size=requests)
+
+    async def scenario():
+        await sink.start()
+        overheads = []
+        started = time.perf_counter()
+        for i in range(requests):
+            t = time.perf_counter()
+            sink.record(APICallLog, api_call(i))
+            overheads.append(time.perf_counter() - t)
+            if i % 100 == 0:
+                await asyncio.sleep(0)  # Requests yield to the loop (and the flusher)
+        request_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        await sink.stop()
+        return overheads, request_seconds, time.perf_counter() - started
+
+    overheads, request_seconds, drain_seconds = asyncio.run(scenario())
+    assert sink.stats.written == requests, sink.stats.as_dict()
+    return summarize("sink", overheads, request_seconds, drain_seconds, commits[0], requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row telemetry commits vs the telemetry sink")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--database-url", help="Scratch PostgreSQL database (default: temporary SQLite)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for case, runner in (("direct", run_direct), ("sink", run_sink)):
+            engine = create_engine(args.database_url or f"sqlite:///{os.path.join(tmpdir, f'{case}.db')}")
+            if not args.database_url:
+                with engine.connect() as conn:
+                    conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            Base.metadata.drop_all(engine, tables=TABLES)
+            Base.metadata.create_all(engine, tables=TABLES)
+            commits = count_commits(engine)
+
+            results.append(runner(sessionmaker(bind=engine), commits, args.requests))
+            print(f"  {results[-1]}")
+
+            if args.database_url:
+                Base.metadata.drop_all(engine, tables=TABLES)
+            engine.dispose()
+
+    print("\n" + "=" * 78)
+    print(f"{'case':<8} {'p50 us':>10} {'p99 us':>10} {'commits':>9} {'commits/s':>11} {'rows/s':>11} {'drain ms':>10}")
+    print("-" * 78)
+    for r in results:
+        print(
+            f"{r['case']:<8} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f} {r['commits']:>9,} "
+            f"{r['commits_per_s']:>11,.1f} {r['rows_per_s']:>11,.0f} {r['drain_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Tests for export API endpoints."""
+
+import csv
+import io
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.models.database import Base, get_db
+from app.models.lead import Lead
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+QUERY = {"table": "leads", "columns": ["id", "company_name", "qualification_score"]}
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(db_session):
+    def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def sample_leads(db_session):
+    db_session.add_all([
+        Lead(company_name=f"Dealer {i}", contact_email=f"d{i}@example.com", qualification_score=50 + i)
+        for i in range(30)
+    ])
+    db_session.commit()
+
+
+def test_csv_export_is_streamed_inline(client, sample_leads):
+    response = client.post("/api/v1/exports/report", json={"query_config": QUERY, "format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment; filename=Analytics_Report_" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 30
+    assert rows[0]["company_name"] == "Dealer 0"
+
+
+def test_large_export_is_queued(client, sample_leads):
+    with patch("app.api.exports.INLINE_EXPORT_MAX_ROWS", {"csv": 10, "pdf": 10, "xlsx": 10}), \
+            patch("app.api.exports.celery_app") as mock_celery:
+        mock_celery.send_task.return_value = Mock(id="task-123")
+        response = client.post("/api/v1/exports/report", json={"query_config": QUERY, "format": "xlsx"})
+
+    assert response.status_code == 202
+    assert response.json()["export_id"] == "task-123"
+    assert response.json()["status"] == "queued"
+    assert response.json()["row_count"] == 30
+    name, kwargs = mock_celery.send_task.call_args[0][0], mock_celery.send_task.call_args[1]
+    assert name == "generate_report_export"
+    assert kwargs["args"] == (QUERY, "xlsx", "Analytics Report", True)
+
+
+def test_empty_export_returns_404(client, db_session):
+    response = client.post("/api/v1/exports/report", json={"query_config": QUERY, "format": "pdf"})
+    assert response.status_code == 404
+
+
+def test_export_job_status_includes_download_link(client):
+    result = Mock(
+        state="SUCCESS",
+        date_done=datetime(2026, 3, 1, 12, 0),
+        result={"object_name": "exports/task-123.csv", "filename": "Report.csv", "format": "csv", "row_count": 900000},
+    )
+    result.name = "generate_report_export"  # Mock(name=...) names the mock itself
+    with patch("app.api.exports.celery_app") as mock_celery, \
+            patch("app.api.exports.RunPodStorageService") as mock_storage:
+        mock_celery.AsyncResult.return_value = result
+        mock_storage.return_value.generate_presigned_url.return_value = "https://storage/exports/task-123.csv?sig"
+        response = client.get("/api/v1/exports/jobs/task-123")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["download_url"] == "https://storage/exports/task-123.csv?sig"
+    assert data["row_count"] == 900000
+
+
+@pytest.mark.parametrize("name, state, payload", [
+    ("qualify_lead", "SUCCESS", {"score": 80}),
+    ("generate_report_export", "SUCCESS", None),
+    ("generate_report_export", "SUCCESS", {"filename": "Report.csv"}),
+])
+def test_non_export_job_ids_return_404(client, name, state, payload):
+    result = Mock(state=state, date_done=None, result=payload)
+    result.name = name
+    with patch("app.api.exports.celery_app") as mock_celery:
+        mock_celery.AsyncResult.return_value = result
+        response = client.get("/api/v1/exports/jobs/task-456")
+
+    assert response.status_code == 404
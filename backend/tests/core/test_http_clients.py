@@ -0,0 +1,134 @@
+"""Tests for the shared pooled HTTP client registry."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.http_clients import (
+    HTTPClientConfig,
+    HTTPClientRegistry,
+    PerHostLimitTransport,
+    PROVIDER_HTTP_CONFIGS,
+    pooled_http_client,
+    http_clients,
+)
+
+
+@pytest.fixture
+def registry():
+    return HTTPClientRegistry({
+        "test": HTTPClientConfig(
+            base_url="https://api.example.com",
+            timeout=7.0,
+            follow_redirects=True,
+            headers={"User-Agent": "test-agent"},
+        )
+    })
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_within_loop(registry):
+    """Test the same pooled client is returned for a provider"""
+    client = registry.get("test")
+
+    assert registry.get("test") is client
+    assert client.base_url == httpx.URL("https://api.example.com")
+    assert client.timeout.read == 7.0
+    assert client.follow_redirects is True
+    assert client.headers["User-Agent"] == "test-agent"
+
+    await registry.aclose()
+
+
+def test_client_is_rebuilt_for_new_event_loop(registry):
+    """Test a client from a finished loop isn't reused (Celery asyncio.run)"""
+    # Explicit loops rather than asyncio.run, which unsets the current loop
+    async def get_client():
+        return registry.get("test")
+
+    loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+    try:
+        first, second = (loop.run_until_complete(get_client()) for loop in loops)
+    finally:
+        for loop in loops:
+            loop.close()
+
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_and_next_get_rebuilds(registry):
+    """Test shutdown closes pooled clients"""
+    client = registry.get("test")
+    await registry.aclose("test")
+
+    assert client.is_closed
+    assert "test" not in registry
+    assert registry.get("test") is not client
+
+    await registry.aclose()
+
+
+def test_unknown_provider_raises(registry):
+    """Test providers must be registered"""
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_provider_configs_cover_integrations():
+    """Test every routed integration has pool settings"""
+    for provider in ("close", "apollo", "linkedin", "hunter", "website_validator", "review_scraper"):
+        assert provider in PROVIDER_HTTP_CONFIGS
+
+
+@pytest.mark.asyncio
+async def test_pooled_http_client_does_not_close_on_exit():
+    """Test borrowing the pooled client leaves it open for the next caller"""
+    async with pooled_http_client("hunter") as client:
+        pass
+
+    assert not client.is_closed
+    async with pooled_http_client("hunter") as again:
+        assert again is client
+
+    await http_clients.aclose("hunter")
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_caps_concurrency():
+    """Test concurrent requests are capped per host, not across hosts"""
+    in_flight = {}
+    peak = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    transport = PerHostLimitTransport(httpx.MockTransport(handler), max_per_host=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        responses = await asyncio.gather(
+            *(client.get(f"https://site{i % 2}.example.com/") for i in range(12))
+        )
+
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == {"site0.example.com": 2, "site1.example.com": 2}
+
+
+@pytest.mark.asyncio
+async def test_service_close_leaves_shared_pool_open():
+    """Test a per-request service close doesn't tear down the pool for concurrent requests"""
+    from app.services.apollo import ApolloService
+
+    apollo = ApolloService(api_key="test-key")
+    client = apollo.client
+    await apollo.close()
+
+    assert not client.is_closed
+    assert ApolloService(api_key="test-key").client is client
+
+    await http_clients.aclose("apollo")
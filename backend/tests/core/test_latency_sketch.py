@@ -0,0 +1,38 @@
+"""Tests for the mergeable latency sketch."""
+
+import random
+
+from app.core.latency_sketch import LatencySketch
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(6, 0.8) for _ in range(20000)]
+    sketch = LatencySketch()
+    sketch.add_all(values)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= exact * sketch.relative_accuracy
+
+
+def test_merge_and_round_trip_match_single_sketch():
+    rng = random.Random(5)
+    values = [rng.randint(0, 5000) for _ in range(5000)]
+    whole = LatencySketch()
+    whole.add_all(values)
+
+    merged = LatencySketch()
+    for offset in range(0, len(values), 1000):
+        part = LatencySketch()
+        part.add_all(values[offset:offset + 1000])
+        merged.merge(LatencySketch.from_dict(part.to_dict()))
+
+    assert merged.count == whole.count == 5000
+    assert merged.quantile(0.95) == whole.quantile(0.95)
+    assert LatencySketch().quantile(0.5) is None
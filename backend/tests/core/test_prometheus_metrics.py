@@ -0,0 +1,177 @@
+"""Tests for route-templated request metrics and LLM/cache/Celery instrumentation."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import (
+    UNMATCHED_ROUTE,
+    CeleryQueueDepthCollector,
+    MetricsMiddleware,
+    observe_llm_call,
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/leads/{lead_id}")
+    async def get_lead(lead_id: int):
+        return {"id": lead_id}
+
+    @app.get("/metrics-test/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template(client):
+    route = "/metrics-test/leads/{lead_id}"
+    before = sample("http_requests_total", method="GET", route=route, status="200")
+
+    for lead_id in (1, 2, 3):
+        assert client.get(f"/metrics-test/leads/{lead_id}").status_code == 200
+    assert client.get("/metrics-test/leads/abc").status_code == 422
+
+    assert sample("http_requests_total", method="GET", route=route, status="200") - before == 3
+    assert sample("http_requests_total", method="GET", route=route, status="422") >= 1
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) - before >= 4
+    # No per-id series
+    assert REGISTRY.get_sample_value(
+        "http_requests_total", {"method": "GET", "route": "/metrics-test/leads/1", "status": "200"}
+    ) is None
+
+
+def test_unmatched_paths_share_one_series(client):
+    before = sample("http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    client.get("/no-such-page/1")
+    client.get("/no-such-page/2")
+
+    assert sample("http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404") - before == 2
+
+
+def test_streaming_responses_pass_through(client):
+    before = sample("http_requests_total", method="GET", route="/metrics-test/stream", status="200")
+
+    response = client.get("/metrics-test/stream")
+
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert sample("http_requests_total", method="GET", route="/metrics-test/stream", status="200") - before == 1
+
+
+def test_audit_middleware_tags_requests(monkeypatch):
+    from app.middleware import audit
+
+    events = []
+
+    class RunningSink:
+        running = True
+
+    monkeypatch.setattr(audit, "get_telemetry_sink", lambda: RunningSink())
+    monkeypatch.setattr(audit.AuditLoggingMiddleware, "_log_audit_event", lambda self, **event: events.append(event))
+
+    app = FastAPI()
+    app.add_middleware(audit.AuditLoggingMiddleware)
+
+    @app.get("/audit-test/{item_id}")
+    async def read_item(item_id: int, request: Request):
+        request.state.user_id = 7
+        return {"request_id": request.state.request_id}
+
+    response = TestClient(app).get("/audit-test/5", headers={"x-forwarded-for": "10.0.0.1, 10.0.0.2"})
+
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert events == [{
+        "request_id": response.json()["request_id"],
+        "method": "GET",
+        "path": "/audit-test/5",
+        "status_code": 200,
+        "latency_ms": events[0]["latency_ms"],
+        "ip_address": "10.0.0.1",
+        "user_agent": "testclient",
+        "user_id": 7,
+    }]
+
+
+def test_llm_calls_record_latency_tokens_and_cost():
+    labels = {"provider": "test-provider", "model": "test-model"}
+    before = sample("llm_request_duration_seconds_count", **labels)
+
+    observe_llm_call("test-provider", "test-model", 0.4, prompt_tokens=300, completion_tokens=120, cost_usd=0.0002)
+    observe_llm_call("test-provider", "test-model", 2.0, success=False)
+
+    assert sample("llm_request_duration_seconds_count", **labels) - before == 2
+    assert sample("llm_requests_total", outcome="success", **labels) >= 1
+    assert sample("llm_requests_total", outcome="error", **labels) >= 1
+    assert sample("llm_tokens_per_request_sum", direction="prompt", **labels) >= 300
+    assert sample("llm_tokens_per_request_sum", direction="completion", **labels) >= 120
+    assert sample("llm_cost_usd_per_request_sum", **labels) == pytest.approx(0.0002)
+
+
+def test_cache_lookups_count_hits_and_misses():
+    from app.services.cache.base import CacheBase
+
+    class FakeRedis:
+        def __init__(self):
+            self.data = {"metrics-test:known": '{"v": 1}'}
+
+        async def get(self, key):
+            return self.data.get(key)
+
+        async def incr(self, key):
+            self.data[key] = int(self.data.get(key, 0)) + 1
+
+    cache = CacheBase(FakeRedis(), prefix="metrics-test")
+
+    async def lookups():
+        await cache.get("known")
+        await cache.get("known")
+        await cache.get("unknown")
+        await cache.get("unknown", track=False)
+
+    asyncio.run(lookups())
+
+    assert sample("cache_requests_total", cache="metrics-test", result="hit") == 2
+    assert sample("cache_requests_total", cache="metrics-test", result="miss") == 1
+
+
+def test_queue_depth_is_read_from_the_broker():
+    class FakePipeline:
+        def __init__(self):
+            self.queues = []
+
+        def llen(self, queue):
+            self.queues.append(queue)
+
+        def execute(self):
+            return [{"default": 4, "workflows": 0}[queue] for queue in self.queues]
+
+    collector = CeleryQueueDepthCollector("redis://localhost:6379/0", ["workflows", "default", "default"])
+    collector.redis = type("FakeRedis", (), {"pipeline": lambda self, transaction: FakePipeline()})()
+
+    [family] = list(collector.collect())
+
+    assert {s.labels["queue"]: s.value for s in family.samples} == {"default": 4, "workflows": 0}
+
+
+def test_queue_depth_is_skipped_when_the_broker_is_down():
+    collector = CeleryQueueDepthCollector("redis://localhost:1/0", ["default"], timeout=0.05)
+
+    [family] = list(collector.collect())
+
+    assert family.samples == []
@@ -0,0 +1,41 @@
+"""Tests for the precompiled substring index."""
+
+import random
+import string
+
+from app.core.substring_index import SubstringIndex
+from app.config.oem_taxonomy import OEM_TAXONOMY, OEMLookupIndex
+
+
+def _first_match_scan(keys, text):
+    for index, key in enumerate(keys):
+        if key in text or text in key:
+            return index
+    return None
+
+
+def test_first_match_equals_linear_scan():
+    keys = ["tesla solar", "tesla", "lg", "lg chem", "sun", "sunpower", "ab", "b"]
+    index = SubstringIndex(keys)
+    rng = random.Random(11)
+
+    texts = ["", "x", "tesla", "lg chem resu", "sunpowered", "cab", "unknown"]
+    texts += ["".join(rng.choice("abgelnstu ") for _ in range(rng.randrange(1, 10))) for _ in range(2000)]
+    for text in texts:
+        assert index.first_match(text) == _first_match_scan(keys, text), text
+
+
+def test_oem_index_matches_taxonomy_scan():
+    brands = [(category, tier, brand.lower())
+              for category, tiers in OEM_TAXONOMY.items()
+              for tier, tier_brands in tiers.items()
+              for brand in tier_brands]
+    oem_index = OEMLookupIndex(OEM_TAXONOMY)
+    rng = random.Random(5)
+
+    names = [brand for _, _, brand in brands] + ["Generac PWRcell Pro", "  TESLA ", "Acme HVAC", "Ca"]
+    names += ["".join(rng.choice(string.ascii_lowercase + " ") for _ in range(rng.randrange(1, 8))) for _ in range(2000)]
+    for name in names:
+        normalized = name.lower().strip()
+        expected = next(((c, t) for c, t, b in brands if b in normalized or normalized in b), None)
+        assert oem_index.lookup(name) == expected, name
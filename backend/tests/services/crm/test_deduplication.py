@@ -331,3 +331,76 @@ async def test_multiple_contacts_same_domain(db_session):
     # Should find all 3 contacts (domain match)
     assert len(result.matches) == 3
     assert all(m.confidence == 80.0 for m in result.matches)  # All domain matches
+
+
+# ========== Persisted Match Key Tests ==========
+
+def test_contact_persists_normalized_keys(sample_contact):
+    """Test CRMContact keeps indexed dedup keys in sync with source fields"""
+    assert sample_contact.email_domain == "acmecorp.com"
+    assert sample_contact.phone_normalized == "15551234"
+    assert sample_contact.company_normalized == "acme"
+    assert sample_contact.company_block_key == "acm"
+
+    sample_contact.company = "Globex Industries"
+    assert sample_contact.company_normalized == "globex industries"
+    assert sample_contact.company_block_key == "glo"
+
+
+# ========== Bulk Deduplication Tests ==========
+
+@pytest.mark.asyncio
+async def test_find_duplicates_bulk_matches_single_lookups(dedup_engine, sample_contact):
+    """Test bulk results match per-contact find_duplicates, in input order"""
+    inputs = [
+        {"email": "JOHN.DOE@ACMECORP.COM"},
+        {"phone": "(555) 1234"},
+        {"company": "ACME Corp"},
+        {"email": "someone@unrelated.com", "company": "Unrelated Co"},
+    ]
+
+    bulk_results = await dedup_engine.find_duplicates_bulk(inputs)
+
+    assert len(bulk_results) == len(inputs)
+    for contact_input, bulk_result in zip(inputs, bulk_results):
+        single_result = await dedup_engine.find_duplicates(**contact_input)
+        assert bulk_result.confidence == single_result.confidence
+        assert bulk_result.is_duplicate == single_result.is_duplicate
+        assert bulk_result.checked_fields == single_result.checked_fields
+        assert [m.contact.id for m in bulk_result.matches] == [m.contact.id for m in single_result.matches]
+
+    assert bulk_results[0].confidence == 100.0
+    assert bulk_results[1].confidence == 70.0
+    assert bulk_results[3].matches == []
+
+
+@pytest.mark.asyncio
+async def test_find_duplicates_bulk_empty_input(dedup_engine):
+    """Test bulk deduplication with no contacts"""
+    assert await dedup_engine.find_duplicates_bulk([]) == []
+
+
+@pytest.mark.asyncio
+async def test_find_duplicates_bulk_fuzzy_company_agrees_with_single(dedup_engine, db_session):
+    """Test bulk company candidates come from the same search as single checks"""
+    db_session.add_all([
+        CRMContact(email="a@northwind.com", company="Northwind Robotics", source_platform="close"),
+        CRMContact(email="b@globex.com", company="Globex Industries", source_platform="close"),
+    ])
+    db_session.commit()
+    inputs = [
+        {"company": "Northwind Robotics Inc"},
+        {"company": "Morthwind Robotics"},  # Different block key prefix
+        {"company": "Globex Industries"},
+    ]
+
+    bulk_results = await dedup_engine.find_duplicates_bulk(inputs)
+
+    for contact_input, bulk_result in zip(inputs, bulk_results):
+        single_result = await dedup_engine.find_duplicates(**contact_input)
+        assert [(m.contact.id, m.confidence) for m in bulk_result.matches] == \
+            [(m.contact.id, m.confidence) for m in single_result.matches]
+
+    assert bulk_results[0].matches[0].contact.company == "Northwind Robotics"
+    if db_session.get_bind().dialect.name == "postgresql":
+        assert bulk_results[1].matches[0].contact.company == "Northwind Robotics"
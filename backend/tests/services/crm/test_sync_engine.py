@@ -0,0 +1,182 @@
+"""
+Tests for CloseSyncEngine
+
+Covers bulk ON CONFLICT upserts, incremental watermarks and resuming an
+interrupted run from its checkpoint, against SQLite and a fake Close provider.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.crm import CRMContact, CRMCredential, CRMSyncLog
+from app.services.crm.base import CRMNetworkError
+from app.services.crm.close import CloseProvider
+from app.services.crm.sync_engine import CloseSyncEngine, bulk_upsert_contacts
+from app.services.retry_handler import RetryWithBackoff
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _lead(i: int, updated: datetime, name: str = None) -> dict:
+    return {
+        "id": f"lead_{i}",
+        "name": f"Dealer {i} LLC",
+        "status_label": "Potential",
+        "url": f"https://app.close.com/lead/lead_{i}/",
+        "date_updated": updated.isoformat() + "+00:00",
+        "contacts": [{
+            "id": f"cont_{i}",
+            "name": name or f"Owner {i}",
+            "title": "Owner",
+            "emails": [{"email": f"owner{i}@dealer{i}.example.com"}],
+            "phones": [{"phone": f"+1 555 000 {i:04d}"}],
+        }],
+    }
+
+
+class FakeCloseProvider:
+    """Serves leads ordered by date_updated with Close's skip/limit semantics"""
+
+    map_lead_to_rows = CloseProvider.map_lead_to_rows
+
+    def __init__(self, leads, fail_at_skip=None):
+        self.leads = leads
+        self.fail_at_skip = fail_at_skip
+        self.calls = []
+
+    async def fetch_lead_page(self, skip=0, limit=100, updated_since=None, query=None):
+        self.calls.append((skip, updated_since))
+        if self.fail_at_skip is not None and skip == self.fail_at_skip:
+            raise CRMNetworkError("connection reset")
+
+        window = sorted(
+            (lead for lead in self.leads
+             if updated_since is None or datetime.fromisoformat(lead["date_updated"][:19]) >= updated_since),
+            key=lambda lead: lead["date_updated"]
+        )
+        page = window[skip:skip + limit]
+        return {"data": page, "has_more": skip + limit < len(window)}
+
+
+@pytest.fixture
+def sqlite_db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (CRMCredential, CRMContact, CRMSyncLog):
+        model.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    credential = CRMCredential(platform="close", api_key="encrypted")
+    session.add(credential)
+    session.commit()
+    try:
+        yield session, credential.id
+    finally:
+        session.close()
+
+
+def _engine(session, credential_id, provider, **kwargs):
+    return CloseSyncEngine(
+        session, provider, credential_id,
+        retry_handler=RetryWithBackoff(max_retries=0), page_size=10, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_import_upserts_and_checkpoints(sqlite_db):
+    """Test every lead is written and the run records its high watermark"""
+    session, credential_id = sqlite_db
+    leads = [_lead(i, BASE_TIME + timedelta(minutes=i)) for i in range(35)]
+
+    result = await _engine(session, credential_id, FakeCloseProvider(leads)).run()
+
+    assert result.contacts_processed == 35
+    assert result.contacts_created == 35
+    assert session.query(CRMContact).count() == 35
+
+    contact = session.query(CRMContact).filter_by(email="owner7@dealer7.example.com").one()
+    assert contact.external_ids == {"close": "cont_7", "close_lead": "lead_7"}
+    assert contact.company_normalized == "dealer 7"
+    assert contact.phone_normalized == "15550000007"
+
+    log = session.query(CRMSyncLog).one()
+    assert log.status == "completed"
+    assert log.sync_cursor is None
+    assert log.high_watermark == BASE_TIME + timedelta(minutes=34)
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_only_fetches_changed_leads(sqlite_db):
+    """Test the next run starts at the previous watermark and merges updates"""
+    session, credential_id = sqlite_db
+    leads = [_lead(i, BASE_TIME + timedelta(minutes=i)) for i in range(35)]
+    await _engine(session, credential_id, FakeCloseProvider(leads)).run()
+
+    changed = _lead(3, BASE_TIME + timedelta(hours=2), name="New Owner")
+    changed["contacts"][0]["title"] = ""  # Empty remote value keeps the local one
+    provider = FakeCloseProvider(leads[:3] + [changed] + leads[4:])
+
+    result = await _engine(session, credential_id, provider).run()
+
+    since = provider.calls[0][1]
+    assert since == BASE_TIME + timedelta(minutes=34) - CloseSyncEngine.WATERMARK_OVERLAP
+    assert result.contacts_processed < 35
+    assert result.contacts_created == 0
+
+    contact = session.query(CRMContact).filter_by(email="owner3@dealer3.example.com").one()
+    assert contact.first_name == "New"
+    assert contact.title == "Owner"
+    assert session.query(CRMContact).count() == 35
+
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_from_cursor(sqlite_db):
+    """Test an interrupted run keeps committed pages and the next run resumes"""
+    session, credential_id = sqlite_db
+    leads = [_lead(i, BASE_TIME + timedelta(minutes=i)) for i in range(35)]
+
+    result = await _engine(session, credential_id, FakeCloseProvider(leads, fail_at_skip=20)).run()
+
+    failed_log = session.query(CRMSyncLog).one()
+    assert failed_log.status == "failed"
+    assert failed_log.sync_cursor == "20"
+    assert result.contacts_processed == 20
+    assert session.query(CRMContact).count() == 20
+
+    provider = FakeCloseProvider(leads)
+    result = await _engine(session, credential_id, provider).run()
+
+    assert provider.calls[0][0] == 20
+    assert result.contacts_processed == 15
+    assert session.query(CRMContact).count() == 35
+
+
+@pytest.mark.asyncio
+async def test_window_reanchors_at_newest_row(sqlite_db):
+    """Test deep windows restart at the newest date_updated instead of skipping"""
+    session, credential_id = sqlite_db
+    leads = [_lead(i, BASE_TIME + timedelta(minutes=i)) for i in range(35)]
+    provider = FakeCloseProvider(leads)
+    engine = _engine(session, credential_id, provider)
+    engine.WINDOW_RESET_SKIP = 20
+
+    result = await engine.run()
+
+    assert (0, BASE_TIME + timedelta(minutes=19)) in provider.calls
+    assert session.query(CRMContact).count() == 35
+    assert result.contacts_created == 35
+
+
+def test_bulk_upsert_counts_created_and_updated(sqlite_db):
+    """Test ON CONFLICT upsert reports inserts vs updates and dedupes a batch"""
+    session, _ = sqlite_db
+    rows = [{"email": "a@x.com", "first_name": "A"}, {"email": "b@x.com", "first_name": "B"}]
+    assert bulk_upsert_contacts(session, rows, "close") == (2, 0)
+
+    rows = [{"email": "a@x.com", "first_name": "Ann"}, {"email": "a@x.com", "first_name": "Anna"}, {"email": "c@x.com"}]
+    assert bulk_upsert_contacts(session, rows, "close") == (1, 1)
+    session.commit()
+
+    assert session.query(CRMContact).filter_by(email="a@x.com").one().first_name == "Anna"
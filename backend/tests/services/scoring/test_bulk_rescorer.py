@@ -0,0 +1,71 @@
+"""Tests for bulk MEP+E rescoring."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.database import Base
+from app.models.lead import Lead
+from app.services.scoring.bulk_rescorer import rescore_mep_e_leads
+from app.services.scoring.mep_e_scorer import calculate_mep_e_score
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+OEM_SETS = [
+    ["Daikin", "Generac", "Span"],
+    ["Tesla", "SunPower", "Enphase", "LG Chem", "Ecobee Pro", "Control4"],
+    [],
+    ["Kohler"],
+]
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_rescore_writes_batch_scores(db_session):
+    db_session.add_all([
+        Lead(
+            company_name=f"Dealer {i}",
+            oems_certified=OEM_SETS[i % len(OEM_SETS)],
+            has_heat_pump=i % 2 == 0,
+            has_commercial=i % 3 == 0,
+        )
+        for i in range(23)
+    ])
+    db_session.commit()
+
+    stats = rescore_mep_e_leads(db_session, chunk_size=5)
+    assert stats["leads_scored"] == 23
+    assert stats["leads_updated"] == 23
+
+    db_session.expire_all()
+    for lead in db_session.query(Lead).all():
+        expected = calculate_mep_e_score({
+            "oems_certified": lead.oems_certified,
+            "has_heat_pump": lead.has_heat_pump,
+            "has_commercial": lead.has_commercial,
+            "has_microgrid": False,
+            "has_smart_panel": False,
+            "has_ev_charger": False,
+            "has_ops_maintenance": False,
+        })
+        assert lead.mep_e_score == expected["mep_e_score"]
+        assert lead.solar_oem_count == expected["solar_oem_count"]
+        assert lead.asset_centric_score == expected["asset_centric_score"]
+
+    # Second run: nothing changed
+    assert rescore_mep_e_leads(db_session, lead_ids=[1, 2, 3])["leads_updated"] == 0
@@ -425,3 +425,46 @@ class TestMEPEScorerIntegration:
 
         # Generator-only = low energy transition = lower score
         assert score < 40, "Generator-only contractors should score < 40"
+
+
+class TestMEPEScoreBatch:
+    """Test vectorized score_batch against calculate_mep_e_score"""
+
+    def test_score_batch_matches_per_lead_scoring(self):
+        """Every output column equals the per-lead result, row for row"""
+        import pandas as pd
+
+        leads = [
+            {
+                "oems_certified": ["Daikin", "Carrier", "Tesla", "SunPower", "Enphase", "LG Chem",
+                                   "Generac", "Span", "Schneider Electric", "Ecobee Pro", "Control4"],
+                "has_heat_pump": True,
+                "has_microgrid": True,
+                "has_commercial": True,
+                "has_ops_maintenance": True,
+            },
+            {"oems_certified": ["Daikin", "Generac", "Span"], "has_heat_pump": True},
+            {"oems_certified": ["tesla", "Tesla", "Tesla", "Unknown Brand"], "has_ev_charger": True},
+            {"oems_certified": [], "has_commercial": True},
+            {"oems_certified": ["Nest", "Ecobee", "Ring"], "has_smart_panel": True},
+        ]
+
+        batch = MEPEScorer().score_batch(pd.DataFrame(leads))
+
+        for i, lead_data in enumerate(leads):
+            expected = calculate_mep_e_score(lead_data)
+            row = batch.iloc[i].to_dict()
+            assert list(batch.columns) == list(expected.keys())
+            for key, value in expected.items():
+                assert row[key] == value, f"row {i}: {key}"
+
+    def test_score_batch_accepts_column_mapping(self):
+        """Mappings of arrays work like DataFrames; missing flags are False"""
+        result = MEPEScorer().score_batch({
+            "oems_certified": [["Kohler", "Cummins"], None],
+            "has_heat_pump": [None, True],
+        })
+
+        assert result["generator_oem_count"].tolist() == [2, 0]
+        assert result["mep_e_score"].tolist() == [calculate_mep_e_score({"oems_certified": ["Kohler", "Cummins"]})["mep_e_score"], 0]
+        assert result["has_heat_pump"].tolist() == [False, True]
@@ -0,0 +1,181 @@
+"""Tests for cache-first bulk Apollo enrichment."""
+
+import httpx
+import pytest
+from fakeredis import aioredis
+
+from app.core.exceptions import APIConnectionError, APIRateLimitError
+from app.services.apollo import ApolloRateLimit, ApolloService, BulkMatchResult
+from app.services.apollo_enrichment_batcher import ApolloEnrichmentBatcher
+from app.services.cache.apollo_cache import ApolloPersonCache
+from app.services.rate_limiter import RateLimiter, RateLimitResult
+
+
+def person(email):
+    return {"id": f"id-{email}", "email": email, "first_name": email.split("@")[0], "title": "CFO"}
+
+
+class FakeApollo:
+    """Matches every email except those at unknown.com; fails per the given script"""
+
+    api_key = "test-key"
+
+    def __init__(self, failures=(), rate_limit=None):
+        self.calls = []
+        self.failures = list(failures)
+        self.rate_limit = rate_limit or ApolloRateLimit()
+
+    async def bulk_match_people(self, details, reveal_personal_emails=False):
+        self.calls.append([d["email"] for d in details])
+        if self.failures:
+            raise self.failures.pop(0)
+        matches = [None if d["email"].endswith("@unknown.com") else person(d["email"]) for d in details]
+        return BulkMatchResult(matches=matches, credits_consumed=sum(1 for m in matches if m),
+                               rate_limit=self.rate_limit)
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.paused = []
+        self.checks = 0
+
+    async def paused_for(self, user_id, provider):
+        return 0.0
+
+    async def check_rate_limit(self, user_id, provider, endpoint, estimated_tokens=0):
+        self.checks += 1
+        return RateLimitResult(allowed=True, requests_remaining=10, tokens_remaining=None, reset_time=0)
+
+    async def record_request(self, user_id, provider, endpoint, tokens_used=0):
+        pass
+
+    async def pause(self, user_id, provider, seconds):
+        self.paused.append(seconds)
+
+
+@pytest.fixture
+def cache():
+    return ApolloPersonCache(aioredis.FakeRedis(decode_responses=True))
+
+
+@pytest.mark.asyncio
+async def test_only_cache_misses_are_sent_ten_per_call(cache):
+    await cache.set_people({"cached@acme.com": person("cached@acme.com"), "gone@acme.com": None})
+    apollo = FakeApollo()
+    batcher = ApolloEnrichmentBatcher(apollo, cache=cache, rate_limiter=FakeLimiter())
+    emails = [f"user{i}@acme.com" for i in range(20)] + ["nobody@unknown.com", " Cached@Acme.com ",
+                                                          "gone@acme.com", "USER0@acme.com"]
+
+    result = await batcher.enrich_emails(emails)
+
+    assert sorted(len(call) for call in apollo.calls) == [1, 10, 10]
+    assert "cached@acme.com" not in sum(apollo.calls, [])
+    assert result.people["user7@acme.com"]["id"] == "id-user7@acme.com"
+    assert result.people["cached@acme.com"]["id"] == "id-cached@acme.com"
+    assert result.people["nobody@unknown.com"] is None
+    assert result.stats.as_dict() == {
+        "requested": 23, "cache_hits": 2, "api_calls": 3, "matched": 21, "not_found": 2,
+        "failed": 0, "credits_consumed": 20, "throttled_seconds": 0.0, "daily_quota_exhausted": False,
+    }
+
+    # Second run is served entirely from the cache, "no match" included
+    again = await ApolloEnrichmentBatcher(apollo, cache=cache).enrich_emails(emails)
+    assert len(apollo.calls) == 3
+    assert again.people == result.people
+    assert again.stats.cache_hits == 23
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_batches_pause_the_shared_limiter_and_retry(cache):
+    apollo = FakeApollo(failures=[APIRateLimitError("slow down", retry_after=7)])
+    limiter = FakeLimiter()
+    batcher = ApolloEnrichmentBatcher(apollo, cache=cache, rate_limiter=limiter)
+
+    result = await batcher.enrich_emails(["a@acme.com", "b@acme.com"])
+
+    assert limiter.paused == [7]
+    assert len(apollo.calls) == 2
+    assert limiter.checks == 2
+    assert result.stats.matched == 2 and result.failed == []
+
+
+@pytest.mark.asyncio
+async def test_exhausted_minute_window_pauses_other_workers(cache):
+    apollo = FakeApollo(rate_limit=ApolloRateLimit(minute_requests_left=0))
+    limiter = FakeLimiter()
+
+    await ApolloEnrichmentBatcher(apollo, rate_limiter=limiter).enrich_emails(["a@acme.com"])
+
+    assert len(limiter.paused) == 1
+    assert 0 < limiter.paused[0] <= 60
+
+
+@pytest.mark.asyncio
+async def test_exhausted_daily_quota_stops_the_run(cache):
+    apollo = FakeApollo(rate_limit=ApolloRateLimit(daily_requests_left=0))
+    batcher = ApolloEnrichmentBatcher(apollo, cache=cache, max_concurrency=1)
+    emails = [f"user{i}@acme.com" for i in range(25)]
+
+    result = await batcher.enrich_emails(emails)
+
+    assert len(apollo.calls) == 1
+    assert result.stats.daily_quota_exhausted
+    assert len(result.people) == 10
+    assert sorted(result.failed) == sorted(emails[10:])
+    # Unenriched emails are retried next run, not cached as "no match"
+    assert set(await cache.get_people(emails)) == set(emails[:10])
+
+
+@pytest.mark.asyncio
+async def test_batches_failing_every_retry_are_reported_not_cached(cache):
+    apollo = FakeApollo(failures=[APIConnectionError("down")] * 3)
+    batcher = ApolloEnrichmentBatcher(apollo, cache=cache, max_retries=2, backoff_seconds=0.001)
+
+    result = await batcher.enrich_emails(["a@acme.com"])
+
+    assert len(apollo.calls) == 3
+    assert result.failed == ["a@acme.com"]
+    assert result.people == {}
+    assert await cache.get_people(["a@acme.com"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_limiter_pause_is_shared_and_keeps_the_longest():
+    limiter = RateLimiter(aioredis.FakeRedis())
+
+    await limiter.pause("key", "apollo", 30)
+    await limiter.pause("key", "apollo", 5)
+    paused, other = await limiter.paused_for("key", "apollo"), await limiter.paused_for("other", "apollo")
+
+    assert 29 < paused <= 30
+    assert other == 0
+
+
+def test_rate_limit_headers_are_parsed_leniently():
+    limits = ApolloRateLimit.from_headers(httpx.Headers({
+        "x-minute-requests-left": "0", "x-hourly-requests-left": "abc", "x-24-hour-requests-left": "1200",
+    }))
+
+    assert limits == ApolloRateLimit(minute_requests_left=0, daily_requests_left=1200)
+    assert not limits.daily_quota_exhausted
+    assert ApolloRateLimit().pause_seconds() == 0
+    assert ApolloRateLimit(retry_after=12, minute_requests_left=0).pause_seconds() == 12
+
+
+@pytest.mark.asyncio
+async def test_bulk_match_keeps_results_aligned_with_the_request(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, headers={"x-minute-requests-left": "49"}, json={
+            "matches": [None, {"person": person("b@acme.com")}], "credits_consumed": 1,
+        })
+
+    client = httpx.AsyncClient(base_url="https://api.apollo.io/api/v1", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ApolloService, "client", property(lambda self: client))
+
+    result = await ApolloService(api_key="test-key").bulk_match_people(
+        [{"email": "a@acme.com"}, {"email": "b@acme.com"}, {"email": "c@acme.com"}]
+    )
+
+    assert result.matches == [None, person("b@acme.com"), None]
+    assert result.credits_consumed == 1
+    assert result.rate_limit.minute_requests_left == 49
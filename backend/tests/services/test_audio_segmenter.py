@@ -0,0 +1,164 @@
+"""
+Tests for VAD utterance segmentation in AudioBuffer / AudioProcessor
+
+Covers PCM and WebM frame decoding (real durations), end-of-speech
+segmentation, and one STT call per utterance with a mocked transcriber.
+"""
+
+import time
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock
+
+from app.services.audio_processor import AudioBuffer, AudioChunk, AudioProcessor
+from app.services.audio_segmenter import (
+    CLUSTER_ID,
+    SEGMENT_ID,
+    SIMPLE_BLOCK_ID,
+    TIMECODE_ID,
+    WebMFrameDecoder,
+    opus_packet_duration_ms,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _pcm(speech_ms: int = 0, silence_ms: int = 0) -> bytes:
+    """Tone (speech stand-in) followed by digital silence, s16le mono."""
+    tone = (np.sin(np.arange(SAMPLE_RATE * speech_ms // 1000) * 0.3) * 8000).astype("<i2")
+    silence = np.zeros(SAMPLE_RATE * silence_ms // 1000, dtype="<i2")
+    return np.concatenate([tone, silence]).tobytes()
+
+
+def _chunks(data: bytes, size: int = 3200, audio_format: str = "pcm"):
+    for i in range(0, len(data), size):
+        yield AudioChunk(data[i:i + size], time.time(), i // size, format=audio_format)
+
+
+def _element(element_id: int, payload: bytes) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + bytes([0x40 | (len(payload) >> 8), len(payload) & 0xFF]) + payload
+
+
+def _webm(packet_sizes):
+    """Minimal WebM: init segment, one unknown-size cluster of 20ms Opus blocks."""
+    init = _element(0x1A45DFA3, b"\x42\x82\x84webm") + SEGMENT_ID.to_bytes(4, "big") + b"\x01" + b"\xff" * 7
+    init += _element(0x1654AE6B, b"\x00" * 8)  # Tracks (opaque to the parser)
+    cluster = CLUSTER_ID.to_bytes(4, "big") + b"\x01" + b"\xff" * 7 + _element(TIMECODE_ID, b"\x00")
+    for i, size in enumerate(packet_sizes):
+        # Track 1, relative timecode, keyframe flag, TOC config 31 (CELT FB 20ms), code 0
+        packet = bytes([31 << 3]) + b"\x55" * (size - 1)
+        cluster += _element(SIMPLE_BLOCK_ID, b"\x81" + (i * 20).to_bytes(2, "big") + b"\x80" + packet)
+    return init, cluster
+
+
+def test_opus_packet_duration_from_toc():
+    """Test Opus TOC config and frame-count code give the packet duration"""
+    assert opus_packet_duration_ms(memoryview(bytes([31 << 3]))) == 20
+    assert opus_packet_duration_ms(memoryview(bytes([(1 << 3) | 1]))) == 40
+    assert opus_packet_duration_ms(memoryview(bytes([(16 << 3) | 3, 4]))) == 10
+
+
+def test_pcm_duration_is_measured_not_estimated():
+    """Test PCM duration comes from decoded frames"""
+    buffer = AudioBuffer(audio_format="pcm")
+    for chunk in _chunks(_pcm(speech_ms=1000)):
+        buffer.add_chunk(chunk)
+
+    assert buffer.supports_segmentation
+    assert buffer.segmenter.in_speech
+    assert buffer.total_duration_ms == pytest.approx(1000, abs=20)
+
+
+def test_pcm_utterance_emitted_at_end_of_speech():
+    """Test one WAV segment is cut after the end-of-speech silence"""
+    buffer = AudioBuffer(audio_format="pcm", end_silence_ms=400)
+    segments = []
+    for chunk in _chunks(_pcm(speech_ms=1200, silence_ms=1000)):
+        segments.extend(buffer.add_chunk(chunk))
+
+    assert len(segments) == 1
+    segment = segments[0]
+    assert segment.audio_format == "wav"
+    assert segment.audio[:4] == b"RIFF"
+    # Speech plus the trailing silence that ended it
+    assert 1500 <= segment.duration_ms <= 1700
+    # Silence after the utterance isn't kept
+    assert buffer.total_bytes < SAMPLE_RATE * 2
+
+
+def test_silence_only_produces_no_segment():
+    """Test silence never triggers transcription and isn't accumulated"""
+    buffer = AudioBuffer(audio_format="pcm")
+    segments = []
+    for chunk in _chunks(_pcm(silence_ms=5000)):
+        segments.extend(buffer.add_chunk(chunk))
+
+    assert segments == []
+    assert buffer.flush_segment() is None
+    assert buffer.total_bytes < SAMPLE_RATE * 2
+
+
+def test_long_speech_is_cut_at_max_duration():
+    """Test continuous speech is split at max_duration_ms"""
+    buffer = AudioBuffer(max_duration_ms=2000, audio_format="pcm")
+    segments = []
+    for chunk in _chunks(_pcm(speech_ms=5000)):
+        segments.extend(buffer.add_chunk(chunk))
+
+    assert len(segments) == 2
+    assert all(s.duration_ms <= 2000 for s in segments)
+
+
+def test_webm_segments_are_self_contained():
+    """Test WebM blocks are parsed and segments carry the init segment"""
+    init, cluster = _webm([120] * 40 + [8] * 40)
+    buffer = AudioBuffer(audio_format="webm", end_silence_ms=400)
+
+    segments = []
+    stream = init + cluster
+    for i in range(0, len(stream), 500):
+        segments.extend(buffer.add_chunk(AudioChunk(stream[i:i + 500], time.time(), i, format="webm")))
+
+    assert len(segments) == 1
+    segment = segments[0]
+    assert segment.audio.startswith(init)
+    assert CLUSTER_ID.to_bytes(4, "big") in segment.audio[len(init):len(init) + 4]
+    assert segment.duration_ms == pytest.approx(1200, abs=40)
+
+
+def test_webm_decoder_waits_for_complete_elements():
+    """Test a block split across chunks is decoded once it is complete"""
+    init, cluster = _webm([120, 120])
+    decoder = WebMFrameDecoder()
+    data = init + cluster
+
+    frames, consumed = decoder.feed(memoryview(data[:-10]), 0)
+    assert len(frames) == 1
+    assert decoder.init_end == len(init)
+
+    frames, _ = decoder.feed(memoryview(data[consumed:]), consumed)
+    assert len(frames) == 1
+    assert frames[0].end == len(data)
+
+
+@pytest.mark.asyncio
+async def test_processor_transcribes_once_per_utterance():
+    """Test STT runs once per utterance instead of per buffer fill"""
+    transcriber = AsyncMock()
+    transcriber.transcribe_audio = AsyncMock(side_effect=lambda *args, **kwargs: {"text": "hello there", "latency_ms": 50})
+    callback = AsyncMock()
+    processor = AudioProcessor("conv-1", transcriber, on_transcription_callback=callback)
+
+    audio = _pcm(speech_ms=1500, silence_ms=800) + _pcm(speech_ms=1500, silence_ms=800)
+    for i in range(0, len(audio), 3200):
+        await processor.process_audio_chunk(audio[i:i + 3200], audio_format="pcm")
+
+    assert transcriber.transcribe_audio.await_count == 2
+    assert transcriber.transcribe_audio.await_args.kwargs["audio_format"] == "wav"
+    assert callback.await_count == 2
+    # Duration of the audio sent to STT: speech + end-of-speech silence, and
+    # for the second utterance the 200 ms of pre-roll before it
+    durations = [call.args[0]["duration_seconds"] for call in callback.await_args_list]
+    assert durations == [pytest.approx(2.0, abs=0.05), pytest.approx(2.2, abs=0.05)]
+    assert await processor.flush() is None
@@ -0,0 +1,193 @@
+"""Tests for cached authenticated principals and off-loop password verification."""
+
+import pytest
+from fakeredis import aioredis
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.dependencies.auth import PermissionChecker, RoleChecker
+from app.models.database import Base
+from app.models.security import Permission, Role, User
+from app.services import auth
+from app.services.auth import AuthService, AuthenticatedPrincipal, hash_password
+from app.services.cache.principal_cache import PrincipalCache
+
+PASSWORD = "Sup3rSecret"
+
+
+@pytest.fixture(scope="module")
+def password_hash_value():
+    return hash_password(PASSWORD)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine, password_hash_value):
+    session = sessionmaker(bind=engine)()
+    read, write = Permission(name="read:leads"), Permission(name="write:leads")
+    session.add(User(
+        username="alice",
+        email="alice@example.com",
+        hashed_password=password_hash_value,
+        roles=[Role(name="manager", permissions=[read, write])],
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def principal_cache():
+    return PrincipalCache(aioredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture(autouse=True)
+def clear_local_principals():
+    auth._local_principals.clear()
+    yield
+    auth._local_principals.clear()
+
+
+@pytest.fixture
+def queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def alice(db):
+    return db.query(User).filter(User.username == "alice").one()
+
+
+@pytest.mark.asyncio
+async def test_principal_is_loaded_once_then_served_from_cache(db, principal_cache, queries):
+    service = AuthService(db)
+    token = service.create_access_token(alice(db))
+    queries.clear()
+
+    first = await service.aget_current_principal(token, principal_cache)
+    loaded = len(queries)
+    second = await service.aget_current_principal(token, principal_cache)
+
+    assert first == second
+    assert first.roles == frozenset({"manager"})
+    assert first.permissions == frozenset({"read:leads", "write:leads"})
+    assert loaded <= 3  # user, roles, permissions
+    assert len(queries) == loaded
+
+
+@pytest.mark.asyncio
+async def test_other_processes_are_served_from_redis(db, principal_cache, queries):
+    service = AuthService(db)
+    token = service.create_access_token(alice(db))
+    principal = await service.aget_current_principal(token, principal_cache)
+
+    auth._local_principals.clear()  # as seen from another worker
+    queries.clear()
+
+    assert await service.aget_current_principal(token, principal_cache) == principal
+    assert queries == []
+
+
+@pytest.mark.asyncio
+async def test_revoking_tokens_invalidates_cached_principals(db, principal_cache):
+    service = AuthService(db)
+    user = alice(db)
+    old_token = service.create_access_token(user)
+    assert await service.aget_current_principal(old_token, principal_cache)
+
+    await service.arevoke_all_tokens(user, principal_cache)
+
+    assert await service.aget_current_principal(old_token, principal_cache) is None
+    assert service.get_current_user(old_token) is None
+    new_token = service.create_access_token(user)
+    assert (await service.aget_current_principal(new_token, principal_cache)).token_version == 1
+
+
+@pytest.mark.asyncio
+async def test_inactive_users_are_rejected(db, principal_cache):
+    service = AuthService(db)
+    user = alice(db)
+    user.is_active = False
+    db.commit()
+
+    assert await service.aget_current_principal(service.create_access_token(user), principal_cache) is None
+
+
+@pytest.mark.asyncio
+async def test_deactivation_rejects_cached_principals(db, principal_cache):
+    service = AuthService(db)
+    user = alice(db)
+    token = service.create_access_token(user)
+    assert await service.aget_current_principal(token, principal_cache)
+
+    await service.adeactivate_user(user, principal_cache)
+
+    assert await service.aget_current_principal(token, principal_cache) is None
+    assert await service.aget_current_principal(service.create_access_token(user), principal_cache) is None
+
+
+@pytest.mark.asyncio
+async def test_role_and_permission_changes_invalidate_cached_principals(db, principal_cache):
+    service = AuthService(db)
+    user = alice(db)
+    token = service.create_access_token(user)
+    assert (await service.aget_current_principal(token, principal_cache)).has_permission("write:leads")
+
+    await service.aset_role_permissions(user.roles[0], ["read:leads"], principal_cache)
+    assert not (await service.aget_current_principal(token, principal_cache)).has_permission("write:leads")
+
+    db.add(Role(name="viewer"))
+    db.commit()
+    await service.aset_user_roles(user, ["viewer"], principal_cache)
+    principal = await service.aget_current_principal(token, principal_cache)
+    assert principal.roles == frozenset({"viewer"})
+    assert principal.permissions == frozenset()
+
+
+@pytest.mark.asyncio
+async def test_checkers_use_precomputed_sets():
+    principal = AuthenticatedPrincipal(
+        id=1, username="bob", email="bob@example.com", is_active=True, is_superuser=False,
+        token_version=0, roles=frozenset({"user"}), permissions=frozenset({"read:leads"}),
+    )
+
+    assert await RoleChecker(["admin", "user"])(principal)
+    assert await PermissionChecker(["read:leads"])(principal)
+    with pytest.raises(HTTPException) as denied:
+        await PermissionChecker(["read:leads", "write:leads"])(principal)
+    assert denied.value.status_code == 403
+    assert "write:leads" in denied.value.detail
+    with pytest.raises(HTTPException):
+        await RoleChecker(["admin"])(principal)
+
+
+def test_principal_round_trips_through_dict():
+    principal = AuthenticatedPrincipal(
+        id=1, username="bob", email="bob@example.com", is_active=True, is_superuser=True,
+        token_version=3, roles=frozenset({"admin"}), permissions=frozenset(),
+    )
+
+    assert AuthenticatedPrincipal.from_dict(principal.as_dict()) == principal
+    assert principal.has_permission("manage:system")
+
+
+@pytest.mark.asyncio
+async def test_login_verifies_passwords_off_the_event_loop(db):
+    service = AuthService(db)
+
+    assert await service.aauthenticate_user("alice", "wrong-password") is None
+    assert alice(db).failed_login_attempts == 1
+
+    user = await service.aauthenticate_user("alice@example.com", PASSWORD)
+    assert user.username == "alice"
+    assert user.failed_login_attempts == 0
+    assert service.authenticate_user("alice", "wrong-password") is None
@@ -0,0 +1,129 @@
+"""
+Tests for BatchQualificationWorker
+
+Covers provider pacing, micro-batching, failure accounting and the bulk
+UPDATE ... FROM (VALUES ...) write-back, with mocked Cerebras and DB session.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import Mock, AsyncMock, MagicMock
+
+from app.services.batch_qualifier import BatchQualificationWorker, ProviderPacer
+
+
+def _lead(lead_id: int) -> dict:
+    return {
+        "id": lead_id, "company_name": f"Dealer {lead_id}", "company_website": None,
+        "company_size": None, "industry": "Solar", "contact_name": None,
+        "contact_title": None, "notes": None,
+    }
+
+
+def _result(rows):
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = rows
+    return result
+
+
+@pytest.fixture
+def cerebras_service():
+    service = Mock()
+    service.default_model = "llama3.1-8b"
+    service.calculate_cost = Mock(return_value={
+        "input_cost_usd": 0.0, "output_cost_usd": 0.0, "total_cost_usd": 0.0
+    })
+
+    async def score(batch):
+        # Model skips the last lead of every batch
+        return (
+            {lead["id"]: (80.0, "Strong fit") for lead in batch[:-1]},
+            50,
+            {"prompt_tokens": 100, "completion_tokens": 50},
+        )
+
+    service.aqualify_leads_batch = AsyncMock(side_effect=score)
+    return service
+
+
+@pytest.fixture
+def db_session():
+    leads = [_lead(i) for i in range(1, 26)]
+    session = MagicMock()
+    # Keyset pagination: one chunk of leads, then no more rows
+    session.execute = AsyncMock(side_effect=[_result(leads), None, _result([])])
+    session.commit = AsyncMock()
+    session.add_all = Mock()
+
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory, session
+
+
+@pytest.mark.asyncio
+async def test_run_batches_leads_and_bulk_updates(cerebras_service, db_session):
+    """Test leads are packed per request and written back in one UPDATE"""
+    factory, session = db_session
+    worker = BatchQualificationWorker(
+        cerebras_service=cerebras_service,
+        session_factory=factory,
+        leads_per_request=10
+    )
+
+    stats = await worker.run()
+
+    # 25 leads / 10 per prompt = 3 requests
+    assert cerebras_service.aqualify_leads_batch.await_count == 3
+    assert stats["requests"] == 3
+    assert stats["leads_loaded"] == 25
+    assert stats["leads_scored"] == 22
+    assert stats["leads_failed"] == 3
+    assert "leads_per_second" in stats
+
+    update_stmt, params = session.execute.await_args_list[1].args
+    assert "FROM (VALUES" in str(update_stmt)
+    assert sum(1 for key in params if key.startswith("id_")) == 22
+    session.add_all.assert_called_once()
+    assert len(session.add_all.call_args.args[0]) == 3
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_counted_not_raised(cerebras_service, db_session):
+    """Test a failing batch is recorded without aborting the run"""
+    factory, session = db_session
+    cerebras_service.aqualify_leads_batch = AsyncMock(side_effect=Exception("503"))
+    session.execute = AsyncMock(side_effect=[_result([_lead(1), _lead(2)]), _result([])])
+
+    worker = BatchQualificationWorker(cerebras_service=cerebras_service, session_factory=factory)
+    stats = await worker.run()
+
+    assert stats["failed_requests"] == 1
+    assert stats["leads_scored"] == 0
+    assert stats["leads_failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pacer_enforces_requests_per_minute():
+    """Test pacer blocks once the per-minute request budget is spent"""
+    pacer = ProviderPacer(requests_per_minute=2)
+    pacer.WINDOW_SECONDS = 0.2
+
+    start = time.monotonic()
+    for _ in range(3):
+        await pacer.acquire()
+
+    assert time.monotonic() - start >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_pacer_enforces_tokens_per_minute():
+    """Test pacer waits when estimated tokens would exceed the budget"""
+    pacer = ProviderPacer(requests_per_minute=100, tokens_per_minute=1000)
+    pacer.WINDOW_SECONDS = 0.2
+
+    await pacer.acquire(800)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(pacer.acquire(800), timeout=0.05)
@@ -0,0 +1,119 @@
+"""Tests for batched, compressed CacheBase operations."""
+
+import asyncio
+import json
+
+import pytest
+from fakeredis import aioredis
+
+from app.services.cache import base
+from app.services.cache.base import CacheBase
+from app.services.cache.qualification_cache import QualificationCache
+from app.services.cache.serialization import CacheCodec
+
+PROFILE = {"name": "Jane Doe", "headline": "CFO at Acme", "experience": [{"company": "Acme", "years": i} for i in range(200)]}
+
+
+@pytest.fixture
+def redis_client():
+    return aioredis.FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def clear_pending_stats():
+    base._pending_stats.clear()
+    base._last_stats_flush.clear()
+    yield
+    base._pending_stats.clear()
+    base._last_stats_flush.clear()
+
+
+def test_get_many_and_set_many_round_trip(redis_client):
+    cache = CacheBase(redis_client, prefix="batch-test", default_ttl=1000)
+    items = {f"company-{i}": {"score": i} for i in range(50)}
+
+    async def scenario():
+        assert await cache.set_many(items, ttls={"company-0": 60})
+        cached = await cache.get_many([f"company-{i}" for i in range(60)])
+        ttls = [await redis_client.ttl(f"batch-test:company-{i}") for i in range(50)]
+        return cached, ttls
+
+    cached, ttls = asyncio.run(scenario())
+
+    assert cached == items
+    assert 59 <= ttls[0] <= 66
+    assert all(999 <= ttl <= 1100 for ttl in ttls[1:])
+    assert len(set(ttls[1:])) > 1  # Jittered, not all expiring together
+
+
+def test_hit_and_miss_counts_are_flushed_in_batches(redis_client, monkeypatch):
+    cache = CacheBase(redis_client, prefix="stats-test")
+
+    async def scenario():
+        await cache.set("known", {"v": 1})
+        await cache.get("known")
+        await cache.get_many(["known", "unknown-1", "unknown-2"])
+        before_flush = await redis_client.get(cache.hits_key)
+        monkeypatch.setattr(base, "CACHE_STATS_FLUSH_SECONDS", 0)
+        await cache.get("unknown-3")
+        return before_flush, await cache.get_stats()
+
+    before_flush, stats = asyncio.run(scenario())
+
+    assert before_flush is None
+    assert (stats["hits"], stats["misses"]) == (2, 3)
+
+
+def test_large_values_are_compressed_and_small_ones_stay_json(redis_client):
+    pytest.importorskip("zstandard")
+    cache = CacheBase(redis_client, prefix="codec-test", compress=True)
+
+    async def scenario():
+        await cache.set_many({"large": PROFILE, "small": {"score": 87}})
+        stored = await redis_client.mget(["codec-test:large", "codec-test:small"])
+        return stored, await cache.get_many(["large", "small"])
+
+    (large, small), cached = asyncio.run(scenario())
+
+    assert large.startswith(b"\x00") and len(large) < len(json.dumps(PROFILE)) / 3
+    assert json.loads(small) == {"score": 87}
+    assert cached == {"large": PROFILE, "small": {"score": 87}}
+
+
+def test_values_written_with_any_settings_decode():
+    pytest.importorskip("msgpack")
+    pytest.importorskip("zstandard")
+    reader = CacheCodec(serializer="json", compress=False)
+
+    for writer in (CacheCodec("msgpack", compress=True, compress_min_bytes=0), CacheCodec("msgpack", compress=False),
+                   CacheCodec("orjson", compress=True, compress_min_bytes=0), CacheCodec("json", compress=False)):
+        assert reader.decode(writer.encode(PROFILE)) == PROFILE
+
+    assert reader.decode(json.dumps(PROFILE)) == PROFILE  # Entries written before the codec
+
+
+def test_clients_decoding_responses_get_plain_json():
+    cache = CacheBase(aioredis.FakeRedis(decode_responses=True), prefix="text-test", serializer="msgpack", compress=True)
+
+    async def scenario():
+        await cache.set("profile", PROFILE)
+        return await cache.redis.get("text-test:profile"), await cache.get("profile")
+
+    stored, cached = asyncio.run(scenario())
+
+    assert json.loads(stored) == PROFILE
+    assert cached == PROFILE
+
+
+def test_qualification_batch_lookups_use_normalized_keys(redis_client):
+    cache = QualificationCache(redis_client)
+
+    async def scenario():
+        await cache.set_qualifications({("Acme, Inc.", "SaaS"): {"result": {"score": 80}}})
+        return await cache.get_qualifications([("acme inc", "saas"), ("Globex", None)])
+
+    cached = asyncio.run(scenario())
+
+    assert list(cached) == [("acme inc", "saas")]
+    assert cached[("acme inc", "saas")]["result"] == {"score": 80}
+    assert cached[("acme inc", "saas")]["company_name"] == "Acme, Inc."
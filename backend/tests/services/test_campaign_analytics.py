@@ -0,0 +1,160 @@
+"""Tests for grouped campaign analytics and the cached analytics snapshot."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.campaign import (
+    Campaign,
+    CampaignChannel,
+    CampaignMessage,
+    MessageStatus,
+    MessageTone,
+    MessageVariantAnalytics,
+)
+from app.models.database import Base
+from app.models.lead import Lead
+from app.services.cache import CampaignAnalyticsCache
+
+TONES = [MessageTone.PROFESSIONAL, MessageTone.FRIENDLY, MessageTone.DIRECT]
+
+
+class FakeRedis:
+    """In-memory stand-in for the async Redis commands CacheBase uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    tables = [Lead.__table__, Campaign.__table__, CampaignMessage.__table__, MessageVariantAnalytics.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: session.statements.append(args[2]))
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def service_factory(db, monkeypatch):
+    monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+    from app.services.outreach import CampaignService
+    return lambda cache=None: CampaignService(db, analytics_cache=cache)
+
+
+def seed(db, counters):
+    """counters: per message, a list of (selected, opened, clicked, replied) per variant"""
+    campaign = Campaign(name="Q1", channel=CampaignChannel.EMAIL, total_messages=len(counters))
+    other = Campaign(name="Other", channel=CampaignChannel.EMAIL, total_messages=1)
+    db.add_all([campaign, other])
+    db.flush()
+    for campaign_id, rows in [(campaign.id, counters), (other.id, [[(50, 50, 50, 50)] * 3])]:
+        for variants in rows:
+            message = CampaignMessage(campaign_id=campaign_id, variants=[], status=MessageStatus.SENT)
+            db.add(message)
+            db.flush()
+            for i, (selected, opened, clicked, replied) in enumerate(variants):
+                db.add(MessageVariantAnalytics(
+                    message_id=message.id, variant_number=i, tone=TONES[i], body="body",
+                    times_selected=selected, times_opened=opened, times_clicked=clicked, times_replied=replied
+                ))
+    db.commit()
+    return campaign
+
+
+def test_variant_performance_is_grouped_per_tone(db, service_factory):
+    campaign = seed(db, [
+        [(10, 5, 2, 1), (10, 6, 3, 4), (10, 2, 1, 0)],
+        [(10, 5, 2, 1), (30, 10, 3, 2)],
+    ])
+    db.statements.clear()
+
+    analytics = service_factory().get_campaign_analytics(campaign.id)
+
+    performance = analytics["ab_testing"]["variant_performance"]
+    assert [p["tone"] for p in performance] == ["professional", "friendly", "direct"]
+    assert performance[0] == {
+        "tone": "professional", "times_selected": 20, "times_opened": 10, "times_clicked": 4, "times_replied": 2,
+        "open_rate": 50.0, "click_rate": 20.0, "reply_rate": 10.0,
+    }
+    assert performance[1]["times_selected"] == 40
+    assert performance[1]["reply_rate"] == pytest.approx(15.0)
+    assert performance[2]["times_opened"] == 2
+    assert analytics["ab_testing"]["winning_variant"]["tone"] == "friendly"
+    assert sum("message_variant_analytics" in statement for statement in db.statements) == 1
+
+
+def test_campaign_without_variants_has_no_performance(db, service_factory):
+    campaign = seed(db, [])
+
+    analytics = service_factory().get_campaign_analytics(campaign.id)
+
+    assert analytics["ab_testing"] == {"variant_performance": [], "winning_variant": None}
+
+
+def test_snapshot_is_cached_until_status_update(db, service_factory):
+    campaign = seed(db, [[(10, 5, 2, 1), (10, 6, 3, 4), (10, 2, 1, 0)]])
+    redis_client = FakeRedis()
+    service = service_factory(CampaignAnalyticsCache(redis_client))
+
+    first = asyncio.run(service.aget_campaign_analytics(campaign.id))
+    assert first["campaign"]["name"] == "Q1"
+    assert first["campaign"]["status"] == "draft"
+    assert "campaign_analytics:%d" % campaign.id in redis_client.data
+
+    db.statements.clear()
+    cached = asyncio.run(service.aget_campaign_analytics(campaign.id))
+    assert cached == first
+    assert db.statements == []
+
+    message = db.query(CampaignMessage).filter(CampaignMessage.campaign_id == campaign.id).first()
+    asyncio.run(service.aupdate_message_status(message.id, "replied", variant_number=2))
+    assert "campaign_analytics:%d" % campaign.id not in redis_client.data
+
+    fresh = asyncio.run(service.aget_campaign_analytics(campaign.id))
+    direct = next(p for p in fresh["ab_testing"]["variant_performance"] if p["tone"] == "direct")
+    assert direct["times_replied"] == 1
+    assert direct["times_selected"] == 11
+
+
+def test_activation_invalidates_the_snapshot(db, service_factory):
+    campaign = seed(db, [[(10, 5, 2, 1)]])
+    service = service_factory(CampaignAnalyticsCache(FakeRedis()))
+
+    assert asyncio.run(service.aget_campaign_analytics(campaign.id))["campaign"]["status"] == "draft"
+    asyncio.run(service.aactivate_campaign(campaign.id))
+
+    assert asyncio.run(service.aget_campaign_analytics(campaign.id))["campaign"]["status"] == "active"
+
+
+def test_cache_errors_fall_back_to_database(db, service_factory):
+    campaign = seed(db, [[(10, 5, 2, 1)]])
+
+    class BrokenRedis(FakeRedis):
+        async def get(self, key):
+            raise ConnectionError("redis down")
+
+        async def setex(self, key, ttl, value):
+            raise ConnectionError("redis down")
+
+    service = service_factory(CampaignAnalyticsCache(BrokenRedis()))
+    analytics = asyncio.run(service.aget_campaign_analytics(campaign.id))
+
+    assert analytics["ab_testing"]["variant_performance"][0]["times_selected"] == 10
@@ -0,0 +1,220 @@
+"""Tests for bulk, cached and resumable campaign message generation."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.exceptions import ResourceConflictError, ValidationError
+from app.models.campaign import (
+    Campaign,
+    CampaignChannel,
+    CampaignMessage,
+    MessageVariantAnalytics,
+)
+from app.models.database import Base
+from app.models.lead import Lead
+
+
+class StubLLM:
+    """Stands in for MessageGenerator.agenerate_from_prompt"""
+
+    def __init__(self, fail_for=(), delay=0.0):
+        self.prompts = []
+        self.fail_for = set(fail_for)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, prompt, channel):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if any(name in prompt for name in self.fail_for):
+                raise RuntimeError("upstream timeout")
+        finally:
+            self.in_flight -= 1
+        variants = [
+            {"tone": tone, "subject": f"{tone} subject", "body": f"{tone} body"}
+            for tone in ("professional", "friendly", "direct")
+        ]
+        return {"variants": variants, "generation_time_ms": 5, "cost_usd": 0.001, "tokens_used": 600}
+
+
+class RecordingAnalyticsCache:
+    """Stands in for CampaignAnalyticsCache, recording invalidations"""
+
+    def __init__(self):
+        self.invalidated = []
+
+    async def invalidate(self, campaign_id):
+        self.invalidated.append(campaign_id)
+        return True
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'campaigns.db'}")
+    # Leads are streamed on a second connection while chunks commit
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    tables = [Lead.__table__, Campaign.__table__, CampaignMessage.__table__, MessageVariantAnalytics.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+    from app.services.outreach import MessageGenerator
+    generator = MessageGenerator()
+    generator.agenerate_from_prompt = StubLLM()
+    return generator
+
+
+def seed(db, leads=6, duplicates=0, industry="Solar"):
+    """Campaign targeting score >= 50; `duplicates` extra leads copy lead 0's profile"""
+    campaign = Campaign(name="Q1", channel=CampaignChannel.EMAIL, min_qualification_score=50)
+    db.add(campaign)
+    for i in range(leads):
+        db.add(Lead(company_name=f"Company {i}", contact_name=f"Contact {i}", qualification_score=60 + i, industry=industry))
+    for _ in range(duplicates):
+        db.add(Lead(company_name="Company 0", contact_name="Contact 0", qualification_score=60, industry=industry))
+    db.add(Lead(company_name="Cold Co", contact_name="Nobody", qualification_score=10, industry=industry))
+    db.commit()
+    return campaign
+
+
+def run(db, generator, campaign, **kwargs):
+    from app.services.outreach import CampaignGenerationEngine
+    engine = CampaignGenerationEngine(db, generator, **kwargs)
+    return asyncio.run(engine.run(campaign.id))
+
+
+def test_generates_messages_in_bulk_for_targeted_leads(db, generator):
+    campaign = seed(db, leads=5)
+    progress = []
+
+    from app.services.outreach import CampaignGenerationEngine
+    engine = CampaignGenerationEngine(db, generator, chunk_size=2)
+    stats = asyncio.run(engine.run(campaign.id, progress_callback=progress.append))
+
+    assert stats["messages_generated"] == 5
+    assert stats["llm_calls"] == 5
+    assert [p["leads_processed"] for p in progress] == [2, 4, 5]
+    assert db.query(CampaignMessage).count() == 5
+    assert db.query(MessageVariantAnalytics).count() == 15
+
+    message = db.query(CampaignMessage).join(Lead).filter(Lead.company_name == "Company 3").one()
+    assert message.personalization_data["qualification_score"] == 63
+    assert [a.variant_number for a in message.analytics] == [0, 1, 2]
+    assert message.analytics[1].body == "friendly body"
+
+    db.refresh(campaign)
+    assert campaign.total_messages == 5
+    assert campaign.total_cost == pytest.approx(0.005)
+
+
+def test_identical_profiles_share_one_llm_call(db, generator):
+    campaign = seed(db, leads=3, duplicates=4)
+
+    stats = run(db, generator, campaign, chunk_size=3)
+
+    assert stats["messages_generated"] == 7
+    assert stats["llm_calls"] == 3
+    assert stats["cache_hits"] == 4
+    assert len(generator.agenerate_from_prompt.prompts) == 3
+    # Cost is only charged to the message that made the call
+    assert stats["total_cost"] == pytest.approx(0.003)
+
+
+def test_generation_concurrency_is_bounded(db, generator):
+    generator.agenerate_from_prompt = StubLLM(delay=0.01)
+    campaign = seed(db, leads=12)
+
+    stats = run(db, generator, campaign, max_concurrency=3)
+
+    assert stats["messages_generated"] == 12
+    assert 1 < generator.agenerate_from_prompt.max_in_flight <= 3
+
+
+def test_rerun_resumes_with_leads_missing_messages(db, generator):
+    generator.agenerate_from_prompt = StubLLM(fail_for={"Company 1", "Company 4"})
+    campaign = seed(db, leads=5)
+
+    first = run(db, generator, campaign, chunk_size=2)
+    assert first["messages_generated"] == 3
+    assert first["failed"] == 2
+
+    generator.agenerate_from_prompt = StubLLM()
+    second = run(db, generator, campaign)
+
+    assert second["leads_processed"] == 2
+    assert second["messages_generated"] == 2
+    assert len(generator.agenerate_from_prompt.prompts) == 2
+    db.refresh(campaign)
+    assert campaign.total_messages == 5
+    assert campaign.total_cost == pytest.approx(0.005)
+
+
+def test_service_validates_and_regenerates(db, generator):
+    from app.services.outreach import CampaignService
+    campaign = seed(db, leads=2)
+    service = CampaignService(db)
+    service.message_generator = generator
+
+    assert service.generate_messages(campaign.id)["messages_generated"] == 2
+
+    with pytest.raises(ResourceConflictError):
+        service.prepare_generation(campaign.id)
+
+    stats = service.generate_messages(campaign.id, force_regenerate=True)
+    assert stats["messages_generated"] == 2
+    assert db.query(CampaignMessage).count() == 2
+
+    empty = Campaign(name="Nobody", channel=CampaignChannel.SMS, target_industries=["Retail"])
+    db.add(empty)
+    db.commit()
+    with pytest.raises(ValidationError):
+        service.prepare_generation(empty.id)
+
+
+def test_each_committed_chunk_invalidates_the_analytics_snapshot(db, generator):
+    campaign = seed(db, leads=5)
+    cache = RecordingAnalyticsCache()
+
+    run(db, generator, campaign, chunk_size=2, analytics_cache=cache)
+
+    # Three chunks, then the refreshed campaign totals
+    assert cache.invalidated == [campaign.id] * 4
+
+
+def test_regeneration_invalidates_the_snapshot_and_validates_once(db, generator, monkeypatch):
+    from app.services.outreach import CampaignService
+    campaign = seed(db, leads=2)
+    cache = RecordingAnalyticsCache()
+    service = CampaignService(db, analytics_cache=cache)
+    service.message_generator = generator
+    service.generate_messages(campaign.id)
+
+    prepared = []
+    prepare_generation = service.prepare_generation
+    monkeypatch.setattr(service, "prepare_generation", lambda *args: prepared.append(args) or prepare_generation(*args))
+    cache.invalidated.clear()
+
+    async def regenerate():
+        await service.aprepare_generation(campaign.id, force_regenerate=True)
+        assert cache.invalidated == [campaign.id]  # Deleted messages leave the snapshot too
+        return await service.agenerate_messages(campaign.id, force_regenerate=True, prepared=True)
+
+    stats = asyncio.run(regenerate())
+
+    assert stats["messages_generated"] == 2
+    assert len(prepared) == 1
+    assert cache.invalidated == [campaign.id] * 3
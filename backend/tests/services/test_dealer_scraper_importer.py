@@ -0,0 +1,180 @@
+"""Tests for the bulk dealer scraper import pipeline."""
+
+import asyncio
+import csv
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models.lead import Lead
+
+FIELDS = [
+    'name', 'phone', 'website', 'email', 'street', 'city', 'state', 'zip', 'ICP_Score', 'ICP_Tier',
+    'OEM_Count', 'OEMs_Certified', 'has_hvac', 'has_solar', 'has_generator', 'has_electrical',
+    'has_plumbing', 'has_ops_maintenance', 'is_commercial', 'is_resimercial', 'employee_count',
+    'rating', 'tier', 'oem_source',
+]
+
+CONTRACTORS = [
+    ['Sunrise Energy', '(617) 555-0101', 'https://sunrise.example.com', 'info@sunrise.example.com', '1 Main St',
+     'Boston', 'MA', '02134', 72, 'GOLD', 3, 'Tesla Powerwall, Enphase, Generac', 'False', 'True', 'True',
+     'True', 'False', 'True', 'True', 'False', 25, 4.7, 'Elite Plus', 'Generac'],
+    ['Cool Air HVAC', '555-0102', '', '', '9 Elm St', 'Austin', 'TX', '73301', 45, 'SILVER', 1, 'Carrier',
+     'True', 'False', 'False', 'False', 'False', 'False', 'False', 'False', '', 3.9, '', ''],
+    ['Bright Electric', '555-0103', 'bright.example.com', '', '', 'Denver', 'CO', '80014', 30, 'BRONZE', 0, '',
+     'False', 'False', 'False', 'True', 'True', 'False', 'False', 'True', 250, '', '', ''],
+    ['', '555-0104', '', '', '', '', '', '', 10, 'BRONZE', 0, '', 'False', 'False', 'False', 'False',
+     'False', 'False', 'False', 'False', '', '', '', ''],
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Lead.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def importer():
+    with patch("app.services.dealer_scraper_importer.LeadService"), \
+            patch("app.services.dealer_scraper_importer.QualificationAgent"), \
+            patch("app.services.dealer_scraper_importer.EnrichmentAgent"):
+        from app.services.dealer_scraper_importer import DealerScraperImporter
+        yield DealerScraperImporter()
+
+
+def run_import(importer, db, path, **kwargs):
+    options = {'qualification_enabled': False, 'enrichment_enabled': False, 'chunk_size': 2}
+    options.update(kwargs)
+    return asyncio.run(importer.import_contractors_csv(path, db=db, **options))
+
+
+def test_import_writes_mapped_leads_in_chunks(importer, db, tmp_path):
+    summary = run_import(importer, db, write_csv(tmp_path / "dealers.csv", CONTRACTORS))
+
+    assert summary['total_records'] == 4
+    assert summary['inserted'] == 3
+    assert summary['errors'] == 1  # Row without a company name
+
+    lead = db.query(Lead).filter(Lead.company_name == 'Sunrise Energy').one()
+    assert lead.contact_phone == '(617) 555-0101'
+    assert lead.company_website == 'https://sunrise.example.com'
+    assert lead.company_size == 'Medium (11-50)'
+    assert lead.industry == 'Multi-Trade Contractor'
+    assert lead.oems_certified == ['Tesla Powerwall', 'Enphase', 'Generac']
+    assert lead.oem_tiers == {'Generac': 'Elite Plus'}
+    assert lead.additional_data['zip_code'] == '02134'
+    assert lead.additional_data['lead_source'] == 'dealer_scraper'
+    assert lead.additional_data['priority_score'] == 100
+
+    expected = importer.parse_oem_data(pd.Series({
+        'OEMs_Certified': 'Tesla Powerwall, Enphase, Generac',
+        'is_commercial': True,
+        'has_ops_maintenance': True,
+    }))
+    assert lead.mep_e_score == expected['mep_e_score']
+    assert lead.solar_oem_count == expected['solar_oem_count']
+    assert lead.has_commercial is True
+    assert lead.qualification_score == max(72, expected['mep_e_score'])
+
+
+def test_vectorized_mapping_matches_per_row_mapping(importer, tmp_path):
+    path = write_csv(tmp_path / "dealers.csv", CONTRACTORS[:3])
+    frame = next(importer._read_csv_chunks(path, 10))
+
+    bulk = importer._map_contractors_to_leads(frame)
+    for lead, (_, row) in zip(bulk, pd.read_csv(path, dtype={'zip': str}).iterrows()):
+        per_row = importer._map_contractor_to_lead(row)
+        assert lead['industry'] == per_row['industry']
+        assert lead['mep_e_score'] == per_row['mep_e_score']
+        assert lead['additional_data']['icp_tier'] == per_row['icp_tier']
+        assert lead['additional_data']['priority_score'] == per_row['priority_score']
+
+
+def test_reimport_updates_existing_leads(importer, db, tmp_path):
+    path = write_csv(tmp_path / "dealers.csv", CONTRACTORS)
+    run_import(importer, db, path)
+
+    lead = db.query(Lead).filter(Lead.company_name == 'Cool Air HVAC').one()
+    lead.qualification_score = 91
+    lead.additional_data = {**lead.additional_data, 'enrichment': {'owner': 'Pat'}}
+    db.commit()
+
+    changed = [row[:] for row in CONTRACTORS]
+    changed[1][11] = 'Carrier, Trane'
+    changed[1][1] = '555 0102'  # Same phone digits
+    summary = run_import(importer, db, write_csv(tmp_path / "dealers2.csv", changed))
+
+    assert summary['inserted'] == 0
+    assert summary['updated'] == 3
+    assert db.query(Lead).count() == 3
+    db.expire_all()
+    lead = db.query(Lead).filter(Lead.company_name == 'Cool Air HVAC').one()
+    assert lead.hvac_oem_count == 2
+    assert lead.qualification_score == 91
+    assert lead.additional_data['enrichment'] == {'owner': 'Pat'}
+
+
+def test_reimport_matches_names_ignoring_case_and_whitespace(importer, db, tmp_path):
+    run_import(importer, db, write_csv(tmp_path / "dealers.csv", CONTRACTORS))
+
+    renamed = [row[:] for row in CONTRACTORS]
+    renamed[0][0] = 'SUNRISE ENERGY'
+    renamed[1][0] = '  cool air hvac '
+    summary = run_import(importer, db, write_csv(tmp_path / "dealers2.csv", renamed))
+
+    assert summary['inserted'] == 0
+    assert summary['updated'] == 3
+    assert db.query(Lead).count() == 3
+
+
+def test_qualification_and_enrichment_run_with_bounded_concurrency(importer, db, tmp_path):
+    in_flight = {'now': 0, 'max': 0}
+
+    async def qualify(**kwargs):
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(0.01)
+        in_flight['now'] -= 1
+        result = SimpleNamespace(qualification_score=88.0, qualification_reasoning='Strong fit', tier='hot')
+        return result, 120, {}
+
+    async def enrich_from_company(company_name, website):
+        return SimpleNamespace(enriched_data={'employees_found': 3})
+
+    importer.qualification_agent.qualify = qualify
+    importer.qualification_agent.model = 'test-model'
+    importer.enrichment_agent.enrich_from_company = enrich_from_company
+
+    rows = [
+        [f'Dealer {i}', f'555-01{i:02d}', f'dealer{i}.example.com'] + CONTRACTORS[2][3:]
+        for i in range(12)
+    ]
+    summary = run_import(
+        importer, db, write_csv(tmp_path / "dealers.csv", rows),
+        qualification_enabled=True, enrichment_enabled=True, batch_size=5, max_concurrency=3
+    )
+
+    assert summary['qualified'] == 12
+    assert summary['enriched'] == 12
+    assert in_flight['max'] <= 3
+    leads = db.query(Lead).all()
+    assert all(lead.qualification_score == 88.0 and lead.qualification_model == 'test-model' for lead in leads)
+    assert all(lead.additional_data['enrichment'] == {'employees_found': 3} for lead in leads)
+    assert all(lead.additional_data['lead_source'] == 'dealer_scraper' for lead in leads)
@@ -0,0 +1,136 @@
+"""
+Tests for LongTermMemory's Redis indexes
+
+Covers token-index pattern lookup, retention-ranked eviction and pipelined
+context loads against an in-memory Redis (fakeredis).
+"""
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.deepagents.memory import LongTermMemory
+
+
+@pytest.fixture
+def memory():
+    memory = LongTermMemory("agent_test", max_entries=3, max_patterns=5, redis_url="redis://unused")
+    memory.redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_relevant_patterns_use_token_index(memory):
+    """Test lookup scores by shared query words and filters by pattern type"""
+    await memory.learn_patterns([
+        ({"industry": "solar", "action": "follow up email", "confidence": 0.9}, "interaction"),
+        ({"industry": "solar roofing", "action": "send quote"}, "interaction"),
+        ({"industry": "hvac", "action": "call owner"}, "objection"),
+    ])
+
+    results = await memory.get_relevant_patterns("solar email follow up")
+
+    assert len(results) == 1
+    assert results[0]["pattern_data"]["action"] == "follow up email"
+    assert results[0]["relevance_score"] == 1.0
+    assert results[0]["confidence"] == 0.9
+
+    assert await memory.get_relevant_patterns("hvac owner", pattern_type="interaction") == []
+    assert len(await memory.get_relevant_patterns("hvac owner", pattern_type="objection")) == 1
+
+
+@pytest.mark.asyncio
+async def test_pattern_eviction_removes_postings(memory):
+    """Test the lowest-ranked patterns are evicted along with their token postings"""
+    await memory.learn_pattern({"topic": "solar", "confidence": 0.1}, "interaction")
+    await memory.learn_patterns([({"topic": f"word{i}", "confidence": 0.9}, "interaction") for i in range(5)])
+
+    redis_client = memory.redis_client
+    assert await redis_client.zcard(memory.pattern_index_key) == 5
+    assert await redis_client.zcard(f"{memory.pattern_tokens_key}:solar") == 0
+    assert await memory.get_relevant_patterns("solar") == []
+
+
+@pytest.mark.asyncio
+async def test_expired_patterns_are_unindexed(memory):
+    """Test candidates whose hash expired are dropped from the index on read"""
+    await memory.learn_pattern({"topic": "solar"}, "interaction")
+    redis_client = memory.redis_client
+    (pattern_key,) = await redis_client.zrange(memory.pattern_index_key, 0, -1)
+    await redis_client.delete(f"{memory.patterns_key}:{pattern_key}")
+
+    assert await memory.get_relevant_patterns("solar") == []
+    assert await redis_client.zcard(memory.pattern_index_key) == 0
+    assert await redis_client.zcard(f"{memory.pattern_tokens_key}:solar") == 0
+
+
+@pytest.mark.asyncio
+async def test_cleanup_keeps_most_important_entries(memory):
+    """Test entry eviction uses the retention index instead of scanning keys"""
+    await memory.save_context("important", {"insights": [], "recommendations": []})
+    for i in range(4):
+        await memory.save_context(f"session_{i}", {"n": i})
+
+    redis_client = memory.redis_client
+    assert await redis_client.zcard(memory.memory_index_key) == 3
+    assert len(await memory.load_context("important")) == 1
+
+    summary = await memory.get_summary("important")
+    assert summary["context_entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_load_context_tracks_access_and_drops_stale_members(memory):
+    """Test a pipelined load bumps access counts and prunes expired entries"""
+    await memory.save_context("session", {"step": 1})
+    redis_client = memory.redis_client
+    (entry_key,) = await redis_client.smembers(f"{memory.context_key}:session")
+    await redis_client.sadd(f"{memory.context_key}:session", "session:0")
+
+    context = await memory.load_context("session")
+
+    assert context == {entry_key: {"step": 1}}
+    assert await redis_client.hget(f"{memory.memory_key}:{entry_key}", "access_count") == "1"
+    assert await redis_client.smembers(f"{memory.context_key}:session") == {entry_key}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_memory_index_backfills_legacy_entries(memory):
+    """Test entries written without the retention index get indexed via SCAN"""
+    await memory.save_context("legacy", {"step": 1})
+    await memory.redis_client.delete(memory.memory_index_key)
+
+    assert await memory.rebuild_memory_index() == 1
+    assert await memory.redis_client.zcard(memory.memory_index_key) == 1
+
+
+@pytest.mark.asyncio
+async def test_pattern_keys_and_type_are_not_search_terms(memory):
+    """Test only pattern_data values are indexed, as the relevance score ranks them"""
+    await memory.learn_pattern({"industry": "solar", "confidence": 0.9}, "interaction")
+
+    assert await memory.get_relevant_patterns("confidence") == []
+    assert await memory.get_relevant_patterns("interaction industry") == []
+    assert len(await memory.get_relevant_patterns("solar")) == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_memory_index_backfills_legacy_patterns(memory):
+    """Test patterns stored before the token index get postings on rebuild"""
+    full_key = f"{memory.patterns_key}:interaction:1700000000"
+    await memory.redis_client.hset(full_key, mapping={
+        "pattern_data": '{"industry": "solar", "action": "send quote", "confidence": 0.8}',
+        "pattern_type": "interaction",
+        "timestamp": "2023-11-14T22:13:20",
+        "agent_id": "agent_test",
+        "confidence": 0.8,
+    })
+    assert await memory.get_relevant_patterns("solar quote") == []
+
+    assert await memory.rebuild_memory_index() == 1
+    assert await memory.rebuild_memory_index() == 0
+
+    (pattern,) = await memory.get_relevant_patterns("solar quote")
+    assert pattern["pattern_key"] == "interaction:1700000000"
+    assert pattern["pattern_data"]["action"] == "send quote"
+    assert pattern["relevance_score"] == 1.0
@@ -0,0 +1,208 @@
+"""Tests for knowledge base chunking, batched embeddings and semantic search."""
+
+import hashlib
+import re
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models.customer_models import Customer, KnowledgeChunk, KnowledgeDocument
+from app.services.vector_index import InMemoryVectorIndex
+
+
+class HashingEmbeddingModel:
+    """Bag-of-words hashing embedder standing in for SentenceTransformer"""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, show_progress_bar=False):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 384), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 384] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    tables = [Customer.__table__, KnowledgeDocument.__table__, KnowledgeChunk.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Customer(id=1, company_name="Acme", email="a@example.com", api_key="key-1"),
+        Customer(id=2, company_name="Globex", email="g@example.com", api_key="key-2"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def service():
+    with patch("app.services.knowledge_base.RunPodStorageService") as mock_storage, \
+            patch("app.services.knowledge_base.SentenceTransformer", HashingEmbeddingModel):
+        mock_storage.return_value.upload_fileobj.return_value = "https://storage/doc"
+        from app.services.knowledge_base import KnowledgeBaseService
+        yield KnowledgeBaseService()
+
+
+def upload(service, db, customer_id, text, filename="doc.txt"):
+    return service.upload_document(text.encode(), filename, str(customer_id), "text/plain", db)
+
+
+class TestInMemoryVectorIndex:
+
+    def test_search_returns_top_k_by_cosine(self):
+        index = InMemoryVectorIndex(dimension=3)
+        index.add(1, [10, 11, 12], [[1, 0, 0], [0, 1, 0], [1, 1, 0]])
+
+        hits = index.search(1, [1, 0.1, 0], k=2)
+
+        assert [chunk_id for chunk_id, _ in hits] == [10, 12]
+        assert hits[0][1] == pytest.approx(1 / np.sqrt(1.01), rel=1e-5)
+
+    def test_partitions_are_isolated_and_removable(self):
+        index = InMemoryVectorIndex(dimension=2)
+        index.add(1, [1], [[1, 0]])
+        index.add(2, [2], [[1, 0]])
+        index.add(1, [3], [[0, 1]])
+        index.remove(1, [1])
+
+        assert [chunk_id for chunk_id, _ in index.search(1, [1, 0], k=5)] == [3]
+        assert index.size(2) == 1
+        assert 3 not in index
+
+
+class TestChunking:
+
+    def test_chunks_overlap_and_cover_text(self, service):
+        words = [f"word{i}" for i in range(600)]
+        chunks = service._chunk_text(" ".join(words))
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert chunks[0].split()[0] == "word0"
+        assert chunks[-1].split()[-1] == "word599"
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous.split()
+
+    def test_empty_text_has_no_chunks(self, service):
+        assert service._chunk_text("  \n ") == []
+
+
+class TestKnowledgeSearch:
+
+    def test_upload_embeds_all_chunks_in_one_batch(self, service, db):
+        text = " ".join(f"heat pump installer training module {i}" for i in range(200))
+
+        result = upload(service, db, 1, text)
+
+        assert result["chunk_count"] > 1
+        assert len(service.embedding_model.calls) == 1
+        assert len(service.embedding_model.calls[0]) == result["chunk_count"]
+        assert db.query(KnowledgeChunk).count() == result["chunk_count"]
+
+    def test_search_ranks_by_similarity_within_customer(self, service, db):
+        upload(service, db, 1, "Commercial solar panel installers in Texas", "solar.txt")
+        upload(service, db, 1, "Restaurant point of sale software", "pos.txt")
+        upload(service, db, 2, "Solar panel installers in Texas", "other.txt")
+
+        results = service.search_similar_documents("solar panel installers", "1", limit=5, similarity_threshold=0.1, db=db)
+
+        assert [r["filename"] for r in results] == ["solar.txt"]
+        assert 0.5 < results[0]["similarity_score"] <= 1.0
+        assert "solar" in results[0]["matched_text"].lower()
+
+    def test_threshold_filters_weak_matches(self, service, db):
+        upload(service, db, 1, "Restaurant point of sale software")
+
+        assert service.search_similar_documents("solar installers", "1", similarity_threshold=0.5, db=db) == []
+
+    def test_query_embeddings_are_cached(self, service, db):
+        upload(service, db, 1, "Battery storage dealers")
+        calls_before = len(service.embedding_model.calls)
+
+        for query in ["battery storage", "Battery  Storage", "battery storage"]:
+            service.search_similar_documents(query, "1", similarity_threshold=0.1, db=db)
+
+        assert len(service.embedding_model.calls) == calls_before + 1
+
+    def test_new_and_deleted_documents_update_loaded_index(self, service, db):
+        upload(service, db, 1, "Generator maintenance contracts", "gen.txt")
+        assert service.search_similar_documents("generator", "1", similarity_threshold=0.1, db=db)
+
+        doc = upload(service, db, 1, "Generator installation for hospitals", "hospital.txt")
+        results = service.search_similar_documents("generator", "1", similarity_threshold=0.1, db=db)
+        assert {r["filename"] for r in results} == {"gen.txt", "hospital.txt"}
+
+        service.delete_document(doc["document_id"], "1", db)
+        results = service.search_similar_documents("generator", "1", similarity_threshold=0.1, db=db)
+        assert [r["filename"] for r in results] == ["gen.txt"]
+
+    def test_reindex_documents_backfills_missing_chunks(self, service, db):
+        db.add(KnowledgeDocument(
+            document_id="legacy", customer_id=1, filename="legacy.txt",
+            text_content="Microgrid controls for campuses", processing_status="completed"
+        ))
+        db.commit()
+
+        assert service.reindex_documents(db) == 1
+        results = service.search_similar_documents("microgrid", "1", similarity_threshold=0.1, db=db)
+        assert [r["filename"] for r in results] == ["legacy.txt"]
+
+
+class RecordingPostgresSession:
+    """Session stand-in recording statements as PostgreSQL SQL"""
+
+    def __init__(self, extversion, rows=()):
+        self.extversion = extversion
+        self.rows = list(rows)
+        self.statements = []
+
+    def execute(self, statement):
+        from sqlalchemy.dialects import postgresql
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        session = self
+
+        class Result:
+            def scalar(self):
+                return session.extversion
+
+            def __iter__(self):
+                return iter(session.rows)
+
+        return Result()
+
+
+class TestPgvectorSearch:
+
+    def test_iterative_scan_keeps_filtered_results_when_supported(self, service):
+        from collections import namedtuple
+        Row = namedtuple("Row", "document_id chunk_text distance")
+        db = RecordingPostgresSession("0.8.0", [Row(1, "b", 0.3), Row(2, "a", 0.1)])
+
+        matches = service._search_pgvector(db, 7, np.ones(384), k=20)
+
+        assert [m[0] for m in matches] == [2, 1]  # Re-sorted after relaxed_order
+        assert "hnsw.ef_search = 40" in db.statements[1]
+        assert "hnsw.iterative_scan = relaxed_order" in db.statements[2]
+        assert "knowledge_chunks.customer_id = " in db.statements[3]
+        service._search_pgvector(db, 7, np.ones(384), k=20)
+        assert len(db.statements) == 7  # Extension version is checked once
+
+    def test_older_pgvector_ranks_the_customers_chunks_exactly(self, service):
+        db = RecordingPostgresSession("0.7.4")
+
+        service._search_pgvector(db, 7, np.ones(384), k=20)
+
+        assert not any("hnsw" in statement for statement in db.statements)
+        assert "AS MATERIALIZED" in db.statements[-1]
+        assert "ORDER BY tenant_chunks.distance" in db.statements[-1]
@@ -0,0 +1,106 @@
+"""Tests for the streaming export pipeline."""
+
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.database import Base
+from app.models.lead import Lead
+from app.services.analytics.query_builder import QueryBuilder, QueryValidationError
+from app.services.exports.streaming import iter_csv, iter_export, write_export
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+QUERY = {
+    "table": "leads",
+    "columns": ["id", "company_name", "qualification_score", "created_at"],
+    "order_by": [{"column": "id", "direction": "asc"}],
+}
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def leads(db_session):
+    db_session.add_all([
+        Lead(
+            company_name=f"Dealer {i}",
+            contact_email=f"d{i}@example.com",
+            qualification_score=float(i % 100),
+            created_at=datetime(2026, 1, 1) + timedelta(hours=i),
+        )
+        for i in range(250)
+    ])
+    db_session.commit()
+
+
+def test_build_and_stream_yields_batches(db_session, leads):
+    builder = QueryBuilder(db_session)
+    stream = builder.build_and_stream(QUERY, batch_size=100)
+
+    batches = list(stream.batches)
+    assert stream.columns == QUERY["columns"]
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    assert batches[2][-1]["company_name"] == "Dealer 249"
+    assert builder.count_rows(QUERY) == 250
+    assert builder.count_rows({**QUERY, "limit": 10}) == 10
+
+    with pytest.raises(QueryValidationError):
+        builder.build_and_stream({"table": "users", "columns": ["id"]})
+
+
+def test_csv_is_written_chunk_per_batch(db_session, leads):
+    stream = QueryBuilder(db_session).build_and_stream(QUERY, batch_size=100)
+    chunks = list(iter_csv(stream.columns, stream.batches))
+
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert len(rows) == 250
+    assert rows[0]["company_name"] == "Dealer 0"
+
+
+def test_xlsx_write_only_export(db_session, leads):
+    stream = QueryBuilder(db_session).build_and_stream(QUERY, batch_size=100)
+    out = io.BytesIO()
+    assert write_export("xlsx", stream.columns, stream.batches, out, "Leads Report") == 250
+
+    workbook = load_workbook(io.BytesIO(out.getvalue()))
+    assert workbook.sheetnames == ["Summary", "Data"]
+    data = workbook["Data"]
+    assert data.max_row == 252  # Header + rows + summary row
+    assert data["B2"].value == "Dealer 0"
+    assert data["C252"].value == "=SUM(C2:C251)"
+    assert data.freeze_panes == "A2"
+    assert workbook["Summary"]["B5"].value == "250"
+
+
+def test_pdf_and_spooled_chunks(db_session, leads):
+    stream = QueryBuilder(db_session).build_and_stream(QUERY, batch_size=100)
+    out = io.BytesIO()
+    assert write_export("pdf", stream.columns, stream.batches, out, "Leads Report") == 250
+    assert out.getvalue().startswith(b"%PDF")
+
+    stream = QueryBuilder(db_session).build_and_stream(QUERY)
+    chunks = list(iter_export("pdf", stream.columns, stream.batches, "Leads Report", chunk_size=4096))
+    assert len(chunks) > 1
+    assert b"".join(chunks).rstrip().endswith(b"%%EOF")
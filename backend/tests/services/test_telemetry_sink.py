@@ -0,0 +1,157 @@
+"""Tests for the buffered telemetry sink."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models.unified_api_call import APICallLog, OperationType, ProviderType
+from app.services.telemetry_sink import TelemetrySink, record_telemetry
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'telemetry.db'}")
+    Base.metadata.create_all(engine, tables=[APICallLog.__table__])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def api_call(i=0):
+    return {
+        "provider": ProviderType.CEREBRAS,
+        "model": "llama3.1-8b",
+        "endpoint": "/chat/completions",
+        "prompt_tokens": i,
+        "completion_tokens": 10,
+        "total_tokens": i + 10,
+        "cost_usd": 0.000006,
+        "latency_ms": 900,
+        "operation_type": OperationType.QUALIFICATION,
+    }
+
+
+def stored(session_factory):
+    with session_factory() as db:
+        return db.query(APICallLog).order_by(APICallLog.id).all()
+
+
+def test_flushes_full_batches_and_the_rest_on_stop(session_factory):
+    sink = TelemetrySink(session_factory, batch_size=3, flush_interval=60)
+
+    async def scenario():
+        await sink.start()
+        for i in range(7):
+            assert sink.record(APICallLog, api_call(i))
+        for _ in range(100):
+            if sink.stats.written == 6:
+                break
+            await asyncio.sleep(0.01)
+        assert sink.stats.written == 6  # 7th row waits for the interval
+        await sink.stop()
+
+    asyncio.run(scenario())
+
+    rows = stored(session_factory)
+    assert [r.prompt_tokens for r in rows] == list(range(7))
+    assert sink.stats.as_dict() == {"queued": 7, "written": 7, "dropped": 0, "flushes": 3, "failed_flushes": 0}
+
+
+def test_flushes_after_interval_with_record_time_timestamp(session_factory):
+    sink = TelemetrySink(session_factory, batch_size=100, flush_interval=0.05)
+
+    async def scenario():
+        await sink.start()
+        sink.record(APICallLog, {**api_call(), "cache_hit": True})
+        await asyncio.sleep(0.3)
+        written = sink.stats.written
+        await sink.stop()
+        return written
+
+    assert asyncio.run(scenario()) == 1
+    row = stored(session_factory)[0]
+    assert row.cache_hit is True
+    assert row.success is True  # Python-side column default
+    assert row.created_at is not None
+
+
+@pytest.mark.parametrize("overflow, kept", [("drop_oldest", [3, 4]), ("drop_newest", [0, 1])])
+def test_full_queue_drops_by_policy(session_factory, overflow, kept):
+    sink = TelemetrySink(session_factory, max_queue_size=2, overflow=overflow)
+
+    async def scenario():
+        await sink.start()
+        # No await in between: the flusher cannot drain the queue
+        for i in range(5):
+            sink.record(APICallLog, api_call(i))
+        await sink.stop()
+
+    asyncio.run(scenario())
+
+    assert [r.prompt_tokens for r in stored(session_factory)] == kept
+    assert sink.stats.dropped == 3
+
+
+def test_failed_batches_are_retried_then_dropped(session_factory):
+    attempts = []
+
+    def failing_factory():
+        attempts.append(1)
+        raise RuntimeError("database unavailable")
+
+    sink = TelemetrySink(failing_factory, flush_interval=0.01)
+
+    async def scenario():
+        await sink.start()
+        sink.record(APICallLog, api_call())
+        sink.record(APICallLog, api_call())
+        await sink.stop()
+
+    asyncio.run(scenario())
+
+    assert len(attempts) == 2
+    assert sink.stats.dropped == 2
+    assert sink.stats.failed_flushes == 1
+
+
+def test_background_sink_accepts_rows_from_other_threads(session_factory):
+    sink = TelemetrySink(session_factory, flush_interval=60)
+    sink.start_background()
+    try:
+        assert sink.running
+        for i in range(4):
+            assert sink.record(APICallLog, api_call(i))
+    finally:
+        sink.stop_background()
+
+    assert not sink.running
+    assert [r.prompt_tokens for r in stored(session_factory)] == [0, 1, 2, 3]
+
+
+def test_stopped_sink_falls_back_to_caller_session(session_factory, monkeypatch):
+    sink = TelemetrySink(session_factory)
+    monkeypatch.setattr("app.services.telemetry_sink._telemetry_sink", sink)
+    assert not sink.record(APICallLog, api_call())
+
+    with session_factory() as db:
+        record_telemetry(db, APICallLog, api_call(5))
+        db.commit()
+
+    assert [r.prompt_tokens for r in stored(session_factory)] == [5]
+    assert sink.stats.queued == 0
+
+
+def test_rejects_unknown_attributes(session_factory):
+    sink = TelemetrySink(session_factory)
+
+    async def scenario():
+        await sink.start()
+        try:
+            with pytest.raises(KeyError):
+                sink.record(APICallLog, {**api_call(), "metadata": {}})
+        finally:
+            await sink.stop()
+
+    asyncio.run(scenario())
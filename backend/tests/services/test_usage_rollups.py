@@ -0,0 +1,149 @@
+"""Tests for incrementally maintained usage rollups."""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.database import Base
+from app.models.ai_cost_tracking import AICostTracking
+from app.models.lead import Lead
+from app.models.unified_api_call import APICallLog, OperationType, ProviderType
+from app.models.usage_rollups import AICostRollup, RollupWatermark
+from app.services.usage_rollups import (
+    ai_cost_lead_usage,
+    ai_cost_usage,
+    api_call_usage,
+    refresh_usage_rollups,
+)
+
+BASE_TIME = datetime(2026, 3, 1, 0, 0)
+AGENTS = ["qualification", "enrichment", "growth"]
+MODELS = [("cerebras", "llama3.1-8b"), ("anthropic", "claude-3-5-sonnet"), ("deepseek", "deepseek-chat")]
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def add_cost_rows(db, count, start, seed):
+    """Rows in timestamp order (ids increase with time, as in production)."""
+    rng = random.Random(seed)
+    lead_ids = [lead.id for lead in db.query(Lead).all()]
+    rows = []
+    for i in range(count):
+        provider, model = rng.choice(MODELS)
+        rows.append(AICostTracking(
+            timestamp=start + timedelta(minutes=7 * i + rng.randint(0, 6)),
+            agent_type=rng.choice(AGENTS),
+            agent_mode=rng.choice(["passthrough", "smart_router", None]),
+            lead_id=rng.choice(lead_ids + [None]),
+            prompt_tokens=100,
+            completion_tokens=50,
+            provider=provider,
+            model=model,
+            cost_usd=Decimal(str(round(rng.random() / 1000, 8))),
+            latency_ms=rng.choice([None, rng.randint(20, 4000)]),
+            cache_hit=rng.random() < 0.2,
+        ))
+    db.add_all(rows)
+    db.commit()
+
+
+def raw_totals(db, start, end, **filters):
+    query = db.query(AICostTracking).filter(AICostTracking.timestamp >= start, AICostTracking.timestamp < end)
+    for name, value in filters.items():
+        query = query.filter(getattr(AICostTracking, name) == value)
+    rows = query.all()
+    return len(rows), sum(float(r.cost_usd) for r in rows), sum(1 for r in rows if r.cache_hit)
+
+
+@pytest.fixture
+def leads(db_session):
+    db_session.add_all([Lead(company_name=f"Dealer {i}", contact_email=f"d{i}@example.com") for i in range(5)])
+    db_session.commit()
+
+
+def test_rollups_match_raw_rows_across_refreshes(db_session, leads):
+    add_cost_rows(db_session, 600, BASE_TIME, seed=1)
+    # Partial refresh: some rows rolled up, the rest still raw
+    refresh_usage_rollups(db_session, batch_size=250, settle_seconds=0, max_batches=1)
+    assert db_session.get(RollupWatermark, "ai_cost_tracking").last_id == 250
+
+    ranges = [
+        (BASE_TIME + timedelta(hours=3, minutes=17), BASE_TIME + timedelta(days=2, hours=5, minutes=41)),
+        (BASE_TIME, BASE_TIME + timedelta(days=1)),
+        (BASE_TIME + timedelta(minutes=5), BASE_TIME + timedelta(minutes=50)),
+    ]
+    for _ in range(2):
+        for start, end in ranges:
+            usage = ai_cost_usage(db_session, start=start, end=end)
+            requests, cost, hits = raw_totals(db_session, start, end)
+            stats = usage.get(())
+            assert (stats.requests if stats else 0) == requests
+            assert (stats.cost_usd if stats else 0) == pytest.approx(cost)
+            assert (stats.cache_hits if stats else 0) == hits
+
+            by_agent = ai_cost_usage(db_session, ("agent_type",), start=start, end=end, agent_type="growth")
+            assert sum(s.requests for s in by_agent.values()) == raw_totals(db_session, start, end, agent_type="growth")[0]
+
+        refresh_usage_rollups(db_session, batch_size=250, settle_seconds=0)
+
+    assert db_session.query(AICostRollup).filter(AICostRollup.granularity == "day").count() > 0
+
+
+def test_daily_series_and_lead_usage_match_raw(db_session, leads):
+    add_cost_rows(db_session, 500, BASE_TIME, seed=2)
+    refresh_usage_rollups(db_session, settle_seconds=0)
+    add_cost_rows(db_session, 50, BASE_TIME + timedelta(days=3), seed=3)  # Not rolled up yet
+
+    start, end = BASE_TIME + timedelta(hours=10, minutes=30), BASE_TIME + timedelta(days=4)
+    daily = ai_cost_usage(db_session, ("day",), start=start, end=end)
+    for (day,), stats in daily.items():
+        day = day.replace(tzinfo=None)
+        assert stats.requests == raw_totals(db_session, max(start, day), min(end, day + timedelta(days=1)))[0]
+
+    lead_id = db_session.query(Lead.id).first()[0]
+    by_lead = ai_cost_lead_usage(db_session, start=start, end=end, lead_id=lead_id)
+    assert sum(s.requests for s in by_lead.values()) == raw_totals(db_session, start, end, lead_id=lead_id)[0]
+
+
+def test_api_call_latency_percentiles_from_rollups(db_session):
+    rng = random.Random(4)
+    latencies = [rng.randint(50, 3000) for _ in range(400)]
+    db_session.add_all([
+        APICallLog(
+            provider=ProviderType.CEREBRAS, model="llama3.1-8b", endpoint="/chat/completions",
+            latency_ms=latency, cost_usd=0.000006, operation_type=OperationType.QUALIFICATION,
+            created_at=BASE_TIME + timedelta(minutes=i),
+        )
+        for i, latency in enumerate(latencies)
+    ])
+    db_session.commit()
+    refresh_usage_rollups(db_session, settle_seconds=0)
+
+    stats = api_call_usage(
+        db_session, start=BASE_TIME, end=BASE_TIME + timedelta(days=1),
+        with_latency=True, provider=ProviderType.CEREBRAS,
+    )[()]
+    exact_p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+    assert stats.requests == 400
+    assert abs(stats.sketch.quantile(0.95) - exact_p95) <= exact_p95 * 0.01
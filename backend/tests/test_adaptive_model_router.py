@@ -0,0 +1,94 @@
+"""Tests for adaptive (latency-ranked, hedged) routing in ModelRouter."""
+
+import asyncio
+
+import pytest
+
+from app.services.latency_tracker import LatencyStats, LatencyTracker
+from app.services.model_router import ModelConfig, ModelResponse, ModelRouter, TaskType
+
+
+PRIMARY = ModelConfig(provider="anthropic", model="primary", max_latency_ms=5000, max_cost_usd=0.01)
+BACKUP = ModelConfig(provider="cerebras", model="backup", max_latency_ms=2000, max_cost_usd=0.001, fallback=True)
+
+
+def make_router(latencies, calls, cancelled):
+    """Router whose model calls sleep for latencies[model] seconds."""
+    router = ModelRouter(adaptive=True, latency_tracker=LatencyTracker(min_samples=5, min_hedge_delay_ms=10))
+    router.routing_rules[TaskType.CONTENT_GENERATION] = [PRIMARY, BACKUP]
+
+    async def fake_call(config, prompt, system_prompt, temperature, max_tokens):
+        calls.append(config.model)
+        try:
+            await asyncio.sleep(latencies[config.model])
+        except asyncio.CancelledError:
+            cancelled.append(config.model)
+            raise
+        return ModelResponse(
+            content=f"from {config.model}",
+            model_used=config.model,
+            provider=config.provider,
+            latency_ms=0,
+            cost_usd=config.max_cost_usd,
+        )
+
+    router._execute_model_call = fake_call
+    return router
+
+
+def warm(router, config, latency_ms, n=10):
+    for _ in range(n):
+        router.latency_tracker.record_success(config.provider, config.model, latency_ms, config.max_cost_usd)
+
+
+def test_latency_stats_ewma_and_p95():
+    stats = LatencyStats(alpha=0.5, window=100)
+    for latency in range(1, 101):
+        stats.record(float(latency))
+
+    assert stats.p95_ms == 95.0
+    assert 98 < stats.ewma_latency_ms < 100
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled():
+    calls, cancelled = [], []
+    router = make_router({"primary": 5.0, "backup": 0.01}, calls, cancelled)
+    warm(router, PRIMARY, 20)
+
+    response = await asyncio.wait_for(
+        router.route_request(TaskType.CONTENT_GENERATION, "hello"), timeout=2
+    )
+
+    assert response.model_used == "backup"
+    assert response.hedged is True
+    assert response.fallback_used is True
+    assert calls == ["primary", "backup"]
+    assert cancelled == ["primary"]
+    assert router.hedge_stats["hedges_fired"] == 1
+    assert router.hedge_stats["hedges_won"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    calls, cancelled = [], []
+    router = make_router({"primary": 0.01, "backup": 0.01}, calls, cancelled)
+    warm(router, PRIMARY, 200)
+
+    response = await router.route_request(TaskType.CONTENT_GENERATION, "hello")
+
+    assert response.model_used == "primary"
+    assert response.hedged is False
+    assert calls == ["primary"]
+    assert router.hedge_stats["hedges_fired"] == 0
+
+
+def test_primary_over_its_latency_budget_is_demoted():
+    router = ModelRouter(adaptive=True, latency_tracker=LatencyTracker(min_samples=5))
+    assert router._rank_models([PRIMARY, BACKUP], 10000, 1.0) == [PRIMARY, BACKUP]
+
+    # Slow but not failing: p95 above the configured 5000ms
+    warm(router, PRIMARY, 8000)
+    warm(router, BACKUP, 300)
+
+    assert router._rank_models([PRIMARY, BACKUP], 10000, 1.0) == [BACKUP, PRIMARY]
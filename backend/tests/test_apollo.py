@@ -157,7 +157,9 @@ class TestApolloService:
         service = ApolloService(api_key=mock_apollo_api_key)
         assert service.api_key == mock_apollo_api_key
         assert service.client is not None
-        assert service.client.headers["x-api-key"] == mock_apollo_api_key
+        # API key is sent per request; the pooled client is shared
+        assert service.headers["x-api-key"] == mock_apollo_api_key
+        assert "x-api-key" not in service.client.headers
     
     def test_init_without_api_key(self, monkeypatch):
         """Test service initialization fails without API key."""
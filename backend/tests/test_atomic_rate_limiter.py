@@ -0,0 +1,151 @@
+"""
+Tests for AtomicRateLimiter.
+
+Runs the Lua check-and-record script on fakeredis (with Lua support) and
+proves concurrent workers sharing one Redis never overshoot a quota.
+"""
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from app.services.rate_limiter import AtomicRateLimiter, PROVIDER_LIMITS
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def make_limiter(server, **kwargs) -> AtomicRateLimiter:
+    """One limiter per simulated worker process, all sharing the same Redis."""
+    return AtomicRateLimiter(
+        redis_client=fakeredis.FakeAsyncRedis(server=server),
+        fail_open=False,
+        timeout_ms=1000,
+        **kwargs,
+    )
+
+
+class TestAtomicCheck:
+    """Check and record happen in one script call."""
+
+    @pytest.mark.asyncio
+    async def test_check_records_request(self, redis_server):
+        """Test an allowed check is counted without a record_request call."""
+        limiter = make_limiter(redis_server)
+
+        result = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=500)
+
+        assert result.allowed is True
+        assert result.requests_remaining == PROVIDER_LIMITS["cerebras"]["requests_per_minute"] - 1
+        status = await limiter.get_status("user123", "cerebras")
+        assert status["requests"]["used"] == 1
+        assert status["tokens"]["used"] == 500
+
+    @pytest.mark.asyncio
+    async def test_token_window_denies_and_reports_retry(self, redis_server):
+        """Test the token window is enforced alongside the request window."""
+        limiter = make_limiter(redis_server)
+        token_limit = PROVIDER_LIMITS["cerebras"]["tokens_per_minute"]
+
+        first = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=token_limit - 1000)
+        second = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=2000)
+
+        assert first.allowed is True
+        assert second.allowed is False
+        assert second.tokens_remaining == 1000
+        assert 0 < second.retry_after <= 60
+        assert "Retry-After" in second.headers
+
+    @pytest.mark.asyncio
+    async def test_settle_refunds_unused_tokens(self, redis_server):
+        """Test settling with actual usage frees the over-estimated tokens."""
+        limiter = make_limiter(redis_server)
+        token_limit = PROVIDER_LIMITS["cerebras"]["tokens_per_minute"]
+
+        result = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=token_limit)
+        blocked = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=1000)
+        await limiter.settle(result, tokens_used=10_000)
+        retried = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=1000)
+
+        assert blocked.allowed is False
+        assert retried.allowed is True
+        status = await limiter.get_status("user123", "cerebras")
+        assert status["tokens"]["used"] == 11_000
+        assert status["requests"]["used"] == 2
+
+
+class TestNoOvershoot:
+    """Concurrent workers sharing Redis stay within the quota."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_never_exceed_request_limit(self, redis_server):
+        """Test 200 concurrent checks across 4 workers admit exactly the limit."""
+        limiters = [make_limiter(redis_server) for _ in range(4)]
+
+        results = await asyncio.gather(*[
+            limiters[i % 4].check_rate_limit("shared", "cerebras", "/qualify")
+            for i in range(200)
+        ])
+
+        assert sum(r.allowed for r in results) == PROVIDER_LIMITS["cerebras"]["requests_per_minute"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_never_exceed_token_limit(self, redis_server):
+        """Test concurrent token reservations stop at tokens_per_minute."""
+        limiters = [make_limiter(redis_server) for _ in range(4)]
+        token_limit = PROVIDER_LIMITS["claude"]["tokens_per_minute"]
+
+        results = await asyncio.gather(*[
+            limiters[i % 4].check_rate_limit("shared", "claude", "/qualify", estimated_tokens=7_000)
+            for i in range(40)
+        ])
+
+        assert sum(r.allowed for r in results) == token_limit // 7_000
+
+    @pytest.mark.asyncio
+    async def test_leased_workers_never_exceed_request_limit(self, redis_server):
+        """Test leases hold capacity in Redis so the total stays within the limit."""
+        limiters = [make_limiter(redis_server, lease_requests=7, lease_tokens=5_000) for _ in range(3)]
+
+        results = await asyncio.gather(*[
+            limiters[i % 3].check_rate_limit("shared", "cerebras", "/qualify", estimated_tokens=100)
+            for i in range(200)
+        ])
+
+        request_limit = PROVIDER_LIMITS["cerebras"]["requests_per_minute"]
+        assert sum(r.allowed for r in results) == request_limit
+
+        # Returning the leases records only what was used
+        for limiter in limiters:
+            await limiter.close()
+        status = await limiters[0].get_status("shared", "cerebras")
+        assert status["requests"]["used"] == request_limit
+        assert status["tokens"]["used"] == request_limit * 100
+
+    @pytest.mark.asyncio
+    async def test_lease_serves_checks_locally(self, redis_server):
+        """Test a lease answers repeated checks without further script calls."""
+        limiter = make_limiter(redis_server, lease_requests=10, lease_tokens=10_000)
+        calls = 0
+        acquire = limiter._acquire_script
+
+        async def counting_acquire(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return await acquire(*args, **kwargs)
+
+        limiter._acquire_script = counting_acquire
+        for _ in range(10):
+            result = await limiter.check_rate_limit("user123", "cerebras", "/api/leads", estimated_tokens=500)
+            assert result.allowed is True
+            await limiter.settle(result, tokens_used=200)
+
+        assert calls == 1
+        await limiter.close()
+        status = await limiter.get_status("user123", "cerebras")
+        assert status["requests"]["used"] == 10
+        assert status["tokens"]["used"] == 2_000
@@ -8,13 +8,15 @@ Tests cover:
 - Fallback when Redis unavailable
 - Key generation consistency
 - Statistics tracking
+- In-process L1 tier, single-flight coalescing and batched stats
 """
 
 import pytest
 import asyncio
+import time
 from datetime import timedelta
 from unittest.mock import AsyncMock, patch, MagicMock
-from app.services.cache_manager import CacheManager
+from app.services.cache_manager import CacheManager, LocalLRUCache
 
 
 class TestCacheManager:
@@ -387,3 +389,114 @@ class TestHealthCheck:
         assert stats["misses"] >= 0
         assert stats["errors"] >= 0
         assert 0 <= stats["hit_rate"] <= 100
+
+
+class TestLocalLRUCache:
+    """Test in-process L1 cache bounds"""
+
+    def test_evicts_least_recently_used_by_entries(self):
+        """Test entry bound evicts the least recently used key"""
+        l1 = LocalLRUCache(max_entries=2, max_bytes=1024, ttl_seconds=60)
+        l1.set("a", "1")
+        l1.set("b", "2")
+        l1.get("a")
+        l1.set("c", "3")
+
+        assert l1.get("a") == "1"
+        assert l1.get("b") is None
+        assert l1.get("c") == "3"
+
+    def test_evicts_by_bytes(self):
+        """Test byte bound evicts until the new value fits"""
+        l1 = LocalLRUCache(max_entries=100, max_bytes=10, ttl_seconds=60)
+        l1.set("a", "x" * 6)
+        l1.set("b", "y" * 6)
+
+        assert l1.get("a") is None
+        assert l1.size_bytes == 6
+        assert l1.set("huge", "z" * 11) is False
+
+    def test_expired_entry_is_dropped(self):
+        """Test entries past their TTL are misses"""
+        l1 = LocalLRUCache(ttl_seconds=60)
+        l1.set("a", "1", ttl_seconds=0.001)
+
+        time.sleep(0.01)
+        assert l1.get("a") is None
+        assert len(l1) == 0
+
+
+@pytest.mark.asyncio
+class TestTwoTierCache:
+    """Test L1 in front of Redis, single-flight and batched stats (mocked Redis)"""
+
+    @pytest.fixture
+    def manager(self):
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.setex = AsyncMock()
+        redis.delete = AsyncMock(return_value=1)
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis.pipeline = MagicMock(return_value=pipe)
+
+        manager = CacheManager(redis_url="redis://localhost:6379/1")
+        manager._redis = redis
+        return manager
+
+    async def test_l1_hit_skips_redis(self, manager):
+        """Test a cached write is served from L1 without a Redis GET"""
+        await manager.cache_qualification("TechCorp", "SaaS", {"score": 80, "reasoning": "Test"})
+
+        result = await manager.get_cached_qualification("TechCorp", "SaaS")
+
+        assert result["score"] == 80
+        manager._redis.get.assert_not_awaited()
+
+    async def test_invalidation_evicts_l1(self, manager):
+        """Test invalidation removes the in-process copy too"""
+        await manager.cache_qualification("TechCorp", "SaaS", {"score": 80, "reasoning": "Test"})
+        await manager.invalidate_lead_cache("TechCorp", "SaaS")
+
+        assert await manager.get_cached_qualification("TechCorp", "SaaS") is None
+
+    async def test_concurrent_misses_share_one_computation(self, manager):
+        """Test single-flight: N concurrent misses make one compute call"""
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"score": 70, "reasoning": "Computed"}
+
+        results = await asyncio.gather(*(
+            manager.get_or_compute_qualification("TechCorp", "SaaS", compute)
+            for _ in range(10)
+        ))
+
+        assert calls == 1
+        sources = [source for _, source in results]
+        assert sources.count("computed") == 1
+        assert sources.count("coalesced") == 9
+        assert all(data["score"] == 70 for data, _ in results)
+        manager._redis.setex.assert_awaited_once()
+
+        # Next lookup is served from L1
+        _, source = await manager.get_or_compute_qualification("TechCorp", "SaaS", compute)
+        assert source == "l1"
+
+    async def test_stats_are_batched_into_one_pipeline(self, manager):
+        """Test stat increments are buffered and flushed together"""
+        for _ in range(5):
+            await manager.get_cached_qualification("MissCorp", "SaaS")
+
+        manager._redis.incr.assert_not_awaited()
+        assert manager._pending_stats["misses"] == 5
+
+        await manager._flush_stats()
+
+        pipe = manager._redis.pipeline.return_value
+        pipe.incrby.assert_called_once_with("cache:stats:misses", 5)
+        pipe.execute.assert_awaited_once()
+        assert not manager._pending_stats
@@ -10,18 +10,21 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from app.main import app
-from app.models.database import Base, get_db
-from app.models.usage_tracker import APICallLog, ProviderType, OperationType
+from app.models.database import Base, get_db, get_async_db
+from app.models.unified_api_call import APICallLog, ProviderType, OperationType
 
 
 # ============================================================================
 # TEST DATABASE SETUP
 # ============================================================================
 
-# Create in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Create in-memory SQLite database for testing (shared cache so the
+# sync and async engines see the same tables and rows)
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:costs_api_test?mode=memory&cache=shared&uri=true"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///file:costs_api_test?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -30,6 +33,16 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async routes read the same in-memory database through aiosqlite
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 def override_get_db():
     """Override database dependency with test database."""
@@ -40,7 +53,14 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    """Override async database dependency with test database."""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 # Create test database tables
 Base.metadata.create_all(bind=engine)
@@ -55,15 +75,16 @@ client = TestClient(app)
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database session for each test."""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    # Rows are committed (the async routes read through another connection,
+    # which an open transaction would lock out) and deleted afterwards
+    session = TestingSessionLocal()
 
     yield session
 
+    session.rollback()
+    session.query(APICallLog).delete()
+    session.commit()
     session.close()
-    transaction.rollback()
-    connection.close()
 
 
 @pytest.fixture
@@ -137,7 +158,7 @@ def sample_api_calls(db_session):
 
 def test_get_cost_summary_default(sample_api_calls):
     """Test cost summary endpoint with default 7-day period."""
-    response = client.get("/api/costs/summary")
+    response = client.get("/api/v1/costs/summary")
 
     assert response.status_code == 200
     data = response.json()
@@ -164,7 +185,7 @@ def test_get_cost_summary_default(sample_api_calls):
 
 def test_get_cost_summary_custom_period(sample_api_calls):
     """Test cost summary with custom time period."""
-    response = client.get("/api/costs/summary?days=3")
+    response = client.get("/api/v1/costs/summary?days=3")
 
     assert response.status_code == 200
     data = response.json()
@@ -175,14 +196,14 @@ def test_get_cost_summary_custom_period(sample_api_calls):
 
 def test_get_cost_summary_invalid_period():
     """Test cost summary with invalid period (exceeds max)."""
-    response = client.get("/api/costs/summary?days=100")
+    response = client.get("/api/v1/costs/summary?days=100")
 
     assert response.status_code == 422  # Validation error
 
 
 def test_get_cost_breakdown_by_provider(sample_api_calls):
     """Test cost breakdown grouped by provider."""
-    response = client.get("/api/costs/breakdown?group_by=provider")
+    response = client.get("/api/v1/costs/breakdown?group_by=provider")
 
     assert response.status_code == 200
     data = response.json()
@@ -201,7 +222,7 @@ def test_get_cost_breakdown_by_provider(sample_api_calls):
 
 def test_get_cost_breakdown_by_model(sample_api_calls):
     """Test cost breakdown grouped by model."""
-    response = client.get("/api/costs/breakdown?group_by=model")
+    response = client.get("/api/v1/costs/breakdown?group_by=model")
 
     assert response.status_code == 200
     data = response.json()
@@ -212,7 +233,7 @@ def test_get_cost_breakdown_by_model(sample_api_calls):
 
 def test_get_cost_breakdown_by_operation(sample_api_calls):
     """Test cost breakdown grouped by operation type."""
-    response = client.get("/api/costs/breakdown?group_by=operation")
+    response = client.get("/api/v1/costs/breakdown?group_by=operation")
 
     assert response.status_code == 200
     data = response.json()
@@ -223,7 +244,7 @@ def test_get_cost_breakdown_by_operation(sample_api_calls):
 
 def test_get_cost_breakdown_invalid_group_by():
     """Test cost breakdown with invalid group_by parameter."""
-    response = client.get("/api/costs/breakdown?group_by=invalid")
+    response = client.get("/api/v1/costs/breakdown?group_by=invalid")
 
     assert response.status_code == 422  # Validation error
 
@@ -234,7 +255,7 @@ def test_get_usage_timeseries_daily(sample_api_calls):
     start_date = now - timedelta(days=7)
 
     response = client.get(
-        f"/api/costs/usage?start_date={start_date.isoformat()}&end_date={now.isoformat()}&interval=daily"
+        f"/api/v1/costs/usage?start_date={start_date.isoformat()}&end_date={now.isoformat()}&interval=daily"
     )
 
     assert response.status_code == 200
@@ -259,7 +280,7 @@ def test_get_usage_timeseries_hourly(sample_api_calls):
     start_date = now - timedelta(hours=24)
 
     response = client.get(
-        f"/api/costs/usage?start_date={start_date.isoformat()}&end_date={now.isoformat()}&interval=hourly"
+        f"/api/v1/costs/usage?start_date={start_date.isoformat()}&end_date={now.isoformat()}&interval=hourly"
     )
 
     assert response.status_code == 200
@@ -270,14 +291,14 @@ def test_get_usage_timeseries_hourly(sample_api_calls):
 
 def test_get_usage_timeseries_missing_dates():
     """Test usage time series without required date parameters."""
-    response = client.get("/api/costs/usage")
+    response = client.get("/api/v1/costs/usage")
 
     assert response.status_code == 422  # Missing required parameters
 
 
 def test_get_budget_status(sample_api_calls):
     """Test budget status endpoint."""
-    response = client.get("/api/costs/budget/status")
+    response = client.get("/api/v1/costs/budget/status")
 
     assert response.status_code == 200
     data = response.json()
@@ -298,7 +319,7 @@ def test_get_budget_status(sample_api_calls):
 
 def test_export_costs_csv(sample_api_calls):
     """Test CSV export."""
-    response = client.get("/api/costs/export?format=csv")
+    response = client.get("/api/v1/costs/export?format=csv")
 
     assert response.status_code == 200
     assert response.headers["content-type"] == "text/csv; charset=utf-8"
@@ -319,7 +340,7 @@ def test_export_costs_csv(sample_api_calls):
 
 def test_export_costs_json(sample_api_calls):
     """Test JSON export."""
-    response = client.get("/api/costs/export?format=json")
+    response = client.get("/api/v1/costs/export?format=json")
 
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/json"
@@ -343,7 +364,7 @@ def test_export_costs_with_date_range(sample_api_calls):
     start_date = now - timedelta(days=3)
 
     response = client.get(
-        f"/api/costs/export?format=csv&start_date={start_date.isoformat()}&end_date={now.isoformat()}"
+        f"/api/v1/costs/export?format=csv&start_date={start_date.isoformat()}&end_date={now.isoformat()}"
     )
 
     assert response.status_code == 200
@@ -351,7 +372,7 @@ def test_export_costs_with_date_range(sample_api_calls):
 
 def test_export_costs_invalid_format():
     """Test export with invalid format."""
-    response = client.get("/api/costs/export?format=xml")
+    response = client.get("/api/v1/costs/export?format=xml")
 
     assert response.status_code == 422  # Validation error
 
@@ -362,8 +383,8 @@ def test_export_costs_invalid_format():
 
 def test_cost_summary_matches_breakdown(sample_api_calls):
     """Test that cost summary totals match breakdown totals."""
-    summary_response = client.get("/api/costs/summary?days=7")
-    breakdown_response = client.get("/api/costs/breakdown?group_by=provider")
+    summary_response = client.get("/api/v1/costs/summary?days=7")
+    breakdown_response = client.get("/api/v1/costs/breakdown?group_by=provider")
 
     assert summary_response.status_code == 200
     assert breakdown_response.status_code == 200
@@ -378,7 +399,7 @@ def test_cost_summary_matches_breakdown(sample_api_calls):
 
 def test_budget_utilization_calculation(sample_api_calls):
     """Test budget utilization is calculated correctly."""
-    response = client.get("/api/costs/budget/status")
+    response = client.get("/api/v1/costs/budget/status")
 
     assert response.status_code == 200
     data = response.json()
@@ -14,6 +14,7 @@ from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 
 from app.services.csv_importer import CSVImportService
+from app.core.exceptions import LeadValidationError, InvalidFileFormatError
 from app.services.document_processor import DocumentProcessor
 from app.services.social_media_scraper import SocialMediaScraper
 from app.services.linkedin_scraper import LinkedInScraper
@@ -110,6 +111,105 @@ TechCorp,john@techcorp.com"""
         assert "duration_ms" in result
 
 
+class _RecordingCopy:
+    """Stand-in for psycopg3's Copy context manager"""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self.sink.append(row)
+
+
+class TestCSVStreamingImport:
+    """Tests for constant-memory streaming CSV import"""
+
+    def setup_method(self):
+        self.csv_importer = CSVImportService()
+        self.rows = []
+        self.mock_db = Mock()
+        self.raw_conn = self.mock_db.connection.return_value.connection
+        self.cursor = self.raw_conn.cursor.return_value
+        self.cursor.copy.side_effect = lambda sql: _RecordingCopy(self.rows)
+
+    def _csv_stream(self, count, bad_every=0):
+        lines = ["company_name,industry,contact_email"]
+        for i in range(count):
+            email = "bad-email" if bad_every and i % bad_every == 0 else f"user{i}@example.com"
+            lines.append(f"Company {i},SaaS,{email}")
+        return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def test_iter_csv_lines_handles_chunk_boundaries(self):
+        """Multibyte characters and quoted newlines survive tiny read chunks"""
+        content = 'company_name,notes\n"Café Corp","line one\nline two"\nAcme,ok'.encode("utf-8")
+        lines = list(self.csv_importer.iter_csv_lines(io.BytesIO(content), chunk_size=3))
+
+        assert "".join(lines) == content.decode("utf-8")
+        assert lines[-1] == "Acme,ok"
+
+    def test_stream_import_commits_per_interval(self):
+        """Rows are written through COPY and committed every commit_interval rows"""
+        progress_updates = []
+
+        result = self.csv_importer.stream_import_leads(
+            self.mock_db,
+            self._csv_stream(25),
+            commit_interval=10,
+            progress_callback=progress_updates.append
+        )
+
+        assert result["imported_count"] == 25
+        assert result["commits"] == 3
+        assert len(self.rows) == 25
+        assert self.raw_conn.commit.call_count == 3
+        assert [p["imported_count"] for p in progress_updates] == [10, 20, 25]
+        # company_name first, one shared created_at timestamp last
+        assert self.rows[0][0] == "Company 0"
+        assert len({row[-1] for row in self.rows}) == 1
+
+    def test_stream_import_counts_invalid_rows(self):
+        """Invalid rows are skipped and counted without aborting the import"""
+        result = self.csv_importer.stream_import_leads(self.mock_db, self._csv_stream(50, bad_every=25))
+
+        assert result["imported_count"] == 48
+        assert result["failed_count"] == 2
+        assert len(result["errors"]) == 2
+
+    def test_stream_import_rejects_high_error_rate(self):
+        """A mostly-invalid file is rolled back before commit"""
+        with pytest.raises(LeadValidationError):
+            self.csv_importer.stream_import_leads(self.mock_db, self._csv_stream(20, bad_every=2))
+
+        self.raw_conn.commit.assert_not_called()
+        self.raw_conn.rollback.assert_called_once()
+
+    def test_stream_import_checks_error_rate_after_last_block(self):
+        """Invalid rows trailing the last committed block still fail the import"""
+        lines = ["company_name,industry,contact_email"]
+        lines += [f"Company {i},SaaS,user{i}@example.com" for i in range(10)]
+        lines += [f"Company {i},SaaS,bad-email" for i in range(10, 15)]
+        stream = io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+        with pytest.raises(LeadValidationError) as exc_info:
+            self.csv_importer.stream_import_leads(self.mock_db, stream, commit_interval=10)
+
+        assert exc_info.value.context["error_count"] == 5
+        assert exc_info.value.context["committed_count"] == 10
+
+    def test_stream_import_missing_headers(self):
+        """Missing required columns raise InvalidFileFormatError"""
+        stream = io.BytesIO(b"industry,contact_email\nSaaS,a@b.com\n")
+
+        with pytest.raises(InvalidFileFormatError):
+            self.csv_importer.stream_import_leads(self.mock_db, stream)
+
+
 # Document Processing Tests
 
 class TestDocumentProcessor:
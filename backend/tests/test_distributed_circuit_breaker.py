@@ -0,0 +1,176 @@
+"""
+Tests for DistributedCircuitBreaker.
+
+Simulates several workers (one breaker instance and Redis client each) sharing
+one fakeredis server, with Lua scripting and pub/sub.
+"""
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import (
+    CircuitBreakerError,
+    CircuitState,
+    DistributedCircuitBreaker,
+)
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture(autouse=True)
+async def breaker_events(monkeypatch):
+    """Fresh pub/sub listeners per test, so none outlive their FakeServer."""
+    events = circuit_breaker._BreakerEvents()
+    monkeypatch.setattr(circuit_breaker, "_events", events)
+    yield events
+    await events.aclose()
+
+
+def make_worker(server, name="cerebras", **kwargs) -> DistributedCircuitBreaker:
+    kwargs.setdefault("failure_threshold", 3)
+    kwargs.setdefault("recovery_timeout", 60)
+    return DistributedCircuitBreaker(
+        name,
+        redis_client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+        redis_timeout_ms=1000,
+        **kwargs,
+    )
+
+
+async def failing():
+    raise TimeoutError("provider timed out")
+
+
+async def succeeding():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_failures_on_one_worker_open_circuit_for_all(redis_server):
+    """Test other workers fail fast once the cluster-wide threshold is hit."""
+    worker_a, worker_b = make_worker(redis_server), make_worker(redis_server)
+    assert await worker_b.call(succeeding) == "ok"
+
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            await worker_a.call(failing)
+
+    calls = 0
+
+    async def counted():
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    await asyncio.sleep(0.05)  # Let the pub/sub event arrive
+    assert worker_b.is_open() is True
+    with pytest.raises(CircuitBreakerError):
+        await worker_b.call(counted)
+    assert calls == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_are_counted_across_workers(redis_server):
+    """Test consecutive failures from different workers add up."""
+    workers = [make_worker(redis_server) for _ in range(3)]
+
+    for worker in workers:
+        with pytest.raises(TimeoutError):
+            await worker.call(failing)
+
+    await asyncio.sleep(0.05)  # Let the pub/sub event arrive
+    assert workers[0].state == CircuitState.OPEN
+    status = workers[-1].get_status()
+    assert status["distributed"] is True
+    assert status["failure_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_single_probe_cluster_wide(redis_server):
+    """Test only one worker probes in HALF_OPEN and its success closes the circuit."""
+    worker_a = make_worker(redis_server, success_threshold=1)
+    worker_b = make_worker(redis_server, success_threshold=1)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            await worker_a.call(failing)
+
+    # Recovery timeout elapses
+    client = fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+    await client.hset("circuit_breaker:cerebras", "opened_at", 0)
+    worker_a._cached_until = worker_b._cached_until = 0.0
+
+    release = asyncio.Event()
+
+    async def slow_probe():
+        await release.wait()
+        return "recovered"
+
+    probe = asyncio.create_task(worker_a.call(slow_probe))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(CircuitBreakerError, match="probing"):
+        await worker_b.call(succeeding)
+
+    release.set()
+    assert await probe == "recovered"
+    await asyncio.sleep(0.05)
+
+    assert await client.hget("circuit_breaker:cerebras", "state") == "closed"
+    assert await worker_b.call(succeeding) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_the_lock(redis_server):
+    """Test a cancelled probe lets the next call probe instead of waiting out probe_timeout."""
+    worker_a = make_worker(redis_server, success_threshold=1)
+    worker_b = make_worker(redis_server, success_threshold=1)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            await worker_a.call(failing)
+
+    client = fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+    await client.hset("circuit_breaker:cerebras", "opened_at", 0)
+    worker_a._cached_until = worker_b._cached_until = 0.0
+
+    probe = asyncio.create_task(worker_a.call(asyncio.Event().wait))
+    await asyncio.sleep(0.05)
+    assert await client.exists("circuit_breaker:cerebras:probe")
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert not await client.exists("circuit_breaker:cerebras:probe")
+    assert await worker_b.call(succeeding) == "ok"
+    assert await client.hget("circuit_breaker:cerebras", "state") == "closed"
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_state_without_redis():
+    """Test the breaker still protects the process when Redis is unreachable."""
+
+    class DownRedis:
+        async def eval(self, *args, **kwargs):
+            raise RedisConnectionError("connection refused")
+
+        def pubsub(self):
+            raise RedisConnectionError("connection refused")
+
+    breaker = DistributedCircuitBreaker("cerebras", failure_threshold=2, redis_client=DownRedis())
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            await breaker.call(failing)
+
+    assert breaker.is_open() is True
+    with pytest.raises(CircuitBreakerError):
+        await breaker.call(succeeding)
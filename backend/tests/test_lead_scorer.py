@@ -541,4 +541,41 @@ class TestEdgeCases:
 
         # Different weights should produce different scores
         assert result1.score != result2.score
-        assert result1.factors["company_size"] != result2.factors["company_size"]
\ No newline at end of file
+        assert result1.factors["company_size"] != result2.factors["company_size"]
+
+class TestScoreBatch:
+    """Test vectorized batch scoring against calculate_score"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.scorer = LeadScorer()
+
+    def test_score_batch_matches_calculate_score(self):
+        """Batch scores, confidence and tiers equal the per-lead results"""
+        leads = [
+            {"company_size": "5000+", "industry": "SaaS"},
+            {"company_size": "11-50", "industry": "saas platform"},
+            {"company_size": None, "industry": "Construction"},
+            {"company_size": "250 employees", "industry": None},
+            {"company_size": "", "industry": "Unknown"},
+            {"company_size": "mid-size", "industry": "Healthcare"},
+        ]
+        signals = [
+            SignalData(recent_funding=True, demo_requested=True),
+            None,
+            SignalData(employee_growth_rate=-0.2),
+            SignalData(recent_funding=False),
+            None,
+            SignalData(content_downloads=3, competitor_customer=True),
+        ]
+
+        batch = self.scorer.score_batch(leads, signals)
+
+        for i, lead_data in enumerate(leads):
+            expected = self.scorer.calculate_score(lead_data, signals[i])
+            row = batch.iloc[i]
+            assert row["score"] == expected.score
+            assert row["confidence"] == expected.confidence
+            assert row["tier"] == expected.tier
+            assert row["industry"] == expected.factors["industry"]
+            assert row["company_size"] == expected.factors["company_size"]
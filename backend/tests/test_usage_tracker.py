@@ -7,6 +7,7 @@ from unittest.mock import Mock, AsyncMock, patch
 from sqlalchemy.orm import Session
 
 from app.services.usage_tracker import UsageTracker
+from app.services.usage_rollups import UsageStats
 from app.models.unified_api_call import APICallLog, ProviderType, OperationType
 
 
@@ -363,51 +364,57 @@ class TestCostBreakdown:
 class TestLatencyPercentiles:
     """Test latency percentile calculations"""
 
-    def test_get_latency_percentiles(self, tracker, mock_db):
+    @staticmethod
+    def _usage(latencies):
+        """Rollup usage as returned by api_call_usage()"""
+        stats = UsageStats()
+        for latency in latencies:
+            stats.add(cost_usd=0.0, cache_hit=False, latency_ms=latency, with_sketch=True)
+        return {(): stats}
+
+    def test_get_latency_percentiles(self, tracker):
         """Test p50, p95, p99 latency calculations"""
         start_date = datetime(2025, 10, 1)
         end_date = datetime(2025, 10, 7)
 
-        # Mock percentile results
-        mock_result = Mock(p50=500, p95=1500, p99=3000)
-        mock_db.execute.return_value.first.return_value = mock_result
-
-        result = tracker.get_latency_percentiles(
-            start_date=start_date,
-            end_date=end_date
-        )
+        latencies = list(range(1, 1001))
+        with patch("app.services.usage_tracker.api_call_usage", return_value=self._usage(latencies)) as usage:
+            result = tracker.get_latency_percentiles(
+                start_date=start_date,
+                end_date=end_date
+            )
 
-        assert result["p50"] == 500
-        assert result["p95"] == 1500
-        assert result["p99"] == 3000
+        # Sketch percentiles are within 1% of the exact values
+        assert result["p50"] == pytest.approx(500, rel=0.01)
+        assert result["p95"] == pytest.approx(950, rel=0.01)
+        assert result["p99"] == pytest.approx(990, rel=0.01)
+        assert usage.call_args.kwargs["end"] > end_date  # end_date is inclusive
 
-    def test_get_latency_percentiles_with_provider_filter(self, tracker, mock_db):
+    def test_get_latency_percentiles_with_provider_filter(self, tracker):
         """Test latency percentiles for specific provider"""
         start_date = datetime(2025, 10, 1)
         end_date = datetime(2025, 10, 7)
 
-        mock_result = Mock(p50=600, p95=1000, p99=2000)
-        mock_db.execute.return_value.first.return_value = mock_result
-
-        result = tracker.get_latency_percentiles(
-            start_date=start_date,
-            end_date=end_date,
-            provider=ProviderType.CEREBRAS
-        )
+        with patch("app.services.usage_tracker.api_call_usage", return_value=self._usage([600] * 10)) as usage:
+            result = tracker.get_latency_percentiles(
+                start_date=start_date,
+                end_date=end_date,
+                provider=ProviderType.CEREBRAS
+            )
 
-        assert result["p50"] == 600
+        assert result["p50"] == pytest.approx(600, rel=0.01)
+        assert usage.call_args.kwargs["provider"] == ProviderType.CEREBRAS
 
-    def test_get_latency_percentiles_no_data(self, tracker, mock_db):
+    def test_get_latency_percentiles_no_data(self, tracker):
         """Test percentiles with no data returns zeros"""
         start_date = datetime(2025, 10, 1)
         end_date = datetime(2025, 10, 7)
 
-        mock_db.execute.return_value.first.return_value = None
-
-        result = tracker.get_latency_percentiles(
-            start_date=start_date,
-            end_date=end_date
-        )
+        with patch("app.services.usage_tracker.api_call_usage", return_value={}):
+            result = tracker.get_latency_percentiles(
+                start_date=start_date,
+                end_date=end_date
+            )
 
         assert result == {"p50": 0, "p95": 0, "p99": 0}
 
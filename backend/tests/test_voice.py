@@ -16,6 +16,7 @@ from fastapi import WebSocket
 from app.services.voice_agent import (
     VoiceAgent,
     TalkingNode,
+    iter_speech_chunks,
     VoiceSession,
     VoiceTurn,
     ConversationState,
@@ -129,6 +130,13 @@ class MockCerebrasService:
             "latency_ms": self.inference_latency
         }
 
+    async def astream_completion(self, prompt: str, system_prompt: str = None, temperature: float = 0.7, max_tokens: int = 150):
+        """Mock token streaming: first token after 150ms, then 20ms per token."""
+        await asyncio.sleep(0.15)
+        for token in "Thank you for your interest! Our product can help streamline your sales process.".split(" "):
+            await asyncio.sleep(0.02)
+            yield token + " "
+
 
 @pytest.fixture
 def mock_voice_agent():
@@ -420,4 +428,79 @@ async def test_latency_compliance():
 
     # Verify global metrics reflect this
     global_metrics = agent.get_global_metrics()
-    assert global_metrics["target_compliance_rate"] >= 0.9
\ No newline at end of file
+    assert global_metrics["target_compliance_rate"] >= 0.9
+
+async def _tokens(text: str):
+    for word in text.split(" "):
+        yield word + " "
+
+
+@pytest.mark.asyncio
+async def test_speech_chunks_cut_at_sentence_and_clause_boundaries():
+    """Test streamed tokens are regrouped into speakable chunks."""
+    text = (
+        "Thanks for asking. Most dealers your size start on the growth plan, "
+        "which covers unlimited lead scoring. Want a demo"
+    )
+
+    chunks = [chunk async for chunk in iter_speech_chunks(_tokens(text))]
+
+    assert chunks == [
+        "Thanks for asking.",
+        "Most dealers your size start on the growth plan,",
+        "which covers unlimited lead scoring.",
+        "Want a demo"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_speech_chunks_force_cut_long_runs():
+    """Test text without punctuation is cut at whitespace past max_chars."""
+    chunks = [chunk async for chunk in iter_speech_chunks(_tokens("word " * 30), max_chars=40)]
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 40 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_streaming_turn_speaks_before_generation_finishes(mock_voice_agent):
+    """Test first audio arrives before the full response has been generated."""
+    agent = mock_voice_agent
+    session = await agent.create_session(voice_id="test_voice")
+
+    messages = []
+    async for chunk in agent.process_audio_turn_streaming(
+        session_id=session.session_id,
+        audio_data=b"test_audio" * 100
+    ):
+        messages.append(chunk)
+
+    types = [m["type"] for m in messages]
+    assert "error" not in types
+    # Audio for the first sentence precedes later response chunks
+    assert types.index("audio") < len(types) - 1 - types[::-1].index("response_chunk")
+
+    metrics = messages[-1]["metrics"]
+    assert metrics["speech_chunks"] == 2
+    assert metrics["total_latency_ms"] < metrics["turn_duration_ms"]
+    # STT (140ms) + full generation (150ms + 13 tokens * 20ms) would be 550ms
+    assert metrics["total_latency_ms"] < 500
+    assert session.context["recent_turns"][-1]["assistant"].startswith("Thank you for your interest!")
+
+
+@pytest.mark.asyncio
+async def test_lead_context_prefetched_once_per_session(mock_voice_agent):
+    """Test lead data is loaded at session creation, not on every turn."""
+    agent = mock_voice_agent
+    agent._get_lead_data = AsyncMock(return_value={"company_name": "TechCorp", "industry": "Solar"})
+
+    session = await agent.create_session(lead_id=7, voice_id="test_voice")
+    for _ in range(2):
+        async for _chunk in agent.process_audio_turn_streaming(
+            session_id=session.session_id,
+            audio_data=b"test_audio"
+        ):
+            pass
+
+    agent._get_lead_data.assert_awaited_once_with(7)
+    assert session.lead_data["company_name"] == "TechCorp"
@@ -3,7 +3,9 @@
 Batch Enrichment Script for Companies
 
 Enriches leads with Apollo.io contacts. Supports two modes:
-1. Email-only: Enrich contacts that already have emails
+1. Email-only: Enrich contacts that already have emails (Apollo cache first,
+   then /people/bulk_match 10 emails per call; the enrichment agent only runs
+   for emails Apollo couldn't match)
 2. Company search: Find contacts using company domain (requires Apollo People Search)
 
 Usage:
@@ -38,6 +40,9 @@ from app.models.database import SessionLocal
 from app.models.lead import Lead
 from app.services.langgraph.agents.enrichment_agent import EnrichmentAgent
 from app.services.apollo import ApolloService
+from app.services.apollo_enrichment_batcher import ApolloEnrichmentBatcher
+from app.services.cache.apollo_cache import ApolloPersonCache, get_apollo_person_cache
+from app.services.rate_limiter import AtomicRateLimiter
 from app.core.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -110,6 +115,51 @@ class BatchEnrichmentService:
         
         return query.all()
     
+    async def bulk_match_apollo(self, leads: List[Lead]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Match all lead emails against Apollo (cache first, 10 per call)"""
+        cache = await get_apollo_person_cache()
+        batcher = ApolloEnrichmentBatcher(
+            self.apollo_service,
+            cache=cache,
+            rate_limiter=AtomicRateLimiter(cache.redis)
+        )
+        result = await batcher.enrich_emails(lead.contact_email for lead in leads)
+        stats = result.stats
+        print(
+            f"🔗 Apollo: {stats.cache_hits} cached, {stats.api_calls} API calls, "
+            f"{stats.matched} matched, {stats.not_found} not found, {stats.failed} failed, "
+            f"{stats.credits_consumed} credits"
+        )
+        return result.people
+
+    def apply_apollo_person(self, lead: Lead, person: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a lead from an Apollo person match (no agent call)"""
+        name = ' '.join(p for p in (person.get('first_name'), person.get('last_name')) if p)
+        if name:
+            lead.contact_name = name
+        if person.get('title'):
+            lead.contact_title = person['title']
+        phone_numbers = person.get('phone_numbers') or []
+        if phone_numbers and phone_numbers[0].get('raw_number'):
+            lead.contact_phone = phone_numbers[0]['raw_number']
+
+        lead.additional_data = {
+            **(lead.additional_data or {}),
+            'enrichment': {
+                'sources': ['apollo.io'],
+                'apollo_person_id': person.get('id'),
+                'linkedin_url': person.get('linkedin_url'),
+                'enriched_at': datetime.now().isoformat()
+            }
+        }
+
+        return {
+            'status': 'success',
+            'lead_id': lead.id,
+            'company': lead.company_name,
+            'source': 'apollo.io'
+        }
+
     async def enrich_lead_with_email(self, lead: Lead) -> Dict[str, Any]:
         """Enrich a lead that has an email"""
         try:
@@ -311,6 +361,25 @@ class BatchEnrichmentService:
         self.stats['total'] = len(leads)
         print(f"📊 Found {len(leads)} leads to enrich\n")
         
+        # Email-only: bulk Apollo pass first; the agent handles the rest
+        apollo_results = []
+        if mode == "email_only":
+            try:
+                apollo_people = await self.bulk_match_apollo(leads)
+            except Exception as e:
+                logger.error(f"Apollo bulk match failed, falling back to per-lead enrichment: {e}")
+                apollo_people = {}
+
+            remaining = []
+            for lead in leads:
+                person = apollo_people.get(ApolloPersonCache.normalize_email(lead.contact_email))
+                if person:
+                    apollo_results.append(self.apply_apollo_person(lead, person))
+                else:
+                    remaining.append(lead)
+            self.db.commit()
+            leads = remaining
+
         # Process in batches
         results = []
         semaphore = asyncio.Semaphore(max_concurrency)
@@ -324,7 +393,7 @@ class BatchEnrichmentService:
         
         # Process all leads
         tasks = [process_lead(lead) for lead in leads]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = apollo_results + list(await asyncio.gather(*tasks, return_exceptions=True))
         
         # Process results
         for result in results: